@@ -0,0 +1,123 @@
+"""unidades_organizativas_cierre: closure table de la jerarquía territorial.
+
+Precalcula todos los pares (ancestro, descendiente) de `unidades_organizativas`
+para que el ámbito territorial se resuelva con un join en lugar de un CTE
+recursivo por petición. La mantienen dos triggers:
+
+- AFTER INSERT: la nueva unidad hereda los ancestros de su padre (+ sí misma).
+- AFTER UPDATE OF agrupacion_padre_id: el subárbol movido se desengancha de sus
+  ancestros antiguos y se engancha a los del nuevo padre. Un padre dentro del
+  propio subárbol (ciclo) se rechaza con una excepción.
+
+Los borrados físicos se propagan por ON DELETE CASCADE. Incluye backfill.
+
+Revision ID: amb1cie2rre3
+Revises: obx1evt2rel3
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "amb1cie2rre3"
+down_revision = "obx1evt2rel3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "unidades_organizativas_cierre",
+        sa.Column("ancestro_id", sa.Uuid(),
+                  sa.ForeignKey("unidades_organizativas.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("descendiente_id", sa.Uuid(),
+                  sa.ForeignKey("unidades_organizativas.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("profundidad", sa.Integer(), nullable=False),
+    )
+    op.create_index(
+        "ix_unidades_organizativas_cierre_descendiente_id",
+        "unidades_organizativas_cierre", ["descendiente_id"],
+    )
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION unidades_organizativas_cierre_alta() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO unidades_organizativas_cierre (ancestro_id, descendiente_id, profundidad)
+            VALUES (NEW.id, NEW.id, 0);
+            IF NEW.agrupacion_padre_id IS NOT NULL THEN
+                INSERT INTO unidades_organizativas_cierre (ancestro_id, descendiente_id, profundidad)
+                SELECT c.ancestro_id, NEW.id, c.profundidad + 1
+                FROM unidades_organizativas_cierre c
+                WHERE c.descendiente_id = NEW.agrupacion_padre_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION unidades_organizativas_cierre_mover() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.agrupacion_padre_id IS NOT NULL AND EXISTS (
+                SELECT 1 FROM unidades_organizativas_cierre
+                WHERE ancestro_id = NEW.id AND descendiente_id = NEW.agrupacion_padre_id
+            ) THEN
+                RAISE EXCEPTION 'La unidad % no puede colgar de su propio subárbol', NEW.id;
+            END IF;
+
+            -- Desenganchar el subárbol de los ancestros antiguos (externos al subárbol).
+            DELETE FROM unidades_organizativas_cierre c
+            USING unidades_organizativas_cierre sub
+            WHERE sub.ancestro_id = NEW.id
+              AND c.descendiente_id = sub.descendiente_id
+              AND c.ancestro_id NOT IN (
+                  SELECT descendiente_id FROM unidades_organizativas_cierre
+                  WHERE ancestro_id = NEW.id
+              );
+
+            -- Engancharlo a los ancestros del nuevo padre.
+            IF NEW.agrupacion_padre_id IS NOT NULL THEN
+                INSERT INTO unidades_organizativas_cierre (ancestro_id, descendiente_id, profundidad)
+                SELECT sup.ancestro_id, sub.descendiente_id, sup.profundidad + sub.profundidad + 1
+                FROM unidades_organizativas_cierre sup
+                CROSS JOIN unidades_organizativas_cierre sub
+                WHERE sup.descendiente_id = NEW.agrupacion_padre_id
+                  AND sub.ancestro_id = NEW.id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_unidades_organizativas_cierre_alta
+        AFTER INSERT ON unidades_organizativas
+        FOR EACH ROW EXECUTE FUNCTION unidades_organizativas_cierre_alta()
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_unidades_organizativas_cierre_mover
+        AFTER UPDATE OF agrupacion_padre_id ON unidades_organizativas
+        FOR EACH ROW
+        WHEN (OLD.agrupacion_padre_id IS DISTINCT FROM NEW.agrupacion_padre_id)
+        EXECUTE FUNCTION unidades_organizativas_cierre_mover()
+    """)
+
+    # Backfill desde la jerarquía actual.
+    op.execute("""
+        WITH RECURSIVE arbol(ancestro_id, descendiente_id, profundidad) AS (
+            SELECT id, id, 0 FROM unidades_organizativas
+            UNION ALL
+            SELECT a.ancestro_id, u.id, a.profundidad + 1
+            FROM arbol a
+            JOIN unidades_organizativas u ON u.agrupacion_padre_id = a.descendiente_id
+        )
+        INSERT INTO unidades_organizativas_cierre (ancestro_id, descendiente_id, profundidad)
+        SELECT ancestro_id, descendiente_id, profundidad FROM arbol
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_unidades_organizativas_cierre_mover ON unidades_organizativas")
+    op.execute("DROP TRIGGER IF EXISTS trg_unidades_organizativas_cierre_alta ON unidades_organizativas")
+    op.execute("DROP FUNCTION IF EXISTS unidades_organizativas_cierre_mover()")
+    op.execute("DROP FUNCTION IF EXISTS unidades_organizativas_cierre_alta()")
+    op.drop_index("ix_unidades_organizativas_cierre_descendiente_id",
+                  table_name="unidades_organizativas_cierre")
+    op.drop_table("unidades_organizativas_cierre")
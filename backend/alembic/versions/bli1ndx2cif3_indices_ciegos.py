@@ -0,0 +1,41 @@
+"""indices ciegos: HMAC buscable junto a DNI/NIF e IBAN cifrados.
+
+Fernet no es determinista, así que una vez cifrados `contactos.numero_documento`,
+`socios.iban` y `cuentas_bancarias.iban` ya no se puede buscar por igualdad.
+Cada uno gana una columna `*_indice` (HMAC-SHA256 del valor normalizado, hex)
+con índice B-tree; las búsquedas por identidad van por ella
+(app/core/indice_ciego.py).
+
+Sin backfill SQL: el HMAC usa una clave de aplicación que la BD no conoce. Lo
+rellena `app/scripts/reindexar_indices_ciegos.py`, que el bootstrap ejecuta en
+cada arranque (solo las filas sin índice).
+
+Revision ID: bli1ndx2cif3
+Revises: ntf1cnt2psh3
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "bli1ndx2cif3"
+down_revision = "ntf1cnt2psh3"
+branch_labels = None
+depends_on = None
+
+_CAMPOS = (
+    ("contactos", "numero_documento_indice"),
+    ("socios", "iban_indice"),
+    ("cuentas_bancarias", "iban_indice"),
+)
+
+
+def upgrade() -> None:
+    for tabla, columna in _CAMPOS:
+        op.add_column(tabla, sa.Column(columna, sa.String(64), nullable=True))
+        op.create_index(f"ix_{tabla}_{columna}", tabla, [columna])
+
+
+def downgrade() -> None:
+    for tabla, columna in reversed(_CAMPOS):
+        op.drop_index(f"ix_{tabla}_{columna}", table_name=tabla)
+        op.drop_column(tabla, columna)
@@ -0,0 +1,52 @@
+"""donaciones_lotes_certificados: emisión en bloque de certificados en segundo plano.
+
+La emisión de todo un ejercicio numeraba y confirmaba antes de renderizar, en
+una sola respuesta HTTP: si el ZIP fallaba a medias, los números quedaban
+gastados y sin documento. Ahora cada petición crea un lote que despacha el
+outbox; el lote guarda los números que asignó para regenerarlos sin volver a
+numerar (app/modules/economico/services/certificados_lote_service.py).
+Aditiva.
+
+Revision ID: lcd1cer2zip3
+Revises: tev1prg2env3
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "lcd1cer2zip3"
+down_revision = "tev1prg2env3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "donaciones_lotes_certificados",
+        sa.Column("id", sa.Uuid(), primary_key=True),
+        sa.Column("ejercicio", sa.Integer(), nullable=False),
+        sa.Column("solo_pendientes", sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column("estado", sa.String(20), nullable=False, server_default="PENDIENTE"),
+        sa.Column("numeros", postgresql.JSONB(), nullable=True),
+        sa.Column("total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("ruta_zip", sa.String(500), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("latido_en", sa.DateTime(), nullable=True),
+        sa.Column("fecha_creacion", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("fecha_modificacion", sa.DateTime(), nullable=True),
+        sa.Column("fecha_eliminacion", sa.DateTime(), nullable=True),
+        sa.Column("eliminado", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("creado_por_id", sa.Uuid(), sa.ForeignKey("usuarios.id"), nullable=True),
+        sa.Column("modificado_por_id", sa.Uuid(), sa.ForeignKey("usuarios.id"), nullable=True),
+    )
+    op.create_index("ix_donaciones_lotes_certificados_ejercicio",
+                    "donaciones_lotes_certificados", ["ejercicio"])
+    op.create_index("ix_donaciones_lotes_certificados_eliminado",
+                    "donaciones_lotes_certificados", ["eliminado"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_donaciones_lotes_certificados_eliminado", table_name="donaciones_lotes_certificados")
+    op.drop_index("ix_donaciones_lotes_certificados_ejercicio", table_name="donaciones_lotes_certificados")
+    op.drop_table("donaciones_lotes_certificados")
@@ -0,0 +1,30 @@
+"""donaciones_lotes_certificados.omitidos: números que un reintento no regeneró.
+
+Al reintentar un lote se regeneran sus números guardados. Si entre tanto se
+anuló una donación numerada, ese certificado ya no se puede regenerar; antes
+desaparecía del ZIP sin aviso. Ahora se anota en `omitidos` y se devuelve con
+el estado del lote. Aditiva.
+
+Revision ID: lcd2omi3tid4
+Revises: sal2bor3asi4
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "lcd2omi3tid4"
+down_revision = "sal2bor3asi4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "donaciones_lotes_certificados",
+        sa.Column("omitidos", postgresql.JSONB(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("donaciones_lotes_certificados", "omitidos")
@@ -0,0 +1,100 @@
+"""contadores_notificaciones: no leídas por usuario, incremental y con aviso push.
+
+El badge de notificaciones se respondía con un COUNT (cacheado 5 min) y el
+frontend lo sondeaba. Ahora una fila por usuario guarda sus no leídas (no
+leídas, no archivadas y no eliminadas) y la mantiene un trigger sobre
+`notificaciones`:
+
+- AFTER INSERT/UPDATE OF leida, archivada, eliminado, usuario_id/DELETE: suma
+  o resta 1 al usuario afectado si la fila entra o sale del recuento.
+- Cada cambio del recuento hace `pg_notify('siga_notificaciones', usuario_id)`.
+  Postgres entrega el aviso al confirmar y agrupa los repetidos de una misma
+  transacción (un "marcar todas" genera un aviso por usuario, no por fila).
+
+Incluye backfill.
+
+Revision ID: ntf1cnt2psh3
+Revises: sal1mes2cta3
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "ntf1cnt2psh3"
+down_revision = "sal1mes2cta3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "contadores_notificaciones",
+        sa.Column("usuario_id", sa.Uuid(),
+                  sa.ForeignKey("usuarios.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("no_leidas", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION contadores_notificaciones_sumar(
+            p_usuario_id uuid, p_delta integer
+        ) RETURNS void AS $$
+        BEGIN
+            INSERT INTO contadores_notificaciones (usuario_id, no_leidas)
+            VALUES (p_usuario_id, GREATEST(p_delta, 0))
+            ON CONFLICT (usuario_id) DO UPDATE
+            SET no_leidas = GREATEST(contadores_notificaciones.no_leidas + p_delta, 0);
+            PERFORM pg_notify('siga_notificaciones', p_usuario_id::text);
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION contadores_notificaciones_trigger() RETURNS trigger AS $$
+        DECLARE
+            antes boolean := false;
+            despues boolean := false;
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                antes := NOT OLD.leida AND NOT OLD.archivada AND NOT OLD.eliminado;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                despues := NOT NEW.leida AND NOT NEW.archivada AND NOT NEW.eliminado;
+            END IF;
+
+            IF TG_OP = 'UPDATE' AND OLD.usuario_id IS DISTINCT FROM NEW.usuario_id THEN
+                IF antes THEN
+                    PERFORM contadores_notificaciones_sumar(OLD.usuario_id, -1);
+                END IF;
+                IF despues THEN
+                    PERFORM contadores_notificaciones_sumar(NEW.usuario_id, 1);
+                END IF;
+            ELSIF antes AND NOT despues THEN
+                PERFORM contadores_notificaciones_sumar(OLD.usuario_id, -1);
+            ELSIF despues AND NOT antes THEN
+                PERFORM contadores_notificaciones_sumar(NEW.usuario_id, 1);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_contadores_notificaciones
+        AFTER INSERT OR UPDATE OF leida, archivada, eliminado, usuario_id OR DELETE
+        ON notificaciones
+        FOR EACH ROW EXECUTE FUNCTION contadores_notificaciones_trigger()
+    """)
+
+    # Backfill desde las notificaciones actuales.
+    op.execute("""
+        INSERT INTO contadores_notificaciones (usuario_id, no_leidas)
+        SELECT usuario_id, COUNT(*)
+        FROM notificaciones
+        WHERE NOT leida AND NOT archivada AND NOT eliminado
+        GROUP BY usuario_id
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_contadores_notificaciones ON notificaciones")
+    op.execute("DROP FUNCTION IF EXISTS contadores_notificaciones_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS contadores_notificaciones_sumar(uuid, integer)")
+    op.drop_table("contadores_notificaciones")
@@ -0,0 +1,44 @@
+"""eventos_outbox: transactional outbox del event bus.
+
+Cola duradera de eventos de dominio escrita en la misma transacción que el
+cambio de negocio y despachada por `OutboxRelay` (SKIP LOCKED, reintentos con
+backoff y dead-letter en estado FALLIDO). Aditiva.
+
+Revision ID: obx1evt2rel3
+Revises: pag1soc2key3
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "obx1evt2rel3"
+down_revision = "pag1soc2key3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "eventos_outbox",
+        sa.Column("id", sa.Uuid(), primary_key=True),
+        sa.Column("tipo", sa.String(100), nullable=False),
+        sa.Column("payload", postgresql.JSONB(), nullable=False),
+        sa.Column("estado", sa.String(20), nullable=False, server_default="PENDIENTE"),
+        sa.Column("intentos", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("completados", postgresql.JSONB(), nullable=False,
+                  server_default=sa.text("'[]'::jsonb")),
+        sa.Column("disponible_en", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("creado_en", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("procesado_en", sa.DateTime(), nullable=True),
+        sa.Column("ultimo_error", sa.Text(), nullable=True),
+    )
+    op.create_index(
+        "ix_eventos_outbox_pendientes", "eventos_outbox", ["disponible_en"],
+        postgresql_where=sa.text("estado = 'PENDIENTE'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_eventos_outbox_pendientes", table_name="eventos_outbox")
+    op.drop_table("eventos_outbox")
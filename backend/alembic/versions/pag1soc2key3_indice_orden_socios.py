@@ -0,0 +1,29 @@
+"""contactos: índice de expresión para el orden del listado de socios.
+
+`sociosPaginados` pagina por cursor (keyset) sobre
+(lower(apellido1), lower(apellido2), lower(nombre)); con este índice cada página
+es un range scan en lugar de un sort del padrón completo. Aditiva.
+
+Revision ID: pag1soc2key3
+Revises: tag1etiq2civi3
+"""
+from alembic import op
+
+
+revision = "pag1soc2key3"
+down_revision = "tag1etiq2civi3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_contactos_orden_apellidos "
+        "ON contactos ("
+        "lower(coalesce(apellido1, '')), lower(coalesce(apellido2, '')), "
+        "lower(coalesce(nombre, '')), id)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_contactos_orden_apellidos")
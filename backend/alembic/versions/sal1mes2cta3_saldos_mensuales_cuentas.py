@@ -0,0 +1,139 @@
+"""saldos_mensuales_cuentas: instantáneas mensuales del debe/haber por cuenta.
+
+Acumula por (cuenta, ejercicio, mes) los apuntes de asientos CONFIRMADOS para
+que el balance y la cuenta de resultados sumen unas pocas filas por cuenta en
+lugar de todos los apuntes del ejercicio. La mantienen dos triggers:
+
+- AFTER UPDATE OF estado/fecha/ejercicio en asientos_contables: resta la
+  aportación del asiento si estaba confirmado y la suma si lo queda (confirmar,
+  anular o mover de mes un asiento confirmado).
+- AFTER INSERT/UPDATE/DELETE en apuntes_contables: si el asiento está
+  confirmado, ajusta el mes con la diferencia del apunte.
+
+Incluye backfill.
+
+Revision ID: sal1mes2cta3
+Revises: amb1cie2rre3
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "sal1mes2cta3"
+down_revision = "amb1cie2rre3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "saldos_mensuales_cuentas",
+        sa.Column("cuenta_id", sa.Uuid(),
+                  sa.ForeignKey("cuentas_contables.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("ejercicio", sa.Integer(), primary_key=True),
+        sa.Column("periodo", sa.Date(), primary_key=True),
+        sa.Column("debe", sa.Numeric(16, 2), nullable=False, server_default="0"),
+        sa.Column("haber", sa.Numeric(16, 2), nullable=False, server_default="0"),
+    )
+    op.create_index(
+        "ix_saldos_mensuales_cuentas_ejercicio_periodo",
+        "saldos_mensuales_cuentas", ["ejercicio", "periodo"],
+    )
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION saldos_mensuales_cuentas_sumar(
+            p_cuenta_id uuid, p_ejercicio integer, p_fecha date, p_debe numeric, p_haber numeric
+        ) RETURNS void AS $$
+        BEGIN
+            INSERT INTO saldos_mensuales_cuentas (cuenta_id, ejercicio, periodo, debe, haber)
+            VALUES (p_cuenta_id, p_ejercicio, date_trunc('month', p_fecha)::date, p_debe, p_haber)
+            ON CONFLICT (cuenta_id, ejercicio, periodo) DO UPDATE
+            SET debe = saldos_mensuales_cuentas.debe + EXCLUDED.debe,
+                haber = saldos_mensuales_cuentas.haber + EXCLUDED.haber;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION saldos_mensuales_cuentas_asiento() RETURNS trigger AS $$
+        DECLARE
+            ap RECORD;
+        BEGIN
+            FOR ap IN
+                SELECT cuenta_id, SUM(debe) AS debe, SUM(haber) AS haber
+                FROM apuntes_contables WHERE asiento_id = NEW.id GROUP BY cuenta_id
+            LOOP
+                IF OLD.estado::text = 'CONFIRMADO' THEN
+                    PERFORM saldos_mensuales_cuentas_sumar(
+                        ap.cuenta_id, OLD.ejercicio, OLD.fecha, -ap.debe, -ap.haber);
+                END IF;
+                IF NEW.estado::text = 'CONFIRMADO' THEN
+                    PERFORM saldos_mensuales_cuentas_sumar(
+                        ap.cuenta_id, NEW.ejercicio, NEW.fecha, ap.debe, ap.haber);
+                END IF;
+            END LOOP;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION saldos_mensuales_cuentas_apunte() RETURNS trigger AS $$
+        DECLARE
+            a RECORD;
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                SELECT ejercicio, fecha, estado::text AS estado INTO a
+                FROM asientos_contables WHERE id = OLD.asiento_id;
+                IF a.estado = 'CONFIRMADO' THEN
+                    PERFORM saldos_mensuales_cuentas_sumar(
+                        OLD.cuenta_id, a.ejercicio, a.fecha, -OLD.debe, -OLD.haber);
+                END IF;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                SELECT ejercicio, fecha, estado::text AS estado INTO a
+                FROM asientos_contables WHERE id = NEW.asiento_id;
+                IF a.estado = 'CONFIRMADO' THEN
+                    PERFORM saldos_mensuales_cuentas_sumar(
+                        NEW.cuenta_id, a.ejercicio, a.fecha, NEW.debe, NEW.haber);
+                END IF;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_saldos_mensuales_cuentas_asiento
+        AFTER UPDATE OF estado, fecha, ejercicio ON asientos_contables
+        FOR EACH ROW
+        WHEN ((OLD.estado::text = 'CONFIRMADO' OR NEW.estado::text = 'CONFIRMADO')
+              AND (OLD.estado IS DISTINCT FROM NEW.estado
+                   OR OLD.fecha IS DISTINCT FROM NEW.fecha
+                   OR OLD.ejercicio IS DISTINCT FROM NEW.ejercicio))
+        EXECUTE FUNCTION saldos_mensuales_cuentas_asiento()
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_saldos_mensuales_cuentas_apunte
+        AFTER INSERT OR UPDATE OF cuenta_id, debe, haber, asiento_id OR DELETE ON apuntes_contables
+        FOR EACH ROW EXECUTE FUNCTION saldos_mensuales_cuentas_apunte()
+    """)
+
+    # Backfill desde los asientos confirmados actuales.
+    op.execute("""
+        INSERT INTO saldos_mensuales_cuentas (cuenta_id, ejercicio, periodo, debe, haber)
+        SELECT ap.cuenta_id, a.ejercicio, date_trunc('month', a.fecha)::date,
+               SUM(ap.debe), SUM(ap.haber)
+        FROM apuntes_contables ap
+        JOIN asientos_contables a ON a.id = ap.asiento_id
+        WHERE a.estado::text = 'CONFIRMADO'
+        GROUP BY ap.cuenta_id, a.ejercicio, date_trunc('month', a.fecha)::date
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_saldos_mensuales_cuentas_apunte ON apuntes_contables")
+    op.execute("DROP TRIGGER IF EXISTS trg_saldos_mensuales_cuentas_asiento ON asientos_contables")
+    op.execute("DROP FUNCTION IF EXISTS saldos_mensuales_cuentas_apunte()")
+    op.execute("DROP FUNCTION IF EXISTS saldos_mensuales_cuentas_asiento()")
+    op.execute("DROP FUNCTION IF EXISTS saldos_mensuales_cuentas_sumar(uuid, integer, date, numeric, numeric)")
+    op.drop_index("ix_saldos_mensuales_cuentas_ejercicio_periodo",
+                  table_name="saldos_mensuales_cuentas")
+    op.drop_table("saldos_mensuales_cuentas")
@@ -0,0 +1,70 @@
+"""saldos_mensuales_cuentas: restar el asiento confirmado que se borra.
+
+`apuntes_contables.asiento_id` es ON DELETE CASCADE: al borrar un asiento
+confirmado, sus apuntes se borran en cascada DESPUÉS que el asiento, y el
+trigger de apuntes (sal1mes2cta3) ya no encuentra el padre, así que no restaba
+nada y la instantánea seguía sumando el asiento borrado.
+
+- BEFORE DELETE en asientos_contables (solo si está CONFIRMADO): resta la
+  aportación de los apuntes que aún tenga. Los borrados en cascada posteriores
+  no restan otra vez (ya no hay padre); si el ORM borró antes los apuntes, los
+  restó el trigger de apuntes y aquí no queda nada.
+- Reconstruye todas las instantáneas para corregir la deriva acumulada (mismo
+  backfill que sal1mes2cta3). Para reparar un ejercicio después:
+  `python -m app.scripts.recalcular_saldos_mensuales`.
+
+Revision ID: sal2bor3asi4
+Revises: lcd1cer2zip3
+"""
+from alembic import op
+
+
+revision = "sal2bor3asi4"
+down_revision = "lcd1cer2zip3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION saldos_mensuales_cuentas_asiento_borrado() RETURNS trigger AS $$
+        DECLARE
+            ap RECORD;
+        BEGIN
+            FOR ap IN
+                SELECT cuenta_id, SUM(debe) AS debe, SUM(haber) AS haber
+                FROM apuntes_contables WHERE asiento_id = OLD.id GROUP BY cuenta_id
+            LOOP
+                PERFORM saldos_mensuales_cuentas_sumar(
+                    ap.cuenta_id, OLD.ejercicio, OLD.fecha, -ap.debe, -ap.haber);
+            END LOOP;
+            RETURN OLD;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_saldos_mensuales_cuentas_asiento_borrado
+        BEFORE DELETE ON asientos_contables
+        FOR EACH ROW
+        WHEN (OLD.estado::text = 'CONFIRMADO')
+        EXECUTE FUNCTION saldos_mensuales_cuentas_asiento_borrado()
+    """)
+
+    # Reconstrucción: las instantáneas pueden arrastrar asientos ya borrados.
+    op.execute("DELETE FROM saldos_mensuales_cuentas")
+    op.execute("""
+        INSERT INTO saldos_mensuales_cuentas (cuenta_id, ejercicio, periodo, debe, haber)
+        SELECT ap.cuenta_id, a.ejercicio, date_trunc('month', a.fecha)::date,
+               SUM(ap.debe), SUM(ap.haber)
+        FROM apuntes_contables ap
+        JOIN asientos_contables a ON a.id = ap.asiento_id
+        WHERE a.estado::text = 'CONFIRMADO'
+        GROUP BY ap.cuenta_id, a.ejercicio, date_trunc('month', a.fecha)::date
+    """)
+
+
+def downgrade() -> None:
+    op.execute(
+        "DROP TRIGGER IF EXISTS trg_saldos_mensuales_cuentas_asiento_borrado ON asientos_contables"
+    )
+    op.execute("DROP FUNCTION IF EXISTS saldos_mensuales_cuentas_asiento_borrado()")
@@ -0,0 +1,41 @@
+"""trabajos_envio: progreso persistido de los envíos masivos en segundo plano.
+
+El registro de trabajos era por proceso: con varios workers, la consulta de
+progreso caía en otro worker y no encontraba el trabajo. Ahora el worker que
+ejecuta el envío vuelca su progreso aquí y cualquiera lo lee
+(app/core/email_service.py). Aditiva.
+
+Revision ID: tev1prg2env3
+Revises: bli1ndx2cif3
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "tev1prg2env3"
+down_revision = "bli1ndx2cif3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "trabajos_envio",
+        sa.Column("id", sa.Uuid(), primary_key=True),
+        sa.Column("usuario_id", sa.Uuid(), nullable=True),
+        sa.Column("estado", sa.String(20), nullable=False, server_default="EN_CURSO"),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("enviados", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("fallidos", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("resultados", postgresql.JSONB(), nullable=False,
+                  server_default=sa.text("'[]'::jsonb")),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("creado_en", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("actualizado_en", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("terminado_en", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("trabajos_envio")
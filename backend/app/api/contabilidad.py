@@ -0,0 +1,110 @@
+"""Endpoints REST de descarga de los libros contables.
+
+GET /api/contabilidad/libro-diario/{ejercicio}?formato=csv|xlsx
+GET /api/contabilidad/libro-mayor/{ejercicio}?formato=csv|xlsx&cuenta_id=...
+  → Libro Diario / Libro Mayor del ejercicio (asientos CONFIRMADOS).
+    Requiere ECO_CIERRE_CONSULTAR.
+
+Igual que la exportación del padrón: el CSV se emite en streaming conforme se
+leen los lotes del cursor de servidor; el XLSX se compone en un fichero
+temporal (openpyxl write_only) y se sirve desde disco. La lectura va al engine
+de solo lectura.
+"""
+import os
+import tempfile
+from typing import Literal, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Header
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import select
+from starlette.background import BackgroundTask
+
+from app.api.permisos import comprobar_permiso
+from app.core.database import async_read_session
+from app.modules.configuracion.models.configuracion import Configuracion
+from app.modules.economico.services.pdf.libro_diario import (
+    csv_en_trozos,
+    escribir_xlsx,
+    filas_libro_diario,
+    filas_libro_mayor,
+)
+
+router = APIRouter(prefix="/api/contabilidad", tags=["contabilidad"])
+
+_PERMISO = "ECO_CIERRE_CONSULTAR"
+_MEDIA_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+_RESPUESTAS = {200: {"content": {"text/csv": {}, _MEDIA_XLSX: {}}}}
+
+
+async def _nombre_organizacion(session) -> str:
+    r = await session.execute(
+        select(Configuracion.valor).where(Configuracion.clave == "org.nombre")
+    )
+    return r.scalar_one_or_none() or "Organización"
+
+
+async def _descargar(authorization: Optional[str], formato: str, nombre: str, hoja: str, filas):
+    """`filas(session, organizacion_nombre)` produce las filas del libro."""
+    async with async_read_session() as session:
+        await comprobar_permiso(session, authorization, _PERMISO)
+        organizacion = await _nombre_organizacion(session)
+
+    if formato == "csv":
+        async def _flujo():
+            # Sesión propia: vive lo que dure el envío del cuerpo.
+            async with async_read_session() as session:
+                async for trozo in csv_en_trozos(filas(session, organizacion)):
+                    yield trozo
+
+        return StreamingResponse(
+            _flujo(),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": f'attachment; filename="{nombre}.csv"'},
+        )
+
+    fd, ruta = tempfile.mkstemp(prefix="siga_libro_", suffix=".xlsx")
+    os.close(fd)
+    try:
+        async with async_read_session() as session:
+            await escribir_xlsx(filas(session, organizacion), ruta, hoja)
+    except BaseException:
+        os.unlink(ruta)
+        raise
+    return FileResponse(
+        ruta, media_type=_MEDIA_XLSX, filename=f"{nombre}.xlsx",
+        background=BackgroundTask(os.unlink, ruta),
+    )
+
+
+@router.get(
+    "/libro-diario/{ejercicio}",
+    responses=_RESPUESTAS,
+    summary="Descarga el Libro Diario del ejercicio en CSV o XLSX",
+)
+async def descargar_libro_diario(
+    ejercicio: int,
+    formato: Literal["csv", "xlsx"] = "csv",
+    authorization: Optional[str] = Header(None),
+):
+    return await _descargar(
+        authorization, formato, f"libro_diario_{ejercicio}", "Libro Diario",
+        lambda session, org: filas_libro_diario(session, ejercicio, org),
+    )
+
+
+@router.get(
+    "/libro-mayor/{ejercicio}",
+    responses=_RESPUESTAS,
+    summary="Descarga el Libro Mayor del ejercicio (o de una cuenta) en CSV o XLSX",
+)
+async def descargar_libro_mayor(
+    ejercicio: int,
+    formato: Literal["csv", "xlsx"] = "csv",
+    cuenta_id: Optional[UUID] = None,
+    authorization: Optional[str] = Header(None),
+):
+    return await _descargar(
+        authorization, formato, f"libro_mayor_{ejercicio}", "Libro Mayor",
+        lambda session, org: filas_libro_mayor(session, ejercicio, org, cuenta_id),
+    )
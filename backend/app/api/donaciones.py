@@ -0,0 +1,96 @@
+"""Endpoints REST de emisión masiva de certificados de donación.
+
+POST /api/donaciones/certificados/{ejercicio}?solo_pendientes=true
+  → Pide la emisión de los certificados anuales (Ley 49/2002) de todos los
+    donantes del ejercicio. Responde 202 con el lote; el trabajo lo ejecuta el
+    outbox en segundo plano (`certificados_lote_service.py`).
+GET  /api/donaciones/certificados/lotes/{lote_id}
+  → Estado del lote (PENDIENTE | EN_CURSO | COMPLETADO | ERROR).
+GET  /api/donaciones/certificados/lotes/{lote_id}/zip
+  → ZIP con los certificados del lote, cuando está COMPLETADO.
+
+Todos requieren ECO_DONACION_EMITIR_CERTIFICADO. La numeración se confirma una
+sola vez por lote: si el renderizado falla, el reintento regenera los mismos
+números, y pedir de nuevo los ya emitidos (`solo_pendientes=false`) conserva
+los suyos.
+"""
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import FileResponse
+
+from app.api.permisos import comprobar_permiso
+from app.core.database import async_session
+from app.modules.economico.models.donaciones import LoteCertificadosDonacion
+from app.modules.economico.services.certificados_lote_service import solicitar_lote
+
+router = APIRouter(prefix="/api/donaciones", tags=["donaciones"])
+
+_PERMISO = "ECO_DONACION_EMITIR_CERTIFICADO"
+
+
+def _estado_lote(lote: LoteCertificadosDonacion) -> dict:
+    return {
+        "lote_id": str(lote.id),
+        "ejercicio": lote.ejercicio,
+        "estado": lote.estado,
+        "total": lote.total,
+        "error": lote.error,
+        "omitidos": lote.omitidos or [],
+    }
+
+
+async def _lote(session, lote_id: str) -> LoteCertificadosDonacion:
+    try:
+        clave = uuid.UUID(lote_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Lote no encontrado")
+    lote = await session.get(LoteCertificadosDonacion, clave)
+    if lote is None:
+        raise HTTPException(status_code=404, detail="Lote no encontrado")
+    return lote
+
+
+@router.post(
+    "/certificados/{ejercicio}",
+    status_code=202,
+    summary="Pide la emisión en bloque de los certificados de donación del ejercicio",
+)
+async def emitir_certificados_ejercicio(
+    ejercicio: int,
+    solo_pendientes: bool = True,
+    authorization: Optional[str] = Header(None),
+):
+    async with async_session() as session:
+        user = await comprobar_permiso(session, authorization, _PERMISO)
+        lote = solicitar_lote(session, ejercicio, solo_pendientes, usuario_id=user.id)
+        await session.commit()
+        return _estado_lote(lote)
+
+
+@router.get("/certificados/lotes/{lote_id}", summary="Estado de un lote de certificados")
+async def estado_lote_certificados(lote_id: str, authorization: Optional[str] = Header(None)):
+    async with async_session() as session:
+        await comprobar_permiso(session, authorization, _PERMISO)
+        return _estado_lote(await _lote(session, lote_id))
+
+
+@router.get(
+    "/certificados/lotes/{lote_id}/zip",
+    responses={200: {"content": {"application/zip": {}}}},
+    summary="ZIP con los certificados de un lote completado",
+)
+async def descargar_lote_certificados(lote_id: str, authorization: Optional[str] = Header(None)):
+    async with async_session() as session:
+        await comprobar_permiso(session, authorization, _PERMISO)
+        lote = await _lote(session, lote_id)
+    if lote.estado != "COMPLETADO":
+        raise HTTPException(status_code=409, detail=f"El lote está {lote.estado}")
+    if not lote.ruta_zip or not Path(lote.ruta_zip).exists():
+        raise HTTPException(status_code=404, detail=f"No hay certificados que emitir en {lote.ejercicio}.")
+    return FileResponse(
+        lote.ruta_zip, media_type="application/zip",
+        filename=f"certificados-{lote.ejercicio}.zip",
+    )
@@ -0,0 +1,89 @@
+"""Endpoint REST de exportación del padrón de miembros.
+
+POST /api/miembros/exportar
+  → Descarga XLSX o CSV de los miembros indicados (`ids`) o, si no se indican,
+    de todos los socios que cumplan los filtros. Requiere MEMBRESIA_MIEMBRO_EXPORTAR
+    y se limita al ámbito territorial de quien exporta (`raices_en_ambito`).
+
+El CSV se emite en streaming conforme se leen los lotes; el XLSX se compone en
+un fichero temporal (openpyxl write_only) y se sirve desde disco. En ambos casos
+la memoria es acotada con independencia del tamaño del padrón. La lectura va al
+engine de solo lectura.
+"""
+import os
+import tempfile
+from datetime import date
+from typing import List, Literal, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+
+from app.api.permisos import comprobar_permiso
+from app.core.database import async_read_session
+from app.modules.acceso.services.ambito_territorial import raices_en_ambito
+from app.modules.membresia.services.exportacion_service import ExportacionMiembrosService
+
+router = APIRouter(prefix="/api/miembros", tags=["miembros"])
+
+_PERMISO_EXPORTAR = "MEMBRESIA_MIEMBRO_EXPORTAR"
+_MEDIA_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+class ExportarMiembrosRequest(BaseModel):
+    formato: Literal["xlsx", "csv"] = "xlsx"
+    ids: Optional[List[UUID]] = None
+    agrupacion_id: Optional[UUID] = None
+    activo: Optional[bool] = None
+    texto: Optional[str] = None
+
+
+@router.post(
+    "/exportar",
+    responses={200: {"content": {_MEDIA_XLSX: {}, "text/csv": {}}}},
+    summary="Exporta el padrón de miembros a XLSX o CSV",
+)
+async def exportar_miembros(
+    body: ExportarMiembrosRequest,
+    authorization: Optional[str] = Header(None),
+):
+    if body.ids is not None and not body.ids:
+        raise HTTPException(status_code=400, detail="No hay miembros que exportar.")
+    filtros = dict(
+        ids=body.ids, agrupacion_id=body.agrupacion_id, activo=body.activo, texto=body.texto,
+    )
+    nombre = f"socios_{date.today().isoformat()}.{body.formato}"
+
+    if body.formato == "csv":
+        async with async_read_session() as session:
+            user = await comprobar_permiso(session, authorization, _PERMISO_EXPORTAR)
+            filtros["ambito"] = await raices_en_ambito(session, user.id)
+
+        async def _flujo():
+            # Sesión propia: vive lo que dure el envío del cuerpo.
+            async with async_read_session() as session:
+                async for trozo in ExportacionMiembrosService(session).exportar_csv(**filtros):
+                    yield trozo
+
+        return StreamingResponse(
+            _flujo(),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": f'attachment; filename="{nombre}"'},
+        )
+
+    fd, ruta = tempfile.mkstemp(prefix="siga_export_", suffix=".xlsx")
+    os.close(fd)
+    try:
+        async with async_read_session() as session:
+            user = await comprobar_permiso(session, authorization, _PERMISO_EXPORTAR)
+            filtros["ambito"] = await raices_en_ambito(session, user.id)
+            await ExportacionMiembrosService(session).exportar_xlsx(ruta, **filtros)
+    except BaseException:
+        os.unlink(ruta)
+        raise
+    return FileResponse(
+        ruta, media_type=_MEDIA_XLSX, filename=nombre,
+        background=BackgroundTask(os.unlink, ruta),
+    )
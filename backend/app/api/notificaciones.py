@@ -0,0 +1,69 @@
+"""Endpoint SSE del contador de notificaciones no leídas.
+
+GET /api/notificaciones/stream
+  → Flujo `text/event-stream` con un evento `no_leidas` al abrirse y otro cada
+    vez que cambia el contador del usuario autenticado (ver
+    app/core/push_notificaciones.py). Sustituye al sondeo periódico del badge.
+
+El navegador lo consume con `fetch` (para poder mandar el bearer token) y
+reconecta al cerrarse. La sesión de BD solo se usa para autenticar: el flujo
+no retiene conexión del pool mientras está abierto. 503 si este worker no
+tiene la escucha de Postgres activa (el frontend vuelve entonces a sondear).
+"""
+import json
+import time
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.database import async_session
+from app.core.push_notificaciones import hub_notificaciones
+from app.core.security import extract_bearer_token, load_user_from_token
+
+router = APIRouter(prefix="/api/notificaciones", tags=["notificaciones"])
+
+# Comentario SSE cada tantos segundos para que proxies y navegador no corten.
+KEEPALIVE_SEGUNDOS = 25.0
+# Vida máxima de un flujo: al reconectar se vuelve a validar el token.
+DURACION_MAXIMA_SEGUNDOS = 30 * 60
+
+
+def _evento(no_leidas: int) -> bytes:
+    return f"event: no_leidas\ndata: {json.dumps({'no_leidas': no_leidas})}\n\n".encode()
+
+
+@router.get(
+    "/stream",
+    responses={200: {"content": {"text/event-stream": {}}}},
+    summary="Contador de notificaciones no leídas en tiempo real (SSE)",
+)
+async def stream_no_leidas(request: Request, authorization: Optional[str] = Header(None)):
+    token = extract_bearer_token(authorization)
+    if not token:
+        raise HTTPException(status_code=401, detail="No autenticado")
+    async with async_session() as session:
+        user = await load_user_from_token(session, token)
+    if not user:
+        raise HTTPException(status_code=401, detail="Token inválido")
+    if not hub_notificaciones.activo:
+        raise HTTPException(status_code=503, detail="Push de notificaciones no disponible")
+    usuario_id = str(user.id)
+
+    async def _flujo():
+        fin = time.monotonic() + DURACION_MAXIMA_SEGUNDOS
+        async with hub_notificaciones.suscripcion(usuario_id) as sub:
+            yield b"retry: 5000\n\n"
+            contadores = await hub_notificaciones.leer_contadores([usuario_id])
+            yield _evento(contadores[usuario_id])
+            while time.monotonic() < fin and not await request.is_disconnected():
+                valor = await sub.siguiente(timeout=KEEPALIVE_SEGUNDOS)
+                if sub.cerrada:
+                    break
+                yield _evento(valor) if valor is not None else b": keepalive\n\n"
+
+    return StreamingResponse(
+        _flujo(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
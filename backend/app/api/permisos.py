@@ -0,0 +1,34 @@
+"""Comprobación de permisos para los endpoints REST.
+
+Los resolvers GraphQL usan `RequireTransaction`; los endpoints REST (descargas
+en streaming) resuelven aquí el usuario del bearer token y consultan la misma
+matriz de permisos en memoria.
+"""
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.core.security import extract_bearer_token, load_user_from_token
+from app.modules.acceso.models.usuario import UsuarioRol
+from app.modules.acceso.services.matrix import matrix_cache
+
+
+async def comprobar_permiso(session, authorization: Optional[str], codigo: str):
+    """Usuario del token; 401 si no hay usuario válido, 403 si sus roles no tienen la transacción."""
+    token = extract_bearer_token(authorization)
+    if not token:
+        raise HTTPException(status_code=401, detail="No autenticado")
+    user = await load_user_from_token(session, token)
+    if not user:
+        raise HTTPException(status_code=401, detail="Token inválido")
+    role_ids = frozenset(str(r[0]) for r in (await session.execute(
+        select(UsuarioRol.rol_id).where(
+            UsuarioRol.usuario_id == user.id,
+            UsuarioRol.activo == True,  # noqa: E712
+            UsuarioRol.eliminado == False,  # noqa: E712
+        )
+    )).all())
+    if not (matrix_cache.is_ready() and matrix_cache.can(role_ids, codigo)):
+        raise HTTPException(status_code=403, detail="Permiso denegado")
+    return user
@@ -2,14 +2,23 @@
 
 GET /api/recibos/cuota/{cuota_id}   → PDF recibo cuota anual
 GET /api/recibos/apunte/{apunte_id} → PDF justificante de movimiento
+GET /api/recibos/cuotas/{ejercicio} → ZIP con los recibos de las cuotas pagadas
+                                      del ejercicio (requiere ECO_CUOTA_LISTAR)
+
+La conversión a PDF se hace en el pool de renderizado (`pdf/render.py`), no en
+el event loop. El ZIP se emite en streaming conforme se renderiza cada recibo.
 """
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import Response, StreamingResponse
 
+from app.api.permisos import comprobar_permiso
+from app.core.database import async_read_session
 from app.core.database import get_db as get_async_session
-from app.modules.economico.services.pdf.recibo_service import ReciboService
+from app.modules.economico.services.pdf.recibo_service import ReciboService, html_a_pdf
+from app.modules.economico.services.pdf.render import renderizar_lote, zip_en_flujo
 
 router = APIRouter(prefix="/api/recibos", tags=["recibos"])
 
@@ -64,3 +73,29 @@ async def descargar_recibo_apunte(
         media_type="application/pdf",
         headers={"Content-Disposition": f"attachment; filename=movimiento-{apunte_id}.pdf"},
     )
+
+
+@router.get(
+    "/cuotas/{ejercicio}",
+    responses={200: {"content": {"application/zip": {}}}},
+    summary="ZIP con los recibos PDF de las cuotas pagadas del ejercicio",
+)
+async def descargar_recibos_cuotas(
+    ejercicio: int,
+    authorization: Optional[str] = Header(None),
+):
+    async with async_read_session() as session:
+        await comprobar_permiso(session, authorization, "ECO_CUOTA_LISTAR")
+
+    async def _flujo():
+        # Sesión propia: vive lo que dure el envío del cuerpo.
+        async with async_read_session() as session:
+            trabajos = ReciboService(session).recibos_cuotas_ejercicio(ejercicio)
+            async for trozo in zip_en_flujo(renderizar_lote(html_a_pdf, trabajos)):
+                yield trozo
+
+    return StreamingResponse(
+        _flujo(),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="recibos-cuotas-{ejercicio}.zip"'},
+    )
@@ -5,12 +5,17 @@ GET /api/remesas/{remesa_id}/sepa-xml
 
 Los datos del acreedor (nombre, IBAN, BIC, identificador SEPA) se leen
 de los parámetros de configuración de la organización.
+
+El fichero se emite en streaming: la remesa y el acreedor se validan antes de
+responder (404 si fallan) y las órdenes se escriben conforme las lee un cursor
+de servidor, con memoria constante sea cual sea el tamaño de la remesa. Los
+totales y las órdenes se leen en una sola transacción REPEATABLE READ.
 """
 import re
 from uuid import UUID
 
 from fastapi import APIRouter, Header, HTTPException
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from typing import Optional
 
 from app.core.database import async_session
@@ -53,21 +58,37 @@ async def descargar_sepa_xml(
         bic          = await _cfg(session, "org.sepa_bic", "XXXXXXXXXXXXX")
         creditor_id  = await _cfg(session, "org.sepa_creditor_id", "ES00ZZZ00000000")
 
-        service = RemesaService(session)
+    # Totales de los bloques y órdenes en la MISMA transacción REPEATABLE READ:
+    # las cabeceras (NbOfTxs/CtrlSum) corresponden a los adeudos que se escriben
+    # aunque la remesa cambie mientras se envía. La sesión vive lo que dure el
+    # envío del cuerpo.
+    sesion_xml = async_session()
+    try:
+        await sesion_xml.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        documento = await RemesaService(sesion_xml).preparar_xml_sepa(
+            remesa_id=remesa_id,
+            creditor_name=nombre,
+            creditor_iban=iban,
+            creditor_bic=bic,
+            creditor_id=creditor_id,
+        )
+    except ValueError as e:
+        await sesion_xml.close()
+        raise HTTPException(status_code=404, detail=str(e))
+    except BaseException:
+        await sesion_xml.close()
+        raise
+
+    async def _flujo():
         try:
-            xml_bytes = await service.generar_xml_sepa(
-                remesa_id=remesa_id,
-                creditor_name=nombre,
-                creditor_iban=iban,
-                creditor_bic=bic,
-                creditor_id=creditor_id,
-            )
-        except ValueError as e:
-            raise HTTPException(status_code=404, detail=str(e))
+            async for trozo in RemesaService(sesion_xml).escribir_xml_sepa(documento):
+                yield trozo
+        finally:
+            await sesion_xml.close()
 
-        filename = f"remesa_{str(remesa_id)[:8]}.xml"
-        return Response(
-            content=xml_bytes,
-            media_type="application/xml",
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-        )
+    filename = f"remesa_{str(remesa_id)[:8]}.xml"
+    return StreamingResponse(
+        _flujo(),
+        media_type="application/xml",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
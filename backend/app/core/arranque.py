@@ -0,0 +1,90 @@
+"""Trabajo de arranque que debe hacerse una sola vez, no una por worker.
+
+Con varios workers (`uvicorn --workers N`, ver WEB_CONCURRENCY) y varias
+réplicas, cada proceso ejecuta el lifespan de FastAPI. La sincronización de
+catálogos declarados en código (CatalogSyncService) y el re-enlace de
+SUPERADMIN y de los roles funcionales escriben en las mismas tablas: si los N
+procesos lo hacen a la vez chocan en las restricciones únicas.
+
+`ejecutar_tareas_unicas` serializa ese trabajo con un advisory lock de
+Postgres ligado a la transacción (se libera solo al hacer commit/rollback):
+
+- El proceso que obtiene el cerrojo sincroniza y confirma.
+- Los que llegan mientras tanto esperan a que termine y no repiten el trabajo:
+  al soltar el cerrojo el estado ya está en la BD y solo tienen que cargarlo
+  (PermissionMatrix, cachés).
+
+En producción lo invoca `bootstrap` en el CMD del Dockerfile, una vez por
+contenedor y antes de arrancar los workers, y el lifespan se lo salta
+(`SINCRONIZAR_CATALOGOS_AL_ARRANCAR=false`). En desarrollo, con un solo
+proceso, lo sigue haciendo el lifespan.
+"""
+import importlib
+import logging
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Clave del advisory lock de arranque (bigint arbitrario, fijo para SIGA).
+CERROJO_ARRANQUE = 0x51_6A_41_72_72_71
+
+
+def importar_catalogos() -> None:
+    """Importa los catalog.py de cada módulo para que se auto-registren."""
+    from app.modules.acceso import catalog as _acceso_catalog  # noqa: F401  registro side-effect
+
+    for modulo in (
+        "membresia", "actividades", "economico", "configuracion",
+        "proteccion_datos", "secretaria", "presidencia",
+    ):
+        try:
+            importlib.import_module(f"app.modules.{modulo}.catalog")
+        except ImportError:
+            pass
+
+
+async def tareas_unicas(session: AsyncSession) -> None:
+    """Catálogos de código → BD y re-enlace de SUPERADMIN y roles funcionales.
+
+    No hace commit: lo hace quien tiene el cerrojo.
+    """
+    from app.modules.acceso.services.catalog_sync import CatalogSyncService
+    from app.scripts.bootstrap import (
+        sync_roles_funcionales_catalog,
+        sync_superadmin_all_transactions,
+    )
+
+    importar_catalogos()
+    # Con la huella del catálogo sin cambios, sync() no escribe nada. Los
+    # re-enlaces de abajo son de conjunto (pocas consultas) y se hacen siempre.
+    await CatalogSyncService(session).sync()
+    # Enlazar SUPERADMIN con las transacciones añadidas por catalog.py
+    await sync_superadmin_all_transactions(session)
+    # Re-enlazar roles funcionales con transacciones de catalog.py
+    await sync_roles_funcionales_catalog(session)
+
+
+async def ejecutar_tareas_unicas(session_factory) -> bool:
+    """Ejecuta `tareas_unicas` bajo el advisory lock de arranque.
+
+    Devuelve True si este proceso hizo el trabajo y False si otro lo estaba
+    haciendo (se espera a que termine y no se repite).
+    """
+    async with session_factory() as session:
+        try:
+            obtenido = await session.scalar(
+                select(func.pg_try_advisory_xact_lock(CERROJO_ARRANQUE))
+            )
+            if not obtenido:
+                logger.info("Arranque en curso en otro proceso; esperando a que termine")
+                await session.execute(select(func.pg_advisory_xact_lock(CERROJO_ARRANQUE)))
+                await session.rollback()
+                return False
+            await tareas_unicas(session)
+            await session.commit()
+            return True
+        except Exception:
+            await session.rollback()
+            raise
@@ -0,0 +1,16 @@
+"""Búsqueda libre por texto: patrones LIKE seguros."""
+
+# Carácter de escape de los patrones LIKE de búsqueda libre.
+ESCAPE_LIKE = "\\"
+
+
+def patron_contiene(texto: str) -> str:
+    """Patrón LIKE «contiene `texto`» (en minúsculas) con `%`, `_` y `\\` escapados.
+
+    Usar con `.like(patron, escape=ESCAPE_LIKE)`: así «50%» o «a_b» buscan el
+    texto literal en lugar de actuar como comodines.
+    """
+    literal = texto.strip().lower()
+    for especial in (ESCAPE_LIKE, "%", "_"):
+        literal = literal.replace(especial, ESCAPE_LIKE + especial)
+    return f"%{literal}%"
@@ -0,0 +1,191 @@
+"""Opciones de carga de relaciones ORM según la forma de cada consulta.
+
+Las relaciones de los modelos son perezosas (`lazy="select"`): un `select(Modelo)`
+trae solo sus columnas y nada que el llamador no vaya a leer. Quien necesita
+relaciones las declara en la propia consulta:
+
+- Servicios: `cargar(Modelo, "ruta", "ruta.anidada", ...)` devuelve las opciones
+  para `.options(...)`. Las colecciones se cargan con `selectinload` (una consulta
+  por nivel) y las muchos-a-uno con `joinedload` (en el mismo SELECT).
+- Resolvers GraphQL: `cargar_seleccion(Modelo, info)` deriva esas rutas del
+  selection set que ha pedido el cliente.
+
+Con AsyncSession una carga perezosa no declarada falla siempre (MissingGreenlet);
+en dev (`SIGA_ENV=dev`) o con `DB_RAISE_ON_LAZY=true` se instala además
+`raiseload("*")` en toda consulta ORM, de modo que el error nombra la relación
+olvidada y aparece también en scripts síncronos. `contar_sentencias` mide cuántas
+sentencias emite un bloque (benchmark `app.scripts.benchmark_cargas` y tests).
+"""
+from __future__ import annotations
+
+import re
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, TypeVar
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, joinedload, raiseload, selectinload
+from sqlalchemy.orm.strategy_options import _AbstractLoad
+from strawberry import Info
+from strawberry.types.nodes import SelectedField, Selection
+
+
+M = TypeVar("M")
+
+
+def _estrategia(coleccion: bool):
+    return selectinload if coleccion else joinedload
+
+
+def cargar(modelo: type, *rutas: str) -> list[_AbstractLoad]:
+    """Opciones de carga para las rutas de relaciones indicadas.
+
+    Cada ruta es una cadena de nombres de relación separados por puntos, p. ej.
+    `cargar(Recibo, "vinculacion_socio.contacto", "vinculacion_socio.socio")`.
+    Lanza ValueError si algún tramo no es una relación del modelo.
+    """
+    opciones: list[_AbstractLoad] = []
+    for ruta in rutas:
+        mapper = inspect(modelo)
+        opcion = None
+        for nombre in ruta.split("."):
+            rel = mapper.relationships.get(nombre)
+            if rel is None:
+                raise ValueError(f"{mapper.class_.__name__} no tiene la relación '{nombre}'")
+            estrategia = _estrategia(rel.uselist)
+            atributo = getattr(mapper.class_, nombre)
+            opcion = (
+                estrategia(atributo) if opcion is None
+                else getattr(opcion, estrategia.__name__)(atributo)
+            )
+            mapper = rel.mapper
+        if opcion is not None:
+            opciones.append(opcion)
+    return opciones
+
+
+_CAMEL = re.compile(r"(?<!^)(?=[A-Z])")
+
+
+def _snake(nombre: str) -> str:
+    return _CAMEL.sub("_", nombre).lower()
+
+
+def _campos(selecciones: Iterable[Selection]) -> Iterator[SelectedField]:
+    """Aplana fragmentos (`...on X`, `...Fragmento`) de un selection set."""
+    for sel in selecciones:
+        if isinstance(sel, SelectedField):
+            yield sel
+        else:
+            yield from _campos(sel.selections)
+
+
+def _hijos(selecciones: Iterable[Selection], nombre: str | None = None) -> list[Selection]:
+    """Sub-selecciones de los campos (solo las del campo `nombre` si se indica)."""
+    return [
+        sub
+        for campo in _campos(selecciones)
+        if nombre is None or _snake(campo.name) == nombre
+        for sub in campo.selections
+    ]
+
+
+def rutas_seleccion(modelo: type, selecciones: Iterable[Selection], prefijo: str = "") -> list[str]:
+    """Rutas de relaciones de `modelo` alcanzadas por un selection set.
+
+    Los campos se casan por nombre (camelCase de GraphQL → snake_case del modelo);
+    los que no son relaciones (columnas, campos calculados) se ignoran.
+    """
+    mapper = inspect(modelo)
+    rutas: list[str] = []
+    for campo in _campos(selecciones):
+        nombre = _snake(campo.name)
+        rel = mapper.relationships.get(nombre)
+        if rel is None:
+            continue
+        ruta = f"{prefijo}{nombre}"
+        anidadas = rutas_seleccion(rel.mapper.class_, campo.selections, f"{ruta}.")
+        rutas.extend(anidadas or [ruta])
+    return rutas
+
+
+def cargar_seleccion(modelo: type, info: Info, raiz: str | None = None) -> list[_AbstractLoad]:
+    """Opciones de carga para lo que el cliente GraphQL ha pedido de `modelo`.
+
+    `raiz` desciende antes por campos envoltorio del tipo devuelto (p. ej.
+    `"items"` en un resultado paginado o `"socio"` en un payload de mutación).
+    """
+    selecciones = _hijos(info.selected_fields)
+    for tramo in raiz.split(".") if raiz else ():
+        selecciones = _hijos(selecciones, tramo)
+    return cargar(modelo, *dict.fromkeys(rutas_seleccion(modelo, selecciones)))
+
+
+async def recargar(
+    session: AsyncSession, instancia: M, info: Info, *rutas: str, raiz: str | None = None,
+) -> M:
+    """Relee `instancia` con las relaciones que pide la selección GraphQL.
+
+    Para resolvers que devuelven una entidad ya cargada (p. ej. la que devuelve un
+    servicio tras el commit). `rutas` añade relaciones que el selection set no
+    revela, como las que leen los campos calculados del tipo.
+    """
+    modelo = type(instancia)
+    opciones = [*cargar_seleccion(modelo, info, raiz), *cargar(modelo, *rutas)]
+    if not opciones:
+        return instancia
+    return await session.get(
+        modelo, inspect(instancia).identity, options=opciones, populate_existing=True,
+    )
+
+
+# ── Modo estricto (dev) ──────────────────────────────────────────────────────
+
+def _raiseload_por_defecto(estado: ORMExecuteState) -> None:
+    if estado.is_select and not estado.is_column_load:
+        estado.statement = estado.statement.options(raiseload("*", sql_only=True))
+
+
+def activar_modo_estricto() -> None:
+    """Toda carga perezosa que necesitaría SQL lanza InvalidRequestError.
+
+    Las rutas declaradas con `cargar`/`cargar_seleccion` prevalecen sobre el
+    comodín. Las muchos-a-uno ya presentes en la sesión se siguen resolviendo
+    sin SQL, y el flush (cascadas de borrado) no se ve afectado.
+    """
+    if not event.contains(Session, "do_orm_execute", _raiseload_por_defecto):
+        event.listen(Session, "do_orm_execute", _raiseload_por_defecto)
+
+
+def desactivar_modo_estricto() -> None:
+    if event.contains(Session, "do_orm_execute", _raiseload_por_defecto):
+        event.remove(Session, "do_orm_execute", _raiseload_por_defecto)
+
+
+# ── Medición ─────────────────────────────────────────────────────────────────
+
+@dataclass
+class ContadorSentencias:
+    """Sentencias SQL emitidas contra un engine durante un bloque."""
+    sentencias: list[str] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return len(self.sentencias)
+
+
+@contextmanager
+def contar_sentencias(engine: Any) -> Iterator[ContadorSentencias]:
+    """Cuenta las sentencias que llegan al cursor (acepta Engine o AsyncEngine)."""
+    destino = getattr(engine, "sync_engine", engine)
+    contador = ContadorSentencias()
+
+    def _antes(conn, cursor, sentencia, parametros, contexto, executemany):
+        contador.sentencias.append(sentencia)
+
+    event.listen(destino, "before_cursor_execute", _antes)
+    try:
+        yield contador
+    finally:
+        event.remove(destino, "before_cursor_execute", _antes)
@@ -22,11 +22,68 @@ class Settings(BaseSettings):
     db_user: str
     db_password: str
 
+    # Workers del servidor: `uvicorn --workers` toma WEB_CONCURRENCY (lo fija el
+    # Dockerfile). Con 2 vCPU, 2–4 workers; cada uno tiene sus pools de BD, su
+    # pool de PDF y sus cachés, así que multiplica las cifras de abajo. Las
+    # invalidaciones de caché llegan al resto de workers por LISTEN/NOTIFY
+    # (app/core/difusion_eventos.py).
+    # Catálogos de código → BD en el lifespan de cada worker (bajo advisory lock,
+    # ver app/core/arranque.py). En producción lo hace bootstrap antes de
+    # lanzar los workers y el Dockerfile lo desactiva aquí.
+    sincronizar_catalogos_al_arrancar: bool = True  # env: SINCRONIZAR_CATALOGOS_AL_ARRANCAR
+
+    # Pool de conexiones (por proceso/worker). Conexiones máximas contra Postgres
+    # ≈ nº workers × (pool_size + max_overflow), sumando el pool de lectura.
+    db_pool_size: int = 5                 # env: DB_POOL_SIZE
+    db_max_overflow: int = 10             # env: DB_MAX_OVERFLOW
+    db_pool_timeout: float = 30.0         # seg. esperando conexión libre antes de fallar
+    db_pool_recycle: int = 1800           # seg. de vida máxima de una conexión
+    db_pool_pre_ping: bool = True         # valida la conexión al sacarla del pool
+    db_statement_timeout_ms: int = 0      # 0 = sin límite (statement_timeout de Postgres)
+    db_echo: bool = False
+    # Las relaciones ORM son perezosas; con esto (y siempre en dev) cualquier carga
+    # no declarada con app.core.carga lanza error en vez de emitir SQL oculto.
+    db_raise_on_lazy: bool = False        # env: DB_RAISE_ON_LAZY
+
+    # Engine de solo lectura (informes). Sin DB_READ_HOST usa el primario en modo
+    # read-only con su propio pool.
+    db_read_host: str = ""                # env: DB_READ_HOST
+    db_read_port: int = 0                 # env: DB_READ_PORT (0 = el de db_port)
+    db_read_pool_size: int = 3
+    db_read_max_overflow: int = 5
+
+    # Redis (opcional). Si está vacío, las cachés compartidas entre workers
+    # (PermissionMatrix, caché de aplicación) funcionan solo en memoria por proceso.
+    redis_url: str = ""                   # env: REDIS_URL
+    # Tope de entradas de la caché de aplicación en memoria (fallback sin Redis).
+    cache_memory_max_entries: int = 10000  # env: CACHE_MEMORY_MAX_ENTRIES
+
     # JWT
     jwt_secret: str
     jwt_algorithm: str = "HS256"
     jwt_expire_minutes: int = 1440
 
+    # Caché del usuario autenticado y sus role_ids entre peticiones (por proceso,
+    # invalidada por eventos; con Redis, también entre workers). El TTL acota lo
+    # que puede tardar en surtir efecto un cambio que no emita evento.
+    auth_cache_ttl_seconds: float = 30.0  # env: AUTH_CACHE_TTL_SECONDS (0 = desactivada)
+    auth_cache_max_entries: int = 2048    # env: AUTH_CACHE_MAX_ENTRIES
+    # Árbol territorial en memoria (ámbito de los roles). El worker que cambia una
+    # unidad lo invalida al instante; el resto converge en como mucho este TTL.
+    ambito_cache_ttl_seconds: float = 60.0  # env: AMBITO_CACHE_TTL_SECONDS
+    # Reglas de categorización compiladas (por proceso). Igual que el árbol: se
+    # invalidan al instante en el worker que las cambia; el resto, tras el TTL.
+    categorizacion_cache_ttl_seconds: float = 300.0  # env: CATEGORIZACION_CACHE_TTL_SECONDS
+
+    # Renderizado de PDFs (recibos, certificados): procesos del pool por worker.
+    # 0 = en un hilo del propio worker (desarrollo/tests).
+    pdf_workers: int = 2                  # env: PDF_WORKERS
+
+    # Transactional outbox del event bus (relay por worker; ver app/core/outbox.py).
+    outbox_batch_size: int = 100          # env: OUTBOX_BATCH_SIZE
+    outbox_poll_seconds: float = 2.0      # env: OUTBOX_POLL_SECONDS (sondeo si no hay aviso local)
+    outbox_max_attempts: int = 8          # env: OUTBOX_MAX_ATTEMPTS (después → dead-letter)
+
     # URL pública de la aplicación (usada en links de email)
     app_url: str = "http://localhost:5173"
 
@@ -38,6 +95,11 @@ class Settings(BaseSettings):
     smtp_password: str = ""       # env: SMTP_PASSWORD
     smtp_from: str = ""           # env: SMTP_FROM  (si vacío usa smtp_username)
     smtp_encryption: str = "tls"  # env: SMTP_ENCRYPTION  (tls | ssl | none)
+    # Envío masivo: conexiones reutilizadas por lote, envíos simultáneos y tope
+    # de mensajes/segundo por servidor (0 = sin límite; ajustar al proveedor).
+    smtp_pool_size: int = 3               # env: SMTP_POOL_SIZE
+    smtp_concurrency: int = 6             # env: SMTP_CONCURRENCY
+    smtp_rate_per_second: float = 10.0    # env: SMTP_RATE_PER_SECOND
 
     # --- Formulario público de firmas (laicismo.org) ---
     # Captcha anti-bot. Proveedor: turnstile | hcaptcha | disabled (solo dev).
@@ -94,6 +156,14 @@ class Settings(BaseSettings):
         """URL con pooler para la app."""
         return f"postgresql+asyncpg://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
 
+    @computed_field
+    @property
+    def database_read_url(self) -> str:
+        """URL del engine de solo lectura (réplica si se define DB_READ_HOST)."""
+        host = self.db_read_host or self.db_host
+        port = self.db_read_port or self.db_port
+        return f"postgresql+asyncpg://{self.db_user}:{self.db_password}@{host}:{port}/{self.db_name}"
+
     class Config:
         env_file = ".env"
         extra = "ignore"
@@ -1,25 +1,155 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+"""Engines y sesiones de base de datos.
+
+Hay dos engines:
+
+- `engine` (primario): lecturas y escrituras de la aplicación.
+- `read_engine`: solo lectura, para consultas de informes/cuadros de mando. Si se
+  configura `DB_READ_HOST` apunta a una réplica; si no, abre su propio pool contra
+  el primario con `default_transaction_read_only=on`, de modo que un informe
+  pesado no puede escribir ni robar conexiones al pool de escritura.
+
+El tamaño de los pools, el pre-ping, el reciclado y el `statement_timeout` se
+toman de `Settings` (variables `DB_POOL_*`). Para dimensionar Postgres con varios
+workers de uvicorn: conexiones máximas ≈ workers × (pool_size + max_overflow)
+por engine. Ambos pools exponen contadores de checkout/espera (`metricas_pool`).
+
+Las relaciones de los modelos se cargan bajo demanda de cada consulta (ver
+`app.core.carga`); en dev o con `DB_RAISE_ON_LAZY` se activa el modo estricto.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
+from .carga import activar_modo_estricto
 from .config import get_settings
 
-# PostgreSQL local - configuración simple sin pool complejo
-engine = create_async_engine(
-    get_settings().database_url,
-    echo=False,
-)
+
+@dataclass
+class PoolMetrics:
+    """Contadores acumulados de un pool (por proceso)."""
+    checkouts: int = 0
+    checkins: int = 0
+    conexiones_abiertas: int = 0
+    invalidaciones: int = 0
+    timeouts: int = 0
+    espera_total_seg: float = 0.0
+    espera_max_seg: float = 0.0
+
+    def registrar_espera(self, segundos: float, *, timeout: bool = False) -> None:
+        self.espera_total_seg += segundos
+        self.espera_max_seg = max(self.espera_max_seg, segundos)
+        if timeout:
+            self.timeouts += 1
+
+    def as_dict(self) -> dict:
+        media = self.espera_total_seg / self.checkouts if self.checkouts else 0.0
+        return {
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "conexiones_abiertas": self.conexiones_abiertas,
+            "invalidaciones": self.invalidaciones,
+            "timeouts": self.timeouts,
+            "espera_media_ms": round(media * 1000, 3),
+            "espera_max_ms": round(self.espera_max_seg * 1000, 3),
+        }
+
+
+class _PoolMedido(AsyncAdaptedQueuePool):
+    """QueuePool que mide cuánto espera cada checkout a que haya conexión libre."""
+
+    metricas: PoolMetrics
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.metricas.registrar_espera(time.perf_counter() - inicio, timeout=True)
+            raise
+        self.metricas.registrar_espera(time.perf_counter() - inicio)
+        return conn
+
+    def recreate(self):
+        nuevo = super().recreate()
+        nuevo.metricas = self.metricas
+        return nuevo
+
+
+def _crear_engine(url: str, *, solo_lectura: bool = False) -> AsyncEngine:
+    """Crea un engine con la configuración de pool de `Settings` e instrumentado."""
+    settings = get_settings()
+    server_settings: dict[str, str] = {}
+    if settings.db_statement_timeout_ms > 0:
+        server_settings["statement_timeout"] = str(settings.db_statement_timeout_ms)
+    if solo_lectura:
+        server_settings["default_transaction_read_only"] = "on"
+
+    eng = create_async_engine(
+        url,
+        echo=settings.db_echo,
+        poolclass=_PoolMedido,
+        pool_size=settings.db_read_pool_size if solo_lectura else settings.db_pool_size,
+        max_overflow=settings.db_read_max_overflow if solo_lectura else settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args={"server_settings": server_settings} if server_settings else {},
+    )
+    metricas = PoolMetrics()
+    eng.sync_engine.pool.metricas = metricas
+
+    @event.listens_for(eng.sync_engine, "connect")
+    def _on_connect(dbapi_conn, conn_record):
+        metricas.conexiones_abiertas += 1
+
+    @event.listens_for(eng.sync_engine, "checkout")
+    def _on_checkout(dbapi_conn, conn_record, conn_proxy):
+        metricas.checkouts += 1
+
+    @event.listens_for(eng.sync_engine, "checkin")
+    def _on_checkin(dbapi_conn, conn_record):
+        metricas.checkins += 1
+
+    @event.listens_for(eng.sync_engine, "invalidate")
+    def _on_invalidate(dbapi_conn, conn_record, exception):
+        metricas.invalidaciones += 1
+
+    return eng
+
+
+engine = _crear_engine(get_settings().database_url)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+read_engine = _crear_engine(get_settings().database_read_url, solo_lectura=True)
+async_read_session = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+
 
 class Base(DeclarativeBase):
     pass
 
 
+if get_settings().is_dev or get_settings().db_raise_on_lazy:
+    activar_modo_estricto()
+
+
 async def get_db() -> AsyncSession:
     async with async_session() as session:
         yield session
 
 
+async def get_read_db() -> AsyncSession:
+    """Dependencia FastAPI de sesión de solo lectura (informes y exportaciones)."""
+    async with async_read_session() as session:
+        yield session
+
+
 def get_database_url() -> str:
     """Obtiene la URL de la base de datos desde la configuración."""
     return get_settings().database_url
@@ -29,3 +159,18 @@ async def get_session() -> AsyncSession:
     """Obtiene una sesión de base de datos (para uso en resolvers GraphQL)."""
     async with async_session() as session:
         yield session
+
+
+def metricas_pool() -> dict:
+    """Estado y contadores de los pools primario y de lectura (para /health)."""
+    salida = {}
+    for nombre, eng in (("primario", engine), ("lectura", read_engine)):
+        pool = eng.sync_engine.pool
+        salida[nombre] = {
+            "tamano": pool.size(),
+            "en_uso": pool.checkedout(),
+            "libres": pool.checkedin(),
+            "overflow": pool.overflow(),
+            **pool.metricas.as_dict(),
+        }
+    return salida
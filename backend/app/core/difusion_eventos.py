@@ -0,0 +1,179 @@
+"""Difusión entre workers de los eventos que invalidan cachés en memoria.
+
+Con varios workers (`WEB_CONCURRENCY`), el event bus es por proceso: la
+mutación que revoca un permiso solo invalida la PermissionMatrix, la caché de
+principal, el árbol territorial y el clasificador de apuntes del worker que la
+atendió. Los demás seguirían concediendo lo revocado (la matriz no caduca).
+
+Sin depender de Redis, cada evento de `EVENTOS_DIFUNDIDOS` publicado en un
+worker se reenvía por `pg_notify('siga_invalidaciones', …)` y el resto lo
+aplica con sus handlers síncronos (los mismos que en local), sin volver a
+difundirlo. Los eventos se publican tras el commit, así que quien lo recibe ya
+ve el cambio en la BD.
+
+Cada worker escucha con una conexión dedicada (como app/core/push_notificaciones.py).
+Si la escucha cae, al volver se descartan todas las cachés y se reconstruye la
+matriz: los avisos perdidos no se pueden recuperar. /health/ready devuelve 503
+mientras no hay escucha.
+
+Si la PermissionMatrix se comparte por Redis (`MatrixSync`), los eventos de
+permisos recibidos no la reconstruyen: ya llega versionada por su canal.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import uuid
+from typing import Optional, Type
+
+from sqlalchemy import text
+
+from .events import (
+    CargoAssigned, CargoRevoked, DomainEvent, FunctionalityChanged, JuntaReconfigured,
+    PermissionChanged, ReglasCategorizacionCambiadas, RoleCreated, RoleDeleted,
+    RoleUpdated, UnidadOrganizativaCambiada, UserRolesChanged, UserUpdated, event_bus,
+)
+
+logger = logging.getLogger(__name__)
+
+CANAL = "siga_invalidaciones"
+
+EVENTOS_DIFUNDIDOS: tuple[Type[DomainEvent], ...] = (
+    RoleCreated, RoleUpdated, RoleDeleted, PermissionChanged, FunctionalityChanged,
+    UserRolesChanged, UserUpdated, CargoAssigned, CargoRevoked, JuntaReconfigured,
+    UnidadOrganizativaCambiada, ReglasCategorizacionCambiadas,
+)
+
+
+class DifusionEventos:
+    """Reenvío por NOTIFY de los eventos de invalidación y aplicación de los ajenos."""
+
+    def __init__(self) -> None:
+        # Identifica a este proceso para descartar sus propios avisos.
+        self.origen = uuid.uuid4().hex
+        self._session_factory = None
+        self._dsn: Optional[str] = None
+        self._tarea: Optional[asyncio.Task] = None
+        self.escuchando = False
+        self.enviados = 0
+        self.recibidos = 0
+
+    def stats(self) -> dict:
+        return {"escuchando": self.escuchando, "enviados": self.enviados, "recibidos": self.recibidos}
+
+    def wire(self) -> None:
+        """Suscribe el reenvío a los eventos difundidos (tras los wire_* locales)."""
+        for tipo in EVENTOS_DIFUNDIDOS:
+            event_bus.subscribe(tipo, self.difundir, sync=True)
+
+    async def difundir(self, event: DomainEvent) -> None:
+        """Handler síncrono: envía el evento al resto de workers."""
+        if self._session_factory is None:
+            return
+        from .outbox import serializar_evento
+        tipo, payload = serializar_evento(event)
+        mensaje = json.dumps({"o": self.origen, "t": tipo, "p": payload})
+        async with self._session_factory() as session:
+            await session.execute(text("SELECT pg_notify(:canal, :mensaje)"),
+                                  {"canal": CANAL, "mensaje": mensaje})
+            await session.commit()
+        self.enviados += 1
+
+    async def recibir(self, mensaje: str) -> None:
+        """Aplica un evento de otro worker con los handlers síncronos locales."""
+        from .outbox import deserializar_evento
+        datos = json.loads(mensaje)
+        if datos.get("o") == self.origen:
+            return
+        event = deserializar_evento(datos["t"], datos["p"])
+        self.recibidos += 1
+        await event_bus.run_sync_handlers(event, exclude=self._excluidos())
+
+    def _excluidos(self) -> list:
+        """Handlers locales que no deben aplicar un evento recibido de otro worker."""
+        from app.modules.acceso.services.matrix import matrix_cache
+        from . import events
+
+        excluidos = [self.difundir]
+        if matrix_cache.sincronizada and events.matrix_invalidation_handler is not None:
+            # Con MatrixSync quien originó el cambio ya publicó la matriz nueva;
+            # reconstruirla aquí repetiría la reconstrucción en cada worker.
+            excluidos.append(events.matrix_invalidation_handler)
+        return excluidos
+
+    def _al_notificar(self, _conexion, _pid, _canal, payload: str) -> None:
+        tarea = asyncio.get_running_loop().create_task(self.recibir(payload))
+        tarea.add_done_callback(_registrar_error)
+
+    async def resincronizar(self) -> None:
+        """Descarta todas las cachés locales y reconstruye la matriz."""
+        from app.modules.acceso.services.ambito_territorial import arbol_territorial
+        from app.modules.acceso.services.matrix import matrix_cache
+        from app.modules.economico.services.categorizacion_service import clasificador_cache
+        from .principal_cache import principal_cache
+
+        async with self._session_factory() as session:
+            await matrix_cache.rebuild(session)
+        await principal_cache.invalidate_all()
+        arbol_territorial.invalidar()
+        clasificador_cache.invalidar()
+
+    # ------------------------------------------------------------------
+    # Conexión de escucha
+    # ------------------------------------------------------------------
+
+    async def connect(self, session_factory, dsn: str) -> None:
+        """Arranca la escucha de `CANAL` (lifespan)."""
+        if self._tarea is not None:
+            return
+        self._session_factory = session_factory
+        self._dsn = dsn
+        self._tarea = asyncio.create_task(self._escuchar())
+
+    async def _escuchar(self) -> None:
+        import asyncpg
+
+        primera = True
+        while True:
+            conexion = None
+            try:
+                conexion = await asyncpg.connect(self._dsn)
+                caida = asyncio.Event()
+                conexion.add_termination_listener(lambda _c: caida.set())
+                await conexion.add_listener(CANAL, self._al_notificar)
+                if not primera:
+                    # Lo invalidado mientras no escuchábamos se ha perdido.
+                    await self.resincronizar()
+                primera = False
+                self.escuchando = True
+                await caida.wait()
+                logger.warning("Conexión LISTEN de invalidaciones cerrada; reintentando")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("LISTEN de invalidaciones no disponible (%s); reintentando en 5 s", e)
+            finally:
+                self.escuchando = False
+                if conexion is not None and not conexion.is_closed():
+                    with contextlib.suppress(Exception):
+                        await conexion.close()
+            await asyncio.sleep(5)
+
+    async def close(self) -> None:
+        if self._tarea is not None:
+            self._tarea.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._tarea
+            self._tarea = None
+        self._session_factory = None
+
+
+def _registrar_error(tarea: asyncio.Task) -> None:
+    if not tarea.cancelled() and tarea.exception() is not None:
+        logger.error("Error aplicando invalidación difundida", exc_info=tarea.exception())
+
+
+# Instancia global (por proceso)
+difusion_eventos = DifusionEventos()
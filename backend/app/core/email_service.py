@@ -1,21 +1,36 @@
 """Servicio de envío de email vía SMTP asíncrono.
 
-Carga la configuración SMTP desde la tabla de configuraciones en cada envío,
-de modo que los cambios en parámetros se aplican sin reiniciar el servidor.
+Carga la configuración SMTP desde la tabla de configuraciones (una vez por
+instancia de servicio), de modo que los cambios en parámetros se aplican sin
+reiniciar el servidor.
+
+Para envíos masivos (`EnvioMasivo`) se reutiliza un pool pequeño de conexiones
+SMTP autenticadas durante todo el lote, con concurrencia acotada y un límite de
+mensajes por segundo compartido por servidor SMTP. Los lotes largos pueden
+lanzarse como trabajo en segundo plano (`lanzar_envio`); su progreso se guarda en
+`trabajos_envio` y se consulta por id (`obtener_trabajo`) desde cualquier worker.
 """
 from __future__ import annotations
 
 import asyncio
 import logging
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import timedelta
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import Optional
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence
 
 import aiosmtplib
-from sqlalchemy import select
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.modules.configuracion.models.configuracion import Configuracion
+from app.modules.core.comunicacion.trabajo_envio import (
+    COMPLETADO, EN_CURSO, ERROR, TrabajoEnvioMasivo,
+)
 from app.core.config import get_settings
 
 logger = logging.getLogger(__name__)
@@ -105,11 +120,389 @@ async def ping_smtp(config: SmtpConfig, timeout: float = 5.0) -> str:
         return 'error'
 
 
+def _construir_mensaje(config: SmtpConfig, m: "MensajeEmail") -> tuple[MIMEMultipart, list[str]]:
+    """MIME del mensaje y lista de destinatarios del sobre SMTP."""
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = m.asunto
+    msg['From']    = config.from_
+    msg['To']      = m.destinatario
+    if m.cc:
+        msg['Cc'] = ', '.join(m.cc)
+    # El Bcc (cco) NO se pone como cabecera (sería visible); se pasa aparte como
+    # destinatario adicional en el sobre SMTP.
+    recipients = [m.destinatario] + list(m.cc or []) + list(m.cco or [])
+
+    if m.cuerpo_texto:
+        msg.attach(MIMEText(m.cuerpo_texto, 'plain', 'utf-8'))
+    msg.attach(MIMEText(m.cuerpo_html, 'html', 'utf-8'))
+    return msg, recipients
+
+
+def _error_no_configurado(config: SmtpConfig) -> ValueError:
+    faltantes = config.campos_faltantes
+    detalle = ', '.join(faltantes) if faltantes else 'parámetros incompletos'
+    return ValueError(
+        f"El servidor SMTP no está configurado. "
+        f"Faltan: {detalle}. "
+        f"Configúralo en Parámetros Generales → Autenticación y Email."
+    )
+
+
+# ---------------------------------------------------------------------------
+# Envío masivo
+# ---------------------------------------------------------------------------
+
+@dataclass
+class MensajeEmail:
+    """Un email individual dentro de un lote. `etiqueta` identifica al
+    destinatario en los errores (p.ej. su nombre)."""
+    destinatario: str
+    asunto: str
+    cuerpo_html: str
+    cuerpo_texto: Optional[str] = None
+    cc: Optional[list] = None
+    cco: Optional[list] = None
+    etiqueta: Optional[str] = None
+
+
+@dataclass
+class ResultadoEnvio:
+    """Resultado por destinatario de un envío masivo."""
+    destinatario: str
+    ok: bool
+    error: Optional[str] = None
+    etiqueta: Optional[str] = None
+
+
+class _LimitadorTasa:
+    """Espaciado mínimo entre envíos (mensajes/segundo), compartido por servidor."""
+
+    def __init__(self, por_segundo: float) -> None:
+        self.intervalo = 1.0 / por_segundo if por_segundo > 0 else 0.0
+        self._siguiente = 0.0
+        self._lock = asyncio.Lock()
+
+    async def esperar(self) -> None:
+        if not self.intervalo:
+            return
+        async with self._lock:
+            ahora = time.monotonic()
+            turno = max(ahora, self._siguiente)
+            self._siguiente = turno + self.intervalo
+        if turno > ahora:
+            await asyncio.sleep(turno - ahora)
+
+
+# Un limitador por (host, tasa): varios lotes simultáneos contra el mismo
+# proveedor comparten el cupo de mensajes por segundo.
+_limitadores: Dict[tuple, _LimitadorTasa] = {}
+
+
+def _limitador_para(config: SmtpConfig, por_segundo: float) -> _LimitadorTasa:
+    clave = (config.host, config.port, config.usuario, por_segundo)
+    lim = _limitadores.get(clave)
+    if lim is None:
+        lim = _limitadores[clave] = _LimitadorTasa(por_segundo)
+    return lim
+
+
+_ERRORES_CONEXION = (
+    aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError,
+    aiosmtplib.SMTPTimeoutError, OSError,
+)
+
+
+class PoolSmtp:
+    """Pool de conexiones SMTP autenticadas reutilizadas entre mensajes.
+
+    Las conexiones se abren bajo demanda hasta `tamano`; una conexión que falla
+    se descarta y la siguiente petición abre otra. Usar como context manager
+    asíncrono para cerrar todas las conexiones (QUIT) al terminar el lote.
+    """
+
+    def __init__(self, config: SmtpConfig, tamano: int = 3, timeout: float = 30.0) -> None:
+        self.config = config
+        self.tamano = max(1, tamano)
+        self.timeout = timeout
+        self._cupo = asyncio.Semaphore(self.tamano)
+        self._libres: List[aiosmtplib.SMTP] = []
+        self.conexiones_creadas = 0
+
+    async def _abrir(self) -> aiosmtplib.SMTP:
+        c = self.config
+        smtp = aiosmtplib.SMTP(
+            hostname=c.host,
+            port=c.port,
+            username=c.usuario or None,
+            password=c.password or None,
+            use_tls=c.ssl,
+            start_tls=c.tls and not c.ssl,
+            timeout=self.timeout,
+        )
+        await smtp.connect()  # EHLO + STARTTLS + AUTH
+        self.conexiones_creadas += 1
+        return smtp
+
+    @asynccontextmanager
+    async def conexion(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        async with self._cupo:
+            smtp = self._libres.pop() if self._libres else None
+            if smtp is None or not smtp.is_connected:
+                smtp = await self._abrir()
+            try:
+                yield smtp
+            except _ERRORES_CONEXION:
+                # Conexión inservible: se descarta; la próxima petición abre otra.
+                smtp.close()
+                raise
+            except BaseException:
+                self._libres.append(smtp)
+                raise
+            else:
+                self._libres.append(smtp)
+
+    async def cerrar(self) -> None:
+        while self._libres:
+            smtp = self._libres.pop()
+            try:
+                await smtp.quit()
+            except Exception:  # noqa: BLE001
+                smtp.close()
+
+    async def __aenter__(self) -> "PoolSmtp":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.cerrar()
+
+
+class EnvioMasivo:
+    """Envía un lote de mensajes con un pool de conexiones, concurrencia
+    acotada y límite de tasa. Nunca lanza por un destinatario: devuelve un
+    `ResultadoEnvio` por mensaje, en el mismo orden de entrada."""
+
+    def __init__(
+        self,
+        config: SmtpConfig,
+        *,
+        conexiones: Optional[int] = None,
+        concurrencia: Optional[int] = None,
+        por_segundo: Optional[float] = None,
+        reintentos: int = 1,
+    ) -> None:
+        s = get_settings()
+        self.config = config
+        self.conexiones = conexiones or s.smtp_pool_size
+        self.concurrencia = max(1, concurrencia or s.smtp_concurrency)
+        self.por_segundo = s.smtp_rate_per_second if por_segundo is None else por_segundo
+        self.reintentos = reintentos
+
+    async def enviar(
+        self,
+        mensajes: Sequence[MensajeEmail],
+        *,
+        al_progresar: Optional[Callable[[ResultadoEnvio], None]] = None,
+    ) -> List[ResultadoEnvio]:
+        if not self.config.configured:
+            raise _error_no_configurado(self.config)
+        limitador = _limitador_para(self.config, self.por_segundo)
+        semaforo = asyncio.Semaphore(self.concurrencia)
+
+        async with PoolSmtp(self.config, self.conexiones) as pool:
+
+            async def _uno(m: MensajeEmail) -> ResultadoEnvio:
+                async with semaforo:
+                    msg, recipients = _construir_mensaje(self.config, m)
+                    error: Optional[str] = None
+                    for intento in range(self.reintentos + 1):
+                        await limitador.esperar()
+                        try:
+                            async with pool.conexion() as smtp:
+                                await smtp.send_message(msg, recipients=recipients)
+                            error = None
+                            break
+                        except _ERRORES_CONEXION as exc:
+                            # Caída de la conexión: se reintenta con otra del pool.
+                            error = str(exc) or exc.__class__.__name__
+                        except Exception as exc:  # noqa: BLE001
+                            # Rechazo del servidor (destinatario, contenido…): sin reintento.
+                            error = str(exc) or exc.__class__.__name__
+                            break
+                    if error:
+                        logger.error("Error enviando email a %s: %s", m.destinatario, error)
+                    res = ResultadoEnvio(m.destinatario, error is None, error, m.etiqueta)
+                    if al_progresar is not None:
+                        al_progresar(res)
+                    return res
+
+            resultados = await asyncio.gather(*(_uno(m) for m in mensajes))
+        enviados = sum(1 for r in resultados if r.ok)
+        logger.info("Envío masivo: %d/%d emails enviados", enviados, len(resultados))
+        return list(resultados)
+
+
+# ---------------------------------------------------------------------------
+# Trabajos de envío en segundo plano
+# ---------------------------------------------------------------------------
+
+@dataclass
+class TrabajoEnvio:
+    """Estado en memoria de un envío masivo que se ejecuta en este proceso.
+
+    El progreso se vuelca periódicamente a `trabajos_envio` (`TrabajoEnvioMasivo`)
+    para que cualquier worker pueda responder a la consulta de progreso.
+    """
+    id: str
+    total: int
+    usuario_id: Optional[uuid.UUID] = None
+    estado: str = EN_CURSO
+    enviados: int = 0
+    fallidos: int = 0
+    resultados: List[ResultadoEnvio] = field(default_factory=list)
+    error: Optional[str] = None
+    creado_en: float = field(default_factory=time.time)
+    terminado_en: Optional[float] = None
+
+    @property
+    def procesados(self) -> int:
+        return self.enviados + self.fallidos
+
+    def _registrar(self, res: ResultadoEnvio) -> None:
+        if res.ok:
+            self.enviados += 1
+        else:
+            self.fallidos += 1
+
+
+# Cada cuánto se vuelca el progreso (y el latido) de un trabajo en curso.
+_INTERVALO_PROGRESO = 1.0
+# Sin latido durante este tiempo, un trabajo EN_CURSO se da por interrumpido.
+_SIN_LATIDO = timedelta(minutes=2)
+# Los trabajos terminados se purgan pasado este tiempo.
+_RETENCION = timedelta(days=7)
+_tareas: set = set()
+
+
+async def _guardar_progreso(session_factory, trabajo: TrabajoEnvio, final: bool = False) -> None:
+    valores = {"enviados": trabajo.enviados, "fallidos": trabajo.fallidos,
+               "actualizado_en": func.now()}
+    if final:
+        valores.update(
+            estado=trabajo.estado, error=trabajo.error, terminado_en=func.now(),
+            resultados=[{"destinatario": r.destinatario, "ok": r.ok, "error": r.error,
+                         "etiqueta": r.etiqueta} for r in trabajo.resultados],
+        )
+    async with session_factory() as session:
+        await session.execute(
+            update(TrabajoEnvioMasivo)
+            .where(TrabajoEnvioMasivo.id == uuid.UUID(trabajo.id))
+            .values(**valores)
+        )
+        await session.commit()
+
+
+async def lanzar_envio(
+    config: SmtpConfig,
+    mensajes: Sequence[MensajeEmail],
+    *,
+    session_factory,
+    usuario_id: Optional[uuid.UUID] = None,
+    al_terminar: Optional[Callable[[TrabajoEnvio], Awaitable[None]]] = None,
+) -> TrabajoEnvio:
+    """Registra el trabajo en BD, lanza el envío como tarea asyncio y devuelve su `TrabajoEnvio`.
+
+    El progreso se guarda con sesiones propias de `session_factory` (la de la
+    petición ya estará cerrada). `al_terminar` se invoca al acabar (con éxito o
+    no), p.ej. para registrar el envío en el histórico.
+    """
+    if not config.configured:
+        raise _error_no_configurado(config)
+    trabajo = TrabajoEnvio(id=str(uuid.uuid4()), total=len(mensajes), usuario_id=usuario_id)
+    async with session_factory() as session:
+        await session.execute(
+            delete(TrabajoEnvioMasivo).where(
+                TrabajoEnvioMasivo.estado != EN_CURSO,
+                TrabajoEnvioMasivo.creado_en < func.now() - _RETENCION,
+            )
+        )
+        session.add(TrabajoEnvioMasivo(id=uuid.UUID(trabajo.id), total=trabajo.total,
+                                       usuario_id=usuario_id))
+        await session.commit()
+
+    async def _latir() -> None:
+        while True:
+            await asyncio.sleep(_INTERVALO_PROGRESO)
+            try:
+                await _guardar_progreso(session_factory, trabajo)
+            except Exception:  # noqa: BLE001
+                logger.warning("No se pudo guardar el progreso del envío %s", trabajo.id, exc_info=True)
+
+    async def _ejecutar() -> None:
+        latido = asyncio.create_task(_latir())
+        try:
+            trabajo.resultados = await EnvioMasivo(config).enviar(
+                mensajes, al_progresar=trabajo._registrar,
+            )
+            trabajo.estado = COMPLETADO
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Trabajo de envío %s fallido", trabajo.id)
+            trabajo.estado = ERROR
+            trabajo.error = str(exc)
+        finally:
+            trabajo.terminado_en = time.time()
+            latido.cancel()
+        try:
+            await _guardar_progreso(session_factory, trabajo, final=True)
+        except Exception:  # noqa: BLE001
+            logger.exception("No se pudo guardar el resultado del envío %s", trabajo.id)
+        if al_terminar is not None:
+            try:
+                await al_terminar(trabajo)
+            except Exception:  # noqa: BLE001
+                logger.exception("Error al cerrar el trabajo de envío %s", trabajo.id)
+
+    tarea = asyncio.create_task(_ejecutar())
+    _tareas.add(tarea)
+    tarea.add_done_callback(_tareas.discard)
+    return trabajo
+
+
+async def obtener_trabajo(session: AsyncSession, trabajo_id: str) -> Optional[TrabajoEnvioMasivo]:
+    """Trabajo de envío por id, desde cualquier worker. None si no existe.
+
+    Un trabajo EN_CURSO sin latido reciente se devuelve como ERROR (el proceso
+    que lo ejecutaba se detuvo); no se modifica en BD.
+    """
+    try:
+        clave = uuid.UUID(trabajo_id)
+    except ValueError:
+        return None
+    fila = (await session.execute(
+        select(TrabajoEnvioMasivo, TrabajoEnvioMasivo.actualizado_en < func.now() - _SIN_LATIDO)
+        .where(TrabajoEnvioMasivo.id == clave)
+    )).first()
+    if fila is None:
+        return None
+    trabajo, sin_latido = fila
+    if trabajo.estado == EN_CURSO and sin_latido:
+        session.expunge(trabajo)
+        trabajo.estado = ERROR
+        trabajo.error = "El envío se interrumpió (se detuvo el proceso que lo ejecutaba)."
+    return trabajo
+
+
 class EmailService:
     """Servicio de email. Instanciar por request con la sesión DB activa."""
 
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, config: Optional[SmtpConfig] = None) -> None:
         self._session = session
+        self._config = config
+
+    async def config(self) -> SmtpConfig:
+        """Configuración SMTP, leída una sola vez por instancia."""
+        if self._config is None:
+            self._config = await _load_smtp_config(self._session)
+        return self._config
 
     async def enviar(
         self,
@@ -124,32 +517,16 @@ class EmailService:
         """Envía un email. `cc` en copia visible, `cco` en copia oculta.
 
         Raises:
-            RuntimeError: si SMTP no está configurado o el envío falla.
+            ValueError: si SMTP no está configurado o el envío falla.
         """
-        config = await _load_smtp_config(self._session)
+        config = await self.config()
         if not config.configured:
-            faltantes = config.campos_faltantes
-            detalle = ', '.join(faltantes) if faltantes else 'parámetros incompletos'
-            raise ValueError(
-                f"El servidor SMTP no está configurado. "
-                f"Faltan: {detalle}. "
-                f"Configúralo en Parámetros Generales → Autenticación y Email."
-            )
-
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = asunto
-        msg['From']    = config.from_
-        msg['To']      = destinatario
-        if cc:
-            msg['Cc'] = ', '.join(cc)
-        # El Bcc (cco) NO se pone como cabecera (sería visible); se pasa aparte como
-        # destinatario adicional en el sobre SMTP.
-        recipients = [destinatario] + list(cc or []) + list(cco or [])
-
-        if cuerpo_texto:
-            msg.attach(MIMEText(cuerpo_texto, 'plain', 'utf-8'))
-        msg.attach(MIMEText(cuerpo_html, 'html', 'utf-8'))
+            raise _error_no_configurado(config)
 
+        msg, recipients = _construir_mensaje(config, MensajeEmail(
+            destinatario=destinatario, asunto=asunto, cuerpo_html=cuerpo_html,
+            cuerpo_texto=cuerpo_texto, cc=cc, cco=cco,
+        ))
         try:
             await aiosmtplib.send(
                 msg,
@@ -165,3 +542,12 @@ class EmailService:
         except Exception as exc:
             logger.error("Error enviando email a %s: %s", destinatario, exc)
             raise ValueError(f"Error al enviar el email: {exc}") from exc
+
+    async def enviar_lote(self, mensajes: Sequence[MensajeEmail], **opciones) -> List[ResultadoEnvio]:
+        """Envía varios emails reutilizando conexiones (ver `EnvioMasivo`).
+
+        Raises:
+            ValueError: si SMTP no está configurado (fallo global). Los fallos por
+            destinatario se devuelven en los resultados.
+        """
+        return await EnvioMasivo(await self.config(), **opciones).enviar(mensajes)
@@ -3,10 +3,22 @@
 Diseño: síncrono en registro, async en dispatch.
 Evolucionable a Redis Pub/Sub o RabbitMQ sin cambiar la interfaz.
 
-Eventos que invalidan la PermissionMatrix:
+Eventos que invalidan la PermissionMatrix (recálculo incremental del rol o
+funcionalidad afectados, ver `apply_permission_event`):
   RoleCreated, RoleUpdated, RoleDeleted
   PermissionChanged, FunctionalityChanged
-  CargoAssigned, CargoRevoked
+
+CargoAssigned / CargoRevoked / JuntaReconfigured cambian qué roles tiene un
+usuario, no qué transacciones tiene un rol: no tocan la matriz, pero sí invalidan
+la caché de principal (usuario + role_ids), igual que UserRolesChanged,
+UserUpdated, RoleUpdated y RoleDeleted.
+
+UnidadOrganizativaCambiada invalida el árbol territorial en memoria (ámbitos).
+
+ReglasCategorizacionCambiadas invalida el clasificador compilado de apuntes.
+
+Con varios workers, todos estos eventos se reenvían al resto de procesos por
+Postgres LISTEN/NOTIFY (app/core/difusion_eventos.py).
 """
 
 from __future__ import annotations
@@ -16,7 +28,7 @@ import logging
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Callable, Coroutine, Dict, List, Optional, Type
+from typing import Any, Callable, Collection, Coroutine, Dict, List, Optional, Type
 import uuid
 
 logger = logging.getLogger(__name__)
@@ -61,6 +73,16 @@ class FunctionalityChanged(DomainEvent):
     role_id: str = ""
     functionality_id: str = ""
 
+@dataclass(frozen=True)
+class UserRolesChanged(DomainEvent):
+    """Rol asignado o revocado directamente a un usuario."""
+    usuario_id: str = ""
+
+@dataclass(frozen=True)
+class UserUpdated(DomainEvent):
+    """Usuario desactivado, eliminado o con credenciales cambiadas."""
+    usuario_id: str = ""
+
 # -----------------------------------------------------------------------
 # Eventos de cargos y juntas
 # -----------------------------------------------------------------------
@@ -81,6 +103,15 @@ class CargoRevoked(DomainEvent):
 class JuntaReconfigured(DomainEvent):
     agrupacion_id: str = ""
 
+@dataclass(frozen=True)
+class UnidadOrganizativaCambiada(DomainEvent):
+    """Unidad organizativa creada, movida en la jerarquía o archivada."""
+    unidad_id: str = ""
+
+@dataclass(frozen=True)
+class ReglasCategorizacionCambiadas(DomainEvent):
+    """Regla de categorización o categoría fiscal creada, modificada o eliminada."""
+
 
 # -----------------------------------------------------------------------
 # Eventos de flujos de trabajo que disparan avisos (secretaría, membresía)
@@ -157,6 +188,16 @@ class MiembroPerfilIncompleto(DomainEvent):
     campos_faltantes: tuple = ()
 
 
+# -----------------------------------------------------------------------
+# Trabajos largos despachados por el outbox
+# -----------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class CertificadosDonacionSolicitados(DomainEvent):
+    """Se ha pedido la emisión en bloque de los certificados de un ejercicio."""
+    lote_id: str = ""
+
+
 # -----------------------------------------------------------------------
 # Event Bus
 # -----------------------------------------------------------------------
@@ -179,10 +220,14 @@ class EventBus:
     fallo de seguridad.
 
     Cada handler captura sus propias excepciones: un fallo en uno no afecta a los
-    demás ni a quien publica. Limitaciones conocidas (sin durabilidad): si el
-    proceso muere antes del dispatch, los eventos en vuelo se pierden. La
-    evolución natural hacia entrega garantizada es un transactional outbox; ver
-    docs/MODULO_COMUNICACION.md (no implementado).
+    demás ni a quien publica. `publish` no es duradero: si el proceso muere antes
+    del dispatch, los eventos en vuelo se pierden.
+
+    Entrega garantizada (`enqueue`): el evento se escribe en el transactional
+    outbox dentro de la transacción de quien lo produce y lo despacha el
+    `OutboxRelay` (todos sus handlers, con reintentos y dead-letter; ver
+    app/core/outbox.py). Es la vía para eventos cuyos efectos no deben perderse
+    (avisos, canales de chat).
     """
 
     def __init__(self) -> None:
@@ -205,18 +250,31 @@ class EventBus:
         else:
             self._handlers[event_type].append(handler)
 
+    def handlers_de(self, event_type: Type[DomainEvent]) -> List[AsyncHandler]:
+        """Todos los handlers del tipo (síncronos primero)."""
+        return list(self._sync_handlers.get(event_type, [])) + list(self._handlers.get(event_type, []))
+
+    def enqueue(self, session, event: DomainEvent) -> None:
+        """Encola el evento en el outbox, en la transacción de `session`.
+
+        No hace flush ni commit: la fila se confirma (o se descarta) junto con el
+        cambio de negocio. Tras el commit se despierta al relay de este proceso.
+        """
+        from sqlalchemy import event as sa_event
+        from .outbox import EventoOutbox, serializar_evento
+
+        tipo, payload = serializar_evento(event)
+        session.add(EventoOutbox(id=uuid.UUID(event.event_id), tipo=tipo, payload=payload))
+        sync_session = getattr(session, "sync_session", session)
+        if not sync_session.info.get("_outbox_listener"):
+            sync_session.info["_outbox_listener"] = True
+            sa_event.listen(sync_session, "after_commit", _despertar_relay)
+
     async def publish(self, event: DomainEvent) -> None:
         event_type = type(event)
 
         # 1) Handlers síncronos: en línea, publish espera a que completen.
-        for h in self._sync_handlers.get(event_type, []):
-            try:
-                await h(event)
-            except Exception:
-                logger.exception(
-                    "Error en handler síncrono %s para evento %s",
-                    getattr(h, "__name__", repr(h)), event_type.__name__,
-                )
+        await self.run_sync_handlers(event)
 
         # 2) Handlers asíncronos: en background, publish NO espera.
         for h in self._handlers.get(event_type, []):
@@ -224,6 +282,23 @@ class EventBus:
             self._tasks.add(task)
             task.add_done_callback(self._tasks.discard)
 
+    async def run_sync_handlers(self, event: DomainEvent, *, exclude: Collection[AsyncHandler] = ()) -> None:
+        """Ejecuta en línea los handlers síncronos del evento (salvo los de `exclude`).
+
+        Lo usa también la difusión entre workers (app/core/difusion_eventos.py)
+        para aplicar un evento publicado en otro proceso sin reenviarlo.
+        """
+        for h in self._sync_handlers.get(type(event), []):
+            if h in exclude:
+                continue
+            try:
+                await h(event)
+            except Exception:
+                logger.exception(
+                    "Error en handler síncrono %s para evento %s",
+                    getattr(h, "__name__", repr(h)), type(event).__name__,
+                )
+
     @staticmethod
     async def _run_background(handler: AsyncHandler, event: DomainEvent) -> None:
         try:
@@ -235,6 +310,12 @@ class EventBus:
             )
 
 
+def _despertar_relay(_session) -> None:
+    from .outbox import outbox_relay
+    if outbox_relay is not None:
+        outbox_relay.despertar()
+
+
 # Instancia global
 event_bus = EventBus()
 
@@ -245,25 +326,95 @@ _PERMISSION_INVALIDATING_EVENTS: tuple[Type[DomainEvent], ...] = (
     RoleDeleted,
     PermissionChanged,
     FunctionalityChanged,
-    CargoAssigned,
-    CargoRevoked,
-    JuntaReconfigured,
 )
 
 
+# Handler instalado por `wire_matrix_invalidation`. La difusión entre workers lo
+# omite si la matriz se comparte por Redis: el cambio ya llega por `MatrixSync`.
+matrix_invalidation_handler: Optional[AsyncHandler] = None
+
+
 def wire_matrix_invalidation(session_factory: Callable) -> None:
     """Conecta el event bus con la invalidación de la PermissionMatrix.
 
     Llamar una vez en el lifespan de FastAPI, después de inicializar la matrix.
     """
-    from ..modules.acceso.services.matrix import invalidate_and_rebuild
+    from ..modules.acceso.services.matrix import apply_permission_event
 
     async def _invalidate(event: DomainEvent) -> None:
         logger.info(
             "PermissionMatrix: invalidando por evento %s", type(event).__name__
         )
         async with session_factory() as session:
-            await invalidate_and_rebuild(session)
+            await apply_permission_event(session, event)
 
+    global matrix_invalidation_handler
+    matrix_invalidation_handler = _invalidate
     for event_type in _PERMISSION_INVALIDATING_EVENTS:
         event_bus.subscribe(event_type, _invalidate, sync=True)
+
+
+# Eventos que invalidan la caché de principal de un usuario concreto…
+_PRINCIPAL_USER_EVENTS: tuple[Type[DomainEvent], ...] = (
+    CargoAssigned,
+    CargoRevoked,
+    UserRolesChanged,
+    UserUpdated,
+)
+# …y los que pueden afectar a muchos usuarios a la vez (se vacía entera).
+_PRINCIPAL_ALL_EVENTS: tuple[Type[DomainEvent], ...] = (
+    JuntaReconfigured,
+    RoleUpdated,
+    RoleDeleted,
+)
+
+
+def wire_principal_invalidation() -> None:
+    """Conecta el event bus con la caché de principal (usuario + role_ids).
+
+    Síncrono por el mismo motivo que la matriz: tras revocar un cargo o desactivar
+    un usuario, la siguiente petición no debe ver los permisos anteriores.
+    """
+    from .principal_cache import principal_cache
+
+    async def _invalidar_usuario(event: DomainEvent) -> None:
+        if getattr(event, "usuario_id", ""):
+            await principal_cache.invalidate_user(event.usuario_id)
+        else:
+            await principal_cache.invalidate_all()
+
+    async def _invalidar_todo(event: DomainEvent) -> None:
+        await principal_cache.invalidate_all()
+
+    for event_type in _PRINCIPAL_USER_EVENTS:
+        event_bus.subscribe(event_type, _invalidar_usuario, sync=True)
+    for event_type in _PRINCIPAL_ALL_EVENTS:
+        event_bus.subscribe(event_type, _invalidar_todo, sync=True)
+
+
+def wire_ambito_invalidation() -> None:
+    """Conecta el event bus con el árbol territorial cacheado (ámbitos de los roles).
+
+    Síncrono: tras mover una unidad, la siguiente comprobación de ámbito de este
+    worker ya usa la jerarquía nueva.
+    """
+    from ..modules.acceso.services.ambito_territorial import arbol_territorial
+
+    async def _invalidar(event: DomainEvent) -> None:
+        arbol_territorial.invalidar()
+
+    event_bus.subscribe(UnidadOrganizativaCambiada, _invalidar, sync=True)
+
+
+def wire_categorizacion_invalidation() -> None:
+    """Conecta el event bus con el clasificador compilado de apuntes.
+
+    Síncrono: tras guardar una regla, la siguiente clasificación de este worker
+    ya la tiene en cuenta.
+    """
+    from ..modules.economico.services.categorizacion_service import clasificador_cache
+
+    async def _invalidar(event: DomainEvent) -> None:
+        clasificador_cache.invalidar()
+
+    event_bus.subscribe(ReglasCategorizacionCambiadas, _invalidar, sync=True)
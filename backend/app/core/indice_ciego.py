@@ -0,0 +1,107 @@
+"""Índice ciego (blind index) de los campos cifrados: DNI/NIF e IBAN.
+
+Fernet no es determinista: cifrar dos veces el mismo DNI da dos tokens
+distintos, así que `numero_documento == nif` deja de encontrar nada en cuanto
+el dato se guarda cifrado (`encriptar_dnis_en_lote`, `encriptar_ibans_en_lote`).
+Junto a cada campo cifrado se guarda un HMAC-SHA256 del valor normalizado
+(`*_indice`, columna indexada), y las búsquedas por identidad comparan índices:
+una lectura de índice B-tree, sin descifrar tablas enteras.
+
+- Clave: secreto `BLIND_INDEX_KEY`, distinto de la clave de cifrado (filtrar
+  el índice no permite descifrar y rotar la clave Fernet no obliga a
+  reindexar). Si no está definido se deriva de la clave MÁS ANTIGUA de
+  `ENCRYPTION_KEY` (la última de la lista): poner una clave nueva delante no
+  cambia los índices; retirar la antigua, sí. En producción debe definirse.
+- Cambio de clave de índice: el bootstrap guarda la huella de la clave en
+  `configuraciones` (`CLAVE_HUELLA`) y, si al arrancar no coincide, recalcula
+  todos los índices antes de lanzar los workers
+  (app/scripts/reindexar_indices_ciegos.py).
+- Dominio: el HMAC incluye el tipo de campo, así el mismo texto en DNI e IBAN
+  no produce el mismo índice.
+- El valor puede llegar en claro o cifrado (datos anteriores al cifrado):
+  `en_claro` descifra solo si tiene cabecera de token Fernet.
+
+Los modelos mantienen la columna con un listener del atributo (cualquier
+asignación por ORM); las escrituras por SQL directo deben rellenarla a mano.
+"""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import logging
+import re
+from functools import lru_cache
+from typing import Optional
+
+from app.core.documento import normalizar_documento
+from app.core.secrets import read_secret_env
+
+logger = logging.getLogger(__name__)
+
+# `encriptar_texto` devuelve base64 del token Fernet, que empieza por 'gAAAAA'
+# (versión 0x80 + marca de tiempo): en base64, 'Z0FBQUFB'.
+PREFIJO_CIFRADO = "Z0FBQUFB"
+
+# Longitud del índice (hex de SHA-256).
+LONGITUD_INDICE = 64
+
+# Huella de la clave con la que están calculados los índices guardados.
+CLAVE_HUELLA = "sistema.indice_ciego_huella"
+
+
+@lru_cache(maxsize=1)
+def _clave() -> bytes:
+    clave = read_secret_env("BLIND_INDEX_KEY")
+    if clave:
+        return clave.encode()
+    from app.infrastructure.services.encriptacion_service import claves_configuradas
+    claves = claves_configuradas()
+    if claves:
+        # Derivada de la clave más antigua: estable mientras se añaden claves
+        # nuevas delante para rotar (ver encriptacion_service).
+        if len(claves) > 1:
+            logger.warning("BLIND_INDEX_KEY no definida: índice ciego derivado de la clave Fernet más antigua")
+        return hmac.new(claves[-1].encode(), b"siga:indice-ciego:v1", hashlib.sha256).digest()
+    # Sin ninguna clave (desarrollo): fija, para que los índices no cambien
+    # entre reinicios como lo haría una clave temporal aleatoria.
+    logger.warning("No se encontró BLIND_INDEX_KEY ni ENCRYPTION_KEY; índice ciego con clave de desarrollo")
+    return b"siga:indice-ciego:desarrollo"
+
+
+def huella_clave() -> str:
+    """Identifica la clave de índice en uso sin revelarla."""
+    return hmac.new(_clave(), b"siga:indice-ciego:huella", hashlib.sha256).hexdigest()[:16]
+
+
+def es_cifrado(valor: Optional[str]) -> bool:
+    """True si `valor` tiene la forma de `EncriptacionService.encriptar_texto`."""
+    return bool(valor) and valor.startswith(PREFIJO_CIFRADO)
+
+
+def en_claro(valor: Optional[str]) -> Optional[str]:
+    """Valor en claro: descifra si es un token, si no lo devuelve tal cual."""
+    if not es_cifrado(valor):
+        return valor
+    from app.infrastructure.services.encriptacion_service import get_encriptacion_service
+    return get_encriptacion_service().desencriptar_texto(valor)
+
+
+def normalizar_iban(iban: Optional[str]) -> str:
+    """Mayúsculas y sin espacios (misma forma que guarda `encriptar_iban`)."""
+    return re.sub(r"\s", "", iban or "").upper()
+
+
+def _indice(dominio: str, valor: str) -> Optional[str]:
+    if not valor:
+        return None
+    return hmac.new(_clave(), f"{dominio}:{valor}".encode(), hashlib.sha256).hexdigest()
+
+
+def indice_documento(numero: Optional[str]) -> Optional[str]:
+    """Índice ciego de un DNI/NIE/NIF/CIF (en claro o cifrado). None si vacío."""
+    return _indice("documento", normalizar_documento(en_claro(numero)))
+
+
+def indice_iban(iban: Optional[str]) -> Optional[str]:
+    """Índice ciego de un IBAN (en claro o cifrado). None si vacío."""
+    return _indice("iban", normalizar_iban(en_claro(iban)))
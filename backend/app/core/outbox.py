@@ -0,0 +1,325 @@
+"""Transactional outbox del event bus: entrega duradera de eventos de dominio.
+
+Quien produce un evento con efectos asíncronos (avisos, canal de chat…) lo
+encola con `event_bus.enqueue(session, evento)` ANTES del commit: la fila de
+`eventos_outbox` se escribe en la misma transacción que el cambio de negocio,
+así que o se guardan ambos o ninguno. Un relay (`OutboxRelay`, arrancado en el
+lifespan) reclama lotes de filas pendientes y despacha sus handlers.
+
+Reclamo de filas — lease con SKIP LOCKED:
+    UPDATE eventos_outbox SET disponible_en = now() + lease, intentos = intentos + 1
+    WHERE id IN (SELECT id … WHERE estado = 'PENDIENTE' AND disponible_en <= now()
+                 ORDER BY disponible_en LIMIT n FOR UPDATE SKIP LOCKED)
+    RETURNING …
+y commit inmediato: los handlers se ejecutan sin transacción abierta. Varios
+workers reparten la carga sin pisarse; si uno muere a mitad de lote, sus filas
+reaparecen al vencer el lease.
+
+Entrega al-menos-una-vez por handler: `completados` guarda los handlers que ya
+terminaron bien, de modo que un reintento solo repite los que fallaron. Tras
+`outbox_max_attempts` intentos (backoff exponencial con jitter) la fila pasa a
+FALLIDO (dead-letter) y se puede reencolar con `reintentar_fallidos`.
+"""
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import logging
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from sqlalchemy import DateTime, Index, Integer, String, Text, Uuid, delete, func, select, text, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .database import Base
+
+logger = logging.getLogger(__name__)
+
+PENDIENTE = "PENDIENTE"
+PROCESADO = "PROCESADO"
+FALLIDO = "FALLIDO"
+
+
+class EventoOutbox(Base):
+    """Evento de dominio pendiente de despachar (o ya despachado / en dead-letter).
+
+    Hereda de Base (no de BaseModel): es una cola técnica, sin soft-delete ni
+    auditoría de usuario.
+    """
+    __tablename__ = "eventos_outbox"
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True)  # = event_id
+    tipo: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    estado: Mapped[str] = mapped_column(String(20), nullable=False, default=PENDIENTE,
+                                        server_default=PENDIENTE)
+    intentos: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    completados: Mapped[list] = mapped_column(JSONB, nullable=False, default=list,
+                                              server_default=text("'[]'::jsonb"))
+    disponible_en: Mapped[datetime] = mapped_column(DateTime, nullable=False,
+                                                    server_default=func.now())
+    creado_en: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=func.now())
+    procesado_en: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    ultimo_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    __table_args__ = (
+        # Solo las pendientes: el índice se mantiene pequeño aunque el histórico crezca.
+        Index("ix_eventos_outbox_pendientes", "disponible_en",
+              postgresql_where=text("estado = 'PENDIENTE'")),
+    )
+
+    def __repr__(self) -> str:
+        return f"<EventoOutbox(tipo='{self.tipo}', estado='{self.estado}', intentos={self.intentos})>"
+
+
+# -----------------------------------------------------------------------
+# Serialización de eventos
+# -----------------------------------------------------------------------
+
+def _tipos_evento() -> Dict[str, Type]:
+    from .events import DomainEvent
+
+    tipos: Dict[str, Type] = {}
+    pendientes = list(DomainEvent.__subclasses__())
+    while pendientes:
+        cls = pendientes.pop()
+        tipos[cls.__name__] = cls
+        pendientes.extend(cls.__subclasses__())
+    return tipos
+
+
+def serializar_evento(event) -> Tuple[str, dict]:
+    """(tipo, payload JSON) de un DomainEvent."""
+    payload = {}
+    for f in dataclasses.fields(event):
+        valor = getattr(event, f.name)
+        if isinstance(valor, datetime):
+            valor = valor.isoformat()
+        elif isinstance(valor, tuple):
+            valor = list(valor)
+        payload[f.name] = valor
+    return type(event).__name__, payload
+
+
+def deserializar_evento(tipo: str, payload: dict):
+    """Reconstruye el DomainEvent; los campos desconocidos se ignoran."""
+    cls = _tipos_evento().get(tipo)
+    if cls is None:
+        raise LookupError(f"Tipo de evento desconocido: {tipo}")
+    kwargs = {}
+    for f in dataclasses.fields(cls):
+        if f.name not in payload:
+            continue
+        valor = payload[f.name]
+        if f.name == "timestamp" and isinstance(valor, str):
+            valor = datetime.fromisoformat(valor)
+        elif isinstance(valor, list) and isinstance(f.default, tuple):
+            valor = tuple(valor)
+        kwargs[f.name] = valor
+    return cls(**kwargs)
+
+
+def nombre_handler(handler: Callable) -> str:
+    """Clave estable de un handler para `completados`."""
+    return f"{getattr(handler, '__module__', '')}.{getattr(handler, '__qualname__', repr(handler))}"
+
+
+# -----------------------------------------------------------------------
+# Relay
+# -----------------------------------------------------------------------
+
+def siguiente_intento(intentos: int, base: float = 2.0, maximo: float = 900.0) -> float:
+    """Segundos hasta el próximo intento: exponencial con jitter (±25 %)."""
+    espera = min(maximo, base * (2 ** max(0, intentos - 1)))
+    return espera * random.uniform(0.75, 1.25)
+
+
+class OutboxRelay:
+    """Despacha por lotes los eventos del outbox. Uno por worker."""
+
+    def __init__(
+        self,
+        session_factory: Callable,
+        bus=None,
+        *,
+        tamano_lote: Optional[int] = None,
+        intervalo: Optional[float] = None,
+        max_intentos: Optional[int] = None,
+        lease: float = 300.0,
+        concurrencia: int = 10,
+        retencion_dias: int = 7,
+    ) -> None:
+        from .config import get_settings
+        from .events import event_bus
+
+        s = get_settings()
+        self.session_factory = session_factory
+        self.bus = bus or event_bus
+        self.tamano_lote = tamano_lote or s.outbox_batch_size
+        self.intervalo = intervalo if intervalo is not None else s.outbox_poll_seconds
+        self.max_intentos = max_intentos or s.outbox_max_attempts
+        self.lease = lease
+        self.concurrencia = concurrencia
+        self.retencion = timedelta(days=retencion_dias)
+        self._despertar = asyncio.Event()
+        self._tarea: Optional[asyncio.Task] = None
+        self._ultima_purga: Optional[datetime] = None
+        self.procesados = 0
+        self.fallidos = 0
+
+    # ---- ciclo ------------------------------------------------------------
+
+    def despertar(self) -> None:
+        """Aviso de que hay eventos nuevos (commit en este proceso)."""
+        self._despertar.set()
+
+    def start(self) -> None:
+        if self._tarea is None:
+            self._tarea = asyncio.create_task(self._bucle(), name="outbox-relay")
+
+    async def close(self) -> None:
+        if self._tarea is not None:
+            self._tarea.cancel()
+            try:
+                await self._tarea
+            except asyncio.CancelledError:
+                pass
+            self._tarea = None
+
+    async def _bucle(self) -> None:
+        while True:
+            try:
+                n = await self.procesar_lote()
+                if n >= self.tamano_lote:
+                    continue  # hay cola: siguiente lote sin esperar
+                await self._purgar_si_toca()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Outbox: error procesando lote")
+            self._despertar.clear()
+            try:
+                await asyncio.wait_for(self._despertar.wait(), timeout=self.intervalo)
+            except asyncio.TimeoutError:
+                pass
+
+    # ---- lote -------------------------------------------------------------
+
+    async def _reclamar(self) -> List[Any]:
+        t = EventoOutbox
+        candidatas = (
+            select(t.id)
+            .where(t.estado == PENDIENTE, t.disponible_en <= func.now())
+            .order_by(t.disponible_en)
+            .limit(self.tamano_lote)
+            .with_for_update(skip_locked=True)
+        )
+        async with self.session_factory() as session:
+            filas = (await session.execute(
+                update(t)
+                .where(t.id.in_(candidatas.scalar_subquery()))
+                .values(
+                    disponible_en=func.now() + timedelta(seconds=self.lease),
+                    intentos=t.intentos + 1,
+                )
+                .returning(t.id, t.tipo, t.payload, t.intentos, t.completados)
+                .execution_options(synchronize_session=False)
+            )).all()
+            await session.commit()
+        return filas
+
+    async def despachar(self, tipo: str, payload: dict, completados: Sequence[str]) -> Tuple[List[str], Optional[str]]:
+        """Ejecuta los handlers aún no completados. Devuelve (completados, error)."""
+        event = deserializar_evento(tipo, payload)
+        hechos = list(completados)
+        errores = []
+        for handler in self.bus.handlers_de(type(event)):
+            clave = nombre_handler(handler)
+            if clave in hechos:
+                continue
+            try:
+                await handler(event)
+                hechos.append(clave)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Outbox: handler %s falló para %s: %s", clave, tipo, exc)
+                errores.append(f"{clave}: {exc!r}")
+        return hechos, ("\n".join(errores) or None)
+
+    async def procesar_lote(self) -> int:
+        """Reclama y despacha un lote. Devuelve el nº de filas reclamadas."""
+        filas = await self._reclamar()
+        if not filas:
+            return 0
+        semaforo = asyncio.Semaphore(self.concurrencia)
+
+        async def _uno(fila):
+            async with semaforo:
+                try:
+                    hechos, error = await self.despachar(fila.tipo, fila.payload, fila.completados or [])
+                except Exception as exc:  # noqa: BLE001  (p.ej. tipo desconocido)
+                    hechos, error = list(fila.completados or []), repr(exc)
+                return fila, hechos, error
+
+        resultados = await asyncio.gather(*(_uno(f) for f in filas))
+
+        t = EventoOutbox
+        async with self.session_factory() as session:
+            for fila, hechos, error in resultados:
+                if error is None:
+                    valores = dict(estado=PROCESADO, procesado_en=func.now(), completados=hechos,
+                                   ultimo_error=None)
+                    self.procesados += 1
+                elif fila.intentos >= self.max_intentos:
+                    logger.error("Outbox: evento %s (%s) a dead-letter tras %d intentos: %s",
+                                 fila.id, fila.tipo, fila.intentos, error)
+                    valores = dict(estado=FALLIDO, completados=hechos, ultimo_error=error)
+                    self.fallidos += 1
+                else:
+                    valores = dict(
+                        completados=hechos, ultimo_error=error,
+                        disponible_en=func.now() + timedelta(seconds=siguiente_intento(fila.intentos)),
+                    )
+                await session.execute(update(t).where(t.id == fila.id).values(**valores))
+            await session.commit()
+        return len(filas)
+
+    async def _purgar_si_toca(self) -> None:
+        ahora = datetime.utcnow()
+        if self._ultima_purga and ahora - self._ultima_purga < timedelta(hours=1):
+            return
+        self._ultima_purga = ahora
+        async with self.session_factory() as session:
+            await session.execute(delete(EventoOutbox).where(
+                EventoOutbox.estado == PROCESADO,
+                EventoOutbox.procesado_en < func.now() - self.retencion,
+            ))
+            await session.commit()
+
+    def stats(self) -> dict:
+        return {"procesados": self.procesados, "fallidos": self.fallidos,
+                "activo": self._tarea is not None and not self._tarea.done()}
+
+
+async def reintentar_fallidos(session, ids: Optional[Iterable[uuid.UUID]] = None) -> int:
+    """Reencola eventos en dead-letter (todos o los `ids` dados). No hace commit."""
+    q = (
+        update(EventoOutbox)
+        .where(EventoOutbox.estado == FALLIDO)
+        .values(estado=PENDIENTE, intentos=0, disponible_en=func.now())
+    )
+    if ids is not None:
+        q = q.where(EventoOutbox.id.in_(list(ids)))
+    res = await session.execute(q.execution_options(synchronize_session=False))
+    return res.rowcount or 0
+
+
+# Relay del proceso (lo fija el lifespan); `enqueue` lo despierta tras el commit.
+outbox_relay: Optional[OutboxRelay] = None
+
+
+def set_relay(relay: Optional[OutboxRelay]) -> None:
+    global outbox_relay
+    outbox_relay = relay
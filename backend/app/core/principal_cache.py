@@ -0,0 +1,205 @@
+"""Caché del usuario autenticado (principal) y de sus role_ids entre peticiones.
+
+Cada petición autenticada hacía dos consultas antes de llegar al resolver: el
+`SELECT` de `Usuario` en `load_user_from_token` (más la carga de sus relaciones) y el
+de `UsuarioRol` en la primera comprobación de permisos. Esta caché las evita.
+
+- Clave: (usuario_id, `iat` del token). Un login nuevo emite otro `iat` y, por
+  tanto, parte de una entrada limpia.
+- LRU acotada (`AUTH_CACHE_MAX_ENTRIES`) con TTL corto (`AUTH_CACHE_TTL_SECONDS`).
+- Se guarda la instancia `Usuario` desacoplada de su sesión (expire_on_commit=False):
+  solo se leen sus columnas. Quien necesite modificar el usuario debe volver a
+  cargarlo en su sesión (como ya hace `cambiar_mi_password`).
+- Invalidación por eventos (`wire_principal_invalidation` en app.core.events):
+  cargos, roles de usuario, roles y altas/bajas de usuarios. Los eventos llegan al
+  resto de workers por LISTEN/NOTIFY (app/core/difusion_eventos.py); con
+  `REDIS_URL` se difunden además por pub/sub.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, FrozenSet, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CANAL = "siga:principal_cache"
+_TODOS = "*"
+
+Clave = Tuple[str, Any]
+
+
+@dataclass
+class _Entrada:
+    user: Any = None
+    role_ids: Optional[FrozenSet[str]] = None
+    expira: float = 0.0
+
+
+class PrincipalCache:
+    """LRU con TTL de principales, indexada por (usuario_id, iat)."""
+
+    def __init__(self, max_entries: int = 2048, ttl: float = 30.0) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entradas: "OrderedDict[Clave, _Entrada]" = OrderedDict()
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def activa(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    # ------------------------------------------------------------------
+    # Lectura / escritura
+    # ------------------------------------------------------------------
+
+    def _entrada(self, usuario_id: str, iat: Any) -> Optional[_Entrada]:
+        if iat is None or not self.activa:
+            return None
+        clave = (str(usuario_id), iat)
+        entrada = self._entradas.get(clave)
+        if entrada is None:
+            return None
+        if entrada.expira <= time.monotonic():
+            del self._entradas[clave]
+            return None
+        self._entradas.move_to_end(clave)
+        return entrada
+
+    def _entrada_para_escribir(self, usuario_id: str, iat: Any) -> Optional[_Entrada]:
+        if iat is None or not self.activa:
+            return None
+        entrada = self._entrada(usuario_id, iat)
+        if entrada is None:
+            entrada = _Entrada(expira=time.monotonic() + self.ttl)
+            self._entradas[(str(usuario_id), iat)] = entrada
+            while len(self._entradas) > self.max_entries:
+                self._entradas.popitem(last=False)
+        return entrada
+
+    def get_user(self, usuario_id: str, iat: Any):
+        entrada = self._entrada(usuario_id, iat)
+        if entrada is None or entrada.user is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entrada.user
+
+    def set_user(self, usuario_id: str, iat: Any, user) -> None:
+        entrada = self._entrada_para_escribir(usuario_id, iat)
+        if entrada is not None:
+            entrada.user = user
+
+    def get_role_ids(self, usuario_id: str, iat: Any) -> Optional[FrozenSet[str]]:
+        entrada = self._entrada(usuario_id, iat)
+        if entrada is None or entrada.role_ids is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entrada.role_ids
+
+    def set_role_ids(self, usuario_id: str, iat: Any, role_ids: FrozenSet[str]) -> None:
+        entrada = self._entrada_para_escribir(usuario_id, iat)
+        if entrada is not None:
+            entrada.role_ids = role_ids
+
+    # ------------------------------------------------------------------
+    # Invalidación
+    # ------------------------------------------------------------------
+
+    def _descartar(self, usuario_id: str) -> None:
+        if usuario_id == _TODOS:
+            self._entradas.clear()
+            return
+        for clave in [c for c in self._entradas if c[0] == usuario_id]:
+            del self._entradas[clave]
+
+    async def invalidate_user(self, usuario_id: str) -> None:
+        """Descarta las entradas de un usuario en este worker y en los demás."""
+        self._descartar(str(usuario_id))
+        await self._difundir(str(usuario_id))
+
+    async def invalidate_all(self) -> None:
+        """Vacía la caché (p. ej. tras reconfigurar una junta o cambiar un rol)."""
+        self._descartar(_TODOS)
+        await self._difundir(_TODOS)
+
+    async def _difundir(self, mensaje: str) -> None:
+        if self._redis is None:
+            return
+        try:
+            await self._redis.publish(CANAL, mensaje)
+        except Exception:
+            logger.warning("No se pudo difundir la invalidación de principal %s", mensaje)
+
+    def stats(self) -> dict:
+        return {"entradas": len(self._entradas), "hits": self.hits, "misses": self.misses}
+
+    # ------------------------------------------------------------------
+    # Redis (opcional)
+    # ------------------------------------------------------------------
+
+    async def connect(self, redis_url: str) -> bool:
+        """Conecta con Redis y escucha invalidaciones de otros workers."""
+        if not redis_url or self._redis is not None:
+            return False
+        try:
+            import redis.asyncio as aioredis
+        except ImportError:
+            return False
+        client = aioredis.from_url(redis_url, decode_responses=True)
+        try:
+            await client.ping()
+        except Exception as e:
+            logger.warning("Redis no disponible (%s): caché de principal solo por proceso", e)
+            await client.aclose()
+            return False
+        self._redis = client
+        self._listener = asyncio.create_task(self._escuchar())
+        return True
+
+    async def _escuchar(self) -> None:
+        while True:
+            try:
+                pubsub = self._redis.pubsub()
+                await pubsub.subscribe(CANAL)
+                async for mensaje in pubsub.listen():
+                    if mensaje.get("type") == "message":
+                        self._descartar(str(mensaje["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Listener de la caché de principal caído; reintentando en 5 s")
+                # Lo perdido mientras tanto no se puede reconstruir: vaciar.
+                self._descartar(_TODOS)
+                await asyncio.sleep(5)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+def _crear_cache() -> PrincipalCache:
+    from .config import get_settings
+    settings = get_settings()
+    return PrincipalCache(
+        max_entries=settings.auth_cache_max_entries,
+        ttl=settings.auth_cache_ttl_seconds,
+    )
+
+
+# Instancia global (por proceso)
+principal_cache = _crear_cache()
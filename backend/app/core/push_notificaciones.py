@@ -0,0 +1,226 @@
+"""Push del contador de notificaciones no leídas (badge) a los navegadores.
+
+El frontend sondeaba `misNotificacionesNoLeidas`. Ahora abre un flujo SSE
+(`GET /api/notificaciones/stream`, app/api/notificaciones.py) y recibe el
+contador cada vez que cambia.
+
+- Origen: el trigger de `contadores_notificaciones` hace
+  `pg_notify('siga_notificaciones', usuario_id)` en cada cambio del recuento.
+  Así se cubre cualquier camino (`NotificacionService.emitir`, marcar leída,
+  archivar, SQL directo) y el aviso solo sale al confirmar la transacción.
+- Reparto entre workers: cada worker mantiene una conexión dedicada con
+  `LISTEN` (no la del pool; requiere conexión directa o pooler en modo
+  sesión). Postgres entrega cada aviso a todos los workers.
+- Reparto por usuario: cada worker guarda las colas de las suscripciones
+  abiertas por usuario. Los avisos de usuarios sin suscripción local se
+  descartan sin tocar la BD; los demás se agrupan y se leen sus contadores en
+  una sola consulta por tanda.
+- Cada cola tiene hueco para un valor: si el cliente va lento, el valor
+  pendiente se sustituye por el último (solo importa el recuento actual).
+
+Si la conexión de escucha cae, se reintenta cada 5 s y al volver se reenvía
+el contador a todas las suscripciones (los avisos perdidos no se recuperan).
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import uuid
+from typing import Dict, Iterable, Optional, Set
+
+from sqlalchemy import select
+
+logger = logging.getLogger(__name__)
+
+CANAL = "siga_notificaciones"
+# Marca de cierre del hub (teardown del worker): termina las suscripciones.
+_FIN = object()
+
+
+class Suscripcion:
+    """Suscripción de un flujo SSE al contador de un usuario."""
+
+    def __init__(self, hub: "HubNotificaciones", usuario_id: str) -> None:
+        self.hub = hub
+        self.usuario_id = usuario_id
+        self.cola: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self.cerrada = False
+
+    async def __aenter__(self) -> "Suscripcion":
+        self.hub._alta(self)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.hub._baja(self)
+
+    def entregar(self, valor) -> None:
+        """Deja `valor` en la cola sustituyendo el pendiente, si lo hay."""
+        if self.cola.full():
+            self.cola.get_nowait()
+        self.cola.put_nowait(valor)
+
+    async def siguiente(self, timeout: float) -> Optional[int]:
+        """Siguiente contador; None si vence `timeout` o si el hub se cierra."""
+        try:
+            valor = await asyncio.wait_for(self.cola.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if valor is _FIN:
+            self.cerrada = True
+            return None
+        return valor
+
+
+class HubNotificaciones:
+    """Reparto por usuario (por proceso) de los avisos de `pg_notify`."""
+
+    def __init__(self) -> None:
+        self._suscripciones: Dict[str, Set[Suscripcion]] = {}
+        self._pendientes: Set[str] = set()
+        self._aviso: Optional[asyncio.Event] = None
+        self._session_factory = None
+        self._dsn: Optional[str] = None
+        self._tareas: list[asyncio.Task] = []
+        self.escuchando = False
+        self.entregas = 0
+
+    @property
+    def activo(self) -> bool:
+        """True si hay conexión de escucha (si no, el cliente debe sondear)."""
+        return self.escuchando
+
+    def suscripcion(self, usuario_id) -> Suscripcion:
+        return Suscripcion(self, str(usuario_id))
+
+    def _alta(self, sub: Suscripcion) -> None:
+        self._suscripciones.setdefault(sub.usuario_id, set()).add(sub)
+
+    def _baja(self, sub: Suscripcion) -> None:
+        subs = self._suscripciones.get(sub.usuario_id)
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                del self._suscripciones[sub.usuario_id]
+
+    def stats(self) -> dict:
+        return {
+            "escuchando": self.escuchando,
+            "usuarios": len(self._suscripciones),
+            "suscripciones": sum(len(s) for s in self._suscripciones.values()),
+            "entregas": self.entregas,
+        }
+
+    # ------------------------------------------------------------------
+    # Avisos → contadores → colas
+    # ------------------------------------------------------------------
+
+    def avisar(self, usuario_ids: Iterable[str]) -> None:
+        """Marca usuarios con cambios; solo cuentan los que tienen suscripción aquí."""
+        locales = [u for u in usuario_ids if u in self._suscripciones]
+        if locales:
+            self._pendientes.update(locales)
+            if self._aviso is not None:
+                self._aviso.set()
+
+    def _al_notificar(self, _conexion, _pid, _canal, payload: str) -> None:
+        self.avisar((payload,))
+
+    async def leer_contadores(self, usuario_ids: Iterable[str]) -> Dict[str, int]:
+        """Contadores de varios usuarios en una consulta (0 si no tienen fila)."""
+        from app.modules.core.comunicacion import ContadorNotificaciones
+        ids = list(usuario_ids)
+        async with self._session_factory() as session:
+            filas = (await session.execute(
+                select(ContadorNotificaciones.usuario_id, ContadorNotificaciones.no_leidas)
+                .where(ContadorNotificaciones.usuario_id.in_([uuid.UUID(u) for u in ids]))
+            )).all()
+        contadores = {u: 0 for u in ids}
+        contadores.update({str(u): n for u, n in filas})
+        return contadores
+
+    async def despachar_pendientes(self) -> None:
+        """Lee los contadores de los usuarios avisados y los entrega."""
+        ids, self._pendientes = self._pendientes, set()
+        ids &= self._suscripciones.keys()
+        if not ids:
+            return
+        for usuario_id, valor in (await self.leer_contadores(ids)).items():
+            for sub in list(self._suscripciones.get(usuario_id, ())):
+                sub.entregar(valor)
+                self.entregas += 1
+
+    async def _despachar(self) -> None:
+        while True:
+            await self._aviso.wait()
+            self._aviso.clear()
+            try:
+                await self.despachar_pendientes()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Error despachando contadores de notificaciones")
+
+    # ------------------------------------------------------------------
+    # Conexión de escucha
+    # ------------------------------------------------------------------
+
+    async def connect(self, session_factory, dsn: str) -> None:
+        """Arranca la escucha de `CANAL` y el despacho (lifespan)."""
+        if self._tareas:
+            return
+        self._session_factory = session_factory
+        self._dsn = dsn
+        self._aviso = asyncio.Event()
+        self._tareas = [
+            asyncio.create_task(self._escuchar()),
+            asyncio.create_task(self._despachar()),
+        ]
+
+    async def _escuchar(self) -> None:
+        import asyncpg
+
+        while True:
+            conexion = None
+            try:
+                conexion = await asyncpg.connect(self._dsn)
+                caida = asyncio.Event()
+                conexion.add_termination_listener(lambda _c: caida.set())
+                await conexion.add_listener(CANAL, self._al_notificar)
+                self.escuchando = True
+                # Lo que cambió mientras no escuchábamos: reenviar a todos.
+                self.avisar(list(self._suscripciones))
+                await caida.wait()
+                logger.warning("Conexión LISTEN de notificaciones cerrada; reintentando")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("LISTEN de notificaciones no disponible (%s); reintentando en 5 s", e)
+            finally:
+                self.escuchando = False
+                if conexion is not None and not conexion.is_closed():
+                    with contextlib.suppress(Exception):
+                        await conexion.close()
+            await asyncio.sleep(5)
+
+    async def close(self) -> None:
+        """Cierra las suscripciones abiertas y la escucha (teardown)."""
+        for subs in self._suscripciones.values():
+            for sub in subs:
+                sub.entregar(_FIN)
+        for tarea in self._tareas:
+            tarea.cancel()
+        for tarea in self._tareas:
+            with contextlib.suppress(asyncio.CancelledError):
+                await tarea
+        self._tareas = []
+
+
+def dsn_escucha() -> str:
+    """DSN de asyncpg (sin el `+asyncpg` del dialecto de SQLAlchemy)."""
+    from .config import get_settings
+    return get_settings().database_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+
+# Instancia global (por proceso)
+hub_notificaciones = HubNotificaciones()
@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
 
 import bcrypt
 import jwt
@@ -78,8 +78,8 @@ def extract_bearer_token(authorization_header: Optional[str]) -> Optional[str]:
     return parts[1].strip() or None
 
 
-async def load_user_from_token(session: AsyncSession, token: str) -> Optional[Usuario]:
-    """Decodifica el token y carga el usuario asociado. None si no es válido."""
+def decode_principal(token: str) -> Optional[Tuple[uuid.UUID, Optional[int]]]:
+    """Valida el token y devuelve (usuario_id, iat). None si no es válido."""
     try:
         payload = decode_access_token(token)
     except TokenError:
@@ -91,6 +91,29 @@ async def load_user_from_token(session: AsyncSession, token: str) -> Optional[Us
         usuario_id = uuid.UUID(sub)
     except (ValueError, TypeError):
         return None
+    return usuario_id, payload.get("iat")
+
+
+async def load_user(
+    session: AsyncSession, usuario_id: uuid.UUID, iat: Optional[int] = None
+) -> Optional[Usuario]:
+    """Carga el usuario activo, sirviéndolo de la caché de principal si está."""
+    from .principal_cache import principal_cache
+
+    user = principal_cache.get_user(str(usuario_id), iat)
+    if user is not None:
+        return user
     stmt = select(Usuario).where(Usuario.id == usuario_id, Usuario.activo == True)  # noqa: E712
     result = await session.execute(stmt)
-    return result.scalar_one_or_none()
+    user = result.scalar_one_or_none()
+    if user is not None:
+        principal_cache.set_user(str(usuario_id), iat, user)
+    return user
+
+
+async def load_user_from_token(session: AsyncSession, token: str) -> Optional[Usuario]:
+    """Decodifica el token y carga el usuario asociado. None si no es válido."""
+    principal = decode_principal(token)
+    if principal is None:
+        return None
+    return await load_user(session, *principal)
@@ -19,6 +19,9 @@ from app.modules.acceso.models.rol import Rol, TipoRol
 from app.modules.acceso.models.funcionalidad import RolFuncionalidad
 from app.modules.acceso.models.rol_transaccion import RolTransaccion
 from app.modules.acceso.models.usuario import UsuarioRol
+from app.core.events import (
+    event_bus, PermissionChanged, RoleCreated, RoleDeleted, RoleUpdated, UserRolesChanged,
+)
 from app.graphql.permissions import RequireTransaction
 
 
@@ -98,6 +101,7 @@ class AccesoMutation:
             session.add(RolTransaccion(rol_id=rol.id, transaccion_id=tid))
 
         await session.commit()
+        await event_bus.publish(RoleCreated(role_id=str(rol.id), role_codigo=rol.codigo))
         return rol.id
 
     @strawberry.mutation(permission_classes=[RequireTransaction("ACCESO_ROL_EDITAR")])
@@ -177,6 +181,7 @@ class AccesoMutation:
                 session.add(RolTransaccion(rol_id=rol.id, transaccion_id=tid))
 
         await session.commit()
+        await event_bus.publish(RoleUpdated(role_id=str(rol.id)))
         return rol.id
 
     # ── Rol ↔ Transacción (usadas en PermisosRol) ───────────────────────────
@@ -200,6 +205,9 @@ class AccesoMutation:
         rt = RolTransaccion(rol_id=rol_id, transaccion_id=transaccion_id, eliminado=False, fecha_creacion=datetime.utcnow())
         session.add(rt)
         await session.commit()
+        await event_bus.publish(PermissionChanged(
+            role_id=str(rol_id), transaction_id=str(transaccion_id),
+        ))
         return rt.id
 
     @strawberry.mutation(permission_classes=[RequireTransaction("ACCESO_FUNC_REVOCAR")])
@@ -220,6 +228,9 @@ class AccesoMutation:
         if rt:
             await session.delete(rt)
             await session.commit()
+            await event_bus.publish(PermissionChanged(
+                role_id=str(rol_id), transaction_id=str(transaccion_id),
+            ))
         return True
 
     # ── Usuario ↔ Rol ────────────────────────────────────────────────────────
@@ -250,6 +261,7 @@ class AccesoMutation:
         )
         session.add(ur)
         await session.commit()
+        await event_bus.publish(UserRolesChanged(usuario_id=str(usuario_id)))
         return ur.id
 
     @strawberry.mutation(permission_classes=[RequireTransaction("ACCESO_ROL_ELIMINAR")])
@@ -269,6 +281,7 @@ class AccesoMutation:
 
         await session.execute(sa_delete(Rol).where(Rol.id == id))
         await session.commit()
+        await event_bus.publish(RoleDeleted(role_id=str(id)))
         return True
 
     @strawberry.mutation(permission_classes=[RequireTransaction("ACCESO_ROL_REVOCAR")])
@@ -289,4 +302,5 @@ class AccesoMutation:
         if ur:
             await session.delete(ur)
             await session.commit()
+            await event_bus.publish(UserRolesChanged(usuario_id=str(usuario_id)))
         return True
@@ -10,6 +10,7 @@ import strawberry
 
 from app.modules.actividades.services.actividad_service import ActividadService
 from app.graphql.types_auto import ActividadType, TareaType, ParticipacionType, GrupoTrabajoType
+from app.core.carga import recargar
 from app.graphql.permissions import RequireTransaction
 
 
@@ -124,7 +125,7 @@ class ActividadResolverMutation:
 
     @strawberry.mutation(permission_classes=[RequireTransaction("ACTIVIDAD_CREAR")])
     async def crear_actividad(self, info: strawberry.Info, data: ActividadCreateData) -> ActividadType:
-        return await ActividadService(info.context.session).crear(
+        actividad = await ActividadService(info.context.session).crear(
             nombre=data.nombre, tipo_actividad_id=data.tipo_actividad_id,
             estado_id=data.estado_id, caracter=data.caracter,
             descripcion=data.descripcion, padre_id=data.padre_id,
@@ -140,6 +141,7 @@ class ActividadResolverMutation:
             datos_conexion_telematica=data.datos_conexion_telematica,
             presupuesto_estimado=data.presupuesto_estimado,
         )
+        return await recargar(info.context.session, actividad, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("ACTIVIDAD_EDITAR")])
     async def actualizar_actividad(self, info: strawberry.Info, data: ActividadUpdateData) -> ActividadType:
@@ -154,16 +156,18 @@ class ActividadResolverMutation:
             'presupuesto_estimado',
             'presupuesto_ejecutado', 'eliminado',
         ]}
-        return await ActividadService(info.context.session).actualizar(data.id, campos)
+        actividad = await ActividadService(info.context.session).actualizar(data.id, campos)
+        return await recargar(info.context.session, actividad, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("ACTIVIDAD_EDITAR")])
     async def crear_tarea(self, info: strawberry.Info, data: TareaCreateData) -> TareaType:
-        return await ActividadService(info.context.session).crear_tarea(
+        tarea = await ActividadService(info.context.session).crear_tarea(
             titulo=data.titulo, estado_id=data.estado_id, descripcion=data.descripcion,
             prioridad=data.prioridad, orden=data.orden, responsable_id=data.responsable_id,
             horas_estimadas=data.horas_estimadas, horas_reales=data.horas_reales,
             fecha_limite=data.fecha_limite, actividad_id=data.actividad_id, grupo_id=data.grupo_id,
         )
+        return await recargar(info.context.session, tarea, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("ACTIVIDAD_EDITAR")])
     async def actualizar_tarea(self, info: strawberry.Info, data: TareaUpdateData) -> TareaType:
@@ -171,34 +175,38 @@ class ActividadResolverMutation:
             'titulo', 'estado_id', 'descripcion', 'prioridad', 'orden',
             'responsable_id', 'horas_estimadas', 'horas_reales', 'fecha_limite',
         ]}
-        return await ActividadService(info.context.session).actualizar_tarea(data.id, campos)
+        tarea = await ActividadService(info.context.session).actualizar_tarea(data.id, campos)
+        return await recargar(info.context.session, tarea, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("ACTIVIDAD_PARTICIPANTE_GESTIONAR")])
     async def crear_participacion(self, info: strawberry.Info, data: ParticipacionCreateData) -> ParticipacionType:
-        return await ActividadService(info.context.session).crear_participacion(
+        participacion = await ActividadService(info.context.session).crear_participacion(
             actividad_id=data.actividad_id, rol=data.rol, miembro_id=data.miembro_id,
             nombre_externo=data.nombre_externo, email_externo=data.email_externo,
             confirmado=data.confirmado, asistio=data.asistio,
             horas_aportadas=data.horas_aportadas,
         )
+        return await recargar(info.context.session, participacion, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("ACTIVIDAD_EDITAR")])
     async def transicionar_actividad(
         self, info: strawberry.Info,
         id: uuid.UUID, estado_id: uuid.UUID, notas: Optional[str] = None,
     ) -> ActividadType:
-        return await ActividadService(info.context.session).transicionar_estado(id, estado_id, notas)
+        actividad = await ActividadService(info.context.session).transicionar_estado(id, estado_id, notas)
+        return await recargar(info.context.session, actividad, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("ACTIVIDAD_APROBAR")])
     async def aprobar_actividad(
         self, info: strawberry.Info,
         id: uuid.UUID, estado_id: uuid.UUID, notas: Optional[str] = None,
     ) -> ActividadType:
-        return await ActividadService(info.context.session).aprobar(
+        actividad = await ActividadService(info.context.session).aprobar(
             id, estado_id,
             aprobado_por_id=getattr(info.context, 'user_id', None),
             notas=notas,
         )
+        return await recargar(info.context.session, actividad, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("GRUPO_CREAR")])
     async def crear_grupo_trabajo_seguro(
@@ -210,12 +218,13 @@ class ActividadResolverMutation:
         agrupacion_id: Optional[uuid.UUID] = None,
         campania_id: Optional[uuid.UUID] = None,
     ) -> GrupoTrabajoType:
-        return await ActividadService(info.context.session).crear_grupo_trabajo(
+        grupo = await ActividadService(info.context.session).crear_grupo_trabajo(
             nombre=nombre, tipo_grupo_id=tipo_grupo_id, descripcion=descripcion,
             objetivo=objetivo, fecha_inicio=fecha_inicio, fecha_fin=fecha_fin,
             coordinador_id=coordinador_id, agrupacion_id=agrupacion_id,
             campania_id=campania_id,
         )
+        return await recargar(info.context.session, grupo, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("ACTIVIDAD_EDITAR")])
     async def cerrar_actividad(
@@ -224,8 +233,9 @@ class ActividadResolverMutation:
         asistencia_real: Optional[int] = None, presupuesto_ejecutado: Optional[Decimal] = None,
         estado_id: Optional[uuid.UUID] = None,
     ) -> ActividadType:
-        return await ActividadService(info.context.session).cerrar(
+        actividad = await ActividadService(info.context.session).cerrar(
             id, estado_id=estado_id, valoracion=valoracion,
             objetivos_cumplidos=objetivos_cumplidos,
             asistencia_real=asistencia_real, presupuesto_ejecutado=presupuesto_ejecutado,
         )
+        return await recargar(info.context.session, actividad, info)
@@ -11,6 +11,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
 
 from ..core.audit import log_action
+from ..core.events import event_bus, UserUpdated
 from ..core.security import create_access_token, hash_password, verify_password
 from ..modules.acceso.models.auditoria import TipoAccion
 from ..modules.acceso.models.usuario import Usuario, UsuarioRol
@@ -233,6 +234,7 @@ class AuthMutation:
             raise ValueError("No puedes desactivar tu propia cuenta")
         usuario.activo = False
         await session.commit()
+        await event_bus.publish(UserUpdated(usuario_id=str(usuario.id)))
         return True
 
     @strawberry.mutation(permission_classes=[RequireTransaction("ACCESO_USUARIO_ELIMINAR")])
@@ -270,6 +272,7 @@ class AuthMutation:
             usuario.eliminado = True
             usuario.activo = False
             await session.commit()
+            await event_bus.publish(UserUpdated(usuario_id=str(id)))
             return True
 
         # Hard-delete: borra dependencias propias y luego la fila.
@@ -278,6 +281,7 @@ class AuthMutation:
             await session.execute(delete(Sesion).where(Sesion.usuario_id == id))
             await session.execute(delete(Usuario).where(Usuario.id == id))
             await session.commit()
+            await event_bus.publish(UserUpdated(usuario_id=str(id)))
             return True
         except IntegrityError:
             await session.rollback()
@@ -392,13 +396,14 @@ class AuthMutation:
         usuario: Optional[Usuario] = info.context.user
         if not usuario:
             raise ValueError("No autenticado")
-        if not verify_password(password_actual, usuario.password_hash):
-            raise ValueError("La contraseña actual no es correcta")
-        if len(nueva_password) < 8:
-            raise ValueError("La nueva contraseña debe tener al menos 8 caracteres")
+        # `context.user` puede venir de la caché de principal: verificar contra la fila.
         session = info.context.session
         result = await session.execute(select(Usuario).where(Usuario.id == usuario.id))
         db_usuario = result.scalar_one()
+        if not verify_password(password_actual, db_usuario.password_hash):
+            raise ValueError("La contraseña actual no es correcta")
+        if len(nueva_password) < 8:
+            raise ValueError("La nueva contraseña debe tener al menos 8 caracteres")
         db_usuario.password_hash = hash_password(nueva_password)
         await session.commit()
         return True
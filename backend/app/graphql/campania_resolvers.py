@@ -11,8 +11,9 @@ from sqlalchemy import select
 
 from app.modules.actividades.services.campania_service import CampaniaService
 from app.graphql.types_auto import CampaniaType, PlantillaCampaniaType, PlantillaActividadType, PlantillaTareaType
+from app.core.carga import cargar_seleccion, recargar
 from app.graphql.permissions import RequireTransaction
-from app.modules.actividades.models.campana import PlantillaActividad, PlantillaTarea
+from app.modules.actividades.models.campana import Campania, PlantillaActividad, PlantillaTarea
 
 
 @strawberry.input
@@ -209,7 +210,7 @@ class CampaniaResolverMutation:
         if data.responsable_id is not None:
             from app.modules.acceso.services.ambito_territorial import ensure_rol_coordinador_campania
             await ensure_rol_coordinador_campania(info.context.session, data.responsable_id)
-        return campania
+        return await recargar(info.context.session, campania, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CAMPANA_EDITAR")])
     async def actualizar_campania(self, info: strawberry.Info, data: CampaniaUpdateInput) -> CampaniaType:
@@ -222,21 +223,23 @@ class CampaniaResolverMutation:
         if campos.get('responsable_id') is not None:
             from app.modules.acceso.services.ambito_territorial import ensure_rol_coordinador_campania
             await ensure_rol_coordinador_campania(info.context.session, campos['responsable_id'])
-        return campania
+        return await recargar(info.context.session, campania, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CAMPANA_EDITAR")])
     async def transicionar_campania(
         self, info: strawberry.Info, id: uuid.UUID, estado_id: uuid.UUID, notas: Optional[str] = None,
     ) -> CampaniaType:
-        return await CampaniaService(info.context.session).transicionar_estado(id, estado_id, notas)
+        campania = await CampaniaService(info.context.session).transicionar_estado(id, estado_id, notas)
+        return await recargar(info.context.session, campania, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CAMPANA_APROBAR")])
     async def aprobar_campania(
         self, info: strawberry.Info, id: uuid.UUID, estado_id: uuid.UUID, notas: Optional[str] = None,
     ) -> CampaniaType:
-        return await CampaniaService(info.context.session).aprobar(
+        campania = await CampaniaService(info.context.session).aprobar(
             id, estado_id, aprobado_por_id=getattr(info.context, 'user_id', None), notas=notas,
         )
+        return await recargar(info.context.session, campania, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CAMPANA_EDITAR")])
     async def previsualizar_notificacion_campania(
@@ -258,48 +261,54 @@ class CampaniaResolverMutation:
         presupuesto_ejecutado: Decimal, resultados_metas: list[ResultadoMetaInput],
         resultados_partidas: list[ResultadoPartidaInput], valoracion: Optional[str] = None,
     ) -> CampaniaType:
-        return await CampaniaService(info.context.session).cerrar(
+        campania = await CampaniaService(info.context.session).cerrar(
             id, estado_id=estado_id, presupuesto_ejecutado=presupuesto_ejecutado,
             resultados_metas=[{"meta_id": r.meta_id, "valor_real": r.valor_real} for r in resultados_metas],
             resultados_partidas=[{"partida_id": r.partida_id, "importe_real": r.importe_real} for r in resultados_partidas],
             valoracion=valoracion,
         )
+        return await recargar(info.context.session, campania, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CAMPANA_EDITAR")])
     async def guardar_metas_campania(
         self, info: strawberry.Info, campania_id: uuid.UUID, metas: list[MetaInput],
     ) -> CampaniaType:
-        return await CampaniaService(info.context.session).guardar_metas(
+        campania = await CampaniaService(info.context.session).guardar_metas(
             campania_id, [{"tipo_meta_id": m.tipo_meta_id, "valor_planificado": m.valor_planificado,
                            "notas": m.notas, "orden": m.orden} for m in metas],
         )
+        return await recargar(info.context.session, campania, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CAMPANA_EDITAR")])
     async def guardar_canales_campania(
         self, info: strawberry.Info, campania_id: uuid.UUID, canal_ids: list[uuid.UUID],
     ) -> CampaniaType:
-        return await CampaniaService(info.context.session).guardar_canales(campania_id, canal_ids)
+        campania = await CampaniaService(info.context.session).guardar_canales(campania_id, canal_ids)
+        return await recargar(info.context.session, campania, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CAMPANA_EDITAR")])
     async def guardar_partidas_campania(
         self, info: strawberry.Info, campania_id: uuid.UUID, partidas: list[PartidaInput],
     ) -> CampaniaType:
-        return await CampaniaService(info.context.session).guardar_partidas(
+        campania = await CampaniaService(info.context.session).guardar_partidas(
             campania_id, [{"concepto": p.concepto, "importe_estimado": p.importe_estimado,
                            "tipo_partida": p.tipo_partida, "orden": p.orden} for p in partidas],
         )
+        return await recargar(info.context.session, campania, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CAMPANA_EDITAR")])
     async def aplicar_plantilla(
         self, info: strawberry.Info, campania_id: uuid.UUID, plantilla_id: uuid.UUID,
     ) -> CampaniaType:
-        return await CampaniaService(info.context.session).aplicar_plantilla(campania_id, plantilla_id)
+        campania = await CampaniaService(info.context.session).aplicar_plantilla(campania_id, plantilla_id)
+        return await recargar(info.context.session, campania, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CAMPANA_EDITAR")])
     async def crear_plantilla(self, info: strawberry.Info, data: PlantillaCreateInput) -> PlantillaCampaniaType:
-        return await CampaniaService(info.context.session).crear_plantilla(
+        plantilla = await CampaniaService(info.context.session).crear_plantilla(
             data.tipo_campania_id, data.nombre, data.descripcion, data.activo,
         )
+        return await recargar(info.context.session, plantilla, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CAMPANA_EDITAR")])
     async def crear_plantilla_desde_campania(
@@ -307,33 +316,37 @@ class CampaniaResolverMutation:
         descripcion: Optional[str] = None,
     ) -> PlantillaCampaniaType:
         """Guarda una campaña existente como plantilla reutilizable (mismo tipo de campaña)."""
-        return await CampaniaService(info.context.session).crear_plantilla_desde_campania(
+        plantilla = await CampaniaService(info.context.session).crear_plantilla_desde_campania(
             campania_id, nombre, descripcion,
         )
+        return await recargar(info.context.session, plantilla, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CAMPANA_EDITAR")])
     async def actualizar_plantilla(self, info: strawberry.Info, data: PlantillaUpdateInput) -> PlantillaCampaniaType:
-        return await CampaniaService(info.context.session).actualizar_plantilla(
+        plantilla = await CampaniaService(info.context.session).actualizar_plantilla(
             data.plantilla_id, {"nombre": data.nombre, "descripcion": data.descripcion, "activo": data.activo},
         )
+        return await recargar(info.context.session, plantilla, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CAMPANA_EDITAR")])
     async def guardar_metas_plantilla(
         self, info: strawberry.Info, plantilla_id: uuid.UUID, metas: list[PlantillaMetaItemInput],
     ) -> PlantillaCampaniaType:
-        return await CampaniaService(info.context.session).guardar_metas_plantilla(
+        plantilla = await CampaniaService(info.context.session).guardar_metas_plantilla(
             plantilla_id, [{"tipo_meta_id": m.tipo_meta_id, "valor_sugerido": m.valor_sugerido,
                             "notas": m.notas, "orden": m.orden} for m in metas],
         )
+        return await recargar(info.context.session, plantilla, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CAMPANA_EDITAR")])
     async def guardar_partidas_plantilla(
         self, info: strawberry.Info, plantilla_id: uuid.UUID, partidas: list[PlantillaPartidaItemInput],
     ) -> PlantillaCampaniaType:
-        return await CampaniaService(info.context.session).guardar_partidas_plantilla(
+        plantilla = await CampaniaService(info.context.session).guardar_partidas_plantilla(
             plantilla_id, [{"concepto": p.concepto, "importe_estimado": p.importe_estimado,
                             "tipo_partida": p.tipo_partida, "orden": p.orden} for p in partidas],
         )
+        return await recargar(info.context.session, plantilla, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CAMPANA_EDITAR")])
     async def crear_plantilla_actividad(
@@ -347,7 +360,7 @@ class CampaniaResolverMutation:
         session.add(act)
         await session.commit()
         await session.refresh(act)
-        return act
+        return await recargar(session, act, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CAMPANA_EDITAR")])
     async def actualizar_plantilla_actividad(
@@ -361,7 +374,7 @@ class CampaniaResolverMutation:
                 setattr(act, campo, v)
         await session.commit()
         await session.refresh(act)
-        return act
+        return await recargar(session, act, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CAMPANA_EDITAR")])
     async def crear_plantilla_tarea(
@@ -376,7 +389,7 @@ class CampaniaResolverMutation:
         session.add(tarea)
         await session.commit()
         await session.refresh(tarea)
-        return tarea
+        return await recargar(session, tarea, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CAMPANA_EDITAR")])
     async def actualizar_plantilla_tarea(
@@ -390,7 +403,7 @@ class CampaniaResolverMutation:
                 setattr(tarea, campo, v)
         await session.commit()
         await session.refresh(tarea)
-        return tarea
+        return await recargar(session, tarea, info)
 
 
 @strawberry.type
@@ -398,17 +411,26 @@ class CampaniaClonarMutation:
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CAMPANA_EDITAR")])
     async def clonar_campania(self, info: strawberry.Info, data: ClonarCampaniaInput) -> CampaniaType:
-        return await CampaniaService(info.context.session).clonar(
+        campania = await CampaniaService(info.context.session).clonar(
             campania_id=data.campania_id, nombre=data.nombre, offset_dias=data.offset_dias,
             incluir_metas=data.incluir_metas, incluir_partidas=data.incluir_partidas,
             incluir_canales=data.incluir_canales, incluir_actividades=data.incluir_actividades,
             incluir_subcampanias=data.incluir_subcampanias, padre_id=data.padre_id,
         )
+        return await recargar(info.context.session, campania, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CAMPANA_EDITAR")])
     async def propagar_a_subcampanias(
         self, info: strawberry.Info, data: PropagarACampaniasInput,
     ) -> list[CampaniaType]:
-        return await CampaniaService(info.context.session).propagar_a_subcampanias(
+        session = info.context.session
+        campanias = await CampaniaService(session).propagar_a_subcampanias(
             data.campania_id, data.campos,
         )
+        if not campanias:
+            return []
+        return list((await session.execute(
+            select(Campania).where(Campania.id.in_([c.id for c in campanias]))
+            .options(*cargar_seleccion(Campania, info))
+            .execution_options(populate_existing=True)
+        )).scalars())
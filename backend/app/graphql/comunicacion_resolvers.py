@@ -17,6 +17,8 @@ from typing import Optional
 
 import strawberry
 
+from app.core.carga import cargar_seleccion
+from app.modules.core.comunicacion import Notificacion
 from app.graphql.types_auto import NotificacionType
 from app.graphql.permissions import RequireAuthenticated
 from app.infrastructure.services.notificacion_service import NotificacionService
@@ -70,6 +72,7 @@ class ComunicacionQuery:
             solo_no_archivadas=not incluir_archivadas,
             limite=limite,
             offset=offset,
+            opciones=cargar_seleccion(Notificacion, info),
         )
         return notificaciones  # strawchemy mapea Notificacion → NotificacionType
 
@@ -11,18 +11,58 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from strawberry.fastapi import BaseContext
 
-from ..core.database import async_session
-from ..core.security import extract_bearer_token, load_user_from_token
+from ..core.database import async_read_session, async_session
+from ..core.principal_cache import principal_cache
+from ..core.security import decode_principal, extract_bearer_token, load_user
 from ..modules.acceso.models.usuario import Usuario, UsuarioRol
 
 
 @dataclass
 class Context(BaseContext):
-    """Contexto GraphQL: sesión de BD + usuario autenticado + permisos en memoria."""
-    session: AsyncSession
+    """Contexto GraphQL: sesión de BD + usuario autenticado + permisos en memoria.
+
+    Las sesiones se abren de forma perezosa: una petición que no toca la BD (p. ej.
+    una query anónima resuelta en memoria) no saca conexión del pool. `session`
+    va al engine primario; `read_session`, al de solo lectura (informes).
+    """
     user: Optional[Usuario] = None
+    token_iat: Optional[int] = None
+    _session: Optional[AsyncSession] = field(default=None, repr=False, compare=False)
+    _read_session: Optional[AsyncSession] = field(default=None, repr=False, compare=False)
     _role_ids_cache: Optional[FrozenSet[str]] = field(default=None, repr=False, compare=False)
 
+    # ------------------------------------------------------------------
+    # Sesiones de BD (perezosas)
+    # ------------------------------------------------------------------
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = async_session()
+        return self._session
+
+    @property
+    def read_session(self) -> AsyncSession:
+        """Sesión de solo lectura para resolvers de informes (no ve lo no confirmado
+        en `session` dentro de la misma petición)."""
+        if self._read_session is None:
+            self._read_session = async_read_session()
+        return self._read_session
+
+    async def close(self, *, commit: bool) -> None:
+        """Confirma (o revierte) y cierra las sesiones que se hayan abierto."""
+        try:
+            if self._session is not None:
+                if commit:
+                    await self._session.commit()
+                else:
+                    await self._session.rollback()
+        finally:
+            for s in (self._session, self._read_session):
+                if s is not None:
+                    await s.close()
+            self._session = self._read_session = None
+
     # ------------------------------------------------------------------
     # Identidad
     # ------------------------------------------------------------------
@@ -36,16 +76,21 @@ class Context(BaseContext):
         return str(self.user.id) if self.user else None
 
     # ------------------------------------------------------------------
-    # Roles efectivos (un solo query por request, luego cached)
+    # Roles efectivos (caché de principal entre requests; si no, un query)
     # ------------------------------------------------------------------
 
     async def get_role_ids(self) -> FrozenSet[str]:
-        """Carga los role_ids activos del usuario desde DB (una sola vez por request)."""
+        """role_ids activos del usuario: de la caché de principal o, si no está,
+        desde DB (una sola vez por request)."""
         if self._role_ids_cache is not None:
             return self._role_ids_cache
         if self.user is None:
             self._role_ids_cache = frozenset()
             return self._role_ids_cache
+        cached = principal_cache.get_role_ids(self.user_id, self.token_iat)
+        if cached is not None:
+            self._role_ids_cache = cached
+            return cached
         result = await self.session.execute(
             select(UsuarioRol.rol_id).where(
                 UsuarioRol.usuario_id == self.user.id,
@@ -54,6 +99,7 @@ class Context(BaseContext):
             )
         )
         self._role_ids_cache = frozenset(str(row[0]) for row in result.all())
+        principal_cache.set_role_ids(self.user_id, self.token_iat, self._role_ids_cache)
         return self._role_ids_cache
 
     # ------------------------------------------------------------------
@@ -75,15 +121,18 @@ class Context(BaseContext):
 
 
 async def get_context(request: Request) -> AsyncGenerator[Context, None]:
-    """Construye el contexto: abre sesión de BD y resuelve el usuario actual."""
-    async with async_session() as session:
+    """Construye el contexto y resuelve el usuario actual. La sesión solo se abre
+    si algo la usa (la carga del usuario, si no está en la caché de principal, o
+    un resolver)."""
+    ctx = Context()
+    try:
         token = extract_bearer_token(request.headers.get("authorization"))
-        user = await load_user_from_token(session, token) if token else None
-
-        ctx = Context(session=session, user=user)
-        try:
-            yield ctx
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
+        principal = decode_principal(token) if token else None
+        if principal is not None:
+            usuario_id, ctx.token_iat = principal
+            ctx.user = await load_user(ctx.session, usuario_id, ctx.token_iat)
+        yield ctx
+    except Exception:
+        await ctx.close(commit=False)
+        raise
+    await ctx.close(commit=True)
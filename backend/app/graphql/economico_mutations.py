@@ -12,6 +12,7 @@ from uuid import UUID
 
 from sqlalchemy import select
 
+from ..core.carga import cargar
 from ..modules.economico.services.tesoreria_service import TesoreriaService
 from ..modules.economico.services.contabilidad_service import ContabilidadService
 from ..modules.economico.services.registro_contable import RegistroContable
@@ -26,7 +27,7 @@ from .permissions import RequireTransaction
 
 async def _vinculacion_socio_de_contacto(session, contacto_id):
     """Devuelve la vinculación SOCIO 'activa' de un contacto (con su satélite
-    Socio cargado por selectin), o None si no la hay."""
+    Socio cargado), o None si no la hay."""
     from ..modules.membresia.models.vinculacion import Vinculacion
     from ..modules.membresia.models.tipo_vinculacion import TipoVinculacion
     res = await session.execute(
@@ -38,6 +39,7 @@ async def _vinculacion_socio_de_contacto(session, contacto_id):
             Vinculacion.estado == "activa",
             Vinculacion.eliminado == False,
         )
+        .options(*cargar(Vinculacion, "socio"))
     )
     return res.scalars().first()
 
@@ -107,6 +109,26 @@ class PreviewLiquidacionType:
     totales: PreviewTotalesType
 
 
+@strawberry.type
+class EmparejamientoExtractoType:
+    """Pareja línea de extracto ↔ apunte propuesta o aplicada por el motor."""
+    extracto_id: UUID
+    apunte_id: UUID
+    criterio: str  # REFERENCIA | CONCEPTO | IMPORTE
+    puntuacion: float
+    fecha: date
+    importe: Decimal
+    concepto_extracto: str
+    concepto_apunte: str
+
+
+@strawberry.type
+class ResultadoConciliacionAutomaticaType:
+    aplicadas: list[EmparejamientoExtractoType]
+    propuestas: list[EmparejamientoExtractoType]
+    sin_emparejar: int
+
+
 @strawberry.type
 class ResultadoLiquidacionType:
     """Resumen del resultado de aplicar liquidar_remesa."""
@@ -254,7 +276,10 @@ class EconomicoFlujosMutation:
                     "Elige una instancia concreta."
                 )
             if actividad.campania_id:
-                rc = await session.execute(_select(Campania).where(Campania.id == actividad.campania_id))
+                rc = await session.execute(
+                    _select(Campania).where(Campania.id == actividad.campania_id)
+                    .options(*cargar(Campania, "estado"))
+                )
                 camp = rc.scalars().first()
                 if camp and camp.esta_cerrada:
                     raise ValueError(
@@ -337,7 +362,10 @@ class EconomicoFlujosMutation:
                     "No se puede imputar a una plantilla recurrente. Elige una instancia."
                 )
             if actividad.campania_id:
-                rc = await session.execute(_select(Campania).where(Campania.id == actividad.campania_id))
+                rc = await session.execute(
+                    _select(Campania).where(Campania.id == actividad.campania_id)
+                    .options(*cargar(Campania, "estado"))
+                )
                 camp = rc.scalars().first()
                 if camp and camp.esta_cerrada:
                     raise ValueError(
@@ -388,6 +416,32 @@ class EconomicoFlujosMutation:
         )
         return str(conciliacion.id)
 
+    @strawberry.mutation(permission_classes=[RequireTransaction("ECO_CONCILIACION_CONCILIAR_APUNTE")])
+    async def conciliar_extractos_automaticamente(
+        self,
+        info: strawberry.Info,
+        cuenta_id: UUID,
+        fecha_inicio: Optional[date] = None,
+        fecha_fin: Optional[date] = None,
+        aplicar: bool = True,
+    ) -> ResultadoConciliacionAutomaticaType:
+        """Empareja de una pasada las líneas de extracto pendientes con los apuntes.
+        Con `aplicar`, concilia las parejas inequívocas y devuelve el resto como
+        propuestas para confirmar con `conciliar_apunte_con_extracto`."""
+        service = TesoreriaService(info.context.session)
+        res = await service.conciliar_automaticamente(
+            cuenta_id=cuenta_id,
+            fecha_inicio=fecha_inicio,
+            fecha_fin=fecha_fin,
+            aplicar=aplicar,
+            usuario_id=getattr(info.context.user, 'id', None),
+        )
+        return ResultadoConciliacionAutomaticaType(
+            aplicadas=[EmparejamientoExtractoType(**p) for p in res["aplicadas"]],
+            propuestas=[EmparejamientoExtractoType(**p) for p in res["propuestas"]],
+            sin_emparejar=res["sin_emparejar"],
+        )
+
     @strawberry.mutation(permission_classes=[RequireTransaction("ECO_CONCILIACION_CONFIRMAR_PERIODO")])
     async def confirmar_conciliacion_periodo(
         self, info: strawberry.Info, conciliacion_id: UUID
@@ -403,7 +457,8 @@ class EconomicoFlujosMutation:
     ) -> int:
         """D8.1: parsea un fichero Norma 43 AEB (codificado base64) y carga las
         líneas en `ExtractoBancario`. Devuelve el número de líneas importadas.
-        Evita duplicar líneas ya existentes con misma fecha/importe/referencia."""
+        Evita duplicar líneas ya existentes con misma fecha/importe/referencia y
+        concilia automáticamente las que casan sin ambigüedad con un apunte."""
         import base64
         session = info.context.session
         service = TesoreriaService(session)
@@ -1370,12 +1425,14 @@ class EconomicoFlujosMutation:
         info: strawberry.Info,
         ejercicio: int,
         fecha_vencimiento: Optional[date] = None,
+        simular: bool = False,
     ) -> ResultadoGeneracionCuotasType:
-        """Crea CuotaAnual para cada miembro activo (A6). Idempotente."""
+        """Crea CuotaAnual para cada miembro activo (A6). Idempotente.
+        Con `simular` devuelve los totales sin crear nada."""
         from ..modules.economico.services.cuota_service import CuotaService
         session = info.context.session
         service = CuotaService(session)
-        r = await service.generar_cuotas_individuales(ejercicio, fecha_vencimiento)
+        r = await service.generar_cuotas_individuales(ejercicio, fecha_vencimiento, simular=simular)
         return ResultadoGeneracionCuotasType(**r)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("ECO_CUOTA_GENERAR")])
@@ -17,6 +17,7 @@ from app.modules.economico.services.tesoreria_service import TesoreriaService
 from app.modules.economico.services.contabilidad_service import ContabilidadService
 from app.modules.economico.services.cierre_service import CierreEjercicioService
 from app.modules.economico.services.pdf.libro_diario import generar_libro_diario_csv
+from app.core.carga import cargar, cargar_seleccion
 from app.graphql.types_auto import CuotaAnualType
 from app.graphql.permissions import RequireTransaction
 
@@ -414,6 +415,10 @@ class EconomicoQuery:
             .join(Vinculacion, Vinculacion.id == CuotaAnual.vinculacion_socio_id)
             .where(Vinculacion.contacto_id == miembro_id)
             .order_by(CuotaAnual.ejercicio.desc())
+            .options(
+                *cargar_seleccion(CuotaAnual, info),
+                *cargar(CuotaAnual, "vinculacion_socio.contacto"),  # campo `miembro`
+            )
         )
         result = await session.execute(stmt)
         return result.scalars().all()
@@ -428,7 +433,7 @@ class EconomicoQuery:
         fecha_fin: Optional[date] = None,
     ) -> BalancePcesflType:
         """Balance del ejercicio estructurado según PCESFL 2013."""
-        service = CierreEjercicioService(info.context.session)
+        service = CierreEjercicioService(info.context.read_session)
         b = await service.calcular_balance_pcesfl(ejercicio, fecha_fin)
         totales = b["totales"]
         return BalancePcesflType(
@@ -455,7 +460,7 @@ class EconomicoQuery:
         fecha_fin: Optional[date] = None,
     ) -> CuentaResultadosType:
         """Cuenta de Resultados del ejercicio en formato PCESFL (Excedente)."""
-        service = CierreEjercicioService(info.context.session)
+        service = CierreEjercicioService(info.context.read_session)
         r = await service.calcular_cuenta_resultados(ejercicio, fecha_fin)
         return CuentaResultadosType(
             ejercicio=ejercicio,
@@ -510,7 +515,7 @@ class EconomicoQuery:
         Solo incluye asientos confirmados con fecha ≤ fecha_corte.
         Si solo_con_saldo=true (por defecto), omite cuentas sin movimientos.
         """
-        service = ContabilidadService(info.context.session)
+        service = ContabilidadService(info.context.read_session)
         filas = await service.calcular_balance_sumas_y_saldos(
             ejercicio=ejercicio,
             fecha_corte=fecha_corte,
@@ -537,7 +542,7 @@ class EconomicoQuery:
     ) -> list[SaldoCuentaType]:
         """Saldos netos por código de cuenta para todas las cuentas con movimientos
         en el ejercicio. Solo cuenta asientos CONFIRMADOS."""
-        service = CierreEjercicioService(info.context.session)
+        service = CierreEjercicioService(info.context.read_session)
         saldos = await service.calcular_saldos_cuentas(ejercicio, fecha_fin)
         return [SaldoCuentaType(codigo=k, saldo=float(v)) for k, v in saldos.items()]
 
@@ -551,7 +556,7 @@ class EconomicoQuery:
         """Genera el Libro Diario del ejercicio en formato CSV (UTF-8 BOM, separador `;`).
         Devuelve el CSV codificado en base64 listo para descargar desde el frontend."""
         contenido = await generar_libro_diario_csv(
-            info.context.session, ejercicio, organizacion_nombre
+            info.context.read_session, ejercicio, organizacion_nombre
         )
         return base64.b64encode(contenido).decode("ascii")
 
@@ -590,7 +595,7 @@ class EconomicoQuery:
         """A1 — Calcula el agregado anual del Modelo 182 (donantes incluibles +
         excluidos), sin persistirlo. D11.1, D11.2."""
         from app.modules.economico.services.modelo_182_service import Modelo182Service
-        service = Modelo182Service(info.context.session)
+        service = Modelo182Service(info.context.read_session)
         ag = await service.generar_agregado(ejercicio)
         return AgregadoModelo182Type(
             ejercicio=ag["ejercicio"],
@@ -851,6 +856,15 @@ class EconomicoMutation:
         asiento = await service.generar_asiento_apertura(ejercicio_nuevo)
         return asiento.id
 
+    @strawberry.mutation(permission_classes=[RequireTransaction("ECO_CIERRE_EJECUTAR")])
+    async def recalcular_saldos_mensuales(
+        self, info: strawberry.Info, ejercicio: int
+    ) -> int:
+        """Reconstruye las instantáneas de saldos mensuales del ejercicio desde
+        los apuntes (reparación). Devuelve el nº de filas (cuenta, mes)."""
+        service = CierreEjercicioService(info.context.session)
+        return await service.recalcular_saldos_mensuales(ejercicio)
+
     # ── Cuentas Anuales (Flujo 10) ──────────────────────────────────────────
 
     @strawberry.mutation(permission_classes=[RequireTransaction("ECO_CUENTAS_ANUALES_GENERAR")])
@@ -5,10 +5,12 @@ from typing import Optional
 
 import strawberry
 from sqlalchemy import select
+from app.core.carga import cargar_seleccion, recargar
 from app.modules.core.geografico import UnidadOrganizativa, NivelOrganizativo
 from .types_auto import UnidadOrganizativaType, NivelOrganizativoType
 from .permissions import RequireTransaction
 from app.modules.acceso.services.ambito_territorial import assert_unidad_en_ambito
+from app.core.events import event_bus, UnidadOrganizativaCambiada
 
 
 # ── NivelOrganizativo: inputs y helpers ──────────────────────────────────────
@@ -49,8 +51,13 @@ _NV_FIELDS = ['nombre', 'naturaleza', 'vinculo', 'activo', 'nivel', 'padre_tipo_
               'estructura_distribuida', 'unidad_id']
 
 
-async def _fetch_nivel(session, nivel_id: uuid.UUID) -> NivelOrganizativo:
+async def _fetch_nivel(
+    session, nivel_id: uuid.UUID, info: Optional[strawberry.Info] = None,
+) -> NivelOrganizativo:
+    """Nivel por id; con `info`, con las relaciones que pide la selección GraphQL."""
     stmt = select(NivelOrganizativo).where(NivelOrganizativo.id == nivel_id)
+    if info is not None:
+        stmt = stmt.options(*cargar_seleccion(NivelOrganizativo, info)).execution_options(populate_existing=True)
     result = await session.execute(stmt)
     return result.scalar_one()
 
@@ -108,8 +115,13 @@ _AG_FIELDS = [
 ]
 
 
-async def _fetch_agrupacion(session, ag_id: uuid.UUID) -> UnidadOrganizativa:
+async def _fetch_agrupacion(
+    session, ag_id: uuid.UUID, info: Optional[strawberry.Info] = None,
+) -> UnidadOrganizativa:
+    """Unidad por id; con `info`, con las relaciones que pide la selección GraphQL."""
     stmt = select(UnidadOrganizativa).where(UnidadOrganizativa.id == ag_id)
+    if info is not None:
+        stmt = stmt.options(*cargar_seleccion(UnidadOrganizativa, info)).execution_options(populate_existing=True)
     result = await session.execute(stmt)
     return result.scalar_one()
 
@@ -133,7 +145,7 @@ class GeograficoMutation:
         nivel = NivelOrganizativo(**kwargs)
         session.add(nivel)
         await session.commit()
-        return await _fetch_nivel(session, nivel.id)
+        return await _fetch_nivel(session, nivel.id, info)
 
     @strawberry.mutation
     async def actualizar_nivel_organizativo(
@@ -151,7 +163,7 @@ class GeograficoMutation:
                 continue
             setattr(nivel, field, val)
         await session.commit()
-        return await _fetch_nivel(session, nivel.id)
+        return await _fetch_nivel(session, nivel.id, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CFG_TERRITORIO_CREAR")])
     async def crear_unidad_organizativa(
@@ -167,7 +179,9 @@ class GeograficoMutation:
         ag = UnidadOrganizativa(**kwargs)
         session.add(ag)
         await session.commit()
-        return await _fetch_agrupacion(session, ag.id)
+        # La unidad nueva entra en el subárbol (ámbito) de sus ancestros.
+        await event_bus.publish(UnidadOrganizativaCambiada(unidad_id=str(ag.id)))
+        return await _fetch_agrupacion(session, ag.id, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CFG_TERRITORIO_EDITAR")])
     async def actualizar_unidad_organizativa(
@@ -179,6 +193,7 @@ class GeograficoMutation:
         if usuario:
             await assert_unidad_en_ambito(session, usuario.id, data.id)
         ag = await _fetch_agrupacion(session, data.id)
+        padre_antes = ag.agrupacion_padre_id
 
         for field in _AG_FIELDS:
             val = getattr(data, field, strawberry.UNSET)
@@ -187,7 +202,10 @@ class GeograficoMutation:
             setattr(ag, field, val)
 
         await session.commit()
-        return await _fetch_agrupacion(session, ag.id)
+        if ag.agrupacion_padre_id != padre_antes:
+            # Movida en la jerarquía: cambian los ámbitos de todo su subárbol.
+            await event_bus.publish(UnidadOrganizativaCambiada(unidad_id=str(ag.id)))
+        return await _fetch_agrupacion(session, ag.id, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CFG_TERRITORIO_ELIMINAR")])
     async def archivar_unidad_organizativa(
@@ -209,4 +227,38 @@ class GeograficoMutation:
         ag.soft_delete()
         await session.commit()
         await session.refresh(ag)
-        return ag
+        return await recargar(session, ag, info)
+
+    @strawberry.mutation(permission_classes=[RequireTransaction("CFG_TERRITORIO_ELIMINAR")])
+    async def eliminar_unidades_organizativas(
+        self, info: strawberry.Info, ids: list[uuid.UUID]
+    ) -> list[uuid.UUID]:
+        """Borrado físico de unidades organizativas sin sub-unidades.
+
+        Las unidades borradas salen del árbol territorial: se publica
+        `UnidadOrganizativaCambiada` para que ningún worker siga resolviendo
+        ámbitos con ellas.
+        """
+        session = info.context.session
+        usuario = info.context.user
+        unidades = (await session.execute(
+            select(UnidadOrganizativa).where(UnidadOrganizativa.id.in_(ids))
+        )).scalars().all()
+        for ag in unidades:
+            if usuario:
+                await assert_unidad_en_ambito(session, usuario.id, ag.id)
+        hijo = await session.scalar(
+            select(UnidadOrganizativa.id).where(
+                UnidadOrganizativa.agrupacion_padre_id.in_([ag.id for ag in unidades]),
+                UnidadOrganizativa.id.not_in(ids),
+            ).limit(1)
+        )
+        if hijo is not None:
+            raise ValueError("No se puede eliminar una unidad con sub-unidades.")
+
+        for ag in unidades:
+            await session.delete(ag)
+        await session.commit()
+        for ag in unidades:
+            await event_bus.publish(UnidadOrganizativaCambiada(unidad_id=str(ag.id)))
+        return [ag.id for ag in unidades]
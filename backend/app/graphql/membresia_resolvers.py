@@ -20,6 +20,7 @@ from app.modules.membresia.models.tipo_vinculacion import TipoVinculacion
 from app.modules.acceso.services.acceso_service import AccesoService
 from app.graphql.types_auto import ContactoType
 from app.graphql.permissions import RequireTransaction, RequireAuthenticated
+from app.core.carga import cargar, cargar_seleccion
 from app.core.events import event_bus, MiembroPerfilIncompleto
 
 
@@ -39,21 +40,21 @@ def _campos_perfil_faltantes(contacto) -> tuple[str, ...]:
     )
 
 
-async def _publicar_perfil_incompleto(contacto) -> None:
-    """Publica MiembroPerfilIncompleto si faltan campos clave. Nunca lanza."""
+def _encolar_perfil_incompleto(session, contacto) -> None:
+    """Encola MiembroPerfilIncompleto en el outbox si faltan campos clave.
+
+    Llamar antes del commit: el aviso se confirma junto con el alta/edición.
+    """
     faltantes = _campos_perfil_faltantes(contacto)
     if not faltantes:
         return
-    try:
-        nombre = " ".join(filter(None, [contacto.nombre, contacto.apellido1])).strip()
-        await event_bus.publish(MiembroPerfilIncompleto(
-            miembro_id=str(contacto.id),
-            miembro_nombre=nombre or "(sin nombre)",
-            agrupacion_id=str(contacto.agrupacion_id) if contacto.agrupacion_id else None,
-            campos_faltantes=faltantes,
-        ))
-    except Exception:
-        pass
+    nombre = " ".join(filter(None, [contacto.nombre, contacto.apellido1])).strip()
+    event_bus.enqueue(session, MiembroPerfilIncompleto(
+        miembro_id=str(contacto.id),
+        miembro_nombre=nombre or "(sin nombre)",
+        agrupacion_id=str(contacto.agrupacion_id) if contacto.agrupacion_id else None,
+        campos_faltantes=faltantes,
+    ))
 
 
 # ---------------------------------------------------------------------------
@@ -227,6 +228,7 @@ async def _vinc_socio(session, contacto_id: uuid.UUID):
         .join(TipoVinculacion, Vinculacion.tipo_vinculacion_id == TipoVinculacion.id)
         .where(TipoVinculacion.codigo == "SOCIO", Vinculacion.contacto_id == contacto_id)
         .order_by(Vinculacion.fecha_inicio.desc())
+        .options(*cargar(Vinculacion, "socio"))
     )).scalars().first()
 
 
@@ -236,6 +238,7 @@ async def _vinc_voluntario(session, contacto_id: uuid.UUID):
         .join(TipoVinculacion, Vinculacion.tipo_vinculacion_id == TipoVinculacion.id)
         .where(TipoVinculacion.codigo == "VOLUNTARIO", Vinculacion.contacto_id == contacto_id)
         .order_by(Vinculacion.fecha_inicio.desc())
+        .options(*cargar(Vinculacion, "voluntario"))
     )).scalars().first()
 
 
@@ -298,9 +301,15 @@ async def _alta_socio(session, data) -> Contacto:
     return contacto
 
 
-async def _fetch_miembro(session, contacto_id: uuid.UUID):
-    """Recarga el Contacto (identidad viva) con sus relaciones selectin."""
+async def _fetch_miembro(session, contacto_id: uuid.UUID, info: Optional[strawberry.Info] = None):
+    """Recarga el Contacto (identidad viva).
+
+    Con `info`, carga además las relaciones que pide la selección GraphQL; sin él,
+    solo las columnas (uso interno antes de editar).
+    """
     stmt = select(Contacto).where(Contacto.id == contacto_id)
+    if info is not None:
+        stmt = stmt.options(*cargar_seleccion(Contacto, info)).execution_options(populate_existing=True)
     result = await session.execute(stmt)
     return result.scalar_one()
 
@@ -339,13 +348,65 @@ class FranjaDisponibilidadOut:
     hora_fin: str
 
 
+@strawberry.type(name="EnvioDestinatario")
+class EnvioDestinatarioType:
+    """Resultado del envío a un destinatario concreto."""
+    destinatario: str
+    ok: bool
+    error: Optional[str] = None
+
+
 @strawberry.type(name="EnvioMensajeResultado")
 class EnvioMensajeResultado:
-    """Resultado del envío masivo de un mensaje a contactos."""
+    """Resultado del envío masivo de un mensaje a contactos. En segundo plano,
+    solo trae `total`/`sin_email` y el `trabajo_id` con el que seguir el progreso."""
     enviados: int
     total: int
     sin_email: int
     errores: list[str]
+    detalle: list[EnvioDestinatarioType] = strawberry.field(default_factory=list)
+    trabajo_id: Optional[str] = None
+
+
+@strawberry.type(name="ProgresoEnvioMensaje")
+class ProgresoEnvioMensajeType:
+    """Progreso de un envío masivo lanzado en segundo plano."""
+    trabajo_id: str
+    estado: str  # EN_CURSO | COMPLETADO | ERROR
+    total: int
+    enviados: int
+    fallidos: int
+    errores: list[str]
+    detalle: list[EnvioDestinatarioType]
+
+
+def _errores_envio(resultados) -> list[str]:
+    return [f"{r.etiqueta or r.destinatario}: {r.error}" for r in resultados if not r.ok]
+
+
+def _detalle_envio(resultados) -> list[EnvioDestinatarioType]:
+    return [EnvioDestinatarioType(destinatario=r.destinatario, ok=r.ok, error=r.error)
+            for r in resultados]
+
+
+def _registro_mensaje_enviado(remitente_id, asunto, cuerpo_html, para, cc, cco, resultados):
+    """Fila del histórico de Comunicación (MVP) para un envío masivo."""
+    from app.modules.core.comunicacion.mensajeria import MensajeEnviado
+    from datetime import datetime, timezone
+    errores = _errores_envio(resultados)
+    return MensajeEnviado(
+        id=uuid.uuid4(),
+        remitente_id=remitente_id,
+        enviado_en=datetime.now(timezone.utc),
+        asunto=asunto,
+        cuerpo_html=cuerpo_html,
+        para=", ".join(para),
+        cc=", ".join(cc) or None,
+        cco=", ".join(cco) or None,
+        enviados=sum(1 for r in resultados if r.ok),
+        total=len(resultados),
+        errores="\n".join(errores) or None,
+    )
 
 
 @strawberry.type
@@ -390,7 +451,9 @@ class MembresiaResolverMutation:
                 )
                 session.add(vinc)
                 await session.flush()
-            vol = vinc.voluntario
+                vol = None
+            else:
+                vol = vinc.voluntario
             if not vol:
                 vol = Voluntario(vinculacion_id=vinc.id)
                 session.add(vol)
@@ -399,7 +462,7 @@ class MembresiaResolverMutation:
                 if val is not None:
                     setattr(vol, field, val)
         await session.commit()
-        return await _fetch_miembro(session, contacto.id)
+        return await _fetch_miembro(session, contacto.id, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("MEMBRESIA_VOLUNTARIO_GESTIONAR")])
     async def asignar_habilidad_voluntario(
@@ -472,11 +535,10 @@ class MembresiaResolverMutation:
         session = info.context.session
 
         contacto = await _alta_socio(session, data)
+        _encolar_perfil_incompleto(session, contacto)
         await session.commit()
 
-        await _publicar_perfil_incompleto(contacto)
-
-        return await _fetch_miembro(session, contacto.id)
+        return await _fetch_miembro(session, contacto.id, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("MEMBRESIA_MIEMBRO_CREAR")])
     async def crear_miembro_con_acceso(
@@ -502,12 +564,11 @@ class MembresiaResolverMutation:
             contacto_id=contacto.id,
             tipo_vinculacion_id=tipo_vinculacion_id,
         )
+        _encolar_perfil_incompleto(session, contacto)
 
         await session.commit()
 
-        await _publicar_perfil_incompleto(contacto)
-
-        return await _fetch_miembro(session, contacto.id)
+        return await _fetch_miembro(session, contacto.id, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("MEMBRESIA_MIEMBRO_EDITAR")])
     async def actualizar_miembro(
@@ -553,16 +614,15 @@ class MembresiaResolverMutation:
             if getattr(data, "es_socio_honor", None) is not None:
                 socio.es_honor = data.es_socio_honor
 
-        await session.commit()
-
         # Notificar solo si la edición ha cambiado el conjunto de campos
         # faltantes y siguen quedando huecos. Si los huecos son los mismos
         # que antes, evitamos el spam por cada edición del coordinador.
-        faltantes_despues = _campos_perfil_faltantes(miembro)
-        if faltantes_despues and faltantes_despues != faltantes_antes:
-            await _publicar_perfil_incompleto(miembro)
+        if _campos_perfil_faltantes(miembro) != faltantes_antes:
+            _encolar_perfil_incompleto(session, miembro)
+
+        await session.commit()
 
-        return await _fetch_miembro(session, miembro.id)
+        return await _fetch_miembro(session, miembro.id, info)
 
     @strawberry.mutation
     async def actualizar_mis_datos(
@@ -604,13 +664,12 @@ class MembresiaResolverMutation:
             if val is not None:
                 setattr(miembro, field, val)
 
-        await session.commit()
+        if _campos_perfil_faltantes(miembro) != faltantes_antes:
+            _encolar_perfil_incompleto(session, miembro)
 
-        faltantes_despues = _campos_perfil_faltantes(miembro)
-        if faltantes_despues and faltantes_despues != faltantes_antes:
-            await _publicar_perfil_incompleto(miembro)
+        await session.commit()
 
-        return await _fetch_miembro(session, miembro.id)
+        return await _fetch_miembro(session, miembro.id, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("MEMBRESIA_MIEMBRO_EDITAR")])
     async def anonimizar_miembro(
@@ -663,7 +722,7 @@ class MembresiaResolverMutation:
         miembro.fecha_anonimizacion = date.today()
 
         await session.commit()
-        return await _fetch_miembro(session, miembro_id)
+        return await _fetch_miembro(session, miembro_id, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("MEMBRESIA_MIEMBRO_EXPORTAR")])
     async def exportar_miembros_xlsx(
@@ -673,72 +732,19 @@ class MembresiaResolverMutation:
     ) -> str:
         """Exporta a XLSX los miembros indicados (los visibles con los filtros
         aplicados en el listado). Devuelve el contenido del fichero en base64.
+
+        Para padrones grandes usar `POST /api/miembros/exportar`, que descarga el
+        fichero sin pasar por base64 ni por la respuesta GraphQL.
         """
         import base64
         import io
-        from openpyxl import Workbook
-        from openpyxl.styles import Font
-        from openpyxl.utils import get_column_letter
+        from app.modules.membresia.services.exportacion_service import ExportacionMiembrosService
 
-        session = info.context.session
         if not ids:
             raise ValueError("No hay miembros que exportar.")
 
-        result = await session.execute(select(Contacto).where(Contacto.id.in_(ids)))
-        contactos = list(result.scalars().all())
-        contactos.sort(key=lambda c: (
-            (c.apellido1 or '').lower(),
-            (c.apellido2 or '').lower(),
-            (c.nombre or '').lower(),
-        ))
-
-        # Nombres de agrupación (Contacto solo guarda el id)
-        from app.modules.core.geografico.direccion import UnidadOrganizativa
-        agr_ids = {c.agrupacion_id for c in contactos if c.agrupacion_id}
-        agr_nombres: dict = {}
-        if agr_ids:
-            ra = await session.execute(
-                select(UnidadOrganizativa.id, UnidadOrganizativa.nombre)
-                .where(UnidadOrganizativa.id.in_(agr_ids))
-            )
-            agr_nombres = {i: n for (i, n) in ra.all()}
-
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Socios"
-        cabecera = [
-            "Nombre", "Primer apellido", "Segundo apellido", "Tipo", "Situación",
-            "Email", "Teléfono", "Agrupación", "Localidad", "Fecha de alta", "Fecha de baja",
-        ]
-        ws.append(cabecera)
-        for celda in ws[1]:
-            celda.font = Font(bold=True)
-
-        for c in contactos:
-            memb = await _membresia_de(session, c.id)
-            vinc = await _vinc_socio(session, c.id)
-            socio = vinc.socio if vinc else None
-            ws.append([
-                c.nombre or '',
-                c.apellido1 or '',
-                c.apellido2 or '',
-                memb.tipo_miembro.nombre if (memb and memb.tipo_miembro) else '',
-                (socio.estado_socio if socio else '') or '',
-                c.email or '',
-                c.telefono or '',
-                agr_nombres.get(c.agrupacion_id, ''),
-                c.localidad or '',
-                vinc.fecha_inicio.isoformat() if (vinc and vinc.fecha_inicio) else '',
-                vinc.fecha_fin.isoformat() if (vinc and vinc.fecha_fin) else '',
-            ])
-
-        anchos = [16, 16, 16, 14, 14, 30, 14, 26, 20, 13, 13]
-        for i, ancho in enumerate(anchos, start=1):
-            ws.column_dimensions[get_column_letter(i)].width = ancho
-        ws.freeze_panes = "A2"
-
         buf = io.BytesIO()
-        wb.save(buf)
+        await ExportacionMiembrosService(info.context.session).exportar_xlsx(buf, ids=ids)
         return base64.b64encode(buf.getvalue()).decode()
 
     # ── Aprobación de solicitudes de socio (SOCIO_ASPIRANTE → SOCIO) ──────────
@@ -772,7 +778,7 @@ class MembresiaResolverMutation:
         if existe_socio is None:
             session.add(Socio(vinculacion_id=vinc.id, numero_socio=numero_socio))
         await session.commit()
-        return await _fetch_miembro(session, contacto_id)
+        return await _fetch_miembro(session, contacto_id, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("MEMBRESIA_MIEMBRO_RECHAZAR")])
     async def rechazar_solicitud_socio(
@@ -798,7 +804,7 @@ class MembresiaResolverMutation:
         vinc.estado = "cerrada"
         vinc.fecha_fin = date.today()
         await session.commit()
-        return await _fetch_miembro(session, contacto_id)
+        return await _fetch_miembro(session, contacto_id, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CONTACTO_LISTAR")])
     async def enviar_mensaje_contactos(
@@ -808,14 +814,19 @@ class MembresiaResolverMutation:
         cuerpo_html: str,
         cc: Optional[list[str]] = None,
         cco: Optional[list[str]] = None,
+        en_segundo_plano: bool = False,
     ) -> 'EnvioMensajeResultado':
         """Envía un mensaje por email a los contactos indicados usando el SMTP de
         Parámetros Generales. `cc`/`cco` son direcciones sueltas que acompañan a
-        CADA envío. Devuelve el nº de envíos y los errores. Si SMTP no está
-        configurado, lanza un error con el detalle (para mostrarlo en la UI)."""
-        from app.core.email_service import EmailService
-        from app.modules.core.comunicacion.mensajeria import MensajeEnviado
-        from datetime import datetime, timezone
+        CADA envío. Devuelve el nº de envíos, los errores y el resultado por
+        destinatario. Si SMTP no está configurado, lanza un error con el detalle
+        (para mostrarlo en la UI).
+
+        Los envíos reutilizan un pool de conexiones SMTP con concurrencia y tasa
+        acotadas. Con `en_segundo_plano` la mutación vuelve de inmediato con un
+        `trabajo_id`; el progreso se consulta con `progresoEnvioMensaje`."""
+        from app.core.database import async_session
+        from app.core.email_service import EmailService, MensajeEmail, lanzar_envio
         session = info.context.session
         user = info.context.user
 
@@ -828,35 +839,44 @@ class MembresiaResolverMutation:
         if not destinatarios and not cc_limpio and not cco_limpio:
             raise ValueError("No hay ningún destinatario con email.")
 
+        mensajes = [
+            MensajeEmail(destinatario=direccion, asunto=asunto, cuerpo_html=cuerpo_html,
+                         cc=cc_limpio or None, cco=cco_limpio or None, etiqueta=nombre)
+            for nombre, direccion in destinatarios
+        ]
+        para = [d for _, d in destinatarios]
+        remitente_id = getattr(user, "id", None)
+        # SMTP no configurado: fallo global (ValueError), se propaga para avisar en la UI.
         email = EmailService(session)
-        enviados = 0
-        errores: list[str] = []
-        for nombre, direccion in destinatarios:
-            try:
-                await email.enviar(destinatario=direccion, asunto=asunto, cuerpo_html=cuerpo_html,
-                                   cc=cc_limpio or None, cco=cco_limpio or None)
-                enviados += 1
-            except ValueError:
-                # SMTP no configurado: es un fallo global, se propaga para avisar en la UI.
-                raise
-            except Exception as exc:  # noqa: BLE001
-                errores.append(f"{nombre or direccion}: {exc}")
+
+        if en_segundo_plano:
+            async def _registrar(trabajo):
+                if not trabajo.enviados:
+                    return
+                async with async_session() as s:
+                    s.add(_registro_mensaje_enviado(
+                        remitente_id, asunto, cuerpo_html, para, cc_limpio, cco_limpio,
+                        trabajo.resultados,
+                    ))
+                    await s.commit()
+
+            trabajo = await lanzar_envio(await email.config(), mensajes,
+                                         session_factory=async_session,
+                                         usuario_id=remitente_id, al_terminar=_registrar)
+            return EnvioMensajeResultado(
+                enviados=0, total=len(destinatarios),
+                sin_email=len(contactos) - len(destinatarios), errores=[],
+                trabajo_id=trabajo.id,
+            )
+
+        resultados = await email.enviar_lote(mensajes)
+        enviados = sum(1 for r in resultados if r.ok)
 
         # Registra el envío en el histórico del módulo de Comunicación (MVP).
         # Solo si se envió al menos uno; un fallo global de SMTP ya se propagó antes.
         if enviados:
-            session.add(MensajeEnviado(
-                id=uuid.uuid4(),
-                remitente_id=getattr(user, "id", None),
-                enviado_en=datetime.now(timezone.utc),
-                asunto=asunto,
-                cuerpo_html=cuerpo_html,
-                para=", ".join(d for _, d in destinatarios),
-                cc=", ".join(cc_limpio) or None,
-                cco=", ".join(cco_limpio) or None,
-                enviados=enviados,
-                total=len(destinatarios),
-                errores="\n".join(errores) or None,
+            session.add(_registro_mensaje_enviado(
+                remitente_id, asunto, cuerpo_html, para, cc_limpio, cco_limpio, resultados,
             ))
             await session.commit()
 
@@ -864,7 +884,8 @@ class MembresiaResolverMutation:
             enviados=enviados,
             total=len(destinatarios),
             sin_email=len(contactos) - len(destinatarios),
-            errores=errores,
+            errores=_errores_envio(resultados),
+            detalle=_detalle_envio(resultados),
         )
 
     @strawberry.mutation(permission_classes=[RequireTransaction("MEMBRESIA_VOLUNTARIO_GESTIONAR")])
@@ -983,6 +1004,32 @@ class ActoContactoType:
 
 @strawberry.type
 class MembresiaQuery:
+    @strawberry.field(permission_classes=[RequireTransaction("CONTACTO_LISTAR")])
+    async def progreso_envio_mensaje(
+        self, info: strawberry.Info, trabajo_id: str,
+    ) -> Optional[ProgresoEnvioMensajeType]:
+        """Progreso de un envío lanzado con `enviarMensajeContactos(enSegundoPlano: true)`.
+        Solo lo ve quien lo lanzó; None si no existe (o ya se purgó). El progreso
+        está en BD, así que responde cualquier worker."""
+        from app.core.email_service import obtener_trabajo
+        trabajo = await obtener_trabajo(info.context.session, trabajo_id)
+        user = info.context.user
+        if trabajo is None or trabajo.usuario_id != getattr(user, "id", None):
+            return None
+        resultados = trabajo.resultados_envio()
+        errores = _errores_envio(resultados)
+        if trabajo.error:
+            errores.insert(0, trabajo.error)
+        return ProgresoEnvioMensajeType(
+            trabajo_id=str(trabajo.id),
+            estado=trabajo.estado,
+            total=trabajo.total,
+            enviados=trabajo.enviados,
+            fallidos=trabajo.fallidos,
+            errores=errores,
+            detalle=_detalle_envio(resultados),
+        )
+
     @strawberry.field(permission_classes=[RequireTransaction("MEMBRESIA_MIEMBRO_VALIDAR")])
     async def solicitudes_socio_pendientes(
         self, info: strawberry.Info,
@@ -1001,7 +1048,8 @@ class MembresiaQuery:
                 Vinculacion.eliminado == False,  # noqa: E712
             )
             .order_by(Vinculacion.fecha_inicio)
-        )).scalars().all()
+            .options(*cargar_seleccion(Contacto, info))
+        )).scalars().unique().all()
         return list(rows)
 
     @strawberry.field(permission_classes=[RequireTransaction("GRUPO_EDITAR")])
@@ -1245,11 +1293,12 @@ class MembresiaQuery:
         (El scoping por campaña de COORDINADOR_CAMPANA se resolverá aparte.)
         """
         from app.modules.acceso.services.ambito_territorial import (
-            agrupaciones_en_ambito, miembros_de_campanias_coordinadas,
+            condicion_en_ambito, miembros_de_campanias_coordinadas, raices_en_ambito,
         )
         session = info.context.session
         user = info.context.user
-        ambito = await agrupaciones_en_ambito(session, user.id) if user else set()
+        # Unidades de los roles sin expandir: el subárbol lo resuelve la closure table.
+        ambito = await raices_en_ambito(session, user.id) if user else set()
 
         # Voluntario = Vinculacion(VOLUNTARIO) activa + satélite Voluntario sobre Contacto.
         q = (
@@ -1266,7 +1315,7 @@ class MembresiaQuery:
         if ambito is not None:              # None = global (sin filtro)
             conds = []
             if ambito:
-                conds.append(Contacto.agrupacion_id.in_(ambito))
+                conds.append(condicion_en_ambito(Contacto.agrupacion_id, ambito))
             camp_ids = await miembros_de_campanias_coordinadas(session, user.id) if user else set()
             if camp_ids:
                 conds.append(Contacto.id.in_(camp_ids))
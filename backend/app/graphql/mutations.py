@@ -115,7 +115,7 @@ class Mutation(AuthMutation, EconomicoFlujosMutation, ConfiguracionOrganizacionM
     # crear_nivel_organizativo / actualizar_nivel_organizativo → GeograficoMutation (custom, FK UUID explícitos)
     eliminar_niveles_organizativos: list[NivelOrganizativoType] = strawchemy.delete(NivelOrganizativoFilter)
 
-    eliminar_unidades_organizativas: list[UnidadOrganizativaType] = strawchemy.delete(UnidadOrganizativaFilter)
+    # eliminar_unidades_organizativas → GeograficoMutation (invalida el árbol territorial)
 
     crear_pais: PaisType = strawchemy.create(PaisCreateInput)
     actualizar_pais: PaisType = strawchemy.update_by_ids(PaisUpdateInput)
@@ -0,0 +1,52 @@
+"""Paginación por cursor (keyset) para los read-models GraphQL.
+
+Las conexiones siguen la forma Relay (`edges { cursor node }`, `pageInfo`,
+`totalCount`). El cursor es opaco para el frontend: codifica, en base64 url-safe,
+los valores de las claves de orden de la última fila servida, de modo que la
+página siguiente se pide con `WHERE (claves) > (cursor)` y un índice puede
+resolverla sin OFFSET.
+"""
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any, Optional, Sequence
+
+import strawberry
+
+
+# Tope defensivo de página (mismo criterio que `limite` en los listados clásicos).
+MAX_PAGINA = 200
+
+
+@strawberry.type
+class PageInfo:
+    """Estado de la paginación de una conexión (forma Relay)."""
+    has_next_page: bool = False
+    has_previous_page: bool = False
+    start_cursor: Optional[str] = None
+    end_cursor: Optional[str] = None
+
+
+def codificar_cursor(valores: Sequence[Any]) -> str:
+    """Serializa las claves de orden de una fila como cursor opaco."""
+    crudo = json.dumps([str(v) if v is not None else None for v in valores], separators=(",", ":"))
+    return base64.urlsafe_b64encode(crudo.encode("utf-8")).decode("ascii")
+
+
+def decodificar_cursor(cursor: str, n_claves: int) -> list[Optional[str]]:
+    """Recupera las claves de orden de un cursor. Lanza ValueError si no es válido."""
+    try:
+        valores = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+    except (ValueError, UnicodeError) as exc:
+        raise ValueError("Cursor de paginación no válido") from exc
+    if not isinstance(valores, list) or len(valores) != n_claves:
+        raise ValueError("Cursor de paginación no válido")
+    return valores
+
+
+def tamano_pagina(first: Optional[int], defecto: int = 50) -> int:
+    """Normaliza `first` al rango [1, MAX_PAGINA]."""
+    if first is None:
+        return defecto
+    return max(1, min(first, MAX_PAGINA))
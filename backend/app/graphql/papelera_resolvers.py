@@ -12,6 +12,7 @@ from app.modules.actividades.models.actividad import Actividad
 from app.modules.actividades.models.grupo import GrupoTrabajo
 from app.modules.actividades.models.campana import Campania
 from app.graphql.types_auto import ContactoType, ActividadType, GrupoTrabajoType, CampaniaType
+from app.core.carga import recargar
 from app.graphql.permissions import RequireTransaction
 
 
@@ -26,8 +27,7 @@ class PapeleraResolverMutation:
         obj.eliminado = False
         obj.fecha_eliminacion = None
         await session.commit()
-        result = await session.execute(select(Contacto).where(Contacto.id == id))
-        return result.scalar_one()
+        return await recargar(session, obj, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("EVENTO_EDITAR")])
     async def restaurar_actividad(self, info: strawberry.Info, id: uuid.UUID) -> ActividadType:
@@ -37,8 +37,7 @@ class PapeleraResolverMutation:
         obj.eliminado = False
         obj.fecha_eliminacion = None
         await session.commit()
-        result = await session.execute(select(Actividad).where(Actividad.id == id))
-        return result.scalar_one()
+        return await recargar(session, obj, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("GRUPO_EDITAR")])
     async def restaurar_grupo_trabajo(self, info: strawberry.Info, id: uuid.UUID) -> GrupoTrabajoType:
@@ -48,8 +47,7 @@ class PapeleraResolverMutation:
         obj.eliminado = False
         obj.fecha_eliminacion = None
         await session.commit()
-        result = await session.execute(select(GrupoTrabajo).where(GrupoTrabajo.id == id))
-        return result.scalar_one()
+        return await recargar(session, obj, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CAMPANA_EDITAR")])
     async def restaurar_campania(self, info: strawberry.Info, id: uuid.UUID) -> CampaniaType:
@@ -59,5 +57,4 @@ class PapeleraResolverMutation:
         obj.eliminado = False
         obj.fecha_eliminacion = None
         await session.commit()
-        result = await session.execute(select(Campania).where(Campania.id == id))
-        return result.scalar_one()
+        return await recargar(session, obj, info)
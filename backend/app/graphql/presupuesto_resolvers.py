@@ -7,6 +7,7 @@ from typing import List, Optional
 
 import strawberry
 
+from app.core.carga import recargar
 from app.graphql.permissions import RequireTransaction
 from app.modules.economico.services.presupuesto_service import PresupuestoService
 from app.modules.economico.models.presupuesto import TipoModificacionPresupuestaria
@@ -236,7 +237,7 @@ class PresupuestoQuery:
         self, info: strawberry.Info, planificacion_id: uuid.UUID
     ) -> Optional[PlanificacionAnualDetailType]:
         service = PresupuestoService(info.context.session)
-        p = await service.obtener_planificacion(planificacion_id)
+        p = await service.obtener_planificacion(planificacion_id, "partidas")
         return PlanificacionAnualDetailType.from_model(p) if p else None
 
     @strawberry.field(permission_classes=[RequireTransaction("ECO_PRESUPUESTO_CONSULTAR")])
@@ -332,7 +333,9 @@ class PresupuestoMutation:
             ejercicio=data.ejercicio, nombre=data.nombre,
             descripcion=data.descripcion, objetivos=data.objetivos,
         )
-        return PlanificacionAnualDetailType.from_model(p)
+        return PlanificacionAnualDetailType.from_model(
+            await recargar(info.context.session, p, info, "partidas")
+        )
 
     @strawberry.mutation(permission_classes=[RequireTransaction("ECO_PRESUPUESTO_CREAR")])
     async def crear_partida(
@@ -386,7 +389,9 @@ class PresupuestoMutation:
     ) -> PlanificacionAnualDetailType:
         service = PresupuestoService(info.context.session)
         p = await service.proponer(planificacion_id)
-        return PlanificacionAnualDetailType.from_model(p)
+        return PlanificacionAnualDetailType.from_model(
+            await recargar(info.context.session, p, info, "partidas")
+        )
 
     @strawberry.mutation(permission_classes=[RequireTransaction("ECO_PRESUPUESTO_APROBAR")])
     async def aprobar_presupuesto(
@@ -394,7 +399,9 @@ class PresupuestoMutation:
     ) -> PlanificacionAnualDetailType:
         service = PresupuestoService(info.context.session)
         p = await service.aprobar(planificacion_id)
-        return PlanificacionAnualDetailType.from_model(p)
+        return PlanificacionAnualDetailType.from_model(
+            await recargar(info.context.session, p, info, "partidas")
+        )
 
     @strawberry.mutation(permission_classes=[RequireTransaction("ECO_PRESUPUESTO_APROBAR")])
     async def iniciar_ejecucion_presupuesto(
@@ -402,7 +409,9 @@ class PresupuestoMutation:
     ) -> PlanificacionAnualDetailType:
         service = PresupuestoService(info.context.session)
         p = await service.iniciar_ejecucion(planificacion_id)
-        return PlanificacionAnualDetailType.from_model(p)
+        return PlanificacionAnualDetailType.from_model(
+            await recargar(info.context.session, p, info, "partidas")
+        )
 
     @strawberry.mutation(permission_classes=[RequireTransaction("ECO_PRESUPUESTO_APROBAR")])
     async def cerrar_presupuesto(
@@ -410,7 +419,9 @@ class PresupuestoMutation:
     ) -> PlanificacionAnualDetailType:
         service = PresupuestoService(info.context.session)
         p = await service.cerrar(planificacion_id)
-        return PlanificacionAnualDetailType.from_model(p)
+        return PlanificacionAnualDetailType.from_model(
+            await recargar(info.context.session, p, info, "partidas")
+        )
 
     @strawberry.mutation(permission_classes=[RequireTransaction("ECO_PRESUPUESTO_CREAR")])
     async def devolver_presupuesto_a_borrador(
@@ -418,7 +429,9 @@ class PresupuestoMutation:
     ) -> PlanificacionAnualDetailType:
         service = PresupuestoService(info.context.session)
         p = await service.devolver_a_borrador(planificacion_id)
-        return PlanificacionAnualDetailType.from_model(p)
+        return PlanificacionAnualDetailType.from_model(
+            await recargar(info.context.session, p, info, "partidas")
+        )
 
     # ── Fase 2 ───────────────────────────────────────────────────────────────
 
@@ -451,7 +464,9 @@ class PresupuestoMutation:
         service.session.add(plan)
         await service.session.commit()
         await service.session.refresh(plan)
-        return PlanificacionAnualDetailType.from_model(plan)
+        return PlanificacionAnualDetailType.from_model(
+            await recargar(info.context.session, plan, info, "partidas")
+        )
 
     # ── Fase 3 ───────────────────────────────────────────────────────────────
 
@@ -467,7 +482,9 @@ class PresupuestoMutation:
         p = await service.clonar_planificacion(
             ejercicio_origen, ejercicio_nuevo, nombre=nombre, factor=factor_dec
         )
-        return PlanificacionAnualDetailType.from_model(p)
+        return PlanificacionAnualDetailType.from_model(
+            await recargar(info.context.session, p, info, "partidas")
+        )
 
     @strawberry.mutation(permission_classes=[RequireTransaction("ECO_PRESUPUESTO_APROBAR")])
     async def prorrogar_presupuesto(
@@ -475,4 +492,6 @@ class PresupuestoMutation:
     ) -> PlanificacionAnualDetailType:
         service = PresupuestoService(info.context.session)
         p = await service.prorrogar(ejercicio_origen, ejercicio_nuevo)
-        return PlanificacionAnualDetailType.from_model(p)
+        return PlanificacionAnualDetailType.from_model(
+            await recargar(info.context.session, p, info, "partidas")
+        )
@@ -19,6 +19,7 @@ import strawberry
 from sqlalchemy import select, func
 
 from .context import Context
+from app.core.carga import recargar
 from .permissions import RequireTransaction
 from .types_auto import (
     SolicitudDerechoRGPDType,
@@ -119,7 +120,7 @@ class ProteccionDatosMutation:
         )
         ctx.session.add(solicitud)
         await ctx.session.flush()
-        return solicitud  # type: ignore[return-value]
+        return await recargar(info.context.session, solicitud, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("RGPD_SOLICITUD_TRAMITAR")])
     async def iniciar_tramite_solicitud_rgpd(
@@ -138,7 +139,7 @@ class ProteccionDatosMutation:
             solicitud.tramitada_por_id = uuid.UUID(ctx.user_id)
             solicitud.modificado_por_id = uuid.UUID(ctx.user_id)
         await ctx.session.flush()
-        return solicitud  # type: ignore[return-value]
+        return await recargar(info.context.session, solicitud, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("RGPD_SOLICITUD_TRAMITAR")])
     async def prorrogar_solicitud_rgpd(
@@ -163,7 +164,7 @@ class ProteccionDatosMutation:
         if ctx.user_id:
             solicitud.modificado_por_id = uuid.UUID(ctx.user_id)
         await ctx.session.flush()
-        return solicitud  # type: ignore[return-value]
+        return await recargar(info.context.session, solicitud, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("RGPD_SOLICITUD_RESOLVER")])
     async def resolver_solicitud_rgpd(
@@ -188,7 +189,7 @@ class ProteccionDatosMutation:
             solicitud.tramitada_por_id = uuid.UUID(ctx.user_id)
             solicitud.modificado_por_id = uuid.UUID(ctx.user_id)
         await ctx.session.flush()
-        return solicitud  # type: ignore[return-value]
+        return await recargar(info.context.session, solicitud, info)
 
     # -----------------------------------------------------------------
     # Consentimientos
@@ -211,7 +212,7 @@ class ProteccionDatosMutation:
         if ctx.user_id:
             consentimiento.modificado_por_id = uuid.UUID(ctx.user_id)
         await ctx.session.flush()
-        return consentimiento  # type: ignore[return-value]
+        return await recargar(info.context.session, consentimiento, info)
 
     # -----------------------------------------------------------------
     # Brechas de seguridad
@@ -256,7 +257,7 @@ class ProteccionDatosMutation:
         )
         ctx.session.add(brecha)
         await ctx.session.flush()
-        return brecha  # type: ignore[return-value]
+        return await recargar(info.context.session, brecha, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("RGPD_BRECHA_NOTIFICAR_AEPD")])
     async def notificar_brecha_aepd(
@@ -278,7 +279,7 @@ class ProteccionDatosMutation:
         if ctx.user_id:
             brecha.modificado_por_id = uuid.UUID(ctx.user_id)
         await ctx.session.flush()
-        return brecha  # type: ignore[return-value]
+        return await recargar(info.context.session, brecha, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("RGPD_BRECHA_CERRAR")])
     async def cerrar_brecha_seguridad(
@@ -300,7 +301,7 @@ class ProteccionDatosMutation:
             brecha.responsable_gestion_id = uuid.UUID(ctx.user_id)
             brecha.modificado_por_id = uuid.UUID(ctx.user_id)
         await ctx.session.flush()
-        return brecha  # type: ignore[return-value]
+        return await recargar(info.context.session, brecha, info)
 
     # -----------------------------------------------------------------
     # Auditoría de accesos
@@ -342,4 +343,4 @@ class ProteccionDatosMutation:
         )
         ctx.session.add(log)
         await ctx.session.flush()
-        return log  # type: ignore[return-value]
+        return await recargar(info.context.session, log, info)
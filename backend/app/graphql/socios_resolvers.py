@@ -4,7 +4,8 @@ En el modelo CRM la identidad vive en `Contacto` y los datos de socio se reparte
 entre `Vinculacion(SOCIO)`, su satélite `Socio`, la `Membresia` (tipo de miembro) y,
 opcionalmente, `Vinculacion(VOLUNTARIO)` + `Voluntario`. El frontend, sin embargo,
 necesita un registro plano «tipo Miembro». Este módulo lo reconstruye con unas pocas
-consultas por lote (sin N+1) y lo expone como `socios` / `socio(id)` / `sociosCount`.
+consultas por lote (sin N+1) y lo expone como `socios` / `socio(id)` / `sociosCount`,
+más la conexión paginada por cursor `sociosPaginados` para el listado del padrón.
 """
 from __future__ import annotations
 
@@ -14,8 +15,11 @@ from decimal import Decimal
 from typing import Optional, List
 
 import strawberry
-from sqlalchemy import select, func
+from sqlalchemy import select, func, tuple_
+from sqlalchemy.orm import aliased
 
+from app.core.busqueda import ESCAPE_LIKE, patron_contiene
+from app.core.carga import cargar, cargar_seleccion
 from app.modules.membresia.models.contacto import Contacto
 from app.modules.membresia.models.vinculacion import Vinculacion, Socio, Voluntario
 from app.modules.membresia.models.tipo_vinculacion import TipoVinculacion
@@ -34,6 +38,9 @@ from app.graphql.types_auto import (
     MotivoReduccionCuotaType, UsuarioType, MiembroHabilidadType, FranjaDisponibilidadType,
 )
 from app.graphql.permissions import RequireTransaction
+from app.graphql.paginacion import (
+    PageInfo, codificar_cursor, decodificar_cursor, tamano_pagina,
+)
 
 
 # El color del badge por situación es ahora property del satélite (Socio.estado_color),
@@ -140,17 +147,35 @@ class SocioVistaType:
     franjas_disponibilidad: List[FranjaDisponibilidadType] = strawberry.field(default_factory=list)
 
 
-async def _construir_socios(
-    session,
-    contacto_id: Optional[uuid.UUID] = None,
+@strawberry.type(name="SocioVistaEdge")
+class SocioVistaEdge:
+    cursor: str
+    node: SocioVistaType
+
+
+@strawberry.type(name="SocioVistaConnection")
+class SocioVistaConnection:
+    """Página de socios (forma Relay) con el total del conjunto filtrado."""
+    edges: List[SocioVistaEdge] = strawberry.field(default_factory=list)
+    page_info: PageInfo = strawberry.field(default_factory=PageInfo)
+    total_count: int = 0
+
+
+def _consulta_socios(
     *,
+    contacto_id: Optional[uuid.UUID] = None,
     agrupacion_id: Optional[uuid.UUID] = None,
     activo: Optional[bool] = None,
     es_voluntario: Optional[bool] = None,
+    texto: Optional[str] = None,
     eliminado: bool = False,
-) -> List[SocioVistaType]:
-    """Reconstruye los `SocioVistaType` con consultas por lote (sin N+1)."""
-    # 1) Vinculaciones SOCIO (+ satélite + contacto), con filtros opcionales.
+):
+    """SELECT de vinculaciones SOCIO con todos los filtros resueltos en SQL.
+
+    `es_voluntario` se traduce a un EXISTS sobre la vinculación VOLUNTARIO activa
+    (con su satélite) y `texto` a un LIKE sobre nombre/apellidos/email/nº de socio,
+    de modo que la paginación opera ya sobre el conjunto filtrado.
+    """
     q = (
         select(Vinculacion)
         .join(TipoVinculacion, Vinculacion.tipo_vinculacion_id == TipoVinculacion.id)
@@ -163,10 +188,99 @@ async def _construir_socios(
         q = q.where(Contacto.agrupacion_id == agrupacion_id)
     if activo is not None:
         q = q.where(Contacto.activo == activo)
+    if es_voluntario is not None:
+        vinc_vol = aliased(Vinculacion)
+        tipo_vol = aliased(TipoVinculacion)
+        existe_vol = (
+            select(vinc_vol.id)
+            .join(tipo_vol, vinc_vol.tipo_vinculacion_id == tipo_vol.id)
+            .join(Voluntario, Voluntario.vinculacion_id == vinc_vol.id)
+            .where(
+                tipo_vol.codigo == "VOLUNTARIO",
+                vinc_vol.estado == "activa",
+                vinc_vol.contacto_id == Vinculacion.contacto_id,
+            )
+            .exists()
+        )
+        q = q.where(existe_vol if es_voluntario else ~existe_vol)
+    if texto and texto.strip():
+        q = q.outerjoin(Socio, Socio.vinculacion_id == Vinculacion.id).where(
+            func.lower(
+                func.concat_ws(
+                    " ", Contacto.nombre, Contacto.apellido1, Contacto.apellido2,
+                    Contacto.email, Socio.numero_socio,
+                )
+            ).like(patron_contiene(texto), escape=ESCAPE_LIKE)
+        )
+    return q
+
+
+# Relaciones de la Vinculacion SOCIO que lee `_hidratar_socios`.
+_CARGA_SOCIO = ("contacto", "socio.motivo_reduccion")
+
+
+def _claves_orden_socios():
+    """Claves del orden estable del listado: apellidos, nombre, id del contacto
+    (las del índice `ix_contactos_orden_apellidos`, que sirve el orden) y, como
+    desempate único, el id de la vinculación. Son también las claves del cursor."""
+    return (
+        func.lower(func.coalesce(Contacto.apellido1, "")).label("k_apellido1"),
+        func.lower(func.coalesce(Contacto.apellido2, "")).label("k_apellido2"),
+        func.lower(func.coalesce(Contacto.nombre, "")).label("k_nombre"),
+        Contacto.id.label("k_contacto"),
+        Vinculacion.id.label("k_id"),
+    )
+
+
+def _tras_cursor(q, claves, after: str):
+    """Filtro keyset: filas estrictamente posteriores al cursor `after`."""
+    *textos, contacto_id, vinculacion_id = decodificar_cursor(after, len(claves))
+    try:
+        valores = [*textos, uuid.UUID(contacto_id), uuid.UUID(vinculacion_id)]
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Cursor de paginación no válido") from exc
+    return q.where(tuple_(*(c.element for c in claves)) > tuple_(*valores))
+
+
+async def _construir_socios(
+    session,
+    contacto_id: Optional[uuid.UUID] = None,
+    *,
+    agrupacion_id: Optional[uuid.UUID] = None,
+    activo: Optional[bool] = None,
+    es_voluntario: Optional[bool] = None,
+    texto: Optional[str] = None,
+    eliminado: bool = False,
+    info: Optional[strawberry.Info] = None,
+) -> List[SocioVistaType]:
+    """Reconstruye los `SocioVistaType` (lista completa filtrada, en orden estable)."""
+    q = _consulta_socios(
+        contacto_id=contacto_id, agrupacion_id=agrupacion_id, activo=activo,
+        es_voluntario=es_voluntario, texto=texto, eliminado=eliminado,
+    ).order_by(*_claves_orden_socios()).options(*cargar(Vinculacion, *_CARGA_SOCIO))
     vincs = list((await session.execute(q)).scalars().all())
+    return await _hidratar_socios(session, vincs, info)
+
+
+async def _hidratar_socios(
+    session, vincs, info: Optional[strawberry.Info] = None, raiz: Optional[str] = None,
+) -> List[SocioVistaType]:
+    """Construye la vista plana de las vinculaciones dadas con consultas por lote
+    (sin N+1). Los satélites se cargan solo para los contactos de `vincs`, así que
+    con una página el coste es el de la página, no el del padrón completo.
+
+    Las `vincs` deben venir con `_CARGA_SOCIO` (contacto y satélite Socio). Con
+    `info`, los objetos ORM que se exponen (usuario, agrupación…) se cargan con las
+    relaciones que pide la selección; `raiz` es la ruta hasta el socio dentro del
+    campo raíz (p. ej. `edges.node` en la conexión paginada)."""
     if not vincs:
         return []
 
+    def _seleccion(modelo, campo: str) -> list:
+        if info is None:
+            return []
+        return cargar_seleccion(modelo, info, f"{raiz}.{campo}" if raiz else campo)
+
     contacto_ids = [v.contacto_id for v in vincs]
 
     # 2) Membresía por contacto (tipo de miembro)
@@ -174,6 +288,7 @@ async def _construir_socios(
         select(Participacion.contacto_id, Membresia)
         .join(Membresia, Membresia.participacion_id == Participacion.id)
         .where(Participacion.contacto_id.in_(contacto_ids), Participacion.tipo == "MEMBRESIA")
+        .options(*cargar(Membresia, "tipo_miembro"))
     )).all()
     membresia_por_contacto = {cid: mb for (cid, mb) in memb_rows}
 
@@ -186,12 +301,14 @@ async def _construir_socios(
             Vinculacion.estado == "activa",
             Vinculacion.contacto_id.in_(contacto_ids),
         )
+        .options(*cargar(Vinculacion, "voluntario"))
     )).scalars().all()
     voluntario_por_contacto = {v.contacto_id: (v.voluntario if v.voluntario else None) for v in vol_rows}
 
     # 4) Usuario por contacto
     usr_rows = (await session.execute(
         select(Usuario).where(Usuario.contacto_id.in_(contacto_ids), Usuario.eliminado == False)  # noqa: E712
+        .options(*_seleccion(Usuario, "usuario"))
     )).scalars().all()
     usuario_por_contacto = {u.contacto_id: u for u in usr_rows}
 
@@ -201,6 +318,7 @@ async def _construir_socios(
     if agr_ids:
         agrupaciones = {u.id: u for u in (await session.execute(
             select(UnidadOrganizativa).where(UnidadOrganizativa.id.in_(agr_ids))
+            .options(*_seleccion(UnidadOrganizativa, "agrupacion"))
         )).scalars().all()}
 
     niv_ids = {v.contacto.nivel_estudios_id for v in vincs if v.contacto and v.contacto.nivel_estudios_id}
@@ -208,6 +326,7 @@ async def _construir_socios(
     if niv_ids:
         niveles = {n.id: n for n in (await session.execute(
             select(NivelEstudios).where(NivelEstudios.id.in_(niv_ids))
+            .options(*_seleccion(NivelEstudios, "nivel_estudios_rel"))
         )).scalars().all()}
 
     mb_ids = {v.socio.motivo_baja_id for v in vincs if v.socio and v.socio.motivo_baja_id}
@@ -215,17 +334,18 @@ async def _construir_socios(
     if mb_ids:
         motivos_baja = {m.id: m for m in (await session.execute(
             select(MotivoBaja).where(MotivoBaja.id.in_(mb_ids))
+            .options(*_seleccion(MotivoBaja, "motivo_baja_rel"))
         )).scalars().all()}
 
     # 6) Habilidades y franjas de disponibilidad. Ahora cuelgan de la extensión
     #    Voluntario (voluntario_id); se indexan por contacto vía Voluntario→Vinculacion.
-    from app.modules.membresia.models.vinculacion import Voluntario
     hab_por_contacto: dict = {}
     for h, contacto_id in (await session.execute(
         select(MiembroHabilidad, Vinculacion.contacto_id)
         .join(Voluntario, Voluntario.id == MiembroHabilidad.voluntario_id)
         .join(Vinculacion, Vinculacion.id == Voluntario.vinculacion_id)
         .where(Vinculacion.contacto_id.in_(contacto_ids))
+        .options(*_seleccion(MiembroHabilidad, "habilidades"))
     )).all():
         hab_por_contacto.setdefault(contacto_id, []).append(h)
     franjas_por_contacto: dict = {}
@@ -234,6 +354,7 @@ async def _construir_socios(
         .join(Voluntario, Voluntario.id == FranjaDisponibilidad.voluntario_id)
         .join(Vinculacion, Vinculacion.id == Voluntario.vinculacion_id)
         .where(Vinculacion.contacto_id.in_(contacto_ids))
+        .options(*_seleccion(FranjaDisponibilidad, "franjas_disponibilidad"))
     )).all():
         franjas_por_contacto.setdefault(contacto_id, []).append(fr)
 
@@ -305,8 +426,6 @@ async def _construir_socios(
             habilidades=hab_por_contacto.get(c.id, []),
             franjas_disponibilidad=franjas_por_contacto.get(c.id, []),
         ))
-    if es_voluntario is not None:
-        socios = [x for x in socios if x.es_voluntario == es_voluntario]
     return socios
 
 
@@ -387,14 +506,13 @@ async def _construir_contactos_dotables(
     if tipo_vinculacion_id is not None:
         q = q.where(Vinculacion.tipo_vinculacion_id == tipo_vinculacion_id)
     if texto:
-        patron = f"%{texto.strip().lower()}%"
         q = q.where(
             func.lower(
                 func.concat_ws(
                     " ", Contacto.nombre, Contacto.apellido1,
                     Contacto.apellido2, Contacto.razon_social,
                 )
-            ).like(patron)
+            ).like(patron_contiene(texto), escape=ESCAPE_LIKE)
         )
 
     filas = (await session.execute(q)).all()
@@ -473,25 +591,78 @@ class SociosQuery:
         agrupacion_id: Optional[uuid.UUID] = None,
         activo: Optional[bool] = None,
         es_voluntario: Optional[bool] = None,
+        texto: Optional[str] = None,
         eliminado: bool = False,
     ) -> List[SocioVistaType]:
         """Listado denormalizado de socios (sustituye a la antigua query `miembros`).
 
         Filtros opcionales planos: contactoId, agrupacionId, activo, esVoluntario,
-        eliminado. (Con contactoId devuelve una lista de 0/1 elementos, para que el
+        texto, eliminado. Para el padrón completo usar `sociosPaginados`. (Con contactoId devuelve una lista de 0/1 elementos, para que el
         frontend pueda aliasar `miembros: socios(contactoId: $id)` y seguir leyendo
         `data.miembros[0]`.)
         """
         res = await _construir_socios(
             info.context.session, contacto_id=contacto_id, agrupacion_id=agrupacion_id,
-            activo=activo, es_voluntario=es_voluntario, eliminado=eliminado,
+            activo=activo, es_voluntario=es_voluntario, texto=texto, eliminado=eliminado,
+            info=info,
         )
         return await _enmascarar_datos_bancarios(info, info.context.session, res)
 
+    @strawberry.field
+    async def socios_paginados(
+        self,
+        info: strawberry.Info,
+        first: Optional[int] = 50,
+        after: Optional[str] = None,
+        agrupacion_id: Optional[uuid.UUID] = None,
+        activo: Optional[bool] = None,
+        es_voluntario: Optional[bool] = None,
+        texto: Optional[str] = None,
+        eliminado: bool = False,
+    ) -> SocioVistaConnection:
+        """Listado de socios paginado por cursor (keyset), orden apellidos/nombre.
+
+        Todos los filtros (incluidos esVoluntario y la búsqueda libre `texto`) se
+        resuelven en SQL; solo la página pedida se hidrata con sus satélites.
+        `after` es el `endCursor` de la página anterior; `first` se acota a 200.
+        """
+        session = info.context.session
+        limite = tamano_pagina(first)
+        base = _consulta_socios(
+            agrupacion_id=agrupacion_id, activo=activo, es_voluntario=es_voluntario,
+            texto=texto, eliminado=eliminado,
+        )
+        total = (await session.execute(
+            select(func.count()).select_from(base.with_only_columns(Vinculacion.id).subquery())
+        )).scalar() or 0
+
+        claves = _claves_orden_socios()
+        q = base.add_columns(*claves)
+        if after:
+            q = _tras_cursor(q, claves, after)
+        q = q.options(*cargar(Vinculacion, *_CARGA_SOCIO))
+        filas = (await session.execute(q.order_by(*claves).limit(limite + 1))).all()
+
+        hay_mas = len(filas) > limite
+        filas = filas[:limite]
+        cursores = [codificar_cursor(fila[1:]) for fila in filas]
+        nodos = await _hidratar_socios(session, [fila[0] for fila in filas], info, "edges.node")
+        nodos = await _enmascarar_datos_bancarios(info, session, nodos)
+        return SocioVistaConnection(
+            edges=[SocioVistaEdge(cursor=c, node=n) for c, n in zip(cursores, nodos)],
+            page_info=PageInfo(
+                has_next_page=hay_mas,
+                has_previous_page=after is not None,
+                start_cursor=cursores[0] if cursores else None,
+                end_cursor=cursores[-1] if cursores else None,
+            ),
+            total_count=total,
+        )
+
     @strawberry.field
     async def socio(self, info: strawberry.Info, id: uuid.UUID) -> Optional[SocioVistaType]:
         """Un socio por id de contacto."""
-        res = await _construir_socios(info.context.session, contacto_id=id)
+        res = await _construir_socios(info.context.session, contacto_id=id, info=info)
         res = await _enmascarar_datos_bancarios(info, info.context.session, res)
         return res[0] if res else None
 
@@ -520,7 +691,9 @@ class SociosQuery:
         identidad tomada del `Contacto` ligado (vacía si la cuenta no tiene contacto).
         """
         session = info.context.session
-        q = select(Usuario).where(Usuario.eliminado == False)  # noqa: E712
+        q = select(Usuario).where(Usuario.eliminado == False).options(  # noqa: E712
+            *cargar(Usuario, "contacto"), *cargar_seleccion(Usuario, info, "usuario"),
+        )
         if activo is not None:
             q = q.where(Usuario.activo == activo)
         usuarios = list((await session.execute(q)).scalars().all())
@@ -535,6 +708,7 @@ class SociosQuery:
         if agr_ids:
             agrupaciones = {a.id: a for a in (await session.execute(
                 select(UnidadOrganizativa).where(UnidadOrganizativa.id.in_(agr_ids))
+                .options(*cargar_seleccion(UnidadOrganizativa, info, "agrupacion"))
             )).scalars().all()}
 
         filas: List[SocioVistaType] = []
@@ -10,6 +10,7 @@ Strawchemy genera automáticamente:
 
 from typing import Optional
 import strawberry
+from strawchemy import QueryHook
 from . import strawchemy
 
 # === ACCESO: roles, transacciones, funcionalidades, cargos ===
@@ -310,25 +311,29 @@ class SolicitudReduccionCuotaDocumentoType:
 class DonacionConceptoType:
     pass
 
+_CARGA_DONANTE = QueryHook(load=[Donacion.contacto])
+
+
 @strawchemy.type(Donacion, include="all", override=True)
 class DonacionType:
     # Marker para que strawchemy procese el body con campos custom escalares.
     observaciones: Optional[str] = None
 
     # Compat: los datos del donante salen del Contacto (ya no hay donante_* en Donacion).
-    @strawberry.field
+    # El hook hace que strawchemy cargue `contacto` en la misma consulta.
+    @strawchemy.field(query_hook=_CARGA_DONANTE)
     def donante_nombre(self) -> Optional[str]:
         return self.contacto.nombre_completo if self.contacto else None
 
-    @strawberry.field
+    @strawchemy.field(query_hook=_CARGA_DONANTE)
     def donante_dni(self) -> Optional[str]:
         return self.contacto.numero_documento if self.contacto else None
 
-    @strawberry.field
+    @strawchemy.field(query_hook=_CARGA_DONANTE)
     def donante_email(self) -> Optional[str]:
         return self.contacto.email if self.contacto else None
 
-    @strawberry.field
+    @strawchemy.field(query_hook=_CARGA_DONANTE)
     def donante_telefono(self) -> Optional[str]:
         return self.contacto.telefono if self.contacto else None
 
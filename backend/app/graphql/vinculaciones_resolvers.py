@@ -29,6 +29,7 @@ from app.modules.membresia.models.contacto import Contacto
 from app.modules.membresia.models.vinculacion import Vinculacion, Socio, Voluntario
 from app.modules.membresia.models.tipo_vinculacion import TipoVinculacion
 from app.modules.membresia.models.historial_nombramiento import HistorialNombramiento
+from app.core.carga import cargar, cargar_seleccion
 from app.graphql.permissions import RequireTransaction
 from app.graphql.types_auto import VinculacionType, ContactoType, HistorialNombramientoType
 from app.modules.acceso.services.ambito_territorial import (
@@ -64,11 +65,16 @@ async def _vinculacion_activa(session, contacto_id: uuid.UUID, codigo: str):
     )).scalar_one_or_none()
 
 
-async def _fetch_vinculacion(session, vinculacion_id: uuid.UUID) -> Vinculacion:
-    """Recarga una Vinculacion con sus relaciones selectin."""
+async def _fetch_vinculacion(
+    session, vinculacion_id: uuid.UUID, info: Optional[strawberry.Info] = None, *rutas: str,
+) -> Vinculacion:
+    """Recarga una Vinculacion con las relaciones que pide la selección GraphQL
+    (si se pasa `info`) más las `rutas` que necesite el llamador."""
+    opciones = [*(cargar_seleccion(Vinculacion, info) if info else ()), *cargar(Vinculacion, *rutas)]
     v = (await session.execute(
         select(Vinculacion).where(Vinculacion.id == vinculacion_id)
-    )).scalar_one_or_none()
+        .options(*opciones).execution_options(populate_existing=True)
+    )).unique().scalar_one_or_none()
     if v is None:
         raise ValueError("Vinculación no encontrada.")
     return v
@@ -213,7 +219,8 @@ class VinculacionesQuery:
                 Vinculacion.eliminado == False,  # noqa: E712
             )
             .order_by(Vinculacion.fecha_inicio)
-        )).scalars().all())
+            .options(*cargar_seleccion(Vinculacion, info), *cargar(Vinculacion, "socio", "contacto"))
+        )).unique().scalars().all())
         await _ocultar_iban_vinculaciones(info, session, rows)
         return rows
 
@@ -274,7 +281,8 @@ class VinculacionesMutation:
         await session.commit()
         return (await session.execute(
             select(HistorialNombramiento).where(HistorialNombramiento.id == n.id)
-        )).scalar_one()
+            .options(*cargar_seleccion(HistorialNombramiento, info))
+        )).unique().scalar_one()
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CONTACTO_CREAR")])
     async def crear_contacto(self, info: strawberry.Info, data: ContactoCreateInput) -> ContactoType:
@@ -305,7 +313,9 @@ class VinculacionesMutation:
         await session.commit()
         return (await session.execute(
             select(Contacto).where(Contacto.id == contacto.id)
-        )).scalar_one()
+            .options(*cargar_seleccion(Contacto, info))
+            .execution_options(populate_existing=True)
+        )).unique().scalar_one()
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CONTACTO_EDITAR")])
     async def actualizar_contacto(self, info: strawberry.Info, data: ContactoUpdateInput) -> ContactoType:
@@ -331,7 +341,9 @@ class VinculacionesMutation:
         await session.commit()
         return (await session.execute(
             select(Contacto).where(Contacto.id == contacto.id)
-        )).scalar_one()
+            .options(*cargar_seleccion(Contacto, info))
+            .execution_options(populate_existing=True)
+        )).unique().scalar_one()
 
     @strawberry.mutation(permission_classes=[RequireTransaction("CONTACTO_ELIMINAR")])
     async def eliminar_contacto(self, info: strawberry.Info, id: uuid.UUID) -> ContactoType:
@@ -351,7 +363,9 @@ class VinculacionesMutation:
         await session.commit()
         return (await session.execute(
             select(Contacto).where(Contacto.id == id)
-        )).scalar_one()
+            .options(*cargar_seleccion(Contacto, info))
+            .execution_options(populate_existing=True)
+        )).unique().scalar_one()
 
     @strawberry.mutation(permission_classes=[RequireTransaction("MEMBRESIA_MIEMBRO_CREAR")])
     async def alta_vinculacion_socio(
@@ -388,7 +402,7 @@ class VinculacionesMutation:
             motivo_reduccion_id=data.motivo_reduccion_id,
         ))
         await session.commit()
-        return await _fetch_vinculacion(session, vinc.id)
+        return await _fetch_vinculacion(session, vinc.id, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("MEMBRESIA_MIEMBRO_CREAR")])
     async def alta_vinculacion_voluntario(
@@ -427,7 +441,7 @@ class VinculacionesMutation:
             disponibilidad_viajar=data.disponibilidad_viajar,
         ))
         await session.commit()
-        return await _fetch_vinculacion(session, vinc.id)
+        return await _fetch_vinculacion(session, vinc.id, info)
 
     @strawberry.mutation(permission_classes=[RequireTransaction("MEMBRESIA_MIEMBRO_EDITAR")])
     async def cerrar_vinculacion(
@@ -436,11 +450,11 @@ class VinculacionesMutation:
     ) -> VinculacionType:
         """Cierra una vinculación (fecha_fin + estado='cerrada'). No la elimina."""
         session = info.context.session
-        vinc = await _fetch_vinculacion(session, vinculacion_id)
+        vinc = await _fetch_vinculacion(session, vinculacion_id, None, "socio")
         vinc.fecha_fin = fecha_cierre or date.today()
         vinc.estado = "cerrada"
         # Si el satélite de socio existe, reflejar la baja en su estado.
         if vinc.socio is not None:
             vinc.socio.estado_socio = "baja"
         await session.commit()
-        return await _fetch_vinculacion(session, vinc.id)
+        return await _fetch_vinculacion(session, vinc.id, info)
@@ -1,37 +1,205 @@
-"""Servicio de caché con soporte para Redis y fallback en memoria."""
-
-import os
-import json
-import pickle
+"""Servicio de caché async con Redis (redis.asyncio) y fallback en memoria.
+
+- Backend Redis nativo de asyncio: ninguna operación bloquea el event loop.
+- Fallback en memoria acotado: LRU con TTL (`CACHE_MEMORY_MAX_ENTRIES`).
+- Serialización JSON (sin pickle) en ambos backends: los valores deben ser
+  JSON-serializables; fechas, UUID y Decimal se guardan como texto. La memoria
+  también guarda el JSON, así que cada lectura devuelve una copia nueva, igual
+  que Redis (modificar lo leído no altera la caché).
+- Espacios de nombres: el primer segmento de la clave (`generar_cache_key(prefix, …)`)
+  es su namespace. `invalidate_namespace` borra solo ese espacio y `flush_all`
+  solo las claves de la aplicación (prefijo `siga:cache:`), nunca la BD de Redis
+  entera (la comparten la PermissionMatrix y la caché de principal).
+- Etiquetas: `set(..., tags=[...])` asocia la clave a etiquetas que luego se
+  invalidan juntas con `invalidate_tags`.
+- `get_or_set` con single-flight: si varias corrutinas del proceso piden a la vez
+  la misma clave ausente, solo una ejecuta la factoría y las demás esperan su
+  resultado.
+- Contadores de hits/misses/evictions/errores (`stats()`).
+"""
+
+import asyncio
 import hashlib
+import json
 import logging
-from typing import Any, Optional, Dict, List
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from uuid import UUID
 
 logger = logging.getLogger(__name__)
 
-# Cache en memoria como fallback
-_memory_cache = {}
-_memory_cache_ttl = {}
+# Prefijo de todas las claves de la aplicación en Redis.
+KEY_PREFIX = "siga:cache:"
+_TAG_PREFIX = "siga:cache-tag:"
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Valor no serializable en caché: {type(value).__name__}")
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=_json_default, separators=(",", ":"))
+
+
+def _loads(raw: Any) -> Any:
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8")
+    try:
+        return json.loads(raw)
+    except (TypeError, ValueError):
+        return raw
+
+
+class _MemoryLRU:
+    """LRU con TTL por entrada y etiquetas (fallback sin Redis).
+
+    Guarda los valores ya serializados. Las etiquetas se indexan en los dos
+    sentidos (etiqueta → claves y clave → etiquetas) para podarlas cuando la
+    clave sale por expulsión LRU, borrado o caducidad: sin eso el índice de
+    etiquetas crecería sin límite.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, tuple[str, Optional[float]]]" = OrderedDict()
+        self._tags: Dict[str, set] = {}
+        self._tags_de: Dict[str, set] = {}
+        self.evictions = 0
+
+    def _desetiquetar(self, key: str) -> None:
+        for t in self._tags_de.pop(key, ()):
+            claves = self._tags.get(t)
+            if claves is not None:
+                claves.discard(key)
+                if not claves:
+                    del self._tags[t]
+
+    def _quitar(self, key: str) -> None:
+        self._data.pop(key, None)
+        self._desetiquetar(key)
+
+    def _vivo(self, key: str) -> bool:
+        item = self._data.get(key)
+        if item is None:
+            return False
+        expira = item[1]
+        if expira is not None and expira <= time.monotonic():
+            self._quitar(key)
+            return False
+        return True
+
+    def get(self, key: str) -> tuple[bool, Optional[str]]:
+        if not self._vivo(key):
+            return False, None
+        self._data.move_to_end(key)
+        return True, self._data[key][0]
+
+    def set(self, key: str, value: str, ttl: Optional[int]) -> None:
+        """Guarda `value` (JSON). Reescribir una clave descarta sus etiquetas previas."""
+        expira = time.monotonic() + ttl if ttl else None
+        self._desetiquetar(key)
+        self._data[key] = (value, expira)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            expulsada, _ = self._data.popitem(last=False)
+            self._desetiquetar(expulsada)
+            self.evictions += 1
+
+    def keep_ttl_set(self, key: str, value: str) -> None:
+        """Cambia el valor conservando el TTL (para increment)."""
+        expira = self._data[key][1] if self._vivo(key) else None
+        self._data[key] = (value, expira)
+        self._data.move_to_end(key)
+
+    def delete(self, key: str) -> bool:
+        vivo = self._vivo(key)
+        self._quitar(key)
+        return vivo
+
+    def exists(self, key: str) -> bool:
+        return self._vivo(key)
+
+    def ttl(self, key: str) -> int:
+        if not self._vivo(key):
+            return -2
+        expira = self._data[key][1]
+        if expira is None:
+            return -1
+        return max(0, int(expira - time.monotonic()))
+
+    def tag(self, key: str, tags: Iterable[str]) -> None:
+        if key not in self._data:
+            return
+        for t in tags:
+            self._tags.setdefault(t, set()).add(key)
+            self._tags_de.setdefault(key, set()).add(t)
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        borradas = 0
+        for t in tags:
+            for key in list(self._tags.get(t, ())):
+                borradas += self.delete(key)
+        return borradas
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        claves = [k for k in self._data if k.startswith(prefix)]
+        for k in claves:
+            self._quitar(k)
+        return len(claves)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._tags.clear()
+        self._tags_de.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
 
 
 class CacheService:
-    """Servicio de caché con soporte para Redis y fallback en memoria."""
+    """Servicio de caché async con soporte para Redis y fallback en memoria."""
 
-    def __init__(self, redis_url: Optional[str] = None):
+    def __init__(self, redis_url: Optional[str] = None, max_entries: int = 10000):
         self.redis_client = None
         self._redis_available = False
-
-        if redis_url:
-            self._setup_redis(redis_url)
-
-    def _setup_redis(self, redis_url: str) -> None:
+        self._redis_url = redis_url
+        self._conectado = redis_url is None
+        self._connect_lock = asyncio.Lock()
+        self._memory = _MemoryLRU(max_entries)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    # ------------------------------------------------------------------
+    # Conexión (perezosa: la primera operación hace el PING)
+    # ------------------------------------------------------------------
+
+    async def _redis(self):
+        """Cliente Redis si está disponible; None → usar memoria."""
+        if self._conectado:
+            return self.redis_client if self._redis_available else None
+        async with self._connect_lock:
+            if not self._conectado:
+                await self._setup_redis(self._redis_url)
+                self._conectado = True
+        return self.redis_client if self._redis_available else None
+
+    async def _setup_redis(self, redis_url: str) -> None:
         """Configura conexión a Redis."""
         try:
-            import redis
-            self.redis_client = redis.from_url(redis_url)
-            # Test connection
-            self.redis_client.ping()
+            import redis.asyncio as aioredis
+            self.redis_client = aioredis.from_url(redis_url)
+            await self.redis_client.ping()
             self._redis_available = True
             logger.info("Redis conectado exitosamente")
         except ImportError:
@@ -40,242 +208,327 @@ class CacheService:
             logger.error(f"Error conectando a Redis: {e}")
             logger.warning("Usando caché en memoria como fallback")
 
-    def get(self, key: str, default: Any = None) -> Any:
+    async def close(self) -> None:
+        if self.redis_client is not None:
+            await self.redis_client.aclose()
+
+    @staticmethod
+    def _k(key: str) -> str:
+        return KEY_PREFIX + key
+
+    def _error(self, accion: str, key: str, e: Exception) -> None:
+        self.errors += 1
+        logger.error(f"Error {accion} caché para {key}: {e}")
+
+    # ------------------------------------------------------------------
+    # API básica
+    # ------------------------------------------------------------------
+
+    async def get(self, key: str, default: Any = None) -> Any:
         """Obtiene un valor del caché."""
         try:
-            if self._redis_available:
-                value = self.redis_client.get(key)
-                if value is not None:
-                    try:
-                        return pickle.loads(value)
-                    except Exception:
-                        return value.decode('utf-8')
+            redis = await self._redis()
+            if redis is not None:
+                value = await redis.get(self._k(key))
+                if value is None:
+                    self.misses += 1
+                    return default
+                self.hits += 1
+                return _loads(value)
+
+            encontrado, value = self._memory.get(key)
+            if not encontrado:
+                self.misses += 1
                 return default
-
-            # Fallback a memoria
-            return self._get_from_memory(key, default)
+            self.hits += 1
+            return _loads(value)
 
         except Exception as e:
-            logger.error(f"Error obteniendo caché para {key}: {e}")
+            self._error("obteniendo", key, e)
             return default
 
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
-        """Guarda un valor en caché."""
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> bool:
+        """Guarda un valor en caché (opcionalmente asociado a etiquetas)."""
         try:
-            if self._redis_available:
-                serialized_value = pickle.dumps(value)
-                if ttl:
-                    return self.redis_client.setex(key, ttl, serialized_value)
-                else:
-                    return self.redis_client.set(key, serialized_value)
+            redis = await self._redis()
+            if redis is not None:
+                async with redis.pipeline(transaction=False) as pipe:
+                    pipe.set(self._k(key), _dumps(value), ex=ttl or None)
+                    for t in tags or ():
+                        pipe.sadd(_TAG_PREFIX + t, self._k(key))
+                    await pipe.execute()
+                return True
 
-            # Fallback a memoria
-            return self._set_in_memory(key, value, ttl)
+            # Fallback a memoria: serializado como en Redis
+            self._memory.set(key, _dumps(value), ttl)
+            if tags:
+                self._memory.tag(key, tags)
+            return True
 
         except Exception as e:
-            logger.error(f"Error guardando en caché para {key}: {e}")
+            self._error("guardando en", key, e)
             return False
 
-    def delete(self, key: str) -> bool:
+    async def delete(self, key: str) -> bool:
         """Elimina una clave del caché."""
         try:
-            if self._redis_available:
-                return bool(self.redis_client.delete(key))
-
-            # Fallback a memoria
-            return self._delete_from_memory(key)
+            redis = await self._redis()
+            if redis is not None:
+                return bool(await redis.delete(self._k(key)))
+            return self._memory.delete(key)
 
         except Exception as e:
-            logger.error(f"Error eliminando caché para {key}: {e}")
+            self._error("eliminando", key, e)
             return False
 
-    def exists(self, key: str) -> bool:
-        """Verifica si una clave existe en el caché."""
+    async def delete_many(self, keys: List[str]) -> int:
+        """Elimina varias claves en una sola operación."""
+        if not keys:
+            return 0
         try:
-            if self._redis_available:
-                return bool(self.redis_client.exists(key))
-
-            # Fallback a memoria
-            return self._exists_in_memory(key)
+            redis = await self._redis()
+            if redis is not None:
+                return int(await redis.delete(*(self._k(k) for k in keys)))
+            return sum(self._memory.delete(k) for k in keys)
 
         except Exception as e:
-            logger.error(f"Error verificando existencia de {key}: {e}")
-            return False
+            self._error("eliminando", ",".join(keys[:3]), e)
+            return 0
 
-    def flush_all(self) -> bool:
-        """Limpia todo el caché."""
+    async def exists(self, key: str) -> bool:
+        """Verifica si una clave existe en el caché."""
         try:
-            if self._redis_available:
-                return self.redis_client.flushdb()
-
-            # Fallback a memoria
-            return self._flush_memory()
+            redis = await self._redis()
+            if redis is not None:
+                return bool(await redis.exists(self._k(key)))
+            return self._memory.exists(key)
 
         except Exception as e:
-            logger.error(f"Error limpiando caché: {e}")
+            self._error("verificando", key, e)
             return False
 
-    def get_ttl(self, key: str) -> int:
+    async def get_ttl(self, key: str) -> int:
         """Obtiene el tiempo de vida restante de una clave."""
         try:
-            if self._redis_available:
-                return self.redis_client.ttl(key)
-
-            # Fallback a memoria
-            return self._get_ttl_from_memory(key)
+            redis = await self._redis()
+            if redis is not None:
+                return int(await redis.ttl(self._k(key)))
+            return self._memory.ttl(key)
 
         except Exception as e:
-            logger.error(f"Error obteniendo TTL para {key}: {e}")
+            self._error("obteniendo TTL de", key, e)
             return -1
 
-    def increment(self, key: str, amount: int = 1) -> Optional[int]:
-        """Incrementa un contador en el caché."""
+    async def increment(self, key: str, amount: int = 1, ttl: Optional[int] = None) -> Optional[int]:
+        """Incrementa un contador; `ttl` se aplica al crearlo (primer incremento)."""
         try:
-            if self._redis_available:
-                return self.redis_client.incr(key, amount)
-
-            # Fallback a memoria
-            return self._increment_in_memory(key, amount)
+            redis = await self._redis()
+            if redis is not None:
+                valor = int(await redis.incrby(self._k(key), amount))
+                if ttl and valor == amount:
+                    await redis.expire(self._k(key), ttl)
+                return valor
+
+            encontrado, actual = self._memory.get(key)
+            if not encontrado:
+                valor = amount
+                self._memory.set(key, _dumps(valor), ttl)
+                return valor
+            actual = _loads(actual)
+            if not isinstance(actual, (int, float)):
+                return 0
+            valor = int(actual + amount)
+            self._memory.keep_ttl_set(key, _dumps(valor))
+            return valor
 
         except Exception as e:
-            logger.error(f"Error incrementando {key}: {e}")
+            self._error("incrementando", key, e)
             return None
 
-    def decrement(self, key: str, amount: int = 1) -> Optional[int]:
+    async def decrement(self, key: str, amount: int = 1) -> Optional[int]:
         """Decrementa un contador en el caché."""
-        try:
-            if self._redis_available:
-                return self.redis_client.decr(key, amount)
-
-            # Fallback a memoria
-            return self._decrement_in_memory(key, amount)
-
-        except Exception as e:
-            logger.error(f"Error decrementando {key}: {e}")
-            return None
+        return await self.increment(key, -amount)
 
-    def get_many(self, keys: List[str]) -> Dict[str, Any]:
-        """Obtiene múltiples valores del caché."""
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Obtiene múltiples valores del caché (solo las claves presentes)."""
         resultados = {}
-
+        if not keys:
+            return resultados
         try:
-            if self._redis_available:
-                values = self.redis_client.mget(keys)
+            redis = await self._redis()
+            if redis is not None:
+                values = await redis.mget([self._k(k) for k in keys])
                 for key, value in zip(keys, values):
                     if value is not None:
-                        try:
-                            resultados[key] = pickle.loads(value)
-                        except Exception:
-                            resultados[key] = value.decode('utf-8')
-                return resultados
-
-            # Fallback a memoria
-            for key in keys:
-                resultados[key] = self.get(key)
+                        resultados[key] = _loads(value)
+            else:
+                for key in keys:
+                    encontrado, value = self._memory.get(key)
+                    if encontrado:
+                        resultados[key] = _loads(value)
+            self.hits += len(resultados)
+            self.misses += len(keys) - len(resultados)
             return resultados
 
         except Exception as e:
-            logger.error(f"Error obteniendo múltiples valores del caché: {e}")
-            return {key: None for key in keys}
+            self._error("obteniendo múltiples valores del", ",".join(keys[:3]), e)
+            return {}
 
-    def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+    async def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
         """Guarda múltiples valores en el caché."""
+        if not mapping:
+            return True
         try:
-            if self._redis_available:
-                # Serializar valores
-                serialized_mapping = {}
-                for key, value in mapping.items():
-                    serialized_mapping[key] = pickle.dumps(value)
-
-                if ttl:
-                    # Usar pipeline para TTL
-                    pipe = self.redis_client.pipeline()
-                    pipe.mset(serialized_mapping)
-                    for key in mapping.keys():
-                        pipe.expire(key, ttl)
-                    pipe.execute()
-                else:
-                    self.redis_client.mset(serialized_mapping)
+            redis = await self._redis()
+            if redis is not None:
+                async with redis.pipeline(transaction=False) as pipe:
+                    for key, value in mapping.items():
+                        pipe.set(self._k(key), _dumps(value), ex=ttl or None)
+                    await pipe.execute()
                 return True
 
-            # Fallback a memoria
             for key, value in mapping.items():
-                self._set_in_memory(key, value, ttl)
+                self._memory.set(key, _dumps(value), ttl)
             return True
 
         except Exception as e:
-            logger.error(f"Error guardando múltiples valores en caché: {e}")
+            self._error("guardando múltiples valores en", ",".join(list(mapping)[:3]), e)
             return False
 
-    # Métodos de caché en memoria (fallback)
-    def _get_from_memory(self, key: str, default: Any = None) -> Any:
-        """Obtiene valor del caché en memoria."""
-        if key in _memory_cache_ttl:
-            if datetime.utcnow() > _memory_cache_ttl[key]:
-                # Expirado
-                del _memory_cache[key]
-                del _memory_cache_ttl[key]
-                return default
-
-        return _memory_cache.get(key, default)
+    # ------------------------------------------------------------------
+    # Single-flight
+    # ------------------------------------------------------------------
+
+    async def get_or_set(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> Any:
+        """Devuelve la clave o la calcula con `factory()` una sola vez por proceso.
+
+        Las corrutinas que llegan mientras otra está calculando la misma clave
+        esperan su resultado en lugar de lanzar la factoría otra vez. Un valor
+        `None` no se cachea.
+        """
+        _ausente = object()
+        value = await self.get(key, _ausente)
+        if value is not _ausente:
+            return value
+
+        en_vuelo = self._inflight.get(key)
+        if en_vuelo is not None:
+            return await asyncio.shield(en_vuelo)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await factory()
+            if value is not None:
+                await self.set(key, value, ttl, tags)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            # Evitar el aviso "exception was never retrieved" si nadie esperaba.
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    # ------------------------------------------------------------------
+    # Invalidación por namespace / etiqueta
+    # ------------------------------------------------------------------
+
+    async def _borrar_por_patron(self, redis, patron: str) -> int:
+        borradas = 0
+        lote: List[Any] = []
+        async for k in redis.scan_iter(match=patron, count=500):
+            lote.append(k)
+            if len(lote) >= 500:
+                borradas += int(await redis.unlink(*lote))
+                lote = []
+        if lote:
+            borradas += int(await redis.unlink(*lote))
+        return borradas
+
+    async def invalidate_namespace(self, namespace: str) -> int:
+        """Borra todas las claves `namespace:*`. Devuelve cuántas se borraron."""
+        prefijo = f"{namespace}:"
+        try:
+            redis = await self._redis()
+            if redis is not None:
+                return await self._borrar_por_patron(redis, self._k(prefijo) + "*")
+            return self._memory.invalidate_prefix(prefijo)
 
-    def _set_in_memory(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
-        """Guarda valor en caché en memoria."""
-        _memory_cache[key] = value
+        except Exception as e:
+            self._error("invalidando namespace del", namespace, e)
+            return 0
 
-        if ttl:
-            _memory_cache_ttl[key] = datetime.utcnow() + timedelta(seconds=ttl)
-        elif key in _memory_cache_ttl:
-            del _memory_cache_ttl[key]
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Borra todas las claves asociadas a alguna de las etiquetas."""
+        try:
+            redis = await self._redis()
+            if redis is not None:
+                borradas = 0
+                for t in tags:
+                    claves = await redis.smembers(_TAG_PREFIX + t)
+                    if claves:
+                        borradas += int(await redis.unlink(*claves))
+                    await redis.delete(_TAG_PREFIX + t)
+                return borradas
+            return self._memory.invalidate_tags(tags)
 
-        return True
+        except Exception as e:
+            self._error("invalidando etiquetas del", ",".join(tags), e)
+            return 0
 
-    def _delete_from_memory(self, key: str) -> bool:
-        """Elimina valor del caché en memoria."""
-        if key in _memory_cache:
-            del _memory_cache[key]
-            if key in _memory_cache_ttl:
-                del _memory_cache_ttl[key]
+    async def flush_all(self) -> bool:
+        """Limpia las claves de caché de la aplicación (no toda la BD de Redis)."""
+        try:
+            redis = await self._redis()
+            if redis is not None:
+                await self._borrar_por_patron(redis, KEY_PREFIX + "*")
+                await self._borrar_por_patron(redis, _TAG_PREFIX + "*")
+                return True
+            self._memory.clear()
             return True
-        return False
-
-    def _exists_in_memory(self, key: str) -> bool:
-        """Verifica existencia en caché en memoria."""
-        return key in _memory_cache
-
-    def _flush_memory(self) -> bool:
-        """Limpia caché en memoria."""
-        _memory_cache.clear()
-        _memory_cache_ttl.clear()
-        return True
-
-    def _get_ttl_from_memory(self, key: str) -> int:
-        """Obtiene TTL de caché en memoria."""
-        if key not in _memory_cache_ttl:
-            return -1
-
-        tiempo_restante = (_memory_cache_ttl[key] - datetime.utcnow()).total_seconds()
-        return max(0, int(tiempo_restante))
 
-    def _increment_in_memory(self, key: str, amount: int = 1) -> int:
-        """Incrementa contador en caché en memoria."""
-        if key not in _memory_cache:
-            _memory_cache[key] = 0
-
-        if isinstance(_memory_cache[key], (int, float)):
-            _memory_cache[key] += amount
-            return int(_memory_cache[key])
+        except Exception as e:
+            self._error("limpiando", "*", e)
+            return False
 
-        return 0
+    # ------------------------------------------------------------------
+    # Métricas
+    # ------------------------------------------------------------------
 
-    def _decrement_in_memory(self, key: str, amount: int = 1) -> int:
-        """Decrementa contador en caché en memoria."""
-        return self._increment_in_memory(key, -amount)
+    def stats(self) -> Dict[str, Any]:
+        """Contadores acumulados del proceso."""
+        total = self.hits + self.misses
+        return {
+            "backend": "redis" if self._redis_available else "memoria",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "evictions": self._memory.evictions,
+            "errores": self.errors,
+            "entradas_memoria": len(self._memory),
+        }
 
 
 # Funciones helper para generar keys de caché
 def generar_cache_key(prefix: str, *args) -> str:
-    """Genera una clave de caché única a partir de parámetros."""
+    """Genera una clave de caché única a partir de parámetros.
+
+    `prefix` actúa como namespace (ver `CacheService.invalidate_namespace`).
+    """
     parts = [prefix]
     for arg in args:
         if isinstance(arg, (dict, list)):
@@ -302,8 +555,10 @@ def get_cache_service(redis_url: Optional[str] = None) -> CacheService:
     """Factory para obtener el servicio de caché (singleton)."""
     global _cache_service
     if _cache_service is None:
-        # Intentar obtener URL de Redis de variables de entorno
-        if not redis_url:
-            redis_url = os.getenv('REDIS_URL')
-        _cache_service = CacheService(redis_url)
+        from ...core.config import get_settings
+        settings = get_settings()
+        _cache_service = CacheService(
+            redis_url or settings.redis_url or None,
+            max_entries=settings.cache_memory_max_entries,
+        )
     return _cache_service
@@ -1,35 +1,55 @@
-"""Servicio de encriptación para datos sensibles usando Fernet (cryptography)."""
+"""Servicio de encriptación para datos sensibles usando Fernet (cryptography).
+
+Admite varias claves (MultiFernet): `ENCRYPTION_KEY` puede ser una lista
+separada por comas; la primera cifra y todas descifran. Para rotar se pone la
+clave nueva delante, se despliega y se recifran los datos existentes con
+`python -m app.scripts.rotar_clave_cifrado`; al terminar se pueden retirar
+las claves antiguas. Sin `BLIND_INDEX_KEY`, los índices ciegos se derivan de
+la clave más antigua (app/core/indice_ciego.py): al retirarla, el bootstrap
+los recalcula todos en el siguiente arranque.
+"""
 
 import os
 import base64
 import json
 import re
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, MultiFernet
 
 from app.core.secrets import read_secret_env
 
 logger = logging.getLogger(__name__)
 
 
+def claves_configuradas() -> List[str]:
+    """Claves de `ENCRYPTION_KEY` (o `FERNET_KEY`), la principal primero."""
+    valor = read_secret_env('ENCRYPTION_KEY') or read_secret_env('FERNET_KEY')
+    return [k.strip() for k in valor.split(',') if k.strip()]
+
+
 class EncriptacionService:
     """Servicio para encriptar y desencriptar datos sensibles."""
 
     def __init__(self):
         self._fernet = None
+        self.claves: List[str] = []
         self._initialize_cipher()
 
     def _initialize_cipher(self) -> None:
-        """Inicializa el cipher con la clave del entorno."""
-        key = read_secret_env('ENCRYPTION_KEY') or read_secret_env('FERNET_KEY')
-        if not key:
+        """Inicializa el cipher con las claves del entorno."""
+        claves = claves_configuradas()
+        if not claves:
             # Generar clave temporal para desarrollo
             logger.warning("No se encontró ENCRYPTION_KEY, generando clave temporal")
-            key = Fernet.generate_key().decode()
+            claves = [Fernet.generate_key().decode()]
 
-        self._fernet = Fernet(key.encode() if isinstance(key, str) else key)
+        self._usar_claves(claves)
+
+    def _usar_claves(self, claves: List[str]) -> None:
+        self.claves = list(claves)
+        self._fernet = MultiFernet([Fernet(k.encode()) for k in self.claves])
 
     def encriptar_texto(self, texto: str) -> str:
         """Encripta un texto plano."""
@@ -92,7 +112,8 @@ class EncriptacionService:
         iban = self.desencriptar_texto(iban_encriptado)
         return self._formatear_iban(iban)
 
-    def _limpiar_iban(self, iban: str) -> str:
+    @staticmethod
+    def _limpiar_iban(iban: str) -> str:
         """Limpia y valida formato IBAN."""
         if not iban:
             return ""
@@ -125,7 +146,8 @@ class EncriptacionService:
         """Desencripta un DNI/NIE."""
         return self.desencriptar_texto(dni_encriptado)
 
-    def _limpiar_dni(self, dni: str) -> str:
+    @staticmethod
+    def _limpiar_dni(dni: str) -> str:
         """Limpia y valida formato DNI/NIE."""
         if not dni:
             return ""
@@ -144,9 +166,13 @@ class EncriptacionService:
         return Fernet.generate_key().decode('utf-8')
 
     def rotar_clave(self, nueva_clave: str) -> None:
-        """Rota la clave de encriptación."""
+        """Pone `nueva_clave` como principal; las anteriores siguen descifrando.
+
+        Solo afecta a este proceso: los datos ya guardados siguen cifrados con
+        la clave anterior hasta que se recifran (app/scripts/rotar_clave_cifrado.py).
+        """
         try:
-            self._fernet = Fernet(nueva_clave.encode())
+            self._usar_claves([nueva_clave] + [k for k in self.claves if k != nueva_clave])
             logger.info("Clave de encriptación rotada exitosamente")
         except Exception as e:
             logger.error(f"Error rotando clave: {e}")
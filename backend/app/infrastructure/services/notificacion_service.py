@@ -1,10 +1,14 @@
 """Servicio de gestión de notificaciones.
 
 Responsabilidades:
-  - Crear notificaciones in-app (fila `Notificacion`) de forma individual o en lote.
+  - Crear notificaciones in-app (fila `Notificacion`) de forma individual o en lote
+    (fan-out: INSERT multi-fila por bloques, tipo y estado resueltos una vez).
   - Resolver el `estado_id` por código (PENDIENTE/ENVIADA/LEIDA/ERROR), con cache.
   - Enviar por email cuando procede, según la PRIORIDAD del tipo de notificación.
-  - Gestionar lectura, archivado, recuento de no leídas y preferencias.
+  - Gestionar lectura, archivado, recuento de no leídas y preferencias. El
+    recuento es la fila de `ContadorNotificaciones` que mantiene un trigger; el
+    mismo trigger avisa por `pg_notify` y el push (app/core/push_notificaciones.py)
+    lleva el nuevo valor a los badges abiertos.
   - Punto de entrada de alto nivel para flujos de trabajo: `emitir(...)`, que
     resuelve la audiencia (rol/cargo/usuario) con DestinatarioResolver, crea las
     notificaciones in-app y dispara los emails que correspondan.
@@ -26,24 +30,29 @@ import logging
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any, Iterable
 
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import Uuid, any_, bindparam, select, and_, or_, insert
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...modules.core.comunicacion import (
     TipoNotificacion,
     Notificacion,
     PreferenciaNotificacion,
+    ContadorNotificaciones,
 )
 from ...modules.configuracion.models.estados import EstadoNotificacion
 from ...modules.acceso.models.usuario import Usuario
-from ...core.email_service import EmailService, _load_smtp_config
-from .cache_service import get_cache_service, generar_cache_key
+from ...core.email_service import EmailService, MensajeEmail, _load_smtp_config
 
 logger = logging.getLogger(__name__)
 
 # Prioridades del tipo que proponen envío por email.
 _PRIORIDADES_EMAIL = frozenset({"ALTA", "URGENTE"})
 
+# Filas por sentencia del INSERT multi-fila (~16 columnas: muy por debajo del
+# límite de 32767 parámetros de PostgreSQL).
+_TAMANO_BLOQUE_INSERT = 1000
+
 
 class ResultadoEmision:
     """Resultado agregado de una emisión de aviso a una audiencia."""
@@ -74,7 +83,6 @@ class NotificacionService:
 
     def __init__(self, session: AsyncSession):
         self.session = session
-        self.cache = get_cache_service()
         # Cache local (por instancia/request) del mapeo código → estado_id.
         self._estado_ids: Dict[str, uuid.UUID] = {}
 
@@ -150,10 +158,55 @@ class NotificacionService:
             await self.session.commit()
             await self.session.refresh(notificacion)
 
-        self._invalidar_cache_no_leidas(usuario_id)
         logger.info("Notificación creada: %s para usuario %s", notificacion.id, usuario_id)
         return notificacion
 
+    async def crear_notificaciones_masivas(
+        self,
+        tipo: TipoNotificacion,
+        usuario_ids: Iterable[uuid.UUID],
+        titulo: str,
+        mensaje: str,
+        canal: str = "INAPP",
+        datos_adicionales: Optional[Dict[str, Any]] = None,
+        entidad_tipo: Optional[str] = None,
+        entidad_id: Optional[str] = None,
+        url_accion: Optional[str] = None,
+        fecha_expiracion: Optional[datetime] = None,
+    ) -> int:
+        """Crea la misma notificación in-app para muchos usuarios (fan-out).
+
+        Tipo y estado se resuelven una vez y las filas se insertan con INSERT
+        multi-fila por bloques de `_TAMANO_BLOQUE_INSERT`, sin pasar por la
+        unidad de trabajo del ORM. No hace commit. Devuelve nº de filas.
+        """
+        canal = self._canal_permitido(tipo, canal)
+        comunes = dict(
+            tipo_id=tipo.id,
+            titulo=titulo,
+            mensaje=mensaje,
+            canal=canal,
+            datos_adicionales=datos_adicionales,
+            entidad_tipo=entidad_tipo,
+            entidad_id=entidad_id,
+            url_accion=url_accion,
+            fecha_expiracion=fecha_expiracion,
+            requiere_accion=tipo.requiere_accion,
+            estado_id=await self._estado_id("PENDIENTE"),
+            leida=False,
+            archivada=False,
+            accion_completada=False,
+            intentos_envio=0,
+            eliminado=False,
+        )
+        filas = [dict(comunes, id=uuid.uuid4(), usuario_id=u) for u in usuario_ids]
+        for i in range(0, len(filas), _TAMANO_BLOQUE_INSERT):
+            await self.session.execute(
+                insert(Notificacion).values(filas[i:i + _TAMANO_BLOQUE_INSERT])
+            )
+        logger.info("Fan-out de notificación '%s': %d filas", titulo, len(filas))
+        return len(filas)
+
     # ------------------------------------------------------------------
     # Punto de entrada de alto nivel para flujos de trabajo
     # ------------------------------------------------------------------
@@ -202,23 +255,18 @@ class NotificacionService:
         )
 
         # 1) Crear todas las notificaciones in-app en lote (un solo commit)
-        for d in destinatarios:
-            await self.crear_notificacion(
-                tipo_codigo=tipo_codigo,
-                usuario_id=d.usuario_id,
-                titulo=titulo,
-                mensaje=mensaje,
-                canal="INAPP",
-                datos_adicionales=datos_adicionales,
-                entidad_tipo=entidad_tipo,
-                entidad_id=entidad_id,
-                url_accion=url_accion,
-                commit=False,
-            )
-            resultado.inapp_creadas += 1
+        usuario_ids = [d.usuario_id for d in destinatarios]
+        resultado.inapp_creadas = await self.crear_notificaciones_masivas(
+            tipo,
+            usuario_ids,
+            titulo=titulo,
+            mensaje=mensaje,
+            datos_adicionales=datos_adicionales,
+            entidad_tipo=entidad_tipo,
+            entidad_id=entidad_id,
+            url_accion=url_accion,
+        )
         await self.session.commit()
-        for d in destinatarios:
-            self._invalidar_cache_no_leidas(d.usuario_id)
 
         # 2) Email, si la prioridad del tipo lo propone
         if not quiere_email:
@@ -229,27 +277,29 @@ class NotificacionService:
             return resultado
 
         smtp = await _load_smtp_config(self.session)
-        email_svc = EmailService(self.session)
         asunto = titulo
         cuerpo = cuerpo_html_email or self._cuerpo_email_discreto(titulo, url_accion)
 
+        vetados = await self._emails_vetados(usuario_ids, tipo.id)
+        mensajes: List[MensajeEmail] = []
         for d in destinatarios:
-            if not await self._email_permitido_para(d.usuario_id, tipo.id):
+            if d.usuario_id in vetados:
                 resultado.sin_email += 1
                 continue
             if not smtp.configured:
                 resultado.email_simulados += 1
                 continue
-            try:
-                await email_svc.enviar(
-                    destinatario=d.email,
-                    asunto=asunto,
-                    cuerpo_html=cuerpo.replace("{{ nombre_miembro }}", d.nombre),
-                )
-                resultado.email_enviados += 1
-            except Exception as exc:  # noqa: BLE001
-                logger.error("Fallo al enviar email a %s: %s", d.email, exc)
-                resultado.email_fallidos += 1
+            mensajes.append(MensajeEmail(
+                destinatario=d.email,
+                asunto=asunto,
+                cuerpo_html=cuerpo.replace("{{ nombre_miembro }}", d.nombre),
+            ))
+
+        # Un único lote: conexiones SMTP reutilizadas y envíos concurrentes.
+        if mensajes:
+            resultados = await EmailService(self.session, smtp).enviar_lote(mensajes)
+            resultado.email_enviados = sum(1 for r in resultados if r.ok)
+            resultado.email_fallidos = len(resultados) - resultado.email_enviados
 
         if not smtp.configured:
             resultado.mensaje = (
@@ -276,8 +326,12 @@ class NotificacionService:
         solo_no_archivadas: bool = True,
         limite: int = 50,
         offset: int = 0,
+        opciones: Iterable = (),
     ) -> List[Notificacion]:
-        """Obtiene las notificaciones de un usuario (más recientes primero)."""
+        """Obtiene las notificaciones de un usuario (más recientes primero).
+
+        `opciones` son opciones de carga para las relaciones que se vayan a leer.
+        """
         filtros = [
             Notificacion.usuario_id == usuario_id,
             Notificacion.eliminado == False,  # noqa: E712
@@ -293,29 +347,20 @@ class NotificacionService:
             .order_by(Notificacion.fecha_creacion.desc())
             .limit(limite)
             .offset(offset)
+            .options(*opciones)
         )
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
     async def contar_no_leidas(self, usuario_id: uuid.UUID) -> int:
-        """Cuenta notificaciones no leídas y no archivadas (cacheado 5 min)."""
-        cache_key = generar_cache_key("notificaciones_no_leidas", str(usuario_id))
-        count = self.cache.get(cache_key)
-        if count is not None:
-            return count
-
-        stmt = select(func.count(Notificacion.id)).where(
-            and_(
-                Notificacion.usuario_id == usuario_id,
-                Notificacion.leida == False,       # noqa: E712
-                Notificacion.archivada == False,   # noqa: E712
-                Notificacion.eliminado == False,   # noqa: E712
+        """Notificaciones no leídas y no archivadas: lectura por clave primaria del
+        contador que mantiene el trigger (siempre al día, sin COUNT ni caché)."""
+        count = await self.session.scalar(
+            select(ContadorNotificaciones.no_leidas).where(
+                ContadorNotificaciones.usuario_id == usuario_id
             )
         )
-        result = await self.session.execute(stmt)
-        count = result.scalar() or 0
-        self.cache.set(cache_key, count, ttl=300)
-        return count
+        return count or 0
 
     # ------------------------------------------------------------------
     # Mutaciones de estado de lectura/archivado
@@ -328,7 +373,6 @@ class NotificacionService:
         notificacion.marcar_como_leida()
         notificacion.estado_id = await self._estado_id("LEIDA")
         await self.session.commit()
-        self._invalidar_cache_no_leidas(usuario_id)
         return True
 
     async def marcar_todas_como_leidas(self, usuario_id: uuid.UUID) -> int:
@@ -348,7 +392,6 @@ class NotificacionService:
             n.estado_id = estado_leida
             count += 1
         await self.session.commit()
-        self._invalidar_cache_no_leidas(usuario_id)
         return count
 
     async def archivar_notificacion(self, notificacion_id: uuid.UUID, usuario_id: uuid.UUID) -> bool:
@@ -357,7 +400,6 @@ class NotificacionService:
             return False
         notificacion.archivar()
         await self.session.commit()
-        self._invalidar_cache_no_leidas(usuario_id)
         return True
 
     async def limpiar_notificaciones_antiguas(self, dias: int = 90) -> int:
@@ -486,6 +528,30 @@ class NotificacionService:
         pref = result.scalar_one_or_none()
         return True if pref is None else bool(pref)
 
+    async def _emails_vetados(
+        self, usuario_ids: Iterable[uuid.UUID], tipo_id: uuid.UUID
+    ) -> set:
+        """Usuarios de la audiencia que han desactivado el email de este tipo.
+
+        Una sola consulta para toda la audiencia; mismo criterio que
+        `_email_permitido_para` (sin preferencia registrada = permitido).
+        """
+        ids = list(usuario_ids)
+        if not ids:
+            return set()
+        result = await self.session.execute(
+            select(PreferenciaNotificacion.usuario_id).where(
+                # Un solo parámetro array: admite audiencias de decenas de miles.
+                PreferenciaNotificacion.usuario_id == any_(
+                    bindparam("usuario_ids", ids, type_=ARRAY(Uuid))
+                ),
+                PreferenciaNotificacion.tipo_id == tipo_id,
+                PreferenciaNotificacion.email_habilitado == False,  # noqa: E712
+                PreferenciaNotificacion.eliminado == False,  # noqa: E712
+            )
+        )
+        return set(result.scalars().all())
+
     @staticmethod
     def _cuerpo_email_discreto(titulo: str, url_accion: Optional[str]) -> str:
         """Cuerpo de email SIN datos personales: solo el título y un enlace.
@@ -521,6 +587,3 @@ class NotificacionService:
             logger.warning("Canal %s no permitido para tipo %s; se usa INAPP", canal, tipo.codigo)
             return "INAPP"
         return canal
-
-    def _invalidar_cache_no_leidas(self, usuario_id: uuid.UUID) -> None:
-        self.cache.delete(generar_cache_key("notificaciones_no_leidas", str(usuario_id)))
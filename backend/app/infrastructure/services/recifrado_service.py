@@ -0,0 +1,323 @@
+"""Recifrado masivo de DNI/NIF e IBAN: rotación de clave Fernet por lotes.
+
+`EncriptacionService` usa MultiFernet: tras poner una clave nueva delante en
+`ENCRYPTION_KEY`, los datos ya guardados siguen descifrándose con la antigua
+pero no se recifran solos. Este servicio los recorre y los reescribe con la
+clave principal:
+
+- Lectura por lotes con paginación por clave (`id > último`), sin OFFSET.
+- El cifrado (CPU puro) se reparte en un pool de procesos; a los procesos
+  solo viajan tuplas (id, valor, índice).
+- Escritura con un UPDATE por lote (`FROM unnest(...)`) que solo toca la fila
+  si el valor sigue siendo el leído: un cambio concurrente desde la app no se
+  pisa. Cada lote es su propia transacción, así que los bloqueos de fila
+  duran lo que tarda un lote, nunca la tabla entera.
+- Punto de control en `configuraciones` (`sistema.rotacion_cifrado.<campo>`),
+  guardado en la misma transacción que el lote: si el proceso se interrumpe,
+  se reanuda tras el último lote confirmado. Está ligado a la huella de la
+  clave principal; con otra clave se empieza de cero.
+- En cada fila se recalcula también el índice ciego (app/core/indice_ciego.py).
+  No depende de la clave principal, pero sí de la más antigua si no hay
+  `BLIND_INDEX_KEY`: así una pasada deja los índices al día con la clave actual.
+
+Las filas que ya están con la clave principal y con el índice al día no se
+escriben, así que relanzar el proceso es barato. Los valores aún en claro
+(importación) solo se reindexan; con `cifrar_en_claro` se cifran además en la
+misma pasada.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import multiprocessing
+import time
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.indice_ciego import es_cifrado, indice_documento, indice_iban
+from app.infrastructure.services.encriptacion_service import EncriptacionService
+
+logger = logging.getLogger(__name__)
+
+_TAMANO_LOTE = 2000
+PREFIJO_PUNTO_CONTROL = "sistema.rotacion_cifrado."
+
+
+@dataclass(frozen=True)
+class CampoCifrado:
+    """Columna cifrada de una tabla y su índice ciego."""
+    tabla: str
+    columna: str
+    columna_indice: str
+    tipo: str  # documento | iban
+
+    @property
+    def nombre(self) -> str:
+        return f"{self.tabla}.{self.columna}"
+
+
+CAMPOS = {
+    c.nombre: c
+    for c in (
+        CampoCifrado("contactos", "numero_documento", "numero_documento_indice", "documento"),
+        CampoCifrado("socios", "iban", "iban_indice", "iban"),
+        CampoCifrado("cuentas_bancarias", "iban", "iban_indice", "iban"),
+    )
+}
+
+
+@dataclass
+class EstadoRecifrado:
+    """Progreso de un campo; es también lo que se guarda como punto de control."""
+    huella: str
+    ultimo_id: Optional[str] = None
+    leidas: int = 0
+    recifradas: int = 0
+    errores: int = 0
+    completo: bool = False
+    # Para el ritmo: filas leídas en esta ejecución (sin las de una reanudada).
+    leidas_al_inicio: int = field(default=0, repr=False)
+    inicio: float = field(default_factory=time.monotonic, repr=False)
+
+    def a_json(self) -> str:
+        return json.dumps({
+            "huella": self.huella, "ultimo_id": self.ultimo_id, "leidas": self.leidas,
+            "recifradas": self.recifradas, "errores": self.errores, "completo": self.completo,
+        })
+
+    @property
+    def filas_por_segundo(self) -> float:
+        return (self.leidas - self.leidas_al_inicio) / max(time.monotonic() - self.inicio, 1e-6)
+
+
+def huella_clave(clave: str) -> str:
+    """Identifica la clave principal en el punto de control sin guardarla."""
+    return hashlib.sha256(clave.encode()).hexdigest()[:16]
+
+
+# ----------------------------------------------------------------------
+# Trabajo de cada proceso del pool (nivel de módulo: se envía por pickle)
+# ----------------------------------------------------------------------
+
+_principal: Optional[Fernet] = None
+_todas: Optional[MultiFernet] = None
+
+
+def iniciar_proceso(claves: Sequence[str]) -> None:
+    """Inicializador del pool: prepara los cifradores una vez por proceso."""
+    global _principal, _todas
+    fernets = [Fernet(k.encode()) for k in claves]
+    _principal = fernets[0]
+    _todas = MultiFernet(fernets)
+
+
+_LIMPIAR = {"documento": EncriptacionService._limpiar_dni, "iban": EncriptacionService._limpiar_iban}
+_INDICE = {"documento": indice_documento, "iban": indice_iban}
+
+
+def recifrar_lote(
+    tipo: str, filas: List[Tuple[uuid.UUID, str, Optional[str]]], cifrar_en_claro: bool,
+) -> Tuple[List[Tuple[uuid.UUID, str, str, Optional[str]]], int]:
+    """Recifra `(id, valor, índice)` con la clave principal.
+
+    Devuelve los cambios `(id, valor_leído, valor_nuevo, índice_nuevo)` y el
+    número de errores (token de clave desconocida o valor en claro inválido).
+    Sin `cifrar_en_claro`, los valores en claro se dejan igual y solo se
+    corrige su índice.
+    """
+    cambios = []
+    errores = 0
+    for id_, valor, indice_actual in filas:
+        if es_cifrado(valor):
+            token = base64.urlsafe_b64decode(valor.encode())
+            try:
+                claro = _principal.decrypt(token)
+                al_dia = True
+            except InvalidToken:
+                try:
+                    claro = _todas.decrypt(token)
+                except InvalidToken:
+                    errores += 1
+                    continue
+                al_dia = False
+            claro = claro.decode()
+        elif cifrar_en_claro:
+            try:
+                claro = _LIMPIAR[tipo](valor)
+            except ValueError:
+                errores += 1
+                continue
+            al_dia = False
+        else:
+            claro, al_dia = valor, True
+
+        indice = _INDICE[tipo](claro)
+        if al_dia:
+            if indice != indice_actual:
+                cambios.append((id_, valor, valor, indice))
+            continue
+        nuevo = base64.urlsafe_b64encode(_principal.encrypt(claro.encode())).decode()
+        cambios.append((id_, valor, nuevo, indice))
+    return cambios, errores
+
+
+def crear_pool(procesos: int, claves: Sequence[str]) -> Optional[Executor]:
+    """Pool de procesos con los cifradores listos; None con 0 procesos (en línea)."""
+    if procesos <= 0:
+        iniciar_proceso(claves)
+        return None
+    return ProcessPoolExecutor(
+        max_workers=procesos,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=iniciar_proceso,
+        initargs=(list(claves),),
+    )
+
+
+# ----------------------------------------------------------------------
+# Bucle por lotes
+# ----------------------------------------------------------------------
+
+async def _leer_punto_control(session, campo: CampoCifrado) -> Optional[dict]:
+    from app.modules.configuracion.models.configuracion import Configuracion
+    valor = await session.scalar(
+        select(Configuracion.valor).where(Configuracion.clave == PREFIJO_PUNTO_CONTROL + campo.nombre)
+    )
+    return json.loads(valor) if valor else None
+
+
+async def _guardar_punto_control(session, campo: CampoCifrado, estado: EstadoRecifrado) -> None:
+    from app.modules.configuracion.models.configuracion import Configuracion
+    valor = estado.a_json()
+    await session.execute(
+        pg_insert(Configuracion)
+        .values(
+            id=uuid.uuid4(),
+            clave=PREFIJO_PUNTO_CONTROL + campo.nombre,
+            valor=valor,
+            tipo_dato="json",
+            descripcion="Punto de control del recifrado de claves (uso interno)",
+            modificable=False,
+            grupo="sistema",
+            orden=0,
+        )
+        .on_conflict_do_update(
+            index_elements=[Configuracion.clave],
+            set_={"valor": valor, "fecha_modificacion": func.now()},
+        )
+    )
+
+
+async def _leer_lote(session, campo: CampoCifrado, desde: Optional[str], limite: int):
+    filtro_desde = "AND id > CAST(:desde AS uuid)" if desde else ""
+    return (await session.execute(
+        text(
+            f"SELECT id, {campo.columna}, {campo.columna_indice} FROM {campo.tabla} "
+            f"WHERE {campo.columna} IS NOT NULL AND {campo.columna} <> '' {filtro_desde} "
+            f"ORDER BY id LIMIT :limite"
+        ),
+        {"desde": desde, "limite": limite},
+    )).all()
+
+
+async def _escribir_lote(session, campo: CampoCifrado, cambios) -> int:
+    if not cambios:
+        return 0
+    ids, anteriores, nuevos, indices = (list(c) for c in zip(*cambios))
+    resultado = await session.execute(
+        text(
+            f"UPDATE {campo.tabla} AS t "
+            f"SET {campo.columna} = v.nuevo, {campo.columna_indice} = v.indice "
+            f"FROM unnest(CAST(:ids AS uuid[]), CAST(:anteriores AS text[]), "
+            f"CAST(:nuevos AS text[]), CAST(:indices AS text[])) AS v(id, anterior, nuevo, indice) "
+            f"WHERE t.id = v.id AND t.{campo.columna} = v.anterior"
+        ),
+        {"ids": ids, "anteriores": anteriores, "nuevos": nuevos, "indices": indices},
+    )
+    return resultado.rowcount
+
+
+async def contar_pendientes(session, campo: CampoCifrado, desde: Optional[str]) -> int:
+    filtro_desde = "AND id > CAST(:desde AS uuid)" if desde else ""
+    return await session.scalar(
+        text(
+            f"SELECT COUNT(*) FROM {campo.tabla} "
+            f"WHERE {campo.columna} IS NOT NULL AND {campo.columna} <> '' {filtro_desde}"
+        ),
+        {"desde": desde},
+    )
+
+
+async def recifrar_campo(
+    session,
+    campo: CampoCifrado,
+    claves: Sequence[str],
+    *,
+    pool: Optional[Executor] = None,
+    procesos: int = 1,
+    lote: int = _TAMANO_LOTE,
+    cifrar_en_claro: bool = False,
+    confirmar: bool = True,
+    reiniciar: bool = False,
+    informe: Optional[Callable[[EstadoRecifrado], None]] = None,
+) -> EstadoRecifrado:
+    """Recifra `campo` con la clave principal de `claves`.
+
+    Con `confirmar`, cada lote se confirma junto con su punto de control y el
+    trabajo se reanuda donde quedó; sin él (importación dentro de una
+    transacción mayor) no se confirma ni se guarda punto de control.
+    """
+    estado = EstadoRecifrado(huella=huella_clave(claves[0]))
+    if confirmar and not reiniciar:
+        previo = await _leer_punto_control(session, campo)
+        if previo and previo.get("huella") == estado.huella:
+            if previo.get("completo"):
+                estado.completo = True
+                return estado
+            estado.ultimo_id = previo.get("ultimo_id")
+            estado.leidas = estado.leidas_al_inicio = previo.get("leidas", 0)
+            estado.recifradas = previo.get("recifradas", 0)
+            estado.errores = previo.get("errores", 0)
+
+    trozos = max(procesos, 1)
+    loop = asyncio.get_running_loop()
+    while True:
+        filas = await _leer_lote(session, campo, estado.ultimo_id, lote * trozos)
+        if not filas:
+            break
+        planas = [(f[0], f[1], f[2]) for f in filas]
+        partes = [planas[i::trozos] for i in range(trozos) if planas[i::trozos]]
+        if pool is None:
+            resultados = [recifrar_lote(campo.tipo, p, cifrar_en_claro) for p in partes]
+        else:
+            resultados = await asyncio.gather(*(
+                loop.run_in_executor(pool, recifrar_lote, campo.tipo, p, cifrar_en_claro)
+                for p in partes
+            ))
+
+        estado.recifradas += await _escribir_lote(
+            session, campo, [c for cambios, _ in resultados for c in cambios]
+        )
+        estado.errores += sum(errores for _, errores in resultados)
+        estado.leidas += len(filas)
+        estado.ultimo_id = str(filas[-1][0])
+        if confirmar:
+            await _guardar_punto_control(session, campo, estado)
+            await session.commit()
+        if informe:
+            informe(estado)
+
+    estado.completo = True
+    if confirmar:
+        await _guardar_punto_control(session, campo, estado)
+        await session.commit()
+    return estado
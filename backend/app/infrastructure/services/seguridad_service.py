@@ -37,8 +37,7 @@ class SeguridadService:
 
             if exitoso:
                 # Limpiar intentos fallidos si el login fue exitoso
-                self.cache.delete(key_intentos)
-                self.cache.delete(key_ip)
+                await self.cache.delete_many([key_intentos, key_ip])
 
                 # Actualizar último acceso del usuario
                 if usuario_id:
@@ -63,21 +62,16 @@ class SeguridadService:
 
             else:
                 # Incrementar contadores de intentos fallidos
-                intentos_identificador = self.cache.increment(key_intentos)
-                intentos_ip = self.cache.increment(key_ip)
-
-                # Establecer TTL en los contadores
-                if intentos_identificador == 1:
-                    self.cache.set(key_intentos, 1, 3600)  # 1 hora
-                if intentos_ip == 1:
-                    self.cache.set(key_ip, 1, 3600)  # 1 hora
+                # (TTL de 1 hora, fijado al crear cada contador)
+                intentos_identificador = await self.cache.increment(key_intentos, ttl=3600)
+                intentos_ip = await self.cache.increment(key_ip, ttl=3600)
 
                 # Verificar si se excedió el límite
                 bloqueado = intentos_identificador >= max_intentos
 
                 if bloqueado:
                     # Bloquear la IP también
-                    self._bloquear_ip(ip_address, tiempo_bloqueo)
+                    await self._bloquear_ip(ip_address, tiempo_bloqueo)
 
                     # Si hay usuario, bloquearlo en la BD
                     if usuario_id:
@@ -117,8 +111,8 @@ class SeguridadService:
             key_ip_bloqueada = generar_cache_key("ip_bloqueada", ip_address)
 
             # Verificar bloqueo de IP
-            if self.cache.exists(key_ip_bloqueada):
-                ttl = self.cache.get_ttl(key_ip_bloqueada)
+            if await self.cache.exists(key_ip_bloqueada):
+                ttl = await self.cache.get_ttl(key_ip_bloqueada)
                 return {
                     'bloqueado': True,
                     'razon': 'IP_BLOQUEADA',
@@ -127,7 +121,7 @@ class SeguridadService:
                 }
 
             # Verificar bloqueo de usuario
-            intentos = self.cache.get(key_intentos, 0)
+            intentos = await self.cache.get(key_intentos, 0)
             max_intentos = await self.config.get_int('MAX_INTENTOS_LOGIN', 5)
 
             if intentos >= max_intentos:
@@ -151,17 +145,17 @@ class SeguridadService:
                 'error': str(e)
             }
 
-    def _bloquear_ip(self, ip_address: str, minutos: int):
+    async def _bloquear_ip(self, ip_address: str, minutos: int):
         """Bloquea una IP temporalmente."""
         key = generar_cache_key("ip_bloqueada", ip_address)
-        self.cache.set(key, True, minutos * 60)
+        await self.cache.set(key, True, minutos * 60)
         logger.warning(f"IP bloqueada: {ip_address} por {minutos} minutos")
 
     async def registrar_cambio_contrasena(self, usuario_id: str, ip_address: str) -> bool:
         """Registra un cambio de contraseña exitoso."""
         try:
             key = generar_cache_key("cambio_contrasena", usuario_id)
-            self.cache.set(key, {
+            await self.cache.set(key, {
                 'fecha': datetime.utcnow().isoformat(),
                 'ip': ip_address
             }, 86400)  # 24 horas
@@ -177,7 +171,7 @@ class SeguridadService:
         """Verifica si se cambió la contraseña recientemente."""
         try:
             key = generar_cache_key("cambio_contrasena", usuario_id)
-            cambio = self.cache.get(key)
+            cambio = await self.cache.get(key)
 
             if cambio:
                 fecha_cambio = datetime.fromisoformat(cambio['fecha'])
@@ -329,7 +323,7 @@ class SeguridadService:
             }
 
             # TTL de 24 horas
-            self.cache.set(key, datos_sesion, 86400)
+            await self.cache.set(key, datos_sesion, 86400)
 
             return True
 
@@ -337,15 +331,15 @@ class SeguridadService:
             logger.error(f"Error registrando información de sesión: {e}")
             return False
 
-    def actualizar_actividad_sesion(self, session_id: str) -> bool:
+    async def actualizar_actividad_sesion(self, session_id: str) -> bool:
         """Actualiza la última actividad de una sesión."""
         try:
             key = generar_cache_key("sesion_info", session_id)
-            datos_sesion = self.cache.get(key)
+            datos_sesion = await self.cache.get(key)
 
             if datos_sesion:
                 datos_sesion['ultima_actividad'] = datetime.utcnow().isoformat()
-                self.cache.set(key, datos_sesion, 86400)  # Renovar TTL
+                await self.cache.set(key, datos_sesion, 86400)  # Renovar TTL
                 return True
 
             return False
@@ -354,11 +348,11 @@ class SeguridadService:
             logger.error(f"Error actualizando actividad de sesión: {e}")
             return False
 
-    def obtener_info_sesion(self, session_id: str) -> Optional[Dict[str, Any]]:
+    async def obtener_info_sesion(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Obtiene información de una sesión."""
         try:
             key = generar_cache_key("sesion_info", session_id)
-            return self.cache.get(key)
+            return await self.cache.get(key)
 
         except Exception as e:
             logger.error(f"Error obteniendo información de sesión: {e}")
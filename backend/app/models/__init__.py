@@ -5,6 +5,9 @@ Centraliza todos los modelos para que Alembic los detecte en autogenerate.
 
 from ..infrastructure.base_model import Base
 
+# Outbox del event bus
+from ..core.outbox import EventoOutbox
+
 # Acceso
 from ..modules.acceso.models import (
     Transaccion, Rol, TipoRol, RolTransaccion,
@@ -19,13 +22,13 @@ from ..modules.acceso.models import (
 # Core - Geográfico
 from ..modules.core.geografico import (
     NivelOrganizativo, NaturalezaUnidad, VinculoUnidad,
-    Pais, Provincia, Municipio, Direccion, UnidadOrganizativa,
+    Pais, Provincia, Municipio, Direccion, UnidadOrganizativa, UnidadOrganizativaCierre,
 )
 
 # Core - Comunicación
 from ..modules.core.comunicacion import (
-    TipoNotificacion, Notificacion, PreferenciaNotificacion,
-    CanalChat, MensajeEnviado,
+    TipoNotificacion, Notificacion, PreferenciaNotificacion, ContadorNotificaciones,
+    CanalChat, MensajeEnviado, TrabajoEnvioMasivo,
 )
 
 # Configuración
@@ -71,7 +74,7 @@ from ..modules.economico.models import (
     TipoCuentaContable, TipoAsientoContable, EstadoAsientoContable,
     CuentaContable, AsientoContable, ApunteContable,
     ModoIngreso, ImporteCuotaAnio, CuotaAnual,
-    DonacionConcepto, Donacion,
+    DonacionConcepto, Donacion, LoteCertificadosDonacion,
     Remesa, OrdenCobro,
     EstadoPlanificacion, CategoriaPartida, PartidaPresupuestaria, CompromisoPresupuestario, PlanificacionAnual,
     ProveedorPago, FormaPago, EstadoPago, TipoEventoPago, TipoPago, Pago, EventoPago,
@@ -48,10 +48,10 @@ class Cargo(BaseModel):
 
     # Relaciones
     cargo_aprobador: Mapped[Optional["Cargo"]] = relationship(
-        foreign_keys=[cargo_aprobador_id], remote_side="Cargo.id", lazy="selectin"
+        foreign_keys=[cargo_aprobador_id], remote_side="Cargo.id", lazy="select"
     )
     roles_sistema: Mapped[List["CargoRol"]] = relationship(
-        back_populates="cargo", lazy="selectin", cascade="all, delete-orphan"
+        back_populates="cargo", lazy="select", cascade="all, delete-orphan"
     )
     nombramientos: Mapped[List["HistorialNombramiento"]] = relationship(
         back_populates="cargo", lazy="noload"
@@ -73,8 +73,8 @@ class CargoRol(BaseModel):
         Uuid, ForeignKey('roles.id', ondelete='CASCADE'), nullable=False, index=True
     )
 
-    cargo: Mapped["Cargo"] = relationship(back_populates="roles_sistema", lazy="selectin")
-    rol: Mapped["Rol"] = relationship(lazy="selectin")
+    cargo: Mapped["Cargo"] = relationship(back_populates="roles_sistema", lazy="select")
+    rol: Mapped["Rol"] = relationship(lazy="select")
 
     def __repr__(self) -> str:
         return f"<CargoRol(cargo='{self.cargo_id}', rol='{self.rol_id}')>"
@@ -49,12 +49,12 @@ class Funcionalidad(BaseModel):
     roles: Mapped[List["RolFuncionalidad"]] = relationship(
         back_populates="funcionalidad",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="select",
     )
     transacciones: Mapped[List["FuncionalidadTransaccion"]] = relationship(
         back_populates="funcionalidad",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="select",
     )
 
     def __repr__(self) -> str:
@@ -83,8 +83,8 @@ class RolFuncionalidad(BaseModel):
         index=True,
     )
 
-    rol: Mapped["Rol"] = relationship(back_populates="funcionalidades", lazy="selectin")
-    funcionalidad: Mapped["Funcionalidad"] = relationship(back_populates="roles", lazy="selectin")
+    rol: Mapped["Rol"] = relationship(back_populates="funcionalidades", lazy="select")
+    funcionalidad: Mapped["Funcionalidad"] = relationship(back_populates="roles", lazy="select")
 
     def __repr__(self) -> str:
         return f"<RolFuncionalidad(rol_id='{self.rol_id}', funcionalidad_id='{self.funcionalidad_id}')>"
@@ -121,9 +121,9 @@ class FuncionalidadTransaccion(BaseModel):
     )
 
     funcionalidad: Mapped["Funcionalidad"] = relationship(
-        back_populates="transacciones", lazy="selectin"
+        back_populates="transacciones", lazy="select"
     )
-    transaccion: Mapped["Transaccion"] = relationship(lazy="selectin")
+    transaccion: Mapped["Transaccion"] = relationship(lazy="select")
 
     def __repr__(self) -> str:
         return (
@@ -181,16 +181,16 @@ class FlujoAprobacion(BaseModel):
     sistema: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
     transaccion_inicio: Mapped["Transaccion"] = relationship(
-        foreign_keys=[transaccion_inicio_id], lazy="selectin"
+        foreign_keys=[transaccion_inicio_id], lazy="select"
     )
     transaccion_aprobacion: Mapped["Transaccion"] = relationship(
-        foreign_keys=[transaccion_aprobacion_id], lazy="selectin"
+        foreign_keys=[transaccion_aprobacion_id], lazy="select"
     )
     transaccion_rechazo: Mapped[Optional["Transaccion"]] = relationship(
-        foreign_keys=[transaccion_rechazo_id], lazy="selectin"
+        foreign_keys=[transaccion_rechazo_id], lazy="select"
     )
     rol_aprobador: Mapped["Rol"] = relationship(
-        foreign_keys=[rol_aprobador_id], lazy="selectin"
+        foreign_keys=[rol_aprobador_id], lazy="select"
     )
 
     def __repr__(self) -> str:
@@ -43,12 +43,12 @@ class Rol(BaseModel):
 
     transacciones: Mapped[List["RolTransaccion"]] = relationship(
         back_populates="rol",
-        lazy="selectin",
+        lazy="select",
         cascade="all, delete-orphan",
     )
     funcionalidades: Mapped[List["RolFuncionalidad"]] = relationship(
         back_populates="rol",
-        lazy="selectin",
+        lazy="select",
         cascade="all, delete-orphan",
     )
 
@@ -34,8 +34,8 @@ class RolTransaccion(BaseModel):
         index=True,
     )
 
-    rol: Mapped["Rol"] = relationship(back_populates="transacciones", lazy="selectin")
-    transaccion: Mapped["Transaccion"] = relationship(back_populates="roles", lazy="selectin")
+    rol: Mapped["Rol"] = relationship(back_populates="transacciones", lazy="select")
+    transaccion: Mapped["Transaccion"] = relationship(back_populates="roles", lazy="select")
 
     def __repr__(self) -> str:
         return f"<RolTransaccion(rol_id='{self.rol_id}', transaccion_id='{self.transaccion_id}')>"
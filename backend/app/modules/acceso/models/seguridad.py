@@ -30,7 +30,7 @@ class Sesion(BaseModel):
     ubicacion: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)  # Ciudad/País aproximado
 
     # Relaciones
-    usuario = relationship('Usuario', foreign_keys=[usuario_id], back_populates='sesiones', lazy='selectin')
+    usuario = relationship('Usuario', foreign_keys=[usuario_id], back_populates='sesiones', lazy='select')
 
     def __repr__(self) -> str:
         return f"<Sesion(usuario_id='{self.usuario_id}', ip='{self.ip_address}', activa={self.activa})>"
@@ -61,7 +61,7 @@ class HistorialSeguridad(BaseModel):
     codigo_error: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
 
     # Relaciones
-    usuario = relationship('Usuario', foreign_keys=[usuario_id], lazy='selectin')
+    usuario = relationship('Usuario', foreign_keys=[usuario_id], lazy='select')
 
     def __repr__(self) -> str:
         return (f"<HistorialSeguridad(tipo='{self.evento_tipo}', "
@@ -82,7 +82,7 @@ class IPBloqueada(BaseModel):
     bloqueado_por_id: Mapped[Optional[uuid.UUID]] = mapped_column(Uuid, ForeignKey('usuarios.id'), nullable=True)
 
     # Relaciones
-    bloqueado_por = relationship('Usuario', foreign_keys=[bloqueado_por_id], lazy='selectin')
+    bloqueado_por = relationship('Usuario', foreign_keys=[bloqueado_por_id], lazy='select')
 
     def __repr__(self) -> str:
         return f"<IPBloqueada(ip='{self.ip_address}', permanente={self.bloqueado_permanente})>"
@@ -118,7 +118,7 @@ class IntentoAcceso(BaseModel):
     bloqueado_tras_intento: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
     # Relaciones
-    usuario = relationship('Usuario', foreign_keys=[usuario_id], lazy='selectin')
+    usuario = relationship('Usuario', foreign_keys=[usuario_id], lazy='select')
 
     def __repr__(self) -> str:
         return (f"<IntentoAcceso(identificador='{self.identificador}', "
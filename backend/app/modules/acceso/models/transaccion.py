@@ -31,7 +31,7 @@ class Transaccion(BaseModel):
 
     roles: Mapped[List["RolTransaccion"]] = relationship(
         back_populates="transaccion",
-        lazy="selectin",
+        lazy="select",
     )
 
     def __repr__(self) -> str:
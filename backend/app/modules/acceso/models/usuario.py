@@ -54,15 +54,15 @@ class Usuario(BaseModel):
     roles: Mapped[List["UsuarioRol"]] = relationship(
         back_populates="usuario",
         foreign_keys="[UsuarioRol.usuario_id]",
-        lazy="selectin"
+        lazy="select"
     )
     contacto: Mapped[Optional["Contacto"]] = relationship(
-        "Contacto", foreign_keys=[contacto_id], lazy="selectin"
+        "Contacto", foreign_keys=[contacto_id], lazy="select"
     )
     sesiones: Mapped[List["Sesion"]] = relationship(
         back_populates="usuario",
         foreign_keys="[Sesion.usuario_id]",
-        lazy="selectin"
+        lazy="select"
     )
 
     def __repr__(self) -> str:
@@ -98,9 +98,9 @@ class UsuarioRol(BaseModel):
     usuario: Mapped["Usuario"] = relationship(
         back_populates="roles",
         foreign_keys=[usuario_id],
-        lazy="selectin"
+        lazy="select"
     )
-    rol: Mapped["Rol"] = relationship(lazy="selectin")
+    rol: Mapped["Rol"] = relationship(lazy="select")
 
     def __repr__(self) -> str:
         return f"<UsuarioRol(usuario_id='{self.usuario_id}', rol_id='{self.rol_id}')>"
@@ -1,5 +1,5 @@
 from .catalog_sync import CatalogSyncService
-from .matrix import matrix_cache, invalidate_and_rebuild
+from .matrix import matrix_cache, invalidate_and_rebuild, apply_permission_event
 from .registry import ModuleCatalog, FuncionalidadDef, TransaccionDef, FlujoAprobacionDef
 from .acceso_service import AccesoService
 
@@ -7,6 +7,7 @@ __all__ = [
     "CatalogSyncService",
     "matrix_cache",
     "invalidate_and_rebuild",
+    "apply_permission_event",
     "ModuleCatalog",
     "FuncionalidadDef",
     "TransaccionDef",
@@ -13,55 +13,142 @@ Regla (ver docs/modulo_membresia.md y docs/modulo_actividades.md §9):
 
 Pensado para Fase 2: enchufar como filtro `Miembro.agrupacion_id IN (...)` en las queries y
 como guard en las mutaciones. En Fase 1 no se invoca todavía.
+
+Resolución del árbol: el árbol de unidades cambia muy poco, así que se carga entero
+(id, padre) en memoria con una sola consulta (`ArbolTerritorial`) y los subárboles se
+resuelven sin ir a BD; la pertenencia al ámbito es un lookup en un frozenset. La caché
+es por proceso, con TTL (`AMBITO_CACHE_TTL_SECONDS`) y se invalida al instante con
+`UnidadOrganizativaCambiada` en el worker que hizo el cambio. Para filtrar en SQL sin
+expandir listas de ids está `condicion_en_ambito`, que se apoya en la closure table
+`unidades_organizativas_cierre` (mantenida por triggers).
 """
 from __future__ import annotations
 
+import asyncio
+import time
 import uuid
-from typing import Optional
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, Optional
 
-from sqlalchemy import select, text
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.modules.acceso.models.usuario import UsuarioRol
 from app.modules.acceso.models.rol import Rol
 from app.modules.core.geografico.direccion import UnidadOrganizativa
+from app.modules.core.geografico.unidad_cierre import UnidadOrganizativaCierre
 
 # Roles cuyo ámbito NO es territorial (se resuelven por otra vía, p. ej. por campaña).
 # No deben entrar en el cálculo del ámbito territorial.
 _ROLES_NO_TERRITORIALES = ("COORDINADOR_CAMPANA",)
 
 
-async def _ids_raiz(session: AsyncSession) -> set[uuid.UUID]:
+class ArbolTerritorial:
+    """Instantánea inmutable de la jerarquía de unidades (padre → hijos)."""
+
+    def __init__(self, pares: Iterable[tuple]) -> None:
+        hijos: Dict[uuid.UUID, list] = defaultdict(list)
+        ids = set()
+        raices = set()
+        for uid, padre in pares:
+            ids.add(uid)
+            if padre is None:
+                raices.add(uid)
+            else:
+                hijos[padre].append(uid)
+        self._hijos = dict(hijos)
+        self.ids: FrozenSet[uuid.UUID] = frozenset(ids)
+        self.raices: FrozenSet[uuid.UUID] = frozenset(raices)
+        self._subarboles: Dict[uuid.UUID, FrozenSet[uuid.UUID]] = {}
+
+    def subarbol_de(self, unidad_id: uuid.UUID) -> FrozenSet[uuid.UUID]:
+        """La unidad + todos sus descendientes (memoizado)."""
+        sub = self._subarboles.get(unidad_id)
+        if sub is None:
+            if unidad_id not in self.ids:
+                return frozenset()
+            visto = {unidad_id}
+            pila = [unidad_id]
+            while pila:
+                for h in self._hijos.get(pila.pop(), ()):
+                    if h not in visto:  # defensivo ante ciclos en datos legados
+                        visto.add(h)
+                        pila.append(h)
+            sub = self._subarboles[unidad_id] = frozenset(visto)
+        return sub
+
+    def subarbol(self, raices: Iterable[uuid.UUID]) -> FrozenSet[uuid.UUID]:
+        raices = list(raices)
+        if len(raices) == 1:
+            return self.subarbol_de(raices[0])
+        return frozenset().union(*(self.subarbol_de(r) for r in raices))
+
+
+class _CacheArbol:
+    """Árbol territorial cacheado por proceso, con TTL y carga single-flight."""
+
+    def __init__(self) -> None:
+        self._arbol: Optional[ArbolTerritorial] = None
+        self._expira = 0.0
+        self._lock = asyncio.Lock()
+        self.cargas = 0
+
+    async def obtener(self, session: AsyncSession) -> ArbolTerritorial:
+        arbol = self._arbol
+        if arbol is not None and self._expira > time.monotonic():
+            return arbol
+        async with self._lock:
+            if self._arbol is not None and self._expira > time.monotonic():
+                return self._arbol
+            from app.core.config import get_settings
+
+            r = await session.execute(
+                select(UnidadOrganizativa.id, UnidadOrganizativa.agrupacion_padre_id)
+            )
+            self._arbol = ArbolTerritorial(r.all())
+            self._expira = time.monotonic() + get_settings().ambito_cache_ttl_seconds
+            self.cargas += 1
+            return self._arbol
+
+    def invalidar(self) -> None:
+        self._arbol = None
+        self._expira = 0.0
+
+
+arbol_territorial = _CacheArbol()
+
+
+async def _ids_raiz(session: AsyncSession) -> FrozenSet[uuid.UUID]:
     """IDs de las unidades raíz (sin padre)."""
-    r = await session.execute(
-        select(UnidadOrganizativa.id).where(UnidadOrganizativa.agrupacion_padre_id.is_(None))
-    )
-    return {row[0] for row in r.all()}
+    return (await arbol_territorial.obtener(session)).raices
 
 
-async def _subarbol(session: AsyncSession, raices: set[uuid.UUID]) -> set[uuid.UUID]:
-    """Una o varias agrupaciones + todos sus descendientes (CTE recursivo)."""
+async def _subarbol(session: AsyncSession, raices: set[uuid.UUID]) -> FrozenSet[uuid.UUID]:
+    """Una o varias agrupaciones + todos sus descendientes (árbol en memoria)."""
     if not raices:
-        return set()
-    sql = text(
-        """
-        WITH RECURSIVE sub AS (
-            SELECT id FROM unidades_organizativas WHERE id = ANY(:raices)
-            UNION ALL
-            SELECT u.id FROM unidades_organizativas u
-            JOIN sub ON u.agrupacion_padre_id = sub.id
-        )
-        SELECT id FROM sub
-        """
-    ).bindparams(raices=list(raices))
-    r = await session.execute(sql)
-    return {row[0] for row in r.all()}
+        return frozenset()
+    return (await arbol_territorial.obtener(session)).subarbol(raices)
 
 
-async def agrupaciones_en_ambito(
+def condicion_en_ambito(columna, raices: Iterable[uuid.UUID]):
+    """Condición SQL «`columna` cae en el subárbol de alguna de `raices`».
+
+    Semijoin contra la closure table: el planificador lo resuelve con el índice
+    de (ancestro_id, descendiente_id) sin que la aplicación expanda el subárbol.
+    """
+    return columna.in_(
+        select(UnidadOrganizativaCierre.descendiente_id)
+        .where(UnidadOrganizativaCierre.ancestro_id.in_(list(raices)))
+    )
+
+
+async def raices_en_ambito(
     session: AsyncSession, usuario_id: uuid.UUID,
 ) -> set[uuid.UUID] | None:
-    """Devuelve el conjunto de agrupaciones que el usuario gobierna, o None si es GLOBAL."""
+    """Unidades de los roles territoriales del usuario (sin expandir), o None si es GLOBAL.
+
+    Mismas reglas que `agrupaciones_en_ambito`; pensada para `condicion_en_ambito`.
+    """
     r = await session.execute(
         select(UsuarioRol.agrupacion_id)
         .join(Rol, Rol.id == UsuarioRol.rol_id)
@@ -81,8 +168,17 @@ async def agrupaciones_en_ambito(
         if a is None or a in raices:
             return None  # GLOBAL → no aplicar filtro
 
-    territoriales = {a for a in ambitos if a is not None}
-    return await _subarbol(session, territoriales)
+    return {a for a in ambitos if a is not None}
+
+
+async def agrupaciones_en_ambito(
+    session: AsyncSession, usuario_id: uuid.UUID,
+) -> set[uuid.UUID] | None:
+    """Devuelve el conjunto de agrupaciones que el usuario gobierna, o None si es GLOBAL."""
+    raices = await raices_en_ambito(session, usuario_id)
+    if raices is None or not raices:
+        return raices
+    return set(await _subarbol(session, raices))
 
 
 async def miembros_de_campanias_coordinadas(
@@ -147,28 +243,32 @@ async def ensure_rol_coordinador_campania(
         return
     session.add(UsuarioRol(usuario_id=usuario_id, rol_id=rol_id, agrupacion_id=None, activo=True))
     await session.commit()
+    from app.core.events import UserRolesChanged, event_bus
+    await event_bus.publish(UserRolesChanged(usuario_id=str(usuario_id)))
 
 
 async def ensure_rol_coordinador_grupo(
     session: AsyncSession, miembro_id: Optional[uuid.UUID],
-) -> None:
+) -> Optional[uuid.UUID]:
     """Concede el rol COORDINADOR_GRUPO_TRABAJO al usuario del coordinador de un grupo.
 
     Mini-coordinador acotado a las actividades de su grupo. Idempotente; no se revoca
     al cambiar de coordinador (si deja de coordinar grupos, su ámbito queda vacío).
     No commitea: se ejecuta dentro de la transacción de creación/designación del grupo.
+    Devuelve el usuario al que se ha concedido el rol (None si no hubo cambio) para
+    que quien llama publique `UserRolesChanged` tras su commit.
     """
     if not miembro_id:
-        return
+        return None
     from app.modules.acceso.models.usuario import Usuario
     from app.modules.acceso.models.rol import Rol
 
     usuario_id = await session.scalar(select(Usuario.id).where(Usuario.contacto_id == miembro_id))
     if not usuario_id:
-        return  # el coordinador no tiene cuenta de acceso
+        return None  # el coordinador no tiene cuenta de acceso
     rol_id = await session.scalar(select(Rol.id).where(Rol.codigo == "COORDINADOR_GRUPO_TRABAJO"))
     if not rol_id:
-        return
+        return None
     existe = await session.scalar(
         select(UsuarioRol.id).where(
             UsuarioRol.usuario_id == usuario_id,
@@ -177,8 +277,9 @@ async def ensure_rol_coordinador_grupo(
         )
     )
     if existe:
-        return
+        return None
     session.add(UsuarioRol(usuario_id=usuario_id, rol_id=rol_id, agrupacion_id=None, activo=True))
+    return usuario_id
 
 
 async def assert_unidad_en_ambito(
@@ -1,17 +1,30 @@
 """Sincroniza los catálogos declarados en código con la base de datos.
 
-Se ejecuta una vez al arrancar la aplicación (lifespan de FastAPI).
+Se ejecuta una vez al arrancar (bootstrap / lifespan, ver app/core/arranque.py).
 Usa upsert para que sea idempotente: no destruye asignaciones existentes,
 solo añade o actualiza las definiciones del catálogo.
+
+Por diferencias y en bloque: cada tabla del catálogo se lee una vez, se
+compara en memoria con las declaraciones de `ModuleCatalog` y solo las filas
+nuevas o cambiadas se escriben, con un INSERT … ON CONFLICT multi-fila.
+
+Además, la huella (SHA-256) del catálogo declarado se guarda en
+`configuraciones` (`CLAVE_HUELLA`). Si al arrancar coincide con la del código,
+no hay nada que sincronizar y se omite todo: el arranque en frío queda en una
+consulta. `sync(forzar=True)` ignora la huella (p. ej. tras tocar a mano las
+tablas del catálogo).
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 from typing import Optional
 import uuid
 
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.transaccion import Transaccion
@@ -21,25 +34,48 @@ from .registry import ModuleCatalog
 
 logger = logging.getLogger(__name__)
 
+CLAVE_HUELLA = "sistema.catalogo_huella"
+# Subir si cambia la forma de sincronizar: invalida las huellas guardadas.
+VERSION_SYNC = 2
+# Filas por sentencia INSERT multi-fila.
+_TAMANO_BLOQUE_INSERT = 1000
+
 
 class CatalogSyncService:
 
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
+        self._transacciones: dict[str, uuid.UUID] = {}
+
+    async def sync(self, forzar: bool = False) -> bool:
+        """Sincroniza sin confirmar: el commit lo hace quien llama, que tiene el
+        advisory lock de arranque ligado a su transacción (app/core/arranque.py).
+        Devuelve False si la huella no ha cambiado."""
+        huella = self.huella_catalogo()
+        if not forzar and await self._huella_guardada() == huella:
+            logger.info("Catálogo sin cambios (huella %s): sincronización omitida", huella[:12])
+            return False
 
-    async def sync(self) -> None:
         await self._sync_transacciones()
         await self._sync_funcionalidades()
-        await self._sync_flujos()
-        await self.session.commit()
+        completo = await self._sync_flujos()
+        # Con referencias pendientes (p. ej. el rol aprobador aún no existe) no se
+        # guarda la huella: el siguiente arranque lo vuelve a intentar.
+        if completo:
+            await self._guardar_huella(huella)
+        await self.session.flush()
         logger.info("Catálogo sincronizado correctamente")
+        return True
 
     # ------------------------------------------------------------------
-    # Transacciones
+    # Huella
     # ------------------------------------------------------------------
 
-    async def _sync_transacciones(self) -> None:
+    @staticmethod
+    def _estado_transacciones() -> list[tuple]:
+        """(codigo, nombre, descripcion, tipo, modulo, activa, sistema) de cada transacción."""
         from .modulos import transaccion_activa_por_funcionalidades
+        filas = []
         for defn in ModuleCatalog.get_transacciones():
             # Módulo canónico declarado en el catálogo (constante MODULO), no el
             # prefijo del código: un módulo puede declarar varios prefijos
@@ -53,141 +89,235 @@ class CatalogSyncService:
             # verdad que la matrix (enforcement de backend).
             funcs = ModuleCatalog.get_funcionalidades_de_transaccion(defn.codigo)
             activa = transaccion_activa_por_funcionalidades(modulo, funcs)
-            result = await self.session.execute(
-                select(Transaccion).where(Transaccion.codigo == defn.codigo)
-            )
-            obj = result.scalar_one_or_none()
-            if obj is None:
-                obj = Transaccion(
-                    id=uuid.uuid4(),
-                    codigo=defn.codigo,
-                    nombre=defn.nombre,
-                    descripcion=defn.descripcion,
-                    tipo=defn.tipo,
-                    modulo=modulo,
-                    activa=activa,
-                    sistema=defn.sistema,
+            filas.append((
+                defn.codigo, defn.nombre, defn.descripcion, defn.tipo,
+                modulo, activa, defn.sistema,
+            ))
+        return filas
+
+    @classmethod
+    def huella_catalogo(cls) -> str:
+        """SHA-256 del catálogo declarado, incluido el estado on/off efectivo."""
+        contenido = {
+            "version": VERSION_SYNC,
+            "transacciones": sorted(cls._estado_transacciones()),
+            "funcionalidades": sorted(
+                (
+                    f.codigo, f.nombre, f.descripcion, f.modulo, f.sistema,
+                    sorted((ft.transaccion_codigo, ft.ambito.value) for ft in f.transacciones),
+                )
+                for f in ModuleCatalog.get_funcionalidades()
+            ),
+            "flujos": sorted(
+                (
+                    f.codigo, f.nombre, f.descripcion, f.entidad, f.sistema,
+                    f.transaccion_inicio_codigo, f.transaccion_aprobacion_codigo,
+                    f.transaccion_rechazo_codigo, f.rol_aprobador_codigo,
                 )
-                self.session.add(obj)
-                logger.debug("Transaccion creada: %s", defn.codigo)
-            else:
-                obj.nombre = defn.nombre
-                obj.descripcion = defn.descripcion
-                obj.modulo = modulo
-                obj.activa = activa
-                obj.sistema = defn.sistema
+                for f in ModuleCatalog.get_flujos()
+            ),
+        }
+        serializado = json.dumps(contenido, ensure_ascii=False, default=str)
+        return hashlib.sha256(serializado.encode("utf-8")).hexdigest()
+
+    async def _huella_guardada(self) -> Optional[str]:
+        from app.modules.configuracion.models.configuracion import Configuracion
+        return await self.session.scalar(
+            select(Configuracion.valor).where(Configuracion.clave == CLAVE_HUELLA)
+        )
+
+    async def _guardar_huella(self, huella: str) -> None:
+        from app.modules.configuracion.models.configuracion import Configuracion
+        await self.session.execute(
+            pg_insert(Configuracion)
+            .values(
+                id=uuid.uuid4(),
+                clave=CLAVE_HUELLA,
+                valor=huella,
+                tipo_dato="string",
+                descripcion="Huella del catálogo de transacciones sincronizado (uso interno)",
+                modificable=False,
+                grupo="sistema",
+                orden=0,
+            )
+            .on_conflict_do_update(
+                index_elements=[Configuracion.clave],
+                set_={"valor": huella, "fecha_modificacion": func.now()},
+            )
+        )
+
+    async def _upsert(self, modelo, filas: list[dict], actualizar: tuple[str, ...]) -> None:
+        """INSERT multi-fila; en conflicto por `codigo` actualiza `actualizar`."""
+        for i in range(0, len(filas), _TAMANO_BLOQUE_INSERT):
+            stmt = pg_insert(modelo).values(filas[i:i + _TAMANO_BLOQUE_INSERT])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[modelo.codigo],
+                set_={
+                    **{c: stmt.excluded[c] for c in actualizar},
+                    "fecha_modificacion": func.now(),
+                },
+            )
+            await self.session.execute(stmt)
+
+    # ------------------------------------------------------------------
+    # Transacciones
+    # ------------------------------------------------------------------
+
+    async def _sync_transacciones(self) -> None:
+        actuales = {
+            f.codigo: f
+            for f in await self.session.execute(select(
+                Transaccion.id, Transaccion.codigo, Transaccion.nombre,
+                Transaccion.descripcion, Transaccion.modulo, Transaccion.activa,
+                Transaccion.sistema,
+            ))
+        }
+        self._transacciones = {codigo: f.id for codigo, f in actuales.items()}
+
+        filas = []
+        for codigo, nombre, descripcion, tipo, modulo, activa, sistema in self._estado_transacciones():
+            actual = actuales.get(codigo)
+            if actual is not None and (
+                actual.nombre, actual.descripcion, actual.modulo, actual.activa, actual.sistema
+            ) == (nombre, descripcion, modulo, activa, sistema):
+                continue
+            id_ = actual.id if actual is not None else uuid.uuid4()
+            self._transacciones[codigo] = id_
+            filas.append({
+                "id": id_, "codigo": codigo, "nombre": nombre, "descripcion": descripcion,
+                "tipo": tipo, "modulo": modulo, "activa": activa, "sistema": sistema,
+            })
+        # El tipo solo se fija al crear, como hasta ahora.
+        await self._upsert(
+            Transaccion, filas, ("nombre", "descripcion", "modulo", "activa", "sistema"),
+        )
+        if filas:
+            logger.debug("Transacciones creadas/actualizadas: %d", len(filas))
 
     # ------------------------------------------------------------------
     # Funcionalidades y sus transacciones
     # ------------------------------------------------------------------
 
     async def _sync_funcionalidades(self) -> None:
+        actuales = {
+            f.codigo: f
+            for f in await self.session.execute(select(
+                Funcionalidad.id, Funcionalidad.codigo, Funcionalidad.nombre,
+                Funcionalidad.descripcion, Funcionalidad.sistema,
+            ))
+        }
+        ids: dict[str, uuid.UUID] = {codigo: f.id for codigo, f in actuales.items()}
+
+        filas = []
         for defn in ModuleCatalog.get_funcionalidades():
-            result = await self.session.execute(
-                select(Funcionalidad).where(Funcionalidad.codigo == defn.codigo)
-            )
-            obj = result.scalar_one_or_none()
-            if obj is None:
-                obj = Funcionalidad(
-                    id=uuid.uuid4(),
-                    codigo=defn.codigo,
-                    nombre=defn.nombre,
-                    descripcion=defn.descripcion,
-                    modulo=defn.modulo,
-                    activa=True,
-                    sistema=defn.sistema,
-                )
-                self.session.add(obj)
-                logger.debug("Funcionalidad creada: %s", defn.codigo)
-            else:
-                obj.nombre = defn.nombre
-                obj.descripcion = defn.descripcion
-                obj.sistema = defn.sistema
-
-            await self.session.flush()
-            await self._sync_funcionalidad_transacciones(obj, defn)
-
-    async def _sync_funcionalidad_transacciones(
-        self, func_obj: Funcionalidad, defn
-    ) -> None:
-        for ft_defn in defn.transacciones:
-            t_result = await self.session.execute(
-                select(Transaccion).where(Transaccion.codigo == ft_defn.transaccion_codigo)
-            )
-            transaccion = t_result.scalar_one_or_none()
-            if transaccion is None:
-                logger.warning(
-                    "Transaccion '%s' no encontrada para funcionalidad '%s'",
-                    ft_defn.transaccion_codigo,
-                    func_obj.codigo,
-                )
+            actual = actuales.get(defn.codigo)
+            if actual is not None and (
+                actual.nombre, actual.descripcion, actual.sistema
+            ) == (defn.nombre, defn.descripcion, defn.sistema):
                 continue
+            id_ = actual.id if actual is not None else uuid.uuid4()
+            ids[defn.codigo] = id_
+            filas.append({
+                "id": id_, "codigo": defn.codigo, "nombre": defn.nombre,
+                "descripcion": defn.descripcion, "modulo": defn.modulo,
+                "activa": True, "sistema": defn.sistema,
+            })
+        await self._upsert(Funcionalidad, filas, ("nombre", "descripcion", "sistema"))
+        if filas:
+            logger.debug("Funcionalidades creadas/actualizadas: %d", len(filas))
 
-            existing = await self.session.execute(
-                select(FuncionalidadTransaccion).where(
-                    FuncionalidadTransaccion.funcionalidad_id == func_obj.id,
-                    FuncionalidadTransaccion.transaccion_id == transaccion.id,
-                )
+        await self._sync_funcionalidad_transacciones(ids)
+
+    async def _sync_funcionalidad_transacciones(self, funcionalidades: dict[str, uuid.UUID]) -> None:
+        """Añade los vínculos funcionalidad–transacción que falten (no toca el ámbito
+        de los existentes)."""
+        existentes = set(
+            (await self.session.execute(select(
+                FuncionalidadTransaccion.funcionalidad_id,
+                FuncionalidadTransaccion.transaccion_id,
+            ))).all()
+        )
+        filas = []
+        for defn in ModuleCatalog.get_funcionalidades():
+            func_id = funcionalidades[defn.codigo]
+            for ft_defn in defn.transacciones:
+                transaccion_id = self._transacciones.get(ft_defn.transaccion_codigo)
+                if transaccion_id is None:
+                    logger.warning(
+                        "Transaccion '%s' no encontrada para funcionalidad '%s'",
+                        ft_defn.transaccion_codigo,
+                        defn.codigo,
+                    )
+                    continue
+                if (func_id, transaccion_id) in existentes:
+                    continue
+                existentes.add((func_id, transaccion_id))
+                filas.append({
+                    "id": uuid.uuid4(),
+                    "funcionalidad_id": func_id,
+                    "transaccion_id": transaccion_id,
+                    "ambito": ft_defn.ambito,
+                })
+        for i in range(0, len(filas), _TAMANO_BLOQUE_INSERT):
+            await self.session.execute(
+                pg_insert(FuncionalidadTransaccion)
+                .values(filas[i:i + _TAMANO_BLOQUE_INSERT])
+                .on_conflict_do_nothing()
             )
-            if existing.scalar_one_or_none() is None:
-                self.session.add(FuncionalidadTransaccion(
-                    id=uuid.uuid4(),
-                    funcionalidad_id=func_obj.id,
-                    transaccion_id=transaccion.id,
-                    ambito=ft_defn.ambito,
-                ))
 
     # ------------------------------------------------------------------
     # Flujos de aprobación
     # ------------------------------------------------------------------
 
-    async def _sync_flujos(self) -> None:
-        for defn in ModuleCatalog.get_flujos():
-            result = await self.session.execute(
-                select(FlujoAprobacion).where(FlujoAprobacion.codigo == defn.codigo)
-            )
-            obj = result.scalar_one_or_none()
+    async def _sync_flujos(self) -> bool:
+        """Devuelve False si algún flujo se omitió por referencias que faltan."""
+        defs = ModuleCatalog.get_flujos()
+        if not defs:
+            return True
+        actuales = {
+            f.codigo: f
+            for f in await self.session.execute(select(
+                FlujoAprobacion.codigo, FlujoAprobacion.nombre,
+                FlujoAprobacion.descripcion, FlujoAprobacion.sistema,
+            ))
+        }
+        roles = dict((await self.session.execute(
+            select(Rol.codigo, Rol.id).where(Rol.codigo.in_({d.rol_aprobador_codigo for d in defs}))
+        )).all())
 
-            t_inicio = await self._get_transaccion(defn.transaccion_inicio_codigo)
-            t_aprobacion = await self._get_transaccion(defn.transaccion_aprobacion_codigo)
-            rol_aprobador = await self._get_rol(defn.rol_aprobador_codigo)
-            t_rechazo: Optional[Transaccion] = None
+        completo = True
+        filas = []
+        for defn in defs:
+            t_inicio = self._transacciones.get(defn.transaccion_inicio_codigo)
+            t_aprobacion = self._transacciones.get(defn.transaccion_aprobacion_codigo)
+            rol_aprobador = roles.get(defn.rol_aprobador_codigo)
+            t_rechazo: Optional[uuid.UUID] = None
             if defn.transaccion_rechazo_codigo:
-                t_rechazo = await self._get_transaccion(defn.transaccion_rechazo_codigo)
+                t_rechazo = self._transacciones.get(defn.transaccion_rechazo_codigo)
 
             if not (t_inicio and t_aprobacion and rol_aprobador):
                 logger.warning("FlujoAprobacion '%s' omitido: faltan referencias", defn.codigo)
+                completo = False
                 continue
 
-            if obj is None:
-                obj = FlujoAprobacion(
-                    id=uuid.uuid4(),
-                    codigo=defn.codigo,
-                    nombre=defn.nombre,
-                    descripcion=defn.descripcion,
-                    transaccion_inicio_id=t_inicio.id,
-                    transaccion_aprobacion_id=t_aprobacion.id,
-                    transaccion_rechazo_id=t_rechazo.id if t_rechazo else None,
-                    rol_aprobador_id=rol_aprobador.id,
-                    entidad=defn.entidad,
-                    activo=True,
-                    sistema=defn.sistema,
-                )
-                self.session.add(obj)
-                logger.debug("FlujoAprobacion creado: %s", defn.codigo)
-            else:
-                obj.nombre = defn.nombre
-                obj.descripcion = defn.descripcion
-                obj.sistema = defn.sistema
-
-    async def _get_transaccion(self, codigo: str) -> Optional[Transaccion]:
-        result = await self.session.execute(
-            select(Transaccion).where(Transaccion.codigo == codigo)
-        )
-        return result.scalar_one_or_none()
-
-    async def _get_rol(self, codigo: str) -> Optional[Rol]:
-        result = await self.session.execute(
-            select(Rol).where(Rol.codigo == codigo)
-        )
-        return result.scalar_one_or_none()
+            actual = actuales.get(defn.codigo)
+            if actual is not None and (
+                actual.nombre, actual.descripcion, actual.sistema
+            ) == (defn.nombre, defn.descripcion, defn.sistema):
+                continue
+            filas.append({
+                "id": uuid.uuid4(),
+                "codigo": defn.codigo,
+                "nombre": defn.nombre,
+                "descripcion": defn.descripcion,
+                "transaccion_inicio_id": t_inicio,
+                "transaccion_aprobacion_id": t_aprobacion,
+                "transaccion_rechazo_id": t_rechazo,
+                "rol_aprobador_id": rol_aprobador,
+                "entidad": defn.entidad,
+                "activo": True,
+                "sistema": defn.sistema,
+            })
+        # Como antes, de un flujo existente solo se actualizan los textos y `sistema`.
+        await self._upsert(FlujoAprobacion, filas, ("nombre", "descripcion", "sistema"))
+        return completo
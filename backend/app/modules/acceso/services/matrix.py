@@ -1,8 +1,15 @@
 """Builder async de la PermissionMatrix y cache global con invalidación por eventos.
 
 Flujo:
-  DB → SQLRepositories → AsyncPermissionMatrixBuilder → PermissionMatrixSnapshot
-  Domain events → matrix_cache.invalidate() → rebuild en background
+  DB → SQLRepositories (consultas por lote) → AsyncPermissionMatrixBuilder
+     → PermissionMatrixSnapshot (versionado, con bitmap rol → transacciones efectivas)
+  Domain events → apply_permission_event() → recálculo SOLO del rol/funcionalidad
+     afectados → snapshot nuevo (copy-on-write) → publicado en Redis (si hay)
+
+Con Redis configurado (`REDIS_URL`) el snapshot se comparte entre workers: quien
+lo cambia lo guarda con una versión nueva y lo anuncia por pub/sub; el resto lo
+adopta sin consultar la BD (ver `matrix_sync`). Sin Redis, cada proceso mantiene
+el suyo como antes.
 """
 
 from __future__ import annotations
@@ -10,7 +17,7 @@ from __future__ import annotations
 import asyncio
 import logging
 from dataclasses import dataclass, field
-from typing import Dict, FrozenSet, Optional, Set
+from typing import Any, Dict, FrozenSet, Iterable, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -25,36 +32,158 @@ logger = logging.getLogger(__name__)
 
 @dataclass
 class PermissionMatrixSnapshot:
-    """Snapshot inmutable del estado de permisos en un instante."""
+    """Snapshot de permisos en un instante. Se trata como inmutable: los cambios
+    incrementales producen una copia (`_copia`) y se instalan de golpe."""
 
-    # role_id → frozenset de transaccion_id (vía RolTransaccion directo)
+    # role_id → frozenset de códigos de transacción (vía RolTransaccion directo)
     role_transactions: Dict[str, FrozenSet[str]] = field(default_factory=dict)
 
     # role_id → frozenset de funcionalidad_id
     role_functionalities: Dict[str, FrozenSet[str]] = field(default_factory=dict)
 
-    # funcionalidad_id → frozenset de transaccion_id
+    # funcionalidad_id → frozenset de códigos de transacción
     functionality_transactions: Dict[str, FrozenSet[str]] = field(default_factory=dict)
 
+    # Códigos de transacciones apagadas (módulo/funcionalidad OFF)
+    inactivas: FrozenSet[str] = frozenset()
+
+    # Versión monotónica (compartida vía Redis si lo hay)
+    version: int = 0
+
+    # Precalculado: código → nº de bit, y role_id → bitmap de transacciones
+    # efectivas (directas ∪ vía funcionalidad − inactivas).
+    transaction_bits: Dict[str, int] = field(default_factory=dict, repr=False)
+    role_effective: Dict[str, int] = field(default_factory=dict, repr=False)
+
+    # ------------------------------------------------------------------
+    # Evaluación
+    # ------------------------------------------------------------------
+
     def can(self, role_ids: FrozenSet[str], transaction_id: str) -> bool:
-        for rid in role_ids:
-            if transaction_id in self.role_transactions.get(rid, frozenset()):
-                return True
-            for fid in self.role_functionalities.get(rid, frozenset()):
-                if transaction_id in self.functionality_transactions.get(fid, frozenset()):
-                    return True
-        return False
+        bit = self.transaction_bits.get(transaction_id)
+        if bit is None:
+            return False
+        mascara = 1 << bit
+        return any(self.role_effective.get(rid, 0) & mascara for rid in role_ids)
+
+    def effective_transactions(self, role_id: str) -> FrozenSet[str]:
+        """Códigos de transacción efectivos de un rol (decodifica el bitmap)."""
+        bitmap = self.role_effective.get(role_id, 0)
+        return frozenset(c for c, b in self.transaction_bits.items() if bitmap >> b & 1)
+
+    # ------------------------------------------------------------------
+    # Precálculo
+    # ------------------------------------------------------------------
+
+    def _bitmap(self, codigos: Iterable[str]) -> int:
+        bitmap = 0
+        for codigo in codigos:
+            if codigo in self.inactivas:
+                continue
+            bit = self.transaction_bits.get(codigo)
+            if bit is None:
+                bit = self.transaction_bits[codigo] = len(self.transaction_bits)
+            bitmap |= 1 << bit
+        return bitmap
+
+    def _recalcular_rol(self, role_id: str) -> None:
+        bitmap = self._bitmap(self.role_transactions.get(role_id, frozenset()))
+        for fid in self.role_functionalities.get(role_id, frozenset()):
+            bitmap |= self._bitmap(self.functionality_transactions.get(fid, frozenset()))
+        self.role_effective[role_id] = bitmap
+
+    def recalcular(self) -> None:
+        """Recalcula los bitmaps de todos los roles."""
+        self.transaction_bits = {}
+        self.role_effective = {}
+        for rid in set(self.role_transactions) | set(self.role_functionalities):
+            self._recalcular_rol(rid)
+
+    def _copia(self) -> "PermissionMatrixSnapshot":
+        return PermissionMatrixSnapshot(
+            role_transactions=dict(self.role_transactions),
+            role_functionalities=dict(self.role_functionalities),
+            functionality_transactions=dict(self.functionality_transactions),
+            inactivas=self.inactivas,
+            version=self.version,
+            transaction_bits=dict(self.transaction_bits),
+            role_effective=dict(self.role_effective),
+        )
+
+    # ------------------------------------------------------------------
+    # Cambios incrementales (devuelven un snapshot nuevo)
+    # ------------------------------------------------------------------
+
+    def con_rol(
+        self,
+        role_id: str,
+        transactions: Optional[Iterable[str]],
+        functionalities: Optional[Iterable[str]],
+    ) -> "PermissionMatrixSnapshot":
+        """Snapshot con el rol reemplazado; `None` en ambos lo elimina."""
+        nuevo = self._copia()
+        if transactions is None and functionalities is None:
+            nuevo.role_transactions.pop(role_id, None)
+            nuevo.role_functionalities.pop(role_id, None)
+            nuevo.role_effective.pop(role_id, None)
+            return nuevo
+        nuevo.role_transactions[role_id] = frozenset(transactions or ())
+        nuevo.role_functionalities[role_id] = frozenset(functionalities or ())
+        nuevo._recalcular_rol(role_id)
+        return nuevo
+
+    def con_funcionalidad(
+        self, functionality_id: str, transactions: Iterable[str]
+    ) -> "PermissionMatrixSnapshot":
+        """Snapshot con la funcionalidad reemplazada; recalcula solo los roles que la tienen."""
+        nuevo = self._copia()
+        nuevo.functionality_transactions[functionality_id] = frozenset(transactions)
+        for rid, funcs in nuevo.role_functionalities.items():
+            if functionality_id in funcs:
+                nuevo._recalcular_rol(rid)
+        return nuevo
+
+    # ------------------------------------------------------------------
+    # Serialización (para compartir vía Redis)
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "role_transactions": {k: sorted(v) for k, v in self.role_transactions.items()},
+            "role_functionalities": {k: sorted(v) for k, v in self.role_functionalities.items()},
+            "functionality_transactions": {
+                k: sorted(v) for k, v in self.functionality_transactions.items()
+            },
+            "inactivas": sorted(self.inactivas),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PermissionMatrixSnapshot":
+        snap = cls(
+            role_transactions={k: frozenset(v) for k, v in data["role_transactions"].items()},
+            role_functionalities={k: frozenset(v) for k, v in data["role_functionalities"].items()},
+            functionality_transactions={
+                k: frozenset(v) for k, v in data["functionality_transactions"].items()
+            },
+            inactivas=frozenset(data.get("inactivas", ())),
+            version=int(data.get("version", 0)),
+        )
+        snap.recalcular()
+        return snap
 
 
 class AsyncPermissionMatrixBuilder:
+    """Construye el snapshot con un puñado de consultas por lote (sin N+1)."""
 
     def __init__(self, session: AsyncSession) -> None:
+        self.session = session
         self.roles = SQLRoleRepository(session)
         self.permissions = SQLPermissionRepository(session)
         self.functionalities = SQLFunctionalityRepository(session)
 
     async def _transacciones_inactivas(self) -> FrozenSet[str]:
-        """IDs de transacciones cuya FUNCIONALIDAD (o módulo) está apagada.
+        """Códigos de transacciones cuya FUNCIONALIDAD (o módulo) está apagada.
 
         Se excluyen del snapshot para que ningún rol —ni el SUPERADMIN— pueda
         ejecutarlas mientras estén apagadas. Fuente de verdad: services.modulos +
@@ -66,34 +195,34 @@ class AsyncPermissionMatrixBuilder:
         from .registry import ModuleCatalog
         from ..models.transaccion import Transaccion
 
-        rows = (await self.roles.session.execute(  # reutiliza la sesión del repo
-            select(Transaccion.id, Transaccion.codigo, Transaccion.modulo)
+        rows = (await self.session.execute(
+            select(Transaccion.codigo, Transaccion.modulo)
         )).all()
         inactivas = set()
-        for (tid, codigo, modulo) in rows:
+        for (codigo, modulo) in rows:
             funcs = ModuleCatalog.get_funcionalidades_de_transaccion(codigo)
             if not transaccion_activa_por_funcionalidades(modulo, funcs):
-                inactivas.add(str(tid))
+                inactivas.add(str(codigo))
         return frozenset(inactivas)
 
     async def build(self) -> PermissionMatrixSnapshot:
-        snapshot = PermissionMatrixSnapshot()
-
         inactivas = await self._transacciones_inactivas()
 
         role_ids = await self.roles.get_all_role_ids()
         func_ids = await self.functionalities.get_all_functionality_ids()
-
-        for rid in role_ids:
-            txs = await self.permissions.get_transactions_by_role(rid)
-            snapshot.role_transactions[rid] = frozenset(txs) - inactivas
-
-            funcs = await self.functionalities.get_functionalities_by_role(rid)
-            snapshot.role_functionalities[rid] = frozenset(funcs)
-
-        for fid in func_ids:
-            txs = await self.functionalities.get_transactions_by_functionality(fid)
-            snapshot.functionality_transactions[fid] = frozenset(txs) - inactivas
+        role_txs = await self.permissions.get_all_role_transactions()
+        role_funcs = await self.functionalities.get_all_role_functionalities()
+        func_txs = await self.functionalities.get_all_functionality_transactions()
+
+        snapshot = PermissionMatrixSnapshot(
+            role_transactions={rid: frozenset(role_txs.get(rid, ())) for rid in role_ids},
+            role_functionalities={rid: frozenset(role_funcs.get(rid, ())) for rid in role_ids},
+            functionality_transactions={
+                fid: frozenset(func_txs.get(fid, ())) for fid in func_ids
+            },
+            inactivas=inactivas,
+        )
+        snapshot.recalcular()
 
         logger.info(
             "PermissionMatrix construida: %d roles, %d funcionalidades, %d transacciones inactivas (módulos OFF)",
@@ -103,25 +232,110 @@ class AsyncPermissionMatrixBuilder:
         )
         return snapshot
 
+    async def build_role(
+        self, base: PermissionMatrixSnapshot, role_id: str
+    ) -> PermissionMatrixSnapshot:
+        """Recarga un solo rol (2 consultas) sobre `base`."""
+        if role_id not in await self.roles.get_all_role_ids():
+            return base.con_rol(role_id, None, None)
+        txs = await self.permissions.get_transactions_by_role(role_id)
+        funcs = await self.functionalities.get_functionalities_by_role(role_id)
+        return base.con_rol(role_id, txs, funcs)
+
+    async def build_functionality(
+        self, base: PermissionMatrixSnapshot, functionality_id: str
+    ) -> PermissionMatrixSnapshot:
+        """Recarga una sola funcionalidad sobre `base` y los roles que la incluyen."""
+        activas = await self.functionalities.get_all_functionality_ids()
+        txs = (
+            await self.functionalities.get_transactions_by_functionality(functionality_id)
+            if functionality_id in activas else set()
+        )
+        return base.con_funcionalidad(functionality_id, txs)
+
 
 class PermissionMatrixCache:
-    """Cache global con lock async para reconstrucción segura."""
+    """Cache global con lock async para reconstrucción segura.
+
+    Si hay un `MatrixSync` instalado (Redis), cada cambio se hace bajo su lock
+    distribuido partiendo de la última versión compartida, y se publica al resto.
+    """
 
     def __init__(self) -> None:
         self._snapshot: Optional[PermissionMatrixSnapshot] = None
         self._lock = asyncio.Lock()
+        self._sync = None  # Optional[MatrixSync]
 
     @property
     def snapshot(self) -> Optional[PermissionMatrixSnapshot]:
         return self._snapshot
 
+    @property
+    def version(self) -> int:
+        return self._snapshot.version if self._snapshot else 0
+
     def is_ready(self) -> bool:
         return self._snapshot is not None
 
-    async def rebuild(self, session: AsyncSession) -> None:
+    def set_sync(self, sync) -> None:
+        self._sync = sync
+
+    @property
+    def sincronizada(self) -> bool:
+        """True si los cambios se comparten entre procesos por un `MatrixSync`."""
+        return self._sync is not None
+
+    def install(self, snapshot: PermissionMatrixSnapshot) -> bool:
+        """Instala un snapshot si es más reciente que el actual (lo usa el listener)."""
+        if self._snapshot is not None and snapshot.version <= self._snapshot.version:
+            return False
+        self._snapshot = snapshot
+        logger.info("PermissionMatrix v%d instalada", snapshot.version)
+        return True
+
+    async def load_shared(self) -> bool:
+        """Adopta el snapshot compartido (Redis) sin tocar la BD. False si no hay."""
+        if self._sync is None:
+            return False
+        snapshot = await self._sync.load()
+        return snapshot is not None and self.install(snapshot)
+
+    async def _aplicar(self, session: AsyncSession, cambio) -> None:
+        """Ejecuta `cambio(builder, base) -> snapshot` y lo instala/publica."""
         async with self._lock:
             builder = AsyncPermissionMatrixBuilder(session)
-            self._snapshot = await builder.build()
+            if self._sync is not None:
+                async with self._sync.lock():
+                    compartido = await self._sync.load()
+                    base = self._snapshot
+                    if compartido is not None and (base is None or compartido.version >= base.version):
+                        base = compartido
+                    nuevo = await cambio(builder, base)
+                    nuevo.version = await self._sync.next_version()
+                    await self._sync.publish(nuevo)
+            else:
+                nuevo = await cambio(builder, self._snapshot)
+                nuevo.version = self.version + 1
+            self._snapshot = nuevo
+
+    async def rebuild(self, session: AsyncSession) -> None:
+        async def _completo(builder, base):
+            return await builder.build()
+        await self._aplicar(session, _completo)
+
+    async def rebuild_role(self, session: AsyncSession, role_id: str) -> None:
+        async def _rol(builder, base):
+            if base is None:
+                return await builder.build()
+            return await builder.build_role(base, role_id)
+        await self._aplicar(session, _rol)
+
+    async def rebuild_functionality(self, session: AsyncSession, functionality_id: str) -> None:
+        async def _func(builder, base):
+            if base is None:
+                return await builder.build()
+            return await builder.build_functionality(base, functionality_id)
+        await self._aplicar(session, _func)
 
     def invalidate(self) -> None:
         self._snapshot = None
@@ -138,6 +352,23 @@ matrix_cache = PermissionMatrixCache()
 
 
 async def invalidate_and_rebuild(session: AsyncSession) -> None:
-    """Punto de entrada para el event bus: invalida y reconstruye la matriz."""
-    matrix_cache.invalidate()
+    """Reconstrucción completa de la matriz (cambios de catálogo o de módulos)."""
     await matrix_cache.rebuild(session)
+
+
+async def apply_permission_event(session: AsyncSession, event) -> None:
+    """Punto de entrada para el event bus: recalcula solo lo afectado por `event`.
+
+    - RoleCreated / RoleUpdated / RoleDeleted / PermissionChanged → ese rol.
+    - FunctionalityChanged con role_id → ese rol (cambió su lista de funcionalidades);
+      solo con functionality_id → esa funcionalidad y los roles que la tienen.
+    - Cualquier otro caso (ids vacíos) → reconstrucción completa.
+    """
+    role_id = getattr(event, "role_id", "") or ""
+    functionality_id = getattr(event, "functionality_id", "") or ""
+    if role_id:
+        await matrix_cache.rebuild_role(session, role_id)
+    elif functionality_id:
+        await matrix_cache.rebuild_functionality(session, functionality_id)
+    else:
+        await matrix_cache.rebuild(session)
@@ -0,0 +1,123 @@
+"""Compartición de la PermissionMatrix entre workers vía Redis.
+
+Claves:
+  siga:permission_matrix:snapshot  → JSON del último snapshot (con su versión)
+  siga:permission_matrix:version   → contador monotónico (INCR)
+  siga:permission_matrix:lock      → lock distribuido para read-modify-write
+Canal pub/sub:
+  siga:permission_matrix           → mensaje = versión recién publicada
+
+Quien cambia la matriz (un worker que atiende la mutación de roles, o el arranque)
+lo hace bajo el lock partiendo de la última versión compartida, guarda el snapshot
+y publica la versión. El listener del resto de workers, al recibir una versión
+mayor que la suya, lee el snapshot y lo instala: convergen sin ir a la BD.
+
+Redis es opcional: `crear_matrix_sync()` devuelve None si no hay `REDIS_URL` o no
+se puede conectar, y la matriz sigue funcionando por proceso.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+from typing import Optional
+
+from .matrix import PermissionMatrixCache, PermissionMatrixSnapshot
+
+logger = logging.getLogger(__name__)
+
+_PREFIJO = "siga:permission_matrix"
+CLAVE_SNAPSHOT = f"{_PREFIJO}:snapshot"
+CLAVE_VERSION = f"{_PREFIJO}:version"
+CLAVE_LOCK = f"{_PREFIJO}:lock"
+CANAL = _PREFIJO
+
+
+class MatrixSync:
+    """Snapshot compartido + notificación por pub/sub sobre `redis.asyncio`."""
+
+    def __init__(self, client) -> None:
+        self.client = client
+        self._listener: Optional[asyncio.Task] = None
+
+    def lock(self):
+        """Lock distribuido (timeout corto: una reconstrucción completa tarda ms)."""
+        return self.client.lock(CLAVE_LOCK, timeout=30, blocking_timeout=30)
+
+    async def next_version(self) -> int:
+        return int(await self.client.incr(CLAVE_VERSION))
+
+    async def load(self) -> Optional[PermissionMatrixSnapshot]:
+        crudo = await self.client.get(CLAVE_SNAPSHOT)
+        if not crudo:
+            return None
+        try:
+            return PermissionMatrixSnapshot.from_dict(json.loads(crudo))
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Snapshot compartido de la PermissionMatrix ilegible; se ignora")
+            return None
+
+    async def publish(self, snapshot: PermissionMatrixSnapshot) -> None:
+        await self.client.set(CLAVE_SNAPSHOT, json.dumps(snapshot.to_dict(), separators=(",", ":")))
+        await self.client.publish(CANAL, str(snapshot.version))
+
+    def start_listener(self, cache: PermissionMatrixCache) -> None:
+        """Lanza la tarea que instala las versiones que publiquen otros workers."""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._escuchar(cache))
+
+    async def _escuchar(self, cache: PermissionMatrixCache) -> None:
+        while True:
+            pubsub = None
+            try:
+                pubsub = self.client.pubsub()
+                await pubsub.subscribe(CANAL)
+                # Tras (re)suscribirse, ponerse al día por si se perdió algún aviso.
+                await cache.load_shared()
+                async for mensaje in pubsub.listen():
+                    if mensaje.get("type") != "message":
+                        continue
+                    try:
+                        version = int(mensaje["data"])
+                    except (TypeError, ValueError):
+                        continue
+                    if version > cache.version:
+                        await cache.load_shared()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Listener de la PermissionMatrix caído; reintentando en 5 s")
+            finally:
+                # Devolver su conexión antes de abrir otra: cada corte la filtraría.
+                if pubsub is not None:
+                    with contextlib.suppress(Exception):
+                        await pubsub.aclose()
+            await asyncio.sleep(5)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        await self.client.aclose()
+
+
+async def crear_matrix_sync(redis_url: str) -> Optional[MatrixSync]:
+    """Conecta con Redis; None si no hay URL, falta la librería o no responde."""
+    if not redis_url:
+        return None
+    try:
+        import redis.asyncio as aioredis
+    except ImportError:
+        logger.warning("Paquete redis no instalado: PermissionMatrix solo por proceso")
+        return None
+    client = aioredis.from_url(redis_url, decode_responses=True)
+    try:
+        await client.ping()
+    except Exception as e:
+        logger.warning("Redis no disponible (%s): PermissionMatrix solo por proceso", e)
+        await client.aclose()
+        return None
+    return MatrixSync(client)
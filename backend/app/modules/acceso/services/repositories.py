@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Optional, Set
+from collections import defaultdict
+from typing import Dict, Optional, Set
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -79,6 +80,21 @@ class SQLPermissionRepository:
         )
         return {str(row[0]) for row in result.all()}
 
+    async def get_all_role_transactions(self) -> Dict[str, Set[str]]:
+        """role_id → códigos de transacción directos, en una sola consulta."""
+        result = await self.session.execute(
+            select(RolTransaccion.rol_id, Transaccion.codigo)
+            .join(Transaccion, RolTransaccion.transaccion_id == Transaccion.id)
+            .where(
+                RolTransaccion.eliminado == False,
+                Transaccion.activa == True,
+            )
+        )
+        mapa: Dict[str, Set[str]] = defaultdict(set)
+        for rol_id, codigo in result.all():
+            mapa[str(rol_id)].add(str(codigo))
+        return mapa
+
 
 class SQLFunctionalityRepository:
     """Resuelve funcionalidades y transacciones por la cadena funcionalidad."""
@@ -117,3 +133,29 @@ class SQLFunctionalityRepository:
             )
         )
         return {str(row[0]) for row in result.all()}
+
+    async def get_all_role_functionalities(self) -> Dict[str, Set[str]]:
+        """role_id → funcionalidad_ids, en una sola consulta."""
+        result = await self.session.execute(
+            select(RolFuncionalidad.rol_id, RolFuncionalidad.funcionalidad_id)
+            .where(RolFuncionalidad.eliminado == False)
+        )
+        mapa: Dict[str, Set[str]] = defaultdict(set)
+        for rol_id, funcionalidad_id in result.all():
+            mapa[str(rol_id)].add(str(funcionalidad_id))
+        return mapa
+
+    async def get_all_functionality_transactions(self) -> Dict[str, Set[str]]:
+        """funcionalidad_id → códigos de transacción, en una sola consulta."""
+        result = await self.session.execute(
+            select(FuncionalidadTransaccion.funcionalidad_id, Transaccion.codigo)
+            .join(Transaccion, FuncionalidadTransaccion.transaccion_id == Transaccion.id)
+            .where(
+                FuncionalidadTransaccion.eliminado == False,
+                Transaccion.activa == True,
+            )
+        )
+        mapa: Dict[str, Set[str]] = defaultdict(set)
+        for funcionalidad_id, codigo in result.all():
+            mapa[str(funcionalidad_id)].add(str(codigo))
+        return mapa
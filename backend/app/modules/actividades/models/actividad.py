@@ -38,9 +38,9 @@ class TipoActividad(InmutableMixin, BaseModel):
         comment="Vincula con el TipoReunion de secretaría que crea instancias de este tipo"
     )
 
-    actividades = relationship('Actividad', back_populates='tipo_actividad', lazy='selectin')
+    actividades = relationship('Actividad', back_populates='tipo_actividad', lazy='select')
     cuenta_contable_default = relationship(
-        'CuentaContable', foreign_keys=[cuenta_contable_default_id], lazy='selectin',
+        'CuentaContable', foreign_keys=[cuenta_contable_default_id], lazy='select',
     )
 
     def __repr__(self) -> str:
@@ -156,29 +156,29 @@ class Actividad(BaseModel):
     asistencia_real: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
     # Relaciones
-    tipo_actividad = relationship('TipoActividad', back_populates='actividades', lazy='selectin')
-    estado = relationship('EstadoAccion', foreign_keys=[estado_id], lazy='selectin')
-    aprobado_por = relationship('Usuario', foreign_keys=[aprobado_por_id], lazy='selectin')
-    campania = relationship('Campania', foreign_keys=[campania_id], back_populates='actividades', lazy='selectin')
-    grupo = relationship('GrupoTrabajo', foreign_keys=[grupo_id], lazy='selectin')
-    responsable = relationship('Contacto', foreign_keys=[responsable_id], lazy='selectin')
+    tipo_actividad = relationship('TipoActividad', back_populates='actividades', lazy='select')
+    estado = relationship('EstadoAccion', foreign_keys=[estado_id], lazy='select')
+    aprobado_por = relationship('Usuario', foreign_keys=[aprobado_por_id], lazy='select')
+    campania = relationship('Campania', foreign_keys=[campania_id], back_populates='actividades', lazy='select')
+    grupo = relationship('GrupoTrabajo', foreign_keys=[grupo_id], lazy='select')
+    responsable = relationship('Contacto', foreign_keys=[responsable_id], lazy='select')
     padre = relationship(
         'Actividad', remote_side='Actividad.id',
-        foreign_keys=[padre_id], lazy='selectin',
+        foreign_keys=[padre_id], lazy='select',
     )
     hijos = relationship(
         'Actividad', back_populates='padre',
-        foreign_keys=[padre_id], lazy='selectin',
+        foreign_keys=[padre_id], lazy='select',
     )
     tareas = relationship(
         'Tarea', back_populates='actividad',
-        foreign_keys='Tarea.actividad_id', lazy='selectin',
+        foreign_keys='Tarea.actividad_id', lazy='select',
     )
-    asistencias = relationship('AsistenciaActividad', back_populates='actividad', lazy='selectin')
-    metas = relationship('MetaActividad', back_populates='actividad', lazy='selectin', cascade='all, delete-orphan')
-    partidas = relationship('PartidaPresupuestoActividad', back_populates='actividad', lazy='selectin', cascade='all, delete-orphan')
-    registros_trabajo = relationship('RegistroTrabajoActividad', back_populates='actividad', lazy='selectin', cascade='all, delete-orphan')
-    documentos = relationship('DocumentoActividad', back_populates='actividad', lazy='selectin', cascade='all, delete-orphan')
+    asistencias = relationship('AsistenciaActividad', back_populates='actividad', lazy='select')
+    metas = relationship('MetaActividad', back_populates='actividad', lazy='select', cascade='all, delete-orphan')
+    partidas = relationship('PartidaPresupuestoActividad', back_populates='actividad', lazy='select', cascade='all, delete-orphan')
+    registros_trabajo = relationship('RegistroTrabajoActividad', back_populates='actividad', lazy='select', cascade='all, delete-orphan')
+    documentos = relationship('DocumentoActividad', back_populates='actividad', lazy='select', cascade='all, delete-orphan')
 
     def __repr__(self) -> str:
         return f"<Actividad(nombre='{self.nombre}')>"
@@ -214,10 +214,10 @@ class AsistenciaActividad(BaseModel):
         Numeric(6, 2), default=Decimal('0.00'), nullable=False
     )
 
-    actividad = relationship('Actividad', back_populates='asistencias', lazy='selectin')
+    actividad = relationship('Actividad', back_populates='asistencias', lazy='select')
     participacion = relationship(
         'Participacion', back_populates='asistencia_actividad',
-        foreign_keys=[participacion_id], lazy='selectin'
+        foreign_keys=[participacion_id], lazy='select'
     )
 
     def __repr__(self) -> str:
@@ -236,8 +236,8 @@ class PartidaPresupuestoActividad(BaseModel):
     tipo_partida: Mapped[str] = mapped_column(String(10), nullable=False, default='gasto')  # 'gasto' | 'ingreso'
     orden: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
-    actividad = relationship('Actividad', back_populates='partidas', lazy='selectin')
-    documentos = relationship('DocumentoPartida', back_populates='partida_actividad', lazy='selectin', cascade='all, delete-orphan', foreign_keys='DocumentoPartida.partida_actividad_id')
+    actividad = relationship('Actividad', back_populates='partidas', lazy='select')
+    documentos = relationship('DocumentoPartida', back_populates='partida_actividad', lazy='select', cascade='all, delete-orphan', foreign_keys='DocumentoPartida.partida_actividad_id')
 
     def __repr__(self) -> str:
         return f"<PartidaPresupuestoActividad(concepto='{self.concepto}', importe={self.importe_estimado})>"
@@ -256,8 +256,8 @@ class RegistroTrabajoActividad(BaseModel):
     tipo: Mapped[str] = mapped_column(String(20), nullable=False, default='presencia')  # presencia|teletrabajo|coordinacion|otro
     creado_en: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
-    actividad = relationship('Actividad', back_populates='registros_trabajo', lazy='selectin')
-    miembro = relationship('Contacto', foreign_keys=[miembro_id], lazy='selectin')
+    actividad = relationship('Actividad', back_populates='registros_trabajo', lazy='select')
+    miembro = relationship('Contacto', foreign_keys=[miembro_id], lazy='select')
 
     def __repr__(self) -> str:
         return f"<RegistroTrabajoActividad(miembro_id='{self.miembro_id}', horas={self.horas})>"
@@ -278,8 +278,8 @@ class DocumentoActividad(BaseModel):
     subido_por_id: Mapped[Optional[uuid.UUID]] = mapped_column(Uuid, ForeignKey('usuarios.id', ondelete='SET NULL'), nullable=True)
     creado_en: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
-    actividad = relationship('Actividad', back_populates='documentos', lazy='selectin')
-    subido_por = relationship('Usuario', foreign_keys=[subido_por_id], lazy='selectin')
+    actividad = relationship('Actividad', back_populates='documentos', lazy='select')
+    subido_por = relationship('Usuario', foreign_keys=[subido_por_id], lazy='select')
 
     def __repr__(self) -> str:
         return f"<DocumentoActividad(nombre='{self.nombre}', tipo='{self.tipo_doc}')>"
@@ -301,5 +301,5 @@ class DocumentoPartida(BaseModel):
     subido_por_id: Mapped[Optional[uuid.UUID]] = mapped_column(Uuid, ForeignKey('usuarios.id', ondelete='SET NULL'), nullable=True)
     creado_en: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
-    partida_actividad = relationship('PartidaPresupuestoActividad', back_populates='documentos', foreign_keys=[partida_actividad_id], lazy='selectin')
-    subido_por = relationship('Usuario', foreign_keys=[subido_por_id], lazy='selectin')
+    partida_actividad = relationship('PartidaPresupuestoActividad', back_populates='documentos', foreign_keys=[partida_actividad_id], lazy='select')
+    subido_por = relationship('Usuario', foreign_keys=[subido_por_id], lazy='select')
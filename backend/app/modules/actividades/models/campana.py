@@ -20,8 +20,8 @@ class TipoCampania(InmutableMixin, BaseModel):
     descripcion: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
-    campanias = relationship('Campania', back_populates='tipo_campania', lazy='selectin')
-    plantilla = relationship('PlantillaCampania', back_populates='tipo_campania', uselist=False, lazy='selectin')
+    campanias = relationship('Campania', back_populates='tipo_campania', lazy='select')
+    plantilla = relationship('PlantillaCampania', back_populates='tipo_campania', uselist=False, lazy='select')
 
     def __repr__(self) -> str:
         return f"<TipoCampania(nombre='{self.nombre}')>"
@@ -39,8 +39,8 @@ class TipoMeta(InmutableMixin, BaseModel):
     unidad_medida: Mapped[str] = mapped_column(String(30), nullable=False)  # "€", "personas", "firmas", "visitas"…
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
-    metas = relationship('MetaCampania', back_populates='tipo_meta', lazy='selectin')
-    plantilla_metas = relationship('PlantillaMeta', back_populates='tipo_meta', lazy='selectin')
+    metas = relationship('MetaCampania', back_populates='tipo_meta', lazy='select')
+    plantilla_metas = relationship('PlantillaMeta', back_populates='tipo_meta', lazy='select')
 
     def __repr__(self) -> str:
         return f"<TipoMeta(nombre='{self.nombre}', unidad='{self.unidad_medida}')>"
@@ -55,7 +55,7 @@ class TipoCanalDifusion(InmutableMixin, BaseModel):
     descripcion: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
-    canales_campania = relationship('CanalDifusionCampania', back_populates='canal', lazy='selectin')
+    canales_campania = relationship('CanalDifusionCampania', back_populates='canal', lazy='select')
 
     def __repr__(self) -> str:
         return f"<TipoCanalDifusion(nombre='{self.nombre}')>"
@@ -75,8 +75,8 @@ class MetaCampania(BaseModel):
     notas: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     orden: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
-    campania = relationship('Campania', back_populates='metas', lazy='selectin')
-    tipo_meta = relationship('TipoMeta', back_populates='metas', lazy='selectin')
+    campania = relationship('Campania', back_populates='metas', lazy='select')
+    tipo_meta = relationship('TipoMeta', back_populates='metas', lazy='select')
 
     def __repr__(self) -> str:
         return f"<MetaCampania(tipo='{self.tipo_meta_id}', plan={self.valor_planificado})>"
@@ -97,8 +97,8 @@ class MetaActividad(BaseModel):
     notas: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     orden: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
-    actividad = relationship('Actividad', back_populates='metas', lazy='selectin')
-    tipo_meta = relationship('TipoMeta', lazy='selectin')
+    actividad = relationship('Actividad', back_populates='metas', lazy='select')
+    tipo_meta = relationship('TipoMeta', lazy='select')
 
     def __repr__(self) -> str:
         return f"<MetaActividad(tipo='{self.tipo_meta_id}', plan={self.valor_planificado})>"
@@ -113,8 +113,8 @@ class CanalDifusionCampania(BaseModel):
     canal_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey('tipos_canal_difusion.id'), nullable=False, index=True)
     notas: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
-    campania = relationship('Campania', back_populates='canales', lazy='selectin')
-    canal = relationship('TipoCanalDifusion', back_populates='canales_campania', lazy='selectin')
+    campania = relationship('Campania', back_populates='canales', lazy='select')
+    canal = relationship('TipoCanalDifusion', back_populates='canales_campania', lazy='select')
 
     def __repr__(self) -> str:
         return f"<CanalDifusionCampania(campania='{self.campania_id}', canal='{self.canal_id}')>"
@@ -132,7 +132,7 @@ class PartidaPresupuestoCampania(BaseModel):
     tipo_partida: Mapped[str] = mapped_column(String(20), default='gasto', nullable=False)  # 'gasto' | 'ingreso'
     orden: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
-    campania = relationship('Campania', back_populates='partidas_presupuesto', lazy='selectin')
+    campania = relationship('Campania', back_populates='partidas_presupuesto', lazy='select')
 
     def __repr__(self) -> str:
         return f"<PartidaPresupuestoCampania(concepto='{self.concepto}', tipo='{self.tipo_partida}')>"
@@ -152,10 +152,10 @@ class PlantillaCampania(BaseModel):
     descripcion: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
-    tipo_campania = relationship('TipoCampania', back_populates='plantilla', lazy='selectin')
-    metas = relationship('PlantillaMeta', back_populates='plantilla', cascade='all, delete-orphan', lazy='selectin')
-    partidas = relationship('PlantillaPartida', back_populates='plantilla', cascade='all, delete-orphan', lazy='selectin')
-    actividades = relationship('PlantillaActividad', back_populates='plantilla', cascade='all, delete-orphan', lazy='selectin')
+    tipo_campania = relationship('TipoCampania', back_populates='plantilla', lazy='select')
+    metas = relationship('PlantillaMeta', back_populates='plantilla', cascade='all, delete-orphan', lazy='select')
+    partidas = relationship('PlantillaPartida', back_populates='plantilla', cascade='all, delete-orphan', lazy='select')
+    actividades = relationship('PlantillaActividad', back_populates='plantilla', cascade='all, delete-orphan', lazy='select')
 
     def __repr__(self) -> str:
         return f"<PlantillaCampania(nombre='{self.nombre}')>"
@@ -172,8 +172,8 @@ class PlantillaMeta(BaseModel):
     notas: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     orden: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
-    plantilla = relationship('PlantillaCampania', back_populates='metas', lazy='selectin')
-    tipo_meta = relationship('TipoMeta', back_populates='plantilla_metas', lazy='selectin')
+    plantilla = relationship('PlantillaCampania', back_populates='metas', lazy='select')
+    tipo_meta = relationship('TipoMeta', back_populates='plantilla_metas', lazy='select')
 
     def __repr__(self) -> str:
         return f"<PlantillaMeta(tipo='{self.tipo_meta_id}', sugerido={self.valor_sugerido})>"
@@ -190,7 +190,7 @@ class PlantillaPartida(BaseModel):
     tipo_partida: Mapped[str] = mapped_column(String(20), default='gasto', nullable=False)  # 'gasto' | 'ingreso'
     orden: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
-    plantilla = relationship('PlantillaCampania', back_populates='partidas', lazy='selectin')
+    plantilla = relationship('PlantillaCampania', back_populates='partidas', lazy='select')
 
     def __repr__(self) -> str:
         return f"<PlantillaPartida(concepto='{self.concepto}')>"
@@ -208,9 +208,9 @@ class PlantillaActividad(BaseModel):
     duracion_dias: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # offset relativo al inicio
     orden: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
-    plantilla = relationship('PlantillaCampania', back_populates='actividades', lazy='selectin')
-    tipo_actividad = relationship('TipoActividad', lazy='selectin')
-    tareas = relationship('PlantillaTarea', back_populates='actividad', cascade='all, delete-orphan', lazy='selectin')
+    plantilla = relationship('PlantillaCampania', back_populates='actividades', lazy='select')
+    tipo_actividad = relationship('TipoActividad', lazy='select')
+    tareas = relationship('PlantillaTarea', back_populates='actividad', cascade='all, delete-orphan', lazy='select')
 
     def __repr__(self) -> str:
         return f"<PlantillaActividad(nombre='{self.nombre}')>"
@@ -229,9 +229,9 @@ class PlantillaTarea(BaseModel):
     habilidad_id: Mapped[Optional[uuid.UUID]] = mapped_column(Uuid, ForeignKey('habilidades.id', ondelete='SET NULL'), nullable=True, index=True)
     nivel_habilidad_id: Mapped[Optional[uuid.UUID]] = mapped_column(Uuid, ForeignKey('niveles_habilidad.id', ondelete='SET NULL'), nullable=True, index=True)
 
-    actividad = relationship('PlantillaActividad', back_populates='tareas', lazy='selectin')
-    habilidad = relationship('Habilidad', lazy='selectin', foreign_keys=[habilidad_id])
-    nivel_habilidad = relationship('NivelHabilidad', lazy='selectin', foreign_keys=[nivel_habilidad_id])
+    actividad = relationship('PlantillaActividad', back_populates='tareas', lazy='select')
+    habilidad = relationship('Habilidad', lazy='select', foreign_keys=[habilidad_id])
+    nivel_habilidad = relationship('NivelHabilidad', lazy='select', foreign_keys=[nivel_habilidad_id])
 
     def __repr__(self) -> str:
         return f"<PlantillaTarea(titulo='{self.titulo}')>"
@@ -293,18 +293,18 @@ class Campania(BaseModel):
     anio_edicion: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
     # Relaciones
-    tipo_campania = relationship('TipoCampania', back_populates='campanias', lazy='selectin')
-    estado = relationship('EstadoCampania', foreign_keys=[estado_id], lazy='selectin')
-    agrupacion = relationship('UnidadOrganizativa', lazy='selectin')
-    responsable = relationship('Contacto', foreign_keys=[responsable_id], lazy='selectin')
-    aprobado_por = relationship('Usuario', foreign_keys=[aprobado_por_id], lazy='selectin')
-    padre = relationship('Campania', remote_side='Campania.id', foreign_keys=[padre_id], lazy='selectin')
-    ediciones = relationship('Campania', back_populates='padre', foreign_keys=[padre_id], lazy='selectin')
-    actividades = relationship('Actividad', back_populates='campania', foreign_keys='Actividad.campania_id', lazy='selectin')
-    firmas = relationship('FirmaCampania', back_populates='campania', lazy='selectin')
-    metas = relationship('MetaCampania', back_populates='campania', cascade='all, delete-orphan', lazy='selectin')
-    canales = relationship('CanalDifusionCampania', back_populates='campania', cascade='all, delete-orphan', lazy='selectin')
-    partidas_presupuesto = relationship('PartidaPresupuestoCampania', back_populates='campania', cascade='all, delete-orphan', lazy='selectin')
+    tipo_campania = relationship('TipoCampania', back_populates='campanias', lazy='select')
+    estado = relationship('EstadoCampania', foreign_keys=[estado_id], lazy='select')
+    agrupacion = relationship('UnidadOrganizativa', lazy='select')
+    responsable = relationship('Contacto', foreign_keys=[responsable_id], lazy='select')
+    aprobado_por = relationship('Usuario', foreign_keys=[aprobado_por_id], lazy='select')
+    padre = relationship('Campania', remote_side='Campania.id', foreign_keys=[padre_id], lazy='select')
+    ediciones = relationship('Campania', back_populates='padre', foreign_keys=[padre_id], lazy='select')
+    actividades = relationship('Actividad', back_populates='campania', foreign_keys='Actividad.campania_id', lazy='select')
+    firmas = relationship('FirmaCampania', back_populates='campania', lazy='select')
+    metas = relationship('MetaCampania', back_populates='campania', cascade='all, delete-orphan', lazy='select')
+    canales = relationship('CanalDifusionCampania', back_populates='campania', cascade='all, delete-orphan', lazy='select')
+    partidas_presupuesto = relationship('PartidaPresupuestoCampania', back_populates='campania', cascade='all, delete-orphan', lazy='select')
 
     # Códigos de estado que indican que la campaña no admite nuevos gastos/ingresos.
     # Convención: el código del estado (estable, no traducible) es la API que consume
@@ -348,10 +348,10 @@ class FirmaCampania(BaseModel):
     fecha_verificacion: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     ip_origen: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
 
-    actividad = relationship('Actividad', foreign_keys=[actividad_id], lazy='selectin')
-    campania = relationship('Campania', back_populates='firmas', lazy='selectin')
-    contacto = relationship('Contacto', back_populates='firmas_campania', foreign_keys=[contacto_id], lazy='selectin')
-    participacion = relationship('Participacion', back_populates='firma_campania', foreign_keys=[participacion_id], lazy='selectin')
+    actividad = relationship('Actividad', foreign_keys=[actividad_id], lazy='select')
+    campania = relationship('Campania', back_populates='firmas', lazy='select')
+    contacto = relationship('Contacto', back_populates='firmas_campania', foreign_keys=[contacto_id], lazy='select')
+    participacion = relationship('Participacion', back_populates='firma_campania', foreign_keys=[participacion_id], lazy='select')
 
     def __repr__(self) -> str:
         return f"<FirmaCampania(campania_id='{self.campania_id}', fecha='{self.fecha_firma}')>"
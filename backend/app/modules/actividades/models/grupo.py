@@ -37,7 +37,7 @@ class TipoGrupo(InmutableMixin, BaseModel):
     )
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
-    grupos = relationship('GrupoTrabajo', back_populates='tipo_grupo', lazy='selectin')
+    grupos = relationship('GrupoTrabajo', back_populates='tipo_grupo', lazy='select')
 
     def __repr__(self) -> str:
         return f"<TipoGrupo(nombre='{self.nombre}')>"
@@ -56,7 +56,7 @@ class RolGrupo(BaseModel):
     puede_aprobar_gastos: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
-    miembros_grupo = relationship('MiembroGrupo', back_populates='rol_grupo', lazy='selectin')
+    miembros_grupo = relationship('MiembroGrupo', back_populates='rol_grupo', lazy='select')
 
     def __repr__(self) -> str:
         return f"<RolGrupo(nombre='{self.nombre}')>"
@@ -96,13 +96,13 @@ class GrupoTrabajo(BaseModel):
         Uuid, ForeignKey('unidades_organizativas.id'), nullable=True, index=True
     )
 
-    tipo_grupo = relationship('TipoGrupo', back_populates='grupos', lazy='selectin')
-    coordinador = relationship('Contacto', foreign_keys=[coordinador_id], lazy='selectin')
-    actividad = relationship('Actividad', foreign_keys=[actividad_id], lazy='selectin')
-    agrupacion = relationship('UnidadOrganizativa', lazy='selectin')
-    miembros = relationship('MiembroGrupo', back_populates='grupo', lazy='selectin')
-    tareas = relationship('Tarea', back_populates='grupo', foreign_keys='Tarea.grupo_id', lazy='selectin')
-    reuniones = relationship('ReunionGrupo', back_populates='grupo', lazy='selectin')
+    tipo_grupo = relationship('TipoGrupo', back_populates='grupos', lazy='select')
+    coordinador = relationship('Contacto', foreign_keys=[coordinador_id], lazy='select')
+    actividad = relationship('Actividad', foreign_keys=[actividad_id], lazy='select')
+    agrupacion = relationship('UnidadOrganizativa', lazy='select')
+    miembros = relationship('MiembroGrupo', back_populates='grupo', lazy='select')
+    tareas = relationship('Tarea', back_populates='grupo', foreign_keys='Tarea.grupo_id', lazy='select')
+    reuniones = relationship('ReunionGrupo', back_populates='grupo', lazy='select')
 
     def __repr__(self) -> str:
         return f"<GrupoTrabajo(nombre='{self.nombre}')>"
@@ -132,9 +132,9 @@ class MiembroGrupo(BaseModel):
     responsabilidades: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
-    grupo = relationship('GrupoTrabajo', back_populates='miembros', lazy='selectin')
-    rol_grupo = relationship('RolGrupo', back_populates='miembros_grupo', lazy='selectin')
-    miembro: Mapped['Contacto'] = relationship('Contacto', foreign_keys=[miembro_id], lazy='selectin')
+    grupo = relationship('GrupoTrabajo', back_populates='miembros', lazy='select')
+    rol_grupo = relationship('RolGrupo', back_populates='miembros_grupo', lazy='select')
+    miembro: Mapped['Contacto'] = relationship('Contacto', foreign_keys=[miembro_id], lazy='select')
 
     def __repr__(self) -> str:
         return f"<MiembroGrupo(miembro_id='{self.miembro_id}', grupo_id='{self.grupo_id}')>"
@@ -149,7 +149,7 @@ class GrupoIniciativa(BaseModel):
     campania_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey('campanias.id'), nullable=False, index=True)
     rol: Mapped[str] = mapped_column(String(50), nullable=False, default='colaborador')
 
-    grupo = relationship('GrupoTrabajo', foreign_keys=[grupo_id], lazy='selectin')
+    grupo = relationship('GrupoTrabajo', foreign_keys=[grupo_id], lazy='select')
 
     def __repr__(self) -> str:
         return f"<GrupoIniciativa(grupo_id='{self.grupo_id}', campania_id='{self.campania_id}')>"
@@ -169,8 +169,8 @@ class RequisitoRecurso(BaseModel):
     horas_necesarias: Mapped[Decimal] = mapped_column(Numeric(8, 2), nullable=False)
     descripcion: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
-    grupo = relationship('GrupoTrabajo', foreign_keys=[grupo_id], lazy='selectin')
-    aportaciones = relationship('AportacionHoras', back_populates='requisito', lazy='selectin')
+    grupo = relationship('GrupoTrabajo', foreign_keys=[grupo_id], lazy='select')
+    aportaciones = relationship('AportacionHoras', back_populates='requisito', lazy='select')
 
     @property
     def horas_cubiertas(self) -> Decimal:
@@ -205,8 +205,8 @@ class AportacionHoras(BaseModel):
     fecha_compromiso: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
-    requisito = relationship('RequisitoRecurso', back_populates='aportaciones', lazy='selectin')
-    miembro = relationship('Contacto', foreign_keys=[miembro_id], lazy='selectin')
+    requisito = relationship('RequisitoRecurso', back_populates='aportaciones', lazy='select')
+    miembro = relationship('Contacto', foreign_keys=[miembro_id], lazy='select')
 
     def __repr__(self) -> str:
         return f"<AportacionHoras(miembro_id='{self.miembro_id}', horas={self.horas_comprometidas})>"
@@ -233,8 +233,8 @@ class ReunionGrupo(BaseModel):
     acta: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     realizada: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
-    grupo = relationship('GrupoTrabajo', back_populates='reuniones', lazy='selectin')
-    asistentes = relationship('AsistenteReunion', back_populates='reunion', lazy='selectin')
+    grupo = relationship('GrupoTrabajo', back_populates='reuniones', lazy='select')
+    asistentes = relationship('AsistenteReunion', back_populates='reunion', lazy='select')
 
     def __repr__(self) -> str:
         return f"<ReunionGrupo(titulo='{self.titulo}', fecha='{self.fecha}')>"
@@ -252,7 +252,7 @@ class AsistenteReunion(BaseModel):
     asistio: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True)
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
-    reunion = relationship('ReunionGrupo', back_populates='asistentes', lazy='selectin')
+    reunion = relationship('ReunionGrupo', back_populates='asistentes', lazy='select')
 
     def __repr__(self) -> str:
         return f"<AsistenteReunion(miembro_id='{self.miembro_id}', reunion_id='{self.reunion_id}')>"
@@ -48,12 +48,12 @@ class Tarea(BaseModel):
         Uuid, ForeignKey('grupos_trabajo.id'), nullable=True, index=True
     )
 
-    estado = relationship('EstadoTarea', foreign_keys=[estado_id], lazy='selectin')
-    responsable = relationship('Contacto', foreign_keys=[responsable_id], lazy='selectin')
-    habilidad = relationship('Habilidad', foreign_keys=[habilidad_id], lazy='selectin')
-    nivel_habilidad = relationship('NivelHabilidad', foreign_keys=[nivel_habilidad_id], lazy='selectin')
-    actividad = relationship('Actividad', back_populates='tareas', foreign_keys=[actividad_id], lazy='selectin')
-    grupo = relationship('GrupoTrabajo', foreign_keys=[grupo_id], lazy='selectin')
+    estado = relationship('EstadoTarea', foreign_keys=[estado_id], lazy='select')
+    responsable = relationship('Contacto', foreign_keys=[responsable_id], lazy='select')
+    habilidad = relationship('Habilidad', foreign_keys=[habilidad_id], lazy='select')
+    nivel_habilidad = relationship('NivelHabilidad', foreign_keys=[nivel_habilidad_id], lazy='select')
+    actividad = relationship('Actividad', back_populates='tareas', foreign_keys=[actividad_id], lazy='select')
+    grupo = relationship('GrupoTrabajo', foreign_keys=[grupo_id], lazy='select')
 
     def __repr__(self) -> str:
         return f"<Tarea(titulo='{self.titulo}')>"
@@ -335,6 +335,7 @@ class ActividadService:
         # El coordinador designado al crear el grupo ENTRA como miembro con rol de
         # coordinador (tratamiento único: coordinador = uno de los miembros). Evita
         # el doble tratamiento cabecera vs miembro y que se pueda añadir dos veces.
+        usuario_con_rol = None
         if coordinador_id:
             from ..models.grupo import RolGrupo, MiembroGrupo
             rol_coord = (await self.session.execute(
@@ -348,19 +349,18 @@ class ActividadService:
             # Y su usuario obtiene el rol de acceso "Coordinador de grupo de trabajo"
             # (mini-coordinador acotado a las actividades del grupo).
             from app.modules.acceso.services.ambito_territorial import ensure_rol_coordinador_grupo
-            await ensure_rol_coordinador_grupo(self.session, coordinador_id)
+            usuario_con_rol = await ensure_rol_coordinador_grupo(self.session, coordinador_id)
+
+        # Aviso de flujo: crear el canal de chat del grupo. Al outbox en la misma
+        # transacción; un fallo del canal se reintenta sin afectar al grupo.
+        from app.core.events import event_bus, GrupoTrabajoCreado
+        event_bus.enqueue(self.session, GrupoTrabajoCreado(
+            grupo_id=str(grupo.id), nombre=grupo.nombre,
+        ))
 
         await self.session.commit()
+        if usuario_con_rol:
+            from app.core.events import UserRolesChanged
+            await event_bus.publish(UserRolesChanged(usuario_id=str(usuario_con_rol)))
         await self.session.refresh(grupo)
-
-        # Aviso de flujo: crear el canal de chat del grupo. Tras commit, envuelto;
-        # un fallo de la creación del canal no afecta a la creación del grupo.
-        try:
-            from app.core.events import event_bus, GrupoTrabajoCreado
-            await event_bus.publish(GrupoTrabajoCreado(
-                grupo_id=str(grupo.id), nombre=grupo.nombre,
-            ))
-        except Exception:
-            pass
-
         return grupo
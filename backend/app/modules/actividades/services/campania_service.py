@@ -15,6 +15,8 @@ from typing import Optional
 from sqlalchemy import select, update as sa_update, delete as sa_delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.carga import cargar
+
 from ..models.campana import (
     Campania, MetaCampania, CanalDifusionCampania,
     PartidaPresupuestoCampania, PlantillaCampania, PlantillaMeta,
@@ -295,6 +297,7 @@ class CampaniaService:
 
         plantilla = (await self.session.execute(
             select(PlantillaCampania).where(PlantillaCampania.id == plantilla_id)
+            .options(*cargar(PlantillaCampania, "metas", "partidas", "actividades.tareas"))
         )).scalar_one()
         campania = await self._get(campania_id)
 
@@ -389,6 +392,7 @@ class CampaniaService:
 
         origen = (await self.session.execute(
             select(Campania).where(Campania.id == campania_id)
+            .options(*cargar(Campania, "metas", "partidas_presupuesto"))
         )).scalar_one()
 
         plantilla = PlantillaCampania(
@@ -450,7 +454,10 @@ class CampaniaService:
         from sqlalchemy import select
         from datetime import timedelta
 
-        origen = (await self.session.execute(select(Campania).where(Campania.id == campania_id))).scalar_one()
+        origen = (await self.session.execute(
+            select(Campania).where(Campania.id == campania_id)
+            .options(*cargar(Campania, "metas", "canales", "partidas_presupuesto"))
+        )).scalar_one()
         estado_inicial = (await self.session.execute(
             select(EstadoCampania).order_by(EstadoCampania.orden.asc().nulls_last()).limit(1)
         )).scalar_one_or_none()
@@ -23,6 +23,7 @@ import jwt
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.carga import cargar
 from app.core.config import get_settings
 from app.core.email_service import EmailService
 from app.modules.actividades.models.campana import Campania, FirmaCampania
@@ -245,9 +246,12 @@ class FirmaPublicaService:
     # decisión (A) en docs/REDISENO_FIRMAS_ACTIVIDAD.md.
     _ESTADOS_ACCION_NO_ACTIVOS = frozenset({"propuesta", "finalizada", "cancelada"})
 
+    # Relaciones que leen `_actividad_esta_activa` y `Campania.esta_cerrada`.
+    _CARGA_ACTIVIDAD = ("estado", "campania.estado")
+
     def _actividad_esta_activa(self, actividad) -> bool:
-        """True si la actividad está iniciada y no cerrada."""
-        estado = actividad.estado  # lazy='selectin'
+        """True si la actividad está iniciada y no cerrada (requiere `estado` cargado)."""
+        estado = actividad.estado
         nombre = (getattr(estado, "nombre", "") or "").strip().lower()
         return nombre not in self._ESTADOS_ACCION_NO_ACTIVOS
 
@@ -273,9 +277,10 @@ class FirmaPublicaService:
             )
             .order_by(Actividad.nombre)
             .distinct()
+            .options(*cargar(Actividad, *self._CARGA_ACTIVIDAD))
         )
         candidatas = (await self.session.scalars(stmt)).all()
-        # Estados (actividad y campaña) por relación selectin: filtramos en memoria.
+        # Estados (actividad y campaña) cargados con la consulta: filtramos en memoria.
         return [
             a
             for a in candidatas
@@ -287,7 +292,9 @@ class FirmaPublicaService:
         """Devuelve la Actividad si existe, es online y está activa; si no, None."""
         from app.modules.actividades.models.actividad import Actividad
 
-        actividad = await self.session.get(Actividad, actividad_id)
+        actividad = await self.session.get(
+            Actividad, actividad_id, options=cargar(Actividad, *self._CARGA_ACTIVIDAD),
+        )
         if actividad is None or actividad.eliminado or not actividad.es_online:
             return None
         if not self._actividad_esta_activa(actividad):
@@ -311,10 +318,10 @@ class FirmaPublicaService:
 
     # --------------------------------------------------------------- helpers
     async def _campania_abierta(self, campania_id: uuid.UUID) -> Optional[Campania]:
-        campania = await self.session.get(Campania, campania_id)
+        campania = await self.session.get(Campania, campania_id, options=cargar(Campania, "estado"))
         if campania is None or campania.eliminado:
             return None
-        estado = campania.estado  # lazy='selectin'
+        estado = campania.estado
         if estado is not None and estado.codigo in Campania.CODIGOS_ESTADO_CERRADO:
             return None
         return campania
@@ -334,8 +341,8 @@ class FirmaPublicaService:
         """Crea o actualiza el Contacto (persona física) que firma.
 
         Desduplicación por identidad:
-        - **Con NIF (DNI/NIE)**: clave fuerte → se busca por `numero_documento`
-          normalizado. Una misma persona no se duplica aunque firme con emails
+        - **Con NIF (DNI/NIE)**: clave fuerte → se busca por el índice ciego de
+          `numero_documento` (vale aunque el NIF esté cifrado en BD). Una misma persona no se duplica aunque firme con emails
           distintos, y si ya existe (p. ej. socio) se reutiliza.
         - **Sin NIF (extranjero)**: clave blanda por **nombre+apellidos
           normalizados**; si no hay coincidencia clara, NO se fusiona (se crea
@@ -351,7 +358,7 @@ class FirmaPublicaService:
         if nif:
             existente = await self.session.scalar(
                 select(Contacto).where(
-                    Contacto.numero_documento == nif,
+                    Contacto.con_documento(nif),
                     Contacto.tipo == "PERSONA_FISICA",
                     Contacto.eliminado.is_(False),
                 )
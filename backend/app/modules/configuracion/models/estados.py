@@ -185,7 +185,7 @@ class HistorialEstado(BaseModel):
     usuario_id: Mapped[Optional[uuid.UUID]] = mapped_column(Uuid, ForeignKey('usuarios.id'), nullable=True)
 
     # Relación con usuario que realizó el cambio
-    usuario = relationship('Usuario', foreign_keys=[usuario_id], lazy='selectin')
+    usuario = relationship('Usuario', foreign_keys=[usuario_id], lazy='select')
 
     def __repr__(self) -> str:
         return (f"<HistorialEstado(entidad='{self.entidad_tipo}:{self.entidad_id}', "
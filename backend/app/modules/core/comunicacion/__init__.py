@@ -1,10 +1,14 @@
 """Modelos de comunicación y notificaciones."""
 
-from .notificacion import TipoNotificacion, Notificacion, PreferenciaNotificacion
+from .notificacion import (
+    TipoNotificacion, Notificacion, PreferenciaNotificacion, ContadorNotificaciones,
+)
 from .plantilla_email import PlantillaEmail
+from .trabajo_envio import TrabajoEnvioMasivo
 from .mensajeria import CanalChat, OrigenCanal, EstadoSync, MensajeEnviado
 
 __all__ = [
-    'TipoNotificacion', 'Notificacion', 'PreferenciaNotificacion', 'PlantillaEmail',
+    'TipoNotificacion', 'Notificacion', 'PreferenciaNotificacion', 'ContadorNotificaciones',
+    'PlantillaEmail', 'TrabajoEnvioMasivo',
     'CanalChat', 'OrigenCanal', 'EstadoSync', 'MensajeEnviado',
 ]
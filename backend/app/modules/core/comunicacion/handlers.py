@@ -6,8 +6,9 @@ por permiso/cargo/miembro). Mantienen los módulos de negocio desacoplados del d
 comunicación: el emisor solo publica un evento; aquí se decide a quién y cómo.
 
 Cada handler abre su propia sesión (los eventos se procesan fuera de la
-transacción de negocio) y nunca propaga excepciones: un fallo de aviso no debe
-afectar a la operación que lo originó (el event_bus ya captura, pero reforzamos).
+transacción de negocio). Un fallo se registra y se propaga al event bus: la
+operación que lo originó ya está confirmada y no se ve afectada, y el relay del
+outbox reintenta el aviso con backoff.
 
 Registro: llamar `wire_comunicacion_handlers(async_session)` una vez en el
 lifespan de FastAPI, junto a `wire_matrix_invalidation`.
@@ -65,6 +66,7 @@ def wire_comunicacion_handlers(session_factory: Callable) -> None:
                 )
         except Exception:
             logger.exception("Fallo emitiendo aviso de tipo %s", tipo_codigo)
+            raise  # el outbox lo reintentará
 
     # ── Secretaría ────────────────────────────────────────────────────────
 
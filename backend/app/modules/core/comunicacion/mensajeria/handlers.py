@@ -52,6 +52,7 @@ def wire_chat_handlers(session_factory: Callable) -> None:
                 await bridge.sincronizar_membresia_grupo(gid)
         except Exception:
             logger.exception("Fallo creando el canal de chat del grupo %s", ev.grupo_id)
+            raise  # el outbox lo reintentará
 
     event_bus.subscribe(GrupoTrabajoCreado, _on_grupo_creado)
     logger.info("Chat: handlers de eventos suscritos al event bus.")
@@ -7,7 +7,7 @@ from typing import Optional
 from sqlalchemy import String, Integer, Boolean, Text, DateTime, Uuid, ForeignKey, JSON, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from ....infrastructure.base_model import BaseModel
+from ....infrastructure.base_model import Base, BaseModel
 
 
 class TipoNotificacion(BaseModel):
@@ -41,8 +41,8 @@ class TipoNotificacion(BaseModel):
     color: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
 
     # Relaciones
-    notificaciones = relationship('Notificacion', back_populates='tipo', lazy='selectin')
-    preferencias = relationship('PreferenciaNotificacion', back_populates='tipo', lazy='selectin')
+    notificaciones = relationship('Notificacion', back_populates='tipo', lazy='select')
+    preferencias = relationship('PreferenciaNotificacion', back_populates='tipo', lazy='select')
 
     def __repr__(self) -> str:
         return f"<TipoNotificacion(codigo='{self.codigo}', nombre='{self.nombre}')>"
@@ -89,9 +89,9 @@ class Notificacion(BaseModel):
     entidad_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True, index=True)  # ID de entidad relacionada
 
     # Relaciones
-    tipo = relationship('TipoNotificacion', back_populates='notificaciones', lazy='selectin')
-    usuario = relationship('Usuario', foreign_keys=[usuario_id], lazy='selectin')
-    estado = relationship('EstadoNotificacion', foreign_keys=[estado_id], lazy='selectin')
+    tipo = relationship('TipoNotificacion', back_populates='notificaciones', lazy='select')
+    usuario = relationship('Usuario', foreign_keys=[usuario_id], lazy='select')
+    estado = relationship('EstadoNotificacion', foreign_keys=[estado_id], lazy='select')
 
     def __repr__(self) -> str:
         return f"<Notificacion(titulo='{self.titulo}', usuario_id='{self.usuario_id}', estado_id='{self.estado_id}')>"
@@ -113,6 +113,24 @@ class Notificacion(BaseModel):
         return False
 
 
+class ContadorNotificaciones(Base):
+    """Notificaciones no leídas (ni archivadas ni eliminadas) de un usuario.
+
+    Tabla derivada: la mantiene un trigger sobre `notificaciones` (migración
+    ntf1cnt2psh3), que además avisa por `pg_notify` para el push de los badges
+    (app/core/push_notificaciones.py). Sin auditoría ni soft-delete.
+    """
+    __tablename__ = 'contadores_notificaciones'
+
+    usuario_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid, ForeignKey('usuarios.id', ondelete='CASCADE'), primary_key=True
+    )
+    no_leidas: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<ContadorNotificaciones(usuario_id='{self.usuario_id}', no_leidas={self.no_leidas})>"
+
+
 class PreferenciaNotificacion(BaseModel):
     """Preferencias de notificación de usuarios."""
     __tablename__ = 'preferencias_notificacion'
@@ -134,8 +152,8 @@ class PreferenciaNotificacion(BaseModel):
     hora_preferida: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # 0-23
 
     # Relaciones
-    usuario = relationship('Usuario', foreign_keys=[usuario_id], lazy='selectin')
-    tipo = relationship('TipoNotificacion', back_populates='preferencias', lazy='selectin')
+    usuario = relationship('Usuario', foreign_keys=[usuario_id], lazy='select')
+    tipo = relationship('TipoNotificacion', back_populates='preferencias', lazy='select')
 
     def __repr__(self) -> str:
         return f"<PreferenciaNotificacion(usuario_id='{self.usuario_id}', tipo_id='{self.tipo_id}')>"
@@ -43,6 +43,7 @@ from typing import Iterable, Optional
 from sqlalchemy import select, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.carga import cargar
 from app.modules.acceso.models.usuario import Usuario, UsuarioRol
 from app.modules.acceso.models.cargo import CargoRol
 from app.modules.acceso.models.transaccion import Transaccion
@@ -310,6 +311,7 @@ class DestinatarioResolver:
                 Usuario.activo == True,        # noqa: E712
                 Usuario.eliminado == False,    # noqa: E712
             )
+            .options(*cargar(Usuario, "contacto"))
         )
         usuarios = result.scalars().all()
 
@@ -0,0 +1,58 @@
+"""Progreso persistido de los envíos masivos de correo en segundo plano.
+
+Lo escribe `app.core.email_service.lanzar_envio` y lo lee cualquier worker
+(`obtener_trabajo`), así el progreso no depende del proceso que atendió la
+petición.
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Optional
+
+from sqlalchemy import DateTime, Integer, String, Text, Uuid, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ....infrastructure.base_model import Base
+
+if TYPE_CHECKING:
+    from app.core.email_service import ResultadoEnvio
+
+# Estados de un trabajo de envío en segundo plano.
+EN_CURSO = "EN_CURSO"
+COMPLETADO = "COMPLETADO"
+ERROR = "ERROR"
+
+
+class TrabajoEnvioMasivo(Base):
+    """Progreso persistido de un envío en segundo plano (lo lee cualquier worker).
+
+    Hereda de Base (no de BaseModel): es un registro técnico, sin soft-delete ni
+    auditoría de usuario. `actualizado_en` hace de latido: si un trabajo EN_CURSO
+    deja de actualizarse es que el proceso que lo ejecutaba se detuvo.
+    """
+    __tablename__ = "trabajos_envio"
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True)
+    usuario_id: Mapped[Optional[uuid.UUID]] = mapped_column(Uuid, nullable=True)
+    estado: Mapped[str] = mapped_column(String(20), nullable=False, default=EN_CURSO,
+                                        server_default=EN_CURSO)
+    total: Mapped[int] = mapped_column(Integer, nullable=False)
+    enviados: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    fallidos: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    resultados: Mapped[list] = mapped_column(JSONB, nullable=False, default=list,
+                                             server_default=text("'[]'::jsonb"))
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    creado_en: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=func.now())
+    actualizado_en: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=func.now())
+    terminado_en: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    def resultados_envio(self) -> List["ResultadoEnvio"]:
+        from app.core.email_service import ResultadoEnvio
+        return [ResultadoEnvio(r["destinatario"], r["ok"], r.get("error"), r.get("etiqueta"))
+                for r in self.resultados or []]
+
+    def __repr__(self) -> str:
+        return f"<TrabajoEnvioMasivo(estado='{self.estado}', {self.enviados + self.fallidos}/{self.total})>"
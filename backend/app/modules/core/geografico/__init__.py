@@ -4,6 +4,7 @@ from .nivel_organizativo import AmbitoGeografico, NivelOrganizativo, NaturalezaU
 from .direccion import Pais, Provincia, Municipio, Direccion, UnidadOrganizativa
 from .entidad_geografica import EntidadGeografica
 from .unidad_organizativa_view import UnidadOrganizativaVista
+from .unidad_cierre import UnidadOrganizativaCierre
 
 __all__ = [
     'AmbitoGeografico',
@@ -15,5 +16,6 @@ __all__ = [
     'Municipio',
     'Direccion',
     'UnidadOrganizativa',
+    'UnidadOrganizativaCierre',
     'EntidadGeografica',
 ]
@@ -25,8 +25,8 @@ class Pais(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    provincias = relationship('Provincia', back_populates='pais', lazy='selectin')
-    direcciones = relationship('Direccion', back_populates='pais', lazy='selectin')
+    provincias = relationship('Provincia', back_populates='pais', lazy='select')
+    direcciones = relationship('Direccion', back_populates='pais', lazy='select')
 
     def __repr__(self) -> str:
         return f"<Pais(codigo='{self.codigo}', nombre='{self.nombre}')>"
@@ -47,9 +47,9 @@ class Provincia(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    pais = relationship('Pais', back_populates='provincias', lazy='selectin')
-    municipios = relationship('Municipio', back_populates='provincia', lazy='selectin')
-    direcciones = relationship('Direccion', back_populates='provincia', lazy='selectin')
+    pais = relationship('Pais', back_populates='provincias', lazy='select')
+    municipios = relationship('Municipio', back_populates='provincia', lazy='select')
+    direcciones = relationship('Direccion', back_populates='provincia', lazy='select')
 
     def __repr__(self) -> str:
         return f"<Provincia(codigo='{self.codigo}', nombre='{self.nombre}')>"
@@ -70,8 +70,8 @@ class Municipio(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    provincia = relationship('Provincia', back_populates='municipios', lazy='selectin')
-    direcciones = relationship('Direccion', back_populates='municipio', lazy='selectin')
+    provincia = relationship('Provincia', back_populates='municipios', lazy='select')
+    direcciones = relationship('Direccion', back_populates='municipio', lazy='select')
 
     def __repr__(self) -> str:
         return f"<Municipio(codigo='{self.codigo}', nombre='{self.nombre}')>"
@@ -112,9 +112,9 @@ class Direccion(BaseModel):
     fecha_validacion: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
 
     # Relaciones
-    pais = relationship('Pais', back_populates='direcciones', lazy='selectin')
-    provincia = relationship('Provincia', back_populates='direcciones', lazy='selectin')
-    municipio = relationship('Municipio', back_populates='direcciones', lazy='selectin')
+    pais = relationship('Pais', back_populates='direcciones', lazy='select')
+    provincia = relationship('Provincia', back_populates='direcciones', lazy='select')
+    municipio = relationship('Municipio', back_populates='direcciones', lazy='select')
 
     def __repr__(self) -> str:
         return f"<Direccion(via='{self.via_nombre}', cp='{self.codigo_postal}')>"
@@ -236,14 +236,14 @@ class UnidadOrganizativa(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    pais = relationship('Pais', lazy='selectin')
-    provincia = relationship('Provincia', lazy='selectin')
-    municipio = relationship('Municipio', lazy='selectin')
-    direccion = relationship('Direccion', lazy='selectin')
+    pais = relationship('Pais', lazy='select')
+    provincia = relationship('Provincia', lazy='select')
+    municipio = relationship('Municipio', lazy='select')
+    direccion = relationship('Direccion', lazy='select')
     # foreign_keys explícito: NivelOrganizativo.unidad_id crea una 2ª ruta de FK
     # entre ambas tablas; aquí la unión es por tipo_id (el tipo/nivel de la unidad).
     tipo_unidad: Mapped[Optional[NivelOrganizativo]] = relationship(
-        'NivelOrganizativo', foreign_keys=[tipo_id], lazy='selectin'
+        'NivelOrganizativo', foreign_keys=[tipo_id], lazy='select'
     )
 
     # Relación jerárquica
@@ -251,12 +251,12 @@ class UnidadOrganizativa(BaseModel):
         'UnidadOrganizativa',
         remote_side=[id],
         back_populates='agrupaciones_hijas',
-        lazy='selectin'
+        lazy='select'
     )
     agrupaciones_hijas: Mapped[List["UnidadOrganizativa"]] = relationship(
         'UnidadOrganizativa',
         back_populates='agrupacion_padre',
-        lazy='selectin'
+        lazy='select'
     )
 
     def __repr__(self) -> str:
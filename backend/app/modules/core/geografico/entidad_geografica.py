@@ -45,13 +45,13 @@ class EntidadGeografica(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, server_default='true', nullable=False)
 
     padre = relationship(
-        'EntidadGeografica', remote_side=[id], back_populates='hijos', lazy='selectin'
+        'EntidadGeografica', remote_side=[id], back_populates='hijos', lazy='select'
     )
     hijos = relationship(
         'EntidadGeografica', back_populates='padre', lazy='noload',
         cascade='all, delete-orphan'
     )
-    ambito_geografico = relationship('AmbitoGeografico', lazy='selectin')
+    ambito_geografico = relationship('AmbitoGeografico', lazy='select')
 
     def __repr__(self) -> str:
         return f"<EntidadGeografica(codigo='{self.codigo}', nombre='{self.nombre}')>"
@@ -91,5 +91,5 @@ class NivelOrganizativo(BaseModel):
     )
 
     ambito_geografico: Mapped[Optional[AmbitoGeografico]] = relationship(
-        "AmbitoGeografico", back_populates="niveles_organizativos", lazy="selectin"
+        "AmbitoGeografico", back_populates="niveles_organizativos", lazy="select"
     )
@@ -0,0 +1,36 @@
+"""Tabla de cierre (closure table) de la jerarquía de unidades organizativas.
+
+Una fila por cada par (ancestro, descendiente) del árbol, incluida la pareja
+reflexiva (u, u) con profundidad 0. La mantienen triggers de PostgreSQL sobre
+`unidades_organizativas` (alta y cambio de `agrupacion_padre_id`, ver migración
+amb1cie2rre3), de modo que se conserva aunque la jerarquía se escriba con SQL
+directo desde los scripts de importación. Los triggers rechazan además ciclos.
+
+Uso: filtrar "dentro del subárbol de X" con un join/semijoin en lugar de expandir
+listas de ids (ver `condicion_en_ambito` en acceso.services.ambito_territorial).
+"""
+
+import uuid
+
+from sqlalchemy import ForeignKey, Integer, Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ....infrastructure.base_model import Base  # tabla derivada: sin auditoría ni soft-delete
+
+
+class UnidadOrganizativaCierre(Base):
+    """Par ancestro → descendiente de la jerarquía territorial."""
+    __tablename__ = 'unidades_organizativas_cierre'
+
+    ancestro_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid, ForeignKey('unidades_organizativas.id', ondelete='CASCADE'), primary_key=True
+    )
+    descendiente_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid, ForeignKey('unidades_organizativas.id', ondelete='CASCADE'), primary_key=True,
+        index=True,
+    )
+    profundidad: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return (f"<UnidadOrganizativaCierre({self.ancestro_id} → {self.descendiente_id}, "
+                f"profundidad={self.profundidad})>")
@@ -64,25 +64,25 @@ class UnidadOrganizativaVista(Base):
     def pais(cls):
         return relationship('Pais',
             primaryjoin='UnidadOrganizativaVista.pais_id == Pais.id',
-            foreign_keys=[cls.pais_id], viewonly=True, lazy='selectin')
+            foreign_keys=[cls.pais_id], viewonly=True, lazy='select')
 
     @declared_attr
     def provincia(cls):
         return relationship('Provincia',
             primaryjoin='UnidadOrganizativaVista.provincia_id == Provincia.id',
-            foreign_keys=[cls.provincia_id], viewonly=True, lazy='selectin')
+            foreign_keys=[cls.provincia_id], viewonly=True, lazy='select')
 
     @declared_attr
     def municipio(cls):
         return relationship('Municipio',
             primaryjoin='UnidadOrganizativaVista.municipio_id == Municipio.id',
-            foreign_keys=[cls.municipio_id], viewonly=True, lazy='selectin')
+            foreign_keys=[cls.municipio_id], viewonly=True, lazy='select')
 
     @declared_attr
     def direccion(cls):
         return relationship('Direccion',
             primaryjoin='UnidadOrganizativaVista.direccion_id == Direccion.id',
-            foreign_keys=[cls.direccion_id], viewonly=True, lazy='selectin')
+            foreign_keys=[cls.direccion_id], viewonly=True, lazy='select')
 
     # Jerarquía (self-referencing)
     @declared_attr
@@ -91,7 +91,7 @@ class UnidadOrganizativaVista(Base):
             'UnidadOrganizativaVista',
             primaryjoin='UnidadOrganizativaVista.agrupacion_padre_id == remote(UnidadOrganizativaVista.id)',
             foreign_keys=[cls.agrupacion_padre_id],
-            viewonly=True, lazy='selectin'
+            viewonly=True, lazy='select'
         )
 
     def __repr__(self) -> str:
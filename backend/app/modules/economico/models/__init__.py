@@ -9,7 +9,7 @@ from .cuotas import (
     ImporteCuotaAnio, CuotaAnual, ModoIngreso, MotivoReduccionCuota,
     SolicitudReduccionCuota, SolicitudReduccionCuotaDocumento,
 )
-from .donaciones import DonacionConcepto, Donacion
+from .donaciones import DonacionConcepto, Donacion, LoteCertificadosDonacion
 from .remesas import Remesa, OrdenCobro
 from .recibos import Recibo
 from .justificantes_gasto import JustificanteGasto, JustificanteGastoLinea, JustificanteGastoDocumento
@@ -46,6 +46,7 @@ from .contabilidad import (
     ApunteContable,
     TipoAsientoContable,
     EstadoAsientoContable,
+    SaldoMensualCuenta,
 )
 
 __all__ = [
@@ -53,7 +54,7 @@ __all__ = [
     'ImporteCuotaAnio', 'CuotaAnual', 'ModoIngreso', 'MotivoReduccionCuota',
     'SolicitudReduccionCuota', 'SolicitudReduccionCuotaDocumento',
     # Donaciones
-    'DonacionConcepto', 'Donacion',
+    'DonacionConcepto', 'Donacion', 'LoteCertificadosDonacion',
     # Remesas
     'Remesa', 'OrdenCobro',
     # Recibos
@@ -80,4 +81,5 @@ __all__ = [
     'ReglaCategorizacion', 'TipoCoincidencia',
     'AsientoContable', 'ApunteContable',
     'TipoAsientoContable', 'EstadoAsientoContable',
+    'SaldoMensualCuenta',
 ]
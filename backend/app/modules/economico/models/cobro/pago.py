@@ -79,11 +79,11 @@ class Pago(BaseModel):
 
     fecha_completado: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
-    proveedor = relationship('ProveedorPago', lazy='selectin')
-    tipo_pago = relationship('TipoPago', lazy='selectin')
-    estado = relationship('EstadoPago', foreign_keys=[estado_id], lazy='selectin')
-    vinculacion_socio = relationship('Vinculacion', foreign_keys=[vinculacion_socio_id], lazy='selectin')
-    suscripcion = relationship('Suscripcion', back_populates='pagos', lazy='selectin')
+    proveedor = relationship('ProveedorPago', lazy='select')
+    tipo_pago = relationship('TipoPago', lazy='select')
+    estado = relationship('EstadoPago', foreign_keys=[estado_id], lazy='select')
+    vinculacion_socio = relationship('Vinculacion', foreign_keys=[vinculacion_socio_id], lazy='select')
+    suscripcion = relationship('Suscripcion', back_populates='pagos', lazy='select')
 
     def __repr__(self) -> str:
         return f"<Pago(importe={self.importe}, proveedor_id='{self.proveedor_id}')>"
@@ -101,8 +101,8 @@ class EventoPago(BaseModel):
     id_evento_externo: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
     payload: Mapped[dict] = mapped_column(JSON, nullable=False)
 
-    proveedor = relationship('ProveedorPago', lazy='selectin')
-    tipo_evento = relationship('TipoEventoPago', lazy='selectin')
+    proveedor = relationship('ProveedorPago', lazy='select')
+    tipo_evento = relationship('TipoEventoPago', lazy='select')
 
     def __repr__(self) -> str:
         return f"<EventoPago(proveedor_id='{self.proveedor_id}')>"
@@ -40,10 +40,10 @@ class Suscripcion(BaseModel):
 
     fecha_proximo_cobro: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
-    proveedor = relationship('ProveedorPago', lazy='selectin')
-    estado = relationship('EstadoSuscripcion', foreign_keys=[estado_id], lazy='selectin')
-    vinculacion_socio = relationship('Vinculacion', foreign_keys=[vinculacion_socio_id], lazy='selectin')
-    pagos = relationship('Pago', back_populates='suscripcion', lazy='selectin')
+    proveedor = relationship('ProveedorPago', lazy='select')
+    estado = relationship('EstadoSuscripcion', foreign_keys=[estado_id], lazy='select')
+    vinculacion_socio = relationship('Vinculacion', foreign_keys=[vinculacion_socio_id], lazy='select')
+    pagos = relationship('Pago', back_populates='suscripcion', lazy='select')
 
     def __repr__(self) -> str:
         return f"<Suscripcion(id_externo='{self.id_externo}', importe={self.importe})>"
@@ -61,9 +61,9 @@ class CuentaContable(BaseModel):
     activa: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
     
     # Relaciones
-    padre = relationship('CuentaContable', remote_side=[id], foreign_keys=[padre_id], lazy='selectin')
-    hijas: Mapped[List["CuentaContable"]] = relationship(back_populates='padre', lazy='selectin')
-    apuntes: Mapped[List["ApunteContable"]] = relationship(back_populates="cuenta", lazy="selectin")
+    padre = relationship('CuentaContable', remote_side=[id], foreign_keys=[padre_id], lazy='select')
+    hijas: Mapped[List["CuentaContable"]] = relationship(back_populates='padre', lazy='select')
+    apuntes: Mapped[List["ApunteContable"]] = relationship(back_populates="cuenta", lazy="select")
 
     def __repr__(self) -> str:
         return f"<CuentaContable(codigo='{self.codigo}', nombre='{self.nombre}', tipo='{self.tipo}')>"
@@ -98,7 +98,7 @@ class AsientoContable(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     # Relaciones
-    apuntes: Mapped[List["ApunteContable"]] = relationship(back_populates="asiento", lazy="selectin", cascade="all, delete-orphan")
+    apuntes: Mapped[List["ApunteContable"]] = relationship(back_populates="asiento", lazy="select", cascade="all, delete-orphan")
 
     def __repr__(self) -> str:
         return f"<AsientoContable(ejercicio={self.ejercicio}, numero={self.numero_asiento}, fecha={self.fecha}, estado='{self.estado}')>"
@@ -152,8 +152,8 @@ class ApunteContable(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     # Relaciones
-    asiento = relationship('AsientoContable', back_populates="apuntes", lazy='selectin')
-    cuenta = relationship('CuentaContable', back_populates="apuntes", lazy='selectin')
+    asiento = relationship('AsientoContable', back_populates="apuntes", lazy='select')
+    cuenta = relationship('CuentaContable', back_populates="apuntes", lazy='select')
 
     def __repr__(self) -> str:
         return f"<ApunteContable(cuenta='{self.cuenta_id}', debe={self.debe}, haber={self.haber})>"
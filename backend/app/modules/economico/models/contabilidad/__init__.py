@@ -4,6 +4,7 @@ from .asiento import AsientoContable, ApunteContable, TipoAsientoContable, Estad
 from .regla_contable import ReglaContable
 from .categoria_fiscal import CategoriaFiscal, TipoCategoriaFiscal
 from .regla_categorizacion import ReglaCategorizacion, TipoCoincidencia
+from .saldo_mensual import SaldoMensualCuenta
 
 __all__ = [
     'CuentaContable', 'TipoCuentaContable',
@@ -12,4 +13,5 @@ __all__ = [
     'ReglaContable',
     'CategoriaFiscal', 'TipoCategoriaFiscal',
     'ReglaCategorizacion', 'TipoCoincidencia',
+    'SaldoMensualCuenta',
 ]
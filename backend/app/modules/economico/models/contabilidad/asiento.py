@@ -52,7 +52,7 @@ class AsientoContable(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    apuntes: Mapped[List["ApunteContable"]] = relationship(back_populates="asiento", lazy="selectin", cascade="all, delete-orphan")
+    apuntes: Mapped[List["ApunteContable"]] = relationship(back_populates="asiento", lazy="select", cascade="all, delete-orphan")
 
     def __repr__(self) -> str:
         return f"<AsientoContable(ejercicio={self.ejercicio}, numero={self.numero_asiento}, fecha={self.fecha}, estado='{self.estado}')>"
@@ -106,8 +106,8 @@ class ApunteContable(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    asiento = relationship('AsientoContable', back_populates="apuntes", lazy='selectin')
-    cuenta = relationship('CuentaContable', back_populates="apuntes", lazy='selectin')
+    asiento = relationship('AsientoContable', back_populates="apuntes", lazy='select')
+    cuenta = relationship('CuentaContable', back_populates="apuntes", lazy='select')
 
     def __repr__(self) -> str:
         return f"<ApunteContable(cuenta='{self.cuenta_id}', debe={self.debe}, haber={self.haber})>"
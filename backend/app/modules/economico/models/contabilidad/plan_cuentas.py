@@ -43,9 +43,9 @@ class CuentaContable(BaseModel):
     activa: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    padre = relationship('CuentaContable', remote_side=[id], foreign_keys=[padre_id], lazy='selectin')
-    hijas: Mapped[List["CuentaContable"]] = relationship(back_populates='padre', lazy='selectin')
-    apuntes: Mapped[List["ApunteContable"]] = relationship(back_populates="cuenta", lazy="selectin")
+    padre = relationship('CuentaContable', remote_side=[id], foreign_keys=[padre_id], lazy='select')
+    hijas: Mapped[List["CuentaContable"]] = relationship(back_populates='padre', lazy='select')
+    apuntes: Mapped[List["ApunteContable"]] = relationship(back_populates="cuenta", lazy="select")
 
     def __repr__(self) -> str:
         return f"<CuentaContable(codigo='{self.codigo}', nombre='{self.nombre}', tipo='{self.tipo}')>"
@@ -58,7 +58,7 @@ class ReglaCategorizacion(BaseModel):
     activa: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     categoria_fiscal = relationship(
-        'CategoriaFiscal', foreign_keys=[categoria_fiscal_id], lazy='selectin'
+        'CategoriaFiscal', foreign_keys=[categoria_fiscal_id], lazy='select'
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,44 @@
+"""Saldos mensuales por cuenta (instantáneas incrementales del mayor).
+
+Una fila por (cuenta, ejercicio, mes) con las sumas del debe y del haber de los
+apuntes de asientos CONFIRMADOS. La mantienen triggers de PostgreSQL (ver
+migraciones sal1mes2cta3 y sal2bor3asi4): al confirmar, anular o borrar un
+asiento se suma o resta su aportación, y los apuntes añadidos, modificados o
+borrados en un asiento ya confirmado ajustan su mes. Así se conserva también cuando se escribe con SQL
+directo desde los scripts de importación.
+
+Uso: el saldo de una cuenta hasta una fecha es la suma de los meses completos
+anteriores más, si la fecha cae a mitad de mes, los apuntes de ese mes (ver
+`CierreEjercicioService.calcular_saldos_cuentas`).
+"""
+
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Date, ForeignKey, Index, Integer, Numeric, Uuid
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .....infrastructure.base_model import Base  # tabla derivada: sin auditoría ni soft-delete
+
+
+class SaldoMensualCuenta(Base):
+    """Sumas del debe y del haber de una cuenta en un mes del ejercicio."""
+    __tablename__ = 'saldos_mensuales_cuentas'
+
+    cuenta_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid, ForeignKey('cuentas_contables.id', ondelete='CASCADE'), primary_key=True
+    )
+    ejercicio: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # Primer día del mes de la fecha de los asientos.
+    periodo: Mapped[date] = mapped_column(Date, primary_key=True)
+    debe: Mapped[Decimal] = mapped_column(Numeric(16, 2), nullable=False, default=Decimal('0.00'))
+    haber: Mapped[Decimal] = mapped_column(Numeric(16, 2), nullable=False, default=Decimal('0.00'))
+
+    __table_args__ = (
+        Index('ix_saldos_mensuales_cuentas_ejercicio_periodo', 'ejercicio', 'periodo'),
+    )
+
+    def __repr__(self) -> str:
+        return (f"<SaldoMensualCuenta(cuenta='{self.cuenta_id}', periodo={self.periodo}, "
+                f"debe={self.debe}, haber={self.haber})>")
@@ -47,7 +47,7 @@ class CuentasAnuales(BaseModel):
 
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
-    aprobador = relationship("Contacto", foreign_keys=[aprobado_por_id], lazy="selectin")
+    aprobador = relationship("Contacto", foreign_keys=[aprobado_por_id], lazy="select")
 
     def __repr__(self) -> str:
         return f"<CuentasAnuales(ejercicio={self.ejercicio}, estado={self.estado})>"
@@ -70,7 +70,7 @@ class ImporteCuotaAnio(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relación
-    tipo_miembro = relationship('TipoMiembro', lazy='selectin')
+    tipo_miembro = relationship('TipoMiembro', lazy='select')
 
     def __repr__(self) -> str:
         return f"<ImporteCuotaAnio(ejercicio={self.ejercicio}, tipo_miembro_id='{self.tipo_miembro_id}', importe={self.importe})>"
@@ -120,12 +120,12 @@ class CuotaAnual(BaseModel):
     )
 
     # Relaciones
-    vinculacion_socio = relationship('Vinculacion', foreign_keys=[vinculacion_socio_id], lazy='selectin')
-    agrupacion = relationship('UnidadOrganizativa', foreign_keys=[agrupacion_id], lazy='selectin')
-    importe_cuota_anio = relationship('ImporteCuotaAnio', foreign_keys=[importe_cuota_anio_id], lazy='selectin')
-    estado = relationship('EstadoCuota', foreign_keys=[estado_id], lazy='selectin')
-    ordenes_cobro = relationship('OrdenCobro', back_populates='cuota', lazy='selectin')
-    motivo_reduccion = relationship('MotivoReduccionCuota', foreign_keys=[motivo_reduccion_id], lazy='selectin')
+    vinculacion_socio = relationship('Vinculacion', foreign_keys=[vinculacion_socio_id], lazy='select')
+    agrupacion = relationship('UnidadOrganizativa', foreign_keys=[agrupacion_id], lazy='select')
+    importe_cuota_anio = relationship('ImporteCuotaAnio', foreign_keys=[importe_cuota_anio_id], lazy='select')
+    estado = relationship('EstadoCuota', foreign_keys=[estado_id], lazy='select')
+    ordenes_cobro = relationship('OrdenCobro', back_populates='cuota', lazy='select')
+    motivo_reduccion = relationship('MotivoReduccionCuota', foreign_keys=[motivo_reduccion_id], lazy='select')
 
     def __repr__(self) -> str:
         return f"<CuotaAnual(vinculacion_socio_id='{self.vinculacion_socio_id}', ejercicio={self.ejercicio}, estado_id='{self.estado_id}')>"
@@ -207,14 +207,14 @@ class SolicitudReduccionCuota(BaseModel):
     motivo_rechazo: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    miembro = relationship("Contacto", foreign_keys=[miembro_id], lazy="selectin")
-    motivo_reduccion = relationship("MotivoReduccionCuota", foreign_keys=[motivo_reduccion_id], lazy="selectin")
-    resolutor = relationship("Contacto", foreign_keys=[resuelto_por_id], lazy="selectin")
+    miembro = relationship("Contacto", foreign_keys=[miembro_id], lazy="select")
+    motivo_reduccion = relationship("MotivoReduccionCuota", foreign_keys=[motivo_reduccion_id], lazy="select")
+    resolutor = relationship("Contacto", foreign_keys=[resuelto_por_id], lazy="select")
     documentos = relationship(
         "SolicitudReduccionCuotaDocumento",
         back_populates="solicitud",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="select",
     )
 
     def __repr__(self) -> str:
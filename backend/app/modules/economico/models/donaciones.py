@@ -1,11 +1,12 @@
 """Modelos relacionados con donaciones."""
 
 import uuid
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import String, ForeignKey, Date, Numeric, Boolean, Text, Uuid, Integer, func
+from sqlalchemy import String, ForeignKey, Date, DateTime, Numeric, Boolean, Text, Uuid, Integer, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ....infrastructure.base_model import BaseModel
@@ -22,7 +23,7 @@ class DonacionConcepto(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    donaciones = relationship('Donacion', back_populates='concepto', lazy='selectin')
+    donaciones = relationship('Donacion', back_populates='concepto', lazy='select')
 
     def __repr__(self) -> str:
         return f"<DonacionConcepto(nombre='{self.nombre}')>"
@@ -95,15 +96,15 @@ class Donacion(BaseModel):
     anonima: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
     # Relaciones
-    contacto = relationship('Contacto', foreign_keys=[contacto_id], lazy='selectin')
-    participacion = relationship('Participacion', back_populates='donacion', foreign_keys=[participacion_id], lazy='selectin')
-    concepto = relationship('DonacionConcepto', back_populates='donaciones', lazy='selectin')
+    contacto = relationship('Contacto', foreign_keys=[contacto_id], lazy='select')
+    participacion = relationship('Participacion', back_populates='donacion', foreign_keys=[participacion_id], lazy='select')
+    concepto = relationship('DonacionConcepto', back_populates='donaciones', lazy='select')
     # campania: pendiente de aplicar FK de SQL_PENDIENTE.md Lote 9
-    estado = relationship('EstadoDonacion', foreign_keys=[estado_id], lazy='selectin')
-    cuenta_bancaria = relationship('CuentaBancaria', foreign_keys=[cuenta_bancaria_id], lazy='selectin')
-    apunte_caja = relationship('ApunteCaja', foreign_keys=[apunte_caja_id], lazy='selectin')
-    asiento = relationship('AsientoContable', foreign_keys=[asiento_id], lazy='selectin')
-    agrupacion = relationship('UnidadOrganizativa', foreign_keys=[agrupacion_id], lazy='selectin')
+    estado = relationship('EstadoDonacion', foreign_keys=[estado_id], lazy='select')
+    cuenta_bancaria = relationship('CuentaBancaria', foreign_keys=[cuenta_bancaria_id], lazy='select')
+    apunte_caja = relationship('ApunteCaja', foreign_keys=[apunte_caja_id], lazy='select')
+    asiento = relationship('AsientoContable', foreign_keys=[asiento_id], lazy='select')
+    agrupacion = relationship('UnidadOrganizativa', foreign_keys=[agrupacion_id], lazy='select')
 
     def __repr__(self) -> str:
         return f"<Donacion(importe={self.importe}, fecha={self.fecha}, estado_id='{self.estado_id}')>"
@@ -125,3 +126,30 @@ class Donacion(BaseModel):
             self.certificado_emitido = True
             self.fecha_certificado = date.today()
             # TODO: self.estado_id = # buscar estado 'CERTIFICADA'
+
+
+class LoteCertificadosDonacion(BaseModel):
+    """Emisión en bloque de los certificados de un ejercicio (trabajo en segundo plano).
+
+    `numeros` se guarda en la misma transacción que numera y marca las
+    donaciones: si el renderizado falla, el reintento regenera esos mismos
+    certificados sin volver a numerarlos. `latido_en` se actualiza mientras se
+    renderiza; un lote EN_CURSO sin latido se puede reclamar de nuevo.
+    `omitidos`: números del lote que un reintento no pudo regenerar (sus
+    donaciones se anularon o perdieron el NIF entre tanto).
+    """
+    __tablename__ = "donaciones_lotes_certificados"
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    ejercicio: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    solo_pendientes: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    estado: Mapped[str] = mapped_column(String(20), nullable=False, default="PENDIENTE")  # PENDIENTE | EN_CURSO | COMPLETADO | ERROR
+    numeros: Mapped[Optional[list]] = mapped_column(JSONB, nullable=True)
+    omitidos: Mapped[Optional[list]] = mapped_column(JSONB, nullable=True)
+    total: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    ruta_zip: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    latido_en: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<LoteCertificadosDonacion(ejercicio={self.ejercicio}, estado='{self.estado}')>"
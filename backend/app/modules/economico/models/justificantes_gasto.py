@@ -105,20 +105,20 @@ class JustificanteGasto(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    miembro = relationship("Contacto", foreign_keys=[miembro_id], lazy="selectin")
-    aceptador = relationship("Contacto", foreign_keys=[aceptado_por_id], lazy="selectin")
-    aprobador = relationship("Contacto", foreign_keys=[aprobado_por_id], lazy="selectin")
-    actividad = relationship("Actividad", foreign_keys=[actividad_id], lazy="selectin")
+    miembro = relationship("Contacto", foreign_keys=[miembro_id], lazy="select")
+    aceptador = relationship("Contacto", foreign_keys=[aceptado_por_id], lazy="select")
+    aprobador = relationship("Contacto", foreign_keys=[aprobado_por_id], lazy="select")
+    actividad = relationship("Actividad", foreign_keys=[actividad_id], lazy="select")
     partida_actividad = relationship(
-        "PartidaPresupuestoActividad", foreign_keys=[partida_actividad_id], lazy="selectin"
+        "PartidaPresupuestoActividad", foreign_keys=[partida_actividad_id], lazy="select"
     )
-    agrupacion = relationship("UnidadOrganizativa", foreign_keys=[agrupacion_id], lazy="selectin")
+    agrupacion = relationship("UnidadOrganizativa", foreign_keys=[agrupacion_id], lazy="select")
     cuenta_bancaria = relationship(
-        "CuentaBancaria", foreign_keys=[cuenta_bancaria_id], lazy="selectin"
+        "CuentaBancaria", foreign_keys=[cuenta_bancaria_id], lazy="select"
     )
-    apunte_caja = relationship("ApunteCaja", foreign_keys=[apunte_caja_id], lazy="selectin")
-    cuenta_contable = relationship("CuentaContable", foreign_keys=[cuenta_contable_id], lazy="selectin")
-    presentado_por_tesorero = relationship("Contacto", foreign_keys=[presentado_en_nombre_de_id], lazy="selectin")
+    apunte_caja = relationship("ApunteCaja", foreign_keys=[apunte_caja_id], lazy="select")
+    cuenta_contable = relationship("CuentaContable", foreign_keys=[cuenta_contable_id], lazy="select")
+    presentado_por_tesorero = relationship("Contacto", foreign_keys=[presentado_en_nombre_de_id], lazy="select")
 
     def __repr__(self) -> str:
         return f"<JustificanteGasto(numero='{self.numero_justificante}', estado='{self.estado}', importe={self.importe})>"
@@ -151,7 +151,7 @@ class JustificanteGasto(BaseModel):
         "JustificanteGastoLinea",
         back_populates="justificante",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="select",
         order_by="JustificanteGastoLinea.fecha_gasto.desc()",
     )
 
@@ -160,7 +160,7 @@ class JustificanteGasto(BaseModel):
         "JustificanteGastoDocumento",
         back_populates="justificante",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="select",
     )
 
 
@@ -25,7 +25,7 @@ class EstadoPlanificacion(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    planificaciones = relationship('PlanificacionAnual', back_populates='estado', lazy='selectin')
+    planificaciones = relationship('PlanificacionAnual', back_populates='estado', lazy='select')
 
     def __repr__(self) -> str:
         return f"<EstadoPlanificacion(codigo='{self.codigo}', nombre='{self.nombre}')>"
@@ -42,7 +42,7 @@ class CategoriaPartida(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    partidas = relationship('PartidaPresupuestaria', back_populates='categoria', lazy='selectin')
+    partidas = relationship('PartidaPresupuestaria', back_populates='categoria', lazy='select')
 
     def __repr__(self) -> str:
         return f"<CategoriaPartida(codigo='{self.codigo}', nombre='{self.nombre}')>"
@@ -87,10 +87,10 @@ class PartidaPresupuestaria(BaseModel):
     )
 
     # Relaciones
-    categoria: Mapped[Optional["CategoriaPartida"]] = relationship(back_populates='partidas', lazy='selectin')
-    planificacion: Mapped[Optional["PlanificacionAnual"]] = relationship(back_populates='partidas', lazy='selectin')
-    actividad = relationship('Actividad', foreign_keys=[actividad_id], lazy='selectin')
-    campania = relationship('Campania', foreign_keys=[campania_id], lazy='selectin')
+    categoria: Mapped[Optional["CategoriaPartida"]] = relationship(back_populates='partidas', lazy='select')
+    planificacion: Mapped[Optional["PlanificacionAnual"]] = relationship(back_populates='partidas', lazy='select')
+    actividad = relationship('Actividad', foreign_keys=[actividad_id], lazy='select')
+    campania = relationship('Campania', foreign_keys=[campania_id], lazy='select')
 
     def __repr__(self) -> str:
         return f"<PartidaPresupuestaria(codigo='{self.codigo}', tipo='{self.tipo}', importe={self.importe_presupuestado})>"
@@ -179,7 +179,7 @@ class CompromisoPresupuestario(BaseModel):
     estado: Mapped[str] = mapped_column(String(20), nullable=False, default='activo')
     # 'activo' → comprometido; 'liberado' → devuelto a disponible; 'ejecutado' → gasto real registrado
 
-    partida: Mapped["PartidaPresupuestaria"] = relationship(lazy='selectin')
+    partida: Mapped["PartidaPresupuestaria"] = relationship(lazy='select')
 
     def __repr__(self) -> str:
         return f"<CompromisoPresupuestario(partida_id='{self.partida_id}', importe={self.importe_comprometido})>"
@@ -213,9 +213,9 @@ class PlanificacionAnual(BaseModel):
     ejercicio_origen_prorroga: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
     # Relaciones
-    estado: Mapped["EstadoPlanificacion"] = relationship(back_populates='planificaciones', lazy='selectin')
-    partidas: Mapped[List["PartidaPresupuestaria"]] = relationship(back_populates='planificacion', lazy='selectin')
-    # propuestas: Mapped[List["PropuestaActividad"]] = relationship(back_populates='planificacion', lazy='selectin')
+    estado: Mapped["EstadoPlanificacion"] = relationship(back_populates='planificaciones', lazy='select')
+    partidas: Mapped[List["PartidaPresupuestaria"]] = relationship(back_populates='planificacion', lazy='select')
+    # propuestas: Mapped[List["PropuestaActividad"]] = relationship(back_populates='planificacion', lazy='select')
 
     def __repr__(self) -> str:
         return f"<PlanificacionAnual(ejercicio={self.ejercicio}, estado_id='{self.estado_id}')>"
@@ -315,12 +315,12 @@ class ModificacionPresupuestaria(BaseModel):
         Uuid, ForeignKey("usuarios.id"), nullable=True
     )
 
-    planificacion = relationship('PlanificacionAnual', lazy='selectin')
+    planificacion = relationship('PlanificacionAnual', lazy='select')
     partida_destino = relationship(
-        'PartidaPresupuestaria', foreign_keys=[partida_destino_id], lazy='selectin'
+        'PartidaPresupuestaria', foreign_keys=[partida_destino_id], lazy='select'
     )
     partida_origen = relationship(
-        'PartidaPresupuestaria', foreign_keys=[partida_origen_id], lazy='selectin'
+        'PartidaPresupuestaria', foreign_keys=[partida_origen_id], lazy='select'
     )
 
     def __repr__(self) -> str:
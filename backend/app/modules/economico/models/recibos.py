@@ -71,11 +71,11 @@ class Recibo(BaseModel):
     )
 
     # Relaciones
-    vinculacion_socio = relationship("Vinculacion", foreign_keys=[vinculacion_socio_id], lazy="selectin")
-    cuota = relationship("CuotaAnual", foreign_keys=[cuota_id], lazy="selectin")
-    orden_cobro = relationship("OrdenCobro", foreign_keys=[orden_cobro_id], lazy="selectin")
-    plantilla_email_aviso = relationship("PlantillaEmail", foreign_keys=[plantilla_email_aviso_id], lazy="selectin")
-    agrupacion = relationship("UnidadOrganizativa", foreign_keys=[agrupacion_id], lazy="selectin")
+    vinculacion_socio = relationship("Vinculacion", foreign_keys=[vinculacion_socio_id], lazy="select")
+    cuota = relationship("CuotaAnual", foreign_keys=[cuota_id], lazy="select")
+    orden_cobro = relationship("OrdenCobro", foreign_keys=[orden_cobro_id], lazy="select")
+    plantilla_email_aviso = relationship("PlantillaEmail", foreign_keys=[plantilla_email_aviso_id], lazy="select")
+    agrupacion = relationship("UnidadOrganizativa", foreign_keys=[agrupacion_id], lazy="select")
 
     def __repr__(self) -> str:
         return f"<Recibo(numero='{self.numero_recibo}', estado='{self.estado}', importe={self.importe})>"
@@ -46,8 +46,8 @@ class AccionReclamacion(BaseModel):
         Uuid, ForeignKey("usuarios.id"), nullable=True, index=True
     )
 
-    reclamacion = relationship('Reclamacion', back_populates='acciones', lazy='selectin')
-    tipo_accion = relationship('TipoAccionReclamacion', lazy='selectin')
+    reclamacion = relationship('Reclamacion', back_populates='acciones', lazy='select')
+    tipo_accion = relationship('TipoAccionReclamacion', lazy='select')
 
     def __repr__(self) -> str:
         return f"<AccionReclamacion(reclamacion_id='{self.reclamacion_id}')>"
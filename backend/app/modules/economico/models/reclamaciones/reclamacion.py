@@ -44,9 +44,9 @@ class Reclamacion(BaseModel):
 
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
-    cuota = relationship('CuotaAnual', lazy='selectin')
-    estado = relationship('EstadoReclamacion', foreign_keys=[estado_id], lazy='selectin')
-    acciones = relationship('AccionReclamacion', back_populates='reclamacion', lazy='selectin')
+    cuota = relationship('CuotaAnual', lazy='select')
+    estado = relationship('EstadoReclamacion', foreign_keys=[estado_id], lazy='select')
+    acciones = relationship('AccionReclamacion', back_populates='reclamacion', lazy='select')
 
     def __repr__(self) -> str:
         return f"<Reclamacion(cuota_id='{self.cuota_id}', nivel={self.nivel})>"
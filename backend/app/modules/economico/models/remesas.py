@@ -53,9 +53,9 @@ class Remesa(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    ordenes: Mapped[List["OrdenCobro"]] = relationship(back_populates="remesa", lazy="selectin")
-    estado = relationship('EstadoRemesa', foreign_keys=[estado_id], lazy='selectin')
-    agrupacion = relationship('UnidadOrganizativa', foreign_keys=[agrupacion_id], lazy='selectin')
+    ordenes: Mapped[List["OrdenCobro"]] = relationship(back_populates="remesa", lazy="select")
+    estado = relationship('EstadoRemesa', foreign_keys=[estado_id], lazy='select')
+    agrupacion = relationship('UnidadOrganizativa', foreign_keys=[agrupacion_id], lazy='select')
 
     def __repr__(self) -> str:
         return f"<Remesa(referencia='{self.referencia}', estado_id='{self.estado_id}', importe={self.importe_total})>"
@@ -108,9 +108,9 @@ class OrdenCobro(BaseModel):
     fecha_rechazo: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
 
     # Relaciones
-    remesa: Mapped["Remesa"] = relationship(back_populates="ordenes", lazy="selectin")
-    cuota = relationship('CuotaAnual', foreign_keys=[cuota_id], back_populates='ordenes_cobro', lazy='selectin')
-    estado = relationship('EstadoOrdenCobro', foreign_keys=[estado_id], lazy='selectin')
+    remesa: Mapped["Remesa"] = relationship(back_populates="ordenes", lazy="select")
+    cuota = relationship('CuotaAnual', foreign_keys=[cuota_id], back_populates='ordenes_cobro', lazy='select')
+    estado = relationship('EstadoOrdenCobro', foreign_keys=[estado_id], lazy='select')
 
     def __repr__(self) -> str:
         return f"<OrdenCobro(cuota_id='{self.cuota_id}', importe={self.importe}, estado_id='{self.estado_id}')>"
@@ -119,8 +119,9 @@ class OrdenCobro(BaseModel):
     def end_to_end_id(self) -> str:
         """Identificador SEPA legible {referencia_remesa}-{nseq:03d} (D4.1).
 
-        Requiere que la relación 'remesa' esté cargada (lazy='selectin' ya lo
-        hace por defecto). Máx 35 caracteres (límite SEPA EndToEndIdentification).
+        Requiere que la Remesa esté en la sesión (cargada antes o con
+        `cargar(OrdenCobro, "remesa")`). Máx 35 caracteres (límite SEPA
+        EndToEndIdentification).
         """
         ref = self.remesa.referencia if self.remesa else ""
         return f"{ref}-{self.nseq:03d}"
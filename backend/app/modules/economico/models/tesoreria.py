@@ -42,8 +42,8 @@ class CuentaBancaria(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     # Relaciones
-    agrupacion = relationship('UnidadOrganizativa', foreign_keys=[agrupacion_id], lazy='selectin')
-    movimientos: Mapped[List["MovimientoTesoreria"]] = relationship(back_populates="cuenta", lazy="selectin")
+    agrupacion = relationship('UnidadOrganizativa', foreign_keys=[agrupacion_id], lazy='select')
+    movimientos: Mapped[List["MovimientoTesoreria"]] = relationship(back_populates="cuenta", lazy="select")
 
     def __repr__(self) -> str:
         return f"<CuentaBancaria(nombre='{self.nombre}', iban='{self.iban[-4:]}', saldo={self.saldo_actual})>"
@@ -91,8 +91,8 @@ class MovimientoTesoreria(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     # Relaciones
-    cuenta = relationship('CuentaBancaria', back_populates="movimientos", lazy='selectin')
-    asiento = relationship('AsientoContable', foreign_keys=[asiento_id], lazy='selectin')
+    cuenta = relationship('CuentaBancaria', back_populates="movimientos", lazy='select')
+    asiento = relationship('AsientoContable', foreign_keys=[asiento_id], lazy='select')
 
     def __repr__(self) -> str:
         return f"<MovimientoTesoreria(fecha={self.fecha}, tipo='{self.tipo}', importe={self.importe}, concepto='{self.concepto}')>"
@@ -138,7 +138,7 @@ class ConciliacionBancaria(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     # Relaciones
-    cuenta = relationship('CuentaBancaria', lazy='selectin')
+    cuenta = relationship('CuentaBancaria', lazy='select')
 
     def __repr__(self) -> str:
         return f"<ConciliacionBancaria(cuenta={self.cuenta_id}, periodo={self.fecha_inicio} a {self.fecha_fin}, conciliado={self.conciliado})>"
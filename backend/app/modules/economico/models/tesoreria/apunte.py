@@ -81,11 +81,11 @@ class ApunteCaja(BaseModel):
 
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
-    cuenta_bancaria = relationship('CuentaBancaria', back_populates='apuntes', lazy='selectin')
-    asiento = relationship('AsientoContable', foreign_keys=[asiento_id], lazy='selectin')
-    actividad = relationship('Actividad', foreign_keys=[actividad_id], lazy='selectin')
-    campania = relationship('Campania', foreign_keys=[campania_id], lazy='selectin')
-    categoria_fiscal = relationship('CategoriaFiscal', foreign_keys=[categoria_fiscal_id], lazy='selectin')
+    cuenta_bancaria = relationship('CuentaBancaria', back_populates='apuntes', lazy='select')
+    asiento = relationship('AsientoContable', foreign_keys=[asiento_id], lazy='select')
+    actividad = relationship('Actividad', foreign_keys=[actividad_id], lazy='select')
+    campania = relationship('Campania', foreign_keys=[campania_id], lazy='select')
+    categoria_fiscal = relationship('CategoriaFiscal', foreign_keys=[categoria_fiscal_id], lazy='select')
 
     def __repr__(self) -> str:
         return f"<ApunteCaja(tipo={self.tipo}, importe={self.importe}, fecha={self.fecha})>"
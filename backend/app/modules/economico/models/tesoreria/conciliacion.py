@@ -33,7 +33,7 @@ class ExtractoBancario(BaseModel):
     conciliado: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False, index=True)
 
     # Relaciones
-    cuenta_bancaria = relationship('CuentaBancaria', back_populates='extractos', lazy='selectin')
+    cuenta_bancaria = relationship('CuentaBancaria', back_populates='extractos', lazy='select')
 
     def __repr__(self) -> str:
         return f"<ExtractoBancario(fecha={self.fecha}, importe={self.importe}, concepto='{self.concepto}')>"
@@ -54,8 +54,8 @@ class Conciliacion(BaseModel):
     usuario_id: Mapped[Optional[uuid.UUID]] = mapped_column(Uuid, nullable=True, index=True)
 
     # Relaciones
-    apunte = relationship('ApunteCaja', foreign_keys=[apunte_id], lazy='selectin')
-    extracto = relationship('ExtractoBancario', foreign_keys=[extracto_id], lazy='selectin')
+    apunte = relationship('ApunteCaja', foreign_keys=[apunte_id], lazy='select')
+    extracto = relationship('ExtractoBancario', foreign_keys=[extracto_id], lazy='select')
 
     def __repr__(self) -> str:
         return f"<Conciliacion(apunte={self.apunte_id}, extracto={self.extracto_id}, metodo={self.metodo})>"
@@ -43,7 +43,7 @@ class ConciliacionBancaria(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    cuenta_bancaria = relationship('CuentaBancaria', back_populates='conciliaciones_periodo', lazy='selectin')
+    cuenta_bancaria = relationship('CuentaBancaria', back_populates='conciliaciones_periodo', lazy='select')
 
     def __repr__(self) -> str:
         return f"<ConciliacionBancaria(cuenta={self.cuenta_bancaria_id}, {self.fecha_inicio} a {self.fecha_fin}, conciliado={self.conciliado})>"
@@ -4,9 +4,10 @@ import uuid
 from decimal import Decimal
 from typing import Optional, List
 
-from sqlalchemy import String, Boolean, Numeric, Text, Uuid, ForeignKey
+from sqlalchemy import String, Boolean, Numeric, Text, Uuid, ForeignKey, event, false
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from .....core.indice_ciego import LONGITUD_INDICE, indice_iban
 from .....infrastructure.base_model import BaseModel
 
 
@@ -17,6 +18,8 @@ class CuentaBancaria(BaseModel):
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     nombre: Mapped[str] = mapped_column(String(200), nullable=False)
     iban: Mapped[str] = mapped_column(String(500), unique=True, nullable=False, index=True)  # 500 por encriptación
+    # Índice ciego del IBAN: ver app/core/indice_ciego.py.
+    iban_indice: Mapped[Optional[str]] = mapped_column(String(LONGITUD_INDICE), nullable=True, index=True)
     bic_swift: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
     banco_nombre: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
     titular: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
@@ -33,15 +36,15 @@ class CuentaBancaria(BaseModel):
     activa: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     apuntes: Mapped[List["ApunteCaja"]] = relationship(
-        'ApunteCaja', back_populates='cuenta_bancaria', lazy='selectin'
+        'ApunteCaja', back_populates='cuenta_bancaria', lazy='select'
     )
     extractos: Mapped[List["ExtractoBancario"]] = relationship(
-        'ExtractoBancario', back_populates='cuenta_bancaria', lazy='selectin'
+        'ExtractoBancario', back_populates='cuenta_bancaria', lazy='select'
     )
     conciliaciones_periodo = relationship(
-        'ConciliacionBancaria', back_populates='cuenta_bancaria', lazy='selectin'
+        'ConciliacionBancaria', back_populates='cuenta_bancaria', lazy='select'
     )
-    agrupacion = relationship('UnidadOrganizativa', foreign_keys=[agrupacion_id], lazy='selectin')
+    agrupacion = relationship('UnidadOrganizativa', foreign_keys=[agrupacion_id], lazy='select')
 
     def __repr__(self) -> str:
         return f"<CuentaBancaria(iban='{self.iban[-4:]}', nombre='{self.nombre}')>"
@@ -49,3 +52,14 @@ class CuentaBancaria(BaseModel):
     @property
     def saldo_disponible(self) -> Decimal:
         return self.saldo_actual
+
+    @classmethod
+    def con_iban(cls, iban: Optional[str]):
+        """Criterio WHERE por IBAN (en claro o cifrado en BD)."""
+        indice = indice_iban(iban)
+        return cls.iban_indice == indice if indice else false()
+
+
+@event.listens_for(CuentaBancaria.iban, "set")
+def _indexar_iban_cuenta(target: CuentaBancaria, value, _oldvalue, _initiator) -> None:
+    target.iban_indice = indice_iban(value)
@@ -6,6 +6,8 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.events import ReglasCategorizacionCambiadas, event_bus
+
 from ..models.contabilidad import CategoriaFiscal, TipoCategoriaFiscal
 
 
@@ -73,6 +75,7 @@ class CategoriaFiscalService:
         )
         self.session.add(categoria)
         await self.session.commit()
+        await event_bus.publish(ReglasCategorizacionCambiadas())
         await self.session.refresh(categoria)
         return categoria
 
@@ -94,6 +97,7 @@ class CategoriaFiscalService:
 
         self.session.add(categoria)
         await self.session.commit()
+        await event_bus.publish(ReglasCategorizacionCambiadas())
         await self.session.refresh(categoria)
         return categoria
 
@@ -120,3 +124,4 @@ class CategoriaFiscalService:
         categoria.soft_delete()
         self.session.add(categoria)
         await self.session.commit()
+        await event_bus.publish(ReglasCategorizacionCambiadas())
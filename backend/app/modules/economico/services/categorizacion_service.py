@@ -4,16 +4,26 @@ Combina tres mecanismos para minimizar la clasificación manual:
   1. Derivación por origen — apuntes de cuotas/donaciones/etc. se clasifican solos
   2. Reglas por concepto — patrones configurables ("Endesa" → Suministros)
   3. Clasificación masiva — asignar categoría a varios apuntes a la vez
+
+Las reglas activas y el mapa origen → categoría se compilan una vez en un
+`ClasificadorCompilado` (una expresión regular combinada por tipo de apunte)
+que se cachea por proceso hasta que cambia una regla o una categoría
+(`ReglasCategorizacionCambiadas`) o vence `CATEGORIZACION_CACHE_TTL_SECONDS`.
 """
 
-from typing import List, Optional, Dict
+import asyncio
+import re
+import time
+from datetime import date
+from typing import Dict, List, Optional, Sequence
 from uuid import UUID
 
-from sqlalchemy import select, and_
+from sqlalchemy import Uuid, any_, bindparam, func, select, and_, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..models.tesoreria import ApunteCaja, TipoApunte, OrigenApunte
-from ..models.contabilidad import CategoriaFiscal, ReglaCategorizacion
+from ..models.tesoreria import ApunteCaja
+from ..models.contabilidad import CategoriaFiscal, ReglaCategorizacion, TipoCoincidencia
 
 
 # Mapeo de origen del apunte → código de categoría fiscal (derivación automática #1).
@@ -26,6 +36,175 @@ _ORIGEN_A_CATEGORIA: Dict[str, str] = {
     "JUSTIFICANTE_GASTO": "GAS_OTROS", # gasto justificado; el detalle se afina por regla/manual
 }
 
+# Apuntes leídos por tramo en la clasificación masiva.
+_TAMANO_TRAMO = 5000
+
+
+def _rama(regla) -> str:
+    """Condición de la regla como lookahead anclado al inicio del texto.
+
+    Como en `ReglaCategorizacion.coincide`: las reglas REGEX se buscan en el
+    concepto original; el resto, en el concepto en minúsculas y sin espacios
+    en los extremos.
+    """
+    if regla.tipo_coincidencia == TipoCoincidencia.REGEX:
+        return f"(?=[\\s\\S]*?(?:{regla.patron}))"
+    patron = re.escape(regla.patron.lower().strip())
+    if regla.tipo_coincidencia == TipoCoincidencia.EMPIEZA_POR:
+        return f"(?={patron})"
+    if regla.tipo_coincidencia == TipoCoincidencia.EXACTO:
+        return f"(?={patron}\\Z)"
+    return f"(?=[\\s\\S]*?{patron})"
+
+
+def _incrustable(rama: str) -> bool:
+    try:
+        re.compile(rama, re.IGNORECASE)
+    except re.error:
+        return False
+    return True
+
+
+def _compilar(reglas: Sequence) -> list:
+    """Agrupa las reglas (ya en orden) en tramos `(buscar, categorias, crudo)`.
+
+    Reglas consecutivas del mismo texto (REGEX → concepto original, resto →
+    normalizado) van en una sola regex alternada: las ramas se prueban en
+    orden en la posición 0 y gana la primera que casa, el mismo resultado que
+    recorrer las reglas por `orden` pero con una sola llamada a `re.match`.
+
+    Una regla REGEX que no se puede incrustar (grupos propios, cuyas
+    referencias `\\1` cambiarían de número, o flags en línea como `(?i)`, que
+    solo valen al principio de la expresión) va sola en su tramo con su patrón
+    tal cual y `re.search`. Las que no compilan se descartan, como hacía
+    `coincide`.
+    """
+    tramos: list = []
+    ramas: list[str] = []
+    categorias: list[UUID] = []
+    crudo_actual = False
+
+    def _cerrar() -> None:
+        if ramas:
+            tramos.append((re.compile("|".join(ramas), re.IGNORECASE).match, list(categorias), crudo_actual))
+            ramas.clear()
+            categorias.clear()
+
+    for regla in reglas:
+        crudo = regla.tipo_coincidencia == TipoCoincidencia.REGEX
+        if crudo:
+            try:
+                propia = re.compile(regla.patron, re.IGNORECASE)
+            except re.error:
+                continue
+            if propia.groups or not _incrustable(_rama(regla)):
+                _cerrar()
+                tramos.append((propia.search, [regla.categoria_fiscal_id], True))
+                continue
+        if crudo != crudo_actual:
+            _cerrar()
+            crudo_actual = crudo
+        ramas.append(f"{_rama(regla)}(?P<r{len(categorias)}>)")
+        categorias.append(regla.categoria_fiscal_id)
+    _cerrar()
+    return tramos
+
+
+class ClasificadorCompilado:
+    """Reglas activas y derivación por origen, listas para aplicar en memoria.
+
+    `reglas`: filas con patron, tipo_coincidencia, tipo_apunte y
+    categoria_fiscal_id, ya ordenadas por `orden`.
+    """
+
+    def __init__(
+        self,
+        reglas: Sequence,
+        categorias_por_origen: Dict[str, UUID],
+    ):
+        self._reglas = list(reglas)
+        self._por_origen = categorias_por_origen
+        self._por_tipo: Dict[Optional[str], list] = {}
+
+    def _tramos(self, tipo: Optional[str]) -> list:
+        """Tramos compilados para un tipo de apunte (perezoso, uno por tipo)."""
+        tramos = self._por_tipo.get(tipo)
+        if tramos is None:
+            aplicables = [
+                r for r in self._reglas if not r.tipo_apunte or not tipo or r.tipo_apunte == tipo
+            ]
+            tramos = self._por_tipo[tipo] = _compilar(aplicables)
+        return tramos
+
+    def resolver(self, origen: Optional[str], tipo: Optional[str], concepto: Optional[str]) -> Optional[UUID]:
+        """Orden: derivación por origen → primera regla que casa → None."""
+        if origen in self._por_origen:
+            return self._por_origen[origen]
+        if not concepto:
+            return None
+        texto = concepto.lower().strip()
+        for buscar, categorias, crudo in self._tramos(tipo):
+            m = buscar(concepto if crudo else texto)
+            if m:
+                return categorias[0] if len(categorias) == 1 else categorias[int(m.lastgroup[1:])]
+        return None
+
+
+class _CacheClasificador:
+    """Clasificador compilado por proceso, con TTL y carga single-flight."""
+
+    def __init__(self) -> None:
+        self._clasificador: Optional[ClasificadorCompilado] = None
+        self._expira = 0.0
+        self._lock = asyncio.Lock()
+        self.cargas = 0
+
+    async def obtener(self, session: AsyncSession) -> ClasificadorCompilado:
+        clasificador = self._clasificador
+        if clasificador is not None and self._expira > time.monotonic():
+            return clasificador
+        async with self._lock:
+            if self._clasificador is not None and self._expira > time.monotonic():
+                return self._clasificador
+            from app.core.config import get_settings
+
+            # Columnas, no entidades: el clasificador sobrevive a la sesión que lo carga.
+            reglas = await session.execute(
+                select(
+                    ReglaCategorizacion.patron, ReglaCategorizacion.tipo_coincidencia,
+                    ReglaCategorizacion.tipo_apunte, ReglaCategorizacion.categoria_fiscal_id,
+                )
+                .where(ReglaCategorizacion.activa == True, ReglaCategorizacion.eliminado == False)
+                .order_by(ReglaCategorizacion.orden)
+            )
+            categorias = await session.execute(
+                select(CategoriaFiscal.codigo, CategoriaFiscal.id).where(
+                    CategoriaFiscal.codigo.in_(set(_ORIGEN_A_CATEGORIA.values())),
+                    CategoriaFiscal.activa == True,
+                )
+            )
+            por_codigo = dict(categorias.all())
+            self._clasificador = ClasificadorCompilado(
+                reglas.all(),
+                {o: por_codigo[c] for o, c in _ORIGEN_A_CATEGORIA.items() if c in por_codigo},
+            )
+            self._expira = time.monotonic() + get_settings().categorizacion_cache_ttl_seconds
+            self.cargas += 1
+            return self._clasificador
+
+    def invalidar(self) -> None:
+        self._clasificador = None
+        self._expira = 0.0
+
+
+clasificador_cache = _CacheClasificador()
+
+
+def _filtro_ejercicio(ejercicio: Optional[int]) -> list:
+    if not ejercicio:
+        return []
+    return [ApunteCaja.fecha.between(date(ejercicio, 1, 1), date(ejercicio, 12, 31))]
+
 
 class CategorizacionService:
     """Resuelve y aplica la categoría fiscal de los apuntes de caja."""
@@ -35,39 +214,17 @@ class CategorizacionService:
 
     # ── Resolución de categoría ────────────────────────────────────────────────
 
-    async def _categoria_por_codigo(self, codigo: str) -> Optional[CategoriaFiscal]:
-        result = await self.session.execute(
-            select(CategoriaFiscal).where(
-                and_(CategoriaFiscal.codigo == codigo, CategoriaFiscal.activa == True)
-            )
-        )
-        return result.scalars().first()
-
     async def resolver_categoria(self, apunte: ApunteCaja) -> Optional[UUID]:
         """Determina la categoría fiscal de un apunte sin guardarla.
 
         Orden: derivación por origen → reglas por concepto → None (sin clasificar).
         """
-        # 1. Derivación por origen
-        origen = apunte.origen.value if apunte.origen else None
-        if origen and origen in _ORIGEN_A_CATEGORIA:
-            cat = await self._categoria_por_codigo(_ORIGEN_A_CATEGORIA[origen])
-            if cat:
-                return cat.id
-
-        # 2. Reglas por concepto (primera que coincide, por orden)
-        tipo_str = apunte.tipo.value if apunte.tipo else None
-        reglas_result = await self.session.execute(
-            select(ReglaCategorizacion)
-            .where(ReglaCategorizacion.activa == True)
-            .order_by(ReglaCategorizacion.orden)
+        clasificador = await clasificador_cache.obtener(self.session)
+        return clasificador.resolver(
+            apunte.origen.value if apunte.origen else None,
+            apunte.tipo.value if apunte.tipo else None,
+            apunte.concepto,
         )
-        for regla in reglas_result.scalars().all():
-            if regla.coincide(apunte.concepto or "", tipo_str):
-                return regla.categoria_fiscal_id
-
-        # 3. Sin clasificar
-        return None
 
     async def clasificar_apunte(self, apunte: ApunteCaja, forzar: bool = False) -> Optional[UUID]:
         """Resuelve y asigna la categoría a un apunte. No sobrescribe si ya tiene
@@ -89,28 +246,63 @@ class CategorizacionService:
     ) -> Dict[str, int]:
         """Aplica derivación + reglas a todos los apuntes sin clasificar (o a todos si forzar).
 
+        Lee los apuntes por tramos de `_TAMANO_TRAMO` (keyset por id, solo las
+        columnas que intervienen), los resuelve en memoria con el clasificador
+        compilado y escribe con un UPDATE por categoría y tramo.
+
         Devuelve {'procesados': n, 'clasificados': m}.
         """
-        query = select(ApunteCaja).where(ApunteCaja.eliminado == False)
+        clasificador = await clasificador_cache.obtener(self.session)
+        filtros = [ApunteCaja.eliminado == False, *_filtro_ejercicio(ejercicio)]
         if not forzar:
-            query = query.where(ApunteCaja.categoria_fiscal_id.is_(None))
-        if ejercicio:
-            from sqlalchemy import extract
-            query = query.where(extract("year", ApunteCaja.fecha) == ejercicio)
-
-        result = await self.session.execute(query)
-        apuntes = list(result.scalars().all())
-
-        clasificados = 0
-        for apunte in apuntes:
-            categoria_id = await self.resolver_categoria(apunte)
-            if categoria_id and categoria_id != apunte.categoria_fiscal_id:
-                apunte.categoria_fiscal_id = categoria_id
-                self.session.add(apunte)
-                clasificados += 1
+            filtros.append(ApunteCaja.categoria_fiscal_id.is_(None))
+
+        procesados = clasificados = 0
+        ultimo: Optional[UUID] = None
+        while True:
+            query = (
+                select(
+                    ApunteCaja.id, ApunteCaja.origen, ApunteCaja.tipo,
+                    ApunteCaja.concepto, ApunteCaja.categoria_fiscal_id,
+                )
+                .where(*filtros)
+                .order_by(ApunteCaja.id)
+                .limit(_TAMANO_TRAMO)
+            )
+            if ultimo is not None:
+                query = query.where(ApunteCaja.id > ultimo)
+            filas = (await self.session.execute(query)).all()
+            if not filas:
+                break
+            ultimo = filas[-1].id
+            procesados += len(filas)
+
+            por_categoria: Dict[UUID, List[UUID]] = {}
+            for f in filas:
+                categoria_id = clasificador.resolver(
+                    f.origen.value if f.origen else None,
+                    f.tipo.value if f.tipo else None,
+                    f.concepto,
+                )
+                if categoria_id and categoria_id != f.categoria_fiscal_id:
+                    por_categoria.setdefault(categoria_id, []).append(f.id)
+            for categoria_id, ids in por_categoria.items():
+                await self._asignar(ids, categoria_id)
+                clasificados += len(ids)
+            if len(filas) < _TAMANO_TRAMO:
+                break
 
         await self.session.commit()
-        return {"procesados": len(apuntes), "clasificados": clasificados}
+        return {"procesados": procesados, "clasificados": clasificados}
+
+    async def _asignar(self, apunte_ids: List[UUID], categoria_fiscal_id: UUID) -> int:
+        result = await self.session.execute(
+            update(ApunteCaja)
+            .where(ApunteCaja.id == any_(bindparam("ids", apunte_ids, type_=ARRAY(Uuid))))
+            .values(categoria_fiscal_id=categoria_fiscal_id)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
 
     async def asignar_categoria_masiva(
         self,
@@ -128,23 +320,16 @@ class CategorizacionService:
         if not cat.scalars().first():
             raise ValueError(f"Categoría fiscal {categoria_fiscal_id} no encontrada")
 
-        result = await self.session.execute(
-            select(ApunteCaja).where(ApunteCaja.id.in_(apunte_ids))
-        )
-        apuntes = list(result.scalars().all())
-        for apunte in apuntes:
-            apunte.categoria_fiscal_id = categoria_fiscal_id
-            self.session.add(apunte)
+        actualizados = await self._asignar(list(apunte_ids), categoria_fiscal_id)
         await self.session.commit()
-        return len(apuntes)
+        return actualizados
 
     async def contar_sin_clasificar(self, ejercicio: Optional[int] = None) -> int:
         """Cuenta los apuntes pendientes de clasificación."""
-        query = select(ApunteCaja).where(
-            and_(ApunteCaja.eliminado == False, ApunteCaja.categoria_fiscal_id.is_(None))
+        result = await self.session.execute(
+            select(func.count()).select_from(ApunteCaja).where(
+                and_(ApunteCaja.eliminado == False, ApunteCaja.categoria_fiscal_id.is_(None)),
+                *_filtro_ejercicio(ejercicio),
+            )
         )
-        if ejercicio:
-            from sqlalchemy import extract
-            query = query.where(extract("year", ApunteCaja.fecha) == ejercicio)
-        result = await self.session.execute(query)
-        return len(list(result.scalars().all()))
+        return result.scalar_one()
@@ -0,0 +1,183 @@
+"""Emisión en bloque de los certificados de donación de un ejercicio, en segundo plano.
+
+Renderizar los certificados de todo un ejercicio puede llevar minutos: no cabe
+en una respuesta HTTP. La petición solo registra un `LoteCertificadosDonacion`
+y encola `CertificadosDonacionSolicitados` en el outbox, en la misma
+transacción; el relay lo despacha a `procesar_lote`:
+
+1. Reclama el lote (PENDIENTE, ERROR o EN_CURSO sin latido). Si otro proceso
+   lo tiene en curso, falla para que el outbox lo reintente más tarde.
+2. Si aún no tiene `numeros`, numera y marca las donaciones y guarda los
+   números en el lote en UNA transacción.
+3. Renderiza esos certificados en el pool de PDF y escribe el ZIP en un
+   directorio privado (`storage/certificados_donacion/`, mismo criterio que el
+   Libro de Socios). Solo al terminar el ZIP el lote pasa a COMPLETADO.
+
+Si el renderizado falla, el lote queda en ERROR y el reintento del outbox
+regenera exactamente los mismos números: nunca se numera dos veces. Los que ya
+no se puedan regenerar (donaciones anuladas entre tanto) quedan en
+`omitidos`, que se informa con el estado del lote.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from datetime import timedelta
+from pathlib import Path
+from typing import AsyncIterator, Callable, Optional, Tuple
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.events import CertificadosDonacionSolicitados, event_bus
+
+from ..models.donaciones import LoteCertificadosDonacion
+from .donacion_service import DonacionService
+from .pdf.certificado_donacion import generar_pdf_certificado
+from .pdf.render import renderizar_lote, zip_en_flujo
+
+logger = logging.getLogger(__name__)
+
+# Directorio privado (NO montado como estático): los certificados llevan NIF.
+_ZIP_DIR = Path("storage/certificados_donacion")
+# Cada cuánto se renueva el latido mientras se renderiza.
+_INTERVALO_LATIDO = 30.0
+# Sin latido durante este tiempo, un lote EN_CURSO se da por abandonado.
+_SIN_LATIDO = timedelta(minutes=10)
+
+
+def solicitar_lote(
+    session: AsyncSession, ejercicio: int, solo_pendientes: bool = True,
+    usuario_id: Optional[uuid.UUID] = None,
+) -> LoteCertificadosDonacion:
+    """Registra el lote y encola su evento en la transacción de `session` (confirma quien llama)."""
+    lote = LoteCertificadosDonacion(
+        id=uuid.uuid4(), ejercicio=ejercicio, solo_pendientes=solo_pendientes,
+        estado="PENDIENTE", total=0, creado_por_id=usuario_id,
+    )
+    session.add(lote)
+    event_bus.enqueue(session, CertificadosDonacionSolicitados(lote_id=str(lote.id)))
+    return lote
+
+
+async def _reclamar(session: AsyncSession, lote_id: uuid.UUID) -> bool:
+    libre = or_(
+        LoteCertificadosDonacion.estado.in_(("PENDIENTE", "ERROR")),
+        (LoteCertificadosDonacion.estado == "EN_CURSO")
+        & (LoteCertificadosDonacion.latido_en < func.now() - _SIN_LATIDO),
+    )
+    reclamado = await session.scalar(
+        update(LoteCertificadosDonacion)
+        .where(LoteCertificadosDonacion.id == lote_id, libre)
+        .values(estado="EN_CURSO", latido_en=func.now(), error=None)
+        .returning(LoteCertificadosDonacion.id)
+    )
+    await session.commit()
+    return reclamado is not None
+
+
+async def _cfg(session: AsyncSession, *claves: str, default: str) -> str:
+    """Primer valor no vacío de las claves de configuración indicadas."""
+    from app.modules.configuracion.models.configuracion import Configuracion
+    for clave in claves:
+        valor = await session.scalar(select(Configuracion.valor).where(Configuracion.clave == clave))
+        if valor:
+            return valor
+    return default
+
+
+async def _con_latido(
+    session_factory: Callable, lote_id: uuid.UUID,
+    documentos: AsyncIterator[Tuple[str, bytes]],
+) -> AsyncIterator[Tuple[str, bytes]]:
+    ultimo = time.monotonic()
+    async for documento in documentos:
+        yield documento
+        if time.monotonic() - ultimo >= _INTERVALO_LATIDO:
+            ultimo = time.monotonic()
+            async with session_factory() as s:
+                await s.execute(
+                    update(LoteCertificadosDonacion)
+                    .where(LoteCertificadosDonacion.id == lote_id)
+                    .values(latido_en=func.now())
+                )
+                await s.commit()
+
+
+async def procesar_lote(session_factory: Callable, lote_id: uuid.UUID) -> None:
+    """Numera (una sola vez), renderiza y empaqueta el lote. Idempotente."""
+    async with session_factory() as session:
+        if not await _reclamar(session, lote_id):
+            lote = await session.get(LoteCertificadosDonacion, lote_id)
+            if lote is None or lote.estado == "COMPLETADO":
+                return
+            raise RuntimeError(f"Lote de certificados {lote_id} en curso en otro proceso")
+
+        lote = await session.get(LoteCertificadosDonacion, lote_id)
+        nombre = await _cfg(session, "organizacion.nombre", "org.nombre", default="Asociación")
+        nif = await _cfg(session, "organizacion.nif", "org.nif", default="—")
+        servicio = DonacionService(session)
+        temporal = None
+        try:
+            if lote.numeros is None:
+                trabajos = await servicio.preparar_certificados_ejercicio(
+                    lote.ejercicio, nombre, nif, solo_pendientes=lote.solo_pendientes,
+                )
+                lote.numeros = [args[0] for _, args in trabajos]
+                lote.total = len(trabajos)
+                await session.commit()  # numeración + marcado + números del lote
+            else:
+                trabajos = await servicio.preparar_certificados_ejercicio(
+                    lote.ejercicio, nombre, nif, numeros=lote.numeros,
+                )
+                regenerados = {args[0] for _, args in trabajos}
+                lote.omitidos = [n for n in lote.numeros if n not in regenerados] or None
+                if lote.omitidos:
+                    logger.warning("Lote de certificados %s: no se pueden regenerar %s",
+                                   lote.id, ", ".join(lote.omitidos))
+
+            ruta = None
+            if trabajos:
+                _ZIP_DIR.mkdir(parents=True, exist_ok=True)
+                ruta = _ZIP_DIR / f"certificados-{lote.ejercicio}-{lote.id}.zip"
+                temporal = ruta.with_suffix(".zip.part")
+                with temporal.open("wb") as fichero:
+                    documentos = renderizar_lote(generar_pdf_certificado, trabajos)
+                    async for trozo in zip_en_flujo(_con_latido(session_factory, lote.id, documentos)):
+                        await asyncio.to_thread(fichero.write, trozo)
+                temporal.replace(ruta)
+
+            lote.estado = "COMPLETADO"
+            lote.ruta_zip = str(ruta) if ruta else None
+            await session.commit()
+        except Exception as exc:
+            if temporal is not None:
+                temporal.unlink(missing_ok=True)
+            await session.rollback()
+            await session.execute(
+                update(LoteCertificadosDonacion)
+                .where(LoteCertificadosDonacion.id == lote_id)
+                .values(estado="ERROR", error=str(exc)[:1000])
+            )
+            await session.commit()
+            raise
+
+
+def wire_certificados_handlers(session_factory: Callable) -> None:
+    """Suscribe la emisión de lotes de certificados al event bus (vía outbox)."""
+
+    async def _on_certificados_solicitados(ev: CertificadosDonacionSolicitados) -> None:
+        try:
+            lote_id = uuid.UUID(ev.lote_id)
+        except (ValueError, TypeError):
+            logger.warning("CertificadosDonacionSolicitados con lote_id inválido: %r", ev.lote_id)
+            return
+        try:
+            await procesar_lote(session_factory, lote_id)
+        except Exception:
+            logger.exception("Fallo emitiendo el lote de certificados %s", ev.lote_id)
+            raise  # el outbox lo reintentará
+
+    event_bus.subscribe(CertificadosDonacionSolicitados, _on_certificados_solicitados)
@@ -1,7 +1,9 @@
 """Servicio de cierre contable y documentos anuales según PCESFL 2013.
 
 Implementa:
-- Cálculo de saldos por cuenta del ejercicio
+- Cálculo de saldos por cuenta del ejercicio (sobre las instantáneas mensuales
+  de `saldos_mensuales_cuentas`; solo el mes en curso de `fecha_fin` se suma
+  desde los apuntes)
 - Balance estructurado según PCESFL (Activo no corriente / Activo corriente /
   Patrimonio Neto / Pasivo no corriente / Pasivo corriente)
 - Cuenta de Resultados PCESFL (Excedente del ejercicio, no Beneficio/Pérdida)
@@ -12,20 +14,23 @@ Implementa:
 Cumplimiento: Ley 50/2002 art. 34; Código de Comercio art. 25.1; PCESFL norma 18ª.
 """
 
-from datetime import date
+from datetime import date, timedelta
 from decimal import Decimal
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, delete, func, insert, literal_column, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.carga import cargar
+
 from ..models.contabilidad import (
     CuentaContable,
     AsientoContable,
     ApunteContable,
     TipoAsientoContable,
     EstadoAsientoContable,
+    SaldoMensualCuenta,
 )
 from .contabilidad_service import ContabilidadService
 
@@ -124,6 +129,37 @@ def _prefijo_codigo(codigo: str) -> str:
     return (codigo or "")[:3]
 
 
+def _indexar(mapa: Dict[Any, Tuple[str, ...]]) -> Dict[str, Tuple[Any, ...]]:
+    """Invierte un mapa sección → prefijos en prefijo → secciones.
+
+    Un prefijo puede estar en varias secciones (p. ej. 650-654 son gastos de la
+    actividad propia y además ayudas monetarias).
+    """
+    indice: Dict[str, List[Any]] = {}
+    for seccion, prefijos in mapa.items():
+        for prefijo in prefijos:
+            indice.setdefault(prefijo, []).append(seccion)
+    return {prefijo: tuple(secciones) for prefijo, secciones in indice.items()}
+
+
+# Precalculados una vez: cada saldo se reparte con una consulta al diccionario
+# en lugar de recorrer todas las subsecciones.
+SUBSECCIONES_BALANCE: Dict[str, Tuple[Tuple[str, str], ...]] = _indexar({
+    (seccion, subseccion): prefijos
+    for seccion, subsecciones in MAPA_BALANCE.items()
+    for subseccion, prefijos in subsecciones.items()
+})
+SECCIONES_RESULTADOS: Dict[str, Tuple[str, ...]] = _indexar(MAPA_RESULTADOS)
+
+
+def _saldos_por_prefijo(saldos: Dict[str, Decimal]) -> Dict[str, Decimal]:
+    por_prefijo: Dict[str, Decimal] = {}
+    for codigo, saldo in saldos.items():
+        prefijo = _prefijo_codigo(codigo)
+        por_prefijo[prefijo] = por_prefijo.get(prefijo, Decimal("0")) + saldo
+    return por_prefijo
+
+
 class CierreEjercicioService:
     """Servicio para cerrar el ejercicio y generar documentos anuales PCESFL."""
 
@@ -142,29 +178,95 @@ class CierreEjercicioService:
         """Saldo neto (debe - haber) por código de cuenta del ejercicio.
 
         Solo cuenta asientos CONFIRMADOS por defecto (incluir_borradores=False).
+        Los meses completos hasta `fecha_fin` salen de `saldos_mensuales_cuentas`;
+        si `fecha_fin` cae a mitad de mes, ese mes se suma desde los apuntes.
+        Con borradores no hay instantánea que valga y se agregan los apuntes.
         """
+        if incluir_borradores:
+            partes = [self._apuntes(ejercicio, hasta=fecha_fin, incluir_borradores=True)]
+        else:
+            instantaneas = select(
+                SaldoMensualCuenta.cuenta_id, SaldoMensualCuenta.debe, SaldoMensualCuenta.haber,
+            ).where(SaldoMensualCuenta.ejercicio == ejercicio)
+            partes = [instantaneas]
+            if fecha_fin:
+                # Primer día del primer mes que no está completo a `fecha_fin`.
+                siguiente = fecha_fin + timedelta(days=1)
+                corte = siguiente if siguiente.day == 1 else fecha_fin.replace(day=1)
+                partes[0] = instantaneas.where(SaldoMensualCuenta.periodo < corte)
+                if corte <= fecha_fin:
+                    partes.append(self._apuntes(ejercicio, desde=corte, hasta=fecha_fin))
+
+        movimientos = (union_all(*partes) if len(partes) > 1 else partes[0]).subquery()
         q = (
             select(
                 CuentaContable.codigo,
-                func.coalesce(func.sum(ApunteContable.debe), Decimal("0")).label("debe"),
-                func.coalesce(func.sum(ApunteContable.haber), Decimal("0")).label("haber"),
+                func.coalesce(func.sum(movimientos.c.debe), Decimal("0")).label("debe"),
+                func.coalesce(func.sum(movimientos.c.haber), Decimal("0")).label("haber"),
             )
-            .join(ApunteContable, CuentaContable.id == ApunteContable.cuenta_id)
-            .join(AsientoContable, ApunteContable.asiento_id == AsientoContable.id)
-            .where(AsientoContable.ejercicio == ejercicio)
+            .join(movimientos, CuentaContable.id == movimientos.c.cuenta_id)
             .group_by(CuentaContable.codigo)
         )
-        if not incluir_borradores:
-            q = q.where(AsientoContable.estado == EstadoAsientoContable.CONFIRMADO)
-        if fecha_fin:
-            q = q.where(AsientoContable.fecha <= fecha_fin)
-
         result = await self.session.execute(q)
         return {
             row.codigo: (row.debe or Decimal("0")) - (row.haber or Decimal("0"))
             for row in result.all()
         }
 
+    @staticmethod
+    def _apuntes(
+        ejercicio: int,
+        desde: Optional[date] = None,
+        hasta: Optional[date] = None,
+        incluir_borradores: bool = False,
+    ):
+        """Apuntes del ejercicio (cuenta, debe, haber) en un rango de fechas."""
+        q = (
+            select(ApunteContable.cuenta_id, ApunteContable.debe, ApunteContable.haber)
+            .join(AsientoContable, ApunteContable.asiento_id == AsientoContable.id)
+            .where(AsientoContable.ejercicio == ejercicio)
+        )
+        if not incluir_borradores:
+            q = q.where(AsientoContable.estado == EstadoAsientoContable.CONFIRMADO)
+        if desde:
+            q = q.where(AsientoContable.fecha >= desde)
+        if hasta:
+            q = q.where(AsientoContable.fecha <= hasta)
+        return q
+
+    async def recalcular_saldos_mensuales(self, ejercicio: int) -> int:
+        """Reconstruye las instantáneas del ejercicio desde los apuntes.
+
+        Los triggers las mantienen al día; esto es para repararlas (p. ej. tras
+        restaurar una copia parcial). Se expone como la mutación
+        `recalcularSaldosMensuales` y el script app/scripts/recalcular_saldos_mensuales.py.
+        Devuelve el nº de filas (cuenta, mes).
+        """
+        periodo = func.date_trunc("month", AsientoContable.fecha).cast(SaldoMensualCuenta.periodo.type)
+        origen = (
+            select(
+                ApunteContable.cuenta_id,
+                literal_column(str(int(ejercicio))).label("ejercicio"),
+                periodo.label("periodo"),
+                func.sum(ApunteContable.debe),
+                func.sum(ApunteContable.haber),
+            )
+            .join(AsientoContable, ApunteContable.asiento_id == AsientoContable.id)
+            .where(AsientoContable.ejercicio == ejercicio)
+            .where(AsientoContable.estado == EstadoAsientoContable.CONFIRMADO)
+            .group_by(ApunteContable.cuenta_id, periodo)
+        )
+        await self.session.execute(
+            delete(SaldoMensualCuenta).where(SaldoMensualCuenta.ejercicio == ejercicio)
+        )
+        result = await self.session.execute(
+            insert(SaldoMensualCuenta).from_select(
+                ["cuenta_id", "ejercicio", "periodo", "debe", "haber"], origen,
+            )
+        )
+        await self.session.commit()
+        return result.rowcount or 0
+
     # ── Balance PCESFL ───────────────────────────────────────────────────────
 
     async def calcular_balance_pcesfl(
@@ -177,20 +279,15 @@ class CierreEjercicioService:
         """
         saldos = await self.calcular_saldos_cuentas(ejercicio, fecha_fin)
 
-        balance: Dict[str, Dict[str, Decimal]] = {}
-        for seccion, subsecciones in MAPA_BALANCE.items():
-            balance[seccion] = {}
-            for subseccion, prefijos in subsecciones.items():
-                total = Decimal("0")
-                for codigo, saldo in saldos.items():
-                    prefijo = _prefijo_codigo(codigo)
-                    if prefijo in prefijos:
-                        # ACTIVO: saldo positivo (debe > haber); PASIVO/PN: invertimos
-                        if seccion.startswith("activo"):
-                            total += saldo
-                        else:
-                            total += -saldo  # pasivo/PN tienen saldo acreedor (haber > debe)
-                balance[seccion][subseccion] = total
+        balance: Dict[str, Dict[str, Decimal]] = {
+            seccion: {subseccion: Decimal("0") for subseccion in subsecciones}
+            for seccion, subsecciones in MAPA_BALANCE.items()
+        }
+        for prefijo, saldo in _saldos_por_prefijo(saldos).items():
+            for seccion, subseccion in SUBSECCIONES_BALANCE.get(prefijo, ()):
+                # ACTIVO: saldo positivo (debe > haber); PASIVO/PN: invertimos
+                # (tienen saldo acreedor, haber > debe)
+                balance[seccion][subseccion] += saldo if seccion.startswith("activo") else -saldo
 
         # Totales agregados
         balance["totales"] = {
@@ -222,20 +319,21 @@ class CierreEjercicioService:
         """
         saldos = await self.calcular_saldos_cuentas(ejercicio, fecha_fin)
 
-        def sumar(prefijos: Tuple[str, ...], como_ingreso: bool) -> Decimal:
-            total = Decimal("0")
-            for codigo, saldo in saldos.items():
-                if _prefijo_codigo(codigo) in prefijos:
-                    total += -saldo if como_ingreso else saldo
-            return total
-
-        ingresos_propios = sumar(MAPA_RESULTADOS["ingresos_actividad_propia"], como_ingreso=True)
-        gastos_propios = sumar(MAPA_RESULTADOS["gastos_actividad_propia"], como_ingreso=False)
-        ingresos_merc = sumar(MAPA_RESULTADOS["ingresos_mercantil"], como_ingreso=True)
-        gastos_merc = sumar(MAPA_RESULTADOS["gastos_mercantil"], como_ingreso=False)
-        ingresos_fin = sumar(MAPA_RESULTADOS["ingresos_financieros"], como_ingreso=True)
-        gastos_fin = sumar(MAPA_RESULTADOS["gastos_financieros"], como_ingreso=False)
-        impuesto = sumar(MAPA_RESULTADOS["impuesto"], como_ingreso=False)
+        por_seccion = {seccion: Decimal("0") for seccion in MAPA_RESULTADOS}
+        for prefijo, saldo in _saldos_por_prefijo(saldos).items():
+            for seccion in SECCIONES_RESULTADOS.get(prefijo, ()):
+                por_seccion[seccion] += saldo
+
+        def sumar(seccion: str, como_ingreso: bool) -> Decimal:
+            return -por_seccion[seccion] if como_ingreso else por_seccion[seccion]
+
+        ingresos_propios = sumar("ingresos_actividad_propia", como_ingreso=True)
+        gastos_propios = sumar("gastos_actividad_propia", como_ingreso=False)
+        ingresos_merc = sumar("ingresos_mercantil", como_ingreso=True)
+        gastos_merc = sumar("gastos_mercantil", como_ingreso=False)
+        ingresos_fin = sumar("ingresos_financieros", como_ingreso=True)
+        gastos_fin = sumar("gastos_financieros", como_ingreso=False)
+        impuesto = sumar("impuesto", como_ingreso=False)
 
         excedente_actividad_propia = ingresos_propios - gastos_propios
         excedente_mercantil = ingresos_merc - gastos_merc
@@ -479,6 +577,7 @@ class CierreEjercicioService:
                 )
             )
             .order_by(AsientoContable.fecha.desc())
+            .options(*cargar(AsientoContable, "apuntes"))
         )
         cierre = cierre_r.scalars().first()
         if not cierre:
@@ -0,0 +1,150 @@
+"""Motor de conciliación automática extracto ↔ apuntes de caja.
+
+Trabaja en memoria sobre lo que el servicio ya ha leído en dos consultas
+(líneas de extracto y apuntes pendientes), sin tocar la BD:
+
+1. Indexa los apuntes pendientes una sola vez por (cuenta, importe con signo),
+   ordenados por fecha: cada línea del extracto solo mira los apuntes de su
+   mismo importe dentro de ±`tolerancia_dias` (búsqueda binaria).
+2. Puntúa cada candidato: referencia coincidente (1.0), parecido del concepto
+   (`difflib`, 0..1) o solo importe y fecha; a igualdad, gana el más cercano.
+3. Asigna de forma voraz de mejor a peor puntuación, sin repetir apunte ni
+   línea. Una pareja se aplica sola (`automatico`) si es inequívoca; el resto
+   quedan como propuestas para que el tesorero las confirme.
+
+Convención de signo: en el extracto los cargos son negativos; en `ApunteCaja`
+el importe es positivo y el signo lo da el tipo (INGRESO/GASTO).
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from difflib import SequenceMatcher
+from typing import Iterable, Optional
+from uuid import UUID
+
+# Criterios, de más a menos fiable.
+REFERENCIA = "REFERENCIA"
+CONCEPTO = "CONCEPTO"
+IMPORTE = "IMPORTE"
+
+TOLERANCIA_DIAS = 3
+UMBRAL_CONCEPTO = 0.6
+# Ventaja mínima sobre el segundo candidato para aplicar por concepto sin revisión.
+MARGEN_CONCEPTO = 0.15
+
+
+@dataclass(frozen=True)
+class Movimiento:
+    """Una línea de extracto o un apunte, reducidos a lo que se compara."""
+    id: UUID
+    cuenta_id: UUID
+    fecha: date
+    importe: Decimal  # con signo: positivo entra dinero, negativo sale
+    concepto: str = ""
+    referencia: str = ""
+
+
+@dataclass(frozen=True)
+class Emparejamiento:
+    extracto: Movimiento
+    apunte: Movimiento
+    criterio: str
+    puntuacion: float
+    automatico: bool
+
+    @property
+    def dias(self) -> int:
+        return abs((self.extracto.fecha - self.apunte.fecha).days)
+
+
+def normalizar(texto: Optional[str]) -> str:
+    """Mayúsculas, sin tildes y con un solo espacio entre palabras."""
+    if not texto:
+        return ""
+    sin_tildes = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode()
+    return " ".join(re.findall(r"[A-Z0-9]+", sin_tildes.upper()))
+
+
+def _misma_referencia(extracto: Movimiento, apunte: Movimiento) -> bool:
+    ref_e, ref_a = extracto.referencia, apunte.referencia
+    if len(ref_e) >= 4 and (ref_e == ref_a or ref_e in apunte.concepto):
+        return True
+    return len(ref_a) >= 4 and ref_a in extracto.concepto
+
+
+def _puntuar(extracto: Movimiento, apunte: Movimiento) -> tuple[str, float]:
+    if _misma_referencia(extracto, apunte):
+        return REFERENCIA, 1.0
+    if extracto.concepto and apunte.concepto:
+        ratio = SequenceMatcher(None, extracto.concepto, apunte.concepto).ratio()
+        if ratio >= UMBRAL_CONCEPTO:
+            return CONCEPTO, round(ratio, 3)
+    return IMPORTE, 0.0
+
+
+class MotorConciliacion:
+    """Índice de apuntes pendientes y emparejamiento de líneas de extracto."""
+
+    def __init__(self, apuntes: Iterable[Movimiento], tolerancia_dias: int = TOLERANCIA_DIAS):
+        self.tolerancia = timedelta(days=tolerancia_dias)
+        self._indice: dict[tuple[UUID, Decimal], tuple[list[date], list[Movimiento]]] = {}
+        grupos: dict[tuple[UUID, Decimal], list[Movimiento]] = {}
+        for a in apuntes:
+            grupos.setdefault((a.cuenta_id, a.importe), []).append(a)
+        for clave, lista in grupos.items():
+            lista.sort(key=lambda a: a.fecha)
+            self._indice[clave] = ([a.fecha for a in lista], lista)
+
+    def candidatos(self, extracto: Movimiento) -> list[Movimiento]:
+        """Apuntes de la misma cuenta e importe dentro de la ventana de fechas."""
+        entrada = self._indice.get((extracto.cuenta_id, extracto.importe))
+        if entrada is None:
+            return []
+        fechas, apuntes = entrada
+        desde = bisect_left(fechas, extracto.fecha - self.tolerancia)
+        hasta = bisect_right(fechas, extracto.fecha + self.tolerancia)
+        return apuntes[desde:hasta]
+
+    def emparejar(self, extractos: Iterable[Movimiento]) -> list[Emparejamiento]:
+        pares: list[Emparejamiento] = []
+        por_extracto: dict[UUID, list[Emparejamiento]] = {}
+        pretendientes: dict[UUID, int] = {}  # líneas que aspiran a cada apunte
+        for e in extractos:
+            opciones = []
+            for a in self.candidatos(e):
+                criterio, puntuacion = _puntuar(e, a)
+                opciones.append(Emparejamiento(e, a, criterio, puntuacion, False))
+                pretendientes[a.id] = pretendientes.get(a.id, 0) + 1
+            por_extracto[e.id] = opciones
+            pares.extend(opciones)
+
+        pares.sort(key=lambda p: (-p.puntuacion, p.dias))
+        usados_e: set[UUID] = set()
+        usados_a: set[UUID] = set()
+        resultado = []
+        for p in pares:
+            if p.extracto.id in usados_e or p.apunte.id in usados_a:
+                continue
+            usados_e.add(p.extracto.id)
+            usados_a.add(p.apunte.id)
+            automatico = _inequivoco(p, por_extracto[p.extracto.id], pretendientes[p.apunte.id])
+            resultado.append(Emparejamiento(p.extracto, p.apunte, p.criterio, p.puntuacion, automatico))
+        resultado.sort(key=lambda p: (p.extracto.fecha, str(p.extracto.id)))
+        return resultado
+
+
+def _inequivoco(par: Emparejamiento, opciones: list[Emparejamiento], pretendientes: int) -> bool:
+    """¿Se puede aplicar sin que nadie lo revise?"""
+    if par.criterio == REFERENCIA:
+        return True
+    otras = [o.puntuacion for o in opciones if o.apunte.id != par.apunte.id]
+    if par.criterio == CONCEPTO:
+        return not otras or par.puntuacion - max(otras) >= MARGEN_CONCEPTO
+    # Solo importe: único candidato, único aspirante y mismo día.
+    return not otras and pretendientes == 1 and par.dias == 0
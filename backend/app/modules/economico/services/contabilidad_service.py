@@ -8,6 +8,8 @@ from uuid import UUID
 from sqlalchemy import select, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.carga import cargar
+
 from ..models.contabilidad import (
     CuentaContable,
     AsientoContable,
@@ -180,10 +182,16 @@ class ContabilidadService:
         await self.session.refresh(asiento)
         return asiento
 
-    async def obtener_asiento(self, asiento_id: UUID) -> Optional[AsientoContable]:
-        result = await self.session.execute(
-            select(AsientoContable).where(AsientoContable.id == asiento_id)
-        )
+    async def obtener_asiento(self, asiento_id: UUID, *rutas: str) -> Optional[AsientoContable]:
+        """Obtiene un asiento cargando las relaciones indicadas en `rutas`.
+
+        Con rutas se repueblan también las colecciones ya cargadas en la sesión,
+        para que las comprobaciones de cuadre vean los apuntes recién añadidos.
+        """
+        q = select(AsientoContable).where(AsientoContable.id == asiento_id)
+        if rutas:
+            q = q.options(*cargar(AsientoContable, *rutas)).execution_options(populate_existing=True)
+        result = await self.session.execute(q)
         return result.scalars().first()
 
     async def listar_asientos(
@@ -284,7 +292,7 @@ class ContabilidadService:
 
     async def confirmar_asiento(self, asiento_id: UUID) -> AsientoContable:
         """Confirma un asiento — debe estar cuadrado (debe == haber)."""
-        asiento = await self.obtener_asiento(asiento_id)
+        asiento = await self.obtener_asiento(asiento_id, "apuntes")
         if not asiento:
             raise ValueError(f"Asiento {asiento_id} no encontrado")
         asiento.confirmar()  # Lanza ValueError si no cuadra
@@ -7,7 +7,9 @@ Operaciones:
   - previsualizar_generacion(): calcula nº de miembros y total esperado por tipo
     sin tocar la BD.
   - generar_cuotas_individuales(): crea `CuotaAnual` para cada miembro activo,
-    aplicando el motivo de reducción del TipoMiembro. Idempotente.
+    aplicando el motivo de reducción del TipoMiembro. Idempotente. Trabaja por
+    conjuntos: lee tuplas de columnas por lotes (keyset) e inserta en bloques
+    multi-fila; con `simular=True` solo devuelve los totales.
   - recalcular_cuota(): recalcula el importe de una cuota con la config actual.
 
 Decisiones aplicadas:
@@ -23,11 +25,13 @@ from __future__ import annotations
 from datetime import date
 from decimal import Decimal
 from typing import Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, and_, exists, func, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.carga import cargar
+
 from ..models.cuotas import (
     CuotaAnual,
     ImporteCuotaAnio,
@@ -39,6 +43,10 @@ from app.modules.configuracion.models.estados import EstadoCuota
 
 CODIGO_CUOTA_BASE = "BASE"  # codigo_cuota reservado para la cuota base del ejercicio
 
+# Vinculaciones leídas por lote y filas por INSERT multi-fila al generar cuotas.
+_TAMANO_LOTE_GENERACION = 5000
+_TAMANO_BLOQUE_INSERT = 1000
+
 # Estados de planificación en los que los importes de ingresos son editables
 _ESTADOS_EDITABLES_PRESUPUESTO = ("BORRADOR", "PROPUESTO")
 
@@ -147,14 +155,15 @@ class CuotaService:
     # ── Socios y tipos (modelo Contacto/Vinculacion/Membresia) ────────────────
 
     async def _vinculaciones_socio_activas(self) -> list:
-        """Vinculaciones de tipo SOCIO en estado 'activa' (con satélite Socio y
-        contacto, cargados por selectin)."""
+        """Vinculaciones de tipo SOCIO en estado 'activa' (con satélite Socio,
+        su motivo de reducción y el contacto ya cargados)."""
         from app.modules.membresia.models.vinculacion import Vinculacion
         from app.modules.membresia.models.tipo_vinculacion import TipoVinculacion
         r = await self.session.execute(
             select(Vinculacion)
             .join(TipoVinculacion, Vinculacion.tipo_vinculacion_id == TipoVinculacion.id)
             .where(TipoVinculacion.codigo == "SOCIO", Vinculacion.estado == "activa")
+            .options(*cargar(Vinculacion, "socio.motivo_reduccion", "contacto"))
         )
         return list(r.scalars().all())
 
@@ -168,6 +177,7 @@ class CuotaService:
             select(Participacion.contacto_id, Membresia)
             .join(Membresia, Membresia.participacion_id == Participacion.id)
             .where(Participacion.contacto_id.in_(ids), Participacion.tipo == "MEMBRESIA")
+            .options(*cargar(Membresia, "tipo_miembro.motivo_reduccion"))
         )
         return {cid: mb.tipo_miembro for (cid, mb) in r.all()}
 
@@ -202,7 +212,10 @@ class CuotaService:
                 cuenta_por_tipo[tm.id] = cuenta_por_tipo.get(tm.id, 0) + 1
 
         # Cargar tipos con su motivo
-        tipos_r = await self.session.execute(select(TipoMiembro).where(TipoMiembro.activo == True))
+        tipos_r = await self.session.execute(
+            select(TipoMiembro).where(TipoMiembro.activo == True)
+            .options(*cargar(TipoMiembro, "motivo_reduccion"))
+        )
         tipos = list(tipos_r.scalars().all())
 
         desglose = []
@@ -252,13 +265,61 @@ class CuotaService:
             "total_esperado": float(total_esperado),
         }
 
+    def _consulta_generacion(self, ejercicio: int):
+        """Una tupla por vinculación SOCIO 'activa' con lo que decide su cuota:
+        cuota ya existente, agrupación, motivo del socio, motivo de su tipo de
+        miembro (vía Membresía) e incremento voluntario. Sin objetos ORM."""
+        from app.modules.membresia.models.contacto import Contacto
+        from app.modules.membresia.models.participacion import Participacion, Membresia
+        from app.modules.membresia.models.tipo_vinculacion import TipoVinculacion
+        from app.modules.membresia.models.vinculacion import Socio, Vinculacion
+
+        motivo_tipo = (
+            select(TipoMiembro.motivo_reduccion_id)
+            .join(Membresia, Membresia.tipo_miembro_id == TipoMiembro.id)
+            .join(Participacion, Membresia.participacion_id == Participacion.id)
+            .where(
+                Participacion.contacto_id == Vinculacion.contacto_id,
+                Participacion.tipo == "MEMBRESIA",
+            )
+            .limit(1)
+            .scalar_subquery()
+        )
+        return (
+            select(
+                Vinculacion.id,
+                exists().where(
+                    CuotaAnual.vinculacion_socio_id == Vinculacion.id,
+                    CuotaAnual.ejercicio == ejercicio,
+                ).label("existente"),
+                func.coalesce(Vinculacion.agrupacion_id, Contacto.agrupacion_id).label("agrupacion_id"),
+                Socio.motivo_reduccion_id.label("motivo_socio_id"),
+                motivo_tipo.label("motivo_tipo_id"),
+                Socio.incremento_cuota,
+            )
+            .join(TipoVinculacion, Vinculacion.tipo_vinculacion_id == TipoVinculacion.id)
+            .outerjoin(Contacto, Contacto.id == Vinculacion.contacto_id)
+            .outerjoin(Socio, Socio.vinculacion_id == Vinculacion.id)
+            .where(TipoVinculacion.codigo == "SOCIO", Vinculacion.estado == "activa")
+            .order_by(Vinculacion.id)
+            .limit(_TAMANO_LOTE_GENERACION)
+        )
+
     async def generar_cuotas_individuales(
         self,
         ejercicio: int,
         fecha_vencimiento: Optional[date] = None,
+        simular: bool = False,
     ) -> dict:
         """Crea CuotaAnual para cada miembro activo según D1.2/D1.4. Idempotente.
 
+        Lee los socios por lotes como tuplas de columnas (keyset por id de
+        vinculación) y aplica en memoria las reglas de motivo (D1.7: el del
+        socio prevalece sobre el de su tipo), exclusión (D1.4) e incremento
+        voluntario; las cuotas se insertan en bloques multi-fila y se confirma
+        una sola vez al final. Con `simular=True` no escribe nada: devuelve los
+        mismos totales que produciría la generación.
+
         Devuelve: {n_creadas, n_omitidas_existentes, n_omitidas_excluidas, total_importe}
         """
         config = await self.obtener_configuracion(ejercicio)
@@ -274,60 +335,63 @@ class CuotaService:
         if not est_pend:
             raise ValueError("Estado de cuota 'Pendiente' no encontrado en BD")
 
-        # Cuotas ya existentes (set de vinculacion_socio_id)
-        ya_r = await self.session.execute(
-            select(CuotaAnual.vinculacion_socio_id).where(CuotaAnual.ejercicio == ejercicio)
-        )
-        ya = {row[0] for row in ya_r.all()}
-
-        # Socios activos: vinculación SOCIO 'activa' (+ satélite Socio). El tipo de
-        # miembro sale de la Membresía del contacto.
-        vinculaciones = await self._vinculaciones_socio_activas()
-        tipo_por_contacto = await self._tipos_miembro_por_contacto(
-            [v.contacto_id for v in vinculaciones]
-        )
+        # Catálogo de motivos (pequeño): sus reglas se aplican sobre las tuplas.
+        motivos_r = await self.session.execute(select(MotivoReduccionCuota))
+        motivos = {m.id: m for m in motivos_r.scalars().all()}
 
         n_creadas = 0
         n_omitidas_existentes = 0
         n_omitidas_excluidas = 0
         total_importe = Decimal("0.00")
 
-        for v in vinculaciones:
-            if v.id in ya:
-                n_omitidas_existentes += 1
-                continue
-            socio = v.socio
-            tipo_miembro = tipo_por_contacto.get(v.contacto_id)
-            # D1.7: override individual (socio) prevalece sobre el motivo del tipo
-            motivo = (socio.motivo_reduccion if socio else None) or (
-                tipo_miembro.motivo_reduccion if tipo_miembro else None
-            )
-            if motivo and motivo.excluye_cuota:
-                n_omitidas_excluidas += 1
-                continue
-            importe_efectivo = motivo.aplicar_a(importe_base) if motivo else importe_base
-            # Incremento voluntario del socio: se suma al importe (no requiere aprobación)
-            importe_efectivo = importe_efectivo + (
-                (socio.incremento_cuota if socio else None) or Decimal("0.00")
-            )
-
-            cuota = CuotaAnual(
-                vinculacion_socio_id=v.id,
-                ejercicio=ejercicio,
-                agrupacion_id=v.agrupacion_id or (v.contacto.agrupacion_id if v.contacto else None),
-                importe_cuota_anio_id=config.id,
-                codigo_cuota=motivo.codigo if motivo else CODIGO_CUOTA_BASE,
-                importe=importe_efectivo,
-                importe_pagado=Decimal("0.00"),
-                estado_id=est_pend.id,
-                fecha_vencimiento=fecha_vencimiento,
-                motivo_reduccion_id=motivo.id if motivo else None,
+        consulta = self._consulta_generacion(ejercicio)
+        ultimo_id = None
+        while True:
+            q = consulta if ultimo_id is None else consulta.where(
+                consulta.selected_columns.id > ultimo_id
             )
-            self.session.add(cuota)
-            n_creadas += 1
-            total_importe += importe_efectivo
+            filas = (await self.session.execute(q)).all()
+            if not filas:
+                break
+            ultimo_id = filas[-1].id
+
+            nuevas = []
+            for f in filas:
+                if f.existente:
+                    n_omitidas_existentes += 1
+                    continue
+                # D1.7: override individual (socio) prevalece sobre el motivo del tipo
+                motivo = motivos.get(f.motivo_socio_id) or motivos.get(f.motivo_tipo_id)
+                if motivo and motivo.excluye_cuota:
+                    n_omitidas_excluidas += 1
+                    continue
+                importe_efectivo = motivo.aplicar_a(importe_base) if motivo else importe_base
+                # Incremento voluntario del socio: se suma al importe (no requiere aprobación)
+                importe_efectivo = importe_efectivo + (f.incremento_cuota or Decimal("0.00"))
+                n_creadas += 1
+                total_importe += importe_efectivo
+                nuevas.append({
+                    "id": uuid4(),
+                    "vinculacion_socio_id": f.id,
+                    "ejercicio": ejercicio,
+                    "agrupacion_id": f.agrupacion_id,
+                    "importe_cuota_anio_id": config.id,
+                    "codigo_cuota": motivo.codigo if motivo else CODIGO_CUOTA_BASE,
+                    "importe": importe_efectivo,
+                    "importe_pagado": Decimal("0.00"),
+                    "gastos_gestion": Decimal("0.00"),
+                    "estado_id": est_pend.id,
+                    "fecha_vencimiento": fecha_vencimiento,
+                    "motivo_reduccion_id": motivo.id if motivo else None,
+                })
+            if not simular:
+                for i in range(0, len(nuevas), _TAMANO_BLOQUE_INSERT):
+                    await self.session.execute(
+                        insert(CuotaAnual).values(nuevas[i:i + _TAMANO_BLOQUE_INSERT])
+                    )
 
-        await self.session.commit()
+        if not simular:
+            await self.session.commit()
         return {
             "ejercicio": ejercicio,
             "n_creadas": n_creadas,
@@ -343,7 +407,10 @@ class CuotaService:
         evitar incoherencias. Para cuotas confirmadas, debe usarse un flujo de
         ajuste contable que está fuera de este flujo.
         """
-        cuota_r = await self.session.execute(select(CuotaAnual).where(CuotaAnual.id == cuota_id))
+        cuota_r = await self.session.execute(
+            select(CuotaAnual).where(CuotaAnual.id == cuota_id)
+            .options(*cargar(CuotaAnual, "vinculacion_socio.socio.motivo_reduccion"))
+        )
         cuota = cuota_r.scalars().first()
         if not cuota:
             raise ValueError(f"Cuota {cuota_id} no encontrada")
@@ -3,6 +3,10 @@
 Implementa el alta, cobro, anulación y emisión de certificado fiscal de
 donaciones (Ley 49/2002). Genera automáticamente ApunteCaja + asiento contable
 al pasar a COBRADA (D6.2).
+
+Los PDF de certificado se renderizan en el pool de `pdf/render.py`; la emisión
+de todo un ejercicio prepara los trabajos en una pasada y la ejecuta un lote en
+segundo plano (`certificados_lote_service.py`) que deja el ZIP para descargar.
 """
 
 from datetime import date
@@ -13,7 +17,11 @@ from uuid import UUID
 from sqlalchemy import select, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.carga import cargar
+
 from ..models.donaciones import Donacion
+from .pdf.certificado_donacion import LineaCertificado, generar_pdf_certificado
+from .pdf.render import renderizar
 from app.modules.configuracion.models.estados import EstadoDonacion
 
 
@@ -29,9 +37,11 @@ class DonacionService:
         )
         return r.scalars().first()
 
-    async def obtener(self, donacion_id: UUID) -> Optional[Donacion]:
+    async def obtener(self, donacion_id: UUID, *rutas: str) -> Optional[Donacion]:
+        """Donación por id; `rutas` son las relaciones que se van a leer."""
         r = await self.session.execute(
             select(Donacion).where(Donacion.id == donacion_id)
+            .options(*cargar(Donacion, *rutas))
         )
         return r.scalars().first()
 
@@ -43,7 +53,7 @@ class DonacionService:
         donante_telefono: Optional[str], anonima: bool,
     ) -> Optional[UUID]:
         """Resuelve el donante a un Contacto. Anónima -> None. Con contacto_id ->
-        ese. Si no, busca por NIF (numero_documento) y, si no existe y hay datos,
+        ese. Si no, busca por NIF (índice ciego de numero_documento) y, si no existe y hay datos,
         crea un Contacto PERSONA_FISICA al vuelo."""
         if anonima:
             return None
@@ -54,7 +64,7 @@ class DonacionService:
         if nif:
             existente = await self.session.scalar(
                 select(Contacto).where(
-                    func.upper(Contacto.numero_documento) == nif,
+                    Contacto.con_documento(nif),
                     Contacto.eliminado.is_(False),
                 )
             )
@@ -175,7 +185,7 @@ class DonacionService:
         """Pasa REGISTRADA → COBRADA y genera ApunteCaja + asiento (D6.2)."""
         from ..models.tesoreria import ApunteCaja, TipoApunte, OrigenApunte
 
-        donacion = await self.obtener(donacion_id)
+        donacion = await self.obtener(donacion_id, "estado", "contacto")
         if not donacion:
             raise ValueError(f"Donación {donacion_id} no encontrada")
 
@@ -268,7 +278,7 @@ class DonacionService:
         """Pasa a ANULADA. Si tenía asiento contable, lo deja en estado ANULADO."""
         from .contabilidad_service import ContabilidadService
 
-        donacion = await self.obtener(donacion_id)
+        donacion = await self.obtener(donacion_id, "estado")
         if not donacion:
             raise ValueError(f"Donación {donacion_id} no encontrada")
 
@@ -312,7 +322,7 @@ class DonacionService:
                 Donacion.fecha >= date(ejercicio, 1, 1),
                 Donacion.fecha <= date(ejercicio, 12, 31),
             )
-        )
+        ).options(*cargar(Donacion, "contacto"))
         r = await self.session.execute(q)
         donaciones = list(r.scalars().all())
 
@@ -371,7 +381,7 @@ class DonacionService:
                 Donacion.fecha <= date(ejercicio, 12, 31),
                 Donacion.tipo == tipo,
             )
-        )
+        ).options(*cargar(Donacion, "contacto"))
         r = await self.session.execute(q)
         donaciones = list(r.scalars().all())
 
@@ -406,138 +416,125 @@ class DonacionService:
             for d in donaciones_donante
         )
 
-        # Generar PDF
-        pdf_bytes = _generar_pdf_certificado(
-            numero_certificado=numero,
-            ejercicio=ejercicio,
-            organizacion_nombre=organizacion_nombre,
-            organizacion_nif=organizacion_nif,
-            donante_nif=nif_norm,
-            donante_nombre=nombre,
-            tipo=tipo,
-            total=total,
-            donaciones=donaciones_donante,
+        # Generar PDF (en el pool de renderizado)
+        pdf_bytes = await renderizar(
+            generar_pdf_certificado,
+            numero, ejercicio, organizacion_nombre, organizacion_nif,
+            nif_norm, nombre, tipo, total, _lineas_certificado(donaciones_donante),
         )
 
-        # Marcar todas las donaciones como certificadas, una de ellas guarda el número
-        hoy = date.today()
-        for i, d in enumerate(donaciones_donante):
-            d.certificado_emitido = True
-            d.fecha_certificado = hoy
-            if i == 0:
-                d.numero_certificado = numero
-            self.session.add(d)
+        _marcar_certificadas(self.session, donaciones_donante, numero)
         await self.session.commit()
 
         return numero, pdf_bytes
 
+    async def preparar_certificados_ejercicio(
+        self,
+        ejercicio: int,
+        organizacion_nombre: str,
+        organizacion_nif: str,
+        solo_pendientes: bool = True,
+        numeros: Optional[list[str]] = None,
+    ) -> list[tuple[str, tuple]]:
+        """Prepara de una vez los certificados de todos los donantes del ejercicio.
+
+        Una sola lectura de las donaciones COBRADAS (no anónimas) del ejercicio,
+        agrupadas por (NIF, tipo). Los grupos ya certificados por completo
+        conservan su número (volver a descargarlos no renumera); con
+        `solo_pendientes` se omiten. Los demás se numeran correlativamente y se
+        marcan, SIN confirmar: confirma quien llama, junto con lo que deba ir en
+        la misma transacción. Con `numeros` no se numera ni se marca nada: solo
+        se regeneran los certificados con esos números, con las donaciones que
+        ya cubrían (las cobradas después quedan pendientes).
+
+        Devuelve los trabajos `(nombre_fichero, args)` para
+        `renderizar_lote(generar_pdf_certificado, ...)`, sin objetos ORM.
+        """
+        est_cobrada = await self._estado("COBRADA")
+        if not est_cobrada:
+            raise ValueError("Estado 'COBRADA' no encontrado.")
 
-# ────────────────────────────────────────────────────────────────────────────
-# PDF certificado (Ley 49/2002 art. 24) — D6.3
-# ────────────────────────────────────────────────────────────────────────────
-
-def _generar_pdf_certificado(
-    numero_certificado: str,
-    ejercicio: int,
-    organizacion_nombre: str,
-    organizacion_nif: str,
-    donante_nif: str,
-    donante_nombre: str,
-    tipo: str,
-    total,
-    donaciones: list[Donacion],
-) -> bytes:
-    from io import BytesIO
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import cm
-    from reportlab.platypus import (
-        SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
-    )
-    from reportlab.lib import colors
-
-    buf = BytesIO()
-    doc = SimpleDocTemplate(
-        buf, pagesize=A4,
-        leftMargin=2.5 * cm, rightMargin=2.5 * cm,
-        topMargin=2 * cm, bottomMargin=2 * cm,
-        title=f"Certificado de donación {numero_certificado}",
-        author=organizacion_nombre,
-    )
-
-    styles = getSampleStyleSheet()
-    h1 = ParagraphStyle("h1", parent=styles["Heading1"], fontSize=18,
-                        alignment=1, textColor=colors.HexColor("#1e3a8a"))
-    h2 = ParagraphStyle("h2", parent=styles["Heading2"], fontSize=12,
-                        textColor=colors.HexColor("#1e3a8a"), spaceBefore=12)
-    body = ParagraphStyle("body", parent=styles["BodyText"], fontSize=11, leading=14)
-    small = ParagraphStyle("small", parent=styles["BodyText"], fontSize=9,
-                            textColor=colors.HexColor("#475569"))
-
-    elements = []
-    elements.append(Paragraph(f"<b>Certificado de donación</b>", h1))
-    elements.append(Paragraph(f"Nº {numero_certificado} · Ejercicio {ejercicio}", small))
-    elements.append(Spacer(1, 16))
-
-    clave = "A — Donativo dinerario" if tipo == "DINERARIA" else "B — Donativo en especie"
-    elements.append(Paragraph(
-        f"<b>{organizacion_nombre}</b>, con NIF <b>{organizacion_nif}</b>, "
-        f"certifica que ha recibido de <b>{donante_nombre}</b> (NIF <b>{donante_nif}</b>) "
-        f"durante el ejercicio fiscal {ejercicio}, donativos por importe total de "
-        f"<b>{_fmt_eur(total)}</b> ({clave}).",
-        body,
-    ))
-
-    elements.append(Paragraph("Detalle de las donaciones del ejercicio", h2))
-    data = [["Fecha", "Forma de pago", "Importe"]]
-    for d in donaciones:
-        data.append([
-            d.fecha.isoformat() if d.fecha else "—",
-            d.modo_ingreso or "—",
-            _fmt_eur(d.valoracion if d.tipo == "ESPECIE" else d.importe),
-        ])
-    tbl = Table(data, colWidths=[3 * cm, 8 * cm, 4 * cm])
-    tbl.setStyle(TableStyle([
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("FONTSIZE", (0, 0), (-1, -1), 10),
-        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1e3a8a")),
-        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-        ("BOX", (0, 0), (-1, -1), 0.5, colors.HexColor("#cbd5e1")),
-        ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.HexColor("#e2e8f0")),
-        ("ALIGN", (-1, 1), (-1, -1), "RIGHT"),
-        ("FONTNAME", (-1, 1), (-1, -1), "Courier"),
-    ]))
-    elements.append(tbl)
-
-    elements.append(Spacer(1, 16))
-    elements.append(Paragraph(
-        "<i>La entidad está acogida al régimen especial de la Ley 49/2002, de 23 de "
-        "diciembre, de régimen fiscal de las entidades sin fines lucrativos y de los "
-        "incentivos fiscales al mecenazgo.</i>",
-        body,
-    ))
-    elements.append(Paragraph(
-        "<i>La donación es irrevocable, pura y simple, según la legislación vigente.</i>",
-        body,
-    ))
-    elements.append(Spacer(1, 20))
-    elements.append(Paragraph(
-        f"Emitido el {date.today().strftime('%d/%m/%Y')}",
-        small,
-    ))
-    elements.append(Spacer(1, 30))
-    elements.append(Paragraph(
-        "______________________________<br/>"
-        f"Firma y sello de {organizacion_nombre}",
-        small,
-    ))
-
-    doc.build(elements)
-    return buf.getvalue()
-
-
-def _fmt_eur(v) -> str:
-    try:
-        return f"{float(v):,.2f} €".replace(",", "X").replace(".", ",").replace("X", ".")
-    except (TypeError, ValueError):
-        return str(v)
+        q = select(Donacion).where(
+            and_(
+                Donacion.estado_id == est_cobrada.id,
+                Donacion.eliminado.is_(False),
+                Donacion.anonima.is_(False),
+                Donacion.fecha >= date(ejercicio, 1, 1),
+                Donacion.fecha <= date(ejercicio, 12, 31),
+            )
+        ).order_by(Donacion.fecha, Donacion.id).options(*cargar(Donacion, "contacto"))
+        donaciones = list((await self.session.execute(q)).scalars().all())
+
+        grupos: dict[tuple[str, str], tuple[str, list[Donacion]]] = {}
+        for d in donaciones:
+            c = d.contacto
+            nif = (getattr(c, "numero_documento", None) or "").strip().upper() if c else ""
+            if not nif:
+                continue  # no certificable sin NIF
+            nombre, lista = grupos.setdefault((nif, d.tipo), (c.nombre_completo or "", []))
+            lista.append(d)
+        if numeros is not None:
+            # Reintento: solo lo que ya se numeró en cada grupo. Una donación cobrada
+            # después queda pendiente para otro lote y no deja al grupo sin su número.
+            grupos = {
+                clave: (nombre, certificadas) for clave, (nombre, lista) in grupos.items()
+                if (certificadas := [d for d in lista if d.certificado_emitido])
+            }
+        emitidos = {clave: _numero_emitido(lista) for clave, (_, lista) in grupos.items()}
+        if numeros is not None:
+            grupos = {clave: grupo for clave, grupo in grupos.items() if emitidos[clave] in numeros}
+        elif solo_pendientes:
+            grupos = {clave: grupo for clave, grupo in grupos.items() if not emitidos[clave]}
+        if not grupos:
+            return []
+
+        siguiente = None
+        if numeros is None and not all(emitidos[clave] for clave in grupos):
+            cnt_r = await self.session.execute(
+                select(func.count(Donacion.id)).where(
+                    Donacion.numero_certificado.like(f"CERT-{ejercicio}-%")
+                )
+            )
+            siguiente = (cnt_r.scalar() or 0) + 1
+
+        trabajos = []
+        for (nif, tipo), (nombre, lista) in sorted(grupos.items()):
+            numero = emitidos[(nif, tipo)]
+            if not numero:
+                numero = f"CERT-{ejercicio}-{siguiente:05d}"
+                siguiente += 1
+                _marcar_certificadas(self.session, lista, numero)
+            total = sum(
+                (d.valoracion if d.tipo == "ESPECIE" else d.importe) or Decimal("0")
+                for d in lista
+            )
+            trabajos.append((f"{numero}_{nif}.pdf", (
+                numero, ejercicio, organizacion_nombre, organizacion_nif,
+                nif, nombre, tipo, total, _lineas_certificado(lista),
+            )))
+        return trabajos
+
+
+def _numero_emitido(donaciones: list[Donacion]) -> Optional[str]:
+    """Número del certificado que ya cubre todo el grupo (None si falta alguna)."""
+    if not all(d.certificado_emitido for d in donaciones):
+        return None
+    return next((d.numero_certificado for d in donaciones if d.numero_certificado), None)
+
+
+def _lineas_certificado(donaciones: list[Donacion]) -> list[LineaCertificado]:
+    return [
+        (d.fecha, d.modo_ingreso, d.valoracion if d.tipo == "ESPECIE" else d.importe)
+        for d in donaciones
+    ]
+
+
+def _marcar_certificadas(session: AsyncSession, donaciones: list[Donacion], numero: str) -> None:
+    """Marca las donaciones como certificadas; la primera guarda el número."""
+    hoy = date.today()
+    for i, d in enumerate(donaciones):
+        d.certificado_emitido = True
+        d.fecha_certificado = hoy
+        if i == 0:
+            d.numero_certificado = numero
+        session.add(d)
@@ -14,6 +14,8 @@ from uuid import UUID
 from sqlalchemy import select, func, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.carga import cargar
+
 from ..models.justificantes_gasto import (
     JustificanteGasto, JustificanteGastoLinea, JustificanteGastoDocumento,
 )
@@ -299,7 +301,7 @@ class JustificanteGastoService:
           3. `justificante.cuenta_contable_id` si ya estaba fijada (presentación legacy).
           4. Error: tesorero debe elegirla en el modal de pago.
         """
-        justificante = await self.obtener(justificante_id)
+        justificante = await self.obtener(justificante_id, "miembro")
         if not justificante:
             raise ValueError(f"Justificante {justificante_id} no encontrado")
         if not justificante.puede_pagarse:
@@ -318,6 +320,7 @@ class JustificanteGastoService:
             # Buscar cuenta_contable_default del tipo de actividad
             r = await self.session.execute(
                 select(Actividad).where(Actividad.id == justificante.actividad_id)
+                .options(*cargar(Actividad, "tipo_actividad"))
             )
             act = r.scalars().first()
             if act and act.tipo_actividad and act.tipo_actividad.cuenta_contable_default_id:
@@ -403,9 +406,11 @@ class JustificanteGastoService:
 
     # ── Consulta ─────────────────────────────────────────────────────────────
 
-    async def obtener(self, justificante_id: UUID) -> Optional[JustificanteGasto]:
+    async def obtener(self, justificante_id: UUID, *rutas: str) -> Optional[JustificanteGasto]:
+        """Justificante por id; `rutas` son las relaciones que se van a leer."""
         r = await self.session.execute(
             select(JustificanteGasto).where(JustificanteGasto.id == justificante_id)
+            .options(*cargar(JustificanteGasto, *rutas))
         )
         return r.scalars().first()
 
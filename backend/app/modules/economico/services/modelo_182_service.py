@@ -14,6 +14,9 @@ from uuid import UUID
 from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.carga import cargar
+from app.core.indice_ciego import en_claro
+
 from ..models.donaciones import Donacion
 from ..models.modelo_182 import Presentacion182
 from ..models.cobro import EstadoPago
@@ -71,7 +74,7 @@ class Modelo182Service:
                 Donacion.fecha <= date(ejercicio, 12, 31),
                 Donacion.anonima.is_(False),
             )
-        )
+        ).options(*cargar(Donacion, "contacto"))
         r = await self.session.execute(q)
         donaciones = list(r.scalars().all())
 
@@ -80,9 +83,10 @@ class Modelo182Service:
         excluidos: list[dict] = []
 
         for d in donaciones:
-            # El donante es un Contacto; NIF y nombre salen de él.
+            # El donante es un Contacto; NIF y nombre salen de él. El NIF puede
+            # estar cifrado: se descifra solo el de los donantes del ejercicio.
             c = d.contacto
-            nif_raw: Optional[str] = getattr(c, "numero_documento", None) if c else None
+            nif_raw: Optional[str] = en_claro(getattr(c, "numero_documento", None)) if c else None
             nombre: Optional[str] = (c.nombre_completo if c else None)
 
             nif = _normalizar_nif(nif_raw or "")
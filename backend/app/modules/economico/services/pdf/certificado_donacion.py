@@ -0,0 +1,128 @@
+"""PDF del certificado anual de donaciones (Ley 49/2002 art. 24) — D6.3.
+
+Generado con ReportLab. `generar_pdf_certificado` recibe solo datos planos
+para poder ejecutarse en el pool de renderizado (ver `render.py`); los estilos
+se construyen una vez por proceso.
+"""
+from datetime import date
+from decimal import Decimal
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# (fecha, forma de pago, importe) de cada donación del certificado.
+LineaCertificado = Tuple[Optional[date], Optional[str], Optional[Decimal]]
+
+
+@lru_cache(maxsize=1)
+def _estilos():
+    """Estilos de párrafo y de la tabla, construidos una vez por proceso."""
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import TableStyle
+
+    styles = getSampleStyleSheet()
+    h1 = ParagraphStyle("h1", parent=styles["Heading1"], fontSize=18,
+                        alignment=1, textColor=colors.HexColor("#1e3a8a"))
+    h2 = ParagraphStyle("h2", parent=styles["Heading2"], fontSize=12,
+                        textColor=colors.HexColor("#1e3a8a"), spaceBefore=12)
+    body = ParagraphStyle("body", parent=styles["BodyText"], fontSize=11, leading=14)
+    small = ParagraphStyle("small", parent=styles["BodyText"], fontSize=9,
+                            textColor=colors.HexColor("#475569"))
+    tabla = TableStyle([
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 10),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1e3a8a")),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+        ("BOX", (0, 0), (-1, -1), 0.5, colors.HexColor("#cbd5e1")),
+        ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.HexColor("#e2e8f0")),
+        ("ALIGN", (-1, 1), (-1, -1), "RIGHT"),
+        ("FONTNAME", (-1, 1), (-1, -1), "Courier"),
+    ])
+    return h1, h2, body, small, tabla
+
+
+def generar_pdf_certificado(
+    numero_certificado: str,
+    ejercicio: int,
+    organizacion_nombre: str,
+    organizacion_nif: str,
+    donante_nif: str,
+    donante_nombre: str,
+    tipo: str,
+    total,
+    lineas: list[LineaCertificado],
+) -> bytes:
+    from io import BytesIO
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
+
+    buf = BytesIO()
+    doc = SimpleDocTemplate(
+        buf, pagesize=A4,
+        leftMargin=2.5 * cm, rightMargin=2.5 * cm,
+        topMargin=2 * cm, bottomMargin=2 * cm,
+        title=f"Certificado de donación {numero_certificado}",
+        author=organizacion_nombre,
+    )
+
+    h1, h2, body, small, estilo_tabla = _estilos()
+
+    elements = []
+    elements.append(Paragraph(f"<b>Certificado de donación</b>", h1))
+    elements.append(Paragraph(f"Nº {numero_certificado} · Ejercicio {ejercicio}", small))
+    elements.append(Spacer(1, 16))
+
+    clave = "A — Donativo dinerario" if tipo == "DINERARIA" else "B — Donativo en especie"
+    elements.append(Paragraph(
+        f"<b>{organizacion_nombre}</b>, con NIF <b>{organizacion_nif}</b>, "
+        f"certifica que ha recibido de <b>{donante_nombre}</b> (NIF <b>{donante_nif}</b>) "
+        f"durante el ejercicio fiscal {ejercicio}, donativos por importe total de "
+        f"<b>{_fmt_eur(total)}</b> ({clave}).",
+        body,
+    ))
+
+    elements.append(Paragraph("Detalle de las donaciones del ejercicio", h2))
+    data = [["Fecha", "Forma de pago", "Importe"]]
+    for fecha, modo_ingreso, importe in lineas:
+        data.append([
+            fecha.isoformat() if fecha else "—",
+            modo_ingreso or "—",
+            _fmt_eur(importe),
+        ])
+    tbl = Table(data, colWidths=[3 * cm, 8 * cm, 4 * cm])
+    tbl.setStyle(estilo_tabla)
+    elements.append(tbl)
+
+    elements.append(Spacer(1, 16))
+    elements.append(Paragraph(
+        "<i>La entidad está acogida al régimen especial de la Ley 49/2002, de 23 de "
+        "diciembre, de régimen fiscal de las entidades sin fines lucrativos y de los "
+        "incentivos fiscales al mecenazgo.</i>",
+        body,
+    ))
+    elements.append(Paragraph(
+        "<i>La donación es irrevocable, pura y simple, según la legislación vigente.</i>",
+        body,
+    ))
+    elements.append(Spacer(1, 20))
+    elements.append(Paragraph(
+        f"Emitido el {date.today().strftime('%d/%m/%Y')}",
+        small,
+    ))
+    elements.append(Spacer(1, 30))
+    elements.append(Paragraph(
+        "______________________________<br/>"
+        f"Firma y sello de {organizacion_nombre}",
+        small,
+    ))
+
+    doc.build(elements)
+    return buf.getvalue()
+
+
+def _fmt_eur(v) -> str:
+    try:
+        return f"{float(v):,.2f} €".replace(",", "X").replace(".", ",").replace("X", ".")
+    except (TypeError, ValueError):
+        return str(v)
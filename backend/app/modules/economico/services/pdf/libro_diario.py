@@ -1,21 +1,29 @@
-"""Generación del Libro Diario en formato CSV/Excel.
+"""Generación del Libro Diario y del Libro Mayor en formato CSV/Excel.
 
 El Libro Diario es obligatorio por el Código de Comercio art. 25.1 — todos los
-asientos del ejercicio en orden cronológico con sus apuntes.
+asientos del ejercicio en orden cronológico con sus apuntes. El Libro Mayor
+agrupa los mismos apuntes por cuenta con su saldo acumulado.
 
 NOTA: Se genera en CSV (UTF-8 con BOM, separador `;`, decimales con coma) porque
-es el formato preferido por el ICAC y la mayoría de protectorados, y porque
-no requiere librerías externas (reportlab/weasyprint no están en el contenedor
-actual). Si se requiere PDF formal, añadir `reportlab` a requirements y
-crear `generar_libro_diario_pdf()`.
+es el formato preferido por el ICAC y la mayoría de protectorados, y en XLSX
+para quien prefiera trabajarlo en la hoja de cálculo. Si se requiere PDF
+formal, crear `generar_libro_diario_pdf()` sobre las mismas filas.
+
+Ambos libros se producen en streaming: una sola consulta (asientos ⋈ apuntes ⋈
+cuentas, ya ordenada) leída con un cursor de servidor por lotes de
+`TAMANO_LOTE`. Las filas se van generando con los totales y saldos acumulados
+calculados sobre la marcha, y el CSV se entrega en trozos de ~`TAMANO_TROZO`
+bytes, así que la memoria no depende del tamaño del ejercicio.
 
 El CSV se abre directamente en Excel/LibreOffice con la configuración española.
 """
+import asyncio
 import csv
 import io
 from datetime import date
 from decimal import Decimal
-from typing import List, Optional, Tuple
+from typing import IO, AsyncIterator, Optional, Union
+from uuid import UUID
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -27,42 +35,224 @@ from ...models.contabilidad import (
     EstadoAsientoContable,
 )
 
+# Filas por viaje del cursor de servidor.
+TAMANO_LOTE = 1000
+# Bytes de CSV acumulados antes de entregar un trozo.
+TAMANO_TROZO = 64 * 1024
+
+CABECERA_DIARIO = (
+    "Nº Asiento", "Fecha", "Glosa", "Cuenta", "Nombre cuenta", "Concepto", "Debe", "Haber",
+)
+CABECERA_MAYOR = (
+    "Cuenta", "Nombre cuenta", "Fecha", "Nº Asiento", "Concepto", "Debe", "Haber", "Saldo",
+)
+CERO = Decimal("0")
+
 
-def _fmt_importe(valor: Optional[Decimal]) -> str:
-    """Formato español: 1.234,56 (sin separador de miles, decimal con coma)."""
-    if valor is None or valor == 0:
+def _celda_csv(valor) -> str:
+    """Formato español: importes con coma decimal (sin miles), fechas dd/mm/aaaa."""
+    if valor is None:
         return ""
-    s = f"{valor:.2f}"
-    return s.replace(".", ",")
+    if isinstance(valor, Decimal):
+        return f"{valor:.2f}".replace(".", ",")
+    if isinstance(valor, date):
+        return valor.strftime("%d/%m/%Y")
+    return str(valor)
+
 
+def _importe(valor: Optional[Decimal]) -> Optional[Decimal]:
+    """Los importes a cero se dejan en blanco, como en el libro en papel."""
+    return valor or None
 
-async def _cargar_asientos_ejercicio(
-    session: AsyncSession, ejercicio: int
-) -> List[Tuple[AsientoContable, List[Tuple[ApunteContable, str, str]]]]:
-    """Carga todos los asientos CONFIRMADOS del ejercicio con sus apuntes y datos de cuenta."""
-    q = (
-        select(AsientoContable)
+
+# ─── Filas ────────────────────────────────────────────────────────────────────
+
+
+async def filas_libro_diario(
+    session: AsyncSession,
+    ejercicio: int,
+    organizacion_nombre: str = "Organización",
+) -> AsyncIterator[list]:
+    """Filas del Libro Diario (con cabecera y totales), sin formatear.
+
+    Cada apunte es una fila; el nº, la fecha y la glosa del asiento solo
+    aparecen en su primer apunte (los del debe antes que los del haber) y los
+    asientos se separan con una fila vacía.
+    """
+    consulta = (
+        select(
+            AsientoContable.id.label("asiento_id"),
+            AsientoContable.numero_asiento,
+            AsientoContable.fecha,
+            AsientoContable.glosa,
+            CuentaContable.codigo,
+            CuentaContable.nombre,
+            ApunteContable.concepto,
+            ApunteContable.debe,
+            ApunteContable.haber,
+        )
+        .join(ApunteContable, ApunteContable.asiento_id == AsientoContable.id)
+        .outerjoin(CuentaContable, CuentaContable.id == ApunteContable.cuenta_id)
         .where(AsientoContable.ejercicio == ejercicio)
         .where(AsientoContable.estado == EstadoAsientoContable.CONFIRMADO)
-        .order_by(AsientoContable.fecha, AsientoContable.numero_asiento)
+        .order_by(
+            AsientoContable.fecha, AsientoContable.numero_asiento, AsientoContable.id,
+            ApunteContable.haber > 0, ApunteContable.id,
+        )
+        .execution_options(yield_per=TAMANO_LOTE)
     )
-    result = await session.execute(q)
-    asientos = list(result.scalars().all())
-
-    salida = []
-    for asiento in asientos:
-        apuntes_data = []
-        for apunte in sorted(asiento.apuntes, key=lambda a: (a.haber > 0, a.id)):
-            # Buscar código y nombre de la cuenta
-            cuenta_r = await session.execute(
-                select(CuentaContable).where(CuentaContable.id == apunte.cuenta_id)
-            )
-            cuenta = cuenta_r.scalars().first()
-            codigo = cuenta.codigo if cuenta else "???"
-            nombre = cuenta.nombre if cuenta else ""
-            apuntes_data.append((apunte, codigo, nombre))
-        salida.append((asiento, apuntes_data))
-    return salida
+
+    yield [f"{organizacion_nombre} - Libro Diario Ejercicio {ejercicio}"]
+    yield []
+    yield list(CABECERA_DIARIO)
+
+    total_debe = total_haber = CERO
+    actual = None
+    async for f in await session.stream(consulta):
+        if f.asiento_id != actual:
+            if actual is not None:
+                yield []  # línea en blanco entre asientos
+            actual = f.asiento_id
+            asiento = [f.numero_asiento, f.fecha, f.glosa]
+        else:
+            asiento = ["", "", ""]
+        yield [
+            *asiento,
+            f.codigo or "???",
+            f.nombre or "",
+            f.concepto or "",
+            _importe(f.debe),
+            _importe(f.haber),
+        ]
+        total_debe += f.debe or CERO
+        total_haber += f.haber or CERO
+    if actual is not None:
+        yield []
+
+    yield []
+    yield ["", "", "TOTAL EJERCICIO", "", "", "", total_debe, total_haber]
+
+
+async def filas_libro_mayor(
+    session: AsyncSession,
+    ejercicio: int,
+    organizacion_nombre: str = "Organización",
+    cuenta_id: Optional[UUID] = None,
+) -> AsyncIterator[list]:
+    """Filas del Libro Mayor: por cuenta (orden de código), sus apuntes en orden
+    cronológico con el saldo acumulado (debe − haber) y un subtotal por cuenta."""
+    consulta = (
+        select(
+            CuentaContable.id.label("cuenta_id"),
+            CuentaContable.codigo,
+            CuentaContable.nombre,
+            AsientoContable.fecha,
+            AsientoContable.numero_asiento,
+            ApunteContable.concepto,
+            ApunteContable.debe,
+            ApunteContable.haber,
+        )
+        .select_from(ApunteContable)
+        .join(AsientoContable, ApunteContable.asiento_id == AsientoContable.id)
+        .join(CuentaContable, CuentaContable.id == ApunteContable.cuenta_id)
+        .where(AsientoContable.ejercicio == ejercicio)
+        .where(AsientoContable.estado == EstadoAsientoContable.CONFIRMADO)
+        .order_by(
+            CuentaContable.codigo, AsientoContable.fecha, AsientoContable.numero_asiento,
+            ApunteContable.id,
+        )
+        .execution_options(yield_per=TAMANO_LOTE)
+    )
+    if cuenta_id:
+        consulta = consulta.where(ApunteContable.cuenta_id == cuenta_id)
+
+    yield [f"{organizacion_nombre} - Libro Mayor Ejercicio {ejercicio}"]
+    yield []
+    yield list(CABECERA_MAYOR)
+
+    total_debe = total_haber = CERO
+    cuenta_debe = cuenta_haber = saldo = CERO
+    actual = None
+
+    def _subtotal() -> list:
+        return ["", "", "", "", "Total cuenta", cuenta_debe, cuenta_haber, saldo]
+
+    async for f in await session.stream(consulta):
+        if f.cuenta_id != actual:
+            if actual is not None:
+                yield _subtotal()
+                yield []
+            actual = f.cuenta_id
+            cuenta_debe = cuenta_haber = saldo = CERO
+            yield [f.codigo, f.nombre]
+        debe, haber = f.debe or CERO, f.haber or CERO
+        cuenta_debe += debe
+        cuenta_haber += haber
+        saldo += debe - haber
+        yield ["", "", f.fecha, f.numero_asiento, f.concepto or "", _importe(debe), _importe(haber), saldo]
+        total_debe += debe
+        total_haber += haber
+    if actual is not None:
+        yield _subtotal()
+        yield []
+
+    yield []
+    yield ["", "", "", "", "TOTAL EJERCICIO", total_debe, total_haber, total_debe - total_haber]
+
+
+# ─── Formatos ─────────────────────────────────────────────────────────────────
+
+
+async def csv_en_trozos(
+    filas: AsyncIterator[list], tamano_trozo: int = TAMANO_TROZO,
+) -> AsyncIterator[bytes]:
+    """Flujo CSV (UTF-8 con BOM y `;`) en trozos de ~`tamano_trozo` bytes."""
+    buf = io.StringIO()
+    writer = csv.writer(buf, delimiter=";", quoting=csv.QUOTE_MINIMAL)
+    buf.write("﻿")  # UTF-8 BOM para Excel
+    async for fila in filas:
+        writer.writerow([_celda_csv(v) for v in fila])
+        if buf.tell() >= tamano_trozo:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+async def escribir_xlsx(
+    filas: AsyncIterator[list],
+    destino: Union[str, IO[bytes]],
+    hoja: str,
+    lote: int = TAMANO_LOTE,
+) -> int:
+    """Vuelca las filas a un XLSX (openpyxl `write_only`). Devuelve nº de filas.
+
+    Como en la exportación del padrón, el volcado de cada lote y el guardado
+    final van a un hilo para no bloquear el event loop. Importes y fechas se
+    escriben como valores nativos, no como texto.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(hoja)
+
+    def _volcar(pendientes: list) -> None:
+        for fila in pendientes:
+            ws.append(fila)
+
+    total = 0
+    pendientes: list = []
+    async for fila in filas:
+        pendientes.append(fila)
+        if len(pendientes) >= lote:
+            await asyncio.to_thread(_volcar, pendientes)
+            total += len(pendientes)
+            pendientes = []
+    await asyncio.to_thread(_volcar, pendientes)
+    total += len(pendientes)
+    await asyncio.to_thread(wb.save, destino)
+    return total
 
 
 async def generar_libro_diario_csv(
@@ -75,51 +265,8 @@ async def generar_libro_diario_csv(
     Cada fila representa un apunte. Las columnas son:
     Nº Asiento | Fecha | Glosa | Cuenta | Nombre cuenta | Concepto | Debe | Haber
 
-    Devuelve bytes listos para descarga (Content-Type: text/csv).
+    Devuelve bytes listos para descarga (Content-Type: text/csv). Para ficheros
+    grandes, mejor el endpoint REST, que emite `csv_en_trozos` sin acumularlo.
     """
-    asientos = await _cargar_asientos_ejercicio(session, ejercicio)
-
-    buffer = io.StringIO()
-    writer = csv.writer(buffer, delimiter=";", quoting=csv.QUOTE_MINIMAL)
-
-    # Cabecera
-    writer.writerow([f"{organizacion_nombre} - Libro Diario Ejercicio {ejercicio}"])
-    writer.writerow([])
-    writer.writerow([
-        "Nº Asiento", "Fecha", "Glosa", "Cuenta", "Nombre cuenta",
-        "Concepto", "Debe", "Haber",
-    ])
-
-    total_debe = Decimal("0")
-    total_haber = Decimal("0")
-
-    for asiento, apuntes_data in asientos:
-        primer_apunte = True
-        for apunte, codigo, nombre in apuntes_data:
-            writer.writerow([
-                asiento.numero_asiento if primer_apunte else "",
-                asiento.fecha.strftime("%d/%m/%Y") if primer_apunte else "",
-                asiento.glosa if primer_apunte else "",
-                codigo,
-                nombre,
-                apunte.concepto or "",
-                _fmt_importe(apunte.debe),
-                _fmt_importe(apunte.haber),
-            ])
-            primer_apunte = False
-            total_debe += apunte.debe or Decimal("0")
-            total_haber += apunte.haber or Decimal("0")
-        # Línea en blanco entre asientos
-        writer.writerow([])
-
-    # Totales
-    writer.writerow([])
-    writer.writerow([
-        "", "", "TOTAL EJERCICIO", "", "", "",
-        _fmt_importe(total_debe),
-        _fmt_importe(total_haber),
-    ])
-
-    # UTF-8 BOM para Excel
-    content = buffer.getvalue()
-    return ("﻿" + content).encode("utf-8")
+    filas = filas_libro_diario(session, ejercicio, organizacion_nombre)
+    return b"".join([trozo async for trozo in csv_en_trozos(filas)])
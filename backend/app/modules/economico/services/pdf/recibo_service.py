@@ -3,20 +3,30 @@
 Usa WeasyPrint (HTML→PDF). Requiere: pip install weasyprint
 Alternativa ligera: reportlab (incluida en la comparación de dependencias).
 
-La función devuelve bytes del PDF listo para enviar como respuesta HTTP.
+La función devuelve bytes del PDF listo para enviar como respuesta HTTP. El
+HTML se compone en el worker de la app; la conversión a PDF (`html_a_pdf`) va
+al pool de renderizado (ver `render.py`), que reutiliza la hoja de estilos y la
+configuración de fuentes ya parseadas entre documentos.
 """
 import io
 from datetime import date
 from decimal import Decimal
-from typing import Optional
+from functools import lru_cache
+from typing import AsyncIterator, Optional, Tuple
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.core.carga import cargar
 from app.modules.economico.models.cuotas import CuotaAnual
 from app.modules.economico.models.tesoreria import ApunteCaja
 
+from .render import renderizar
+
+# Cuotas leídas por viaje al generar los recibos de un ejercicio.
+TAMANO_LOTE_RECIBOS = 200
+
 
 # ─── Templates HTML ───────────────────────────────────────────────────────────
 
@@ -59,7 +69,7 @@ def _html_recibo_cuota(
     ref_str = f"<tr><td>Referencia</td><td>{referencia}</td></tr>" if referencia else ""
     return f"""<!DOCTYPE html>
 <html lang="es">
-<head><meta charset="UTF-8"><style>{_CSS_BASE}</style></head>
+<head><meta charset="UTF-8"></head>
 <body>
   <div class="header">
     <div class="logo-area">
@@ -123,7 +133,7 @@ def _html_recibo_apunte(
     ref_str = f"<tr><td>Referencia</td><td>{referencia}</td></tr>" if referencia else ""
     return f"""<!DOCTYPE html>
 <html lang="es">
-<head><meta charset="UTF-8"><style>{_CSS_BASE}</style></head>
+<head><meta charset="UTF-8"></head>
 <body>
   <div class="header">
     <div class="logo-area">
@@ -160,6 +170,31 @@ def _html_recibo_apunte(
 </html>"""
 
 
+# ─── Conversión HTML → PDF (se ejecuta en el pool de renderizado) ─────────────
+
+@lru_cache(maxsize=1)
+def _estilos():
+    """Hoja de estilos y fuentes parseadas una vez por proceso."""
+    from weasyprint import CSS
+    from weasyprint.text.fonts import FontConfiguration
+    fuentes = FontConfiguration()
+    return CSS(string=_CSS_BASE, font_config=fuentes), fuentes
+
+
+def html_a_pdf(html: str) -> bytes:
+    """Convierte HTML a bytes PDF usando WeasyPrint."""
+    try:
+        from weasyprint import HTML
+    except ImportError:
+        raise RuntimeError(
+            "WeasyPrint no está instalado. Ejecuta: pip install weasyprint"
+        )
+    css, fuentes = _estilos()
+    buffer = io.BytesIO()
+    HTML(string=html).write_pdf(buffer, stylesheets=[css], font_config=fuentes)
+    return buffer.getvalue()
+
+
 # ─── Servicio ─────────────────────────────────────────────────────────────────
 
 class ReciboService:
@@ -175,36 +210,19 @@ class ReciboService:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    def _generar_pdf(self, html: str) -> bytes:
-        """Convierte HTML a bytes PDF usando WeasyPrint."""
-        try:
-            from weasyprint import HTML
-            buffer = io.BytesIO()
-            HTML(string=html).write_pdf(buffer)
-            return buffer.getvalue()
-        except ImportError:
-            raise RuntimeError(
-                "WeasyPrint no está instalado. Ejecuta: pip install weasyprint"
-            )
-
-    async def recibo_cuota(self, cuota_id: UUID) -> bytes:
-        """Genera el PDF de recibo para una CuotaAnual pagada."""
-        result = await self.session.execute(
-            select(CuotaAnual).where(CuotaAnual.id == cuota_id)
-        )
-        cuota = result.scalars().first()
-        if not cuota:
-            raise ValueError(f"CuotaAnual {cuota_id} no encontrada")
+    async def _generar_pdf(self, html: str) -> bytes:
+        """Convierte HTML a PDF en el pool de renderizado, sin bloquear el event loop."""
+        return await renderizar(html_a_pdf, html)
 
-        miembro = cuota.miembro
-        nombre_socio = (
-            f"{miembro.nombre} {miembro.apellidos}"
-            if miembro
-            else "Socio desconocido"
-        )
+    def _html_cuota(self, cuota: CuotaAnual) -> Tuple[str, str]:
+        """(número de recibo, HTML) de una cuota con `vinculacion_socio.contacto` cargado."""
+        # La cuota cuelga de la vinculación de socio; el socio es su contacto.
+        vinculacion = cuota.vinculacion_socio
+        miembro = vinculacion.contacto if vinculacion else None
+        nombre_socio = miembro.nombre_completo if miembro else "Socio desconocido"
         nif_socio = getattr(miembro, 'numero_documento', None) if miembro else None
 
-        numero_recibo = f"REC-{cuota.ejercicio}-{str(cuota_id)[:8].upper()}"
+        numero_recibo = f"REC-{cuota.ejercicio}-{str(cuota.id)[:8].upper()}"
         fecha_pago = cuota.fecha_pago or date.today()
 
         html = _html_recibo_cuota(
@@ -220,7 +238,49 @@ class ReciboService:
             concepto=f"Cuota de socio — Ejercicio {cuota.ejercicio}",
             referencia=cuota.referencia_pago,
         )
-        return self._generar_pdf(html)
+        return numero_recibo, html
+
+    async def recibo_cuota(self, cuota_id: UUID) -> bytes:
+        """Genera el PDF de recibo para una CuotaAnual pagada."""
+        result = await self.session.execute(
+            select(CuotaAnual).where(CuotaAnual.id == cuota_id)
+            .options(*cargar(CuotaAnual, "vinculacion_socio.contacto"))
+        )
+        cuota = result.scalars().first()
+        if not cuota:
+            raise ValueError(f"CuotaAnual {cuota_id} no encontrada")
+
+        _, html = self._html_cuota(cuota)
+        return await self._generar_pdf(html)
+
+    async def recibos_cuotas_ejercicio(self, ejercicio: int) -> AsyncIterator[Tuple[str, tuple]]:
+        """Trabajos `(nombre_fichero, (html,))` de los recibos de las cuotas pagadas
+        del ejercicio, para `renderizar_lote(html_a_pdf, ...)`.
+
+        Lee por lotes con paginación keyset por id: la memoria no depende del
+        número de socios.
+        """
+        ultimo_id = None
+        while True:
+            q = (
+                select(CuotaAnual)
+                .where(CuotaAnual.ejercicio == ejercicio)
+                .where(CuotaAnual.fecha_pago.is_not(None))
+                .where(CuotaAnual.eliminado == False)  # noqa: E712
+                .order_by(CuotaAnual.id)
+                .limit(TAMANO_LOTE_RECIBOS)
+                .options(*cargar(CuotaAnual, "vinculacion_socio.contacto"))
+            )
+            if ultimo_id is not None:
+                q = q.where(CuotaAnual.id > ultimo_id)
+            cuotas = list((await self.session.execute(q)).scalars().all())
+            if not cuotas:
+                return
+            for cuota in cuotas:
+                numero, html = self._html_cuota(cuota)
+                yield f"{numero}.pdf", (html,)
+            ultimo_id = cuotas[-1].id
+            self.session.expunge_all()
 
     async def recibo_apunte(self, apunte_id: UUID) -> bytes:
         """Genera el PDF de justificante para un ApunteCaja."""
@@ -243,4 +303,4 @@ class ReciboService:
             fecha=apunte.fecha,
             referencia=apunte.referencia_externa,
         )
-        return self._generar_pdf(html)
+        return await self._generar_pdf(html)
@@ -0,0 +1,136 @@
+"""Renderizado de PDFs fuera del event loop y empaquetado en ZIP en streaming.
+
+WeasyPrint y ReportLab son CPU puro y síncronos: llamados dentro de una
+petición bloquean el event loop del worker. Aquí se delegan a un pool de
+procesos por worker (`settings.pdf_workers`, 0 = un hilo, útil en desarrollo
+y tests). Las funciones que se envían al pool deben ser de nivel de módulo y
+recibir datos planos (str, Decimal, date, tuplas), no objetos ORM.
+
+Cada proceso del pool conserva sus cachés (`lru_cache`) de hojas de estilo y
+fuentes entre documentos, así que en un lote solo se parsean una vez por
+proceso.
+
+Para lotes, `renderizar_lote` mantiene unos pocos documentos en vuelo por
+proceso y los entrega en orden; `zip_en_flujo` los va comprimiendo y
+emitiendo sin acumular el archivo completo.
+"""
+import asyncio
+import logging
+import multiprocessing
+import zipfile
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import AsyncIterator, Callable, Iterable, Optional, Tuple, Union
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Documentos en vuelo por proceso: suficiente para que ninguno quede ocioso
+# mientras el ZIP consume el anterior, sin acumular el lote en memoria.
+EN_VUELO_POR_PROCESO = 2
+
+_pool: Optional[Executor] = None
+
+
+def _obtener_pool() -> Optional[Executor]:
+    global _pool
+    procesos = get_settings().pdf_workers
+    if procesos <= 0:
+        return None
+    if _pool is None:
+        # spawn: el worker de la app tiene hilos (pools de BD, relay); hacer
+        # fork de un proceso con hilos puede dejar cerrojos tomados en el hijo.
+        _pool = ProcessPoolExecutor(
+            max_workers=procesos, mp_context=multiprocessing.get_context("spawn"),
+        )
+        logger.info("Pool de renderizado PDF iniciado (%d procesos)", procesos)
+    return _pool
+
+
+def cerrar_pool() -> None:
+    """Para el pool de procesos (teardown del lifespan)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def renderizar(funcion: Callable[..., bytes], *args) -> bytes:
+    """Ejecuta `funcion(*args)` en el pool (o en un hilo) y devuelve sus bytes."""
+    pool = _obtener_pool()
+    if pool is None:
+        return await asyncio.to_thread(funcion, *args)
+    return await asyncio.get_running_loop().run_in_executor(pool, funcion, *args)
+
+
+async def renderizar_lote(
+    funcion: Callable[..., bytes],
+    trabajos: Union[Iterable[Tuple[str, tuple]], AsyncIterator[Tuple[str, tuple]]],
+) -> AsyncIterator[Tuple[str, bytes]]:
+    """Renderiza `(nombre, args)` en paralelo y produce `(nombre, pdf)` en orden.
+
+    Como mucho `EN_VUELO_POR_PROCESO` documentos por proceso a la vez: la
+    memoria queda acotada aunque el lote tenga miles de documentos.
+    """
+    limite = max(get_settings().pdf_workers, 1) * EN_VUELO_POR_PROCESO
+    en_vuelo: deque = deque()
+
+    async def _trabajos():
+        if hasattr(trabajos, "__aiter__"):
+            async for t in trabajos:
+                yield t
+        else:
+            for t in trabajos:
+                yield t
+
+    try:
+        async for nombre, args in _trabajos():
+            en_vuelo.append((nombre, asyncio.ensure_future(renderizar(funcion, *args))))
+            if len(en_vuelo) >= limite:
+                nombre_listo, tarea = en_vuelo.popleft()
+                yield nombre_listo, await tarea
+        while en_vuelo:
+            nombre_listo, tarea = en_vuelo.popleft()
+            yield nombre_listo, await tarea
+    finally:
+        for _, tarea in en_vuelo:
+            tarea.cancel()
+
+
+class _Salida:
+    """Destino no posicionable para ZipFile: acumula hasta que se vacía."""
+
+    def __init__(self):
+        self._trozos: list[bytes] = []
+
+    def write(self, datos: bytes) -> int:
+        self._trozos.append(bytes(datos))
+        return len(datos)
+
+    def flush(self) -> None:
+        pass
+
+    def vaciar(self) -> bytes:
+        datos = b"".join(self._trozos)
+        self._trozos.clear()
+        return datos
+
+
+async def zip_en_flujo(documentos: AsyncIterator[Tuple[str, bytes]]) -> AsyncIterator[bytes]:
+    """ZIP en streaming: emite cada entrada en cuanto está comprimida.
+
+    Con un destino no posicionable, `zipfile` escribe los tamaños en un
+    descriptor tras cada entrada en lugar de volver atrás a la cabecera.
+    Los PDF ya van comprimidos por dentro: se guardan con DEFLATE nivel 1.
+    """
+    salida = _Salida()
+    with zipfile.ZipFile(salida, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        async for nombre, contenido in documentos:
+            zf.writestr(nombre, contenido)
+            trozo = salida.vaciar()
+            if trozo:
+                yield trozo
+    final = salida.vaciar()
+    if final:
+        yield final
@@ -13,6 +13,8 @@ from uuid import UUID
 from sqlalchemy import select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.carga import cargar
+
 from ..models.presupuesto import (
     PlanificacionAnual,
     PartidaPresupuestaria,
@@ -64,16 +66,20 @@ class PresupuestoService:
     # ── Planificación anual ─────────────────────────────────────────────────
 
     async def listar_planificaciones(self) -> List[PlanificacionAnual]:
+        """Planificaciones con sus partidas (los totales se calculan sobre ellas)."""
         result = await self.session.execute(
             select(PlanificacionAnual)
             .where(PlanificacionAnual.eliminado == False)
             .order_by(PlanificacionAnual.ejercicio.desc())
+            .options(*cargar(PlanificacionAnual, "partidas"))
         )
         return list(result.scalars().all())
 
-    async def obtener_planificacion(self, planificacion_id: UUID) -> Optional[PlanificacionAnual]:
+    async def obtener_planificacion(self, planificacion_id: UUID, *rutas: str) -> Optional[PlanificacionAnual]:
+        """Planificación por id; `rutas` son las relaciones que se van a leer."""
         result = await self.session.execute(
             select(PlanificacionAnual).where(PlanificacionAnual.id == planificacion_id)
+            .options(*cargar(PlanificacionAnual, *rutas))
         )
         return result.scalars().first()
 
@@ -6,6 +6,8 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.events import ReglasCategorizacionCambiadas, event_bus
+
 from ..models.contabilidad import ReglaCategorizacion, TipoCoincidencia
 
 
@@ -52,6 +54,7 @@ class ReglaCategorizacionService:
         )
         self.session.add(regla)
         await self.session.commit()
+        await event_bus.publish(ReglasCategorizacionCambiadas())
         await self.session.refresh(regla)
         return regla
 
@@ -64,6 +67,7 @@ class ReglaCategorizacionService:
                 setattr(regla, key, value)
         self.session.add(regla)
         await self.session.commit()
+        await event_bus.publish(ReglasCategorizacionCambiadas())
         await self.session.refresh(regla)
         return regla
 
@@ -74,3 +78,4 @@ class ReglaCategorizacionService:
         regla.soft_delete()
         self.session.add(regla)
         await self.session.commit()
+        await event_bus.publish(ReglasCategorizacionCambiadas())
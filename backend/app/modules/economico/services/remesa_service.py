@@ -3,27 +3,66 @@
 Flujo principal:
   1. generar_remesa()     → crea Remesa en estado Borrador + OrdenCobro por cada cuota pendiente
   2. generar_xml_sepa()   → produce el Pain.008.003.02 listo para enviar al banco
+                            (en streaming: preparar_xml_sepa() + escribir_xml_sepa())
   3. marcar_enviada()     → cambia estado a Enviada (archivo guardado)
   4. liquidar_remesa()    → TesoreriaService.liquidar_remesa() (ApunteCaja + asiento)
 """
 from datetime import date, timedelta
 from decimal import Decimal
-from typing import Optional
+from typing import AsyncIterator, Iterator, Optional
 from uuid import UUID, uuid4
-from xml.etree.ElementTree import Element, SubElement, tostring
-import re
 import uuid as uuid_module
 
-from sqlalchemy import select, and_
+from sqlalchemy import (
+    Boolean, Column, Date, MetaData, String, Table, Text, Uuid,
+    and_, bindparam, case, column, delete, exists, func, insert, literal_column, select, update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.schema import CreateTable
 
+from app.core.carga import cargar
 from ..models.remesas import Remesa, OrdenCobro
 from ..models.cuotas import CuotaAnual
 from ..models.recibos import Recibo
 from ..models.tesoreria import ApunteCaja, TipoApunte, OrigenApunte
+from .sepa_pain008 import Acreedor, Adeudo, BloquePago, DocumentoPain008, EscritorPain008
 from app.modules.configuracion.models.estados import EstadoCuota, EstadoRemesa, EstadoOrdenCobro
 
 
+# Relaciones que lee `_resumen_orden` (nombre del deudor).
+_CARGA_ORDEN_DEUDOR = ("cuota.vinculacion_socio.contacto",)
+
+# Filas por INSERT multi-fila (órdenes y tabla temporal de liquidación).
+_TAMANO_BLOQUE_INSERT = 1000
+
+# Adeudos por bloque PmtInf del pain.008 y filas por lote del cursor que los lee.
+_ADEUDOS_POR_PMTINF = 5000
+_FILAS_POR_LOTE = 500
+_REMESA_CAMBIADA = (
+    "Las órdenes de la remesa han cambiado mientras se generaba el fichero SEPA; "
+    "vuelva a descargarlo"
+)
+
+# Resultado del banco que aplica `liquidar_remesa`: una fila por orden, cobrada o
+# fallida. Vive solo dentro de la transacción de la liquidación (ON COMMIT DROP)
+# y cada paso se aplica con un único UPDATE ... FROM sobre ella.
+_tmp_liquidacion = Table(
+    "tmp_liquidacion_remesa",
+    MetaData(),
+    Column("orden_id", Uuid, primary_key=True),
+    Column("cobrada", Boolean, nullable=False),
+    Column("codigo", String(50)),
+    Column("motivo", Text),
+    Column("fecha_rechazo", Date),
+    Column("nota", Text),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+
 def _resumen_orden(orden: OrdenCobro) -> dict:
     """Resumen de una orden para la previsualización de liquidación."""
     miembro_nombre = ""
@@ -38,6 +77,43 @@ def _resumen_orden(orden: OrdenCobro) -> dict:
     }
 
 
+class _IndiceOrdenes:
+    """Órdenes de una remesa indexadas una sola vez para emparejar el fichero
+    del banco en tiempo lineal: por EndToEndId, por id y con su importe.
+
+    Lleva además qué órdenes ya se han emparejado, para detectar líneas
+    repetidas y saber cuáles no aparecen en el fichero.
+    """
+
+    def __init__(self, ordenes: list[OrdenCobro]):
+        self.ordenes = ordenes
+        self._por_eei = {o.end_to_end_id: o for o in ordenes}
+        self._por_id = {str(o.id): o for o in ordenes}
+        self._emparejadas: set = set()
+
+    def por_eei(self, end_to_end_id: str) -> Optional[OrdenCobro]:
+        return self._por_eei.get(end_to_end_id)
+
+    def por_id(self, orden_id) -> Optional[OrdenCobro]:
+        return self._por_id.get(str(orden_id))
+
+    def emparejar(
+        self, orden: Optional[OrdenCobro], importe: Optional[Decimal] = None,
+    ) -> Optional[str]:
+        """Marca la orden como emparejada; devuelve el motivo si no procede."""
+        if orden is None:
+            return "EndToEndId no pertenece a esta remesa"
+        if orden.id in self._emparejadas:
+            return "Línea repetida en el fichero"
+        if importe is not None and importe != orden.importe:
+            return f"Importe {importe:.2f} no coincide con la orden ({orden.importe:.2f})"
+        self._emparejadas.add(orden.id)
+        return None
+
+    def sin_emparejar(self) -> Iterator[OrdenCobro]:
+        return (o for o in self.ordenes if o.id not in self._emparejadas)
+
+
 class RemesaService:
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -114,27 +190,31 @@ class RemesaService:
         self.session.add(remesa)
         await self.session.flush()
 
+        # Ids de orden generados aquí: el enlace con su recibo no necesita
+        # esperar al INSERT (antes, un flush por orden).
+        filas: list[dict] = []
+        enlaces: list[tuple[UUID, UUID]] = []
         for nseq, recibo in enumerate(recibos_elegibles, start=1):
-            importe_orden = recibo.importe - recibo.importe_pagado
-            mandato = f"MAND-{str(recibo.vinculacion_socio_id)[:8].upper()}"
             _socio = recibo.vinculacion_socio.socio if recibo.vinculacion_socio else None
-            iban = getattr(_socio, "iban", None) if _socio else None
-
-            orden = OrdenCobro(
+            orden_id = uuid4()
+            filas.append(dict(
+                id=orden_id,
                 remesa_id=remesa.id,
                 cuota_id=recibo.cuota_id,
                 nseq=nseq,
-                importe=importe_orden,
-                referencia_mandato=mandato,
-                iban=iban,
+                importe=recibo.importe - recibo.importe_pagado,
+                referencia_mandato=f"MAND-{str(recibo.vinculacion_socio_id)[:8].upper()}",
+                iban=getattr(_socio, "iban", None) if _socio else None,
                 estado_id=est_oc_pendiente.id,
-            )
-            self.session.add(orden)
-            await self.session.flush()  # necesitamos orden.id para enlazar al recibo
+                eliminado=False,
+            ))
+            enlaces.append((recibo.id, orden_id))
 
-            # D3.7: enlazar el recibo preexistente con la orden
-            recibo.orden_cobro_id = orden.id
-            self.session.add(recibo)
+        await self._insertar_ordenes(filas)
+        # D3.7: enlazar cada recibo preexistente con su orden
+        await self._enlazar_recibos(enlaces)
+        for recibo, (_, orden_id) in zip(recibos_elegibles, enlaces):
+            set_committed_value(recibo, "orden_cobro_id", orden_id)
 
         await self.session.commit()
         await self.session.refresh(remesa)
@@ -175,7 +255,9 @@ class RemesaService:
         # Buscar vinculaciones de socio y validar IBAN (en el satélite Socio)
         from app.modules.membresia.models.vinculacion import Vinculacion
         vinc_q = await self.session.execute(
-            select(Vinculacion).where(Vinculacion.id.in_(vinculacion_socio_ids))
+            select(Vinculacion)
+            .where(Vinculacion.id.in_(vinculacion_socio_ids))
+            .options(*cargar(Vinculacion, "socio"))
         )
         vinculaciones = {v.id: v for v in vinc_q.scalars().all()}
         miembros_validos = [
@@ -357,24 +439,20 @@ class RemesaService:
             self.session.add(orden)
             contador += 1
 
-        await self.session.commit()
-
-        # Aviso de flujo: devoluciones recibidas del banco. Tras commit, envuelto;
-        # un fallo de aviso no afecta al registro de los fallidos.
+        # Aviso de flujo: devoluciones recibidas del banco. Al outbox, en la misma
+        # transacción que el registro de los fallidos.
         if contador > 0:
-            try:
-                from app.core.events import event_bus, RemesaDevolucion
-                rem = (await self.session.execute(
-                    select(Remesa).where(Remesa.id == remesa_id)
-                )).scalars().first()
-                await event_bus.publish(RemesaDevolucion(
-                    remesa_id=str(remesa_id),
-                    num_devoluciones=contador,
-                    agrupacion_id=str(rem.agrupacion_id) if rem and rem.agrupacion_id else None,
-                ))
-            except Exception:
-                pass
+            from app.core.events import event_bus, RemesaDevolucion
+            rem = (await self.session.execute(
+                select(Remesa).where(Remesa.id == remesa_id)
+            )).scalars().first()
+            event_bus.enqueue(self.session, RemesaDevolucion(
+                remesa_id=str(remesa_id),
+                num_devoluciones=contador,
+                agrupacion_id=str(rem.agrupacion_id) if rem and rem.agrupacion_id else None,
+            ))
 
+        await self.session.commit()
         return contador
 
     async def previsualizar_liquidacion(
@@ -397,9 +475,7 @@ class RemesaService:
           "totales": {n_cobradas, n_fallidas, importe_cobrado}
         }
         """
-        from .sepa_parsers import (
-            parse_pain002, parse_camt054, motivo_sepa, ResultadoPain002, ResultadoCamt054,
-        )
+        from .sepa_parsers import iterar_camt054, iterar_pain002, motivo_sepa
 
         remesa_r = await self.session.execute(select(Remesa).where(Remesa.id == remesa_id))
         remesa = remesa_r.scalars().first()
@@ -407,10 +483,11 @@ class RemesaService:
             raise ValueError(f"Remesa {remesa_id} no encontrada")
 
         ordenes_r = await self.session.execute(
-            select(OrdenCobro).where(OrdenCobro.remesa_id == remesa_id)
+            select(OrdenCobro)
+            .where(OrdenCobro.remesa_id == remesa_id)
+            .options(*cargar(OrdenCobro, *_CARGA_ORDEN_DEUDOR))
         )
-        ordenes = list(ordenes_r.scalars().all())
-        por_eei = {o.end_to_end_id: o for o in ordenes}
+        indice = _IndiceOrdenes(list(ordenes_r.scalars().all()))
 
         cobradas: list[dict] = []
         fallidas: list[dict] = []
@@ -419,69 +496,56 @@ class RemesaService:
         if tipo_fichero == "pain002":
             if not contenido:
                 raise ValueError("Fichero pain.002 vacío")
-            res = parse_pain002(contenido)
-            ids_rechazados = {l.end_to_end_id for l in res.lineas if l.es_rechazada}
-            for l in res.lineas:
-                orden = por_eei.get(l.end_to_end_id)
-                if not orden:
-                    no_emparejadas.append({
-                        "end_to_end_id": l.end_to_end_id,
-                        "motivo": "EndToEndId no pertenece a esta remesa",
-                    })
+            for l in iterar_pain002(contenido):
+                orden = indice.por_eei(l.end_to_end_id)
+                if orden and not l.es_rechazada:
+                    continue  # aceptada: queda entre las cobradas
+                motivo = indice.emparejar(orden)
+                if motivo:
+                    no_emparejadas.append({"end_to_end_id": l.end_to_end_id, "motivo": motivo})
                     continue
-                if l.es_rechazada:
-                    fallidas.append({
-                        "orden_id": str(orden.id),
-                        "end_to_end_id": l.end_to_end_id,
-                        "codigo": l.codigo_rechazo or "",
-                        "motivo": l.motivo_rechazo or motivo_sepa(l.codigo_rechazo or ""),
-                        "fecha": l.fecha_rechazo.isoformat() if l.fecha_rechazo else None,
-                        "importe": float(orden.importe),
-                    })
+                fallidas.append({
+                    "orden_id": str(orden.id),
+                    "end_to_end_id": l.end_to_end_id,
+                    "codigo": l.codigo_rechazo or "",
+                    "motivo": l.motivo_rechazo or motivo_sepa(l.codigo_rechazo or ""),
+                    "fecha": l.fecha_rechazo.isoformat() if l.fecha_rechazo else None,
+                    "importe": float(orden.importe),
+                })
             # Las no listadas como rechazadas se asumen cobradas
-            for orden in ordenes:
-                if orden.end_to_end_id not in ids_rechazados and not any(
-                    f["orden_id"] == str(orden.id) for f in fallidas
-                ):
-                    cobradas.append(_resumen_orden(orden))
+            cobradas.extend(_resumen_orden(o) for o in indice.sin_emparejar())
 
         elif tipo_fichero == "camt054":
             if not contenido:
                 raise ValueError("Fichero camt.054 vacío")
-            res = parse_camt054(contenido)
-            cobradas_eei = {c.end_to_end_id for c in res.cargos}
-            for cargo in res.cargos:
-                orden = por_eei.get(cargo.end_to_end_id)
-                if not orden:
-                    no_emparejadas.append({
-                        "end_to_end_id": cargo.end_to_end_id,
-                        "motivo": "EndToEndId no pertenece a esta remesa",
-                    })
+            for cargo in iterar_camt054(contenido):
+                motivo = indice.emparejar(indice.por_eei(cargo.end_to_end_id), cargo.importe)
+                if motivo:
+                    no_emparejadas.append({"end_to_end_id": cargo.end_to_end_id, "motivo": motivo})
                     continue
-                cobradas.append(_resumen_orden(orden))
+                cobradas.append(_resumen_orden(indice.por_eei(cargo.end_to_end_id)))
             # En camt.054 las órdenes que no aparecen probablemente quedaron pendientes
             # (puede llegar un pain.002 con las rechazadas más tarde). Las marcamos
             # como tales en la previsualización para que el tesorero decida.
-            for orden in ordenes:
-                if orden.end_to_end_id not in cobradas_eei:
-                    no_emparejadas.append({
-                        "end_to_end_id": orden.end_to_end_id,
-                        "motivo": "Orden no aparece en camt.054 — esperando pain.002 de rechazos",
-                    })
+            for orden in indice.sin_emparejar():
+                no_emparejadas.append({
+                    "end_to_end_id": orden.end_to_end_id,
+                    "motivo": "Orden no aparece en camt.054 — esperando pain.002 de rechazos",
+                })
 
         elif tipo_fichero == "manual":
             # Entrada manual: lista de fallidos. Las no listadas se consideran cobradas.
-            ids_fallidos = set()
             for f in (fallidos_manual or []):
                 orden_id = f.get("orden_id")
-                orden = next((o for o in ordenes if str(o.id) == str(orden_id)), None)
+                orden = indice.por_id(orden_id)
                 if not orden:
                     no_emparejadas.append({
                         "end_to_end_id": str(orden_id),
                         "motivo": "Orden no pertenece a esta remesa",
                     })
                     continue
-                ids_fallidos.add(orden.id)
+                if indice.emparejar(orden):
+                    continue  # la misma orden listada dos veces
                 fallidas.append({
                     "orden_id": str(orden.id),
                     "end_to_end_id": orden.end_to_end_id,
@@ -490,9 +554,7 @@ class RemesaService:
                     "fecha": f.get("fecha"),
                     "importe": float(orden.importe),
                 })
-            for orden in ordenes:
-                if orden.id not in ids_fallidos:
-                    cobradas.append(_resumen_orden(orden))
+            cobradas.extend(_resumen_orden(o) for o in indice.sin_emparejar())
         else:
             raise ValueError(f"Tipo de fichero no soportado: {tipo_fichero}")
 
@@ -530,6 +592,10 @@ class RemesaService:
 
         fallidas: [{orden_id: UUID, codigo: str, motivo: str, fecha?: date}]
 
+        Todo se aplica por conjuntos: el resultado del banco se vuelca en una tabla
+        temporal y cada paso es un UPDATE ... FROM sobre ella, así que el número de
+        sentencias no crece con el de órdenes.
+
         Devuelve: {n_cobradas, n_fallidas, importe_cobrado, apunte_id?, asiento_id?, remesa_estado}
         """
         from .registro_contable import RegistroContable
@@ -547,53 +613,15 @@ class RemesaService:
         if not (est_oc_procesada and est_oc_fallida and est_rem_procesada):
             raise ValueError("Estados de remesa/orden no encontrados en BD")
 
-        importe_cobrado = Decimal("0.00")
-        n_cobradas = 0
-        n_fallidas = 0
-
-        # ── Procesar cobradas ─────────────────────────────────────────────────
-        for orden_id in cobradas:
-            orden_r = await self.session.execute(
-                select(OrdenCobro).where(OrdenCobro.id == orden_id).where(OrdenCobro.remesa_id == remesa_id)
-            )
-            orden = orden_r.scalars().first()
-            if not orden:
-                continue
-
-            orden.estado_id = est_oc_procesada.id
-            orden.fecha_procesamiento = fecha_liquidacion
-            self.session.add(orden)
-            importe_cobrado += orden.importe
-            n_cobradas += 1
-
-            # Actualizar cuota
-            if orden.cuota_id:
-                cuota_r = await self.session.execute(
-                    select(CuotaAnual).where(CuotaAnual.id == orden.cuota_id)
-                )
-                cuota = cuota_r.scalars().first()
-                if cuota:
-                    cuota.importe_pagado = (cuota.importe_pagado or Decimal("0")) + orden.importe
-                    cuota.fecha_pago = fecha_liquidacion
-                    if cuota.importe_pagado >= cuota.importe and est_cuota_cobrada:
-                        cuota.estado_id = est_cuota_cobrada.id
-                    self.session.add(cuota)
-
-            # Actualizar recibo asociado (por orden_cobro_id o por cuota_id)
-            await self._marcar_recibo_cobrado(orden, fecha_liquidacion)
-
-        # ── Procesar fallidas ─────────────────────────────────────────────────
+        # ── Resultado del banco → tabla temporal ─────────────────────────────
+        # Una orden listada en ambas listas cuenta como fallida; las que no son
+        # de esta remesa se descartan antes de aplicar nada.
+        resultado: dict[UUID, dict] = {
+            UUID(str(orden_id)): dict(cobrada=True) for orden_id in cobradas
+        }
         for f in fallidas:
-            orden_id = f.get("orden_id")
-            if not orden_id:
-                continue
-            orden_r = await self.session.execute(
-                select(OrdenCobro).where(OrdenCobro.id == orden_id).where(OrdenCobro.remesa_id == remesa_id)
-            )
-            orden = orden_r.scalars().first()
-            if not orden:
+            if not f.get("orden_id"):
                 continue
-
             codigo = f.get("codigo", "")
             motivo = f.get("motivo", "")
             fecha_r = f.get("fecha")
@@ -602,23 +630,95 @@ class RemesaService:
                     fecha_r = date.fromisoformat(fecha_r)
                 except ValueError:
                     fecha_r = None
-            orden.marcar_fallida(codigo, motivo, fecha_r or fecha_liquidacion)
-            orden.estado_id = est_oc_fallida.id
-            self.session.add(orden)
-            n_fallidas += 1
+            resultado[UUID(str(f["orden_id"]))] = dict(
+                cobrada=False,
+                codigo=codigo,
+                motivo=motivo,
+                fecha_rechazo=fecha_r,
+                nota=f"FALLIDO [{codigo}]" + (f": {motivo}" if motivo else ""),
+            )
+        await self._cargar_resultado_banco(remesa_id, resultado)
+        tmp = _tmp_liquidacion
+
+        # ── Cobradas ──────────────────────────────────────────────────────────
+        procesadas = (await self.session.execute(
+            update(OrdenCobro)
+            .where(OrdenCobro.id == tmp.c.orden_id, tmp.c.cobrada.is_(True))
+            .values(estado_id=est_oc_procesada.id, fecha_procesamiento=fecha_liquidacion)
+            .returning(OrdenCobro.importe)
+            .execution_options(synchronize_session=False)
+        )).scalars().all()
+        n_cobradas = len(procesadas)
+        importe_cobrado = sum(procesadas, Decimal("0.00"))
+
+        # Cuotas: importe_pagado += lo cobrado; Cobrada si queda completa
+        cobrado = (
+            select(OrdenCobro.cuota_id, func.sum(OrdenCobro.importe).label("importe"))
+            .join(tmp, tmp.c.orden_id == OrdenCobro.id)
+            .where(tmp.c.cobrada.is_(True), OrdenCobro.cuota_id.is_not(None))
+            .group_by(OrdenCobro.cuota_id)
+            .subquery()
+        )
+        pagado = func.coalesce(CuotaAnual.importe_pagado, 0) + cobrado.c.importe
+        valores_cuota = dict(importe_pagado=pagado, fecha_pago=fecha_liquidacion)
+        if est_cuota_cobrada:
+            valores_cuota["estado_id"] = case(
+                (pagado >= CuotaAnual.importe, est_cuota_cobrada.id),
+                else_=CuotaAnual.estado_id,
+            )
+        await self.session.execute(
+            update(CuotaAnual)
+            .where(CuotaAnual.id == cobrado.c.cuota_id)
+            .values(**valores_cuota)
+            .execution_options(synchronize_session=False)
+        )
 
-            await self._marcar_recibo_fallido(orden, codigo, motivo)
+        await self._actualizar_recibos_liquidados(
+            cobrada=True,
+            estados_sin_enlace=("EMITIDO", "FALLIDO"),
+            valores=lambda origen: dict(
+                estado="COBRADO",
+                fecha_cobro=fecha_liquidacion,
+                importe_pagado=Recibo.importe,
+                orden_cobro_id=origen.c.orden_id,
+            ),
+        )
 
-        # ── Estado final de la remesa ─────────────────────────────────────────
-        # Recargar TODAS las órdenes para evaluar
-        todas_r = await self.session.execute(
-            select(OrdenCobro).where(OrdenCobro.remesa_id == remesa_id)
+        # ── Fallidas (D4.2: la cuota no se toca) ──────────────────────────────
+        n_fallidas = len((await self.session.execute(
+            update(OrdenCobro)
+            .where(OrdenCobro.id == tmp.c.orden_id, tmp.c.cobrada.is_(False))
+            .values(
+                estado_id=est_oc_fallida.id,
+                fecha_procesamiento=date.today(),
+                fecha_rechazo=func.coalesce(tmp.c.fecha_rechazo, fecha_liquidacion),
+                codigo_rechazo=tmp.c.codigo,
+                motivo_rechazo=tmp.c.motivo,
+            )
+            .returning(OrdenCobro.id)
+            .execution_options(synchronize_session=False)
+        )).all())
+
+        await self._actualizar_recibos_liquidados(
+            cobrada=False,
+            estados_sin_enlace=("EMITIDO",),
+            valores=lambda origen: dict(
+                estado="FALLIDO",
+                orden_cobro_id=origen.c.orden_id,
+                observaciones=case(
+                    (func.coalesce(Recibo.observaciones, "") == "", origen.c.nota),
+                    else_=Recibo.observaciones + "\n" + origen.c.nota,
+                ),
+            ),
         )
-        todas = list(todas_r.scalars().all())
-        pendientes = [
-            o for o in todas
-            if o.estado_id not in (est_oc_procesada.id, est_oc_fallida.id)
-        ]
+
+        # ── Estado final de la remesa ─────────────────────────────────────────
+        pendientes = (await self.session.execute(
+            select(func.count())
+            .select_from(OrdenCobro)
+            .where(OrdenCobro.remesa_id == remesa_id)
+            .where(OrdenCobro.estado_id.not_in([est_oc_procesada.id, est_oc_fallida.id]))
+        )).scalar_one()
         if pendientes:
             # Hay órdenes aún en Pendiente → Parcial (si existe ese estado)
             remesa.estado_id = (est_rem_parcial.id if est_rem_parcial else est_rem_procesada.id)
@@ -666,53 +766,85 @@ class RemesaService:
             "remesa_estado": estado_remesa.nombre if estado_remesa else None,
         }
 
-    async def _marcar_recibo_cobrado(self, orden: OrdenCobro, fecha_cobro: date) -> None:
-        """Busca el recibo asociado a la orden y lo marca como COBRADO."""
-        # Estrategia: por orden_cobro_id primero, luego por cuota_id + estado EMITIDO
-        recibo = None
-        recibo_r = await self.session.execute(
-            select(Recibo).where(Recibo.orden_cobro_id == orden.id)
+    async def _insertar_ordenes(self, filas: list[dict]) -> list[UUID]:
+        """INSERT multi-fila de órdenes con ids ya asignados (RETURNING id)."""
+        ids: list[UUID] = []
+        for i in range(0, len(filas), _TAMANO_BLOQUE_INSERT):
+            res = await self.session.execute(
+                insert(OrdenCobro)
+                .values(filas[i:i + _TAMANO_BLOQUE_INSERT])
+                .returning(OrdenCobro.id)
+            )
+            ids.extend(res.scalars().all())
+        return ids
+
+    async def _enlazar_recibos(self, enlaces: list[tuple[UUID, UUID]]) -> None:
+        """Un único UPDATE recibos ... FROM unnest(recibo_ids, orden_ids)."""
+        if not enlaces:
+            return
+        recibo_ids, orden_ids = zip(*enlaces)
+        pares = func.unnest(
+            bindparam("recibo_ids", list(recibo_ids), type_=ARRAY(Uuid)),
+            bindparam("orden_ids", list(orden_ids), type_=ARRAY(Uuid)),
+        ).table_valued(column("recibo_id", Uuid), column("orden_id", Uuid)).render_derived()
+        await self.session.execute(
+            update(Recibo)
+            .where(Recibo.id == pares.c.recibo_id)
+            .values(orden_cobro_id=pares.c.orden_id)
+            .execution_options(synchronize_session=False)
         )
-        recibo = recibo_r.scalars().first()
-        if not recibo and orden.cuota_id:
-            recibo_r = await self.session.execute(
-                select(Recibo)
-                .where(Recibo.cuota_id == orden.cuota_id)
-                .where(Recibo.estado.in_(["EMITIDO", "FALLIDO"]))
-                .order_by(Recibo.fecha_emision.desc())
+
+    async def _cargar_resultado_banco(self, remesa_id: UUID, resultado: dict[UUID, dict]) -> None:
+        """Crea la tabla temporal de la liquidación con las órdenes de esta remesa."""
+        tmp = _tmp_liquidacion
+        await self.session.execute(CreateTable(tmp))
+        vacia = dict.fromkeys(("codigo", "motivo", "fecha_rechazo", "nota"))
+        filas = [dict(vacia, orden_id=orden_id, **datos) for orden_id, datos in resultado.items()]
+        for i in range(0, len(filas), _TAMANO_BLOQUE_INSERT):
+            await self.session.execute(insert(tmp).values(filas[i:i + _TAMANO_BLOQUE_INSERT]))
+        if filas:
+            await self.session.execute(
+                delete(tmp).where(~exists().where(
+                    OrdenCobro.id == tmp.c.orden_id, OrdenCobro.remesa_id == remesa_id,
+                ))
             )
-            recibo = recibo_r.scalars().first()
-        if recibo:
-            recibo.estado = "COBRADO"
-            recibo.fecha_cobro = fecha_cobro
-            recibo.importe_pagado = recibo.importe
-            recibo.orden_cobro_id = orden.id
-            self.session.add(recibo)
 
-    async def _marcar_recibo_fallido(
-        self, orden: OrdenCobro, codigo: str, motivo: str
+    async def _actualizar_recibos_liquidados(
+        self, cobrada: bool, estados_sin_enlace: tuple[str, ...], valores,
     ) -> None:
-        """Busca el recibo asociado a la orden y lo marca como FALLIDO."""
-        recibo = None
-        recibo_r = await self.session.execute(
-            select(Recibo).where(Recibo.orden_cobro_id == orden.id)
+        """Aplica el resultado del banco a los recibos de las órdenes liquidadas.
+
+        Primero los recibos enlazados a la orden (`orden_cobro_id`); después, para
+        órdenes sin recibo enlazado, el más reciente de su cuota en
+        `estados_sin_enlace`. `valores(origen)` construye el SET; `origen` expone
+        las columnas `orden_id` y `nota` de la fila de la tabla temporal.
+        """
+        tmp = _tmp_liquidacion
+        await self.session.execute(
+            update(Recibo)
+            .where(Recibo.orden_cobro_id == tmp.c.orden_id, tmp.c.cobrada.is_(cobrada))
+            .values(**valores(tmp))
+            .execution_options(synchronize_session=False)
+        )
+
+        candidato, enlazado = aliased(Recibo), aliased(Recibo)
+        sin_enlace = (
+            select(candidato.id.label("recibo_id"), tmp.c.orden_id, tmp.c.nota)
+            .join(OrdenCobro, OrdenCobro.cuota_id == candidato.cuota_id)
+            .join(tmp, tmp.c.orden_id == OrdenCobro.id)
+            .where(tmp.c.cobrada.is_(cobrada))
+            .where(candidato.estado.in_(estados_sin_enlace))
+            .where(~exists().where(enlazado.orden_cobro_id == OrdenCobro.id))
+            .order_by(candidato.cuota_id, candidato.fecha_emision.desc())
+            .distinct(candidato.cuota_id)
+            .subquery()
+        )
+        await self.session.execute(
+            update(Recibo)
+            .where(Recibo.id == sin_enlace.c.recibo_id)
+            .values(**valores(sin_enlace))
+            .execution_options(synchronize_session=False)
         )
-        recibo = recibo_r.scalars().first()
-        if not recibo and orden.cuota_id:
-            recibo_r = await self.session.execute(
-                select(Recibo)
-                .where(Recibo.cuota_id == orden.cuota_id)
-                .where(Recibo.estado == "EMITIDO")
-                .order_by(Recibo.fecha_emision.desc())
-            )
-            recibo = recibo_r.scalars().first()
-        if recibo:
-            recibo.estado = "FALLIDO"
-            recibo.orden_cobro_id = orden.id
-            sufijo = f"FALLIDO [{codigo}]" + (f": {motivo}" if motivo else "")
-            obs_prev = recibo.observaciones or ""
-            recibo.observaciones = f"{obs_prev}\n{sufijo}".strip()
-            self.session.add(recibo)
 
     # ── Generar XML SEPA Pain.008.003.02 ─────────────────────────────────────
 
@@ -724,10 +856,30 @@ class RemesaService:
         creditor_bic: Optional[str] = None,
         creditor_id: Optional[str] = None,
     ) -> bytes:
-        """Genera el XML SEPA Direct Debit (Pain.008.003.02).
+        """Genera el XML SEPA Direct Debit (Pain.008.003.02) completo en memoria.
+
+        Para remesas grandes, mejor `preparar_xml_sepa` + `escribir_xml_sepa`
+        (streaming, como hace la descarga REST en app.api.remesas).
+        """
+        doc = await self.preparar_xml_sepa(
+            remesa_id, creditor_name, creditor_iban, creditor_bic, creditor_id,
+        )
+        return b"".join([trozo async for trozo in self.escribir_xml_sepa(doc)])
+
+    async def preparar_xml_sepa(
+        self,
+        remesa_id: UUID,
+        creditor_name: Optional[str] = None,
+        creditor_iban: Optional[str] = None,
+        creditor_bic: Optional[str] = None,
+        creditor_id: Optional[str] = None,
+    ) -> DocumentoPain008:
+        """Valida la remesa y el acreedor y calcula los bloques PmtInf.
 
         D3.5: si no se pasan los datos del acreedor por argumento, se leen de
         `configuraciones` (claves `sepa_creditor_*`). Si faltan, lanza ValueError.
+        Los totales de cada bloque salen de una consulta agregada; los adeudos
+        no se leen hasta `escribir_xml_sepa`.
         """
         # D3.5: cargar acreedor desde configuraciones cuando no se pasa por argumento
         if not all([creditor_name, creditor_iban, creditor_bic, creditor_id]):
@@ -748,114 +900,107 @@ class RemesaService:
                 + ", ".join(faltan)
             )
 
-        result = await self.session.execute(
-            select(Remesa).where(Remesa.id == remesa_id)
-        )
+        result = await self.session.execute(select(Remesa).where(Remesa.id == remesa_id))
         remesa = result.scalars().first()
         if not remesa:
             raise ValueError(f"Remesa {remesa_id} no encontrada")
 
-        root = Element("Document", attrib={
-            "xmlns": "urn:iso:std:iso:20022:tech:xsd:pain.008.003.02",
-            "xmlns:xsi": "http://www.w3.org/2001/XMLSchema-instance",
-        })
-        cstmr = SubElement(root, "CstmrDrctDbtInitn")
-
-        # Group Header
-        grp_hdr = SubElement(cstmr, "GrpHdr")
-        SubElement(grp_hdr, "MsgId").text = remesa.mensaje_id or str(remesa.id)[:35]
-        SubElement(grp_hdr, "CreDtTm").text = f"{date.today().isoformat()}T00:00:00"
-        SubElement(grp_hdr, "NbOfTxs").text = str(remesa.num_ordenes)
-        SubElement(grp_hdr, "CtrlSum").text = str(remesa.importe_total)
-        init_pty = SubElement(grp_hdr, "InitgPty")
-        SubElement(init_pty, "Nm").text = creditor_name[:70]
-
-        # Payment Information block
-        pmt_inf = SubElement(cstmr, "PmtInf")
-        SubElement(pmt_inf, "PmtInfId").text = (remesa.mensaje_id or str(remesa.id))[:35]
-        SubElement(pmt_inf, "PmtMtd").text = "DD"
-        SubElement(pmt_inf, "NbOfTxs").text = str(remesa.num_ordenes)
-        SubElement(pmt_inf, "CtrlSum").text = str(remesa.importe_total)
-
-        pmt_tp_inf = SubElement(pmt_inf, "PmtTpInf")
-        svc_lvl = SubElement(pmt_tp_inf, "SvcLvl")
-        SubElement(svc_lvl, "Cd").text = "SEPA"
-        lcl_instrm = SubElement(pmt_tp_inf, "LclInstrm")
-        SubElement(lcl_instrm, "Cd").text = "CORE"
-        # SeqTp del mandato SEPA — viene del campo de la remesa (FRST/RCUR/LAST/OOFF)
-        SubElement(pmt_tp_inf, "SeqTp").text = remesa.seq_tipo or "RCUR"
-
-        SubElement(pmt_inf, "ReqdColltnDt").text = remesa.fecha_cobro.isoformat()
-
-        # Creditor
-        cdtr = SubElement(pmt_inf, "Cdtr")
-        SubElement(cdtr, "Nm").text = creditor_name[:70]
-        cdtr_acct = SubElement(pmt_inf, "CdtrAcct")
-        cdtr_id_elem = SubElement(cdtr_acct, "Id")
-        SubElement(cdtr_id_elem, "IBAN").text = re.sub(r"\s", "", creditor_iban)
-        cdtr_agt = SubElement(pmt_inf, "CdtrAgt")
-        fin_instn_id = SubElement(cdtr_agt, "FinInstnId")
-        SubElement(fin_instn_id, "BIC").text = creditor_bic
-
-        cdtr_schme = SubElement(pmt_inf, "CdtrSchmeId")
-        cdtr_schme_id = SubElement(cdtr_schme, "Id")
-        prvt_id = SubElement(cdtr_schme_id, "PrvtId")
-        othr = SubElement(prvt_id, "Othr")
-        SubElement(othr, "Id").text = creditor_id
-        schme_nm = SubElement(othr, "SchmeNm")
-        SubElement(schme_nm, "Prtry").text = "SEPA"
-
-        # Transactions
-        for orden in remesa.ordenes:
-            drct_dbt_tx_inf = SubElement(pmt_inf, "DrctDbtTxInf")
-
-            pmt_id = SubElement(drct_dbt_tx_inf, "PmtId")
-            # D4.1: EndToEndId legible {referencia_remesa}-{nseq:03d}
-            # Permite emparejar la respuesta del banco (pain.002/camt.054) con la orden
-            # sin exponer UUIDs al deudor ni a los extractos bancarios.
-            SubElement(pmt_id, "EndToEndId").text = orden.end_to_end_id[:35]
-
-            instd_amt = SubElement(drct_dbt_tx_inf, "InstdAmt", attrib={"Ccy": "EUR"})
-            instd_amt.text = f"{orden.importe:.2f}"
-
-            drct_dbt_tx = SubElement(drct_dbt_tx_inf, "DrctDbtTx")
-            mndtn_rltd_inf = SubElement(drct_dbt_tx, "MndtRltdInf")
-            SubElement(mndtn_rltd_inf, "MndtId").text = (orden.referencia_mandato or str(orden.id)[:35])
-            SubElement(mndtn_rltd_inf, "DtOfSgntr").text = "2010-01-01"
-
-            if orden.iban:
-                dbtr_agt = SubElement(drct_dbt_tx_inf, "DbtrAgt")
-                fi = SubElement(dbtr_agt, "FinInstnId")
-                SubElement(fi, "Othr").text = "NOTPROVIDED"
-
-                dbtr = SubElement(drct_dbt_tx_inf, "Dbtr")
-                cuota = orden.cuota
-                _vs = cuota.vinculacion_socio if cuota else None
-                if _vs and _vs.contacto:
-                    nombre = (_vs.contacto.nombre_completo or "")[:70]
-                    SubElement(dbtr, "Nm").text = nombre or "DESCONOCIDO"
-                else:
-                    SubElement(dbtr, "Nm").text = "DESCONOCIDO"
-
-                dbtr_acct = SubElement(drct_dbt_tx_inf, "DbtrAcct")
-                dbtr_acct_id = SubElement(dbtr_acct, "Id")
-                SubElement(dbtr_acct_id, "IBAN").text = re.sub(r"\s", "", orden.iban)
-
-            purp = SubElement(drct_dbt_tx_inf, "Purp")
-            SubElement(purp, "Cd").text = "OTHR"
-
-            ustrd_rmt = SubElement(drct_dbt_tx_inf, "RmtInf")
-            # Concepto del cobro: usa el de la remesa (más flexible), fallback al ejercicio
-            if remesa.concepto:
-                concepto_cobro = remesa.concepto
-            else:
-                cuota = orden.cuota
-                ejercicio = cuota.ejercicio if cuota else "?"
-                concepto_cobro = f"Cuota {ejercicio}"
-            SubElement(ustrd_rmt, "Ustrd").text = concepto_cobro[:140]
-
-        xml_bytes = b'<?xml version="1.0" encoding="UTF-8"?>\n' + tostring(root, encoding="unicode").encode("utf-8")
-        return xml_bytes
+        # SeqTp y fecha de cobro son de la remesa; los bloques se parten además por
+        # tramos de nseq para acotar el tamaño de cada PmtInf.
+        # Constantes en línea: el GROUP BY debe repetir la expresión tal cual.
+        tramo = (
+            (OrdenCobro.nseq - literal_column("1")) // literal_column(str(_ADEUDOS_POR_PMTINF))
+        ).label("tramo")
+        tramos = (await self.session.execute(
+            select(tramo, func.count(), func.coalesce(func.sum(OrdenCobro.importe), 0))
+            .where(OrdenCobro.remesa_id == remesa_id)
+            .group_by(tramo)
+            .order_by(tramo)
+        )).all()
+        base_id = remesa.mensaje_id or str(remesa.id)
+        bloques = tuple(
+            BloquePago(
+                pmt_inf_id=base_id if len(tramos) == 1 else f"{base_id[:31]}-{n:03d}",
+                seq_tipo=remesa.seq_tipo or "RCUR",
+                fecha_cobro=remesa.fecha_cobro,
+                num_adeudos=num,
+                importe=Decimal(importe),
+            )
+            for n, (_, num, importe) in enumerate(tramos, start=1)
+        )
+        return DocumentoPain008(
+            remesa_id=remesa.id,
+            msg_id=base_id[:35],
+            acreedor=Acreedor(creditor_name, creditor_iban, creditor_bic, creditor_id),
+            bloques=bloques,
+            concepto=remesa.concepto,
+        )
+
+    async def escribir_xml_sepa(self, doc: DocumentoPain008) -> AsyncIterator[bytes]:
+        """Emite el pain.008 por trozos leyendo las órdenes con un cursor de servidor.
+
+        Se leen columnas (no entidades), así que ni la sesión ni el proceso
+        acumulan las órdenes ya escritas. Los totales de `doc` deben leerse en la
+        misma transacción REPEATABLE READ que las órdenes (ver app.api.remesas);
+        si aun así no cuadran con lo leído, lanza ValueError en lugar de emitir
+        un fichero con cabeceras que no corresponden a los adeudos.
+        """
+        from app.modules.membresia.models.contacto import Contacto
+        from app.modules.membresia.models.vinculacion import Vinculacion
+
+        q = (
+            select(
+                OrdenCobro.id, OrdenCobro.nseq, OrdenCobro.importe,
+                OrdenCobro.referencia_mandato, OrdenCobro.iban,
+                Remesa.referencia, CuotaAnual.ejercicio,
+                Contacto.tipo, Contacto.nombre, Contacto.apellido1,
+                Contacto.apellido2, Contacto.razon_social,
+            )
+            .join(Remesa, Remesa.id == OrdenCobro.remesa_id)
+            .outerjoin(CuotaAnual, CuotaAnual.id == OrdenCobro.cuota_id)
+            .outerjoin(Vinculacion, Vinculacion.id == CuotaAnual.vinculacion_socio_id)
+            .outerjoin(Contacto, Contacto.id == Vinculacion.contacto_id)
+            .where(OrdenCobro.remesa_id == doc.remesa_id)
+            .order_by(OrdenCobro.nseq)
+            .execution_options(yield_per=_FILAS_POR_LOTE)
+        )
+
+        xml = EscritorPain008()
+        xml.abrir(doc)
+        bloques = iter(doc.bloques)
+        abierto = False
+        pendientes = 0  # adeudos que faltan por escribir en el bloque abierto
+        async for fila in await self.session.stream(q):
+            if not pendientes:
+                if abierto:
+                    xml.cerrar_bloque()
+                bloque = next(bloques, None)
+                if bloque is None:
+                    raise ValueError(_REMESA_CAMBIADA)
+                xml.abrir_bloque(bloque)
+                abierto, pendientes = True, bloque.num_adeudos
+            xml.adeudo(Adeudo(
+                # D4.1: EndToEndId legible {referencia_remesa}-{nseq:03d}; permite
+                # emparejar la respuesta del banco (pain.002/camt.054) con la orden
+                # sin exponer UUIDs al deudor ni a los extractos bancarios.
+                end_to_end_id=f"{fila.referencia}-{fila.nseq:03d}",
+                importe=fila.importe,
+                referencia_mandato=fila.referencia_mandato or str(fila.id),
+                iban=fila.iban,
+                # Misma regla que Contacto.nombre_completo, sobre las columnas leídas.
+                nombre_deudor=Contacto.nombre_completo.fget(fila) if fila.nombre else None,
+                # Concepto del cobro: el de la remesa; si no hay, el del ejercicio
+                concepto=doc.concepto or f"Cuota {fila.ejercicio or '?'}",
+            ))
+            pendientes -= 1
+            if trozo := xml.vaciar():
+                yield trozo
+        if pendientes or next(bloques, None) is not None:
+            raise ValueError(_REMESA_CAMBIADA)
+        if abierto:
+            xml.cerrar_bloque()
+        xml.cerrar()
+        yield xml.vaciar(forzar=True)
 
     async def marcar_enviada(self, remesa_id: UUID, archivo: Optional[str] = None) -> Remesa:
         estado_enviada = await self._estado_remesa("Enviada")
@@ -989,6 +1134,9 @@ class RemesaService:
             .where(Recibo.estado == "EMITIDO")
             .where(Recibo.modo_cobro == "SEPA")
             .where(Recibo.orden_cobro_id.is_(None))
+            .options(*cargar(
+                Recibo, "cuota", "vinculacion_socio.socio", "vinculacion_socio.contacto",
+            ))
         )
         if agrupacion_id:
             # Recibos cuyo socio pertenece a la agrupación (vía la vinculación)
@@ -1039,7 +1187,7 @@ class RemesaService:
         q = select(CuotaAnual).where(
             CuotaAnual.ejercicio == ejercicio,
             CuotaAnual.estado_id == est_pend.id,
-        )
+        ).options(*cargar(CuotaAnual, "vinculacion_socio.socio"))
         if agrupacion_id:
             q = q.where(CuotaAnual.agrupacion_id == agrupacion_id)
         result = await self.session.execute(q)
@@ -1105,6 +1253,11 @@ class RemesaService:
         from .recibo_service import ReciboService
 
         ejercicio = remesa.fecha_cobro.year
+        remesa = (await self.session.execute(
+            select(Remesa)
+            .where(Remesa.id == remesa.id)
+            .options(*cargar(Remesa, "agrupacion", "ordenes.cuota"))
+        )).scalars().one()
         existentes_q = await self.session.execute(
             select(Recibo.orden_cobro_id).where(
                 Recibo.orden_cobro_id.in_([o.id for o in (remesa.ordenes or [])])
@@ -1218,7 +1371,7 @@ class RemesaService:
         No se permite anular una remesa Procesada o Parcial (ya hubo cobros).
         """
         r = await self.session.execute(
-            select(Remesa).where(Remesa.id == remesa_id)
+            select(Remesa).where(Remesa.id == remesa_id).options(*cargar(Remesa, "ordenes"))
         )
         remesa = r.scalars().first()
         if not remesa:
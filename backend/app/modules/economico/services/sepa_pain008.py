@@ -0,0 +1,181 @@
+"""Escritor incremental del fichero pain.008.003.02 (adeudos directos SEPA CORE).
+
+El documento se emite por trozos de bytes conforme llegan las órdenes, sin
+construir el árbol XML en memoria: la memoria es constante con independencia
+del tamaño de la remesa. Estructura:
+
+    Document/CstmrDrctDbtInitn
+      GrpHdr                      ← totales de todo el fichero
+      PmtInf × N                  ← un bloque por (SeqTp, fecha de cobro, tramo)
+        DrctDbtTxInf × M          ← un adeudo por orden de cobro
+
+Como cada cabecera (`GrpHdr`, `PmtInf`) lleva su `NbOfTxs`/`CtrlSum` antes que
+sus transacciones, el llamador calcula esos totales de antemano (una consulta
+agregada) y luego va pasando los adeudos en el mismo orden que los bloques.
+
+No depende de ningún paquete externo: escapa el texto con `xml.sax.saxutils`.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+from xml.sax.saxutils import escape
+
+NAMESPACE = "urn:iso:std:iso:20022:tech:xsd:pain.008.003.02"
+
+# Bytes acumulados antes de entregar un trozo al llamador.
+TAMANO_TROZO = 64 * 1024
+
+
+@dataclass(frozen=True)
+class Acreedor:
+    """Datos del acreedor SEPA (la organización)."""
+    nombre: str
+    iban: str
+    bic: str
+    identificador: str
+
+
+@dataclass(frozen=True)
+class BloquePago:
+    """Un `PmtInf`: adeudos con el mismo SeqTp y fecha de cobro."""
+    pmt_inf_id: str
+    seq_tipo: str
+    fecha_cobro: date
+    num_adeudos: int
+    importe: Decimal
+
+
+@dataclass(frozen=True)
+class Adeudo:
+    """Un `DrctDbtTxInf` (una orden de cobro)."""
+    end_to_end_id: str
+    importe: Decimal
+    referencia_mandato: str
+    concepto: str
+    iban: Optional[str] = None
+    nombre_deudor: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class DocumentoPain008:
+    """Lo necesario para escribir el fichero de una remesa, ya validado."""
+    remesa_id: object
+    msg_id: str
+    acreedor: Acreedor
+    bloques: tuple[BloquePago, ...]
+    concepto: Optional[str] = None
+
+    @property
+    def num_adeudos(self) -> int:
+        return sum(b.num_adeudos for b in self.bloques)
+
+    @property
+    def importe(self) -> Decimal:
+        return sum((b.importe for b in self.bloques), Decimal("0.00"))
+
+
+def _e(etiqueta: str, texto) -> str:
+    return f"<{etiqueta}>{escape(str(texto))}</{etiqueta}>"
+
+
+def _importe(valor: Decimal) -> str:
+    return f"{valor:.2f}"
+
+
+def _sin_espacios(iban: str) -> str:
+    return re.sub(r"\s", "", iban)
+
+
+class EscritorPain008:
+    """Acumula el XML por partes y lo entrega en trozos de ~`tamano_trozo` bytes.
+
+    Uso: `abrir(doc)`, luego por cada bloque `abrir_bloque` + `adeudo`… +
+    `cerrar_bloque`, y `cerrar()`. Tras cada paso, `vaciar()` devuelve los bytes
+    listos (o b"" si aún no llegan al tamaño del trozo); `vaciar(forzar=True)`
+    entrega lo que quede.
+    """
+
+    def __init__(self, tamano_trozo: int = TAMANO_TROZO):
+        self._partes: list[str] = []
+        self._tamano = 0
+        self._tamano_trozo = tamano_trozo
+        self._acreedor: Optional[Acreedor] = None
+
+    def _escribir(self, *partes: str) -> None:
+        self._partes.extend(partes)
+        self._tamano += sum(len(p) for p in partes)
+
+    def vaciar(self, forzar: bool = False) -> bytes:
+        if not self._partes or (not forzar and self._tamano < self._tamano_trozo):
+            return b""
+        trozo = "".join(self._partes).encode("utf-8")
+        self._partes.clear()
+        self._tamano = 0
+        return trozo
+
+    def abrir(self, doc: DocumentoPain008, creado: Optional[datetime] = None) -> None:
+        self._acreedor = doc.acreedor
+        creado = creado or datetime.combine(date.today(), datetime.min.time())
+        self._escribir(
+            '<?xml version="1.0" encoding="UTF-8"?>\n',
+            f'<Document xmlns="{NAMESPACE}" '
+            'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">',
+            "<CstmrDrctDbtInitn><GrpHdr>",
+            _e("MsgId", doc.msg_id[:35]),
+            _e("CreDtTm", creado.strftime("%Y-%m-%dT%H:%M:%S")),
+            _e("NbOfTxs", doc.num_adeudos),
+            _e("CtrlSum", _importe(doc.importe)),
+            "<InitgPty>", _e("Nm", doc.acreedor.nombre[:70]), "</InitgPty>",
+            "</GrpHdr>",
+        )
+
+    def abrir_bloque(self, bloque: BloquePago) -> None:
+        a = self._acreedor
+        self._escribir(
+            "<PmtInf>",
+            _e("PmtInfId", bloque.pmt_inf_id[:35]),
+            _e("PmtMtd", "DD"),
+            _e("NbOfTxs", bloque.num_adeudos),
+            _e("CtrlSum", _importe(bloque.importe)),
+            "<PmtTpInf><SvcLvl>", _e("Cd", "SEPA"), "</SvcLvl>",
+            "<LclInstrm>", _e("Cd", "CORE"), "</LclInstrm>",
+            _e("SeqTp", bloque.seq_tipo), "</PmtTpInf>",
+            _e("ReqdColltnDt", bloque.fecha_cobro.isoformat()),
+            "<Cdtr>", _e("Nm", a.nombre[:70]), "</Cdtr>",
+            "<CdtrAcct><Id>", _e("IBAN", _sin_espacios(a.iban)), "</Id></CdtrAcct>",
+            "<CdtrAgt><FinInstnId>", _e("BIC", a.bic), "</FinInstnId></CdtrAgt>",
+            "<CdtrSchmeId><Id><PrvtId><Othr>", _e("Id", a.identificador),
+            "<SchmeNm>", _e("Prtry", "SEPA"), "</SchmeNm></Othr></PrvtId></Id></CdtrSchmeId>",
+        )
+
+    def adeudo(self, adeudo: Adeudo) -> None:
+        self._escribir(
+            "<DrctDbtTxInf><PmtId>", _e("EndToEndId", adeudo.end_to_end_id[:35]), "</PmtId>",
+            f'<InstdAmt Ccy="EUR">{_importe(adeudo.importe)}</InstdAmt>',
+            "<DrctDbtTx><MndtRltdInf>",
+            _e("MndtId", adeudo.referencia_mandato[:35]),
+            _e("DtOfSgntr", "2010-01-01"),
+            "</MndtRltdInf></DrctDbtTx>",
+        )
+        if adeudo.iban:
+            self._escribir(
+                "<DbtrAgt><FinInstnId>", _e("Othr", "NOTPROVIDED"), "</FinInstnId></DbtrAgt>",
+                "<Dbtr>", _e("Nm", (adeudo.nombre_deudor or "")[:70] or "DESCONOCIDO"), "</Dbtr>",
+                "<DbtrAcct><Id>", _e("IBAN", _sin_espacios(adeudo.iban)), "</Id></DbtrAcct>",
+            )
+        self._escribir(
+            "<Purp>", _e("Cd", "OTHR"), "</Purp>",
+            "<RmtInf>", _e("Ustrd", adeudo.concepto[:140]), "</RmtInf>",
+            "</DrctDbtTxInf>",
+        )
+
+    def cerrar_bloque(self) -> None:
+        self._escribir("</PmtInf>")
+
+    def cerrar(self) -> None:
+        self._escribir("</CstmrDrctDbtInitn></Document>")
@@ -15,18 +15,28 @@ Convención de emparejamiento:
 - El parser extrae esa cadena y deja que la capa de servicio (`RemesaService`)
   haga la resolución a `OrdenCobro` real.
 
+Los ficheros se leen de forma incremental (`ElementTree.iterparse`): las
+funciones `iterar_*` son generadores que entregan cada línea en cuanto se
+cierra su elemento y lo descartan, de modo que un fichero de varios megas se
+procesa en memoria constante. `parse_*` acumulan esas líneas en un resultado.
+
 No depende de ningún paquete externo: usa `xml.etree.ElementTree` de la stdlib.
 """
 
 from __future__ import annotations
 
+import io
 from dataclasses import dataclass, field
 from datetime import date
 from decimal import Decimal
-from typing import Optional
+from typing import BinaryIO, Iterator, Optional, Union
 from xml.etree import ElementTree as ET
 
 
+# Contenido del fichero: los bytes ya leídos o un fichero binario abierto.
+Fuente = Union[bytes, BinaryIO]
+
+
 # --- Resultados del parseo ----------------------------------------------------
 
 
@@ -96,13 +106,9 @@ def _find(elem: ET.Element, *path: str) -> Optional[ET.Element]:
     return None
 
 
-def _findall(elem: ET.Element, name: str) -> list[ET.Element]:
-    """Devuelve todos los descendientes con ese local-name (cualquier nivel)."""
-    out: list[ET.Element] = []
-    for child in elem.iter():
-        if _strip_ns(child.tag) == name:
-            out.append(child)
-    return out
+def _primero(*elems: Optional[ET.Element]) -> Optional[ET.Element]:
+    """Primer elemento no nulo. No vale `a or b`: un Element sin hijos es falso."""
+    return next((e for e in elems if e is not None), None)
 
 
 def _text(elem: Optional[ET.Element], *path: str) -> Optional[str]:
@@ -124,115 +130,175 @@ def _parse_date(s: Optional[str]) -> Optional[date]:
         return None
 
 
+# --- Lectura incremental -----------------------------------------------------
+
+
+def _iterar(fuente: Fuente, etiquetas: frozenset[str]) -> Iterator[tuple[ET.Element, list[ET.Element]]]:
+    """Recorre el XML con `iterparse` y entrega cada elemento cuyo local-name
+    está en `etiquetas` en cuanto se cierra, junto con la pila de sus ancestros.
+
+    Tras entregarlo lo desengancha de su padre, de modo que el árbol nunca
+    retiene las transacciones ya procesadas: la memoria depende del tamaño de
+    una transacción, no del fichero.
+    """
+    if isinstance(fuente, (bytes, bytearray, memoryview)):
+        fuente = io.BytesIO(fuente)
+    pila: list[ET.Element] = []
+    for evento, elem in ET.iterparse(fuente, events=("start", "end")):
+        if evento == "start":
+            pila.append(elem)
+            continue
+        pila.pop()
+        if _strip_ns(elem.tag) in etiquetas:
+            yield elem, pila
+            elem.clear()
+            if pila:
+                pila[-1].remove(elem)
+
+
 # --- Pain.002 -----------------------------------------------------------------
 
 
-def parse_pain002(xml_bytes: bytes) -> ResultadoPain002:
-    """Extrae el estado de cada transacción del fichero pain.002.
+def _linea_pain002(tx: ET.Element) -> Optional[LineaPain002]:
+    end_to_end = _text(tx, "OrgnlEndToEndId")
+    if not end_to_end:
+        return None
+    estado = _text(tx, "TxSts") or "PDNG"
+    codigo = None
+    motivo = None
+    sts_rsn = _find(tx, "StsRsnInf")
+    if sts_rsn is not None:
+        rsn = _find(sts_rsn, "Rsn")
+        if rsn is not None:
+            codigo = _text(rsn, "Cd") or _text(rsn, "Prtry")
+        motivo = _text(sts_rsn, "AddtlInf")
+    return LineaPain002(
+        end_to_end_id=end_to_end,
+        estado=estado,
+        es_rechazada=estado.upper() == "RJCT",
+        codigo_rechazo=codigo,
+        motivo_rechazo=motivo,
+        fecha_rechazo=_parse_date(_text(tx, "AccptncDtTm")),
+    )
+
+
+_ETIQUETAS_PAIN002 = frozenset({"GrpHdr", "OrgnlGrpInfAndSts", "TxInfAndSts"})
+
+
+def iterar_pain002(
+    fuente: Fuente, resultado: Optional[ResultadoPain002] = None,
+) -> Iterator[LineaPain002]:
+    """Genera las transacciones del pain.002 según se leen, en memoria constante.
 
     Soporta variantes pain.002.001.0x (estructura ISO 20022). Las transacciones
     pueden venir agrupadas en uno o varios `OrgnlPmtInfAndSts` que a su vez
     contienen `TxInfAndSts`. Las rechazadas tienen `TxSts=RJCT` y un nodo
     `StsRsnInf` con el código R (`Cd`) y motivo (`AddtlInf`).
+
+    Si se pasa `resultado`, se rellenan en él los datos de cabecera
+    (`fecha_creacion`, `msg_id_original`) conforme aparecen; las líneas no se
+    acumulan.
     """
-    root = ET.fromstring(xml_bytes)
+    for elem, _ in _iterar(fuente, _ETIQUETAS_PAIN002):
+        nombre = _strip_ns(elem.tag)
+        if nombre == "TxInfAndSts":
+            linea = _linea_pain002(elem)
+            if linea is not None:
+                yield linea
+        elif resultado is None:
+            continue
+        elif nombre == "GrpHdr":
+            resultado.fecha_creacion = _parse_date(_text(elem, "CreDtTm"))
+        elif nombre == "OrgnlGrpInfAndSts":
+            resultado.msg_id_original = _text(elem, "OrgnlMsgId")
 
-    grp_hdr = _find(root, "CstmrPmtStsRpt", "GrpHdr") or _find(root, "GrpHdr")
-    fecha_creacion = _parse_date(_text(grp_hdr, "CreDtTm")) if grp_hdr is not None else None
 
-    msg_id_original = (
-        _text(root, "OrgnlGrpInfAndSts", "OrgnlMsgId")
-        or _text(root, "CstmrPmtStsRpt", "OrgnlGrpInfAndSts", "OrgnlMsgId")
-    )
+def parse_pain002(xml_bytes: Fuente) -> ResultadoPain002:
+    """Extrae el estado de cada transacción del fichero pain.002.
 
-    lineas: list[LineaPain002] = []
-    for tx in _findall(root, "TxInfAndSts"):
-        end_to_end = _text(tx, "OrgnlEndToEndId")
-        estado = _text(tx, "TxSts") or "PDNG"
-        es_rechazada = estado.upper() == "RJCT"
-        codigo = None
-        motivo = None
-        sts_rsn = _find(tx, "StsRsnInf")
-        if sts_rsn is not None:
-            rsn = _find(sts_rsn, "Rsn")
-            if rsn is not None:
-                codigo = _text(rsn, "Cd") or _text(rsn, "Prtry")
-            motivo = _text(sts_rsn, "AddtlInf")
-        fecha_r = _parse_date(_text(tx, "AccptncDtTm"))
-
-        if not end_to_end:
-            continue
-        lineas.append(LineaPain002(
-            end_to_end_id=end_to_end,
-            estado=estado,
-            es_rechazada=es_rechazada,
-            codigo_rechazo=codigo,
-            motivo_rechazo=motivo,
-            fecha_rechazo=fecha_r,
-        ))
-
-    return ResultadoPain002(
-        msg_id_original=msg_id_original,
-        fecha_creacion=fecha_creacion,
-        lineas=lineas,
-    )
+    Versión acumulada de `iterar_pain002`, para quien necesite todas las líneas.
+    """
+    resultado = ResultadoPain002()
+    resultado.lineas = list(iterar_pain002(xml_bytes, resultado))
+    return resultado
 
 
 # --- camt.054 -----------------------------------------------------------------
 
 
-def parse_camt054(xml_bytes: bytes) -> ResultadoCamt054:
-    """Extrae los cargos individuales y el bruto de un fichero camt.054.
+def _linea_camt054(tx: ET.Element, fecha_valor: Optional[date]) -> Optional[LineaCamt054]:
+    end_to_end = _text(tx, "Refs", "EndToEndId")
+    amt_el = _primero(_find(tx, "Amt"), _find(tx, "AmtDtls", "InstdAmt", "Amt"))
+    if not end_to_end or amt_el is None or not amt_el.text:
+        return None
+    try:
+        importe = Decimal(amt_el.text)
+    except (ValueError, ArithmeticError):
+        return None
+    return LineaCamt054(
+        end_to_end_id=end_to_end,
+        importe=importe,
+        referencia_bancaria=_text(tx, "Refs", "AcctSvcrRef"),
+        fecha_valor=fecha_valor,
+    )
 
-    Estructura ISO 20022: `BkToCstmrDbtCdtNtfctn / Ntfctn / Ntry`. Cada `Ntry`
-    es un movimiento bancario (puede ser el ingreso bruto del lote). El detalle
-    por orden está en `NtryDtls/TxDtls/Refs/EndToEndId` con su `Amt`.
-    """
-    root = ET.fromstring(xml_bytes)
-
-    fecha_liq = None
-    importe_bruto = Decimal("0.00")
-    moneda = "EUR"
-
-    # Tomamos el primer Ntry como el ingreso bruto del lote
-    primer_ntry = _find(root, "BkToCstmrDbtCdtNtfctn", "Ntfctn", "Ntry") or _find(root, "Ntry")
-    if primer_ntry is not None:
-        # Fecha valor
-        val_dt = _find(primer_ntry, "ValDt", "Dt") or _find(primer_ntry, "BookgDt", "Dt")
-        if val_dt is not None and val_dt.text:
-            fecha_liq = _parse_date(val_dt.text)
-        amt = _find(primer_ntry, "Amt")
-        if amt is not None and amt.text:
-            try:
-                importe_bruto = Decimal(amt.text)
-            except (ValueError, ArithmeticError):
-                pass
-            moneda = amt.attrib.get("Ccy", "EUR")
-
-    cargos: list[LineaCamt054] = []
-    for tx in _findall(root, "TxDtls"):
-        end_to_end = _text(tx, "Refs", "EndToEndId")
-        ref_bancaria = _text(tx, "Refs", "AcctSvcrRef")
-        amt_el = _find(tx, "Amt") or _find(tx, "AmtDtls", "InstdAmt", "Amt")
-        if not end_to_end or amt_el is None or not amt_el.text:
-            continue
+
+def _cabecera_camt054(ntry: ET.Element, resultado: ResultadoCamt054) -> None:
+    """Rellena fecha e importe bruto a partir del primer `Ntry` del fichero."""
+    val_dt = _primero(_find(ntry, "ValDt", "Dt"), _find(ntry, "BookgDt", "Dt"))
+    if val_dt is not None and val_dt.text:
+        resultado.fecha_liquidacion = _parse_date(val_dt.text)
+    amt = _find(ntry, "Amt")
+    if amt is not None and amt.text:
         try:
-            importe = Decimal(amt_el.text)
+            resultado.importe_bruto = Decimal(amt.text)
         except (ValueError, ArithmeticError):
-            continue
-        cargos.append(LineaCamt054(
-            end_to_end_id=end_to_end,
-            importe=importe,
-            referencia_bancaria=ref_bancaria,
-            fecha_valor=fecha_liq,
-        ))
-
-    return ResultadoCamt054(
-        fecha_liquidacion=fecha_liq,
-        importe_bruto=importe_bruto,
-        moneda=moneda,
-        cargos=cargos,
-    )
+            pass
+        resultado.moneda = amt.attrib.get("Ccy", "EUR")
+
+
+_ETIQUETAS_CAMT054 = frozenset({"Ntry", "TxDtls"})
+
+
+def iterar_camt054(
+    fuente: Fuente, resultado: Optional[ResultadoCamt054] = None,
+) -> Iterator[LineaCamt054]:
+    """Genera los cargos individuales del camt.054 según se leen.
+
+    Estructura ISO 20022: `BkToCstmrDbtCdtNtfctn / Ntfctn / Ntry`. Cada `Ntry`
+    es un movimiento bancario; el primero se toma como el ingreso bruto del lote
+    y su fecha valor se aplica a todos los cargos. El detalle por orden está en
+    `NtryDtls/TxDtls/Refs/EndToEndId` con su `Amt`.
+
+    Los `TxDtls` se desenganchan al procesarlos, así que un `Ntry` con miles de
+    cargos no llega a existir entero en memoria. `Amt` y `ValDt` preceden a
+    `NtryDtls` en el esquema, por lo que ya están leídos cuando llega el primer
+    cargo. Si se pasa `resultado`, se rellenan en él los datos del bruto.
+    """
+    cabecera = resultado if resultado is not None else ResultadoCamt054()
+    leida = False
+    for elem, ancestros in _iterar(fuente, _ETIQUETAS_CAMT054):
+        if not leida:
+            ntry = elem if _strip_ns(elem.tag) == "Ntry" else next(
+                (a for a in reversed(ancestros) if _strip_ns(a.tag) == "Ntry"), None,
+            )
+            if ntry is not None:
+                _cabecera_camt054(ntry, cabecera)
+                leida = True
+        if _strip_ns(elem.tag) == "TxDtls":
+            linea = _linea_camt054(elem, cabecera.fecha_liquidacion)
+            if linea is not None:
+                yield linea
+
+
+def parse_camt054(xml_bytes: Fuente) -> ResultadoCamt054:
+    """Extrae los cargos individuales y el bruto de un fichero camt.054.
+
+    Versión acumulada de `iterar_camt054`, para quien necesite todos los cargos.
+    """
+    resultado = ResultadoCamt054()
+    resultado.cargos = list(iterar_camt054(xml_bytes, resultado))
+    return resultado
 
 
 # --- Códigos SEPA (R-Reasons EPC131-08) ---------------------------------------
@@ -1,13 +1,17 @@
 """Servicio de tesorería para gestión de cuentas bancarias y movimientos."""
 
-from datetime import date
+from datetime import date, timedelta
 from decimal import Decimal
 from typing import List, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy import select, and_, func
+from sqlalchemy import Uuid, any_, bindparam, insert, select, and_, func, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.carga import cargar
+from .conciliacion_automatica import TOLERANCIA_DIAS, Movimiento, MotorConciliacion, normalizar
+
 from ..models.tesoreria import (
     CuentaBancaria,
     ApunteCaja,
@@ -23,6 +27,10 @@ from ..models.cuotas import CuotaAnual
 from app.modules.configuracion.models.estados import EstadoCuota, EstadoRemesa, EstadoOrdenCobro
 
 
+# Filas por sentencia INSERT multi-fila.
+_TAMANO_BLOQUE_INSERT = 1000
+
+
 class TesoreriaService:
     """Servicio para gestionar tesorería: cuentas bancarias y movimientos."""
 
@@ -44,7 +52,7 @@ class TesoreriaService:
         """Crea una nueva cuenta bancaria."""
         # Validar IBAN único
         existing = await self.session.execute(
-            select(CuentaBancaria).where(CuentaBancaria.iban == iban)
+            select(CuentaBancaria).where(CuentaBancaria.con_iban(iban))
         )
         if existing.scalars().first():
             raise ValueError(f"Ya existe una cuenta con IBAN {iban[-4:]}")
@@ -414,56 +422,80 @@ class TesoreriaService:
         self,
         cuenta_id: UUID,
         lineas: List[dict],
-    ) -> List[ExtractoBancario]:
-        """Importa líneas de un extracto bancario.
+        conciliar: bool = True,
+    ) -> List[UUID]:
+        """Importa líneas de un extracto bancario. Devuelve los ids creados.
 
         D8.1: el cliente puede llamar con líneas pre-parseadas (de CSV en frontend)
         o usar el parser de Norma 43 (`parse_norma43` + esta función).
 
         Cada línea: {fecha (date), importe (number), concepto (str), referencia (str)}.
         Evita duplicar líneas con misma (fecha, importe, referencia) en la misma cuenta.
+        Las líneas se insertan en bloques multi-fila y, si `conciliar`, se pasa
+        el motor de conciliación automática sobre su rango de fechas en la misma
+        transacción.
         """
-        from datetime import date as _date
         cuenta = await self.obtener_cuenta_bancaria(cuenta_id)
         if not cuenta:
             raise ValueError(f"Cuenta {cuenta_id} no encontrada")
 
-        # Pre-cargar líneas ya existentes para evitar duplicados (mismo día + importe + referencia)
+        normalizadas = []
+        for linea in lineas:
+            f = linea["fecha"]
+            if isinstance(f, str):
+                f = date.fromisoformat(f)
+            normalizadas.append((
+                f,
+                Decimal(str(linea["importe"])).quantize(Decimal("0.01")),
+                (linea.get("referencia") or "").strip(),
+                linea.get("concepto"),
+            ))
+        if not normalizadas:
+            return []
+        desde = min(n[0] for n in normalizadas)
+        hasta = max(n[0] for n in normalizadas)
+
+        # Líneas ya existentes en el rango del fichero (mismo día + importe + referencia)
         existentes_r = await self.session.execute(
             select(ExtractoBancario.fecha, ExtractoBancario.importe, ExtractoBancario.referencia)
-            .where(ExtractoBancario.cuenta_bancaria_id == cuenta_id)
+            .where(
+                ExtractoBancario.cuenta_bancaria_id == cuenta_id,
+                ExtractoBancario.fecha.between(desde, hasta),
+            )
         )
         existentes = {
             (f, Decimal(str(i)).quantize(Decimal("0.01")), (ref or "").strip())
             for f, i, ref in existentes_r.all()
         }
 
-        extractos = []
-        for linea in lineas:
-            f = linea["fecha"]
-            if isinstance(f, str):
-                f = _date.fromisoformat(f)
-            importe_norm = Decimal(str(linea["importe"])).quantize(Decimal("0.01"))
-            ref_norm = (linea.get("referencia") or "").strip()
-            clave = (f, importe_norm, ref_norm)
-            if clave in existentes:
+        filas = []
+        for f, importe, ref, concepto in normalizadas:
+            if (f, importe, ref) in existentes:
                 continue
-            existentes.add(clave)
-
-            extracto = ExtractoBancario(
-                cuenta_bancaria_id=cuenta_id,
-                fecha=f,
-                importe=importe_norm,
-                concepto=linea.get("concepto"),
-                referencia=ref_norm or None,
+            existentes.add((f, importe, ref))
+            filas.append({
+                "id": uuid4(),
+                "cuenta_bancaria_id": cuenta_id,
+                "fecha": f,
+                "importe": importe,
+                "concepto": concepto,
+                "referencia": ref or None,
+                "conciliado": False,
+            })
+
+        ids: List[UUID] = []
+        for i in range(0, len(filas), _TAMANO_BLOQUE_INSERT):
+            res = await self.session.execute(
+                insert(ExtractoBancario)
+                .values(filas[i:i + _TAMANO_BLOQUE_INSERT])
+                .returning(ExtractoBancario.id)
             )
-            self.session.add(extracto)
-            extractos.append(extracto)
+            ids.extend(res.scalars().all())
 
+        if conciliar and ids:
+            await self._conciliar(cuenta_id, desde, hasta, aplicar=True)
         await self.session.commit()
-        for e in extractos:
-            await self.session.refresh(e)
-        return extractos
+        return ids
 
     @staticmethod
     def parse_norma43(contenido: bytes) -> List[dict]:
@@ -641,6 +673,151 @@ class TesoreriaService:
         await self.session.refresh(conciliacion)
         return conciliacion
 
+    async def conciliar_automaticamente(
+        self,
+        cuenta_id: Optional[UUID] = None,
+        fecha_inicio: Optional[date] = None,
+        fecha_fin: Optional[date] = None,
+        aplicar: bool = True,
+        tolerancia_dias: int = TOLERANCIA_DIAS,
+        usuario_id: Optional[UUID] = None,
+    ) -> dict:
+        """Empareja de una pasada las líneas de extracto pendientes con los apuntes
+        pendientes (ver `conciliacion_automatica`).
+
+        Si `aplicar`, las parejas inequívocas se concilian (método AUTOMATICO) y
+        el resto se devuelven como propuestas; si no, todas son propuestas y la
+        BD no se toca.
+
+        Resultado:
+        {
+          "aplicadas": [{extracto_id, apunte_id, criterio, puntuacion, fecha, importe,
+                         concepto_extracto, concepto_apunte}],
+          "propuestas": [... igual ...],
+          "sin_emparejar": n_lineas_de_extracto_sin_candidato,
+        }
+        """
+        resultado = await self._conciliar(
+            cuenta_id, fecha_inicio, fecha_fin, aplicar, tolerancia_dias, usuario_id,
+        )
+        if aplicar:
+            await self.session.commit()
+        return resultado
+
+    async def _conciliar(
+        self,
+        cuenta_id: Optional[UUID],
+        fecha_inicio: Optional[date],
+        fecha_fin: Optional[date],
+        aplicar: bool,
+        tolerancia_dias: int = TOLERANCIA_DIAS,
+        usuario_id: Optional[UUID] = None,
+    ) -> dict:
+        filtros = [ExtractoBancario.conciliado.is_(False), ExtractoBancario.eliminado.is_(False)]
+        if cuenta_id:
+            filtros.append(ExtractoBancario.cuenta_bancaria_id == cuenta_id)
+        if fecha_inicio:
+            filtros.append(ExtractoBancario.fecha >= fecha_inicio)
+        if fecha_fin:
+            filtros.append(ExtractoBancario.fecha <= fecha_fin)
+        extractos_r = await self.session.execute(
+            select(
+                ExtractoBancario.id, ExtractoBancario.cuenta_bancaria_id, ExtractoBancario.fecha,
+                ExtractoBancario.importe, ExtractoBancario.concepto, ExtractoBancario.referencia,
+            ).where(*filtros)
+        )
+        extractos = [
+            Movimiento(e.id, e.cuenta_bancaria_id, e.fecha, e.importe,
+                       normalizar(e.concepto), normalizar(e.referencia))
+            for e in extractos_r.all()
+        ]
+        if not extractos:
+            return {"aplicadas": [], "propuestas": [], "sin_emparejar": 0}
+
+        # Apuntes pendientes de las mismas cuentas en el rango ampliado por la tolerancia
+        margen = timedelta(days=tolerancia_dias)
+        cuentas = list({e.cuenta_id for e in extractos})
+        apuntes_r = await self.session.execute(
+            select(
+                ApunteCaja.id, ApunteCaja.cuenta_bancaria_id, ApunteCaja.fecha, ApunteCaja.tipo,
+                ApunteCaja.importe, ApunteCaja.concepto, ApunteCaja.referencia_externa,
+            ).where(
+                ApunteCaja.cuenta_bancaria_id == any_(bindparam("cuentas", cuentas, type_=ARRAY(Uuid))),
+                ApunteCaja.conciliado.is_(False),
+                ApunteCaja.eliminado.is_(False),
+                ApunteCaja.tipo != TipoApunte.TRANSFERENCIA,
+                ApunteCaja.fecha.between(
+                    min(e.fecha for e in extractos) - margen,
+                    max(e.fecha for e in extractos) + margen,
+                ),
+            )
+        )
+        motor = MotorConciliacion(
+            (
+                Movimiento(
+                    a.id, a.cuenta_bancaria_id, a.fecha,
+                    a.importe if a.tipo == TipoApunte.INGRESO else -a.importe,
+                    normalizar(a.concepto), normalizar(a.referencia_externa),
+                )
+                for a in apuntes_r.all()
+            ),
+            tolerancia_dias,
+        )
+        pares = motor.emparejar(extractos)
+        automaticos = [p for p in pares if p.automatico and aplicar]
+        if automaticos:
+            await self._aplicar_conciliaciones(automaticos, usuario_id)
+
+        def _fila(p) -> dict:
+            return {
+                "extracto_id": p.extracto.id,
+                "apunte_id": p.apunte.id,
+                "criterio": p.criterio,
+                "puntuacion": p.puntuacion,
+                "fecha": p.extracto.fecha,
+                "importe": p.extracto.importe,
+                "concepto_extracto": p.extracto.concepto,
+                "concepto_apunte": p.apunte.concepto,
+            }
+
+        aplicadas = {p.extracto.id for p in automaticos}
+        return {
+            "aplicadas": [_fila(p) for p in automaticos],
+            "propuestas": [_fila(p) for p in pares if p.extracto.id not in aplicadas],
+            "sin_emparejar": len(extractos) - len(pares),
+        }
+
+    async def _aplicar_conciliaciones(self, pares: list, usuario_id: Optional[UUID]) -> None:
+        """Crea las `Conciliacion` y marca apuntes y líneas con sentencias por conjuntos."""
+        filas = [
+            {
+                "id": uuid4(),
+                "apunte_id": p.apunte.id,
+                "extracto_id": p.extracto.id,
+                "metodo": MetodoConciliacion.AUTOMATICO,
+                "usuario_id": usuario_id,
+            }
+            for p in pares
+        ]
+        for i in range(0, len(filas), _TAMANO_BLOQUE_INSERT):
+            await self.session.execute(
+                insert(Conciliacion).values(filas[i:i + _TAMANO_BLOQUE_INSERT])
+            )
+        apuntes = bindparam("apuntes", [p.apunte.id for p in pares], type_=ARRAY(Uuid))
+        extractos = bindparam("extractos", [p.extracto.id for p in pares], type_=ARRAY(Uuid))
+        await self.session.execute(
+            update(ApunteCaja)
+            .where(ApunteCaja.id == any_(apuntes))
+            .values(conciliado=True, fecha_conciliacion=date.today())
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(
+            update(ExtractoBancario)
+            .where(ExtractoBancario.id == any_(extractos))
+            .values(conciliado=True)
+            .execution_options(synchronize_session=False)
+        )
+
     async def crear_conciliacion_periodo(
         self,
         cuenta_id: UUID,
@@ -877,7 +1054,10 @@ class TesoreriaService:
         """
         from ..services.registro_contable import RegistroContable
 
-        cuota_r = await self.session.execute(select(CuotaAnual).where(CuotaAnual.id == cuota_id))
+        cuota_r = await self.session.execute(
+            select(CuotaAnual).where(CuotaAnual.id == cuota_id)
+            .options(*cargar(CuotaAnual, "vinculacion_socio.contacto"))
+        )
         cuota = cuota_r.scalars().first()
         if not cuota:
             raise ValueError(f"Cuota {cuota_id} no encontrada")
@@ -19,7 +19,7 @@ class CategoriaHabilidad(InmutableMixin, BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
     habilidades: Mapped[list['Habilidad']] = relationship(
-        'Habilidad', back_populates='categoria', lazy='selectin'
+        'Habilidad', back_populates='categoria', lazy='select'
     )
 
     def __repr__(self) -> str:
@@ -11,9 +11,10 @@ import uuid
 from datetime import date, datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Boolean, Date, ForeignKey, String, Text
+from sqlalchemy import Boolean, Date, ForeignKey, String, Text, event, false
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.indice_ciego import LONGITUD_INDICE, indice_documento
 from app.infrastructure.base_model import BaseModel
 
 if TYPE_CHECKING:
@@ -57,6 +58,11 @@ class Contacto(BaseModel):
     numero_documento: Mapped[Optional[str]] = mapped_column(
         String(255), unique=True, nullable=True, index=True
     )
+    # Índice ciego de numero_documento (puede estar cifrado): las búsquedas
+    # por NIF van por aquí (`Contacto.con_documento`). Ver app/core/indice_ciego.py.
+    numero_documento_indice: Mapped[Optional[str]] = mapped_column(
+        String(LONGITUD_INDICE), nullable=True, index=True
+    )
     pais_documento_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         ForeignKey("paises.id"), nullable=True
     )
@@ -130,13 +136,13 @@ class Contacto(BaseModel):
     representante_legal: Mapped[Optional[Contacto]] = relationship(
         back_populates="contactos_donde_represento",
         remote_side=[representante_legal_id],
-        lazy="selectin"
+        lazy="select"
     )
 
     vinculaciones: Mapped[list[Vinculacion]] = relationship(
         back_populates="contacto",
         cascade="all, delete-orphan",
-        lazy="selectin"
+        lazy="select"
     )
     participaciones: Mapped[list[Participacion]] = relationship(
         back_populates="contacto",
@@ -203,3 +209,14 @@ class Contacto(BaseModel):
     def es_voluntario(self) -> bool:
         """True si tiene una vinculación vigente de tipo VOLUNTARIO."""
         return self.tiene_vinculacion_tipo("VOLUNTARIO")
+
+    @classmethod
+    def con_documento(cls, numero: Optional[str]):
+        """Criterio WHERE por número de documento (en claro o cifrado en BD)."""
+        indice = indice_documento(numero)
+        return cls.numero_documento_indice == indice if indice else false()
+
+
+@event.listens_for(Contacto.numero_documento, "set")
+def _indexar_numero_documento(target: Contacto, value, _oldvalue, _initiator) -> None:
+    target.numero_documento_indice = indice_documento(value)
@@ -30,8 +30,8 @@ class CoordinacionTerritorial(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
 
     # Relaciones
-    miembro = relationship('Contacto', lazy='selectin')
-    agrupacion = relationship('UnidadOrganizativa', lazy='selectin')
+    miembro = relationship('Contacto', lazy='select')
+    agrupacion = relationship('UnidadOrganizativa', lazy='select')
 
     def __repr__(self) -> str:
         return f"<CoordinacionTerritorial(miembro_id={self.miembro_id}, agrupacion_id={self.agrupacion_id})>"
@@ -46,7 +46,7 @@ class ContactoEtiqueta(BaseModel):
         ForeignKey("etiquetas.id", ondelete="CASCADE"), nullable=False, index=True
     )
 
-    etiqueta = relationship("Etiqueta", lazy="selectin")
+    etiqueta = relationship("Etiqueta", lazy="select")
 
     def __repr__(self) -> str:
         return f"<ContactoEtiqueta(contacto={self.contacto_id}, etiqueta={self.etiqueta_id})>"
@@ -27,7 +27,7 @@ class Habilidad(InmutableMixin, BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     categoria: Mapped[Optional['CategoriaHabilidad']] = relationship(
-        'CategoriaHabilidad', back_populates='habilidades', lazy='selectin'
+        'CategoriaHabilidad', back_populates='habilidades', lazy='select'
     )
 
     miembro_habilidades: Mapped[list['MiembroHabilidad']] = relationship(
@@ -65,10 +65,10 @@ class MiembroHabilidad(BaseModel):
     notas: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
 
     habilidad: Mapped['Habilidad'] = relationship(
-        'Habilidad', back_populates='miembro_habilidades', lazy='selectin'
+        'Habilidad', back_populates='miembro_habilidades', lazy='select'
     )
     nivel_habilidad: Mapped[Optional['NivelHabilidad']] = relationship(
-        'NivelHabilidad', back_populates='miembro_habilidades', lazy='selectin'
+        'NivelHabilidad', back_populates='miembro_habilidades', lazy='select'
     )
 
     def __repr__(self) -> str:
@@ -29,7 +29,7 @@ class HistorialAgrupacion(BaseModel):
     fecha_fin: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
     motivo: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
 
-    miembro = relationship('Contacto', lazy='selectin')
+    miembro = relationship('Contacto', lazy='select')
 
     def __repr__(self) -> str:
         fin = self.fecha_fin or 'actual'
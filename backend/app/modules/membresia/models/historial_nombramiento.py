@@ -79,11 +79,11 @@ class HistorialNombramiento(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    miembro = relationship('Contacto', lazy='selectin')
-    cargo = relationship('Cargo', back_populates='nombramientos', lazy='selectin')
-    rol = relationship('Rol', lazy='selectin')
-    agrupacion = relationship('UnidadOrganizativa', lazy='selectin')
-    aprobado_por = relationship('Usuario', foreign_keys=[aprobado_por_id], lazy='selectin')
+    miembro = relationship('Contacto', lazy='select')
+    cargo = relationship('Cargo', back_populates='nombramientos', lazy='select')
+    rol = relationship('Rol', lazy='select')
+    agrupacion = relationship('UnidadOrganizativa', lazy='select')
+    aprobado_por = relationship('Usuario', foreign_keys=[aprobado_por_id], lazy='select')
 
     @property
     def es_vigente(self) -> bool:
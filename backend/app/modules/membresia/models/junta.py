@@ -41,7 +41,7 @@ class JuntaDirectiva(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    agrupacion = relationship('UnidadOrganizativa', lazy='selectin')
+    agrupacion = relationship('UnidadOrganizativa', lazy='select')
 
     def __repr__(self) -> str:
         return f"<JuntaDirectiva(agrupacion_id='{self.agrupacion_id}', activa={self.activa})>"
@@ -40,7 +40,7 @@ class TipoMiembro(InmutableMixin, BaseModel):
 
     # Relaciones
     motivo_reduccion = relationship(
-        'MotivoReduccionCuota', foreign_keys=[motivo_reduccion_id], lazy='selectin'
+        'MotivoReduccionCuota', foreign_keys=[motivo_reduccion_id], lazy='select'
     )
 
     def __repr__(self) -> str:
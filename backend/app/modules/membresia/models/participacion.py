@@ -54,33 +54,33 @@ class Participacion(BaseModel):
     )
 
     contacto: Mapped["Contacto"] = relationship(
-        back_populates="participaciones", lazy="selectin"
+        back_populates="participaciones", lazy="select"
     )
 
     # Satelites 1:1 (definidos en sus modulos de dominio).
     membresia: Mapped[Optional["Membresia"]] = relationship(
         "Membresia", back_populates="participacion", uselist=False,
-        cascade="all, delete-orphan", lazy="selectin",
+        cascade="all, delete-orphan", lazy="select",
         foreign_keys="Membresia.participacion_id",
     )
     firma_campania: Mapped[Optional["FirmaCampania"]] = relationship(
         "FirmaCampania", back_populates="participacion", uselist=False,
-        cascade="all, delete-orphan", lazy="selectin",
+        cascade="all, delete-orphan", lazy="select",
         foreign_keys="FirmaCampania.participacion_id",
     )
     donacion: Mapped[Optional["Donacion"]] = relationship(
         "Donacion", back_populates="participacion", uselist=False,
-        cascade="all, delete-orphan", lazy="selectin",
+        cascade="all, delete-orphan", lazy="select",
         foreign_keys="Donacion.participacion_id",
     )
     convenio: Mapped[Optional["Convenio"]] = relationship(
         "Convenio", back_populates="participacion", uselist=False,
-        cascade="all, delete-orphan", lazy="selectin",
+        cascade="all, delete-orphan", lazy="select",
         foreign_keys="Convenio.participacion_id",
     )
     asistencia_actividad: Mapped[Optional["AsistenciaActividad"]] = relationship(
         "AsistenciaActividad", back_populates="participacion", uselist=False,
-        cascade="all, delete-orphan", lazy="selectin",
+        cascade="all, delete-orphan", lazy="select",
         foreign_keys="AsistenciaActividad.participacion_id",
     )
 
@@ -112,10 +112,10 @@ class Membresia(BaseModel):
     )
 
     participacion: Mapped["Participacion"] = relationship(
-        back_populates="membresia", lazy="selectin"
+        back_populates="membresia", lazy="select"
     )
     tipo_miembro = relationship(
-        "TipoMiembro", foreign_keys=[tipo_miembro_id], lazy="selectin"
+        "TipoMiembro", foreign_keys=[tipo_miembro_id], lazy="select"
     )
 
     def __repr__(self) -> str:
@@ -34,7 +34,7 @@ class TipoRelacion(BaseModel):
     descripcion: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
-    relaciones = relationship("Relacion", back_populates="tipo_relacion", lazy="selectin")
+    relaciones = relationship("Relacion", back_populates="tipo_relacion", lazy="select")
 
     def __repr__(self) -> str:
         return f"<TipoRelacion(codigo='{self.codigo}')>"
@@ -62,9 +62,9 @@ class Relacion(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
     notas: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
-    contacto_a = relationship("Contacto", foreign_keys=[contacto_a_id], lazy="selectin")
-    contacto_b = relationship("Contacto", foreign_keys=[contacto_b_id], lazy="selectin")
-    tipo_relacion = relationship("TipoRelacion", back_populates="relaciones", lazy="selectin")
+    contacto_a = relationship("Contacto", foreign_keys=[contacto_a_id], lazy="select")
+    contacto_b = relationship("Contacto", foreign_keys=[contacto_b_id], lazy="select")
+    tipo_relacion = relationship("TipoRelacion", back_populates="relaciones", lazy="select")
 
     def __repr__(self) -> str:
         return f"<Relacion(a={self.contacto_a_id}, tipo={self.tipo_relacion_id}, b={self.contacto_b_id})>"
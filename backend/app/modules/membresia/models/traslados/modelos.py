@@ -73,7 +73,7 @@ class SolicitudTraslado(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    miembro = relationship('Contacto', lazy='selectin')
+    miembro = relationship('Contacto', lazy='select')
 
     def __repr__(self) -> str:
         return f"<SolicitudTraslado(miembro={self.miembro_id}, estado='{self.estado}')>"
@@ -11,9 +11,10 @@ import uuid
 from datetime import date, datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Boolean, Date, ForeignKey, Numeric, String, Text
+from sqlalchemy import Boolean, Date, ForeignKey, Numeric, String, Text, event, false
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.indice_ciego import LONGITUD_INDICE, indice_iban
 from app.infrastructure.base_model import BaseModel
 
 if TYPE_CHECKING:
@@ -60,31 +61,31 @@ class Vinculacion(BaseModel):
     # Relaciones
     contacto: Mapped[Contacto] = relationship(
         back_populates="vinculaciones",
-        lazy="selectin"
+        lazy="select"
     )
     tipo_vinculacion: Mapped[TipoVinculacion] = relationship(
         back_populates="vinculaciones",
-        lazy="selectin"
+        lazy="select"
     )
     socio: Mapped[Optional[Socio]] = relationship(
         back_populates="vinculacion",
         uselist=False,
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="select",
         foreign_keys="Socio.vinculacion_id"
     )
     voluntario: Mapped[Optional[Voluntario]] = relationship(
         back_populates="vinculacion",
         uselist=False,
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="select",
         foreign_keys="Voluntario.vinculacion_id"
     )
     contratado: Mapped[Optional["Contratado"]] = relationship(
         back_populates="vinculacion",
         uselist=False,
         cascade="all, delete-orphan",
-        lazy="selectin",
+        lazy="select",
         foreign_keys="Contratado.vinculacion_id"
     )
 
@@ -125,6 +126,10 @@ class Socio(BaseModel):
 
     # Datos bancarios
     iban: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    # Índice ciego del IBAN (cifrado en BD): ver app/core/indice_ciego.py.
+    iban_indice: Mapped[Optional[str]] = mapped_column(
+        String(LONGITUD_INDICE), nullable=True, index=True
+    )
     swift_bic: Mapped[Optional[str]] = mapped_column(String(11), nullable=True)
     referencia_pago: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
     forma_pago_id: Mapped[Optional[uuid.UUID]] = mapped_column(
@@ -148,10 +153,10 @@ class Socio(BaseModel):
     # Relación
     vinculacion: Mapped[Vinculacion] = relationship(
         back_populates="socio",
-        lazy="selectin"
+        lazy="select"
     )
     motivo_reduccion = relationship(
-        "MotivoReduccionCuota", foreign_keys=[motivo_reduccion_id], lazy="selectin"
+        "MotivoReduccionCuota", foreign_keys=[motivo_reduccion_id], lazy="select"
     )
 
     # Color del badge por situación del socio (la situación ya no es un catálogo).
@@ -178,6 +183,17 @@ class Socio(BaseModel):
         num = self.numero_socio or "?"
         return f"<Socio(numero={num}, estado={self.estado_socio})>"
 
+    @classmethod
+    def con_iban(cls, iban: Optional[str]):
+        """Criterio WHERE por IBAN (en claro o cifrado en BD)."""
+        indice = indice_iban(iban)
+        return cls.iban_indice == indice if indice else false()
+
+
+@event.listens_for(Socio.iban, "set")
+def _indexar_iban_socio(target: Socio, value, _oldvalue, _initiator) -> None:
+    target.iban_indice = indice_iban(value)
+
 
 class Voluntario(BaseModel):
     """Satélite de Vinculacion: datos específicos del vínculo de voluntario.
@@ -217,7 +233,7 @@ class Voluntario(BaseModel):
     # Relación
     vinculacion: Mapped[Vinculacion] = relationship(
         back_populates="voluntario",
-        lazy="selectin"
+        lazy="select"
     )
 
     def __repr__(self) -> str:
@@ -256,7 +272,7 @@ class Contratado(BaseModel):
 
     vinculacion: Mapped[Vinculacion] = relationship(
         back_populates="contratado",
-        lazy="selectin"
+        lazy="select"
     )
 
     def __repr__(self) -> str:
@@ -20,7 +20,7 @@ class CategoriaCompetencia(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    competencias = relationship('Competencia', back_populates='categoria', lazy='selectin')
+    competencias = relationship('Competencia', back_populates='categoria', lazy='select')
 
     def __repr__(self) -> str:
         return f"<CategoriaCompetencia(nombre='{self.nombre}')>"
@@ -37,8 +37,8 @@ class Competencia(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    categoria = relationship('CategoriaCompetencia', back_populates='competencias', lazy='selectin')
-    miembros_competencia = relationship('MiembroCompetencia', back_populates='competencia', lazy='selectin')
+    categoria = relationship('CategoriaCompetencia', back_populates='competencias', lazy='select')
+    miembros_competencia = relationship('MiembroCompetencia', back_populates='competencia', lazy='select')
 
     def __repr__(self) -> str:
         return f"<Competencia(nombre='{self.nombre}')>"
@@ -54,7 +54,7 @@ class NivelCompetencia(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    miembros_competencia = relationship('MiembroCompetencia', back_populates='nivel', lazy='selectin')
+    miembros_competencia = relationship('MiembroCompetencia', back_populates='nivel', lazy='select')
 
     def __repr__(self) -> str:
         return f"<NivelCompetencia(nombre='{self.nombre}')>"
@@ -77,8 +77,8 @@ class MiembroCompetencia(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    competencia = relationship('Competencia', back_populates='miembros_competencia', lazy='selectin')
-    nivel = relationship('NivelCompetencia', back_populates='miembros_competencia', lazy='selectin')
+    competencia = relationship('Competencia', back_populates='miembros_competencia', lazy='select')
+    nivel = relationship('NivelCompetencia', back_populates='miembros_competencia', lazy='select')
 
     def __repr__(self) -> str:
         return f"<MiembroCompetencia(voluntario_id='{self.voluntario_id}', competencia_id='{self.competencia_id}')>"
@@ -95,7 +95,7 @@ class TipoDocumentoVoluntario(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    documentos = relationship('DocumentoMiembro', back_populates='tipo_documento', lazy='selectin')
+    documentos = relationship('DocumentoMiembro', back_populates='tipo_documento', lazy='select')
 
     def __repr__(self) -> str:
         return f"<TipoDocumentoVoluntario(nombre='{self.nombre}')>"
@@ -126,7 +126,7 @@ class DocumentoMiembro(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    tipo_documento = relationship('TipoDocumentoVoluntario', back_populates='documentos', lazy='selectin')
+    tipo_documento = relationship('TipoDocumentoVoluntario', back_populates='documentos', lazy='select')
 
     def __repr__(self) -> str:
         return f"<DocumentoMiembro(nombre='{self.nombre}', voluntario_id='{self.voluntario_id}')>"
@@ -148,7 +148,7 @@ class TipoFormacion(BaseModel):
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
 
     # Relaciones
-    formaciones = relationship('FormacionMiembro', back_populates='tipo_formacion', lazy='selectin')
+    formaciones = relationship('FormacionMiembro', back_populates='tipo_formacion', lazy='select')
 
     def __repr__(self) -> str:
         return f"<TipoFormacion(nombre='{self.nombre}')>"
@@ -178,7 +178,7 @@ class FormacionMiembro(BaseModel):
     es_interna: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)  # Formación interna de la organización
 
     # Relaciones
-    tipo_formacion = relationship('TipoFormacion', back_populates='formaciones', lazy='selectin')
+    tipo_formacion = relationship('TipoFormacion', back_populates='formaciones', lazy='select')
 
     def __repr__(self) -> str:
         return f"<FormacionMiembro(titulo='{self.titulo}', voluntario_id='{self.voluntario_id}')>"
@@ -0,0 +1,263 @@
+"""Exportación del padrón de miembros a XLSX/CSV en memoria acotada.
+
+Los contactos se recorren por lotes con paginación keyset sobre el mismo orden
+del listado (apellidos, nombre, id; índice `ix_contactos_orden_apellidos`) y,
+por lote, los datos satélite se cargan con una consulta por tabla:
+
+- membresía más reciente (tipo de miembro)  → DISTINCT ON contacto
+- vinculación SOCIO más reciente (+ Socio)  → DISTINCT ON contacto
+- nombres de agrupación                     → solo los no vistos aún
+
+Así una exportación de N contactos hace ~3·N/TAMANO_LOTE consultas en lugar de
+2·N, y nunca hay más de un lote en memoria. El XLSX se escribe con openpyxl en
+modo `write_only` (las filas van a un temporal, no a un árbol en RAM) y el CSV se
+produce como un flujo de bytes.
+"""
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import uuid
+from typing import IO, Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Union
+
+from sqlalchemy import Uuid, any_, bindparam, func, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.busqueda import ESCAPE_LIKE, patron_contiene
+
+from ..models.contacto import Contacto
+from ..models.miembro import TipoMiembro
+from ..models.participacion import Membresia, Participacion
+from ..models.tipo_vinculacion import TipoVinculacion
+from ..models.vinculacion import Socio, Vinculacion
+
+TAMANO_LOTE = 1000
+
+CABECERA = (
+    "Nombre", "Primer apellido", "Segundo apellido", "Tipo", "Situación",
+    "Email", "Teléfono", "Agrupación", "Localidad", "Fecha de alta", "Fecha de baja",
+)
+ANCHOS = (16, 16, 16, 14, 14, 30, 14, 26, 20, 13, 13)
+
+
+class ExportacionMiembrosService:
+    """Genera las filas del padrón por lotes y las vuelca a XLSX o CSV."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._agrupaciones: Dict[uuid.UUID, str] = {}
+
+    # ------------------------------------------------------------------
+    # Selección de contactos
+    # ------------------------------------------------------------------
+
+    def _consulta(
+        self,
+        ids: Optional[Sequence[uuid.UUID]],
+        agrupacion_id: Optional[uuid.UUID],
+        activo: Optional[bool],
+        texto: Optional[str],
+        ambito: Optional[Iterable[uuid.UUID]] = None,
+    ):
+        claves = (
+            func.lower(func.coalesce(Contacto.apellido1, "")),
+            func.lower(func.coalesce(Contacto.apellido2, "")),
+            func.lower(func.coalesce(Contacto.nombre, "")),
+            Contacto.id,
+        )
+        q = select(
+            Contacto.id, Contacto.nombre, Contacto.apellido1, Contacto.apellido2,
+            Contacto.email, Contacto.telefono, Contacto.localidad, Contacto.agrupacion_id,
+            *claves,
+        )
+        if ids is not None:
+            # Un solo parámetro array (no N binds): admite decenas de miles de ids.
+            q = q.where(Contacto.id == any_(bindparam("ids", list(ids), type_=ARRAY(Uuid))))
+        else:
+            # Sin selección explícita: todos los contactos con vinculación SOCIO.
+            q = q.where(
+                select(Vinculacion.id)
+                .join(TipoVinculacion, Vinculacion.tipo_vinculacion_id == TipoVinculacion.id)
+                .where(
+                    TipoVinculacion.codigo == "SOCIO",
+                    Vinculacion.contacto_id == Contacto.id,
+                    Vinculacion.eliminado == False,  # noqa: E712
+                )
+                .exists()
+            )
+        if agrupacion_id is not None:
+            q = q.where(Contacto.agrupacion_id == agrupacion_id)
+        if activo is not None:
+            q = q.where(Contacto.activo == activo)
+        if ambito is not None:
+            # Ámbito territorial de quien exporta (None = global, sin filtro).
+            from app.modules.acceso.services.ambito_territorial import condicion_en_ambito
+            q = q.where(condicion_en_ambito(Contacto.agrupacion_id, ambito))
+        if texto and texto.strip():
+            patron = patron_contiene(texto)
+            con_numero = (
+                select(Socio.id)
+                .join(Vinculacion, Socio.vinculacion_id == Vinculacion.id)
+                .where(
+                    Vinculacion.contacto_id == Contacto.id,
+                    func.lower(Socio.numero_socio).like(patron, escape=ESCAPE_LIKE),
+                )
+                .exists()
+            )
+            q = q.where(or_(
+                func.lower(func.concat_ws(
+                    " ", Contacto.nombre, Contacto.apellido1, Contacto.apellido2, Contacto.email,
+                )).like(patron, escape=ESCAPE_LIKE),
+                con_numero,
+            ))
+        return q.order_by(*claves), claves
+
+    # ------------------------------------------------------------------
+    # Carga por lotes de los satélites
+    # ------------------------------------------------------------------
+
+    async def _tipos_miembro(self, contacto_ids: List[uuid.UUID]) -> Dict[uuid.UUID, str]:
+        rows = await self.session.execute(
+            select(Participacion.contacto_id, TipoMiembro.nombre)
+            .select_from(Membresia)
+            .join(Participacion, Membresia.participacion_id == Participacion.id)
+            .outerjoin(TipoMiembro, Membresia.tipo_miembro_id == TipoMiembro.id)
+            .where(Participacion.contacto_id.in_(contacto_ids), Participacion.tipo == "MEMBRESIA")
+            .order_by(Participacion.contacto_id, Participacion.fecha.desc())
+            .distinct(Participacion.contacto_id)
+        )
+        return {cid: nombre or "" for cid, nombre in rows.all()}
+
+    async def _vinculaciones_socio(self, contacto_ids: List[uuid.UUID]) -> Dict[uuid.UUID, Any]:
+        rows = await self.session.execute(
+            select(
+                Vinculacion.contacto_id, Vinculacion.fecha_inicio, Vinculacion.fecha_fin,
+                Socio.estado_socio,
+            )
+            .join(TipoVinculacion, Vinculacion.tipo_vinculacion_id == TipoVinculacion.id)
+            .outerjoin(Socio, Socio.vinculacion_id == Vinculacion.id)
+            .where(TipoVinculacion.codigo == "SOCIO", Vinculacion.contacto_id.in_(contacto_ids))
+            .order_by(Vinculacion.contacto_id, Vinculacion.fecha_inicio.desc())
+            .distinct(Vinculacion.contacto_id)
+        )
+        return {r.contacto_id: r for r in rows.all()}
+
+    async def _nombres_agrupacion(self, agr_ids: set) -> Dict[uuid.UUID, str]:
+        from app.modules.core.geografico.direccion import UnidadOrganizativa
+
+        nuevas = {a for a in agr_ids if a and a not in self._agrupaciones}
+        if nuevas:
+            rows = await self.session.execute(
+                select(UnidadOrganizativa.id, UnidadOrganizativa.nombre)
+                .where(UnidadOrganizativa.id.in_(nuevas))
+            )
+            self._agrupaciones.update({i: n for i, n in rows.all()})
+        return self._agrupaciones
+
+    # ------------------------------------------------------------------
+    # Filas
+    # ------------------------------------------------------------------
+
+    async def lotes(
+        self,
+        *,
+        ids: Optional[Sequence[uuid.UUID]] = None,
+        agrupacion_id: Optional[uuid.UUID] = None,
+        activo: Optional[bool] = None,
+        texto: Optional[str] = None,
+        ambito: Optional[Iterable[uuid.UUID]] = None,
+        tamano_lote: int = TAMANO_LOTE,
+    ) -> AsyncIterator[List[list]]:
+        """Genera las filas (sin cabecera) en lotes de `tamano_lote`, en orden.
+
+        `ambito` son las unidades raíz de quien exporta (`raices_en_ambito`):
+        solo salen contactos de sus subárboles; None = global.
+        """
+        consulta, claves = self._consulta(ids, agrupacion_id, activo, texto, ambito)
+        ultimo = None
+        while True:
+            q = consulta
+            if ultimo is not None:
+                q = q.where(tuple_(*claves) > tuple_(*ultimo))
+            contactos = (await self.session.execute(q.limit(tamano_lote))).all()
+            if not contactos:
+                return
+            cids = [c.id for c in contactos]
+            tipos = await self._tipos_miembro(cids)
+            vincs = await self._vinculaciones_socio(cids)
+            agrupaciones = await self._nombres_agrupacion({c.agrupacion_id for c in contactos})
+
+            filas = []
+            for c in contactos:
+                vinc = vincs.get(c.id)
+                filas.append([
+                    c.nombre or '',
+                    c.apellido1 or '',
+                    c.apellido2 or '',
+                    tipos.get(c.id, ''),
+                    (vinc.estado_socio if vinc else '') or '',
+                    c.email or '',
+                    c.telefono or '',
+                    agrupaciones.get(c.agrupacion_id, ''),
+                    c.localidad or '',
+                    vinc.fecha_inicio.isoformat() if (vinc and vinc.fecha_inicio) else '',
+                    vinc.fecha_fin.isoformat() if (vinc and vinc.fecha_fin) else '',
+                ])
+            yield filas
+
+            if len(contactos) < tamano_lote:
+                return
+            ultimo = tuple(contactos[-1][-len(claves):])
+
+    # ------------------------------------------------------------------
+    # Formatos
+    # ------------------------------------------------------------------
+
+    async def exportar_xlsx(self, destino: Union[str, IO[bytes]], **filtros) -> int:
+        """Escribe el XLSX en `destino` (ruta o fichero binario). Devuelve nº de filas.
+
+        openpyxl es síncrono: el volcado de cada lote y el guardado final se hacen
+        en un hilo para no bloquear el event loop.
+        """
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
+        from openpyxl.utils import get_column_letter
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Socios")
+        for i, ancho in enumerate(ANCHOS, start=1):
+            ws.column_dimensions[get_column_letter(i)].width = ancho
+        ws.freeze_panes = "A2"
+        negrita = Font(bold=True)
+        cabecera = []
+        for titulo in CABECERA:
+            celda = WriteOnlyCell(ws, value=titulo)
+            celda.font = negrita
+            cabecera.append(celda)
+        ws.append(cabecera)
+
+        def _volcar(filas: List[list]) -> None:
+            for fila in filas:
+                ws.append(fila)
+
+        total = 0
+        async for filas in self.lotes(**filtros):
+            await asyncio.to_thread(_volcar, filas)
+            total += len(filas)
+        await asyncio.to_thread(wb.save, destino)
+        return total
+
+    async def exportar_csv(self, **filtros) -> AsyncIterator[bytes]:
+        """Flujo CSV (UTF-8 con BOM y `;`, como lo abre Excel en español)."""
+        buf = io.StringIO()
+        writer = csv.writer(buf, delimiter=";")
+        writer.writerow(CABECERA)
+        yield ("\ufeff" + buf.getvalue()).encode("utf-8")
+        async for filas in self.lotes(**filtros):
+            buf.seek(0)
+            buf.truncate()
+            writer.writerows(filas)
+            yield buf.getvalue().encode("utf-8")
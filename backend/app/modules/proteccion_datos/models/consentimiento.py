@@ -52,7 +52,7 @@ class Consentimiento(BaseModel):
         comment='Evidencia del consentimiento: IP, user-agent, ruta del PDF firmado, etc.'
     )
 
-    clausula: Mapped['ClausulaInformativa'] = relationship('ClausulaInformativa', lazy='selectin')
+    clausula: Mapped['ClausulaInformativa'] = relationship('ClausulaInformativa', lazy='select')
 
     def __repr__(self) -> str:
         return f"<Consentimiento(clausula={self.clausula_id}, estado='{self.estado}')>"
@@ -99,7 +99,7 @@ class ActividadTratamiento(BaseModel):
 
     encargados_rel: Mapped[List['ActividadTratamientoEncargado']] = relationship(
         'ActividadTratamientoEncargado', back_populates='actividad',
-        cascade='all, delete-orphan', lazy='selectin'
+        cascade='all, delete-orphan', lazy='select'
     )
 
     def __repr__(self) -> str:
@@ -121,8 +121,8 @@ class ActividadTratamientoEncargado(BaseModel):
     )
 
     actividad: Mapped['ActividadTratamiento'] = relationship(
-        'ActividadTratamiento', back_populates='encargados_rel', lazy='selectin'
+        'ActividadTratamiento', back_populates='encargados_rel', lazy='select'
     )
     encargado: Mapped['EncargadoTratamiento'] = relationship(
-        'EncargadoTratamiento', lazy='selectin'
+        'EncargadoTratamiento', lazy='select'
     )
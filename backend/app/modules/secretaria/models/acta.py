@@ -71,9 +71,9 @@ class Acta(BaseModel):
     # Relaciones
     reunion = relationship('Reunion', foreign_keys=[reunion_id], back_populates='acta')
     reunion_aprobacion = relationship('Reunion', foreign_keys=[reunion_aprobacion_id])
-    secretario = relationship('Contacto', foreign_keys=[secretario_id], lazy='selectin')
-    presidente = relationship('Contacto', foreign_keys=[presidente_id], lazy='selectin')
-    certificados = relationship('CertificadoAcuerdo', back_populates='acta', lazy='selectin')
+    secretario = relationship('Contacto', foreign_keys=[secretario_id], lazy='select')
+    presidente = relationship('Contacto', foreign_keys=[presidente_id], lazy='select')
+    certificados = relationship('CertificadoAcuerdo', back_populates='acta', lazy='select')
 
     def __repr__(self) -> str:
         return f"<Acta(numero={self.numero}, anio={self.anio}, estado='{self.estado_codigo}')>"
@@ -126,8 +126,8 @@ class CertificadoAcuerdo(BaseModel):
     # Relaciones
     acta = relationship('Acta', back_populates='certificados')
     acuerdo = relationship('Acuerdo', back_populates='certificados')
-    secretario = relationship('Contacto', foreign_keys=[secretario_id], lazy='selectin')
-    presidente = relationship('Contacto', foreign_keys=[presidente_id], lazy='selectin')
+    secretario = relationship('Contacto', foreign_keys=[secretario_id], lazy='select')
+    presidente = relationship('Contacto', foreign_keys=[presidente_id], lazy='select')
 
     def __repr__(self) -> str:
         return f"<CertificadoAcuerdo(numero='{self.numero_certificado}')>"
@@ -23,7 +23,7 @@ class TipoConvenio(InmutableMixin, BaseModel):
     descripcion: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     activo: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
-    convenios = relationship('Convenio', back_populates='tipo_convenio', lazy='selectin')
+    convenios = relationship('Convenio', back_populates='tipo_convenio', lazy='select')
 
     def __repr__(self) -> str:
         return f"<TipoConvenio(nombre='{self.nombre}')>"
@@ -96,11 +96,11 @@ class Convenio(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    tipo_convenio = relationship('TipoConvenio', back_populates='convenios', lazy='selectin')
-    contraparte = relationship('Contacto', foreign_keys=[contraparte_id], lazy='selectin')
-    firmante = relationship('Contacto', foreign_keys=[firmante_id], lazy='selectin')
+    tipo_convenio = relationship('TipoConvenio', back_populates='convenios', lazy='select')
+    contraparte = relationship('Contacto', foreign_keys=[contraparte_id], lazy='select')
+    firmante = relationship('Contacto', foreign_keys=[firmante_id], lazy='select')
     acuerdo_autorizacion = relationship('Acuerdo', foreign_keys=[acuerdo_autorizacion_id])
-    participacion = relationship('Participacion', back_populates='convenio', foreign_keys=[participacion_id], lazy='selectin')
+    participacion = relationship('Participacion', back_populates='convenio', foreign_keys=[participacion_id], lazy='select')
 
     def __repr__(self) -> str:
         return f"<Convenio(referencia='{self.referencia}', estado='{self.estado}')>"
@@ -156,8 +156,8 @@ class DelegacionFirma(BaseModel):
     observaciones: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Relaciones
-    delegante = relationship('Contacto', foreign_keys=[delegante_id], lazy='selectin')
-    delegado = relationship('Contacto', foreign_keys=[delegado_id], lazy='selectin')
+    delegante = relationship('Contacto', foreign_keys=[delegante_id], lazy='select')
+    delegado = relationship('Contacto', foreign_keys=[delegado_id], lazy='select')
     acuerdo_autorizacion = relationship('Acuerdo', foreign_keys=[acuerdo_autorizacion_id])
 
     def __repr__(self) -> str:
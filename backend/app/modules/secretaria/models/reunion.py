@@ -48,7 +48,7 @@ class TipoReunion(InmutableMixin, BaseModel):
     orden: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
     # Relaciones
-    reuniones = relationship('Reunion', back_populates='tipo_reunion', lazy='selectin')
+    reuniones = relationship('Reunion', back_populates='tipo_reunion', lazy='select')
 
     def __repr__(self) -> str:
         return f"<TipoReunion(nombre='{self.nombre}', organo='{self.organo}')>"
@@ -128,15 +128,15 @@ class Reunion(BaseModel):
     )
 
     # Relaciones
-    tipo_reunion = relationship('TipoReunion', back_populates='reuniones', lazy='selectin')
-    agrupacion = relationship('UnidadOrganizativa', lazy='selectin')
-    asistentes = relationship('AsistenteReunionSecretaria', back_populates='reunion', lazy='selectin')
+    tipo_reunion = relationship('TipoReunion', back_populates='reuniones', lazy='select')
+    agrupacion = relationship('UnidadOrganizativa', lazy='select')
+    asistentes = relationship('AsistenteReunionSecretaria', back_populates='reunion', lazy='select')
     puntos_orden_dia = relationship(
         'PuntoOrdenDia', back_populates='reunion',
-        lazy='selectin', order_by='PuntoOrdenDia.orden'
+        lazy='select', order_by='PuntoOrdenDia.orden'
     )
-    acta = relationship('Acta', foreign_keys='Acta.reunion_id', back_populates='reunion', uselist=False, lazy='selectin')
-    actividad = relationship('Actividad', foreign_keys=[actividad_id], lazy='selectin')
+    acta = relationship('Acta', foreign_keys='Acta.reunion_id', back_populates='reunion', uselist=False, lazy='select')
+    actividad = relationship('Actividad', foreign_keys=[actividad_id], lazy='select')
 
     def __repr__(self) -> str:
         return f"<Reunion(tipo='{self.tipo_reunion_id}', fecha='{self.fecha_celebracion}', estado='{self.estado_codigo}')>"
@@ -178,8 +178,8 @@ class AsistenteReunionSecretaria(BaseModel):
 
     # Relaciones
     reunion = relationship('Reunion', back_populates='asistentes')
-    miembro = relationship('Contacto', foreign_keys=[miembro_id], lazy='selectin')
-    representado_por = relationship('Contacto', foreign_keys=[representado_por_id], lazy='selectin')
+    miembro = relationship('Contacto', foreign_keys=[miembro_id], lazy='select')
+    representado_por = relationship('Contacto', foreign_keys=[representado_por_id], lazy='select')
 
     def __repr__(self) -> str:
         return f"<AsistenteReunionSecretaria(reunion_id='{self.reunion_id}', miembro_id='{self.miembro_id}')>"
@@ -207,7 +207,7 @@ class PuntoOrdenDia(BaseModel):
     reunion = relationship('Reunion', back_populates='puntos_orden_dia')
     acuerdos = relationship(
         'Acuerdo', back_populates='punto_orden_dia',
-        lazy='selectin', order_by='Acuerdo.numero'
+        lazy='select', order_by='Acuerdo.numero'
     )
 
     def __repr__(self) -> str:
@@ -262,9 +262,9 @@ class Acuerdo(BaseModel):
 
     # Relaciones
     punto_orden_dia = relationship('PuntoOrdenDia', back_populates='acuerdos')
-    votacion = relationship('VotacionAcuerdo', back_populates='acuerdo', uselist=False, lazy='selectin')
-    responsable = relationship('Contacto', foreign_keys=[responsable_id], lazy='selectin')
-    certificados = relationship('CertificadoAcuerdo', back_populates='acuerdo', lazy='selectin')
+    votacion = relationship('VotacionAcuerdo', back_populates='acuerdo', uselist=False, lazy='select')
+    responsable = relationship('Contacto', foreign_keys=[responsable_id], lazy='select')
+    certificados = relationship('CertificadoAcuerdo', back_populates='acuerdo', lazy='select')
 
     def __repr__(self) -> str:
         return f"<Acuerdo(numero={self.numero}, resultado='{self.resultado}')>"
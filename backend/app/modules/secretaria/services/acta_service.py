@@ -97,21 +97,19 @@ class ActaService:
         # Actualizar estado de la reunión
         reunion.estado_codigo = 'ACTA_BORRADOR'
         reunion.modificado_por_id = creado_por_id
+        await self.session.flush()
+
+        # Aviso de flujo: acta en borrador pendiente de revisión. Va al outbox en
+        # la misma transacción: se entrega si (y solo si) el acta se guarda.
+        from app.core.events import event_bus, ActaEnBorrador
+        event_bus.enqueue(self.session, ActaEnBorrador(
+            acta_id=str(acta.id),
+            reunion_titulo=f"convocatoria {reunion.numero_convocatoria}/{reunion.anio}",
+            agrupacion_id=str(reunion.agrupacion_id) if reunion.agrupacion_id else None,
+        ))
 
         await self.session.commit()
         await self.session.refresh(acta)
-
-        # Aviso de flujo: acta en borrador pendiente de revisión.
-        try:
-            from app.core.events import event_bus, ActaEnBorrador
-            await event_bus.publish(ActaEnBorrador(
-                acta_id=str(acta.id),
-                reunion_titulo=f"convocatoria {reunion.numero_convocatoria}/{reunion.anio}",
-                agrupacion_id=str(reunion.agrupacion_id) if reunion.agrupacion_id else None,
-            ))
-        except Exception:
-            pass
-
         return acta
 
     async def obtener_acta(self, acta_id: UUID) -> Optional[Acta]:
@@ -179,27 +177,22 @@ class ActaService:
             reunion.estado_codigo = 'ACTA_APROBADA'
             reunion.modificado_por_id = modificado_por_id
 
+        # Aviso de flujo: acta lista para firma. Al outbox, en la misma transacción.
+        from app.core.events import event_bus, ActaAprobada
+        if reunion is not None:
+            desc = f"convocatoria {reunion.numero_convocatoria}/{reunion.anio}"
+            agr = str(reunion.agrupacion_id) if reunion.agrupacion_id else None
+        else:
+            desc = f"reunión {acta.reunion_id}"
+            agr = None
+        event_bus.enqueue(self.session, ActaAprobada(
+            acta_id=str(acta.id),
+            reunion_titulo=desc,
+            agrupacion_id=agr,
+        ))
+
         await self.session.commit()
         await self.session.refresh(acta)
-
-        # Aviso de flujo: acta lista para firma. Publicado tras el commit; un
-        # fallo de aviso no afecta a la aprobación (el event bus captura).
-        try:
-            from app.core.events import event_bus, ActaAprobada
-            if reunion is not None:
-                desc = f"convocatoria {reunion.numero_convocatoria}/{reunion.anio}"
-                agr = str(reunion.agrupacion_id) if reunion.agrupacion_id else None
-            else:
-                desc = f"reunión {acta.reunion_id}"
-                agr = None
-            await event_bus.publish(ActaAprobada(
-                acta_id=str(acta.id),
-                reunion_titulo=desc,
-                agrupacion_id=agr,
-            ))
-        except Exception:
-            pass
-
         return acta
 
     async def anular_aprobacion_acta(
@@ -14,6 +14,8 @@ from uuid import UUID
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.indice_ciego import en_claro
+
 from ..models.libro_socios import LibroSociosSnapshot
 
 # Directorio privado (NO montado como estático) para los PDF del Libro de Socios.
@@ -94,7 +96,7 @@ class LibroSociosService:
     async def _socios_para_libro(self) -> List[dict]:
         """Lista de socios (histórico) ordenada por agrupación → apellidos.
 
-        Selecciona COLUMNAS (no entidades) a propósito: evita el selectin-load de
+        Selecciona COLUMNAS (no entidades) a propósito: evita la carga de
         relaciones (p.ej. TipoVinculacion) y, por tanto, es robusto frente a desfases
         modelo↔BD de otros campos no usados aquí.
         """
@@ -133,7 +135,7 @@ class LibroSociosService:
                 "orden": (r.apellido1 or "", r.apellido2 or "", r.nombre or ""),
                 "num": r.numero_socio or "",
                 "nombre": nombre,
-                "nif": (r.numero_documento or r.cif or "") or "—",
+                "nif": (en_claro(r.numero_documento) or r.cif or "") or "—",
                 "alta": r.fecha_inicio.strftime("%d/%m/%Y") if r.fecha_inicio else "—",
                 "baja": r.fecha_fin.strftime("%d/%m/%Y") if r.fecha_fin else "—",
                 "estado": "Activo" if r.estado == "activa" else "Baja",
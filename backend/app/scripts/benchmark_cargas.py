@@ -0,0 +1,89 @@
+"""Benchmark de carga de relaciones: selectin global vs. rutas declaradas.
+
+Ejecuta las consultas más frecuentes de dos formas contra la BD configurada y
+compara sentencias emitidas y tiempo:
+
+- antes:   `selectinload` recursivo de todas las relaciones alcanzables (lo que
+           hacía `lazy="selectin"` en los modelos), hasta `PROFUNDIDAD` niveles
+           y sin volver a expandir un mapper ya visitado en la misma rama.
+- después: solo las rutas que declara cada servicio con `cargar(...)`.
+
+Solo lectura. Uso:
+
+    python -m app.scripts.benchmark_cargas [--limite 200]
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import selectinload
+
+from app.core.carga import cargar, contar_sentencias
+from app.core.database import async_read_session, read_engine
+from app.modules.actividades.models.actividad import Actividad
+from app.modules.acceso.models.usuario import Usuario
+from app.modules.economico.models.contabilidad import AsientoContable
+from app.modules.economico.models.cuotas import CuotaAnual
+from app.modules.economico.models.donaciones import Donacion
+from app.modules.membresia.models.vinculacion import Vinculacion
+
+
+# Niveles que se expanden en el "antes": basta para reproducir el coste de la
+# carga en cascada sin que el árbol de opciones crezca de forma exponencial.
+PROFUNDIDAD = 3
+
+# (nombre, modelo, rutas que declara el código que hace esa consulta)
+CONSULTAS = [
+    ("socios (listado)", Vinculacion, ("contacto", "socio.motivo_reduccion")),
+    ("cuotas (cobro/recibo)", CuotaAnual, ("vinculacion_socio.contacto",)),
+    ("donaciones (modelo 182)", Donacion, ("contacto",)),
+    ("asientos (libro diario)", AsientoContable, ("apuntes.cuenta",)),
+    ("actividades (firmas)", Actividad, ("estado", "campania.estado")),
+    ("usuarios (destinatarios)", Usuario, ("contacto",)),
+]
+
+
+def _selectin_recursivo(
+    modelo: type, profundidad: int = PROFUNDIDAD, visitados: frozenset = frozenset(),
+) -> list:
+    """Opciones equivalentes a `lazy="selectin"` en todas las relaciones."""
+    mapper = inspect(modelo)
+    visitados = visitados | {mapper}
+    opciones = []
+    for rel in mapper.relationships:
+        opcion = selectinload(getattr(modelo, rel.key))
+        if profundidad > 1 and rel.mapper not in visitados:
+            anidadas = _selectin_recursivo(rel.mapper.class_, profundidad - 1, visitados)
+            if anidadas:
+                opcion = opcion.options(*anidadas)
+        opciones.append(opcion)
+    return opciones
+
+
+async def _medir(modelo: type, opciones: list, limite: int) -> tuple[int, int, float]:
+    async with async_read_session() as session:
+        with contar_sentencias(read_engine) as contador:
+            t0 = time.perf_counter()
+            filas = (await session.execute(
+                select(modelo).options(*opciones).limit(limite)
+            )).scalars().all()
+            ms = (time.perf_counter() - t0) * 1000
+    return len(filas), contador.total, ms
+
+
+async def main(limite: int) -> None:
+    print(f"{'consulta':<26} {'filas':>6} {'antes':>14} {'después':>14}")
+    for nombre, modelo, rutas in CONSULTAS:
+        filas, n_antes, ms_antes = await _medir(modelo, _selectin_recursivo(modelo), limite)
+        _, n_despues, ms_despues = await _medir(modelo, cargar(modelo, *rutas), limite)
+        print(
+            f"{nombre:<26} {filas:>6} "
+            f"{n_antes:>4} sql {ms_antes:>6.0f}ms {n_despues:>4} sql {ms_despues:>6.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limite", type=int, default=200, help="filas por consulta")
+    asyncio.run(main(parser.parse_args().limite))
@@ -9,8 +9,10 @@ SUPERADMIN_PASSWORD está definido, asegura la cuenta de sistema `superadmin`
 administradores de trabajo se crean desde dentro de la aplicación.
 
 Se invoca desde el CMD del Dockerfile tras `alembic upgrade head` y antes
-de arrancar uvicorn. Es idempotente: si los registros ya existen no hace
-nada destructivo.
+de arrancar los workers de uvicorn. Al final hace también, bajo el advisory
+lock de arranque, la sincronización de catálogos y el re-enlace de roles
+(app/core/arranque.py), de modo que los workers solo cargan el estado. Es
+idempotente: si los registros ya existen no hace nada destructivo.
 """
 
 import asyncio
@@ -48,6 +50,7 @@ from app.modules.membresia.models.contacto import Contacto
 from app.modules.economico.models.cobro.forma_pago import FormaPago  # noqa: F401 — registra mapper
 from app.scripts.seeding.seed_init_accesos import seed as seed_roles_funcionales
 from app.scripts.seeding.seed_comunicacion import seed_comunicacion
+from app.scripts.reindexar_indices_ciegos import asegurar_indices_ciegos
 from app.scripts.seeding.catalogos_base import ensure_catalogos_base
 
 
@@ -800,9 +803,9 @@ async def main() -> None:
     async with async_session() as session:
         try:
             # Las transacciones son fuente única de los catalog.py de cada módulo
-            # (CatalogSyncService, en el lifespan de FastAPI). Aquí solo tomamos
-            # las que ya existan en la BD; el lifespan completa los enlaces que
-            # falten (sync_superadmin_all_transactions + sync_roles_funcionales_catalog).
+            # (CatalogSyncService). Aquí solo tomamos las que ya existan en la BD;
+            # ejecutar_tareas_unicas, al final, completa los enlaces que falten
+            # (sync_superadmin_all_transactions + sync_roles_funcionales_catalog).
             transacciones = {
                 t.codigo: t
                 for t in (await session.execute(select(Transaccion))).scalars()
@@ -820,11 +823,18 @@ async def main() -> None:
             await seed_comunicacion(session)
             await seed_roles_funcionales(session, transacciones)
             await ensure_coordinadores_usuarios(session)
+            indexados = await asegurar_indices_ciegos(session)
+            if any(indexados.values()):
+                print(f"[bootstrap] Índices ciegos rellenados: {indexados}")
             await session.commit()
         except Exception:
             await session.rollback()
             raise
 
+    from app.core.arranque import ejecutar_tareas_unicas
+    await ejecutar_tareas_unicas(async_session)
+    print("[bootstrap] Catálogos sincronizados y roles re-enlazados")
+
 
 if __name__ == "__main__":
     asyncio.run(main())
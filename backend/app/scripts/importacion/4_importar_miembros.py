@@ -24,9 +24,8 @@ from sqlalchemy import select, text
 
 from app.core.database import get_database_url
 from app.infrastructure.services.encriptacion_service import get_encriptacion_service
-from app.modules.membresia.models.contacto import Contacto
+from app.infrastructure.services.recifrado_service import CAMPOS, crear_pool, recifrar_campo
 from app.modules.membresia.models.miembro import TipoMiembro
-from app.modules.membresia.models.vinculacion import Socio
 from app.scripts.importacion.mysql_helper import get_mysql_connection
 
 
@@ -521,61 +520,29 @@ class ImportadorMiembrosCSV:
         print(f"  [OK] {len(self.mapeo_miembros)} mapeos MIEMBRO + {len(self.mapeo_vinc_socio)} VINCULACION_SOCIO guardados", flush=True)
 
     async def encriptar_dnis_en_lote(self, session: AsyncSession):
-        """Encripta DNIs en lote."""
-        print("\nEncriptando DNIs...", flush=True)
-
-        result = await session.execute(
-            select(Contacto).where(
-                Contacto.numero_documento.isnot(None),
-                Contacto.numero_documento != ''
-            )
-        )
-        miembros = result.scalars().all()
-
-        encriptados = 0
-        errores = 0
-
-        for miembro in miembros:
-            try:
-                miembro.numero_documento = self.servicio_encriptacion.encriptar_dni(miembro.numero_documento)
-                encriptados += 1
-                if encriptados % 100 == 0:
-                    await session.flush()
-                    print(f"  Encriptados {encriptados}...", flush=True)
-            except ValueError:
-                errores += 1
-
-        await session.flush()
-        print(f"  [OK] {encriptados} DNIs encriptados (errores: {errores})", flush=True)
+        """Encripta DNIs en lote (pool de procesos + UPDATE por lote)."""
+        await self._encriptar_campo_en_lote(session, "contactos.numero_documento", "DNIs")
 
     async def encriptar_ibans_en_lote(self, session: AsyncSession):
-        """Encripta IBANs en lote."""
-        print("\nEncriptando IBANs...", flush=True)
-
-        result = await session.execute(
-            select(Socio).where(
-                Socio.iban.isnot(None),
-                Socio.iban != ''
+        """Encripta IBANs en lote (pool de procesos + UPDATE por lote)."""
+        await self._encriptar_campo_en_lote(session, "socios.iban", "IBANs")
+
+    async def _encriptar_campo_en_lote(self, session: AsyncSession, nombre: str, etiqueta: str):
+        print(f"\nEncriptando {etiqueta}...", flush=True)
+        # Dentro de la transacción de la importación: sin confirmar por lote ni
+        # punto de control (si falla, se repite la importación entera).
+        procesos = os.cpu_count() or 1
+        claves = self.servicio_encriptacion.claves
+        pool = crear_pool(procesos, claves)
+        try:
+            estado = await recifrar_campo(
+                session, CAMPOS[nombre], claves, pool=pool, procesos=procesos,
+                cifrar_en_claro=True, confirmar=False,
             )
-        )
-        socios = result.scalars().all()
-
-        encriptados = 0
-        errores = 0
-
-        for miembro in socios:
-            try:
-                miembro.iban = self.servicio_encriptacion.encriptar_iban(miembro.iban)
-                encriptados += 1
-                if encriptados % 100 == 0:
-                    await session.flush()
-                    print(f"  Encriptados {encriptados}...", flush=True)
-            except Exception:
-                errores += 1
-
-        await session.flush()
-        print(f"  [OK] {encriptados} IBANs encriptados (errores: {errores})", flush=True)
-
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        print(f"  [OK] {estado.recifradas} {etiqueta} encriptados (errores: {estado.errores})", flush=True)
 
 async def main():
     """Función principal."""
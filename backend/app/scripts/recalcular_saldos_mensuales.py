@@ -0,0 +1,43 @@
+"""Reconstruye las instantáneas mensuales de saldos por cuenta.
+
+Los triggers de `saldos_mensuales_cuentas` las mantienen al día; este script
+las recalcula desde los apuntes de asientos confirmados para repararlas (p. ej.
+tras restaurar una copia parcial o con triggers desactivados):
+
+    python -m app.scripts.recalcular_saldos_mensuales                 # todos los ejercicios
+    python -m app.scripts.recalcular_saldos_mensuales --ejercicio 2026
+
+Cada ejercicio se confirma por separado (`CierreEjercicioService.recalcular_saldos_mensuales`).
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import select, union
+
+from app.core.database import async_session
+from app.modules.economico.models.contabilidad import AsientoContable, SaldoMensualCuenta
+from app.modules.economico.services.cierre_service import CierreEjercicioService
+
+
+async def ejercicios_con_saldos(session) -> list[int]:
+    """Ejercicios con asientos o con instantáneas (para vaciar las huérfanas)."""
+    q = union(select(AsientoContable.ejercicio), select(SaldoMensualCuenta.ejercicio))
+    return sorted((await session.execute(q)).scalars().all())
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ejercicio", type=int, help="Solo este ejercicio")
+    args = parser.parse_args()
+
+    async with async_session() as session:
+        ejercicios = [args.ejercicio] if args.ejercicio else await ejercicios_con_saldos(session)
+        servicio = CierreEjercicioService(session)
+        for ejercicio in ejercicios:
+            n = await servicio.recalcular_saldos_mensuales(ejercicio)
+            print(f"[saldos-mensuales] {ejercicio}: {n} filas (cuenta, mes)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,136 @@
+"""Rellena (o recalcula) los índices ciegos de DNI/NIF e IBAN.
+
+Los índices son HMAC con una clave de aplicación (app/core/indice_ciego.py),
+así que no se pueden calcular en la migración SQL. Este script los rellena
+por lotes con paginación por clave (`id > último`), descifrando solo las
+filas que lo necesitan:
+
+    python -m app.scripts.reindexar_indices_ciegos          # solo los que faltan
+    python -m app.scripts.reindexar_indices_ciegos --todos  # tras cambiar BLIND_INDEX_KEY
+
+El bootstrap lo ejecuta con `asegurar_indices_ciegos`: solo los que faltan
+(casi gratis cuando ya están todos) o todos si la huella de la clave de índice
+guardada no coincide con la actual (se cambió `BLIND_INDEX_KEY` o se retiró la
+clave Fernet de la que se deriva). Cada lote se confirma por separado si se
+invoca desde aquí.
+"""
+
+import argparse
+import asyncio
+import uuid
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.database import async_session
+from app.core.indice_ciego import CLAVE_HUELLA, huella_clave, indice_documento, indice_iban
+from app.modules.configuracion.models.configuracion import Configuracion
+from app.modules.economico.models.tesoreria.cuenta_bancaria import CuentaBancaria
+from app.modules.membresia.models.contacto import Contacto
+from app.modules.membresia.models.vinculacion import Socio
+
+_TAMANO_LOTE = 1000
+
+# (modelo, columna cifrada, columna índice, función de índice)
+CAMPOS = (
+    (Contacto, "numero_documento", "numero_documento_indice", indice_documento),
+    (Socio, "iban", "iban_indice", indice_iban),
+    (CuentaBancaria, "iban", "iban_indice", indice_iban),
+)
+
+
+async def reindexar_campo(session, modelo, campo: str, campo_indice: str, funcion,
+                          todos: bool = False, confirmar: bool = False) -> int:
+    """Calcula el índice de `modelo.campo` por lotes. Devuelve filas actualizadas."""
+    columna = getattr(modelo, campo)
+    columna_indice = getattr(modelo, campo_indice)
+    filtro = columna.isnot(None)
+    if not todos:
+        filtro = filtro & columna_indice.is_(None)
+
+    tabla = modelo.__table__
+    actualizar = (
+        update(tabla)
+        .where(tabla.c.id == bindparam("_id"))
+        .values({campo_indice: bindparam("_indice")})
+    )
+
+    total = 0
+    ultimo = None
+    while True:
+        q = select(modelo.id, columna, columna_indice).where(filtro)
+        if ultimo is not None:
+            q = q.where(modelo.id > ultimo)
+        filas = (await session.execute(q.order_by(modelo.id).limit(_TAMANO_LOTE))).all()
+        if not filas:
+            break
+        ultimo = filas[-1][0]
+        cambios = []
+        for id_, valor, actual in filas:
+            indice = funcion(valor)
+            if indice != actual:
+                cambios.append({"_id": id_, "_indice": indice})
+        if cambios:
+            await session.execute(actualizar, cambios)
+            total += len(cambios)
+            if confirmar:
+                await session.commit()
+    return total
+
+
+async def reindexar_indices_ciegos(session, todos: bool = False, confirmar: bool = False) -> dict:
+    """Reindexa todos los campos de `CAMPOS`. Devuelve {tabla.campo: filas}."""
+    resultado = {}
+    for modelo, campo, campo_indice, funcion in CAMPOS:
+        n = await reindexar_campo(session, modelo, campo, campo_indice, funcion,
+                                  todos=todos, confirmar=confirmar)
+        resultado[f"{modelo.__tablename__}.{campo}"] = n
+    return resultado
+
+
+async def _guardar_huella(session, huella: str) -> None:
+    await session.execute(
+        pg_insert(Configuracion)
+        .values(
+            id=uuid.uuid4(),
+            clave=CLAVE_HUELLA,
+            valor=huella,
+            tipo_dato="string",
+            descripcion="Huella de la clave de los índices ciegos (uso interno)",
+            modificable=False,
+            grupo="sistema",
+            orden=0,
+        )
+        .on_conflict_do_update(
+            index_elements=[Configuracion.clave],
+            set_={"valor": huella, "fecha_modificacion": func.now()},
+        )
+    )
+
+
+async def asegurar_indices_ciegos(session) -> dict:
+    """Índices al día con la clave actual: los que faltan o, si cambió la clave, todos."""
+    huella = huella_clave()
+    guardada = await session.scalar(select(Configuracion.valor).where(Configuracion.clave == CLAVE_HUELLA))
+    resultado = await reindexar_indices_ciegos(session, todos=guardada != huella)
+    await _guardar_huella(session, huella)
+    return resultado
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--todos", action="store_true",
+                        help="Recalcular también los índices ya rellenos (cambio de clave)")
+    args = parser.parse_args()
+
+    async with async_session() as session:
+        resultado = await reindexar_indices_ciegos(session, todos=args.todos, confirmar=True)
+        if args.todos:
+            await _guardar_huella(session, huella_clave())
+        await session.commit()
+    for campo, n in resultado.items():
+        print(f"[indices-ciegos] {campo}: {n} filas actualizadas")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+"""Recifra DNI/NIF e IBAN con la clave principal de ENCRYPTION_KEY.
+
+Rotación de clave:
+
+1. Generar una clave: `python -c "from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())"`.
+2. Ponerla delante en ENCRYPTION_KEY (`nueva,antigua`) y desplegar: la app
+   cifra ya con la nueva y sigue leyendo lo cifrado con la antigua.
+3. Ejecutar este script. Si se interrumpe, relanzarlo: sigue tras el último
+   lote confirmado (app/infrastructure/services/recifrado_service.py).
+4. Cuando termine sin errores, retirar la clave antigua de ENCRYPTION_KEY.
+   Sin BLIND_INDEX_KEY eso cambia la clave de los índices ciegos: el bootstrap
+   del siguiente despliegue los recalcula todos antes de abrir la app.
+
+    python -m app.scripts.rotar_clave_cifrado                   # todos los campos
+    python -m app.scripts.rotar_clave_cifrado --campo socios.iban --procesos 4
+    python -m app.scripts.rotar_clave_cifrado --reiniciar       # ignora el punto de control
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+from app.core.database import async_session
+from app.core.secrets import read_secret_env
+from app.infrastructure.services.encriptacion_service import claves_configuradas
+from app.infrastructure.services.recifrado_service import (
+    CAMPOS,
+    EstadoRecifrado,
+    contar_pendientes,
+    crear_pool,
+    recifrar_campo,
+)
+
+
+def _informe(campo: str, total: int):
+    def _imprimir(estado: EstadoRecifrado) -> None:
+        ritmo = estado.filas_por_segundo
+        restantes = max(total - estado.leidas, 0)
+        eta = f"{restantes / ritmo:.0f} s" if ritmo else "?"
+        print(
+            f"[recifrado] {campo}: {estado.leidas} leídas, {estado.recifradas} recifradas, "
+            f"{estado.errores} errores — {ritmo:,.0f} filas/s, quedan ~{eta}",
+            flush=True,
+        )
+    return _imprimir
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--campo", action="append", choices=sorted(CAMPOS),
+                        help="Campo a recifrar (repetible; por defecto todos)")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1,
+                        help="Procesos de cifrado (0 = en el propio proceso)")
+    parser.add_argument("--lote", type=int, default=2000, help="Filas por proceso y lote")
+    parser.add_argument("--cifrar-en-claro", action="store_true",
+                        help="Cifrar también los valores que sigan en claro")
+    parser.add_argument("--reiniciar", action="store_true",
+                        help="Empezar desde el principio aunque haya punto de control")
+    args = parser.parse_args()
+
+    claves = claves_configuradas()
+    if not claves:
+        print("[recifrado] ENCRYPTION_KEY no definida", file=sys.stderr)
+        return 1
+    print(f"[recifrado] {len(claves)} clave(s); la principal cifra, el resto solo descifra")
+    if not read_secret_env("BLIND_INDEX_KEY"):
+        print("[recifrado] BLIND_INDEX_KEY no definida: los índices ciegos dependen de la clave "
+              "más antigua; al retirarla se recalcularán en el bootstrap", file=sys.stderr)
+
+    pool = crear_pool(args.procesos, claves)
+    errores = 0
+    try:
+        for nombre in args.campo or list(CAMPOS):
+            campo = CAMPOS[nombre]
+            async with async_session() as session:
+                pendientes = await contar_pendientes(session, campo, None)
+                estado = await recifrar_campo(
+                    session, campo, claves,
+                    pool=pool, procesos=args.procesos, lote=args.lote,
+                    cifrar_en_claro=args.cifrar_en_claro, reiniciar=args.reiniciar,
+                    informe=_informe(nombre, pendientes),
+                )
+            errores += estado.errores
+            print(
+                f"[recifrado] {nombre}: completo — {estado.recifradas} recifradas, "
+                f"{estado.errores} errores", flush=True,
+            )
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    if errores:
+        print("[recifrado] Hay valores que no se pudieron descifrar: no retirar todavía "
+              "la clave antigua", file=sys.stderr)
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -109,12 +109,15 @@ async def seed(session, transacciones: dict) -> None:
     """
     now = datetime.utcnow()
 
+    # Una consulta para los roles y otra para sus enlaces, no dos por rol.
+    roles = {
+        r.codigo: r
+        for r in (await session.execute(
+            select(Rol).where(Rol.codigo.in_([d["codigo"] for d in _ROLES]))
+        )).scalars()
+    }
     for rol_def in _ROLES:
-        # Obtener o crear el rol
-        rol = (await session.execute(
-            select(Rol).where(Rol.codigo == rol_def["codigo"])
-        )).scalar_one_or_none()
-
+        rol = roles.get(rol_def["codigo"])
         if rol is None:
             rol = Rol(
                 id=uuid.uuid4(),
@@ -130,35 +133,39 @@ async def seed(session, transacciones: dict) -> None:
                 eliminado=False,
             )
             session.add(rol)
-            await session.flush()
+            roles[rol.codigo] = rol
             print(f"[bootstrap] Rol '{rol_def['codigo']}' creado")
-        else:
+        elif (rol.nombre, rol.descripcion) != (rol_def["nombre"], rol_def["descripcion"]):
             # Sincronizar nombre/descripción por si cambiaron
             rol.nombre = rol_def["nombre"]
             rol.descripcion = rol_def["descripcion"]
 
-        # Asignar transacciones que le falten
-        existing_trans_ids = {
-            rt.transaccion_id
-            for rt in (await session.execute(
-                select(RolTransaccion).where(RolTransaccion.rol_id == rol.id)
-            )).scalars()
-        }
+    existentes = set(
+        (await session.execute(
+            select(RolTransaccion.rol_id, RolTransaccion.transaccion_id)
+            .where(RolTransaccion.rol_id.in_([r.id for r in roles.values()]))
+        )).all()
+    )
 
+    # Asignar transacciones que le falten
+    for rol_def in _ROLES:
+        rol = roles[rol_def["codigo"]]
         added = 0
         for codigo in rol_def["transacciones"]:
             trans = transacciones.get(codigo)
             if trans is None:
                 continue  # La transacción no existe todavía en el JSON
-            if trans.id not in existing_trans_ids:
+            if (rol.id, trans.id) not in existentes:
                 session.add(RolTransaccion(
                     rol_id=rol.id,
                     transaccion_id=trans.id,
                     fecha_creacion=now,
                     eliminado=False,
                 ))
+                existentes.add((rol.id, trans.id))
                 added += 1
-
         if added:
-            await session.flush()
             print(f"[bootstrap] Rol '{rol_def['codigo']}': +{added} transacciones enlazadas")
+
+    # Un único flush: los RolTransaccion nuevos salen en un INSERT multi-fila.
+    await session.flush()
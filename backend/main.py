@@ -17,7 +17,10 @@ from fastapi.staticfiles import StaticFiles
 from strawberry.fastapi import GraphQLRouter
 
 from app.core.database import async_session
-from app.core.events import event_bus, wire_matrix_invalidation
+from app.core.events import (
+    event_bus, wire_ambito_invalidation, wire_categorizacion_invalidation,
+    wire_matrix_invalidation, wire_principal_invalidation,
+)
 from app.graphql.context import get_context
 from app.graphql.schema_simple import schema
 
@@ -27,72 +30,74 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Inicialización al arrancar: sincroniza catálogos y construye la PermissionMatrix."""
-    async with async_session() as session:
-        # 1. Sincronizar catálogos declarados en código → DB
-        from app.modules.acceso.services.catalog_sync import CatalogSyncService
-        from app.modules.acceso import catalog as _acceso_catalog  # noqa: F401  registro side-effect
-
-        # Importar catálogos de todos los módulos para que se auto-registren
-        try:
-            from app.modules.membresia import catalog as _membresia_catalog  # noqa: F401
-        except ImportError:
-            pass
-        try:
-            from app.modules.actividades import catalog as _actividades_catalog  # noqa: F401
-        except ImportError:
-            pass
-        try:
-            from app.modules.economico import catalog as _economico_catalog  # noqa: F401
-        except ImportError:
-            pass
-        try:
-            from app.modules.configuracion import catalog as _configuracion_catalog  # noqa: F401
-        except ImportError:
-            pass
-        try:
-            from app.modules.proteccion_datos import catalog as _proteccion_datos_catalog  # noqa: F401
-        except ImportError:
-            pass
-        try:
-            from app.modules.secretaria import catalog as _secretaria_catalog  # noqa: F401
-        except ImportError:
-            pass
-        try:
-            from app.modules.presidencia import catalog as _presidencia_catalog  # noqa: F401
-        except ImportError:
-            pass
+    from app.core.arranque import ejecutar_tareas_unicas, importar_catalogos
+    from app.core.config import get_settings
 
-        sync = CatalogSyncService(session)
-        await sync.sync()
-        logger.info("Catálogos sincronizados")
+    # 1. Catálogos declarados en código → DB, re-enlace de SUPERADMIN y roles.
+    #    Una sola vez aunque arranquen varios workers (advisory lock); en
+    #    producción ya lo ha hecho bootstrap antes de lanzar los workers.
+    importar_catalogos()
+    if get_settings().sincronizar_catalogos_al_arrancar:
+        await ejecutar_tareas_unicas(async_session)
 
-        # 1b. Enlazar SUPERADMIN con las transacciones añadidas por catalog.py
-        from app.scripts.bootstrap import (
-            sync_superadmin_all_transactions,
-            sync_roles_funcionales_catalog,
-        )
-        await sync_superadmin_all_transactions(session)
-        # 1c. Re-enlazar roles funcionales con transacciones de catalog.py
-        await sync_roles_funcionales_catalog(session)
-        await session.commit()
-
-        # 2. Construir la PermissionMatrix en memoria
+    async with async_session() as session:
+        # 2. Construir la PermissionMatrix en memoria. Con Redis, la construcción
+        #    se publica como nueva versión compartida y el listener mantiene este
+        #    worker al día con los cambios que hagan los demás.
         from app.modules.acceso.services.matrix import matrix_cache
+        from app.modules.acceso.services.matrix_sync import crear_matrix_sync
+        matrix_sync = await crear_matrix_sync(get_settings().redis_url)
+        matrix_cache.set_sync(matrix_sync)
         await matrix_cache.rebuild(session)
-        logger.info("PermissionMatrix construida")
+        if matrix_sync is not None:
+            matrix_sync.start_listener(matrix_cache)
+        logger.info("PermissionMatrix construida (v%d)", matrix_cache.version)
 
-    # 3. Conectar event bus con invalidación de la matrix
+    # 3. Conectar event bus con invalidación de la matrix y de la caché de principal
+    from app.core.push_notificaciones import dsn_escucha
     wire_matrix_invalidation(async_session)
+    from app.core.principal_cache import principal_cache
+    await principal_cache.connect(get_settings().redis_url)
+    wire_principal_invalidation()
+    wire_ambito_invalidation()
+    wire_categorizacion_invalidation()
+    # Reenvío de esas invalidaciones al resto de workers (LISTEN/NOTIFY).
+    from app.core.difusion_eventos import difusion_eventos
+    difusion_eventos.wire()
+    await difusion_eventos.connect(async_session, dsn_escucha())
     # 3b. Conectar handlers de comunicación (avisos de flujos de trabajo)
     from app.modules.core.comunicacion.handlers import wire_comunicacion_handlers
     wire_comunicacion_handlers(async_session)
     # 3c. Conectar handlers del chat interno (canal por grupo de trabajo)
     from app.modules.core.comunicacion.mensajeria.handlers import wire_chat_handlers
     wire_chat_handlers(async_session)
+    # 3c'. Emisión en bloque de certificados de donación (lote vía outbox)
+    from app.modules.economico.services.certificados_lote_service import wire_certificados_handlers
+    wire_certificados_handlers(async_session)
+    # 3d. Relay del outbox: despacha los eventos encolados con event_bus.enqueue
+    from app.core.outbox import OutboxRelay, set_relay
+    outbox_relay = OutboxRelay(async_session)
+    set_relay(outbox_relay)
+    outbox_relay.start()
+    # 3e. Push del badge de notificaciones: LISTEN en Postgres y reparto por usuario
+    from app.core.push_notificaciones import hub_notificaciones
+    await hub_notificaciones.connect(async_session, dsn_escucha())
     logger.info("Event bus conectado")
 
     yield
-    # Teardown (si se necesita cerrar conexiones externas)
+    # Teardown
+    await hub_notificaciones.close()
+    await difusion_eventos.close()
+    await outbox_relay.close()
+    from app.modules.economico.services.pdf.render import cerrar_pool
+    cerrar_pool()
+    set_relay(None)
+    await principal_cache.close()
+    from app.infrastructure.services.cache_service import get_cache_service
+    await get_cache_service().close()
+    if matrix_sync is not None:
+        matrix_cache.set_sync(None)
+        await matrix_sync.close()
 
 
 # Crear aplicación FastAPI
@@ -131,6 +136,10 @@ app.include_router(graphql_app, prefix="/graphql")
 # Routers REST
 from app.api.recibos import router as recibos_router
 from app.api.remesas import router as remesas_router
+from app.api.miembros import router as miembros_router
+from app.api.contabilidad import router as contabilidad_router
+from app.api.donaciones import router as donaciones_router
+from app.api.notificaciones import router as notificaciones_router
 try:
     from app.api.paypal import router as paypal_router
     _paypal_available = True
@@ -139,6 +148,10 @@ except ImportError:
 
 app.include_router(recibos_router)
 app.include_router(remesas_router)
+app.include_router(miembros_router)
+app.include_router(contabilidad_router)
+app.include_router(donaciones_router)
+app.include_router(notificaciones_router)
 if _paypal_available:
     app.include_router(paypal_router)
 
@@ -682,11 +695,56 @@ async def root():
     }
 
 
+@app.get("/health/live")
+async def health_live():
+    """Liveness: el proceso responde. Sin E/S, para que un fallo de la BD o del
+    SMTP no haga reiniciar los workers."""
+    return {"status": "ok"}
+
+
+@app.get("/health/ready")
+async def health_ready():
+    """Readiness: este worker puede atender (PermissionMatrix cargada, BD
+    accesible y escuchando las invalidaciones del resto de workers). 503 si no,
+    para que el balanceador no le envíe tráfico."""
+    from fastapi.responses import JSONResponse
+    from sqlalchemy import text
+    from app.core.difusion_eventos import difusion_eventos
+    from app.modules.acceso.services.matrix import matrix_cache
+
+    matrix_ok = matrix_cache.is_ready()
+    difusion_ok = difusion_eventos.escuchando
+    db_ok = True
+    try:
+        async with async_session() as session:
+            await session.execute(text("SELECT 1"))
+    except Exception:
+        db_ok = False
+    listo = matrix_ok and db_ok and difusion_ok
+    return JSONResponse(
+        status_code=200 if listo else 503,
+        content={
+            "status": "ready" if listo else "not_ready",
+            "permission_matrix": "ready" if matrix_ok else "not_ready",
+            "invalidaciones": "ok" if difusion_ok else "not_listening",
+            "database": "ok" if db_ok else "error",
+        },
+    )
+
+
 @app.get("/health")
 async def health():
+    """Diagnóstico detallado (BD, SMTP, cachés, pools). Para sondas usar
+    /health/live y /health/ready."""
     from sqlalchemy import text
     from app.modules.acceso.services.matrix import matrix_cache
     from app.core.email_service import _load_smtp_config, ping_smtp
+    from app.core.database import metricas_pool
+    from app.core.principal_cache import principal_cache
+    from app.infrastructure.services.cache_service import get_cache_service
+    from app.core.outbox import outbox_relay
+    from app.core.push_notificaciones import hub_notificaciones
+    from app.core.difusion_eventos import difusion_eventos
 
     db_status   = "ok"
     smtp_status = "not_configured"
@@ -708,6 +766,13 @@ async def health():
     return {
         "status": overall,
         "permission_matrix": "ready" if matrix_cache.is_ready() else "not_ready",
+        "permission_matrix_version": matrix_cache.version,
+        "principal_cache": principal_cache.stats(),
+        "cache": get_cache_service().stats(),
+        "outbox": outbox_relay.stats() if outbox_relay else None,
+        "push_notificaciones": hub_notificaciones.stats(),
+        "invalidaciones": difusion_eventos.stats(),
         "database": db_status,
+        "db_pool": metricas_pool(),
         "smtp": smtp_status,
     }
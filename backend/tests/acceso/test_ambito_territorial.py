@@ -0,0 +1,168 @@
+"""Tests del ámbito territorial con árbol en memoria y closure table."""
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.events import EventBus, UnidadOrganizativaCambiada, UserRolesChanged
+from app.modules.acceso.services.ambito_territorial import (
+    ArbolTerritorial,
+    agrupaciones_en_ambito,
+    arbol_territorial,
+    condicion_en_ambito,
+    ensure_rol_coordinador_campania,
+    ensure_rol_coordinador_grupo,
+)
+from app.modules.membresia.models.contacto import Contacto
+
+RAIZ, ANDALUCIA, SEVILLA, CADIZ, MADRID = (uuid.uuid4() for _ in range(5))
+PARES = [
+    (RAIZ, None), (ANDALUCIA, RAIZ), (SEVILLA, ANDALUCIA), (CADIZ, ANDALUCIA), (MADRID, RAIZ),
+]
+
+
+def _res(filas):
+    r = MagicMock()
+    r.all.return_value = filas
+    return r
+
+
+@pytest.fixture(autouse=True)
+def _limpiar_cache():
+    arbol_territorial.invalidar()
+    yield
+    arbol_territorial.invalidar()
+
+
+class TestArbol:
+    def test_subarbol(self):
+        arbol = ArbolTerritorial(PARES)
+        assert arbol.raices == {RAIZ}
+        assert arbol.subarbol_de(ANDALUCIA) == {ANDALUCIA, SEVILLA, CADIZ}
+        assert arbol.subarbol({SEVILLA, MADRID}) == {SEVILLA, MADRID}
+        assert arbol.subarbol_de(uuid.uuid4()) == frozenset()
+
+    def test_condicion_usa_closure(self):
+        sql = str(condicion_en_ambito(Contacto.agrupacion_id, {ANDALUCIA}))
+        assert "unidades_organizativas_cierre" in sql
+        assert "WITH RECURSIVE" not in sql
+
+
+class TestAmbitoUsuario:
+    async def test_arbol_se_carga_una_vez(self):
+        session = AsyncMock()
+        session.execute = AsyncMock(side_effect=[
+            _res([(ANDALUCIA,)]),   # roles del usuario
+            _res(PARES),            # árbol (una sola vez)
+            _res([(ANDALUCIA,)]),   # roles, segunda petición
+        ])
+        usuario = uuid.uuid4()
+        cargas = arbol_territorial.cargas
+        assert await agrupaciones_en_ambito(session, usuario) == {ANDALUCIA, SEVILLA, CADIZ}
+        assert await agrupaciones_en_ambito(session, usuario) == {ANDALUCIA, SEVILLA, CADIZ}
+        assert session.execute.await_count == 3
+        assert arbol_territorial.cargas == cargas + 1
+
+    async def test_rol_en_raiz_es_global(self):
+        session = AsyncMock()
+        session.execute = AsyncMock(side_effect=[_res([(RAIZ,)]), _res(PARES)])
+        assert await agrupaciones_en_ambito(session, uuid.uuid4()) is None
+
+    async def test_evento_invalida(self, monkeypatch):
+        bus = EventBus()
+        monkeypatch.setattr("app.core.events.event_bus", bus)
+        from app.core.events import wire_ambito_invalidation
+
+        wire_ambito_invalidation()
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=_res(PARES))
+        primero = await arbol_territorial.obtener(session)
+        assert await arbol_territorial.obtener(session) is primero
+        await bus.publish(UnidadOrganizativaCambiada(unidad_id=str(SEVILLA)))
+        assert await arbol_territorial.obtener(session) is not primero
+
+
+class TestRolesCoordinador:
+    """La concesión automática de roles invalida la caché de principal como las demás."""
+
+    @pytest.fixture
+    def bus(self, monkeypatch):
+        bus = EventBus()
+        monkeypatch.setattr("app.core.events.event_bus", bus)
+        publicados = []
+
+        async def _recoger(ev):
+            publicados.append(ev)
+
+        bus.subscribe(UserRolesChanged, _recoger, sync=True)
+        return publicados
+
+    @staticmethod
+    def _session(usuario_id, existe=None):
+        session = AsyncMock()
+        session.add = MagicMock()
+        session.scalar = AsyncMock(side_effect=[usuario_id, uuid.uuid4(), existe])
+        return session
+
+    async def test_campania_publica_tras_commit(self, bus):
+        usuario = uuid.uuid4()
+        session = self._session(usuario)
+        await ensure_rol_coordinador_campania(session, uuid.uuid4())
+        session.commit.assert_awaited_once()
+        assert [ev.usuario_id for ev in bus] == [str(usuario)]
+
+    async def test_campania_sin_cambio_no_publica(self, bus):
+        session = self._session(uuid.uuid4(), existe=uuid.uuid4())
+        await ensure_rol_coordinador_campania(session, uuid.uuid4())
+        session.commit.assert_not_awaited()
+        assert bus == []
+
+    async def test_grupo_devuelve_usuario_sin_commitear(self, bus):
+        usuario = uuid.uuid4()
+        session = self._session(usuario)
+        assert await ensure_rol_coordinador_grupo(session, uuid.uuid4()) == usuario
+        session.commit.assert_not_awaited()
+        assert bus == []  # publica quien llama, tras su commit
+        session = self._session(usuario, existe=uuid.uuid4())
+        assert await ensure_rol_coordinador_grupo(session, uuid.uuid4()) is None
+
+
+class TestEliminarUnidades:
+    """El borrado físico de unidades invalida el árbol territorial cacheado."""
+
+    @staticmethod
+    def _resolver():
+        from app.graphql.geografico_resolvers import GeograficoMutation
+        return GeograficoMutation.eliminar_unidades_organizativas
+
+    @staticmethod
+    def _info(unidades, hijo=None):
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=MagicMock(
+            scalars=MagicMock(return_value=MagicMock(all=MagicMock(return_value=unidades)))))
+        session.scalar = AsyncMock(return_value=hijo)
+        return MagicMock(context=MagicMock(session=session, user=None))
+
+    async def test_borrar_invalida_el_arbol(self, monkeypatch):
+        bus = EventBus()
+        monkeypatch.setattr("app.graphql.geografico_resolvers.event_bus", bus)
+        monkeypatch.setattr("app.core.events.event_bus", bus)
+        from app.core.events import wire_ambito_invalidation
+        wire_ambito_invalidation()
+
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=_res(PARES))
+        await arbol_territorial.obtener(session)
+        assert arbol_territorial._arbol is not None
+
+        info = self._info([MagicMock(id=CADIZ)])
+        assert await self._resolver()(None, info, [CADIZ]) == [CADIZ]
+        info.context.session.delete.assert_awaited_once()
+        info.context.session.commit.assert_awaited_once()
+        assert arbol_territorial._arbol is None
+
+    async def test_con_subunidades_no_borra(self):
+        info = self._info([MagicMock(id=ANDALUCIA)], hijo=SEVILLA)
+        with pytest.raises(ValueError):
+            await self._resolver()(None, info, [ANDALUCIA])
+        info.context.session.delete.assert_not_awaited()
@@ -0,0 +1,66 @@
+"""Tests de la sincronización por diferencias del catálogo (huella, upsert en bloque)."""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+import uuid
+
+import pytest
+
+from app.modules.acceso.services.catalog_sync import CatalogSyncService
+from app.modules.acceso.services.registry import ModuleCatalog, TransaccionDef
+
+
+@pytest.fixture
+def catalogo():
+    """Catálogo aislado con dos transacciones de un módulo activo."""
+    transacciones = {
+        "ROL_CREAR": TransaccionDef("ROL_CREAR", "Crear rol", "MUTACION"),
+        "ROL_LISTAR": TransaccionDef("ROL_LISTAR", "Listar roles", "CONSULTA"),
+    }
+    with patch.object(ModuleCatalog, "_transacciones", transacciones), \
+         patch.object(ModuleCatalog, "_transaccion_modulos", {c: "acceso" for c in transacciones}), \
+         patch.object(ModuleCatalog, "_funcionalidades", {}), \
+         patch.object(ModuleCatalog, "_flujos", {}):
+        yield transacciones
+
+
+def _session():
+    session = MagicMock()
+    session.scalar = AsyncMock(return_value=None)
+    session.execute = AsyncMock()
+    session.flush = AsyncMock()
+    return session
+
+
+class TestHuella:
+    def test_estable_y_sensible_a_cambios(self, catalogo):
+        huella = CatalogSyncService.huella_catalogo()
+        assert huella == CatalogSyncService.huella_catalogo()
+        catalogo["ROL_CREAR"] = TransaccionDef("ROL_CREAR", "Alta de rol", "MUTACION")
+        assert CatalogSyncService.huella_catalogo() != huella
+
+    async def test_huella_igual_omite_la_sincronizacion(self, catalogo):
+        session = _session()
+        session.scalar.return_value = CatalogSyncService.huella_catalogo()
+        assert await CatalogSyncService(session).sync() is False
+        session.execute.assert_not_awaited()
+        session.flush.assert_not_awaited()
+
+
+class TestTransacciones:
+    async def test_solo_escribe_las_nuevas_o_cambiadas(self, catalogo):
+        sin_cambios = SimpleNamespace(
+            id=uuid.uuid4(), codigo="ROL_LISTAR", nombre="Listar roles",
+            descripcion=None, modulo="acceso", activa=True, sistema=True,
+        )
+        session = _session()
+        session.execute.side_effect = [[sin_cambios], None]
+        service = CatalogSyncService(session)
+
+        await service._sync_transacciones()
+
+        assert session.execute.await_count == 2  # lectura + un único upsert
+        upsert = session.execute.await_args_list[1].args[0]
+        params = upsert.compile().params
+        assert "ROL_CREAR" in params.values()
+        assert "ROL_LISTAR" not in params.values()
+        assert set(service._transacciones) == {"ROL_CREAR", "ROL_LISTAR"}
@@ -0,0 +1,116 @@
+"""Tests del snapshot de la PermissionMatrix (bitmap, cambios incrementales, serialización)."""
+import pytest
+from unittest.mock import AsyncMock
+
+from app.modules.acceso.services.matrix import (
+    PermissionMatrixCache,
+    PermissionMatrixSnapshot,
+)
+
+
+@pytest.fixture
+def snapshot():
+    snap = PermissionMatrixSnapshot(
+        role_transactions={
+            "admin": frozenset({"ROL_CREAR", "ROL_EDITAR"}),
+            "tesorero": frozenset({"REMESA_VER"}),
+        },
+        role_functionalities={
+            "admin": frozenset(),
+            "tesorero": frozenset({"f_remesas"}),
+        },
+        functionality_transactions={
+            "f_remesas": frozenset({"REMESA_CREAR", "REMESA_APAGADA"}),
+        },
+        inactivas=frozenset({"REMESA_APAGADA"}),
+        version=3,
+    )
+    snap.recalcular()
+    return snap
+
+
+class TestSnapshot:
+    def test_can_directa_y_via_funcionalidad(self, snapshot):
+        assert snapshot.can(frozenset({"admin"}), "ROL_CREAR")
+        assert snapshot.can(frozenset({"tesorero"}), "REMESA_VER")
+        assert snapshot.can(frozenset({"tesorero"}), "REMESA_CREAR")
+        assert not snapshot.can(frozenset({"tesorero"}), "ROL_CREAR")
+        assert not snapshot.can(frozenset({"desconocido"}), "ROL_CREAR")
+
+    def test_inactivas_no_se_conceden(self, snapshot):
+        assert not snapshot.can(frozenset({"tesorero"}), "REMESA_APAGADA")
+        assert "REMESA_APAGADA" not in snapshot.effective_transactions("tesorero")
+
+    def test_con_rol_no_muta_el_original(self, snapshot):
+        nuevo = snapshot.con_rol("tesorero", {"ROL_CREAR"}, set())
+        assert nuevo.can(frozenset({"tesorero"}), "ROL_CREAR")
+        assert not nuevo.can(frozenset({"tesorero"}), "REMESA_CREAR")
+        assert snapshot.can(frozenset({"tesorero"}), "REMESA_CREAR")
+
+    def test_con_rol_none_elimina(self, snapshot):
+        nuevo = snapshot.con_rol("admin", None, None)
+        assert not nuevo.can(frozenset({"admin"}), "ROL_CREAR")
+        assert "admin" not in nuevo.role_transactions
+
+    def test_con_funcionalidad_recalcula_roles_afectados(self, snapshot):
+        nuevo = snapshot.con_funcionalidad("f_remesas", {"REMESA_BORRAR"})
+        assert nuevo.can(frozenset({"tesorero"}), "REMESA_BORRAR")
+        assert not nuevo.can(frozenset({"tesorero"}), "REMESA_CREAR")
+        assert nuevo.can(frozenset({"admin"}), "ROL_EDITAR")
+
+    def test_roundtrip_dict(self, snapshot):
+        copia = PermissionMatrixSnapshot.from_dict(snapshot.to_dict())
+        assert copia.version == 3
+        for rol in ("admin", "tesorero"):
+            assert copia.effective_transactions(rol) == snapshot.effective_transactions(rol)
+
+
+class TestCache:
+    def test_install_solo_versiones_nuevas(self, snapshot):
+        cache = PermissionMatrixCache()
+        assert cache.install(snapshot)
+        antiguo = snapshot.con_rol("admin", None, None)
+        antiguo.version = 2
+        assert not cache.install(antiguo)
+        assert cache.version == 3
+
+    async def test_load_shared_adopta_snapshot_de_redis(self, snapshot):
+        cache = PermissionMatrixCache()
+        sync = AsyncMock()
+        sync.load.return_value = snapshot
+        cache.set_sync(sync)
+        assert await cache.load_shared()
+        assert cache.can(frozenset({"admin"}), "ROL_EDITAR")
+
+
+class TestMatrixSyncListener:
+    async def test_cierra_el_pubsub_antes_de_reconectar(self, monkeypatch):
+        import asyncio
+        from unittest.mock import MagicMock
+
+        from app.modules.acceso.services import matrix_sync
+
+        pubsubs = []
+
+        def _pubsub():
+            ps = MagicMock()
+            ps.subscribe = AsyncMock(side_effect=ConnectionError("redis caído"))
+            ps.aclose = AsyncMock()
+            pubsubs.append(ps)
+            return ps
+
+        esperas = 0
+
+        async def _sleep(_):
+            nonlocal esperas
+            esperas += 1
+            if esperas == 2:
+                raise asyncio.CancelledError
+
+        monkeypatch.setattr(matrix_sync.asyncio, "sleep", _sleep)
+        sync = matrix_sync.MatrixSync(MagicMock(pubsub=_pubsub))
+        with pytest.raises(asyncio.CancelledError):
+            await sync._escuchar(PermissionMatrixCache())
+        assert len(pubsubs) == 2
+        for ps in pubsubs:
+            ps.aclose.assert_awaited_once()
@@ -0,0 +1,44 @@
+"""Tests de la caché de principal (usuario autenticado + role_ids)."""
+import pytest
+from unittest.mock import patch
+
+from app.core.principal_cache import PrincipalCache
+
+
+@pytest.fixture
+def cache():
+    return PrincipalCache(max_entries=2, ttl=30.0)
+
+
+class TestPrincipalCache:
+    def test_clave_incluye_iat(self, cache):
+        cache.set_user("u1", 100, "usuario")
+        assert cache.get_user("u1", 100) == "usuario"
+        assert cache.get_user("u1", 101) is None
+
+    def test_sin_iat_no_cachea(self, cache):
+        cache.set_role_ids("u1", None, frozenset({"r1"}))
+        assert cache.get_role_ids("u1", None) is None
+
+    def test_lru_acotada(self, cache):
+        cache.set_user("u1", 1, "a")
+        cache.set_user("u2", 1, "b")
+        cache.get_user("u1", 1)          # u1 pasa a ser el más reciente
+        cache.set_user("u3", 1, "c")
+        assert cache.get_user("u2", 1) is None
+        assert cache.get_user("u1", 1) == "a"
+
+    def test_ttl(self, cache):
+        with patch("app.core.principal_cache.time.monotonic", return_value=1000.0):
+            cache.set_role_ids("u1", 1, frozenset({"r1"}))
+        with patch("app.core.principal_cache.time.monotonic", return_value=1031.0):
+            assert cache.get_role_ids("u1", 1) is None
+
+    async def test_invalidate_user(self, cache):
+        cache.set_user("u1", 1, "a")
+        cache.set_user("u2", 1, "b")
+        await cache.invalidate_user("u1")
+        assert cache.get_user("u1", 1) is None
+        assert cache.get_user("u2", 1) == "b"
+        await cache.invalidate_all()
+        assert cache.get_user("u2", 1) is None
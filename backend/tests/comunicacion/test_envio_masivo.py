@@ -0,0 +1,157 @@
+"""Tests del envío masivo de email (pool de conexiones, concurrencia, trabajos)."""
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import aiosmtplib
+import pytest
+
+from app.core import email_service
+from app.core.email_service import (
+    EnvioMasivo,
+    MensajeEmail,
+    SmtpConfig,
+    lanzar_envio,
+    obtener_trabajo,
+)
+
+
+class _SmtpFalso:
+    """Sustituto de aiosmtplib.SMTP que registra conexiones y envíos."""
+    conexiones = 0
+    en_vuelo = 0
+    max_en_vuelo = 0
+    rechazados: set = set()
+    caer_una_vez: set = set()
+
+    def __init__(self, **kwargs):
+        self.is_connected = False
+
+    async def connect(self):
+        type(self).conexiones += 1
+        self.is_connected = True
+
+    async def send_message(self, msg, recipients):
+        cls = type(self)
+        cls.en_vuelo += 1
+        cls.max_en_vuelo = max(cls.max_en_vuelo, cls.en_vuelo)
+        try:
+            await asyncio.sleep(0.001)
+            destino = recipients[0]
+            if destino in cls.caer_una_vez:
+                cls.caer_una_vez.discard(destino)
+                self.is_connected = False
+                raise aiosmtplib.SMTPServerDisconnected("conexión perdida")
+            if destino in cls.rechazados:
+                raise aiosmtplib.SMTPRecipientsRefused([])
+        finally:
+            cls.en_vuelo -= 1
+
+    async def quit(self):
+        self.is_connected = False
+
+    def close(self):
+        self.is_connected = False
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    class Falso(_SmtpFalso):
+        rechazados = {"malo@example.org"}
+        caer_una_vez = {"c3@example.org"}
+
+    monkeypatch.setattr(email_service.aiosmtplib, "SMTP", Falso)
+    return Falso
+
+
+@pytest.fixture
+def config():
+    return SmtpConfig({
+        "smtp.host": "smtp.example.org", "smtp.usuario": "u",
+        "smtp.password": "p", "smtp.from": "siga@example.org",
+    })
+
+
+def _mensajes(n, extra=()):
+    direcciones = [f"c{i}@example.org" for i in range(n)] + list(extra)
+    return [MensajeEmail(destinatario=d, asunto="Hola", cuerpo_html="<p>x</p>") for d in direcciones]
+
+
+class TestEnvioMasivo:
+    async def test_reutiliza_conexiones_y_acota_concurrencia(self, smtp, config):
+        envio = EnvioMasivo(config, conexiones=2, concurrencia=4, por_segundo=0)
+        resultados = await envio.enviar(_mensajes(20, ["malo@example.org"]))
+
+        assert len(resultados) == 21
+        assert [r.destinatario for r in resultados][:2] == ["c0@example.org", "c1@example.org"]
+        fallidos = [r for r in resultados if not r.ok]
+        assert [r.destinatario for r in fallidos] == ["malo@example.org"]
+        # 2 conexiones del pool + 1 reapertura tras la caída de c3 (reintentado con éxito)
+        assert smtp.conexiones == 3
+        assert smtp.max_en_vuelo <= 2
+
+    async def test_smtp_no_configurado(self, smtp):
+        with pytest.raises(ValueError, match="no está configurado"):
+            await EnvioMasivo(SmtpConfig({}), por_segundo=0).enviar(_mensajes(1))
+
+
+class _SesionFalsa:
+    """Sesión mínima: registra `add` y los valores de cada UPDATE."""
+
+    def __init__(self, registro):
+        self.registro = registro
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def add(self, obj):
+        self.registro["filas"].append(obj)
+
+    async def execute(self, stmt):
+        if stmt.is_update:
+            self.registro["updates"].append(
+                {c.key: v.value for c, v in stmt._values.items() if hasattr(v, "value")}
+            )
+
+    async def commit(self):
+        pass
+
+
+class TestTrabajoEnvio:
+    async def test_progreso_en_segundo_plano(self, smtp, config, monkeypatch):
+        monkeypatch.setattr(email_service.get_settings(), "smtp_rate_per_second", 0.0)
+        terminado = asyncio.Event()
+        registro = {"filas": [], "updates": []}
+
+        async def al_terminar(trabajo):
+            terminado.set()
+
+        trabajo = await lanzar_envio(config, _mensajes(5, ["malo@example.org"]),
+                                     session_factory=lambda: _SesionFalsa(registro),
+                                     al_terminar=al_terminar)
+        # El trabajo queda registrado en BD antes de volver: lo ve cualquier worker.
+        (fila,) = registro["filas"]
+        assert str(fila.id) == trabajo.id and fila.total == 6
+        assert trabajo.estado == "EN_CURSO"
+        await asyncio.wait_for(terminado.wait(), 1)
+        assert trabajo.estado == "COMPLETADO"
+        assert (trabajo.enviados, trabajo.fallidos, trabajo.procesados) == (5, 1, 6)
+        final = registro["updates"][-1]
+        assert (final["estado"], final["enviados"], final["fallidos"]) == ("COMPLETADO", 5, 1)
+        assert [r["ok"] for r in final["resultados"]].count(False) == 1
+
+    async def test_trabajo_sin_latido_se_da_por_interrumpido(self):
+        fila = email_service.TrabajoEnvioMasivo(
+            id=uuid.uuid4(), total=3, estado="EN_CURSO", enviados=1, fallidos=0, resultados=[],
+        )
+        resultado = MagicMock()
+        resultado.first.return_value = (fila, True)
+        session = MagicMock(execute=AsyncMock(return_value=resultado))
+
+        trabajo = await obtener_trabajo(session, str(fila.id))
+        assert trabajo.estado == "ERROR" and "interrumpió" in trabajo.error
+        session.expunge.assert_called_once_with(fila)
+        assert await obtener_trabajo(session, "no-es-un-uuid") is None
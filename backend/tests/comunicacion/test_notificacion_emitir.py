@@ -0,0 +1,71 @@
+"""Tests del fan-out de `NotificacionService.emitir` a audiencias grandes."""
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.infrastructure.services import notificacion_service as ns
+from app.infrastructure.services.notificacion_service import NotificacionService
+from app.modules.core.comunicacion.services import destinatario_resolver as dr
+from app.modules.core.comunicacion.services.destinatario_resolver import (
+    Destinatario,
+    EspecificacionAudiencia,
+)
+
+
+def _res(scalar=None, scalars=()):
+    r = MagicMock()
+    r.scalar_one_or_none.return_value = scalar
+    r.scalars.return_value.all.return_value = list(scalars)
+    return r
+
+
+@pytest.fixture
+def audiencia(monkeypatch):
+    destinatarios = [
+        Destinatario(usuario_id=uuid.uuid4(), email=f"u{i}@example.org", nombre=f"U{i}")
+        for i in range(2500)
+    ]
+    monkeypatch.setattr(dr.DestinatarioResolver, "resolver", AsyncMock(return_value=destinatarios))
+    return destinatarios
+
+
+@pytest.fixture
+def servicio():
+    session = AsyncMock()
+    session.add = MagicMock()
+    return NotificacionService(session)
+
+
+class TestFanOut:
+    async def test_consultas_constantes(self, audiencia, servicio, monkeypatch):
+        svc = servicio
+        tipo = SimpleNamespace(id=uuid.uuid4(), prioridad="ALTA", permite_email=True,
+                               permite_sms=False, permite_push=False, permite_inapp=True,
+                               requiere_accion=False)
+        vetado = audiencia[7].usuario_id
+        svc.session.execute = AsyncMock(side_effect=[
+            _res(scalar=tipo),                 # tipo
+            _res(scalar=uuid.uuid4()),         # estado PENDIENTE
+            _res(), _res(), _res(),            # INSERT multi-fila: 3 bloques de ≤1000
+            _res(scalars=[vetado]),            # preferencias de toda la audiencia
+        ])
+        smtp = SimpleNamespace(configured=False)
+        monkeypatch.setattr(ns, "_load_smtp_config", AsyncMock(return_value=smtp))
+
+        resultado = await svc.emitir(
+            tipo_codigo="SECRETARIA_CONVOCATORIA",
+            audiencia=EspecificacionAudiencia.por_permiso("X"),
+            titulo="Convocatoria", mensaje="Se ha convocado…",
+        )
+
+        assert resultado.inapp_creadas == 2500
+        assert resultado.sin_email == 1 and resultado.email_simulados == 2499
+        assert svc.session.execute.await_count == 6
+        svc.session.commit.assert_awaited_once()
+        svc.session.add.assert_not_called()
+
+        insert = svc.session.execute.await_args_list[2].args[0]
+        filas = insert.compile().params
+        assert sum(1 for k in filas if k.startswith("usuario_id")) == 1000
@@ -0,0 +1,43 @@
+"""Tests del reparto por usuario del push de notificaciones (app/core/push_notificaciones.py)."""
+import uuid
+from unittest.mock import AsyncMock
+
+from app.core.push_notificaciones import HubNotificaciones
+
+
+def _hub(contadores: dict) -> HubNotificaciones:
+    hub = HubNotificaciones()
+    hub.leer_contadores = AsyncMock(side_effect=lambda ids: {u: contadores.get(u, 0) for u in ids})
+    return hub
+
+
+class TestReparto:
+    async def test_solo_lee_usuarios_con_suscripcion_local(self):
+        u1, u2 = str(uuid.uuid4()), str(uuid.uuid4())
+        hub = _hub({u1: 4})
+        async with hub.suscripcion(u1) as a, hub.suscripcion(u1) as b:
+            hub.avisar([u1, u2])
+            await hub.despachar_pendientes()
+            assert await a.siguiente(timeout=0.1) == 4
+            assert await b.siguiente(timeout=0.1) == 4
+        hub.leer_contadores.assert_awaited_once_with({u1})
+        assert hub.stats()["suscripciones"] == 0
+
+    async def test_cliente_lento_recibe_solo_el_ultimo_valor(self):
+        u = str(uuid.uuid4())
+        contadores = {u: 1}
+        hub = _hub(contadores)
+        async with hub.suscripcion(u) as sub:
+            for n in (1, 2, 3):
+                contadores[u] = n
+                hub.avisar([u])
+                await hub.despachar_pendientes()
+            assert await sub.siguiente(timeout=0.1) == 3
+            assert await sub.siguiente(timeout=0.01) is None
+
+    async def test_close_termina_las_suscripciones(self):
+        hub = _hub({})
+        async with hub.suscripcion(str(uuid.uuid4())) as sub:
+            await hub.close()
+            assert await sub.siguiente(timeout=0.1) is None
+            assert sub.cerrada
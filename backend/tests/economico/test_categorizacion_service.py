@@ -0,0 +1,95 @@
+"""Tests del clasificador compilado de apuntes y de la clasificación masiva."""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.sql.dml import Update
+
+from app.modules.economico.models.contabilidad import ReglaCategorizacion, TipoCoincidencia
+from app.modules.economico.models.tesoreria import OrigenApunte, TipoApunte
+from app.modules.economico.services.categorizacion_service import (
+    CategorizacionService,
+    ClasificadorCompilado,
+)
+
+C = TipoCoincidencia
+REGLAS = [
+    ReglaCategorizacion(patron="Endesa", tipo_coincidencia=C.CONTIENE, tipo_apunte="GASTO", orden=1),
+    ReglaCategorizacion(patron="recibo", tipo_coincidencia=C.EMPIEZA_POR, tipo_apunte=None, orden=2),
+    ReglaCategorizacion(patron="Intereses", tipo_coincidencia=C.EXACTO, tipo_apunte=None, orden=3),
+    ReglaCategorizacion(patron=r"(ab)\1", tipo_coincidencia=C.REGEX, tipo_apunte=None, orden=4),
+    ReglaCategorizacion(patron=r"factura\s+n[º°]?\d+", tipo_coincidencia=C.REGEX, tipo_apunte=None, orden=5),
+    ReglaCategorizacion(patron="[sin cerrar", tipo_coincidencia=C.REGEX, tipo_apunte=None, orden=6),
+    ReglaCategorizacion(patron="a.b", tipo_coincidencia=C.CONTIENE, tipo_apunte="INGRESO", orden=7),
+    # Flags en línea: solo valen al principio, no se pueden incrustar.
+    ReglaCategorizacion(patron="(?i)iberdrola", tipo_coincidencia=C.REGEX, tipo_apunte=None, orden=8),
+    # REGEX sobre el concepto original (espacios iniciales incluidos).
+    ReglaCategorizacion(patron=r"^\s+cuota", tipo_coincidencia=C.REGEX, tipo_apunte=None, orden=9),
+    ReglaCategorizacion(patron="cuota", tipo_coincidencia=C.EMPIEZA_POR, tipo_apunte=None, orden=10),
+]
+for _regla in REGLAS:
+    _regla.activa = True
+    _regla.categoria_fiscal_id = uuid4()
+
+CONCEPTOS = [
+    "Recibo ENDESA marzo", "  recibo agua", "intereses", "Intereses cuenta", "ABAB cobro",
+    "Pago factura nº123", "x a.b y", "axb", "[sin cerrar", "", "Transferencia",
+    "Recibo IBERDROLA", "Pago Iberdrola", "  cuota anual", "cuota anual",
+]
+
+
+def _secuencial(concepto, tipo):
+    """Resolución de referencia: las reglas una a una, como antes de compilarlas."""
+    return next((r.categoria_fiscal_id for r in REGLAS if r.coincide(concepto, tipo)), None)
+
+
+class TestClasificadorCompilado:
+    @pytest.mark.parametrize("tipo", ["INGRESO", "GASTO", None])
+    @pytest.mark.parametrize("concepto", CONCEPTOS)
+    def test_equivale_a_recorrer_las_reglas(self, concepto, tipo):
+        clasificador = ClasificadorCompilado(REGLAS, {})
+        assert clasificador.resolver(None, tipo, concepto) == _secuencial(concepto, tipo)
+
+    def test_regla_con_flags_en_linea_no_rompe_el_resto(self):
+        clasificador = ClasificadorCompilado(REGLAS, {})
+        assert clasificador.resolver(None, None, "Pago IBERDROLA") == REGLAS[7].categoria_fiscal_id
+        assert clasificador.resolver(None, None, "  Cuota socio") == REGLAS[8].categoria_fiscal_id
+        assert clasificador.resolver(None, None, "Cuota socio") == REGLAS[9].categoria_fiscal_id
+
+    def test_origen_prevalece(self):
+        cuotas = uuid4()
+        clasificador = ClasificadorCompilado(REGLAS, {"CUOTA": cuotas})
+        assert clasificador.resolver("CUOTA", "GASTO", "Recibo Endesa") == cuotas
+
+
+class TestClasificarPendientes:
+    async def test_un_update_por_categoria(self):
+        gastos, agua = REGLAS[0].categoria_fiscal_id, REGLAS[1].categoria_fiscal_id
+        filas = [
+            SimpleNamespace(id=uuid4(), origen=None, tipo=TipoApunte.GASTO,
+                            concepto=c, categoria_fiscal_id=None)
+            for c in ["Recibo Endesa"] * 30 + ["recibo agua"] * 20 + ["Transferencia"] * 5
+        ]
+        filas.append(SimpleNamespace(id=uuid4(), origen=OrigenApunte.MANUAL, tipo=TipoApunte.GASTO,
+                                     concepto="Endesa", categoria_fiscal_id=gastos))
+        sentencias = []
+
+        async def execute(stmt):
+            sentencias.append(stmt)
+            return MagicMock(all=MagicMock(return_value=filas if len(sentencias) == 1 else []))
+
+        session = MagicMock()
+        session.execute = execute
+        session.commit = AsyncMock()
+        clasificador = ClasificadorCompilado(REGLAS, {})
+        with patch(
+            "app.modules.economico.services.categorizacion_service.clasificador_cache.obtener",
+            AsyncMock(return_value=clasificador),
+        ):
+            res = await CategorizacionService(session).clasificar_pendientes(forzar=True)
+
+        assert res == {"procesados": 56, "clasificados": 50}
+        updates = [s for s in sentencias if isinstance(s, Update)]
+        assert len(updates) == 2
+        assert {u.compile().params["categoria_fiscal_id"] for u in updates} == {gastos, agua}
@@ -0,0 +1,81 @@
+"""Tests del lote de certificados de donación en segundo plano (certificados_lote_service.py)."""
+import io
+import uuid
+import zipfile
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.modules.economico.services import certificados_lote_service as lotes
+from app.modules.economico.services.pdf import render
+
+
+def _eco(numero, *_):
+    return numero.encode()
+
+
+@pytest.fixture
+def entorno(tmp_path):
+    lote = SimpleNamespace(id=uuid.uuid4(), ejercicio=2026, solo_pendientes=True, estado="EN_CURSO",
+                           numeros=None, omitidos=None, total=0, ruta_zip=None, error=None)
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+    session.get = AsyncMock(return_value=lote)
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    session.execute = AsyncMock()
+    preparar = AsyncMock(return_value=[
+        ("CERT-2026-00005_1.pdf", ("CERT-2026-00005",)),
+        ("CERT-2026-00006_2.pdf", ("CERT-2026-00006",)),
+    ])
+    with patch.object(lotes, "_ZIP_DIR", tmp_path), \
+            patch.object(lotes, "_reclamar", AsyncMock(return_value=True)), \
+            patch.object(lotes, "_cfg", AsyncMock(return_value="x")), \
+            patch.object(lotes, "generar_pdf_certificado", _eco), \
+            patch.object(lotes.DonacionService, "preparar_certificados_ejercicio", preparar), \
+            patch.object(render, "get_settings", return_value=SimpleNamespace(pdf_workers=0)):
+        yield SimpleNamespace(lote=lote, session=session, preparar=preparar)
+
+
+class TestProcesarLote:
+    async def test_numera_una_vez_y_deja_el_zip(self, entorno):
+        await lotes.procesar_lote(lambda: entorno.session, entorno.lote.id)
+
+        lote = entorno.lote
+        assert lote.estado == "COMPLETADO" and lote.total == 2
+        assert lote.numeros == ["CERT-2026-00005", "CERT-2026-00006"]
+        with zipfile.ZipFile(io.BytesIO(open(lote.ruta_zip, "rb").read())) as zf:
+            assert zf.read("CERT-2026-00006_2.pdf") == b"CERT-2026-00006"
+        # La numeración se confirma antes de renderizar; el COMPLETADO, después.
+        assert entorno.session.commit.await_count == 2
+
+    async def test_reintento_regenera_los_mismos_numeros(self, entorno):
+        entorno.lote.numeros = ["CERT-2026-00005", "CERT-2026-00006"]
+        await lotes.procesar_lote(lambda: entorno.session, entorno.lote.id)
+        assert entorno.preparar.await_args.kwargs == {"numeros": ["CERT-2026-00005", "CERT-2026-00006"]}
+        assert entorno.lote.estado == "COMPLETADO"
+
+    async def test_reintento_informa_de_los_numeros_que_no_puede_regenerar(self, entorno, caplog):
+        entorno.lote.numeros = ["CERT-2026-00004", "CERT-2026-00005", "CERT-2026-00006"]
+        await lotes.procesar_lote(lambda: entorno.session, entorno.lote.id)
+        assert entorno.lote.estado == "COMPLETADO"
+        assert entorno.lote.omitidos == ["CERT-2026-00004"]
+        assert "CERT-2026-00004" in caplog.text
+
+    async def test_fallo_al_renderizar_deja_error_y_reintenta(self, entorno):
+        def _roto(*_):
+            raise RuntimeError("sin fuentes")
+
+        with patch.object(lotes, "generar_pdf_certificado", _roto), pytest.raises(RuntimeError):
+            await lotes.procesar_lote(lambda: entorno.session, entorno.lote.id)
+        assert entorno.lote.numeros == ["CERT-2026-00005", "CERT-2026-00006"]
+        assert entorno.lote.estado != "COMPLETADO"
+        entorno.session.rollback.assert_awaited_once()
+
+    async def test_lote_completado_no_se_repite(self, entorno):
+        entorno.lote.estado = "COMPLETADO"
+        with patch.object(lotes, "_reclamar", AsyncMock(return_value=False)):
+            await lotes.procesar_lote(lambda: entorno.session, entorno.lote.id)
+        entorno.preparar.assert_not_awaited()
@@ -0,0 +1,128 @@
+"""Tests del cálculo de saldos del cierre sobre las instantáneas mensuales."""
+from datetime import date
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.modules.economico.services.cierre_service import (
+    MAPA_BALANCE,
+    CierreEjercicioService,
+)
+
+SALDOS = {
+    "5720001": Decimal("1500.00"), "5720002": Decimal("-20.00"), "1000000": Decimal("-900.00"),
+    "4300001": Decimal("80.50"), "7210001": Decimal("-1200.00"), "6290001": Decimal("300.00"),
+    "6500001": Decimal("150.00"), "6300001": Decimal("25.00"), "7690001": Decimal("-3.10"),
+    "9990001": Decimal("7.00"), "": Decimal("1.00"),
+}
+
+
+def _session(filas=()):
+    sentencias = []
+
+    async def execute(stmt):
+        sentencias.append(stmt)
+        return MagicMock(all=MagicMock(return_value=list(filas)))
+
+    session = MagicMock()
+    session.execute = execute
+    session.sentencias = sentencias
+    return session
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(compile_kwargs={"literal_binds": True}))
+
+
+class TestMapeoSecciones:
+    async def test_balance_igual_que_recorrer_prefijos(self):
+        service = CierreEjercicioService(_session())
+        with patch.object(service, "calcular_saldos_cuentas", AsyncMock(return_value=SALDOS)):
+            balance = await service.calcular_balance_pcesfl(2026)
+        for seccion, subsecciones in MAPA_BALANCE.items():
+            signo = 1 if seccion.startswith("activo") else -1
+            for subseccion, prefijos in subsecciones.items():
+                esperado = sum((signo * s for c, s in SALDOS.items() if c[:3] in prefijos), Decimal("0"))
+                assert balance[seccion][subseccion] == esperado
+        assert balance["totales"]["total_activo"] == Decimal("1560.50")
+
+    async def test_resultados_con_prefijos_en_varias_secciones(self):
+        service = CierreEjercicioService(_session())
+        with patch.object(service, "calcular_saldos_cuentas", AsyncMock(return_value=SALDOS)):
+            res = await service.calcular_cuenta_resultados(2026)
+        assert res["ingresos_actividad_propia"] == Decimal("1200.00")
+        # 650 es gasto de la actividad propia; 630 solo impuesto.
+        assert res["gastos_actividad_propia"] == Decimal("450.00")
+        assert res["impuesto_sobre_beneficios"] == Decimal("25.00")
+        assert res["ingresos_financieros"] == Decimal("3.10")
+        assert res["excedente_ejercicio"] == Decimal("728.10")
+
+
+class TestCalcularSaldosCuentas:
+    @pytest.mark.parametrize("fecha_fin, con_apuntes, corte", [
+        (None, False, None),
+        (date(2026, 3, 31), False, "2026-04-01"),
+        (date(2026, 2, 28), False, "2026-03-01"),
+        (date(2026, 3, 15), True, "2026-03-01"),
+    ])
+    async def test_meses_completos_desde_instantaneas(self, fecha_fin, con_apuntes, corte):
+        fila = MagicMock(codigo="5720001", debe=Decimal("100"), haber=Decimal("40"))
+        session = _session([fila])
+        saldos = await CierreEjercicioService(session).calcular_saldos_cuentas(2026, fecha_fin)
+
+        assert saldos == {"5720001": Decimal("60")}
+        [stmt] = session.sentencias
+        sql = _sql(stmt)
+        assert "saldos_mensuales_cuentas" in sql
+        assert ("apuntes_contables" in sql) is con_apuntes
+        if corte:
+            assert f"saldos_mensuales_cuentas.periodo < '{corte}'" in sql
+
+    async def test_con_borradores_agrega_apuntes(self):
+        session = _session()
+        await CierreEjercicioService(session).calcular_saldos_cuentas(2026, incluir_borradores=True)
+        sql = _sql(session.sentencias[0])
+        assert "saldos_mensuales_cuentas" not in sql and "apuntes_contables" in sql
+        assert "CONFIRMADO" not in sql
+
+
+class TestRecalcularSaldosMensuales:
+    async def test_reconstruye_el_ejercicio_desde_apuntes(self):
+        session = _session()
+        session.execute = AsyncMock(side_effect=[MagicMock(), MagicMock(rowcount=7)])
+        session.commit = AsyncMock()
+        assert await CierreEjercicioService(session).recalcular_saldos_mensuales(2026) == 7
+
+        borrado, insercion = (_sql(c.args[0]) for c in session.execute.await_args_list)
+        assert borrado.startswith("DELETE FROM saldos_mensuales_cuentas")
+        assert "saldos_mensuales_cuentas.ejercicio = 2026" in borrado
+        assert insercion.startswith("INSERT INTO saldos_mensuales_cuentas")
+        assert "apuntes_contables" in insercion and "CONFIRMADO" in insercion
+        session.commit.assert_awaited_once()
+
+
+class TestTriggerBorradoAsiento:
+    """La migración sal2bor3asi4 resta el asiento confirmado antes de la cascada."""
+
+    def test_resta_antes_de_borrar_y_reconstruye(self):
+        import importlib.util
+        from pathlib import Path
+
+        ruta = Path(__file__).parents[2] / "alembic/versions/sal2bor3asi4_saldos_mensuales_borrado_asiento.py"
+        spec = importlib.util.spec_from_file_location("sal2bor3asi4", ruta)
+        migracion = importlib.util.module_from_spec(spec)
+        op = MagicMock()
+        with patch.dict("sys.modules", {"alembic": MagicMock(op=op)}):
+            spec.loader.exec_module(migracion)
+            migracion.upgrade()
+
+        sql = [" ".join(str(c.args[0]).split()) for c in op.execute.call_args_list]
+        funcion, trigger, vaciar, backfill = sql
+        assert "WHERE asiento_id = OLD.id" in funcion and "-ap.debe, -ap.haber" in funcion
+        assert "RETURN OLD" in funcion
+        assert "BEFORE DELETE ON asientos_contables" in trigger
+        assert "WHEN (OLD.estado::text = 'CONFIRMADO')" in trigger
+        assert vaciar == "DELETE FROM saldos_mensuales_cuentas"
+        assert backfill.startswith("INSERT INTO saldos_mensuales_cuentas")
+        assert migracion.down_revision == "lcd1cer2zip3"
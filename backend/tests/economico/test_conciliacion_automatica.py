@@ -0,0 +1,103 @@
+"""Tests del motor de conciliación automática extracto ↔ apuntes."""
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from sqlalchemy.sql.dml import Insert, Update
+
+from app.modules.economico.services.conciliacion_automatica import (
+    CONCEPTO,
+    IMPORTE,
+    REFERENCIA,
+    Movimiento,
+    MotorConciliacion,
+    normalizar,
+)
+from app.modules.economico.models.tesoreria import TipoApunte
+from app.modules.economico.services.tesoreria_service import TesoreriaService
+
+CUENTA = uuid4()
+
+
+def _mov(dia, importe, concepto="", referencia="", cuenta=CUENTA):
+    return Movimiento(
+        uuid4(), cuenta, date(2026, 3, dia), Decimal(importe), normalizar(concepto), normalizar(referencia),
+    )
+
+
+class TestMotorConciliacion:
+    def test_referencia_se_aplica_sola(self):
+        apunte = _mov(5, "150.00", "Liquidación remesa REM-2026-001", "REM-2026-001")
+        extracto = _mov(7, "150.00", "ABONO REMESA REM-2026-001")
+        [par] = MotorConciliacion([apunte]).emparejar([extracto])
+        assert (par.apunte, par.criterio, par.automatico) == (apunte, REFERENCIA, True)
+
+    def test_fuera_de_ventana_o_de_signo_no_empareja(self):
+        apuntes = [_mov(1, "40.00"), _mov(10, "-40.00"), _mov(10, "40.00", cuenta=uuid4())]
+        assert MotorConciliacion(apuntes, tolerancia_dias=3).emparejar([_mov(10, "40.00")]) == []
+
+    def test_concepto_elige_el_mas_parecido(self):
+        luz = _mov(3, "-62.10", "Recibo luz Iberdrola marzo")
+        agua = _mov(3, "-62.10", "Canal de Isabel II agua")
+        [par] = MotorConciliacion([agua, luz]).emparejar([_mov(4, "-62.10", "RECIBO IBERDROLA LUZ MARZO")])
+        assert (par.apunte, par.criterio, par.automatico) == (luz, CONCEPTO, True)
+
+    def test_solo_importe_ambiguo_queda_como_propuesta(self):
+        apuntes = [_mov(5, "30.00", "Cuota Ana"), _mov(5, "30.00", "Cuota Luis")]
+        pares = MotorConciliacion(apuntes).emparejar([_mov(5, "30.00", "TRANSF"), _mov(6, "30.00", "TRANSF")])
+        assert len(pares) == 2
+        assert {p.apunte.id for p in pares} == {a.id for a in apuntes}
+        assert all(p.criterio == IMPORTE and not p.automatico for p in pares)
+
+    def test_solo_importe_unico_y_mismo_dia(self):
+        apunte = _mov(5, "12.34", "Comisión")
+        [par] = MotorConciliacion([apunte]).emparejar([_mov(5, "12.34", "XX")])
+        assert par.automatico
+        [par] = MotorConciliacion([apunte]).emparejar([_mov(6, "12.34", "XX")])
+        assert not par.automatico
+
+
+class _Filas:
+    def __init__(self, filas):
+        self._filas = filas
+
+    def all(self):
+        return self._filas
+
+
+class TestConciliarAutomaticamente:
+    async def test_aplica_por_conjuntos(self):
+        n = 200
+        extractos = [
+            SimpleNamespace(id=uuid4(), cuenta_bancaria_id=CUENTA, fecha=date(2026, 3, 5),
+                            importe=Decimal("30.00"), concepto="Abono", referencia=f"REF{i:04d}")
+            for i in range(n)
+        ]
+        apuntes = [
+            SimpleNamespace(id=uuid4(), cuenta_bancaria_id=CUENTA, fecha=date(2026, 3, 4),
+                            tipo=TipoApunte.INGRESO, importe=Decimal("30.00"),
+                            concepto="Cuota", referencia_externa=f"REF{i:04d}")
+            for i in range(n)
+        ]
+        respuestas = iter([_Filas(extractos), _Filas(apuntes)])
+        sentencias = []
+
+        async def execute(stmt):
+            sentencias.append(stmt)
+            return next(respuestas, None)
+
+        session = MagicMock()
+        session.execute = execute
+        session.commit = AsyncMock()
+
+        res = await TesoreriaService(session).conciliar_automaticamente(CUENTA)
+
+        assert len(res["aplicadas"]) == n and res["propuestas"] == []
+        assert all(p["criterio"] == REFERENCIA for p in res["aplicadas"])
+        assert {(p["extracto_id"], p["apunte_id"]) for p in res["aplicadas"]} == {
+            (e.id, a.id) for e, a in zip(extractos, apuntes)
+        }
+        assert [type(s) for s in sentencias[2:]] == [Insert, Update, Update]
+        session.commit.assert_awaited_once()
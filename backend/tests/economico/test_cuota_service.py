@@ -0,0 +1,78 @@
+"""Tests de la generación por conjuntos de las cuotas anuales."""
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.sql.dml import Insert
+
+from app.modules.economico.models.cuotas import MotivoReduccionCuota
+from app.modules.economico.services.cuota_service import CuotaService
+
+JOVEN = MotivoReduccionCuota(id=uuid4(), codigo="JOVEN", nombre="Joven", porcentaje_reduccion=Decimal("50"))
+HONOR = MotivoReduccionCuota(id=uuid4(), codigo="HONOR", nombre="Honor", porcentaje_reduccion=Decimal("100"))
+
+
+def _fila(existente=False, motivo_socio=None, motivo_tipo=None, incremento=None):
+    return SimpleNamespace(
+        id=uuid4(), existente=existente, agrupacion_id=uuid4(),
+        motivo_socio_id=motivo_socio, motivo_tipo_id=motivo_tipo, incremento_cuota=incremento,
+    )
+
+
+def _session(lotes):
+    respuestas = iter([
+        MagicMock(scalars=lambda: MagicMock(first=lambda: SimpleNamespace(id=uuid4()))),  # Pendiente
+        MagicMock(scalars=lambda: MagicMock(all=lambda: [JOVEN, HONOR])),  # motivos
+        *[MagicMock(all=MagicMock(return_value=lote)) for lote in lotes],
+        MagicMock(all=MagicMock(return_value=[])),
+    ])
+    sentencias = []
+
+    async def execute(stmt):
+        sentencias.append(stmt)
+        return None if isinstance(stmt, Insert) else next(respuestas)
+
+    session = MagicMock()
+    session.execute = execute
+    session.commit = AsyncMock()
+    session.sentencias = sentencias
+    return session
+
+
+FILAS = [
+    _fila(),                                           # base: 40
+    _fila(existente=True),                             # ya tiene cuota
+    _fila(motivo_tipo=JOVEN.id),                       # tipo joven: 20
+    _fila(motivo_socio=HONOR.id, motivo_tipo=JOVEN.id),  # el del socio prevalece: excluido
+    _fila(motivo_socio=JOVEN.id, incremento=Decimal("5")),  # 20 + 5
+]
+
+
+class TestGenerarCuotasIndividuales:
+    @pytest.mark.parametrize("simular", [False, True])
+    async def test_reglas_y_totales(self, simular):
+        session = _session([FILAS[:3], FILAS[3:]])
+        service = CuotaService(session)
+        service.obtener_configuracion = AsyncMock(
+            return_value=SimpleNamespace(id=uuid4(), importe=Decimal("40.00"))
+        )
+
+        r = await service.generar_cuotas_individuales(2026, simular=simular)
+
+        assert r == {
+            "ejercicio": 2026, "n_creadas": 3, "n_omitidas_existentes": 1,
+            "n_omitidas_excluidas": 1, "total_importe": 85.0,
+        }
+        inserts = [s for s in session.sentencias if isinstance(s, Insert)]
+        if simular:
+            assert inserts == []
+            session.commit.assert_not_awaited()
+            return
+        # Un INSERT multi-fila por lote con cuotas nuevas, un solo commit.
+        assert len(inserts) == 2
+        filas = [p for s in inserts for p in s.compile().params.items()]
+        importes = sorted(v for k, v in filas if k.startswith("importe_m") or k == "importe")
+        assert importes == [Decimal("20.00"), Decimal("25.00"), Decimal("40.00")]
+        session.commit.assert_awaited_once()
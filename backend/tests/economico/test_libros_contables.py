@@ -0,0 +1,115 @@
+"""Tests de la generación en streaming del Libro Diario y del Libro Mayor."""
+import io
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+from openpyxl import load_workbook
+
+from app.modules.economico.services.pdf.libro_diario import (
+    csv_en_trozos,
+    escribir_xlsx,
+    filas_libro_diario,
+    filas_libro_mayor,
+    generar_libro_diario_csv,
+)
+
+
+class _Stream:
+    def __init__(self, filas):
+        self._filas = filas
+
+    def __aiter__(self):
+        return self._gen()
+
+    async def _gen(self):
+        for fila in self._filas:
+            yield fila
+
+
+def _session(filas):
+    session = MagicMock()
+    consultas = []
+
+    async def stream(consulta):
+        consultas.append(consulta)
+        return _Stream(filas)
+
+    session.stream = stream
+    session.consultas = consultas
+    return session
+
+
+def _apunte(asiento, numero, dia, codigo, debe="0", haber="0", cuenta=None):
+    return SimpleNamespace(
+        asiento_id=asiento, numero_asiento=numero, fecha=date(2026, 3, dia), glosa=f"Asiento {numero}",
+        cuenta_id=cuenta, codigo=codigo, nombre=f"Cuenta {codigo}" if codigo else None,
+        concepto="", debe=Decimal(debe), haber=Decimal(haber),
+    )
+
+
+A1, A2 = uuid4(), uuid4()
+DIARIO = [
+    _apunte(A1, 1, 2, "572", debe="100.50"),
+    _apunte(A1, 1, 2, "720", haber="100.50"),
+    _apunte(A2, 2, 5, "629", debe="20"),
+    _apunte(A2, 2, 5, None, haber="20"),
+]
+
+
+class TestLibroDiario:
+    async def test_formato_csv(self):
+        session = _session(DIARIO)
+        contenido = await generar_libro_diario_csv(session, 2026, "Asociación")
+        lineas = contenido.decode("utf-8").lstrip("﻿").splitlines()
+        assert lineas == [
+            "Asociación - Libro Diario Ejercicio 2026",
+            "",
+            "Nº Asiento;Fecha;Glosa;Cuenta;Nombre cuenta;Concepto;Debe;Haber",
+            "1;02/03/2026;Asiento 1;572;Cuenta 572;;100,50;",
+            ";;;720;Cuenta 720;;;100,50",
+            "",
+            "2;05/03/2026;Asiento 2;629;Cuenta 629;;20,00;",
+            ";;;???;;;;20,00",
+            "",
+            "",
+            ";;TOTAL EJERCICIO;;;;120,50;120,50",
+        ]
+        # Una sola consulta, leída con cursor de servidor por lotes.
+        [consulta] = session.consultas
+        assert consulta.get_execution_options()["yield_per"] > 0
+
+    async def test_csv_en_trozos(self):
+        filas = [_apunte(A1, 1, 2, "572", debe="1")] * 500
+        trozos = [t async for t in csv_en_trozos(filas_libro_diario(_session(filas), 2026), 1024)]
+        assert len(trozos) > 5
+        assert all(len(t) < 1024 + 200 for t in trozos)
+        assert b"".join(trozos).startswith("﻿".encode("utf-8"))
+
+
+class TestLibroMayor:
+    async def test_saldo_acumulado_y_subtotales(self):
+        caja, ingresos = uuid4(), uuid4()
+        filas = [
+            _apunte(A1, 1, 2, "572", debe="100", cuenta=caja),
+            _apunte(A2, 2, 5, "572", haber="30", cuenta=caja),
+            _apunte(A1, 1, 2, "720", haber="100", cuenta=ingresos),
+        ]
+        resultado = [f async for f in filas_libro_mayor(_session(filas), 2026)]
+        cuerpo = resultado[3:]
+        assert cuerpo[0] == ["572", "Cuenta 572"]
+        assert [f[7] for f in cuerpo[1:3]] == [Decimal("100"), Decimal("70")]
+        assert cuerpo[3][4:] == ["Total cuenta", Decimal("100"), Decimal("30"), Decimal("70")]
+        assert cuerpo[5] == ["720", "Cuenta 720"]
+        assert cuerpo[6][7] == Decimal("-100")
+        assert resultado[-1][4:] == ["TOTAL EJERCICIO", Decimal("100"), Decimal("130"), Decimal("-30")]
+
+    async def test_xlsx_valores_nativos(self):
+        destino = io.BytesIO()
+        n = await escribir_xlsx(filas_libro_diario(_session(DIARIO), 2026), destino, "Libro Diario", lote=2)
+        assert n == 11
+        ws = load_workbook(destino).active
+        assert ws["G4"].value == 100.5
+        assert ws["B4"].value.date() == date(2026, 3, 2)
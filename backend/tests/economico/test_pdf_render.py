@@ -0,0 +1,138 @@
+"""Tests del renderizado de PDFs en lote y del ZIP en streaming."""
+import io
+import zipfile
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.modules.economico.services.donacion_service import DonacionService
+from app.modules.economico.services.pdf import render
+from app.modules.economico.services.pdf.certificado_donacion import generar_pdf_certificado
+
+ARGS_CERTIFICADO = (
+    "CERT-2026-00001", 2026, "Asociación", "G00000000", "12345678Z", "Ana Pérez",
+    "DINERARIA", Decimal("50.00"), [(date(2026, 3, 1), "TRANSFERENCIA", Decimal("50.00"))],
+)
+
+
+def _eco(texto: str) -> bytes:
+    return texto.encode()
+
+
+@pytest.fixture
+def procesos():
+    def _configurar(n):
+        return patch.object(render, "get_settings", return_value=SimpleNamespace(pdf_workers=n))
+    yield _configurar
+    render.cerrar_pool()
+
+
+class TestZipEnFlujo:
+    async def test_lote_en_orden_y_en_trozos(self, procesos):
+        trabajos = [(f"doc-{i:03d}.pdf", (f"contenido {i}",)) for i in range(25)]
+        with procesos(0):
+            trozos = [t async for t in render.zip_en_flujo(render.renderizar_lote(_eco, trabajos))]
+
+        assert len(trozos) > 1
+        with zipfile.ZipFile(io.BytesIO(b"".join(trozos))) as zf:
+            assert zf.namelist() == [n for n, _ in trabajos]
+            assert zf.read("doc-007.pdf") == b"contenido 7"
+
+    async def test_pool_de_procesos(self, procesos):
+        with procesos(2):
+            pdf = await render.renderizar(generar_pdf_certificado, *ARGS_CERTIFICADO)
+        assert pdf.startswith(b"%PDF")
+
+
+class TestPrepararCertificados:
+    def _servicio(self, donaciones, contador=4):
+        resultados = iter([
+            MagicMock(scalars=lambda: MagicMock(all=lambda: donaciones)),
+            MagicMock(scalar=lambda: contador),
+        ])
+        session = MagicMock()
+        session.execute = AsyncMock(side_effect=lambda *_: next(resultados))
+        session.commit = AsyncMock()
+        service = DonacionService(session)
+        service._estado = AsyncMock(return_value=SimpleNamespace(id=1))
+        return service, session
+
+    def _donaciones(self):
+        ana = SimpleNamespace(numero_documento="12345678z", nombre_completo="Ana")
+        luis = SimpleNamespace(numero_documento="87654321X", nombre_completo="Luis")
+
+        def _don(contacto, tipo="DINERARIA", importe="10", numero=None):
+            return SimpleNamespace(
+                contacto=contacto, tipo=tipo, importe=Decimal(importe), valoracion=Decimal("99"),
+                fecha=date(2026, 5, 1), modo_ingreso="BIZUM", certificado_emitido=numero is not None,
+                numero_certificado=numero,
+            )
+
+        return [
+            _don(ana), _don(ana, importe="15"), _don(ana, tipo="ESPECIE"),
+            _don(luis, numero="CERT-2026-00001"),
+            _don(SimpleNamespace(numero_documento=None, nombre_completo="X")),
+        ]
+
+    async def test_numera_por_donante_y_tipo(self):
+        donaciones = self._donaciones()
+        service, session = self._servicio(donaciones)
+
+        trabajos = await service.preparar_certificados_ejercicio(2026, "Asociación", "G0")
+
+        assert [nombre for nombre, _ in trabajos] == [
+            "CERT-2026-00005_12345678Z.pdf", "CERT-2026-00006_12345678Z.pdf",
+        ]
+        dineraria = trabajos[0][1]
+        assert dineraria[6:8] == ("DINERARIA", Decimal("25"))
+        assert trabajos[1][1][7] == Decimal("99")
+        assert donaciones[0].numero_certificado == "CERT-2026-00005"
+        assert donaciones[1].certificado_emitido and donaciones[1].numero_certificado is None
+        assert not donaciones[4].certificado_emitido
+        # Confirma quien llama (el lote, junto con sus números).
+        session.commit.assert_not_awaited()
+
+    async def test_los_ya_emitidos_conservan_su_numero(self):
+        donaciones = self._donaciones()
+        service, _ = self._servicio(donaciones)
+
+        trabajos = await service.preparar_certificados_ejercicio(
+            2026, "Asociación", "G0", solo_pendientes=False,
+        )
+        assert [nombre for nombre, _ in trabajos] == [
+            "CERT-2026-00005_12345678Z.pdf", "CERT-2026-00006_12345678Z.pdf",
+            "CERT-2026-00001_87654321X.pdf",
+        ]
+        assert donaciones[3].numero_certificado == "CERT-2026-00001"
+
+    async def test_regenerar_por_numeros_no_numera(self):
+        donaciones = self._donaciones()
+        donaciones[0].certificado_emitido = donaciones[1].certificado_emitido = True
+        donaciones[0].numero_certificado = "CERT-2026-00005"
+        service, session = self._servicio(donaciones)
+
+        trabajos = await service.preparar_certificados_ejercicio(
+            2026, "Asociación", "G0", numeros=["CERT-2026-00005", "CERT-2026-00001"],
+        )
+        assert [nombre for nombre, _ in trabajos] == [
+            "CERT-2026-00005_12345678Z.pdf", "CERT-2026-00001_87654321X.pdf",
+        ]
+        assert session.execute.await_count == 1  # sin contar números: no se numera
+        assert not donaciones[2].certificado_emitido
+
+    async def test_regenerar_ignora_donaciones_posteriores_del_grupo(self):
+        donaciones = self._donaciones()
+        donaciones[0].certificado_emitido = True
+        donaciones[0].numero_certificado = "CERT-2026-00005"
+        # donaciones[1]: misma donante y tipo, cobrada tras numerar el lote.
+        service, _ = self._servicio(donaciones)
+
+        trabajos = await service.preparar_certificados_ejercicio(
+            2026, "Asociación", "G0", numeros=["CERT-2026-00005"],
+        )
+        assert [nombre for nombre, _ in trabajos] == ["CERT-2026-00005_12345678Z.pdf"]
+        assert trabajos[0][1][7] == Decimal("10")  # solo lo que ya cubría
+        assert not donaciones[1].certificado_emitido
@@ -0,0 +1,123 @@
+"""Tests de generación y liquidación de remesas por conjuntos."""
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.sql.dml import Insert, Update
+
+from app.modules.economico.models.recibos import Recibo
+from app.modules.economico.services.remesa_service import RemesaService
+
+
+class _Resultado:
+    def __init__(self, valores):
+        self._valores = valores
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._valores
+
+    def first(self):
+        return self._valores[0] if self._valores else None
+
+    def scalar_one(self):
+        return 0
+
+
+@pytest.fixture
+def sentencias():
+    return []
+
+
+@pytest.fixture
+def mock_session(sentencias):
+    async def execute(stmt, *args, **kwargs):
+        sentencias.append(stmt)
+        if isinstance(stmt, Update) and stmt._returning:
+            return _Resultado([Decimal("30.00")])
+        return _Resultado([SimpleNamespace(
+            id=uuid4(), referencia="REM-2026-001", agrupacion_id=None, nombre="Procesada",
+        )])
+
+    session = MagicMock()
+    session.execute = execute
+    session.flush = AsyncMock()
+    session.commit = AsyncMock()
+    session.refresh = AsyncMock()
+    return session
+
+
+@pytest.fixture
+def service(mock_session):
+    svc = RemesaService(mock_session)
+    estado = AsyncMock(return_value=SimpleNamespace(id=uuid4(), nombre="Procesada"))
+    svc._estado_remesa = svc._estado_orden_cobro = svc._estado_cuota = estado
+    return svc
+
+
+def _recibos(n):
+    return [
+        Recibo(
+            id=uuid4(), cuota_id=uuid4(), vinculacion_socio_id=uuid4(),
+            importe=Decimal("30.00"), importe_pagado=Decimal("0.00"),
+        )
+        for _ in range(n)
+    ]
+
+
+class TestGenerarRemesa:
+    @pytest.mark.parametrize("n", [1, 250])
+    async def test_sentencias_no_dependen_de_las_ordenes(self, service, mock_session, sentencias, n):
+        recibos = _recibos(n)
+        service._buscar_ordinaria_activa = AsyncMock(return_value=None)
+        service._siguiente_referencia_remesa = AsyncMock(return_value="REM-2026-001")
+        service._recibos_sepa_emitidos_para_remesa = AsyncMock(return_value=(recibos, []))
+
+        remesa = await service.generar_remesa(2026, date.today() + timedelta(days=10))
+
+        inserts = [s for s in sentencias if isinstance(s, Insert)]
+        updates = [s for s in sentencias if isinstance(s, Update)]
+        assert len(inserts) == 1 and len(updates) == 1
+        assert mock_session.flush.await_count == 1  # solo la remesa
+        assert remesa.num_ordenes == n
+        assert all(r.orden_cobro_id is not None for r in recibos)
+        assert len({r.orden_cobro_id for r in recibos}) == n
+
+
+class TestLiquidarRemesa:
+    async def _liquidar(self, service, cobradas, fallidas):
+        with patch(
+            "app.modules.economico.services.registro_contable.RegistroContable"
+            ".generar_asiento_para_apunte",
+            AsyncMock(return_value=None),
+        ):
+            return await service.liquidar_remesa(
+                uuid4(), date(2026, 3, 1), uuid4(), cobradas=cobradas, fallidas=fallidas,
+            )
+
+    async def test_sentencias_no_dependen_de_las_ordenes(self, service, sentencias):
+        await self._liquidar(service, [uuid4()], [])
+        pocas = len(sentencias)
+        sentencias.clear()
+        await self._liquidar(
+            service,
+            [uuid4() for _ in range(300)],
+            [{"orden_id": uuid4(), "codigo": "AM04"} for _ in range(40)],
+        )
+        assert len(sentencias) == pocas
+
+    async def test_fallida_prevalece_sobre_cobrada(self, service, sentencias):
+        orden_id = uuid4()
+        await self._liquidar(
+            service, [orden_id], [{"orden_id": str(orden_id), "codigo": "MS03", "motivo": "Sin motivo"}],
+        )
+        carga = next(s for s in sentencias if isinstance(s, Insert))
+        filas = carga._multi_values[0]
+        assert len(filas) == 1
+        assert filas[0]["cobrada"] is False
+        assert filas[0]["nota"] == "FALLIDO [MS03]: Sin motivo"
@@ -0,0 +1,136 @@
+"""Tests del escritor incremental pain.008 y de su uso desde RemesaService."""
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+from xml.etree import ElementTree as ET
+
+import pytest
+
+from app.modules.economico.services.remesa_service import RemesaService
+from app.modules.economico.services.sepa_pain008 import (
+    NAMESPACE,
+    Acreedor,
+    Adeudo,
+    BloquePago,
+    DocumentoPain008,
+    EscritorPain008,
+)
+
+NS = {"p": NAMESPACE}
+ACREEDOR = Acreedor("Asociación & Cía", "ES76 2077 0024 0031 0257 5766", "CAHMESMMXXX", "ES00ZZZ00000000")
+
+
+def _documento(*tamanos):
+    bloques = tuple(
+        BloquePago(f"REM-2026-001-{i:03d}", "RCUR", date(2026, 3, 5), n, Decimal("30.00") * n)
+        for i, n in enumerate(tamanos, start=1)
+    )
+    return DocumentoPain008(uuid4(), "REM-2026-001", ACREEDOR, bloques, concepto="Cuota 2026")
+
+
+def _adeudo(nseq, **kw):
+    return Adeudo(
+        end_to_end_id=f"REM-2026-001-{nseq:03d}", importe=Decimal("30.00"),
+        referencia_mandato=f"MAND-{nseq}", concepto="Cuota 2026", **kw,
+    )
+
+
+class TestEscritorPain008:
+    def test_documento_valido_con_varios_bloques(self):
+        doc = _documento(2, 1)
+        xml = EscritorPain008(tamano_trozo=1)
+        trozos = []
+        xml.abrir(doc)
+        nseq = 0
+        for bloque in doc.bloques:
+            xml.abrir_bloque(bloque)
+            for _ in range(bloque.num_adeudos):
+                nseq += 1
+                xml.adeudo(_adeudo(nseq, iban="ES91 2100 0418 4502 0005 1332", nombre_deudor="Ana <Pérez>"))
+                trozos.append(xml.vaciar())
+            xml.cerrar_bloque()
+        xml.cerrar()
+        trozos.append(xml.vaciar(forzar=True))
+
+        assert all(trozos)  # con trozo de 1 byte, cada paso entrega algo
+        raiz = ET.fromstring(b"".join(trozos))
+        cabecera = raiz.find("p:CstmrDrctDbtInitn/p:GrpHdr", NS)
+        assert cabecera.find("p:NbOfTxs", NS).text == "3"
+        assert cabecera.find("p:CtrlSum", NS).text == "90.00"
+        assert cabecera.find("p:InitgPty/p:Nm", NS).text == "Asociación & Cía"
+        bloques = raiz.findall("p:CstmrDrctDbtInitn/p:PmtInf", NS)
+        assert [len(b.findall("p:DrctDbtTxInf", NS)) for b in bloques] == [2, 1]
+        assert bloques[1].find("p:NbOfTxs", NS).text == "1"
+        tx = bloques[0].find("p:DrctDbtTxInf", NS)
+        assert tx.find("p:Dbtr/p:Nm", NS).text == "Ana <Pérez>"
+        assert tx.find("p:DbtrAcct/p:Id/p:IBAN", NS).text == "ES9121000418450200051332"
+
+    def test_acumula_hasta_el_tamano_del_trozo(self):
+        xml = EscritorPain008()
+        xml.abrir(_documento(1))
+        assert xml.vaciar() == b""
+        assert xml.vaciar(forzar=True).startswith(b'<?xml version="1.0" encoding="UTF-8"?>')
+
+
+class _Stream:
+    def __init__(self, filas):
+        self._filas = filas
+
+    def __aiter__(self):
+        return self._gen()
+
+    async def _gen(self):
+        for fila in self._filas:
+            yield fila
+
+
+class TestEscribirXmlSepa:
+    async def test_reparte_las_filas_en_los_bloques(self):
+        filas = [
+            SimpleNamespace(
+                id=uuid4(), nseq=n, importe=Decimal("30.00"), referencia_mandato=None,
+                iban="ES9121000418450200051332", referencia="REM-2026-001", ejercicio=2026,
+                tipo="PERSONA_FISICA", nombre="Ana", apellido1="Pérez", apellido2=None,
+                razon_social=None,
+            )
+            for n in range(1, 4)
+        ]
+        session = MagicMock()
+
+        async def stream(q):
+            return _Stream(filas)
+
+        session.stream = stream
+        doc = _documento(2, 1)
+        contenido = b"".join([t async for t in RemesaService(session).escribir_xml_sepa(doc)])
+
+        raiz = ET.fromstring(contenido)
+        bloques = raiz.findall("p:CstmrDrctDbtInitn/p:PmtInf", NS)
+        ids = [
+            [e.text for e in b.findall("p:DrctDbtTxInf/p:PmtId/p:EndToEndId", NS)] for b in bloques
+        ]
+        assert ids == [["REM-2026-001-001", "REM-2026-001-002"], ["REM-2026-001-003"]]
+        assert raiz.find(".//p:Dbtr/p:Nm", NS).text == "Ana Pérez"
+
+    @pytest.mark.parametrize("num_filas", [2, 4])
+    async def test_ordenes_que_no_cuadran_con_los_bloques_fallan_claro(self, num_filas):
+        filas = [
+            SimpleNamespace(
+                id=uuid4(), nseq=n, importe=Decimal("30.00"), referencia_mandato=None,
+                iban="ES9121000418450200051332", referencia="REM-2026-001", ejercicio=2026,
+                tipo="PERSONA_FISICA", nombre="Ana", apellido1="Pérez", apellido2=None,
+                razon_social=None,
+            )
+            for n in range(1, num_filas + 1)
+        ]
+        session = MagicMock()
+
+        async def stream(q):
+            return _Stream(filas)
+
+        session.stream = stream
+        # Bloques calculados con 3 órdenes; entre tanto se borró o añadió una.
+        with pytest.raises(ValueError, match="han cambiado"):
+            _ = [t async for t in RemesaService(session).escribir_xml_sepa(_documento(2, 1))]
@@ -0,0 +1,142 @@
+"""Tests de la lectura incremental de pain.002/camt.054 y del emparejamiento."""
+from datetime import date
+from decimal import Decimal
+from io import BytesIO
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+from app.modules.economico.services import sepa_parsers
+from app.modules.economico.services.remesa_service import RemesaService
+from app.modules.economico.services.sepa_parsers import (
+    iterar_pain002,
+    parse_camt054,
+    parse_pain002,
+)
+
+
+def _pain002(*txs):
+    cuerpo = "".join(
+        f"<TxInfAndSts><OrgnlEndToEndId>{eei}</OrgnlEndToEndId><TxSts>{sts}</TxSts>"
+        + (f"<StsRsnInf><Rsn><Cd>{cd}</Cd></Rsn></StsRsnInf>" if cd else "")
+        + "</TxInfAndSts>"
+        for eei, sts, cd in txs
+    )
+    return (
+        '<Document xmlns="urn:iso:std:iso:20022:tech:xsd:pain.002.001.03"><CstmrPmtStsRpt>'
+        "<GrpHdr><MsgId>X</MsgId><CreDtTm>2026-03-06T10:00:00</CreDtTm></GrpHdr>"
+        "<OrgnlGrpInfAndSts><OrgnlMsgId>REM-2026-001</OrgnlMsgId></OrgnlGrpInfAndSts>"
+        f"<OrgnlPmtInfAndSts>{cuerpo}</OrgnlPmtInfAndSts>"
+        "</CstmrPmtStsRpt></Document>"
+    ).encode()
+
+
+def _camt054(*cargos):
+    detalle = "".join(
+        f"<TxDtls><Refs><EndToEndId>{eei}</EndToEndId></Refs>"
+        f'<Amt Ccy="EUR">{importe}</Amt></TxDtls>'
+        for eei, importe in cargos
+    )
+    return (
+        '<Document xmlns="urn:iso:std:iso:20022:tech:xsd:camt.054.001.02">'
+        "<BkToCstmrDbtCdtNtfctn><Ntfctn><Ntry>"
+        '<Amt Ccy="EUR">60.00</Amt><ValDt><Dt>2026-03-07</Dt></ValDt>'
+        f"<NtryDtls>{detalle}</NtryDtls>"
+        "</Ntry></Ntfctn></BkToCstmrDbtCdtNtfctn></Document>"
+    ).encode()
+
+
+class TestParsers:
+    def test_pain002(self):
+        res = parse_pain002(_pain002(("REM-2026-001-001", "ACSC", None), ("REM-2026-001-002", "RJCT", "AM04")))
+        assert res.msg_id_original == "REM-2026-001"
+        assert res.fecha_creacion == date(2026, 3, 6)
+        assert [l.end_to_end_id for l in res.rechazadas] == ["REM-2026-001-002"]
+        assert res.rechazadas[0].codigo_rechazo == "AM04"
+
+    def test_camt054_lee_importe_de_hoja(self):
+        res = parse_camt054(BytesIO(_camt054(("REM-2026-001-001", "30.00"), ("REM-2026-001-002", "30.00"))))
+        assert res.importe_bruto == Decimal("60.00")
+        assert [c.importe for c in res.cargos] == [Decimal("30.00")] * 2
+        assert all(c.fecha_valor == date(2026, 3, 7) for c in res.cargos)
+
+    def test_no_retiene_las_transacciones_leidas(self, monkeypatch):
+        xml = _pain002(*((f"REM-2026-001-{n:03d}", "RJCT", "AM04") for n in range(1, 3001)))
+        hijos = []
+        original = sepa_parsers._iterar
+
+        def espiar(fuente, etiquetas):
+            for elem, pila in original(fuente, etiquetas):
+                hijos.append(len(pila[-1]))
+                yield elem, pila
+
+        monkeypatch.setattr(sepa_parsers, "_iterar", espiar)
+        assert sum(1 for _ in iterar_pain002(xml)) == 3000
+        # El padre solo conserva lo leído por adelantado (un bloque del parser),
+        # no las transacciones ya entregadas.
+        assert max(hijos) < 300
+
+
+def _orden(nseq, importe="30.00"):
+    return SimpleNamespace(
+        id=uuid4(), end_to_end_id=f"REM-2026-001-{nseq:03d}", importe=Decimal(importe), cuota=None,
+    )
+
+
+class _Resultado:
+    def __init__(self, valores):
+        self._valores = valores
+
+    def scalars(self):
+        return self
+
+    def first(self):
+        return self._valores[0]
+
+    def all(self):
+        return self._valores
+
+
+async def _previsualizar(ordenes, tipo, contenido=None, **kw):
+    respuestas = iter([_Resultado([SimpleNamespace(referencia="REM-2026-001")]), _Resultado(ordenes)])
+    session = MagicMock()
+
+    async def execute(stmt):
+        return next(respuestas)
+
+    session.execute = execute
+    return await RemesaService(session).previsualizar_liquidacion(uuid4(), tipo, contenido, **kw)
+
+
+class TestPrevisualizarLiquidacion:
+    async def test_pain002(self):
+        ordenes = [_orden(n) for n in range(1, 4)]
+        res = await _previsualizar(ordenes, "pain002", _pain002(
+            ("REM-2026-001-002", "RJCT", "AM04"),
+            ("REM-2026-001-002", "RJCT", "AM04"),
+            ("REM-2026-009-001", "RJCT", "AM04"),
+        ))
+        assert [f["orden_id"] for f in res["fallidas"]] == [str(ordenes[1].id)]
+        assert {c["orden_id"] for c in res["cobradas"]} == {str(ordenes[0].id), str(ordenes[2].id)}
+        assert [n["motivo"] for n in res["no_emparejadas"]] == [
+            "Línea repetida en el fichero", "EndToEndId no pertenece a esta remesa",
+        ]
+
+    async def test_camt054_comprueba_importe(self):
+        ordenes = [_orden(1), _orden(2, "45.00"), _orden(3)]
+        res = await _previsualizar(ordenes, "camt054", _camt054(
+            ("REM-2026-001-001", "30.00"), ("REM-2026-001-002", "30.00"),
+        ))
+        assert [c["orden_id"] for c in res["cobradas"]] == [str(ordenes[0].id)]
+        assert [n["end_to_end_id"] for n in res["no_emparejadas"]] == [
+            "REM-2026-001-002", "REM-2026-001-002", "REM-2026-001-003",
+        ]
+        assert res["no_emparejadas"][0]["motivo"].startswith("Importe 30.00 no coincide")
+
+    async def test_manual(self):
+        ordenes = [_orden(1), _orden(2)]
+        res = await _previsualizar(
+            ordenes, "manual", fallidos_manual=[{"orden_id": str(ordenes[0].id), "codigo": "AM04"}],
+        )
+        assert res["totales"]["n_fallidas"] == 1
+        assert [c["orden_id"] for c in res["cobradas"]] == [str(ordenes[1].id)]
@@ -0,0 +1,43 @@
+"""Tests del arranque único bajo advisory lock (app/core/arranque.py)."""
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core import arranque
+
+
+def _factoria(session):
+    @asynccontextmanager
+    async def _ctx():
+        yield session
+    return _ctx
+
+
+def _session(obtiene_cerrojo: bool):
+    session = MagicMock()
+    session.scalar = AsyncMock(return_value=obtiene_cerrojo)
+    session.execute = AsyncMock()
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    return session
+
+
+class TestEjecutarTareasUnicas:
+    async def test_con_cerrojo_sincroniza_y_confirma(self):
+        session = _session(True)
+        with patch.object(arranque, "tareas_unicas", AsyncMock()) as tareas:
+            hecho = await arranque.ejecutar_tareas_unicas(_factoria(session))
+        assert hecho is True
+        tareas.assert_awaited_once_with(session)
+        session.commit.assert_awaited_once()
+        session.execute.assert_not_awaited()
+
+    async def test_sin_cerrojo_espera_y_no_repite(self):
+        session = _session(False)
+        with patch.object(arranque, "tareas_unicas", AsyncMock()) as tareas:
+            hecho = await arranque.ejecutar_tareas_unicas(_factoria(session))
+        assert hecho is False
+        tareas.assert_not_awaited()
+        # Espera bloqueante al cerrojo del otro proceso y lo suelta sin escribir.
+        session.execute.assert_awaited_once()
+        session.rollback.assert_awaited_once()
+        session.commit.assert_not_awaited()
@@ -0,0 +1,106 @@
+"""Tests del CacheService (tier en memoria: LRU/TTL, namespaces, single-flight)."""
+import asyncio
+import time
+
+import pytest
+
+from app.infrastructure.services.cache_service import CacheService, generar_cache_key
+
+
+@pytest.fixture
+def cache():
+    return CacheService(redis_url=None, max_entries=3)
+
+
+class TestMemoria:
+    async def test_get_set_y_contadores(self, cache):
+        assert await cache.get("a:1", "def") == "def"
+        await cache.set("a:1", {"x": 1})
+        assert await cache.get("a:1") == {"x": 1}
+        stats = cache.stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+
+    async def test_lru_acotada(self, cache):
+        for i in range(4):
+            await cache.set(f"k:{i}", i)
+        assert await cache.get("k:0") is None
+        assert await cache.get("k:3") == 3
+        assert cache.stats()["evictions"] == 1
+
+    async def test_rechaza_valores_no_json(self, cache):
+        assert await cache.set("k:obj", object()) is False
+
+    async def test_increment_con_ttl(self, cache):
+        assert await cache.increment("intentos:x", ttl=60) == 1
+        assert await cache.increment("intentos:x", ttl=60) == 2
+        assert 0 < await cache.get_ttl("intentos:x") <= 60
+
+
+class TestInvalidacion:
+    async def test_namespace(self, cache):
+        await cache.set(generar_cache_key("notif", "u1"), 1)
+        await cache.set(generar_cache_key("otro", "u1"), 2)
+        assert await cache.invalidate_namespace("notif") == 1
+        assert await cache.get("notif:u1") is None
+        assert await cache.get("otro:u1") == 2
+
+    async def test_tags(self, cache):
+        await cache.set("a:1", 1, tags=["usuario:u1"])
+        await cache.set("b:1", 2, tags=["usuario:u1"])
+        await cache.set("c:1", 3)
+        assert await cache.invalidate_tags("usuario:u1") == 2
+        assert await cache.get("c:1") == 3
+
+    async def test_etiquetas_se_podan_al_salir_la_clave(self, cache, monkeypatch):
+        memoria = cache._memory
+        for i in range(5):  # expulsión LRU (max_entries=3)
+            await cache.set(f"k:{i}", i, tags=[f"t:{i}", "comun"])
+        assert set(memoria._tags) == {"t:2", "t:3", "t:4", "comun"}
+        assert memoria._tags["comun"] == {"k:2", "k:3", "k:4"}
+
+        await cache.delete("k:2")
+        await cache.set("k:3", 3, ttl=1)  # reescrita sin etiquetas
+        ahora = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: ahora + 5)
+        assert await cache.get("k:3") is None  # caducada
+        assert memoria._tags == {"t:4": {"k:4"}, "comun": {"k:4"}}
+        assert set(memoria._tags_de) == {"k:4"}
+
+    async def test_clave_reescrita_no_hereda_etiquetas(self, cache):
+        await cache.set("a:1", 1, tags=["usuario:u1"])
+        await cache.set("a:1", 2)
+        assert await cache.invalidate_tags("usuario:u1") == 0
+        assert await cache.get("a:1") == 2
+
+    async def test_lectura_es_una_copia_como_en_redis(self, cache):
+        await cache.set("a:1", {"lista": [1]})
+        leido = await cache.get("a:1")
+        leido["lista"].append(2)
+        assert await cache.get("a:1") == {"lista": [1]}
+        await cache.set("a:2", (1, 2))
+        assert await cache.get("a:2") == [1, 2]  # JSON, igual que Redis
+
+
+class TestGetOrSet:
+    async def test_single_flight(self, cache):
+        llamadas = 0
+
+        async def factoria():
+            nonlocal llamadas
+            llamadas += 1
+            await asyncio.sleep(0.01)
+            return 42
+
+        resultados = await asyncio.gather(*(cache.get_or_set("x:1", factoria) for _ in range(5)))
+        assert resultados == [42] * 5
+        assert llamadas == 1
+        assert await cache.get_or_set("x:1", factoria) == 42
+        assert llamadas == 1
+
+    async def test_error_se_propaga_y_no_cachea(self, cache):
+        async def falla():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_set("x:2", falla)
+        assert await cache.exists("x:2") is False
@@ -0,0 +1,131 @@
+"""Tests de las opciones de carga de relaciones (app.core.carga)."""
+from types import SimpleNamespace
+from typing import List, Optional
+
+import pytest
+from sqlalchemy import ForeignKey, create_engine, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, relationship
+from strawberry.types.nodes import InlineFragment, SelectedField
+
+from app.core.carga import (
+    activar_modo_estricto,
+    cargar,
+    cargar_seleccion,
+    contar_sentencias,
+    desactivar_modo_estricto,
+    rutas_seleccion,
+)
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class Pais(_Base):
+    __tablename__ = "pais"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    nombre: Mapped[str]
+
+
+class Autor(_Base):
+    __tablename__ = "autor"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    nombre: Mapped[str]
+    pais_id: Mapped[Optional[int]] = mapped_column(ForeignKey("pais.id"))
+    pais: Mapped[Optional[Pais]] = relationship(lazy="select")
+    libros: Mapped[List["Libro"]] = relationship(back_populates="autor", lazy="select")
+
+
+class Libro(_Base):
+    __tablename__ = "libro"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    titulo: Mapped[str]
+    autor_id: Mapped[int] = mapped_column(ForeignKey("autor.id"))
+    autor: Mapped[Autor] = relationship(back_populates="libros", lazy="select")
+
+
+def _campo(nombre: str, *hijos) -> SelectedField:
+    return SelectedField(name=nombre, directives={}, arguments={}, selections=list(hijos))
+
+
+@pytest.fixture
+def engine():
+    eng = create_engine("sqlite://")
+    _Base.metadata.create_all(eng)
+    with Session(eng) as s:
+        es = Pais(id=1, nombre="España")
+        s.add_all([
+            Autor(id=1, nombre="Galdós", pais=es, libros=[Libro(titulo="Tristana"), Libro(titulo="Miau")]),
+            Autor(id=2, nombre="Pardo Bazán", pais=es, libros=[Libro(titulo="Insolación")]),
+        ])
+        s.commit()
+    yield eng
+    desactivar_modo_estricto()
+    eng.dispose()
+
+
+class TestCargar:
+    def test_ruta_desconocida(self):
+        with pytest.raises(ValueError, match="Autor no tiene la relación 'editorial'"):
+            cargar(Autor, "editorial")
+
+    def test_tramo_anidado_desconocido(self):
+        with pytest.raises(ValueError, match="Libro no tiene la relación 'titulo'"):
+            cargar(Autor, "libros.titulo")
+
+    def test_rutas_en_pocas_sentencias(self, engine):
+        with Session(engine) as s, contar_sentencias(engine) as c:
+            autores = s.scalars(select(Autor).options(*cargar(Autor, "pais", "libros"))).all()
+            titulos = sorted(l.titulo for a in autores for l in a.libros)
+            paises = {a.pais.nombre for a in autores}
+        assert titulos == ["Insolación", "Miau", "Tristana"]
+        assert paises == {"España"}
+        # Autor + pais en un JOIN; libros en un único SELECT ... IN.
+        assert c.total == 2
+
+    def test_sin_rutas_carga_perezosa(self, engine):
+        with Session(engine) as s, contar_sentencias(engine) as c:
+            for a in s.scalars(select(Autor)).all():
+                a.libros
+        assert c.total == 3
+
+
+class TestModoEstricto:
+    def test_relacion_no_declarada_lanza(self, engine):
+        activar_modo_estricto()
+        with Session(engine) as s:
+            autor = s.scalars(select(Autor).where(Autor.id == 1)).one()
+            with pytest.raises(InvalidRequestError, match="libros"):
+                autor.libros
+
+    def test_ruta_declarada_prevalece(self, engine):
+        activar_modo_estricto()
+        with Session(engine) as s:
+            autor = s.scalars(
+                select(Autor).where(Autor.id == 1).options(*cargar(Autor, "libros.autor"))
+            ).one()
+            assert {l.autor.nombre for l in autor.libros} == {"Galdós"}
+
+    def test_desactivar(self, engine):
+        activar_modo_estricto()
+        desactivar_modo_estricto()
+        with Session(engine) as s:
+            assert len(s.get(Autor, 1).libros) == 2
+
+
+class TestSeleccion:
+    def test_rutas_desde_seleccion(self):
+        seleccion = [
+            _campo("nombre"),
+            _campo("libros", _campo("titulo"), _campo("autor", _campo("pais", _campo("nombre")))),
+            InlineFragment(type_condition="Autor", directives={}, selections=[_campo("pais", _campo("id"))]),
+        ]
+        assert rutas_seleccion(Autor, seleccion) == ["libros.autor.pais", "pais"]
+
+    def test_raiz_por_campos_envoltorio(self):
+        info = SimpleNamespace(selected_fields=[
+            _campo("autoresPaginados", _campo("total"), _campo("items", _campo("libros", _campo("id")))),
+        ])
+        assert len(cargar_seleccion(Autor, info, raiz="items")) == 1
+        assert cargar_seleccion(Autor, info) == []
@@ -0,0 +1,65 @@
+"""Tests de la difusión de invalidaciones entre workers (app/core/difusion_eventos.py)."""
+import json
+from unittest.mock import AsyncMock
+
+from app.core.difusion_eventos import DifusionEventos
+from app.core.events import EventBus, UserRolesChanged
+from app.core import difusion_eventos as modulo
+
+
+class TestDifusionEventos:
+    async def test_aplica_eventos_ajenos_sin_reenviarlos(self, monkeypatch):
+        bus = EventBus()
+        monkeypatch.setattr(modulo, "event_bus", bus)
+        local = AsyncMock()
+        bus.subscribe(UserRolesChanged, local, sync=True)
+        difusion = DifusionEventos()
+        difusion.difundir = AsyncMock()
+        difusion.wire()
+
+        otro = DifusionEventos()
+        mensaje = json.dumps({"o": otro.origen, "t": "UserRolesChanged", "p": {"usuario_id": "u1"}})
+        await difusion.recibir(mensaje)
+
+        local.assert_awaited_once()
+        assert local.await_args.args[0].usuario_id == "u1"
+        difusion.difundir.assert_not_awaited()
+        assert difusion.recibidos == 1
+
+    async def test_ignora_sus_propios_avisos(self, monkeypatch):
+        bus = EventBus()
+        monkeypatch.setattr(modulo, "event_bus", bus)
+        local = AsyncMock()
+        bus.subscribe(UserRolesChanged, local, sync=True)
+        difusion = DifusionEventos()
+
+        await difusion.recibir(json.dumps({"o": difusion.origen, "t": "UserRolesChanged", "p": {}}))
+        local.assert_not_awaited()
+
+    async def test_con_matrix_sync_no_reconstruye_la_matriz(self, monkeypatch):
+        from unittest.mock import MagicMock
+
+        from app.core import events
+        from app.core.events import RoleUpdated
+        from app.modules.acceso.services import matrix
+
+        bus = EventBus()
+        monkeypatch.setattr(modulo, "event_bus", bus)
+        monkeypatch.setattr(events, "event_bus", bus)
+        monkeypatch.setattr(events, "matrix_invalidation_handler", None)
+        aplicar = AsyncMock()
+        monkeypatch.setattr(matrix, "apply_permission_event", aplicar)
+        principal = AsyncMock()
+        bus.subscribe(RoleUpdated, principal, sync=True)
+        events.wire_matrix_invalidation(MagicMock())
+        difusion = DifusionEventos()
+        mensaje = json.dumps({"o": "otro", "t": "RoleUpdated", "p": {"role_id": "r1"}})
+
+        monkeypatch.setattr(matrix.matrix_cache, "_sync", MagicMock())
+        await difusion.recibir(mensaje)
+        aplicar.assert_not_awaited()
+        principal.assert_awaited_once()  # el resto de cachés sí se invalida
+
+        monkeypatch.setattr(matrix.matrix_cache, "_sync", None)
+        await difusion.recibir(mensaje)
+        aplicar.assert_awaited_once()
@@ -0,0 +1,75 @@
+"""Tests del índice ciego de DNI/NIF e IBAN (app/core/indice_ciego.py)."""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from cryptography.fernet import Fernet
+
+from app.core import indice_ciego
+from app.core.indice_ciego import en_claro, es_cifrado, indice_documento, indice_iban
+from app.infrastructure.services.encriptacion_service import get_encriptacion_service
+from app.modules.membresia.models.contacto import Contacto
+from app.modules.membresia.models.vinculacion import Socio
+
+
+class TestIndiceCiego:
+    def test_mismo_indice_en_claro_normalizado_y_cifrado(self):
+        cifrado = get_encriptacion_service().encriptar_dni("12345678Z")
+        assert es_cifrado(cifrado)
+        assert en_claro(cifrado) == "12345678Z"
+        esperado = indice_documento("12345678Z")
+        assert len(esperado) == 64
+        assert indice_documento("12.345.678-z") == esperado
+        assert indice_documento(cifrado) == esperado
+        assert indice_documento(None) is None and indice_documento("  ") is None
+
+    def test_dominios_separados(self):
+        assert indice_documento("ES0000000000") != indice_iban("ES0000000000")
+
+    def test_el_modelo_mantiene_la_columna(self):
+        c = Contacto(tipo="PERSONA_FISICA", nombre="Ana", numero_documento="12345678Z")
+        assert c.numero_documento_indice == indice_documento("12345678Z")
+        c.numero_documento = get_encriptacion_service().encriptar_dni("12345678Z")
+        assert c.numero_documento_indice == indice_documento("12345678Z")
+        c.numero_documento = None
+        assert c.numero_documento_indice is None
+
+        s = Socio(iban="ES76 2077 0024 0031 0257 5766")
+        assert s.iban_indice == indice_iban("ES7620770024003102575766")
+
+    def test_criterio_de_busqueda(self):
+        sql = str(Contacto.con_documento("12345678Z").compile(compile_kwargs={"literal_binds": True}))
+        assert "numero_documento_indice" in sql and indice_documento("12345678Z") in sql
+        assert str(Contacto.con_documento("")) == "false"
+
+    def test_rotar_la_clave_fernet_no_cambia_el_indice(self, monkeypatch):
+        antigua, nueva = Fernet.generate_key().decode(), Fernet.generate_key().decode()
+        monkeypatch.delenv("BLIND_INDEX_KEY", raising=False)
+        monkeypatch.delenv("BLIND_INDEX_KEY_FILE", raising=False)
+        valores = []
+        try:
+            for claves in (antigua, f"{nueva},{antigua}", nueva):
+                monkeypatch.setenv("ENCRYPTION_KEY", claves)
+                indice_ciego._clave.cache_clear()
+                valores.append((indice_documento("12345678Z"), indice_ciego.huella_clave()))
+        finally:
+            indice_ciego._clave.cache_clear()
+        # Nueva delante: igual. Retirada la antigua: cambia (y la huella lo delata).
+        assert valores[0] == valores[1]
+        assert valores[2][0] != valores[0][0] and valores[2][1] != valores[0][1]
+
+
+class TestAsegurarIndicesCiegos:
+    async def _asegurar(self, guardada):
+        from app.scripts import reindexar_indices_ciegos as ri
+        session = MagicMock(scalar=AsyncMock(return_value=guardada))
+        with patch.object(ri, "reindexar_indices_ciegos", AsyncMock(return_value={})) as reindexar, \
+                patch.object(ri, "_guardar_huella", AsyncMock()) as guardar:
+            await ri.asegurar_indices_ciegos(session)
+        guardar.assert_awaited_once_with(session, indice_ciego.huella_clave())
+        return reindexar.await_args.kwargs["todos"]
+
+    async def test_misma_clave_solo_los_que_faltan(self):
+        assert await self._asegurar(indice_ciego.huella_clave()) is False
+
+    async def test_otra_clave_reindexa_todo(self):
+        assert await self._asegurar("otra") is True
+        assert await self._asegurar(None) is True
@@ -0,0 +1,119 @@
+"""Tests del transactional outbox del event bus (serialización, relay, dead-letter)."""
+import uuid
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.events import EventBus, GrupoTrabajoCreado, MiembroPerfilIncompleto
+from app.core.outbox import (
+    FALLIDO,
+    PROCESADO,
+    EventoOutbox,
+    OutboxRelay,
+    deserializar_evento,
+    nombre_handler,
+    serializar_evento,
+    siguiente_intento,
+)
+
+
+class TestSerializacion:
+    def test_ida_y_vuelta(self):
+        ev = MiembroPerfilIncompleto(miembro_id="m1", campos_faltantes=("email", "teléfono"))
+        tipo, payload = serializar_evento(ev)
+        assert tipo == "MiembroPerfilIncompleto"
+        assert payload["campos_faltantes"] == ["email", "teléfono"]
+        assert deserializar_evento(tipo, payload) == ev
+
+    def test_tipo_desconocido(self):
+        with pytest.raises(LookupError):
+            deserializar_evento("NoExiste", {})
+
+    def test_enqueue_en_la_transaccion(self):
+        session = AsyncSession()
+        ev = GrupoTrabajoCreado(grupo_id="g1", nombre="Laicismo")
+        EventBus().enqueue(session, ev)
+        filas = [o for o in session.new if isinstance(o, EventoOutbox)]
+        assert len(filas) == 1
+        assert filas[0].id == uuid.UUID(ev.event_id)
+        assert filas[0].payload["nombre"] == "Laicismo"
+
+
+def _relay(bus, filas, **kw):
+    sesiones = []
+
+    @asynccontextmanager
+    async def factoria():
+        s = AsyncMock()
+        s.execute = AsyncMock(return_value=SimpleNamespace(all=lambda: filas))
+        sesiones.append(s)
+        yield s
+
+    relay = OutboxRelay(factoria, bus, tamano_lote=10, intervalo=0, max_intentos=3, **kw)
+    return relay, sesiones
+
+
+def _valores(sesion):
+    """Valores del UPDATE de cierre de cada fila."""
+    return [c.args[0].compile().params for c in sesion.execute.await_args_list]
+
+
+def _fila(ev, intentos=1, completados=()):
+    tipo, payload = serializar_evento(ev)
+    return SimpleNamespace(id=uuid.UUID(ev.event_id), tipo=tipo, payload=payload,
+                           intentos=intentos, completados=list(completados))
+
+
+class TestRelay:
+    async def test_reintento_solo_de_handlers_fallidos(self):
+        bus = EventBus()
+        llamadas = []
+
+        async def ok(ev):
+            llamadas.append("ok")
+
+        async def falla(ev):
+            llamadas.append("falla")
+            raise RuntimeError("ejabberd caído")
+
+        bus.subscribe(GrupoTrabajoCreado, ok)
+        bus.subscribe(GrupoTrabajoCreado, falla)
+        relay, _ = _relay(bus, [])
+        _, payload = serializar_evento(GrupoTrabajoCreado(grupo_id="g1"))
+
+        hechos, error = await relay.despachar("GrupoTrabajoCreado", payload, [])
+        assert hechos == [nombre_handler(ok)] and "ejabberd caído" in error
+        hechos, error = await relay.despachar("GrupoTrabajoCreado", payload, hechos)
+        assert llamadas == ["ok", "falla", "falla"]
+
+    async def test_procesado_reintento_y_dead_letter(self):
+        bus = EventBus()
+
+        async def falla(ev):
+            raise RuntimeError("boom")
+
+        bus.subscribe(MiembroPerfilIncompleto, falla)
+        filas = [
+            _fila(GrupoTrabajoCreado(grupo_id="g1")),                  # sin handlers → OK
+            _fila(MiembroPerfilIncompleto(miembro_id="m1"), intentos=1),  # → reintento
+            _fila(MiembroPerfilIncompleto(miembro_id="m2"), intentos=3),  # → dead-letter
+        ]
+        relay, sesiones = _relay(bus, filas)
+        assert await relay.procesar_lote() == 3
+
+        reclamo, cierre = sesiones
+        reclamo.commit.assert_awaited_once()
+        ok, reintento, muerta = _valores(cierre)
+        assert ok["estado"] == PROCESADO
+        assert "estado" not in reintento and "boom" in reintento["ultimo_error"]
+        assert muerta["estado"] == FALLIDO
+        assert (relay.procesados, relay.fallidos) == (1, 1)
+
+
+def test_backoff_exponencial_acotado():
+    assert siguiente_intento(1) <= 2.5
+    assert 12 <= siguiente_intento(4) <= 20
+    assert siguiente_intento(50) <= 900 * 1.25
@@ -0,0 +1,91 @@
+"""Tests del recifrado por lotes con MultiFernet (app/infrastructure/services/recifrado_service.py)."""
+import base64
+import json
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from cryptography.fernet import Fernet
+
+from app.core.indice_ciego import indice_documento
+from app.infrastructure.services import recifrado_service as rs
+
+VIEJA = Fernet.generate_key().decode()
+NUEVA = Fernet.generate_key().decode()
+
+
+def _token(clave: str, claro: str) -> str:
+    return base64.urlsafe_b64encode(Fernet(clave.encode()).encrypt(claro.encode())).decode()
+
+
+def _descifrar(clave: str, valor: str) -> str:
+    return Fernet(clave.encode()).decrypt(base64.urlsafe_b64decode(valor)).decode()
+
+
+class TestRecifrarLote:
+    def test_recifra_salta_lo_al_dia_y_cuenta_errores(self):
+        rs.iniciar_proceso([NUEVA, VIEJA])
+        viejo, al_dia = _token(VIEJA, "12345678Z"), _token(NUEVA, "87654321X")
+        ajena = _token(Fernet.generate_key().decode(), "11111111H")
+        ids = [uuid.uuid4() for _ in range(4)]
+        filas = [
+            (ids[0], viejo, None),
+            (ids[1], al_dia, indice_documento("87654321X")),
+            (ids[2], ajena, None),
+            (ids[3], "22222222 j", None),
+        ]
+
+        cambios, errores = rs.recifrar_lote("documento", filas, cifrar_en_claro=False)
+        assert errores == 1
+        assert [c[0] for c in cambios] == [ids[0], ids[3]]
+        id_, anterior, nuevo, indice = cambios[0]
+        assert anterior == viejo and _descifrar(NUEVA, nuevo) == "12345678Z"
+        assert indice == indice_documento("12345678Z")
+        # En claro sin `cifrar_en_claro`: mismo valor, solo el índice.
+        assert cambios[1][1:] == ("22222222 j", "22222222 j", indice_documento("22222222J"))
+
+        filas[3] = (ids[3], "22222222 j", indice_documento("22222222J"))
+        cambios, _ = rs.recifrar_lote("documento", filas, cifrar_en_claro=False)
+        assert [c[0] for c in cambios] == [ids[0]]
+
+        cambios, _ = rs.recifrar_lote("documento", filas, cifrar_en_claro=True)
+        claro = next(c for c in cambios if c[0] == ids[3])
+        assert _descifrar(NUEVA, claro[2]) == "22222222J"
+
+
+    def test_cuentas_bancarias_entra_en_la_rotacion(self):
+        campo = rs.CAMPOS["cuentas_bancarias.iban"]
+        assert (campo.columna_indice, campo.tipo) == ("iban_indice", "iban")
+
+
+class TestRecifrarCampo:
+    async def test_reanuda_desde_el_punto_de_control(self):
+        rs.iniciar_proceso([NUEVA, VIEJA])
+        campo = rs.CAMPOS["contactos.numero_documento"]
+        previo = {"huella": rs.huella_clave(NUEVA), "ultimo_id": "u-100", "leidas": 100,
+                  "recifradas": 90, "errores": 0, "completo": False}
+        filas = [(uuid.uuid4(), _token(VIEJA, "12345678Z"), None)]
+        session = MagicMock()
+        session.commit = AsyncMock()
+        leer = AsyncMock(side_effect=[filas, []])
+        with patch.object(rs, "_leer_punto_control", AsyncMock(return_value=previo)), \
+                patch.object(rs, "_leer_lote", leer), \
+                patch.object(rs, "_escribir_lote", AsyncMock(return_value=1)), \
+                patch.object(rs, "_guardar_punto_control", AsyncMock()) as guardar:
+            estado = await rs.recifrar_campo(session, campo, [NUEVA, VIEJA], procesos=0)
+
+        assert leer.await_args_list[0].args[2] == "u-100"
+        assert (estado.leidas, estado.recifradas, estado.completo) == (101, 91, True)
+        assert json.loads(guardar.await_args.args[2].a_json())["completo"] is True
+        assert session.commit.await_count == 2
+
+    async def test_otra_clave_principal_empieza_de_cero(self):
+        campo = rs.CAMPOS["socios.iban"]
+        previo = {"huella": rs.huella_clave(VIEJA), "ultimo_id": "u-100", "completo": True}
+        leer = AsyncMock(return_value=[])
+        with patch.object(rs, "_leer_punto_control", AsyncMock(return_value=previo)), \
+                patch.object(rs, "_leer_lote", leer), \
+                patch.object(rs, "_guardar_punto_control", AsyncMock()):
+            session = MagicMock(commit=AsyncMock())
+            estado = await rs.recifrar_campo(session, campo, [NUEVA, VIEJA], procesos=0)
+        assert leer.await_args.args[2] is None
+        assert estado.completo
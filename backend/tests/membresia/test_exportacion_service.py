@@ -0,0 +1,95 @@
+"""Tests de la exportación del padrón (volcado XLSX write_only y CSV en streaming)."""
+import io
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from openpyxl import load_workbook
+
+from app.modules.membresia.services.exportacion_service import (
+    CABECERA,
+    ExportacionMiembrosService,
+)
+
+
+def _resultado(filas):
+    res = MagicMock()
+    res.all.return_value = filas
+    return res
+
+
+def _contacto(nombre, apellido1, agrupacion_id=None):
+    cid = uuid4()
+    # Columnas del SELECT + las 4 claves de orden del keyset al final.
+    return SimpleNamespace(
+        id=cid, nombre=nombre, apellido1=apellido1, apellido2=None,
+        email=f"{nombre.lower()}@example.org", telefono=None, localidad="Sevilla",
+        agrupacion_id=agrupacion_id,
+    ), (apellido1.lower(), "", nombre.lower(), cid)
+
+
+class _Fila(tuple):
+    """Fila tipo Row: acceso por atributo y por posición."""
+
+    def __new__(cls, ns, claves):
+        obj = super().__new__(cls, tuple(vars(ns).values()) + claves)
+        obj.__dict__.update(vars(ns))
+        return obj
+
+
+@pytest.fixture
+def datos():
+    agr = uuid4()
+    ana, k_ana = _contacto("Ana", "Álvarez", agr)
+    luis, k_luis = _contacto("Luis", "Bravo")
+    filas = [_Fila(ana, k_ana), _Fila(luis, k_luis)]
+    vinc = SimpleNamespace(
+        contacto_id=ana.id, fecha_inicio=date(2020, 1, 15), fecha_fin=None, estado_socio="ALTA",
+    )
+    session = AsyncMock()
+    session.execute = AsyncMock(side_effect=[
+        _resultado(filas),                       # contactos (lote único < tamaño)
+        _resultado([(ana.id, "Numerario")]),     # tipos de miembro
+        _resultado([vinc]),                      # vinculaciones SOCIO
+        _resultado([(agr, "Agrupación Sur")]),   # nombres de agrupación
+    ])
+    return session
+
+
+class TestExportacion:
+    async def test_xlsx_write_only(self, datos):
+        buf = io.BytesIO()
+        total = await ExportacionMiembrosService(datos).exportar_xlsx(buf, ids=[uuid4()])
+        assert total == 2
+        ws = load_workbook(io.BytesIO(buf.getvalue())).active
+        filas = list(ws.iter_rows(values_only=True))
+        assert filas[0] == CABECERA
+        assert filas[1][:5] == ("Ana", "Álvarez", None, "Numerario", "ALTA")
+        assert filas[1][7] == "Agrupación Sur"
+        assert filas[1][9] == "2020-01-15"
+        assert filas[2][0] == "Luis"
+        # Cuatro consultas en total, independientemente del nº de contactos
+        assert datos.execute.await_count == 4
+
+    async def test_csv_streaming(self, datos):
+        trozos = [t async for t in ExportacionMiembrosService(datos).exportar_csv()]
+        texto = b"".join(trozos).decode("utf-8")
+        assert texto.startswith("\ufeffNombre;Primer apellido")
+        assert "Ana;Álvarez;;Numerario;ALTA" in texto
+        assert len(trozos) == 2  # cabecera + un lote
+
+    def test_filtros_de_ambito_y_texto_en_sql(self):
+        from sqlalchemy.dialects import postgresql
+
+        raiz = uuid4()
+        consulta, _ = ExportacionMiembrosService(AsyncMock())._consulta(
+            None, None, None, "50%", ambito={raiz},
+        )
+        sql = str(consulta.compile(dialect=postgresql.dialect()))
+        assert "unidades_organizativas_cierre" in sql  # subárbol del ámbito
+        assert "numero_socio" in sql and "ESCAPE" in sql
+
+        global_, _ = ExportacionMiembrosService(AsyncMock())._consulta(None, None, None, None)
+        assert "cierre" not in str(global_.compile(dialect=postgresql.dialect()))
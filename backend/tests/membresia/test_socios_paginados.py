@@ -0,0 +1,96 @@
+"""Tests de la paginación por cursor del listado de socios (socios_resolvers.py).
+
+La consulta real (`_consulta_socios` + claves de orden + filtro keyset) se
+ejecuta sobre SQLite en memoria con solo las tablas que toca (nombres ASCII:
+el `lower` de SQLite no pliega acentos).
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401  (registra todas las tablas en el metadata)
+from app.core.database import Base
+from app.core.busqueda import patron_contiene
+from app.graphql.paginacion import codificar_cursor
+from app.graphql.socios_resolvers import _claves_orden_socios, _consulta_socios, _tras_cursor
+from app.modules.membresia.models.contacto import Contacto
+from app.modules.membresia.models.tipo_vinculacion import TipoVinculacion
+from app.modules.membresia.models.vinculacion import Socio, Vinculacion
+
+# (apellido1, nombre, nº de socio): tres empates exactos en la clave de orden.
+SOCIOS = [
+    ("Garcia", "Ana", "S-1"), ("garcia", "ana", "S-2"), ("GARCIA", "ANA", "S-3"),
+    ("López", "Luis", "50%"), ("Martín", "Eva", "S_5"), ("Pérez", "Juan", "S-6"),
+    ("Ruiz", "Sara", "S-7"),
+]
+
+
+@pytest.fixture
+def session():
+    eng = create_engine("sqlite://")
+    Base.metadata.create_all(eng, tables=[
+        Contacto.__table__, TipoVinculacion.__table__, Vinculacion.__table__, Socio.__table__,
+    ])
+    with Session(eng) as s:
+        tipo = TipoVinculacion(nombre="Socio", codigo="SOCIO", ambito="ORGANIZACION")
+        s.add(tipo)
+        for apellido, nombre, numero in SOCIOS:
+            contacto = Contacto(tipo="PERSONA_FISICA", nombre=nombre, apellido1=apellido)
+            vinc = Vinculacion(contacto=contacto, tipo_vinculacion=tipo,
+                               fecha_inicio=date(2020, 1, 1), estado="activa")
+            s.add_all([contacto, vinc, Socio(vinculacion=vinc, numero_socio=numero)])
+        s.commit()
+        yield s
+
+
+def _paginar(session, limite, **filtros):
+    """Recorre todas las páginas como lo hace `sociosPaginados`."""
+    claves = _claves_orden_socios()
+    paginas, after = [], None
+    while True:
+        q = _consulta_socios(**filtros).add_columns(*claves)
+        if after:
+            q = _tras_cursor(q, claves, after)
+        filas = session.execute(q.order_by(*claves).limit(limite + 1)).all()
+        hay_mas = len(filas) > limite
+        filas = filas[:limite]
+        paginas.append([fila[0].socio.numero_socio for fila in filas])
+        if not hay_mas:
+            return paginas
+        after = codificar_cursor(filas[-1][1:])
+
+
+class TestSociosPaginados:
+    def test_recorre_todo_sin_repetir_ni_saltar_empates(self, session):
+        paginas = _paginar(session, 2)
+        vistos = [n for pagina in paginas for n in pagina]
+        assert sorted(vistos) == sorted(n for _, _, n in SOCIOS)
+        assert len(vistos) == len(set(vistos))
+        # Los tres empates de «garcia ana» abren el listado, partidos entre páginas.
+        assert set(vistos[:3]) == {"S-1", "S-2", "S-3"}
+        assert vistos[3:] == ["50%", "S_5", "S-6", "S-7"]
+
+    def test_ultima_pagina(self, session):
+        paginas = _paginar(session, 3)
+        assert [len(p) for p in paginas] == [3, 3, 1]
+        # Página exacta: la última llena no anuncia otra vacía.
+        assert [len(p) for p in _paginar(session, 7)] == [7]
+
+    def test_cursor_ida_y_vuelta(self, session):
+        claves = _claves_orden_socios()
+        fila = session.execute(
+            _consulta_socios().add_columns(*claves).order_by(*claves).limit(1)
+        ).one()
+        q = _tras_cursor(_consulta_socios().add_columns(*claves), claves, codificar_cursor(fila[1:]))
+        resto = session.execute(q.order_by(*claves)).all()
+        assert len(resto) == len(SOCIOS) - 1
+        assert fila[0].id not in {r[0].id for r in resto}
+        with pytest.raises(ValueError):
+            _tras_cursor(q, claves, codificar_cursor(["a", "b", "c", "no-uuid", "x"]))
+
+    def test_texto_con_comodines_es_literal(self, session):
+        assert patron_contiene(" 50% ") == "%50\\%%"
+        assert _paginar(session, 10, texto="50%") == [["50%"]]
+        assert _paginar(session, 10, texto="s_5") == [["S_5"]]
@@ -880,10 +880,8 @@ export const UPDATE_AGRUPACION_TERRITORIAL = `
 `
 
 export const DELETE_AGRUPACION_TERRITORIAL = `
-  mutation EliminarUnidadOrganizativa($filter: UnidadOrganizativaFilter!) {
-    eliminarUnidadesOrganizativas(filter: $filter) {
-      id
-    }
+  mutation EliminarUnidadOrganizativa($ids: [UUID!]!) {
+    eliminarUnidadesOrganizativas(ids: $ids)
   }
 `
 